@@ -41,49 +41,38 @@ def load_and_parse_log_data_jsonl(log_file_path: str) -> list:
         return []
     return parsed_logs
 
-def analyze_goal_lifecycles(parsed_logs: list) -> dict:
+class GoalLifecycleAccumulator:
     """
-    Analyzes parsed log data to reconstruct the lifecycle of each goal.
+    Incrementally reconstructs goal lifecycles, one log entry at a time.
 
-    Args:
-        parsed_logs (list): A list of log entry dictionaries, sorted by timestamp.
-
-    Returns:
-        dict: A dictionary where keys are goal_ids and values are dictionaries
-              containing the reconstructed lifecycle information for each goal.
-              Example structure:
-              {
-                  "G001": {
-                      "description": "Explore novel object A",
-                      "type": "INTRINSIC_CURIOSITY",
-                      "creation_time": 1678886400.5,
-                      "current_priority": 0.75,
-                      "priority_history": [{"timestamp": ..., "priority": ...}, ...],
-                      "state_history": [{"timestamp": ..., "state": ..., "reason": ...}, ...],
-                      "outcome": "ACHIEVED",
-                      "end_time": 1678886410.2,
-                      "duration_seconds": 9.7
-                  }, ...
-              }
+    This is the streaming form of `analyze_goal_lifecycles`: entries are fed through
+    `process_entry` (e.g. by the single-pass `AnalysisPipeline` or a live log tail) and
+    `finalize` can be called at any point to obtain the lifecycle dictionary for the
+    entries seen so far.
     """
-    # Using defaultdict to easily initialize new goal entries
-    # In a real implementation, more robust data structures might be used.
-    goals_data = defaultdict(lambda: {
-        "priority_history": [],
-        "state_history": [],
-        "events_processed": 0 # For tracking if any event related to this goal was processed
-    })
-
-    for entry in parsed_logs:
+    name = "goal_dynamics"
+    # Any event carrying a goal_id contributes to that goal's record, so no event-type filter.
+    event_types = None
+
+    def __init__(self):
+        # Using defaultdict to easily initialize new goal entries
+        self._goals_data = defaultdict(lambda: {
+            "priority_history": [],
+            "state_history": [],
+            "events_processed": 0 # For tracking if any event related to this goal was processed
+        })
+
+    def process_entry(self, entry: dict) -> None:
+        """Updates the lifecycle of the goal referenced by `entry`, if any."""
         event_type = entry.get("event_type")
         event_data = entry.get("event_data", {})
         goal_id = event_data.get("goal_id")
         timestamp = entry.get("timestamp")
 
         if not goal_id or timestamp is None:
-            continue # Skip entries without goal_id or timestamp
+            return # Skip entries without goal_id or timestamp
 
-        current_goal = goals_data[goal_id]
+        current_goal = self._goals_data[goal_id]
         current_goal["events_processed"] += 1
 
 
@@ -165,23 +154,56 @@ def analyze_goal_lifecycles(parsed_logs: list) -> dict:
                 current_goal["priority_change_count"] = current_goal.get("priority_change_count", 0) + 1
                 current_goal["total_priority_change_magnitude"] = current_goal.get("total_priority_change_magnitude", 0.0) + abs(new_priority - old_priority)
 
+    def finalize(self) -> dict:
+        """
+        Computes derived per-goal fields and returns the lifecycle dictionary.
+        Safe to call repeatedly; later entries continue to update the same goal records.
+        """
+        # After processing all logs, calculate average priority change magnitude for each goal
+        for goal_id, data in self._goals_data.items():
+            if data.get("priority_change_count", 0) > 0:
+                data["avg_priority_change_magnitude"] = round(
+                    data["total_priority_change_magnitude"] / data["priority_change_count"],
+                    3 # Round to 3 decimal places
+                )
+            else:
+                data["avg_priority_change_magnitude"] = 0.0
+            # Ensure all goals have these fields, even if no priority updates occurred
+            data.setdefault("priority_change_count", 0)
+            data.setdefault("final_failure_reason", None)
+            data.setdefault("initial_priority_value", data.get("current_priority")) # Fallback if GOAL_CREATED was missed
+
+        return dict(self._goals_data)
 
-    # After processing all logs, calculate average priority change magnitude for each goal
-    for goal_id, data in goals_data.items():
-        if data.get("priority_change_count", 0) > 0:
-            data["avg_priority_change_magnitude"] = round(
-                data["total_priority_change_magnitude"] / data["priority_change_count"],
-                3 # Round to 3 decimal places
-            )
-        else:
-            data["avg_priority_change_magnitude"] = 0.0
-        # Ensure all goals have these fields, even if no priority updates occurred
-        data.setdefault("priority_change_count", 0)
-        data.setdefault("final_failure_reason", None)
-        data.setdefault("initial_priority_value", data.get("current_priority")) # Fallback if GOAL_CREATED was missed
+def analyze_goal_lifecycles(parsed_logs: list) -> dict:
+    """
+    Analyzes parsed log data to reconstruct the lifecycle of each goal.
 
+    Args:
+        parsed_logs (list): A list of log entry dictionaries, sorted by timestamp.
 
-    return dict(goals_data)
+    Returns:
+        dict: A dictionary where keys are goal_ids and values are dictionaries
+              containing the reconstructed lifecycle information for each goal.
+              Example structure:
+              {
+                  "G001": {
+                      "description": "Explore novel object A",
+                      "type": "INTRINSIC_CURIOSITY",
+                      "creation_time": 1678886400.5,
+                      "current_priority": 0.75,
+                      "priority_history": [{"timestamp": ..., "priority": ...}, ...],
+                      "state_history": [{"timestamp": ..., "state": ..., "reason": ...}, ...],
+                      "outcome": "ACHIEVED",
+                      "end_time": 1678886410.2,
+                      "duration_seconds": 9.7
+                  }, ...
+              }
+    """
+    accumulator = GoalLifecycleAccumulator()
+    for entry in parsed_logs:
+        accumulator.process_entry(entry)
+    return accumulator.finalize()
 
 def generate_summary_report(analyzed_goals_data: dict):
     """
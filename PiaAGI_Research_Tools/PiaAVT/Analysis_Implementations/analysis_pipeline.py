@@ -0,0 +1,174 @@
+# analysis_pipeline.py
+"""
+Single-pass analysis pipeline for the PiaAVT Analysis_Implementations scripts.
+
+Each analysis script loads and parses the complete log on its own, so running the
+full suite used to cost one read/decode/sort of the log per analysis. This module
+reads and decodes the log once and routes each entry only to the analyses that
+registered interest in its event type, then assembles a combined report.
+
+An analysis is any object exposing:
+    name (str): Key under which its result appears in the combined report.
+    event_types (Optional[Collection[str]]): Event types it handles, or None for all entries.
+    process_entry(entry) -> None: Consumes one log entry.
+    finalize() -> Any: Returns the analysis result for the entries consumed so far.
+
+The accumulator classes of the individual scripts (`GoalLifecycleAccumulator`,
+`EmotionalStateTrajectoryAccumulator`, `EmotionalTrajectoryAccumulator`,
+`IntrinsicMotivationAccumulator`, `TaskPerformanceAccumulator`) implement this interface.
+"""
+
+import json
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from .Goal_Dynamics_Analysis import GoalLifecycleAccumulator
+    from .emotional_state_trajectory_analysis import EmotionalStateTrajectoryAccumulator
+    from .emotional_trajectory_analysis import EmotionalTrajectoryAccumulator
+    from .intrinsic_motivation_analysis import IntrinsicMotivationAccumulator
+    from .task_performance_analysis import TaskPerformanceAccumulator
+except ImportError: # Allows running this module directly as a script
+    from Goal_Dynamics_Analysis import GoalLifecycleAccumulator
+    from emotional_state_trajectory_analysis import EmotionalStateTrajectoryAccumulator
+    from emotional_trajectory_analysis import EmotionalTrajectoryAccumulator
+    from intrinsic_motivation_analysis import IntrinsicMotivationAccumulator
+    from task_performance_analysis import TaskPerformanceAccumulator
+
+
+class AnalysisPipeline:
+    """
+    Routes log entries to registered analyses in a single pass.
+
+    Analyses are dispatched by event type: an entry is handed to every analysis that
+    listed its `event_type`, plus every analysis that registered for all entries
+    (`event_types = None`). Entries are processed in the order they are fed, so
+    callers that need chronological processing should feed sorted entries
+    (`run_jsonl` sorts by timestamp, as the individual scripts do).
+    """
+
+    def __init__(self, analyses: Optional[Iterable[Any]] = None):
+        self._analyses: Dict[str, Any] = {}
+        self._handlers_by_event_type: Dict[str, List[Any]] = defaultdict(list)
+        self._catch_all_handlers: List[Any] = []
+        self.entries_processed = 0
+        for analysis in analyses or ():
+            self.register(analysis)
+
+    @classmethod
+    def with_default_analyses(cls,
+                              target_agent_id: Optional[str] = None,
+                              target_simulation_run_id: Optional[str] = None,
+                              max_indexed_events: Optional[int] = None) -> "AnalysisPipeline":
+        """
+        Creates a pipeline with all five Analysis_Implementations analyses registered.
+        The agent/simulation filters apply to the analyses that support them.
+        `max_indexed_events` bounds the intrinsic motivation analysis' event_id index
+        (see `IntrinsicMotivationAccumulator`); by default every event is indexed.
+        """
+        return cls([
+            GoalLifecycleAccumulator(),
+            EmotionalStateTrajectoryAccumulator(target_agent_id, target_simulation_run_id),
+            EmotionalTrajectoryAccumulator(),
+            IntrinsicMotivationAccumulator(target_agent_id, target_simulation_run_id, max_indexed_events),
+            TaskPerformanceAccumulator(),
+        ])
+
+    @property
+    def analysis_names(self) -> List[str]:
+        """Names of the registered analyses, in registration order."""
+        return list(self._analyses)
+
+    def get_analysis(self, name: str) -> Optional[Any]:
+        """Returns the registered analysis with the given name, or None."""
+        return self._analyses.get(name)
+
+    def register(self, analysis: Any) -> Any:
+        """
+        Registers an analysis and its event-type handlers.
+
+        Raises:
+            ValueError: If an analysis with the same name is already registered.
+        """
+        name = analysis.name
+        if name in self._analyses:
+            raise ValueError(f"An analysis named '{name}' is already registered.")
+        self._analyses[name] = analysis
+        if analysis.event_types is None:
+            self._catch_all_handlers.append(analysis)
+        else:
+            for event_type in analysis.event_types:
+                self._handlers_by_event_type[event_type].append(analysis)
+        return analysis
+
+    def process_entry(self, entry: Dict[str, Any]) -> None:
+        """Routes a single decoded log entry to the interested analyses."""
+        self.entries_processed += 1
+        for analysis in self._handlers_by_event_type.get(entry.get("event_type"), ()):
+            analysis.process_entry(entry)
+        for analysis in self._catch_all_handlers:
+            analysis.process_entry(entry)
+
+    def process_entries(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Routes every entry of `entries` to the interested analyses."""
+        for entry in entries:
+            self.process_entry(entry)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns the combined report: each analysis' `finalize()` result keyed by name.
+        Can be called repeatedly, e.g. while entries are still being fed.
+        """
+        return {name: analysis.finalize() for name, analysis in self._analyses.items()}
+
+    def run(self, entries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Processes `entries` in one pass and returns the combined report."""
+        self.process_entries(entries)
+        return self.report()
+
+    def run_jsonl(self, log_file_path: str, sort_by_timestamp: bool = True) -> Dict[str, Any]:
+        """
+        Reads and decodes a JSONL log file once, runs every analysis over it, and
+        returns the combined report.
+
+        Args:
+            log_file_path (str): Path to the JSONL log file.
+            sort_by_timestamp (bool): Sort entries by 'timestamp' before dispatching, as the
+                individual scripts' loaders do. If False, entries are streamed straight from
+                the file without being held in memory.
+
+        Returns:
+            Dict[str, Any]: The combined report, or an empty dict if the file is not found.
+        """
+        try:
+            if sort_by_timestamp:
+                entries = list(_iter_jsonl_entries(log_file_path))
+                entries.sort(key=lambda x: x.get("timestamp", float('inf'))) # float('inf') for entries missing timestamp
+                self.process_entries(entries)
+            else:
+                self.process_entries(_iter_jsonl_entries(log_file_path))
+        except FileNotFoundError:
+            print(f"Error: Log file not found at {log_file_path}")
+            return {}
+        return self.report()
+
+
+def _iter_jsonl_entries(log_file_path: str) -> Iterable[Dict[str, Any]]:
+    """Yields decoded entries of a JSONL file, skipping empty and malformed lines."""
+    with open(log_file_path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            stripped_line = line.strip()
+            if not stripped_line: # Skip empty lines
+                continue
+            try:
+                yield json.loads(stripped_line)
+            except json.JSONDecodeError as e:
+                print(f"Error decoding JSON from line {line_number} in {log_file_path}: {stripped_line} - {e}")
+
+
+def run_full_analysis_jsonl(log_file_path: str,
+                            target_agent_id: Optional[str] = None,
+                            target_simulation_run_id: Optional[str] = None) -> Dict[str, Any]:
+    """Runs all five analyses over a JSONL log file with a single read and decode pass."""
+    pipeline = AnalysisPipeline.with_default_analyses(target_agent_id, target_simulation_run_id)
+    return pipeline.run_jsonl(log_file_path)
@@ -39,101 +39,114 @@ def load_and_parse_log_data_jsonl(log_file_path: str) -> list:
         return []
     return parsed_logs
 
-def analyze_emotional_trajectory(parsed_logs: list, target_agent_id: str = None, target_simulation_run_id: str = None) -> dict:
+class EmotionalStateTrajectoryAccumulator:
     """
-    Analyzes emotional state trajectory from parsed log data.
-    Filters logs for EMOTION_STATE_UPDATED events and optionally by agent_id and simulation_run_id.
-    Extracts timestamp and VAD values.
-    Calculates summary statistics for VAD values.
-    """
-    trajectory = []
-    relevant_logs = []
-
-    # Filter for EMOTION_STATE_UPDATED events
-    for log_entry in parsed_logs:
-        if log_entry.get("event_type") == "EMOTION_STATE_UPDATED":
-            relevant_logs.append(log_entry)
-
-    # Filter by target_agent_id if provided
-    if target_agent_id:
-        relevant_logs = [log for log in relevant_logs if log.get("agent_id") == target_agent_id]
-
-    # Filter by target_simulation_run_id if provided
-    if target_simulation_run_id:
-        relevant_logs = [log for log in relevant_logs if log.get("simulation_run_id") == target_simulation_run_id]
-
-    # Extract VAD data and timestamps
-    actual_agent_id_from_logs = target_agent_id
-    actual_sim_id_from_logs = target_simulation_run_id
-    
-    # Determine unique agent_ids and sim_ids from the relevant logs if no target is specified
-    # This helps in more accurate reporting when analyzing across all agents/simulations
-    if not target_agent_id and relevant_logs:
-        unique_agent_ids = set(log.get("agent_id") for log in relevant_logs if log.get("agent_id"))
-        if len(unique_agent_ids) == 1:
-            actual_agent_id_from_logs = unique_agent_ids.pop()
-        elif len(unique_agent_ids) > 1:
-            actual_agent_id_from_logs = "Multiple_Agents" # Or "N/A" or similar indicator
-        # else, it remains None or the initially set target_agent_id (which is None here)
-
-    if not target_simulation_run_id and relevant_logs:
-        unique_sim_ids = set(log.get("simulation_run_id") for log in relevant_logs if log.get("simulation_run_id"))
-        if len(unique_sim_ids) == 1:
-            actual_sim_id_from_logs = unique_sim_ids.pop()
-        elif len(unique_sim_ids) > 1:
-            actual_sim_id_from_logs = "Multiple_Sim_Runs" # Or "N/A"
-        # else, it remains None or the initially set target_simulation_run_id
-
-    for log in relevant_logs:
-        timestamp = log.get("timestamp")
-        event_data = log.get("event_data", {})
-        current_vad = event_data.get("current_vad")
-
-        # Update agent_id and sim_id if they were not targeted and not yet set from unique values
-        if target_agent_id is None and actual_agent_id_from_logs is None and log.get("agent_id"):
-             # This case is less likely now with the pre-check, but as a fallback
-            actual_agent_id_from_logs = log.get("agent_id")
-        if target_simulation_run_id is None and actual_sim_id_from_logs is None and log.get("simulation_run_id"):
-            actual_sim_id_from_logs = log.get("simulation_run_id")
+    Incrementally builds the VAD trajectory from EMOTION_STATE_UPDATED events.
 
+    Streaming form of `analyze_emotional_trajectory`: the agent and simulation run
+    filters are applied as entries arrive, trajectory points are extracted immediately,
+    and `finalize` computes the summary statistics for the entries seen so far.
+    """
+    name = "emotional_state_trajectory"
+    event_types = frozenset({"EMOTION_STATE_UPDATED"})
+
+    def __init__(self, target_agent_id: str = None, target_simulation_run_id: str = None):
+        self.target_agent_id = target_agent_id
+        self.target_simulation_run_id = target_simulation_run_id
+        self._trajectory = []
+        # Unique ids seen in relevant logs, used for reporting when no target is specified
+        self._agent_ids = set()
+        self._sim_ids = set()
+
+    def process_entry(self, log_entry: dict) -> None:
+        """Adds a trajectory point if `log_entry` is a matching EMOTION_STATE_UPDATED event."""
+        if log_entry.get("event_type") != "EMOTION_STATE_UPDATED":
+            return
+        # Filter by target_agent_id if provided
+        if self.target_agent_id and log_entry.get("agent_id") != self.target_agent_id:
+            return
+        # Filter by target_simulation_run_id if provided
+        if self.target_simulation_run_id and log_entry.get("simulation_run_id") != self.target_simulation_run_id:
+            return
+
+        if log_entry.get("agent_id"):
+            self._agent_ids.add(log_entry.get("agent_id"))
+        if log_entry.get("simulation_run_id"):
+            self._sim_ids.add(log_entry.get("simulation_run_id"))
+
+        # Extract VAD data and timestamps
+        timestamp = log_entry.get("timestamp")
+        current_vad = log_entry.get("event_data", {}).get("current_vad")
         if timestamp is not None and current_vad is not None:
             valence = current_vad.get("valence")
             arousal = current_vad.get("arousal")
             dominance = current_vad.get("dominance")
             if None not in [valence, arousal, dominance]:
-                trajectory.append({
+                self._trajectory.append({
                     "timestamp": timestamp,
                     "valence": valence,
                     "arousal": arousal,
                     "dominance": dominance
                 })
 
-    # Calculate summary statistics
-    summary_stats = {
-        "avg_valence": 0.0, "std_valence": 0.0,
-        "avg_arousal": 0.0, "std_arousal": 0.0,
-        "avg_dominance": 0.0, "std_dominance": 0.0,
-        "count": len(trajectory)
-    }
-
-    if trajectory:
-        valences = [t["valence"] for t in trajectory]
-        arousals = [t["arousal"] for t in trajectory]
-        dominances = [t["dominance"] for t in trajectory]
-
-        summary_stats["avg_valence"] = statistics.mean(valences) if valences else 0.0
-        summary_stats["std_valence"] = statistics.stdev(valences) if len(valences) > 1 else 0.0
-        summary_stats["avg_arousal"] = statistics.mean(arousals) if arousals else 0.0
-        summary_stats["std_arousal"] = statistics.stdev(arousals) if len(arousals) > 1 else 0.0
-        summary_stats["avg_dominance"] = statistics.mean(dominances) if dominances else 0.0
-        summary_stats["std_dominance"] = statistics.stdev(dominances) if len(dominances) > 1 else 0.0
-
-    return {
-        "agent_id": actual_agent_id_from_logs,
-        "simulation_run_id": actual_sim_id_from_logs,
-        "trajectory": trajectory,
-        "summary_stats": summary_stats
-    }
+    def finalize(self) -> dict:
+        """Returns the trajectory and VAD summary statistics for the relevant events seen so far."""
+        trajectory = list(self._trajectory)
+
+        # Determine unique agent_ids and sim_ids from the relevant logs if no target is specified
+        # This helps in more accurate reporting when analyzing across all agents/simulations
+        actual_agent_id_from_logs = self.target_agent_id
+        if not self.target_agent_id:
+            if len(self._agent_ids) == 1:
+                actual_agent_id_from_logs = next(iter(self._agent_ids))
+            elif len(self._agent_ids) > 1:
+                actual_agent_id_from_logs = "Multiple_Agents" # Or "N/A" or similar indicator
+
+        actual_sim_id_from_logs = self.target_simulation_run_id
+        if not self.target_simulation_run_id:
+            if len(self._sim_ids) == 1:
+                actual_sim_id_from_logs = next(iter(self._sim_ids))
+            elif len(self._sim_ids) > 1:
+                actual_sim_id_from_logs = "Multiple_Sim_Runs" # Or "N/A"
+
+        # Calculate summary statistics
+        summary_stats = {
+            "avg_valence": 0.0, "std_valence": 0.0,
+            "avg_arousal": 0.0, "std_arousal": 0.0,
+            "avg_dominance": 0.0, "std_dominance": 0.0,
+            "count": len(trajectory)
+        }
+
+        if trajectory:
+            valences = [t["valence"] for t in trajectory]
+            arousals = [t["arousal"] for t in trajectory]
+            dominances = [t["dominance"] for t in trajectory]
+
+            summary_stats["avg_valence"] = statistics.mean(valences) if valences else 0.0
+            summary_stats["std_valence"] = statistics.stdev(valences) if len(valences) > 1 else 0.0
+            summary_stats["avg_arousal"] = statistics.mean(arousals) if arousals else 0.0
+            summary_stats["std_arousal"] = statistics.stdev(arousals) if len(arousals) > 1 else 0.0
+            summary_stats["avg_dominance"] = statistics.mean(dominances) if dominances else 0.0
+            summary_stats["std_dominance"] = statistics.stdev(dominances) if len(dominances) > 1 else 0.0
+
+        return {
+            "agent_id": actual_agent_id_from_logs,
+            "simulation_run_id": actual_sim_id_from_logs,
+            "trajectory": trajectory,
+            "summary_stats": summary_stats
+        }
+
+def analyze_emotional_trajectory(parsed_logs: list, target_agent_id: str = None, target_simulation_run_id: str = None) -> dict:
+    """
+    Analyzes emotional state trajectory from parsed log data.
+    Filters logs for EMOTION_STATE_UPDATED events and optionally by agent_id and simulation_run_id.
+    Extracts timestamp and VAD values.
+    Calculates summary statistics for VAD values.
+    """
+    accumulator = EmotionalStateTrajectoryAccumulator(target_agent_id, target_simulation_run_id)
+    for log_entry in parsed_logs:
+        accumulator.process_entry(log_entry)
+    return accumulator.finalize()
 
 def generate_summary_report_emotional(analysis_results: dict):
     """
@@ -39,19 +39,21 @@ def load_and_parse_log_data_jsonl(log_file_path: str) -> list:
         return []
     return parsed_logs
 
-def analyze_emotional_trajectory(parsed_logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+class EmotionalTrajectoryAccumulator:
     """
-    Analyzes parsed log data to extract a chronological list of emotional states.
-
-    Args:
-        parsed_logs: A list of log entry dictionaries, sorted by timestamp.
+    Incrementally collects emotional state snapshots from EMOTION_STATE_UPDATED events.
 
-    Returns:
-        A list of dictionaries, where each dictionary represents an emotional state snapshot.
+    Streaming form of `analyze_emotional_trajectory`, used by the single-pass
+    `AnalysisPipeline` and by live log tailing.
     """
-    emotional_states_chronological: List[Dict[str, Any]] = []
+    name = "emotional_trajectory"
+    event_types = frozenset({"EMOTION_STATE_UPDATED"})
 
-    for entry in parsed_logs:
+    def __init__(self):
+        self._states: List[Dict[str, Any]] = []
+
+    def process_entry(self, entry: Dict[str, Any]) -> None:
+        """Appends a snapshot if `entry` is an EMOTION_STATE_UPDATED event with VAD data."""
         event_type = entry.get("event_type")
         event_data = entry.get("event_data", {})
         timestamp = entry.get("timestamp")
@@ -86,11 +88,28 @@ def analyze_emotional_trajectory(parsed_logs: List[Dict[str, Any]]) -> List[Dict
                     "discrete_emotion": discrete_emotion,
                     "intensity": intensity # Could be None
                 }
-                emotional_states_chronological.append(state_snapshot)
+                self._states.append(state_snapshot)
             else:
                 print(f"Warning: EMOTION_STATE_UPDATED event at {timestamp} missing VAD data in 'current_vad' or 'current_emotion_profile'. Entry: {event_data}")
 
-    return emotional_states_chronological
+    def finalize(self) -> List[Dict[str, Any]]:
+        """Returns the chronological list of emotional state snapshots seen so far."""
+        return list(self._states)
+
+def analyze_emotional_trajectory(parsed_logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Analyzes parsed log data to extract a chronological list of emotional states.
+
+    Args:
+        parsed_logs: A list of log entry dictionaries, sorted by timestamp.
+
+    Returns:
+        A list of dictionaries, where each dictionary represents an emotional state snapshot.
+    """
+    accumulator = EmotionalTrajectoryAccumulator()
+    for entry in parsed_logs:
+        accumulator.process_entry(entry)
+    return accumulator.finalize()
 
 def generate_emotional_trajectory_report(emotional_states_chronological: List[Dict[str, Any]]):
     """
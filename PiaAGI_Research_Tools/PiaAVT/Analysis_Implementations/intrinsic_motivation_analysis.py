@@ -3,7 +3,7 @@
 import json
 import os # Keep os for path operations if needed
 import argparse # Added for command-line arguments
-from collections import defaultdict
+from collections import ChainMap, OrderedDict, defaultdict
 
 def load_and_parse_log_data_jsonl(log_file_path: str) -> list:
     """
@@ -39,49 +39,90 @@ def load_and_parse_log_data_jsonl(log_file_path: str) -> list:
         return []
     return parsed_logs
 
+class IntrinsicMotivationAccumulator:
+    """
+    Incrementally collects the data needed for intrinsic motivation analysis.
+
+    Streaming form of `analyze_intrinsic_motivation`: intrinsic GOAL_CREATED events
+    and an event_id index (for tracing triggers) are built as entries arrive, and
+    `finalize` runs the per-goal analysis over what has been seen so far.
+
+    Events that an intrinsic goal names as its trigger are kept for good. With
+    `max_indexed_events` set (as when following a live log), the index of the other
+    events keeps only the most recent ones, so a trigger has to be among them when
+    its goal arrives; without it (the default) every event is indexed, as in a batch run.
+    """
+    name = "intrinsic_motivation"
+    # Trigger tracing needs an index over every event that carries an event_id.
+    event_types = None
+
+    def __init__(self, target_agent_id: str = None, target_simulation_run_id: str = None,
+                 max_indexed_events: int = None):
+        self.target_agent_id = target_agent_id
+        self.target_simulation_run_id = target_simulation_run_id
+        self.max_indexed_events = max_indexed_events
+        self._intrinsic_goal_events = []
+        # Store logs in a way that's easy to search by event_id for trigger/impact tracing
+        self._events_by_id = OrderedDict() # Oldest first, for eviction
+        self._trigger_events = {} # Events referenced by an intrinsic goal's source_trigger_event_id
+
+    def process_entry(self, log: dict) -> None:
+        """Indexes `log` by event_id and keeps it if it creates an intrinsic goal."""
+        # Filter by simulation_run_id if provided
+        if self.target_simulation_run_id and log.get("simulation_run_id") != self.target_simulation_run_id:
+            return
+        event_id = log.get("event_id")
+        if event_id:
+            if event_id in self._trigger_events:
+                self._trigger_events[event_id] = log # A later event with the same id replaces it, as in the index
+            else:
+                self._index_event(event_id, log)
+
+        # Filter by agent_id if provided (for GOAL_CREATED events, agent_id is who created the goal)
+        # Triggers and impacts might involve other agents or be system events, so they are not filtered.
+        if self.target_agent_id and log.get("agent_id") != self.target_agent_id:
+            return
+        if log.get("event_type") == "GOAL_CREATED" and log.get("event_data", {}).get("type", "").startswith("INTRINSIC_"):
+            self._intrinsic_goal_events.append(log)
+            trigger_id = log.get("event_data", {}).get("source_trigger_event_id")
+            if trigger_id and trigger_id not in self._trigger_events:
+                self._trigger_events[trigger_id] = self._events_by_id.pop(trigger_id, None)
+
+    def _index_event(self, event_id, log: dict) -> None:
+        self._events_by_id[event_id] = log
+        if self.max_indexed_events is not None:
+            self._events_by_id.move_to_end(event_id)
+            while len(self._events_by_id) > self.max_indexed_events:
+                self._events_by_id.popitem(last=False)
+
+    def finalize(self) -> dict:
+        """Returns the intrinsic motivation analysis for the entries seen so far."""
+        intrinsic_goal_events = sorted(self._intrinsic_goal_events, key=lambda x: x.get("timestamp"))
+        seen_triggers = {event_id: log for event_id, log in self._trigger_events.items() if log is not None}
+        return _analyze_intrinsic_goal_events(
+            intrinsic_goal_events,
+            ChainMap(seen_triggers, self._events_by_id),
+            self.target_agent_id,
+            self.target_simulation_run_id
+        )
+
 def analyze_intrinsic_motivation(parsed_logs: list, target_agent_id: str = None, target_simulation_run_id: str = None) -> dict:
     """
     Analyzes intrinsic motivation dynamics from parsed log data. (Conceptual Outline)
     Filters for GOAL_CREATED events of intrinsic types.
     Conceptually outlines tracing triggers and impacts of these goals.
     """
-    # -------------------------------------------------------------------------
-    # 1. Pre-filtering and Data Preparation
-    # -------------------------------------------------------------------------
-    logs_to_process = list(parsed_logs) # Work on a copy
-
-    # Filter by simulation_run_id if provided
-    if target_simulation_run_id:
-        logs_to_process = [log for log in logs_to_process if log.get("simulation_run_id") == target_simulation_run_id]
-
-    # Filter by agent_id if provided (for GOAL_CREATED events, agent_id is who created the goal)
-    # For other events (triggers, impacts), agent_id might refer to the acting agent.
-    if target_agent_id:
-        # This initial filter might be too broad for triggers/impacts not directly on target_agent,
-        # but helps scope down GOAL_CREATED events. Refined filtering might be needed later.
-        agent_specific_logs = [log for log in logs_to_process if log.get("agent_id") == target_agent_id]
-        # However, triggers and impacts might involve other agents or be system events.
-        # So, for now, we will primarily use target_agent_id for filtering GOAL_CREATED.
-    else:
-        agent_specific_logs = logs_to_process
-
-
-    intrinsic_goal_events = sorted(
-        [
-            log for log in (agent_specific_logs if target_agent_id else logs_to_process)
-            if log.get("event_type") == "GOAL_CREATED"
-            and log.get("event_data", {}).get("type", "").startswith("INTRINSIC_")
-        ],
-        key=lambda x: x.get("timestamp")
-    )
-
-    # Store all logs in a way that's easy to search by event_id or timestamp for trigger/impact tracing
-    # This is a simplified approach; a more robust system might use a database or indexed structure.
-    events_by_id = {log.get("event_id"): log for log in logs_to_process if log.get("event_id")}
-    # Sort all logs by timestamp for temporal proximity searches
-    all_logs_sorted_by_time = sorted(logs_to_process, key=lambda x: x.get("timestamp", 0.0) or 0.0)
-
+    accumulator = IntrinsicMotivationAccumulator(target_agent_id, target_simulation_run_id)
+    for log in parsed_logs:
+        accumulator.process_entry(log)
+    return accumulator.finalize()
 
+def _analyze_intrinsic_goal_events(intrinsic_goal_events: list, events_by_id: dict,
+                                   target_agent_id: str = None, target_simulation_run_id: str = None) -> dict:
+    """
+    Traces triggers and impacts for a timestamp-sorted list of intrinsic GOAL_CREATED events.
+    `events_by_id` maps event_id to log entry for all (simulation-filtered) events.
+    """
     analyzed_goals = []
     # Conceptual summary statistics
     total_intrinsic_goals = 0
@@ -198,7 +239,7 @@ def analyze_intrinsic_motivation(parsed_logs: list, target_agent_id: str = None,
     report_sim_id_header = target_simulation_run_id
     if not target_simulation_run_id:
         # Try to infer if all logs/goals belong to a single simulation
-        sim_ids_in_goals = set(ig["creation_timestamp"] and ig_event.get("simulation_run_id") for ig_event in intrinsic_goal_events) # Re-extract from original events
+        sim_ids_in_goals = set(ig_event.get("simulation_run_id") for ig_event in intrinsic_goal_events) # Re-extract from original events
         if len(sim_ids_in_goals) == 1:
             report_sim_id_header = sim_ids_in_goals.pop() if sim_ids_in_goals else "ALL_SIMULATIONS (None found)"
         elif not sim_ids_in_goals:
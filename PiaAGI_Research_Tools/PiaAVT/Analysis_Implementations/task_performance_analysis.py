@@ -32,33 +32,34 @@ def load_and_parse_log_data_jsonl(log_file_path: str) -> list:
         return []
     return parsed_logs
 
-def analyze_task_performance(parsed_logs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+class TaskPerformanceAccumulator:
     """
-    Analyzes parsed log data to reconstruct task performance metrics.
-    Tasks are primarily identified via GOAL_CREATED and GOAL_STATUS_CHANGED events.
+    Incrementally reconstructs task performance metrics, one log entry at a time.
 
-    Args:
-        parsed_logs: A list of log entry dictionaries, sorted by timestamp.
-
-    Returns:
-        A dictionary where keys are task_ids (goal_ids) and values are dictionaries
-        containing performance information for each task.
+    Streaming form of `analyze_task_performance`, used by the single-pass
+    `AnalysisPipeline` and by live log tailing. `finalize` may be called repeatedly.
     """
-    tasks_data = defaultdict(lambda: {
-        "resources_consumed_conceptual": 0.0, # Initialize conceptual resource consumption
-        "event_history": [] # To store relevant events for a task
-    })
-
-    for entry in parsed_logs:
+    name = "task_performance"
+    # Any event carrying a goal_id is recorded in that task's event history.
+    event_types = None
+
+    def __init__(self):
+        self._tasks_data = defaultdict(lambda: {
+            "resources_consumed_conceptual": 0.0, # Initialize conceptual resource consumption
+            "event_history": [] # To store relevant events for a task
+        })
+
+    def process_entry(self, entry: Dict[str, Any]) -> None:
+        """Updates the task referenced by `entry`, if any."""
         event_type = entry.get("event_type")
         event_data = entry.get("event_data", {})
         timestamp = entry.get("timestamp")
         task_id = event_data.get("goal_id") # Assuming goal_id serves as task_id
 
         if not task_id or timestamp is None:
-            continue
+            return
 
-        task = tasks_data[task_id]
+        task = self._tasks_data[task_id]
         task["event_history"].append(entry) # Keep a log of all events for this task_id
 
         if event_type == "GOAL_CREATED":
@@ -104,26 +105,44 @@ def analyze_task_performance(parsed_logs: List[Dict[str, Any]]) -> Dict[str, Dic
                 cost = action_details.get("cost", 0.0) # Example field
                 resources_consumed = action_details.get("resources_consumed", 0.0) # Example field
                 task["resources_consumed_conceptual"] += cost + resources_consumed
-    
-    # Post-processing to determine outcome string
-    for task_id, data in tasks_data.items():
-        if "final_status" in data:
-            if data["final_status"] == "ACHIEVED":
-                data["outcome"] = "SUCCESS"
-            else:
-                data["outcome"] = "FAILURE" # Includes FAILED, ABANDONED, INVALIDATED etc.
-        elif data.get("start_time") and "end_time" not in data : # Started but not finished
-             data["outcome"] = "IN_PROGRESS_OR_UNKNOWN" # Task might still be active or logging ended
-        else: # Not started or no terminal status
-            data["outcome"] = "UNKNOWN_OR_NOT_STARTED"
 
-        # Ensure essential fields exist for all tasks that had at least one event
-        data.setdefault("task_id", task_id)
-        data.setdefault("description", "N/A - No GOAL_CREATED event or description missing")
-        data.setdefault("task_type", "UNKNOWN")
+    def finalize(self) -> Dict[str, Dict[str, Any]]:
+        """Derives task outcomes and returns the per-task performance dictionary."""
+        # Post-processing to determine outcome string
+        for task_id, data in self._tasks_data.items():
+            if "final_status" in data:
+                if data["final_status"] == "ACHIEVED":
+                    data["outcome"] = "SUCCESS"
+                else:
+                    data["outcome"] = "FAILURE" # Includes FAILED, ABANDONED, INVALIDATED etc.
+            elif data.get("start_time") and "end_time" not in data : # Started but not finished
+                 data["outcome"] = "IN_PROGRESS_OR_UNKNOWN" # Task might still be active or logging ended
+            else: # Not started or no terminal status
+                data["outcome"] = "UNKNOWN_OR_NOT_STARTED"
+
+            # Ensure essential fields exist for all tasks that had at least one event
+            data.setdefault("task_id", task_id)
+            data.setdefault("description", "N/A - No GOAL_CREATED event or description missing")
+            data.setdefault("task_type", "UNKNOWN")
+
+        return dict(self._tasks_data)
 
+def analyze_task_performance(parsed_logs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyzes parsed log data to reconstruct task performance metrics.
+    Tasks are primarily identified via GOAL_CREATED and GOAL_STATUS_CHANGED events.
 
-    return dict(tasks_data)
+    Args:
+        parsed_logs: A list of log entry dictionaries, sorted by timestamp.
+
+    Returns:
+        A dictionary where keys are task_ids (goal_ids) and values are dictionaries
+        containing performance information for each task.
+    """
+    accumulator = TaskPerformanceAccumulator()
+    for entry in parsed_logs:
+        accumulator.process_entry(entry)
+    return accumulator.finalize()
 
 
 def generate_task_performance_report(tasks_data: Dict[str, Dict[str, Any]]):
@@ -378,5 +378,3 @@ if __name__ == "__main__":
     print(f"\n--- Filtered Value Counts (between {start_dt} and {end_dt}) ---")
     filtered_source_counts = analyzer.count_unique_values("source", start_time=start_dt, end_time=end_dt)
     print(f"Filtered Source counts: {filtered_source_counts}")
-
-```
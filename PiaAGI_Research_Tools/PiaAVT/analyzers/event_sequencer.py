@@ -1,8 +1,13 @@
 # PiaAGI_Hub/PiaAVT/analyzers/event_sequencer.py
 
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterator
 from datetime import datetime, timedelta
 
+try:
+    from .sequence_matcher import CompiledSequenceMatcher, SequenceMatch, SequencePattern
+except ImportError: # Allows running this module directly as a script
+    from sequence_matcher import CompiledSequenceMatcher, SequenceMatch, SequencePattern
+
 # Assuming LogEntry and DEFAULT_TIMESTAMP_FORMAT are defined consistently
 # (e.g., in core.logging_system or a shared types module)
 # For now, redefine locally for modularity or assume they will be imported via API
@@ -56,6 +61,14 @@ class EventSequencer:
 
         return sorted(logs, key=get_timestamp_key)
 
+    def _sorted_logs_with_timestamps(self) -> List[Tuple[Optional[datetime], LogEntry]]:
+        """
+        Returns `(parsed_timestamp, entry)` pairs sorted by timestamp, parsing each
+        timestamp only once. Entries with missing or invalid timestamps sort first.
+        """
+        pairs = [(self._parse_timestamp(entry.get("timestamp")), entry) for entry in self.log_data]
+        pairs.sort(key=lambda pair: pair[0] or datetime.min)
+        return pairs
 
     def extract_event_sequences(
         self,
@@ -67,6 +80,10 @@ class EventSequencer:
         """
         Extracts sequences of log entries that match a defined pattern of events.
 
+        The logs are sorted and their timestamps parsed once, then streamed through a
+        `CompiledSequenceMatcher`, so each entry is only compared against the partial
+        sequences that are waiting for it.
+
         Args:
             sequence_definition (List[Dict[str, Optional[str]]]):
                 A list of dictionaries, where each dictionary defines a step in the sequence.
@@ -90,92 +107,94 @@ class EventSequencer:
 
         Returns:
             List[List[LogEntry]]: A list of found sequences. Each sequence is a list
-                                  of the LogEntry objects that form it.
+                                  of the LogEntry objects that form it, ordered by
+                                  the position of its first step.
         """
         if not sequence_definition:
             return []
 
-        sorted_logs = self._sort_logs_by_timestamp(list(self.log_data)) # Work with a sorted copy
-
-        found_sequences: List[List[LogEntry]] = []
-        num_logs = len(sorted_logs)
-        seq_def_len = len(sequence_definition)
-
-        for i in range(num_logs):
-            current_match_attempt: List[LogEntry] = []
-            current_seq_def_idx = 0
-            last_matched_log_original_idx = i # Index in sorted_logs for the start of this attempt
-
-            # Try to match the first step
-            log_entry_i = sorted_logs[i]
-            step_def_i = sequence_definition[current_seq_def_idx]
-
-            match_i = True
-            if step_def_i.get("event_type") and log_entry_i.get("event_type") != step_def_i["event_type"]:
-                match_i = False
-            if step_def_i.get("source") and log_entry_i.get("source") != step_def_i["source"]:
-                match_i = False
-
-            if not match_i:
-                continue # This log cannot start a sequence
-
-            current_match_attempt.append(log_entry_i)
-            current_seq_def_idx += 1
-
-            if current_seq_def_idx == seq_def_len: # Sequence of length 1 found
-                found_sequences.append(list(current_match_attempt))
-                continue
-
-            # Try to match subsequent steps
-            last_event_ts_for_window = self._parse_timestamp(log_entry_i.get("timestamp", ""))
-
-            for j in range(i + 1, num_logs):
-                log_entry_j = sorted_logs[j]
-
-                # Constraint: Max intervening logs
-                # This counts logs between `last_matched_log_original_idx` and `j`
-                if max_intervening_logs is not None and (j - last_matched_log_original_idx - 1) > max_intervening_logs:
-                    # This sequence attempt is broken because too many logs came between matched steps
-                    break
-
-                # Constraint: Max time between steps
-                current_event_ts_for_window = self._parse_timestamp(log_entry_j.get("timestamp", ""))
-                if max_time_between_steps_seconds is not None and last_event_ts_for_window and current_event_ts_for_window:
-                    if (current_event_ts_for_window - last_event_ts_for_window).total_seconds() > max_time_between_steps_seconds:
-                        # This sequence attempt is broken
-                        break
-
-                # Check if log_entry_j matches sequence_definition[current_seq_def_idx]
-                step_def_j = sequence_definition[current_seq_def_idx]
-                match_j = True
-                if step_def_j.get("event_type") and log_entry_j.get("event_type") != step_def_j["event_type"]:
-                    match_j = False
-                if step_def_j.get("source") and log_entry_j.get("source") != step_def_j["source"]:
-                    match_j = False
-
-                if match_j:
-                    # `allow_repeats_in_definition` check:
-                    # If this definition is same as previous, and this log is same as previous in `current_match_attempt`
-                    if not allow_repeats_in_definition and current_seq_def_idx > 0:
-                        prev_step_def_in_seq = sequence_definition[current_seq_def_idx - 1]
-                        if step_def_j == prev_step_def_in_seq and log_entry_j == current_match_attempt[-1]:
-                            # This log already fulfilled an identical previous step definition.
-                            # To truly allow a single log to match multiple identical consecutive definitions,
-                            # the logic would need to not advance `j` or use a more complex state.
-                            # This simple check prevents one log instance being used for two identical steps back-to-back.
-                            continue # Skip this log for this step, try next log for current step_def_j
-
-                    current_match_attempt.append(log_entry_j)
-                    current_seq_def_idx += 1
-                    last_matched_log_original_idx = j # Update for intervening log check
-                    last_event_ts_for_window = current_event_ts_for_window # Update for time window check
-
-                    if current_seq_def_idx == seq_def_len: # Full sequence matched
-                        found_sequences.append(list(current_match_attempt))
-                        break # Break from inner loop (j), start new search from i+1
-            # End of inner loop (j)
-        # End of outer loop (i)
-        return found_sequences
+        pattern = SequencePattern(
+            "sequence",
+            sequence_definition,
+            max_time_between_steps_seconds=max_time_between_steps_seconds,
+            max_intervening_logs=max_intervening_logs,
+            allow_repeats_in_definition=allow_repeats_in_definition,
+        )
+        matcher = CompiledSequenceMatcher([pattern])
+        matches = list(matcher.match_timestamped_stream(self._sorted_logs_with_timestamps()))
+        # Report sequences in order of their first step, as a start-by-start scan would.
+        matches.sort(key=lambda match: match.start_index)
+        return [match.entries for match in matches]
+
+    def iter_sequence_matches(
+        self,
+        sequence_definitions: Dict[str, List[Dict[str, Optional[str]]]],
+        max_time_between_steps_seconds: Optional[float] = None,
+        max_intervening_logs: Optional[int] = None,
+        allow_repeats_in_definition: bool = False
+    ) -> Iterator[SequenceMatch]:
+        """
+        Matches several sequence definitions simultaneously in one pass over the logs.
+
+        The logs are sorted by timestamp once and streamed through a
+        `CompiledSequenceMatcher`; matches are yielded as soon as they complete.
+
+        Args:
+            sequence_definitions (Dict[str, List[Dict[str, Optional[str]]]]):
+                Mapping of pattern name to sequence definition (same format as
+                `extract_event_sequences`). Empty definitions are ignored.
+            max_time_between_steps_seconds (Optional[float]): Applied to every pattern.
+            max_intervening_logs (Optional[int]): Applied to every pattern.
+            allow_repeats_in_definition (bool): Applied to every pattern.
+
+        Yields:
+            SequenceMatch: `(pattern_name, start_index, entries)` for each found sequence,
+                           in completion order.
+        """
+        patterns = [
+            SequencePattern(
+                name,
+                definition,
+                max_time_between_steps_seconds=max_time_between_steps_seconds,
+                max_intervening_logs=max_intervening_logs,
+                allow_repeats_in_definition=allow_repeats_in_definition,
+            )
+            for name, definition in sequence_definitions.items() if definition
+        ]
+        if not patterns:
+            return
+        matcher = CompiledSequenceMatcher(patterns)
+        yield from matcher.match_timestamped_stream(self._sorted_logs_with_timestamps())
+
+    def extract_multiple_event_sequences(
+        self,
+        sequence_definitions: Dict[str, List[Dict[str, Optional[str]]]],
+        max_time_between_steps_seconds: Optional[float] = None,
+        max_intervening_logs: Optional[int] = None,
+        allow_repeats_in_definition: bool = False
+    ) -> Dict[str, List[List[LogEntry]]]:
+        """
+        Extracts sequences for several definitions at once.
+
+        Equivalent to calling `extract_event_sequences` for each definition, but the
+        logs are sorted and scanned only once for all of them.
+
+        Returns:
+            Dict[str, List[List[LogEntry]]]: Found sequences per pattern name, each list
+                                             ordered by the position of the first step.
+        """
+        results: Dict[str, List[SequenceMatch]] = {name: [] for name in sequence_definitions}
+        for match in self.iter_sequence_matches(
+            sequence_definitions,
+            max_time_between_steps_seconds,
+            max_intervening_logs,
+            allow_repeats_in_definition
+        ):
+            results[match.pattern_name].append(match)
+        return {
+            name: [match.entries for match in sorted(matches, key=lambda match: match.start_index)]
+            for name, matches in results.items()
+        }
 
     def format_sequences_for_display(self, sequences: List[List[LogEntry]]) -> str:
         """
@@ -283,5 +302,3 @@ if __name__ == "__main__":
     sequences6 = sequencer.extract_event_sequences(defined_sequence_not_present)
     print(sequencer.format_sequences_for_display(sequences6))
     # Expected: "No event sequences found."
-
-```
@@ -0,0 +1,161 @@
+# PiaAGI_Hub/PiaAVT/analyzers/running_stats.py
+"""
+Constant-memory descriptive statistics that are updated one log entry at a time.
+
+`BasicAnalyzer.get_descriptive_stats` recomputes its statistics from the full list of
+entries on every call. `RunningFieldStats` keeps count, sum, min, max and a Welford
+running mean/variance instead, so statistics over a log that is being tailed can be
+refreshed without revisiting earlier entries. Partial statistics computed
+independently (e.g. one per log file in a worker process) can be combined with
+`merge`.
+"""
+
+import math
+from collections import Counter
+from typing import List, Dict, Any, Optional, Union
+
+LogEntry = Dict[str, Any] # Should match the definition in core.logging_system
+
+
+class RunningFieldStats:
+    """
+    Running statistics for one numeric field of the log entries' 'data' dictionary.
+
+    Args:
+        data_field_path (Union[str, List[str]]): Key or path of keys to the numeric field
+            within each entry's 'data' dictionary (same as `BasicAnalyzer.get_descriptive_stats`).
+        source (Optional[str]): Only count entries with this source.
+        event_type (Optional[str]): Only count entries with this event type.
+    """
+
+    def __init__(self,
+                 data_field_path: Union[str, List[str]],
+                 source: Optional[str] = None,
+                 event_type: Optional[str] = None):
+        self.data_field_path = data_field_path
+        self._path: List[str] = [data_field_path] if isinstance(data_field_path, str) else list(data_field_path)
+        self.source = source
+        self.event_type = event_type
+        self.count = 0
+        self.sum: Union[int, float] = 0
+        self.min: Optional[Union[int, float]] = None
+        self.max: Optional[Union[int, float]] = None
+        self._mean = 0.0
+        self._m2 = 0.0 # Sum of squared deviations from the running mean
+
+    def update(self, entry: LogEntry) -> bool:
+        """
+        Folds one log entry into the statistics.
+
+        Returns:
+            bool: True if the entry passed the filters and contained a numeric value.
+        """
+        if self.source is not None and entry.get("source") != self.source:
+            return False
+        if self.event_type is not None and entry.get("event_type") != self.event_type:
+            return False
+
+        current_val = entry.get("data", {})
+        try:
+            for key in self._path:
+                current_val = current_val[key]
+        except (KeyError, TypeError, IndexError):
+            return False
+        if not isinstance(current_val, (int, float)):
+            return False
+
+        self.count += 1
+        self.sum += current_val
+        if self.min is None or current_val < self.min:
+            self.min = current_val
+        if self.max is None or current_val > self.max:
+            self.max = current_val
+        delta = current_val - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (current_val - self._mean)
+        return True
+
+    def merge(self, other: "RunningFieldStats") -> "RunningFieldStats":
+        """
+        Folds the statistics of `other` (computed over a disjoint set of entries) into this one.
+
+        Uses the pairwise update of Chan et al., so the merged mean and variance equal those
+        of a single pass over both sets of entries.
+
+        Returns:
+            RunningFieldStats: self, to allow chaining.
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.sum, self.min, self.max = other.count, other.sum, other.min, other.max
+            self._mean, self._m2 = other._mean, other._m2
+            return self
+        total = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def get_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the statistics of the values seen so far.
+
+        Returns:
+            Optional[Dict[str, Any]]: Keys "count", "mean", "min", "max", "stdev" (sample
+                                      standard deviation, 0.0 if count < 2) and "sum", or
+                                      None if no value has been seen. The median is not
+                                      available in constant memory and is omitted.
+        """
+        if self.count == 0:
+            return None
+        return {
+            "count": self.count,
+            "mean": self._mean,
+            "min": self.min,
+            "max": self.max,
+            "stdev": math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0,
+            "sum": self.sum,
+        }
+
+
+class RunningEventCounts:
+    """
+    Running count of log entries per event type (and in total).
+
+    Args:
+        source (Optional[str]): Only count entries with this source.
+    """
+
+    def __init__(self, source: Optional[str] = None):
+        self.source = source
+        self.total = 0
+        self._counts: Counter = Counter()
+
+    def update(self, entry: LogEntry) -> bool:
+        """Counts one log entry. Returns True if it passed the source filter."""
+        if self.source is not None and entry.get("source") != self.source:
+            return False
+        self.total += 1
+        self._counts[entry.get("event_type")] += 1
+        return True
+
+    def merge(self, other: "RunningEventCounts") -> "RunningEventCounts":
+        """Adds the counts of `other` to this one and returns self."""
+        self.total += other.total
+        self._counts.update(other._counts)
+        return self
+
+    def get_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns:
+            Optional[Dict[str, Any]]: {"total": int, "by_event_type": {event_type: count}}
+                                      (most common first), or None if nothing was counted.
+        """
+        if self.total == 0:
+            return None
+        return {"total": self.total, "by_event_type": dict(self._counts.most_common())}
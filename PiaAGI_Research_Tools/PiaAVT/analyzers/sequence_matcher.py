@@ -0,0 +1,310 @@
+# PiaAGI_Hub/PiaAVT/analyzers/sequence_matcher.py
+"""
+Compiled, single-pass matching of event-sequence patterns over PiaAVT log streams.
+
+`EventSequencer.extract_event_sequences` originally restarted a forward scan from
+every log index, which is quadratic in the log length for each pattern. This module
+compiles one or more sequence definitions into a small automaton:
+
+- Every step of every pattern is indexed by its `(event_type, source)` key, so an
+  incoming log entry is only routed to the partial matches that are waiting for it.
+- Partial matches waiting on the same step live in a FIFO queue ordered by the
+  position of their last matched entry. Because the time and intervening-log
+  constraints only ever become stricter as the stream advances, expired partial
+  matches always sit at the front of their queue and are pruned cheaply.
+- Timestamps are parsed once per entry, not once per (start, entry) pair.
+
+The matcher is fed one entry at a time (`feed`) or a whole iterable (`match_stream`)
+and emits `SequenceMatch` results as soon as the final step of a pattern is seen.
+Entries are expected to arrive in timestamp order.
+"""
+
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, NamedTuple, Deque
+
+LogEntry = Dict[str, Any] # Should match the definition in core.logging_system
+DEFAULT_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ" # Should match the definition in core.logging_system
+
+StepKey = Tuple[Optional[str], Optional[str]]
+
+
+def parse_log_timestamp(timestamp: Any) -> Optional[datetime]:
+    """
+    Parses a log timestamp, returning None if it is missing or malformed. Both PiaAVT's
+    ISO strings and the float epoch seconds that PiaSE's loggers write (`wall_time`) are
+    accepted; either becomes a naive UTC datetime, so the two compare with each other.
+    """
+    if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+        try:
+            return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+        except (ValueError, OverflowError, OSError):
+            return None
+    try:
+        return datetime.strptime(timestamp, DEFAULT_TIMESTAMP_FORMAT)
+    except (ValueError, TypeError):
+        return None
+
+
+class SequenceMatch(NamedTuple):
+    """
+    A completed sequence match.
+
+    Attributes:
+        pattern_name (str): Name of the pattern that matched.
+        start_index (int): Stream position of the entry that matched the first step.
+        entries (List[LogEntry]): The log entries forming the sequence, in step order.
+    """
+    pattern_name: str
+    start_index: int
+    entries: List[LogEntry]
+
+
+class SequencePattern:
+    """
+    A named sequence definition together with its matching constraints.
+
+    Args:
+        name (str): Identifier reported in `SequenceMatch.pattern_name`.
+        steps (List[Dict[str, Optional[str]]]): Step definitions, each with an optional
+            'event_type' and optional 'source'. A missing or empty value matches anything.
+        max_time_between_steps_seconds (Optional[float]): Maximum time allowed between
+            the timestamps of consecutive matched entries.
+        max_intervening_logs (Optional[int]): Maximum number of other entries allowed
+            between consecutive matched entries.
+        allow_repeats_in_definition (bool): If False, an entry identical to the previously
+            matched entry cannot satisfy a step whose definition repeats the previous step.
+            Same semantics as `EventSequencer.extract_event_sequences`.
+
+    Raises:
+        ValueError: If `steps` is empty or contains non-dictionary items.
+    """
+
+    def __init__(self,
+                 name: str,
+                 steps: List[Dict[str, Optional[str]]],
+                 max_time_between_steps_seconds: Optional[float] = None,
+                 max_intervening_logs: Optional[int] = None,
+                 allow_repeats_in_definition: bool = False):
+        if not steps:
+            raise ValueError(f"Sequence pattern '{name}' must define at least one step.")
+        if not all(isinstance(step, dict) for step in steps):
+            raise ValueError(f"All steps of sequence pattern '{name}' must be dictionaries.")
+
+        self.name = name
+        self.steps = list(steps)
+        self.max_time_between_steps_seconds = max_time_between_steps_seconds
+        self.max_intervening_logs = max_intervening_logs
+        self.allow_repeats_in_definition = allow_repeats_in_definition
+
+        # Precomputed per-step data used on the hot path
+        self.step_keys: List[StepKey] = [
+            (step.get("event_type") or None, step.get("source") or None) for step in self.steps
+        ]
+        self.repeats_previous_step: List[bool] = [
+            i > 0 and self.steps[i] == self.steps[i - 1] for i in range(len(self.steps))
+        ]
+        self._max_gap: Optional[timedelta] = (
+            timedelta(seconds=max_time_between_steps_seconds)
+            if max_time_between_steps_seconds is not None else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def is_expired(self, partial: "_PartialMatch", position: int, timestamp: Optional[datetime]) -> bool:
+        """Returns True if `partial` can no longer be extended by an entry at `position`/`timestamp`."""
+        if self.max_intervening_logs is not None and position - partial.last_index - 1 > self.max_intervening_logs:
+            return True
+        if self._max_gap is not None and timestamp is not None and partial.last_timestamp is not None:
+            if timestamp - partial.last_timestamp > self._max_gap:
+                return True
+        return False
+
+
+class _PartialMatch:
+    """A sequence attempt that has matched a prefix of its pattern."""
+    __slots__ = ("start_index", "last_index", "last_timestamp", "entries")
+
+    def __init__(self, start_index: int, timestamp: Optional[datetime], entry: LogEntry):
+        self.start_index = start_index
+        self.last_index = start_index
+        self.last_timestamp = timestamp
+        self.entries: List[LogEntry] = [entry]
+
+
+class CompiledSequenceMatcher:
+    """
+    Matches many sequence patterns simultaneously in a single pass over a log stream.
+
+    The matcher keeps state between calls to `feed`, so it can be driven incrementally
+    (e.g. while tailing a growing log file) or run over a complete list of entries with
+    `match_stream`. Patterns can be added at any time; new patterns only see entries
+    fed after they were added.
+
+    Semantics per pattern are the same as `EventSequencer.extract_event_sequences`:
+    every entry matching the first step starts a new attempt, and each attempt greedily
+    takes the earliest following entry that matches its next step while honouring the
+    pattern's constraints. Each attempt yields at most one match.
+
+    Args:
+        patterns (Optional[Iterable[SequencePattern]]): Initial patterns to compile.
+        max_partial_matches_per_step (Optional[int]): If set, bounds the number of pending
+            attempts kept for each (pattern, step); the oldest attempts are dropped first.
+            Useful for unconstrained patterns over unbounded streams.
+        prune_interval (int): Every `prune_interval` entries, all queues are swept for
+            expired attempts, including queues that received no recent matching entries.
+    """
+
+    def __init__(self,
+                 patterns: Optional[Iterable[SequencePattern]] = None,
+                 max_partial_matches_per_step: Optional[int] = None,
+                 prune_interval: int = 1024):
+        if prune_interval < 1:
+            raise ValueError("prune_interval must be a positive integer.")
+        self.max_partial_matches_per_step = max_partial_matches_per_step
+        self.prune_interval = prune_interval
+
+        self._patterns: List[SequencePattern] = []
+        # (event_type, source) -> pattern indices whose first step has that key
+        self._start_index: Dict[StepKey, List[int]] = {}
+        # (event_type, source) -> (pattern index, step index) for steps >= 1
+        self._step_index: Dict[StepKey, List[Tuple[int, int]]] = {}
+        # (pattern index, step index) -> attempts waiting for that step
+        self._waiting: Dict[Tuple[int, int], Deque[_PartialMatch]] = {}
+        self._position = 0
+
+        for pattern in patterns or ():
+            self.add_pattern(pattern)
+
+    @property
+    def patterns(self) -> List[SequencePattern]:
+        """The compiled patterns, in registration order."""
+        return list(self._patterns)
+
+    @property
+    def position(self) -> int:
+        """Number of entries fed so far (the stream position of the next entry)."""
+        return self._position
+
+    def pending_count(self) -> int:
+        """Returns the number of partial matches currently held in memory."""
+        return sum(len(queue) for queue in self._waiting.values())
+
+    def add_pattern(self, pattern: SequencePattern) -> None:
+        """
+        Compiles a pattern into the matcher's dispatch indexes.
+
+        Raises:
+            ValueError: If a pattern with the same name is already registered.
+        """
+        if any(existing.name == pattern.name for existing in self._patterns):
+            raise ValueError(f"A sequence pattern named '{pattern.name}' is already registered.")
+        pattern_idx = len(self._patterns)
+        self._patterns.append(pattern)
+
+        self._start_index.setdefault(pattern.step_keys[0], []).append(pattern_idx)
+        for step_idx in range(1, len(pattern)):
+            self._step_index.setdefault(pattern.step_keys[step_idx], []).append((pattern_idx, step_idx))
+            self._waiting[(pattern_idx, step_idx)] = self._new_queue()
+
+    def reset(self) -> None:
+        """Discards all pending partial matches and resets the stream position."""
+        for key in self._waiting:
+            self._waiting[key] = self._new_queue()
+        self._position = 0
+
+    def feed(self, entry: LogEntry, timestamp: Optional[datetime] = None) -> List[SequenceMatch]:
+        """
+        Advances the automaton by one log entry.
+
+        Args:
+            entry (LogEntry): The next entry of the stream.
+            timestamp (Optional[datetime]): The entry's parsed timestamp. If None, it is
+                parsed from `entry['timestamp']`.
+
+        Returns:
+            List[SequenceMatch]: Matches completed by this entry, ordered by start index.
+        """
+        position = self._position
+        self._position += 1
+        if timestamp is None:
+            timestamp = parse_log_timestamp(entry.get("timestamp"))
+
+        event_type = entry.get("event_type")
+        source = entry.get("source")
+        candidate_keys = dict.fromkeys(((event_type, source), (event_type, None), (None, source), (None, None)))
+
+        completed: List[SequenceMatch] = []
+        advanced: List[Tuple[Tuple[int, int], _PartialMatch]] = []
+
+        for key in candidate_keys:
+            for pattern_idx, step_idx in self._step_index.get(key, ()):
+                queue = self._waiting[(pattern_idx, step_idx)]
+                if not queue:
+                    continue
+                pattern = self._patterns[pattern_idx]
+                skip_identical = not pattern.allow_repeats_in_definition and pattern.repeats_previous_step[step_idx]
+                is_last_step = step_idx + 1 == len(pattern)
+
+                remaining = self._new_queue()
+                for partial in queue:
+                    if pattern.is_expired(partial, position, timestamp):
+                        continue
+                    if skip_identical and entry == partial.entries[-1]:
+                        remaining.append(partial)
+                        continue
+                    partial.entries.append(entry)
+                    partial.last_index = position
+                    partial.last_timestamp = timestamp
+                    if is_last_step:
+                        completed.append(SequenceMatch(pattern.name, partial.start_index, partial.entries))
+                    else:
+                        advanced.append(((pattern_idx, step_idx + 1), partial))
+                self._waiting[(pattern_idx, step_idx)] = remaining
+
+        # Attempts advanced by this entry are enqueued only after dispatch so that a
+        # single entry never satisfies two consecutive steps of the same attempt.
+        for waiting_key, partial in advanced:
+            self._waiting[waiting_key].append(partial)
+
+        for key in candidate_keys:
+            for pattern_idx in self._start_index.get(key, ()):
+                pattern = self._patterns[pattern_idx]
+                partial = _PartialMatch(position, timestamp, entry)
+                if len(pattern) == 1:
+                    completed.append(SequenceMatch(pattern.name, position, partial.entries))
+                else:
+                    self._waiting[(pattern_idx, 1)].append(partial)
+
+        if self._position % self.prune_interval == 0:
+            self._prune_expired(self._position, timestamp)
+
+        if len(completed) > 1:
+            completed.sort(key=lambda match: match.start_index)
+        return completed
+
+    def match_stream(self, entries: Iterable[LogEntry]) -> Iterator[SequenceMatch]:
+        """
+        Feeds every entry of `entries` and yields matches as they complete.
+
+        Matches are yielded in completion order; matches completed by the same entry
+        are yielded in start order.
+        """
+        for entry in entries:
+            yield from self.feed(entry)
+
+    def match_timestamped_stream(self, entries: Iterable[Tuple[Optional[datetime], LogEntry]]) -> Iterator[SequenceMatch]:
+        """Like `match_stream`, for `(parsed_timestamp, entry)` pairs whose timestamps are already parsed."""
+        for timestamp, entry in entries:
+            yield from self.feed(entry, timestamp)
+
+    def _new_queue(self) -> Deque[_PartialMatch]:
+        return deque(maxlen=self.max_partial_matches_per_step)
+
+    def _prune_expired(self, position: int, timestamp: Optional[datetime]) -> None:
+        """Drops expired attempts from the front of every queue."""
+        for (pattern_idx, _), queue in self._waiting.items():
+            pattern = self._patterns[pattern_idx]
+            while queue and pattern.is_expired(queue[0], position, timestamp):
+                queue.popleft()
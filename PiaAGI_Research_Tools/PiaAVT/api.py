@@ -1,6 +1,6 @@
 # PiaAGI_Hub/PiaAVT/api.py
 
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, Iterable, Callable
 from datetime import datetime
 import json # Added import json for the __main__ block example
 
@@ -8,9 +8,11 @@ import json # Added import json for the __main__ block example
 # This structure assumes PiaAVT is used as a package or these paths are configured.
 try:
     from .core.logging_system import LoggingSystem, LogEntry, DEFAULT_TIMESTAMP_FORMAT, LogValidationError
+    from .core.column_store import LogColumnStore
     from .analyzers.basic_analyzer import BasicAnalyzer
     from .analyzers.event_sequencer import EventSequencer
     from .visualizers.timeseries_plotter import TimeseriesPlotter
+    from .visualizers.downsampling import TimeseriesPyramid
     from .visualizers.state_visualizer import StateVisualizer
 
     # Imports for refactored analysis scripts
@@ -18,6 +20,9 @@ try:
     from .Analysis_Implementations.emotional_state_trajectory_analysis import analyze_emotional_trajectory
     from .Analysis_Implementations.intrinsic_motivation_analysis import analyze_intrinsic_motivation
     from .Analysis_Implementations.task_performance_analysis import analyze_task_performance
+    from .Analysis_Implementations.analysis_pipeline import AnalysisPipeline
+    from .live_monitor import LiveLogMonitor
+    from .dataset import LogDataset
 
 except ImportError:
     # Fallback for environments where the relative import doesn't work (e.g., running script directly)
@@ -25,9 +30,11 @@ except ImportError:
     # For robust use, PiaAVT should be structured and installed as a proper Python package.
     print("PiaAVT API: Attempting fallback imports. For proper package structure, ensure PiaAVT is installable.")
     from core.logging_system import LoggingSystem, LogEntry, DEFAULT_TIMESTAMP_FORMAT, LogValidationError
+    from core.column_store import LogColumnStore
     from analyzers.basic_analyzer import BasicAnalyzer
     from analyzers.event_sequencer import EventSequencer
     from visualizers.timeseries_plotter import TimeseriesPlotter
+    from visualizers.downsampling import TimeseriesPyramid
     from visualizers.state_visualizer import StateVisualizer
 
     # Fallback imports for refactored analysis scripts
@@ -37,6 +44,9 @@ except ImportError:
     from Analysis_Implementations.emotional_state_trajectory_analysis import analyze_emotional_trajectory
     from Analysis_Implementations.intrinsic_motivation_analysis import analyze_intrinsic_motivation
     from Analysis_Implementations.task_performance_analysis import analyze_task_performance
+    from Analysis_Implementations.analysis_pipeline import AnalysisPipeline
+    from live_monitor import LiveLogMonitor
+    from dataset import LogDataset
 
 
 class PiaAVTAPI:
@@ -54,6 +64,7 @@ class PiaAVTAPI:
         event_sequencer (Optional[EventSequencer]): Instance for event sequence analysis; initialized after logs are loaded.
         timeseries_plotter (TimeseriesPlotter): Instance for generating time-series plots.
         state_visualizer (StateVisualizer): Instance for creating textual representations of agent states.
+        live_monitor (Optional[LiveLogMonitor]): Incremental analyses of a followed (still growing) log file.
         _active_log_file (Optional[str]): Path to the currently loaded log file.
     """
 
@@ -66,7 +77,10 @@ class PiaAVTAPI:
         self.event_sequencer: Optional[EventSequencer] = None
         self.timeseries_plotter = TimeseriesPlotter()
         self.state_visualizer = StateVisualizer()
+        self.live_monitor: Optional[LiveLogMonitor] = None
         self._active_log_file: Optional[str] = None
+        self._timeseries_pyramids: Dict[Tuple, TimeseriesPyramid] = {}
+        self._column_store: Optional[LogColumnStore] = None
 
     def load_logs_from_jsonl(self, file_path: str, validate: bool = True) -> bool:
         """
@@ -83,12 +97,38 @@ class PiaAVTAPI:
         Returns:
             bool: True if logs were loaded and analyzers initialized successfully, False otherwise.
         """
+        return self._load_logs(lambda: self.logging_system.load_logs_from_jsonl_file(file_path, validate=validate),
+                               f"JSONL file {file_path}", file_path)
+
+    def load_logs_from_jsonl_stream(self, lines: Iterable[Union[str, bytes]], validate: bool = True,
+                                    source_name: str = "JSONL stream") -> bool:
+        """
+        Loads log data from an iterable of JSONL lines (e.g., an upload stream read in
+        chunks) without the data ever being written to a file first.
+        Otherwise behaves like `load_logs_from_jsonl`.
+
+        Args:
+            lines (Iterable[Union[str, bytes]]): The JSONL lines, as `str` or UTF-8 `bytes`.
+            validate (bool): Whether to validate log entries during ingestion. Defaults to True.
+            source_name (str): Description of the source, used in messages and as the
+                               active log "file".
+
+        Returns:
+            bool: True if logs were loaded and analyzers initialized successfully, False otherwise.
+        """
+        return self._load_logs(lambda: self.logging_system.load_logs_from_jsonl_stream(lines, validate=validate, source_name=source_name),
+                               source_name, source_name)
+
+    def _load_logs(self, load: Callable[[], Any], description: str, active_log_file: str) -> bool:
+        """Clears the current logs, runs `load` and (re)initializes the analyzers."""
         try:
+            self._timeseries_pyramids.clear() # Pyramids describe the previously loaded logs
+            self._column_store = None
             self.logging_system.clear_logs() # Clear previous logs
-            self.logging_system.load_logs_from_jsonl_file(file_path, validate=validate) # Updated call
+            load()
             loaded_logs = self.logging_system.get_log_data()
             if not loaded_logs: # Check if any logs were actually loaded (JSONL parsing might skip all lines)
-                print(f"API Warning: No valid log entries were loaded from {file_path}. Analyzers will not be initialized.")
+                print(f"API Warning: No valid log entries were loaded from {description}. Analyzers will not be initialized.")
                 self.analyzer = None
                 self.event_sequencer = None
                 self._active_log_file = None
@@ -96,20 +136,20 @@ class PiaAVTAPI:
 
             self.analyzer = BasicAnalyzer(loaded_logs)
             self.event_sequencer = EventSequencer(loaded_logs)
-            self._active_log_file = file_path
-            print(f"API: Successfully loaded and initialized analyzers with logs from JSONL file: {file_path}")
+            self._active_log_file = active_log_file
+            print(f"API: Successfully loaded and initialized analyzers with logs from {description}")
             return True
-        except (FileNotFoundError, LogValidationError) as e: # JSONDecodeError is handled within load_logs_from_jsonl_file
+        except (FileNotFoundError, LogValidationError) as e: # JSONDecodeError is handled by the LoggingSystem loaders
             self.analyzer = None # Ensure analyzers are not stale
             self.event_sequencer = None
             self._active_log_file = None
-            print(f"API Error: Failed to load logs from JSONL file {file_path}. {e}")
+            print(f"API Error: Failed to load logs from {description}. {e}")
             return False
         except Exception as e: # Catch any other unexpected errors during loading/init
             self.analyzer = None
             self.event_sequencer = None
             self._active_log_file = None
-            print(f"API Error: An unexpected error occurred loading logs from JSONL file {file_path}. {e}")
+            print(f"API Error: An unexpected error occurred loading logs from {description}. {e}")
             return False
 
     def get_log_count(self) -> int:
@@ -156,6 +196,22 @@ class PiaAVTAPI:
 
     # --- Direct Analysis & Visualization Methods (Facades) ---
 
+    def get_column_store(self) -> Optional[LogColumnStore]:
+        """
+        Returns the columnar view of the loaded logs, built on first use and kept until
+        new logs are loaded. Use it for repeated filtered counts, statistics and series
+        (e.g. from an interactive dashboard).
+
+        Returns:
+            Optional[LogColumnStore]: The store, or None if no logs are loaded.
+        """
+        if not self.analyzer:
+            print("API Error: Analyzer not available. Load logs first.")
+            return None
+        if self._column_store is None:
+            self._column_store = LogColumnStore(self.logging_system.get_log_data())
+        return self._column_store
+
     def get_stats_for_field(self,
                             data_field_path: Union[str, List[str]],
                             source: Optional[str] = None,
@@ -244,6 +300,41 @@ class PiaAVTAPI:
 
         return self.analyzer.get_time_series(data_field_path, source, event_type, start_dt, end_dt)
 
+    def get_timeseries_pyramid(self,
+                               data_field_path: Union[str, List[str]],
+                               source: Optional[str] = None,
+                               event_type: Optional[str] = None,
+                               start_time_str: Optional[str] = None,
+                               end_time_str: Optional[str] = None
+                              ) -> Optional[TimeseriesPyramid]:
+        """
+        Returns the multi-resolution pyramid of a field's time series, for plotting.
+
+        The pyramid is built once per (field, filters) combination and cached until new
+        logs are loaded; query it with `TimeseriesPyramid.get_points(pixel_width, start, end)`
+        to obtain only the points needed for a given plot width and zoom window.
+
+        Args:
+            data_field_path (Union[str, List[str]]): Key or path to the field in the 'data' dictionary.
+            source (Optional[str]): Filter logs by this source string.
+            event_type (Optional[str]): Filter logs by this event_type string.
+            start_time_str (Optional[str]): ISO format timestamp string for start time filter (inclusive).
+            end_time_str (Optional[str]): ISO format timestamp string for end time filter (inclusive).
+
+        Returns:
+            Optional[TimeseriesPyramid]: The pyramid, or None if no time-series data is found.
+        """
+        path_key = data_field_path if isinstance(data_field_path, str) else tuple(data_field_path)
+        cache_key = (path_key, source, event_type, start_time_str, end_time_str)
+        pyramid = self._timeseries_pyramids.get(cache_key)
+        if pyramid is None:
+            ts_data = self.get_timeseries_for_field(data_field_path, source, event_type, start_time_str, end_time_str)
+            if not ts_data:
+                return None
+            pyramid = TimeseriesPyramid(ts_data)
+            self._timeseries_pyramids[cache_key] = pyramid
+        return pyramid
+
     def plot_field_over_time(self,
                              data_field_path: Union[str, List[str]],
                              title: Optional[str] = None,
@@ -253,12 +344,17 @@ class PiaAVTAPI:
                              start_time_str: Optional[str] = None,
                              end_time_str: Optional[str] = None,
                              output_file: Optional[str] = None,
-                             show_plot: bool = True) -> None:
+                             show_plot: bool = True,
+                             pixel_width: Optional[int] = None,
+                             downsample_method: str = "minmax") -> None:
         """
         Generates and displays/saves a time-series plot for a specified field from the log data.
         This method combines data extraction (using `get_timeseries_for_field`) and plotting
         (via `TimeseriesPlotter`).
 
+        Numeric fields are plotted from their cached `TimeseriesPyramid`, so only as many
+        points as the plot can resolve are drawn, regardless of the log length.
+
         Args:
             data_field_path (Union[str, List[str]]): Key or path to the field in the 'data' dictionary.
             title (Optional[str]): Title for the plot. If None, a default title is generated
@@ -272,20 +368,28 @@ class PiaAVTAPI:
             show_plot (bool): If True (default), the plot will be displayed (e.g., in a GUI window
                               or inline in a notebook). Set to False for non-interactive environments
                               or when only saving the file.
+            pixel_width (Optional[int]): Horizontal plot resolution used for downsampling.
+                                         Defaults to the figure width in pixels.
+            downsample_method (str): "minmax" (default, preserves spikes) or "lttb" (preserves shape).
         """
-        ts_data = self.get_timeseries_for_field(data_field_path, source, event_type, start_time_str, end_time_str)
-        if not ts_data:
+        plot_input: Any = self.get_timeseries_pyramid(data_field_path, source, event_type, start_time_str, end_time_str)
+        if plot_input is None:
             print("API: No time series data found to plot for the given parameters.")
             return
+        if plot_input.skipped_points:
+            # Non-numeric values cannot be downsampled; plot the raw series as before.
+            plot_input = self.get_timeseries_for_field(data_field_path, source, event_type, start_time_str, end_time_str)
 
         _title = title or f"Time Series for '{str(data_field_path)}'"
         _y_label = y_label or str(data_field_path)
 
-        self.timeseries_plotter.plot_time_series(ts_data,
+        self.timeseries_plotter.plot_time_series(plot_input,
                                                  title=_title,
                                                  y_label=_y_label,
                                                  output_file=output_file,
-                                                 show_plot=show_plot)
+                                                 show_plot=show_plot,
+                                                 pixel_width=pixel_width,
+                                                 downsample_method=downsample_method)
 
     def display_formatted_dict(self, data_dict: Dict[str, Any], title: str = "Details") -> None:
         """
@@ -370,6 +474,40 @@ class PiaAVTAPI:
             print(f"API Error: Error during event sequence extraction: {e}")
             return []
 
+    def find_multiple_event_sequences(self,
+                                      sequence_definitions: Dict[str, List[Dict[str, Optional[str]]]],
+                                      max_time_between_steps_seconds: Optional[float] = None,
+                                      max_intervening_logs: Optional[int] = None,
+                                      allow_repeats_in_definition: bool = False
+                                     ) -> Dict[str, List[List[LogEntry]]]:
+        """
+        Facade to find several event sequence patterns in a single pass over the logs.
+
+        Args:
+            sequence_definitions (Dict[str, List[Dict[str, Optional[str]]]]): Mapping of
+                pattern name to sequence definition (same format as `find_event_sequences`).
+            max_time_between_steps_seconds (Optional[float]): Max time between consecutive steps.
+            max_intervening_logs (Optional[int]): Max other logs between consecutive steps.
+            allow_repeats_in_definition (bool): Policy for repeated definitions.
+
+        Returns:
+            Dict[str, List[List[LogEntry]]]: Found sequences per pattern name,
+                                             or an empty dict if an error occurs.
+        """
+        if not self.event_sequencer:
+            print("API Error: Event sequencer not available. Load logs first.")
+            return {}
+        try:
+            return self.event_sequencer.extract_multiple_event_sequences(
+                sequence_definitions,
+                max_time_between_steps_seconds,
+                max_intervening_logs,
+                allow_repeats_in_definition
+            )
+        except Exception as e:
+            print(f"API Error: Error during multi-pattern event sequence extraction: {e}")
+            return {}
+
     def get_formatted_event_sequences(self,
                                       sequence_definition: List[Dict[str, Optional[str]]],
                                       max_time_between_steps_seconds: Optional[float] = None,
@@ -500,6 +638,200 @@ class PiaAVTAPI:
             print(f"API Error: An error occurred during task performance analysis: {e}")
             return None
 
+    def analyze_all(self, target_agent_id: Optional[str] = None, target_simulation_run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Runs all Analysis_Implementations analyses in a single pass over the loaded logs.
+
+        Unlike calling each `analyze_*` method in turn, the logs are iterated once and each
+        entry is routed only to the analyses that handle its event type.
+
+        Args:
+            target_agent_id (Optional[str]): Filter for analyses that support agent filtering.
+            target_simulation_run_id (Optional[str]): Filter for analyses that support simulation run filtering.
+
+        Returns:
+            Optional[Dict[str, Any]]: Combined report keyed by analysis name ("goal_dynamics",
+                                      "emotional_state_trajectory", "emotional_trajectory",
+                                      "intrinsic_motivation", "task_performance"),
+                                      or None if logs are not loaded or an error occurs.
+        """
+        logs = self.logging_system.get_log_data()
+        if not logs:
+            print("API Warning: No log data loaded. Cannot run analyses.")
+            return None
+        try:
+            print(f"API: Running single-pass analysis pipeline (Agent: {target_agent_id}, Sim: {target_simulation_run_id})...")
+            pipeline = AnalysisPipeline.with_default_analyses(target_agent_id, target_simulation_run_id)
+            return pipeline.run(logs)
+        except Exception as e:
+            print(f"API Error: An error occurred during the combined analysis: {e}")
+            return None
+
+    # --- Live Tail (Follow Mode) Methods ---
+
+    def follow_log_jsonl(self,
+                         file_path: str,
+                         from_beginning: bool = True,
+                         target_agent_id: Optional[str] = None,
+                         target_simulation_run_id: Optional[str] = None) -> bool:
+        """
+        Starts following a JSONL log file that is still being written (e.g. by PiaSELogger
+        or PrototypeLogger during a running simulation).
+
+        Following is independent of `load_logs_from_jsonl`: entries are not stored in the
+        LoggingSystem. Each call to `poll_followed_log` reads only the bytes appended since
+        the previous poll and updates running aggregates (field statistics, goal lifecycles,
+        emotion trajectories and the other pipeline analyses, event sequence matches).
+        Register statistics and sequences with `follow_field_stats` / `follow_event_sequence`.
+        Any previously followed file is replaced.
+
+        Args:
+            file_path (str): The JSONL file to follow. It does not need to exist yet.
+            from_beginning (bool): If True (default), existing content is ingested on the first poll.
+                                   If False, only entries written from now on are analysed.
+            target_agent_id (Optional[str]): Filter for analyses that support agent filtering.
+            target_simulation_run_id (Optional[str]): Filter for analyses that support simulation run filtering.
+
+        Returns:
+            bool: True if following started, False on error.
+        """
+        try:
+            self.live_monitor = LiveLogMonitor(file_path,
+                                               from_beginning=from_beginning,
+                                               target_agent_id=target_agent_id,
+                                               target_simulation_run_id=target_simulation_run_id)
+            print(f"API: Following log file {file_path} (from {'beginning' if from_beginning else 'end'}).")
+            return True
+        except Exception as e:
+            self.live_monitor = None
+            print(f"API Error: Failed to follow log file {file_path}. {e}")
+            return False
+
+    def follow_field_stats(self,
+                           data_field_path: Union[str, List[str]],
+                           source: Optional[str] = None,
+                           event_type: Optional[str] = None) -> Optional[str]:
+        """
+        Tracks running descriptive statistics for a numeric field of the followed log.
+        Only entries ingested after this call are counted.
+
+        Args:
+            data_field_path (Union[str, List[str]]): Key or path of keys to the field within 'data'.
+            source (Optional[str]): Only count entries with this source.
+            event_type (Optional[str]): Only count entries with this event type.
+
+        Returns:
+            Optional[str]: The name of the tracked statistics in `get_live_report()["field_stats"]`,
+                           or None if no file is followed or the field is already tracked.
+        """
+        if not self.live_monitor:
+            print("API Error: No log file is being followed. Use 'follow_log_jsonl' first.")
+            return None
+        try:
+            return self.live_monitor.add_field_stats(data_field_path, source, event_type)
+        except ValueError as e:
+            print(f"API Error: {e}")
+            return None
+
+    def follow_event_sequence(self,
+                              name: str,
+                              sequence_definition: List[Dict[str, Optional[str]]],
+                              max_time_between_steps_seconds: Optional[float] = None,
+                              max_intervening_logs: Optional[int] = None,
+                              allow_repeats_in_definition: bool = False) -> bool:
+        """
+        Matches an event sequence incrementally against the followed log.
+        Only entries ingested after this call are considered. See `find_event_sequences`
+        for the definition format and constraints.
+
+        Returns:
+            bool: True if the sequence was registered, False otherwise.
+        """
+        if not self.live_monitor:
+            print("API Error: No log file is being followed. Use 'follow_log_jsonl' first.")
+            return False
+        try:
+            self.live_monitor.add_sequence(name, sequence_definition,
+                                           max_time_between_steps_seconds=max_time_between_steps_seconds,
+                                           max_intervening_logs=max_intervening_logs,
+                                           allow_repeats_in_definition=allow_repeats_in_definition)
+            return True
+        except ValueError as e:
+            print(f"API Error: Invalid sequence '{name}'. {e}")
+            return False
+
+    def poll_followed_log(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Ingests the entries appended to the followed log since the previous poll.
+
+        Args:
+            max_bytes (Optional[int]): Upper bound on the bytes read by this poll. None reads
+                                       everything available.
+
+        Returns:
+            int: The number of new entries ingested (0 if no file is followed).
+        """
+        if not self.live_monitor:
+            print("API Error: No log file is being followed. Use 'follow_log_jsonl' first.")
+            return 0
+        try:
+            return len(self.live_monitor.poll(max_bytes=max_bytes))
+        except OSError as e:
+            print(f"API Error: Failed to read followed log file {self.live_monitor.file_path}. {e}")
+            return 0
+
+    def get_live_report(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns a snapshot of the running aggregates of the followed log.
+
+        Returns:
+            Optional[Dict[str, Any]]: See `LiveLogMonitor.report`, or None if no file is followed.
+        """
+        if not self.live_monitor:
+            print("API Warning: No log file is being followed.")
+            return None
+        return self.live_monitor.report()
+
+    def stop_following(self) -> None:
+        """Stops following the current log file and discards its running aggregates."""
+        self.live_monitor = None
+
+    # --- Multi-Run Dataset Methods ---
+
+    def open_log_dataset(self,
+                         patterns: Union[str, List[str]],
+                         max_workers: Optional[int] = None,
+                         chunk_size: int = 10000) -> Optional[LogDataset]:
+        """
+        Opens a collection of log files (e.g. every `piase_internal_log.jsonl` of a parameter
+        sweep) for out-of-core analysis.
+
+        Unlike `load_logs_from_jsonl`, nothing is loaded into the LoggingSystem and the
+        currently loaded log is left untouched. Aggregations on the returned dataset
+        (`field_stats`, `event_counts`, `aggregate`) stream each file in chunks inside
+        parallel worker processes and merge the partial results per
+        (experiment_id, simulation_run_id) group.
+
+        Args:
+            patterns (Union[str, List[str]]): Glob pattern(s) (supporting '**'), files or directories,
+                                              e.g. "runs/**/piase_internal_log.jsonl".
+            max_workers (Optional[int]): Worker processes; None for the CPU count, 1 for in-process.
+            chunk_size (int): Maximum number of entries held in memory per file at a time.
+
+        Returns:
+            Optional[LogDataset]: The dataset, or None if no file matches.
+        """
+        try:
+            dataset = LogDataset(patterns, max_workers=max_workers, chunk_size=chunk_size)
+        except ValueError as e:
+            print(f"API Error: Invalid dataset parameters. {e}")
+            return None
+        if not dataset.files:
+            print(f"API Warning: No log files matched {patterns}.")
+            return None
+        print(f"API: Opened log dataset with {len(dataset)} file(s).")
+        return dataset
+
 # Example Usage (demonstrates the API)
 # This section is intended for direct script execution demonstration and simple testing.
 # It creates a dummy log file, loads it via the API, and showcases some API functionalities.
@@ -675,4 +1007,3 @@ if __name__ == "__main__":
                 print(f"Error removing file {f_path}: {e}")
 
     print("\nAPI Demo Complete.")
-```
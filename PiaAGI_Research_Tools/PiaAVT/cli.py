@@ -2,8 +2,9 @@
 import argparse
 import sys
 import os # For path manipulation in fallback import
-from typing import Union, List # For type hinting _parse_field_path
+from typing import Union, List, Dict, Optional # For type hinting _parse_field_path
 import json # Ensure json is imported for parsing sequence definition
+import time # For the polling interval of the follow command
 
 # Attempt to import PiaAVTAPI from the api module within the same package
 try:
@@ -179,33 +180,41 @@ def handle_list_logs(args):
     if limit < len(logs):
         print(f"... and {len(logs) - limit} more log(s) not shown.")
 
-def handle_sequences(args):
-    """Handles the 'sequences' command."""
-    if not _ensure_api_initialized_and_logs_loaded():
-        return
-
-    print(f"CLI: Finding event sequences for definition: {args.definition_str}")
-    print(f"  Max time between steps: {args.max_time}s")
-    print(f"  Max intervening logs: {args.max_logs}")
-
+def _parse_sequence_definition(definition_str: str) -> Optional[List[Dict[str, str]]]:
+    """Parses a sequence definition given as a JSON list or comma-separated event types; prints errors and returns None if invalid."""
     try:
         # Attempt to parse as JSON list of dicts
-        sequence_definition = json.loads(args.definition_str)
+        sequence_definition = json.loads(definition_str)
         if not isinstance(sequence_definition, list) or \
            not all(isinstance(step, dict) and "event_type" in step for step in sequence_definition):
             raise ValueError("Definition must be a JSON list of objects, each with at least 'event_type'.")
     except json.JSONDecodeError:
         # Fallback: Try simple comma-separated event_types (no source)
         print("CLI Info: Could not parse definition as JSON. Trying as comma-separated event_types (no source matching).")
-        event_types = [et.strip() for et in args.definition_str.split(',')]
+        event_types = [et.strip() for et in definition_str.split(',')]
         if not all(event_types):
              print("CLI Error: Invalid format for simple event type sequence. Use comma-separated values e.g., 'EventA,EventB'.", file=sys.stderr)
-             return
+             return None
         sequence_definition = [{"event_type": et} for et in event_types]
     except ValueError as e:
         print(f"CLI Error: Invalid sequence definition format. {e}", file=sys.stderr)
         print("  Use a JSON string like '[{\"event_type\":\"TypeA\"}, {\"event_type\":\"TypeB\",\"source\":\"SrcB\"}]'", file=sys.stderr)
         print("  Or a simple comma-separated list of event types like 'TypeA,TypeB,TypeC'", file=sys.stderr)
+        return None
+
+    return sequence_definition
+
+def handle_sequences(args):
+    """Handles the 'sequences' command."""
+    if not _ensure_api_initialized_and_logs_loaded():
+        return
+
+    print(f"CLI: Finding event sequences for definition: {args.definition_str}")
+    print(f"  Max time between steps: {args.max_time}s")
+    print(f"  Max intervening logs: {args.max_logs}")
+
+    sequence_definition = _parse_sequence_definition(args.definition_str)
+    if sequence_definition is None:
         return
 
     if not pia_api_instance:
@@ -219,6 +228,63 @@ def handle_sequences(args):
     )
     print(formatted_output)
 
+def _print_live_summary(report: Dict) -> None:
+    """Prints a compact summary of a live follow report."""
+    print(f"CLI: {report['entries_processed']} entries ingested from {report['file_path']} (offset {report['offset']} bytes).")
+    for name, stats in report["field_stats"].items():
+        if stats:
+            print(f"  {name}: count={stats['count']} mean={stats['mean']:.4g} min={stats['min']} max={stats['max']} stdev={stats['stdev']:.4g}")
+        else:
+            print(f"  {name}: no numeric values yet")
+    for name, count in report["sequence_match_counts"].items():
+        print(f"  Sequence '{name}': {count} match(es)")
+    analyses = report["analyses"]
+    goals = analyses.get("goal_dynamics") or {}
+    print(f"  Goals tracked: {len(goals)}")
+    emotion_points = analyses.get("emotional_trajectory") or []
+    print(f"  Emotion state updates: {len(emotion_points)}")
+
+def handle_follow(args):
+    """Handles the 'follow' command: tails a growing log file and prints running aggregates."""
+    global pia_api_instance
+    if pia_api_instance is None:
+        pia_api_instance = PiaAVTAPI()
+
+    if not pia_api_instance.follow_log_jsonl(args.filepath,
+                                             from_beginning=not args.from_end,
+                                             target_agent_id=args.agent_id,
+                                             target_simulation_run_id=args.sim_id):
+        return
+
+    for field_path_str in args.field or []:
+        pia_api_instance.follow_field_stats(_parse_field_path(field_path_str),
+                                            source=args.source,
+                                            event_type=args.event_type)
+    for i, definition_str in enumerate(args.sequence or [], 1):
+        sequence_definition = _parse_sequence_definition(definition_str)
+        if sequence_definition is None:
+            return
+        pia_api_instance.follow_event_sequence(f"seq{i}", sequence_definition,
+                                               max_time_between_steps_seconds=args.max_time,
+                                               max_intervening_logs=args.max_logs)
+
+    print(f"CLI: Following {args.filepath} every {args.interval}s. Press Ctrl+C to stop.")
+    polls = 0
+    try:
+        while True:
+            new_entries = pia_api_instance.poll_followed_log()
+            polls += 1
+            if new_entries:
+                _print_live_summary(pia_api_instance.get_live_report())
+            if args.max_polls is not None and polls >= args.max_polls:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nCLI: Stopped following.")
+        report = pia_api_instance.get_live_report()
+        if report:
+            _print_live_summary(report)
+
 def main():
     parser = argparse.ArgumentParser(
         description="PiaAVT Command-Line Interface. Use 'load' command first to load log data.",
@@ -286,6 +352,29 @@ def main():
                               help="Allow repeats in definition matching (see API docs for nuances).")
     seq_parser.set_defaults(func=handle_sequences)
 
+    # --- Follow command ---
+    follow_parser = subparsers.add_parser("follow", aliases=['tail'],
+                                          help="Follow a growing JSONL log file and print running aggregates as new entries arrive.")
+    follow_parser.add_argument("filepath", type=str, help="Path to the JSONL log file being written.")
+    follow_parser.add_argument("--field", type=str, action="append",
+                               help="Field path within 'data' to keep running statistics for (repeatable).")
+    follow_parser.add_argument("--source", type=str, help="Only count --field values from this source.")
+    follow_parser.add_argument("--event_type", type=str, help="Only count --field values from this event type.")
+    follow_parser.add_argument("--sequence", type=str, action="append",
+                               help="Sequence definition to match incrementally (same format as 'sequences'; repeatable).")
+    follow_parser.add_argument("--max_time", type=float, default=None,
+                               help="Maximum time in seconds between consecutive steps of --sequence matches.")
+    follow_parser.add_argument("--max_logs", type=int, default=None,
+                               help="Maximum number of intervening logs between steps of --sequence matches.")
+    follow_parser.add_argument("--agent_id", type=str, help="Filter for analyses that support agent filtering.")
+    follow_parser.add_argument("--sim_id", type=str, help="Filter for analyses that support simulation run filtering.")
+    follow_parser.add_argument("--from_end", action="store_true",
+                               help="Skip existing content and only analyse entries written from now on.")
+    follow_parser.add_argument("--interval", type=float, default=2.0, help="Seconds between polls (default: 2.0).")
+    follow_parser.add_argument("--max_polls", type=int, default=None,
+                               help="Stop after this many polls (default: follow until interrupted).")
+    follow_parser.set_defaults(func=handle_follow)
+
     if len(sys.argv) <= 1:
         parser.print_help(sys.stderr)
         sys.exit(1)
@@ -312,5 +401,5 @@ if __name__ == "__main__":
     # python PiaAGI_Hub/PiaAVT/cli.py view_goals 8
     # python PiaAGI_Hub/PiaAVT/cli.py sequences "Write,Action" --max_logs 0
     # python PiaAGI_Hub/PiaAVT/cli.py sequences '[{"event_type":"Write"},{"event_type":"Action","source":"PiaSE.Agent0"}]' --max_logs 0
+    # python PiaAGI_Hub/PiaAVT/cli.py follow path/to/piase_internal_log.jsonl --field reward --sequence "Write,Action" --interval 5
     main()
-```
@@ -0,0 +1,267 @@
+# PiaAGI_Hub/PiaAVT/core/column_store.py
+"""
+Columnar view of a loaded log for fast, repeated filtering and aggregation.
+
+`BasicAnalyzer` walks the list of log entry dicts on every call, re-parsing every
+timestamp and re-evaluating every filter. That is fine for one query, but an
+interactive dashboard issues dozens of queries against the same log while the user
+adjusts filters. `LogColumnStore` decodes the log once into NumPy columns:
+
+- `timestamps`: float seconds on the same naive-epoch axis as `visualizers.downsampling`
+  (NaN where a timestamp is missing or unparseable).
+- Categorical columns ("source", "event_type", "simulation_run_id", "agent_id", ...):
+  integer codes into a list of distinct values (-1 where the field is missing), so a
+  filter is a vectorized lookup and value counts are a `bincount`.
+- Numeric data fields: a float column per 'data' path (NaN where the value is missing
+  or not numeric), extracted on first use and kept for later queries.
+
+Filters accept a single value or a collection of values (multi-select), and combine
+into a boolean mask that the query methods take.
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Union, Tuple, Iterable, Sequence
+
+import numpy as np
+
+try:
+    from .logging_system import LogEntry, DEFAULT_TIMESTAMP_FORMAT
+except ImportError:
+    from core.logging_system import LogEntry, DEFAULT_TIMESTAMP_FORMAT
+
+DEFAULT_CATEGORICAL_FIELDS = ("source", "event_type", "simulation_run_id", "agent_id")
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+# Timestamps in DEFAULT_TIMESTAMP_FORMAT are parsed in one vectorized NumPy call.
+_DEFAULT_FORMAT_PATTERN = re.compile(r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{1,6}Z$')
+
+FilterValue = Optional[Union[str, Iterable[str]]]
+
+
+def _to_seconds(timestamp: datetime) -> float:
+    """Converts a (naive or aware) datetime to seconds on the naive-epoch axis."""
+    if timestamp.tzinfo is not None:
+        return timestamp.timestamp()
+    return (timestamp - _NAIVE_EPOCH).total_seconds()
+
+
+def seconds_to_datetime(seconds: float) -> datetime:
+    """Inverse of the store's timestamp encoding (returns a naive datetime)."""
+    return _NAIVE_EPOCH + timedelta(seconds=float(seconds))
+
+
+def parse_timestamps(values: Sequence[Any], timestamp_format: str = DEFAULT_TIMESTAMP_FORMAT) -> np.ndarray:
+    """
+    Parses timestamp strings into float seconds, NaN for missing or unparseable values.
+
+    Strings in `DEFAULT_TIMESTAMP_FORMAT` are converted in bulk by NumPy; anything else
+    goes through `datetime.strptime(value, timestamp_format)` individually.
+    """
+    seconds = np.full(len(values), np.nan)
+    fast_index, fast_values, slow_index = [], [], []
+    use_fast_path = timestamp_format == DEFAULT_TIMESTAMP_FORMAT
+    for i, value in enumerate(values):
+        if not isinstance(value, str):
+            continue
+        if use_fast_path and _DEFAULT_FORMAT_PATTERN.match(value):
+            fast_index.append(i)
+            fast_values.append(value[:-1]) # NumPy does not accept the 'Z' suffix
+        else:
+            slow_index.append(i)
+    if fast_index:
+        parsed = np.array(fast_values, dtype='datetime64[us]')
+        seconds[fast_index] = (parsed - np.datetime64(0, 'us')) / np.timedelta64(1, 's')
+    for i in slow_index:
+        try:
+            seconds[i] = _to_seconds(datetime.strptime(values[i], timestamp_format))
+        except ValueError:
+            continue
+    return seconds
+
+
+class LogColumnStore:
+    """
+    Column-oriented, read-only copy of a list of log entries.
+
+    Args:
+        log_data (List[LogEntry]): The entries. They are referenced, not copied; the store
+            must be rebuilt if the list changes.
+        categorical_fields (Sequence[str]): Top-level fields encoded as categorical columns
+            up front. Other top-level fields are encoded on first use.
+
+    Attributes:
+        timestamps (np.ndarray): Float seconds per entry (NaN if missing or unparseable).
+    """
+
+    def __init__(self, log_data: List[LogEntry], categorical_fields: Sequence[str] = DEFAULT_CATEGORICAL_FIELDS):
+        self.log_data = log_data
+        self.timestamps = parse_timestamps([entry.get("timestamp") for entry in log_data])
+        self._categories: Dict[str, List[Any]] = {}
+        self._codes: Dict[str, np.ndarray] = {}
+        self._numeric_columns: Dict[Tuple[str, ...], np.ndarray] = {}
+        for field in categorical_fields:
+            self._encode(field)
+
+    def __len__(self) -> int:
+        return len(self.log_data)
+
+    @staticmethod
+    def _path_key(data_field_path: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+        if isinstance(data_field_path, str):
+            return (data_field_path,)
+        return tuple(data_field_path)
+
+    def _encode(self, field: str) -> None:
+        lookup: Dict[Any, int] = {}
+        categories: List[Any] = []
+        codes = np.full(len(self.log_data), -1, dtype=np.int32)
+        for i, entry in enumerate(self.log_data):
+            if field not in entry:
+                continue
+            value = entry[field]
+            if isinstance(value, (list, dict)):
+                value = str(value) # Hashable, as in BasicAnalyzer.count_unique_values
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(categories)
+                categories.append(value)
+            codes[i] = code
+        self._categories[field] = categories
+        self._codes[field] = codes
+
+    def categories(self, field: str) -> List[Any]:
+        """Returns the distinct values of a top-level field, in order of first appearance."""
+        if field not in self._codes:
+            self._encode(field)
+        return list(self._categories[field])
+
+    def mask(self,
+             source: FilterValue = None,
+             event_type: FilterValue = None,
+             start_time: Optional[datetime] = None,
+             end_time: Optional[datetime] = None,
+             **field_filters: FilterValue) -> np.ndarray:
+        """
+        Builds a boolean row mask from filters.
+
+        Each filter takes one value or a collection of accepted values; None or an empty
+        collection disables it. Time bounds are inclusive, and rows without a parseable
+        timestamp are excluded once a time bound is set (as in `BasicAnalyzer.filter_logs`).
+
+        Args:
+            source (FilterValue): Accepted 'source' value(s).
+            event_type (FilterValue): Accepted 'event_type' value(s).
+            start_time (Optional[datetime]): Inclusive lower time bound.
+            end_time (Optional[datetime]): Inclusive upper time bound.
+            **field_filters (FilterValue): Accepted values of other top-level fields,
+                e.g. `simulation_run_id="sim_run_001"`.
+
+        Returns:
+            np.ndarray: Boolean array with one element per entry.
+        """
+        result = np.ones(len(self.log_data), dtype=bool)
+        for field, accepted in (("source", source), ("event_type", event_type), *field_filters.items()):
+            if accepted is None:
+                continue
+            accepted = [accepted] if isinstance(accepted, str) else list(accepted)
+            if not accepted:
+                continue
+            if field not in self._codes:
+                self._encode(field)
+            lookup = {value: code for code, value in enumerate(self._categories[field])}
+            accepted_codes = [lookup[value] for value in accepted if value in lookup]
+            result &= np.isin(self._codes[field], accepted_codes)
+        if start_time is not None:
+            result &= self.timestamps >= _to_seconds(start_time) # NaN compares False
+        if end_time is not None:
+            result &= self.timestamps <= _to_seconds(end_time)
+        return result
+
+    def count_unique_values(self, field: str, mask: Optional[np.ndarray] = None) -> Dict[Any, int]:
+        """
+        Counts the values of a top-level field among the (masked) entries.
+
+        Returns:
+            Dict[Any, int]: Value -> count for every value that occurs, most frequent first.
+        """
+        if field not in self._codes:
+            self._encode(field)
+        codes = self._codes[field] if mask is None else self._codes[field][mask]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self._categories[field]))
+        order = np.argsort(-counts, kind="stable")
+        return {self._categories[field][i]: int(counts[i]) for i in order if counts[i]}
+
+    def numeric_column(self, data_field_path: Union[str, Sequence[str]]) -> np.ndarray:
+        """
+        Returns the float column of a numeric field within the entries' 'data' dictionary
+        (NaN where missing or non-numeric). Extracted once per path, then cached.
+
+        Args:
+            data_field_path (Union[str, Sequence[str]]): Key or path of keys, as in `BasicAnalyzer`.
+        """
+        path = self._path_key(data_field_path)
+        column = self._numeric_columns.get(path)
+        if column is None:
+            column = np.full(len(self.log_data), np.nan)
+            for i, entry in enumerate(self.log_data):
+                value = entry.get("data")
+                if not isinstance(value, dict):
+                    continue
+                try:
+                    for key in path:
+                        value = value[key]
+                except (KeyError, TypeError, IndexError):
+                    continue
+                if isinstance(value, (int, float)):
+                    column[i] = value
+            self._numeric_columns[path] = column
+        return column
+
+    def get_descriptive_stats(self, data_field_path: Union[str, Sequence[str]],
+                              mask: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+        """
+        Descriptive statistics of a numeric data field among the (masked) entries, with
+        the keys of `BasicAnalyzer.get_descriptive_stats` ("count", "mean", "median",
+        "min", "max", "stdev", "sum"). Returns None if there are no numeric values.
+        """
+        values = self.numeric_column(data_field_path)
+        if mask is not None:
+            values = values[mask]
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return None
+        return {
+            "count": int(len(values)),
+            "mean": float(values.mean()),
+            "median": float(np.median(values)),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "stdev": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+            "sum": float(values.sum()),
+        }
+
+    def get_time_series_arrays(self, data_field_path: Union[str, Sequence[str]],
+                               mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (seconds, values) of a numeric data field among the (masked) entries that
+        have both a timestamp and a numeric value, sorted by time.
+        """
+        values = self.numeric_column(data_field_path)
+        keep = ~np.isnan(values) & ~np.isnan(self.timestamps)
+        if mask is not None:
+            keep &= mask
+        x, y = self.timestamps[keep], values[keep]
+        if len(x) > 1 and np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind="stable")
+            x, y = x[order], y[order]
+        return x, y
+
+    def select(self, mask: Optional[np.ndarray] = None, limit: Optional[int] = None) -> List[LogEntry]:
+        """Returns the (masked) entries in log order, at most `limit` of them."""
+        if mask is None:
+            return self.log_data[:limit] if limit is not None else list(self.log_data)
+        indices = np.flatnonzero(mask)
+        if limit is not None:
+            indices = indices[:limit]
+        return [self.log_data[i] for i in indices]
@@ -0,0 +1,153 @@
+# PiaAGI_Hub/PiaAVT/core/log_tailer.py
+"""
+Incremental reader for JSONL log files that are still being written.
+
+`LoggingSystem.load_logs_from_jsonl_file` reads a log file from the beginning every
+time it is called, which is fine for completed runs but not for watching a long
+PiaSE experiment whose log keeps growing. `JsonlLogTailer` remembers the byte offset
+it has consumed and, on each poll, reads only the bytes appended since then. A
+trailing line without its newline (a write in progress) is held back until it is
+complete, and a file that shrinks or is replaced (truncation, rotation) is re-read
+from the start.
+
+`normalize_log_entry` bridges the field names used by the different loggers
+(`PiaSELogger`: wall_time/source_component/data, `PrototypeLogger`:
+source_component_id/event_data, PiaAVT: timestamp/source/data) so that the analyzers
+can consume entries from any of them.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+LogEntry = Dict[str, Any] # Should match the definition in core.logging_system
+
+_FIELD_ALIASES = (
+    # (canonical field, alternative fields in order of preference)
+    ("timestamp", ("wall_time",)),
+    ("source", ("source_component_id", "source_component")),
+    ("data", ("event_data",)),
+    ("event_data", ("data",)),
+)
+
+
+def normalize_log_entry(entry: LogEntry) -> LogEntry:
+    """
+    Fills in the field names expected by PiaAVT from the aliases other loggers use.
+
+    Existing fields are never overwritten; the entry is updated in place and returned.
+
+    Args:
+        entry (LogEntry): A decoded log entry.
+
+    Returns:
+        LogEntry: The same entry, with any missing canonical fields filled in.
+    """
+    for field, aliases in _FIELD_ALIASES:
+        if field in entry:
+            continue
+        for alias in aliases:
+            if alias in entry:
+                entry[field] = entry[alias]
+                break
+    return entry
+
+
+class JsonlLogTailer:
+    """
+    Follows a growing JSONL file, returning only the entries appended since the last read.
+
+    Args:
+        file_path (str): Path to the JSONL file. It does not need to exist yet.
+        start_offset (int): Byte offset to start reading from. Use 0 to read the file
+            from the beginning, or `os.path.getsize(file_path)` to skip existing content.
+        normalize (bool): If True (default), entries are passed through `normalize_log_entry`.
+
+    Attributes:
+        file_path (str): The followed file.
+        entries_read (int): Number of entries decoded so far.
+        malformed_lines (int): Number of complete lines that could not be decoded.
+        resets (int): Number of times the file was truncated or replaced and re-read.
+    """
+
+    def __init__(self, file_path: str, start_offset: int = 0, normalize: bool = True):
+        if start_offset < 0:
+            raise ValueError("start_offset must be non-negative.")
+        self.file_path = file_path
+        self.normalize = normalize
+        self.entries_read = 0
+        self.malformed_lines = 0
+        self.resets = 0
+        self._read_offset = start_offset # Next byte to read from the file
+        self._pending = b"" # Bytes of an incomplete trailing line
+        self._file_id: Optional[tuple] = None # (st_dev, st_ino) of the file being followed
+
+    @property
+    def offset(self) -> int:
+        """Byte offset of the first byte not yet returned as part of a complete line."""
+        return self._read_offset - len(self._pending)
+
+    @property
+    def has_partial_line(self) -> bool:
+        """True if an incomplete trailing line is buffered, waiting for its newline."""
+        return bool(self._pending)
+
+    def read_new_entries(self, max_bytes: Optional[int] = None) -> List[LogEntry]:
+        """
+        Reads and decodes the complete lines appended since the previous call.
+
+        Args:
+            max_bytes (Optional[int]): Upper bound on the number of bytes read by this
+                call, to bound the work per poll. None reads everything available.
+
+        Returns:
+            List[LogEntry]: Newly decoded entries in file order. Empty if the file does
+                            not exist (yet) or nothing new has been written.
+        """
+        try:
+            stat_result = os.stat(self.file_path)
+        except FileNotFoundError:
+            return []
+
+        file_id = (stat_result.st_dev, stat_result.st_ino)
+        if self._file_id is not None and (file_id != self._file_id or stat_result.st_size < self._read_offset):
+            # The file was replaced or truncated; start over on the new content.
+            self._read_offset = 0
+            self._pending = b""
+            self.resets += 1
+        self._file_id = file_id
+
+        if stat_result.st_size <= self._read_offset:
+            return []
+
+        with open(self.file_path, 'rb') as f:
+            f.seek(self._read_offset)
+            chunk = f.read(-1 if max_bytes is None else max_bytes)
+        self._read_offset += len(chunk)
+
+        data = self._pending + chunk
+        last_newline = data.rfind(b"\n")
+        if last_newline < 0:
+            self._pending = data
+            return []
+        self._pending = data[last_newline + 1:]
+        return self._decode_lines(data[:last_newline])
+
+    def _decode_lines(self, data: bytes) -> List[LogEntry]:
+        entries: List[LogEntry] = []
+        for raw_line in data.split(b"\n"):
+            line = raw_line.strip()
+            if not line:
+                continue # Skip empty lines
+            try:
+                entry = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                self.malformed_lines += 1
+                print(f"Error decoding JSON while tailing {self.file_path}: {e}\nProblematic line: '{line[:200]!r}'")
+                continue
+            if not isinstance(entry, dict):
+                self.malformed_lines += 1
+                continue
+            entries.append(normalize_log_entry(entry) if self.normalize else entry)
+        self.entries_read += len(entries)
+        return entries
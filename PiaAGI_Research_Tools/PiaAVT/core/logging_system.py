@@ -14,7 +14,7 @@ Key Components:
     LoggingSystem (class): Manages log ingestion, validation, storage, and access.
 """
 import json
-from typing import List, Dict, Any, Optional # Retain Optional for consistency if used elsewhere, though not in current file directly
+from typing import List, Dict, Any, Optional, Iterable, Union # Retain Optional for consistency if used elsewhere, though not in current file directly
 from datetime import datetime
 
 # Define a standard log entry structure (can be expanded)
@@ -216,37 +216,64 @@ class LoggingSystem:
                                 log entry from the file fails validation.
             Exception: Catches other potential errors during file operations or processing.
         """
-        loaded_entries: List[LogEntry] = []
         try:
             with open(file_path, 'r') as f:
-                for i, line in enumerate(f):
-                    line = line.strip()
-                    if not line:
-                        continue  # Skip empty lines
-                    try:
-                        entry = json.loads(line)
-                        loaded_entries.append(entry)
-                    except json.JSONDecodeError as e_json:
-                        print(f"Error decoding JSON from line {i+1} in {file_path}: {e_json}\nProblematic line: '{line}'")
-                        # Optionally, decide if you want to stop processing or continue
-                        continue
+                self.load_logs_from_jsonl_stream(f, validate=validate, source_name=f"JSONL file {file_path}")
+        except FileNotFoundError:
+            print(f"Error: File not found at {file_path}")
+            raise
+
+    def load_logs_from_jsonl_stream(self,
+                                    lines: Iterable[Union[str, bytes]],
+                                    validate: bool = True,
+                                    source_name: str = "JSONL stream") -> int:
+        """
+        Loads log entries from an iterable of JSONL lines, such as an open file, an
+        upload stream or a generator decoding network chunks.
+
+        Lines are parsed as they are produced, so the source never has to exist as a
+        whole file. Lines may be `str` or UTF-8 `bytes`; empty lines are skipped, and
+        lines that are not valid JSON are reported and skipped. The parsed entries are
+        then added via `add_log_entries`, respecting the `validate` flag.
+
+        Args:
+            lines (Iterable[Union[str, bytes]]): The JSONL lines.
+            validate (bool): If True (default), the parsed entries are validated.
+            source_name (str): Description of the source used in messages.
+
+        Returns:
+            int: The number of entries added.
+
+        Raises:
+            LogValidationError: If `validate` is True and any parsed entry fails validation.
+        """
+        loaded_entries: List[LogEntry] = []
+        try:
+            for i, line in enumerate(lines):
+                line = line.strip()
+                if not line:
+                    continue  # Skip empty lines
+                try:
+                    loaded_entries.append(json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError) as e_json:
+                    if isinstance(line, bytes):
+                        line = line.decode('utf-8', errors='replace')
+                    print(f"Error decoding JSON from line {i+1} in {source_name}: {e_json}\nProblematic line: '{line}'")
+                    continue
 
             if not loaded_entries:
-                print(f"No valid log entries found or loaded from {file_path}.")
-                return
+                print(f"No valid log entries found or loaded from {source_name}.")
+                return 0
 
             self.add_log_entries(loaded_entries, validate=validate)
-            print(f"Successfully processed {len(loaded_entries)} potential log entries from JSONL file {file_path}.")
-            # Note: add_log_entries will print its own success/error or raise LogValidationError
+            print(f"Successfully processed {len(loaded_entries)} potential log entries from {source_name}.")
+            return len(loaded_entries)
 
-        except FileNotFoundError:
-            print(f"Error: File not found at {file_path}")
-            raise
         except LogValidationError as e_val: # Catch validation errors from add_log_entries
-            print(f"Error processing log entries from JSONL file {file_path}: {e_val}")
+            print(f"Error processing log entries from {source_name}: {e_val}")
             raise # Re-raise to signal failure at a higher level if needed
         except Exception as e: # Catch other unexpected errors
-            print(f"An unexpected error occurred while loading logs from JSONL file {file_path}: {e}")
+            print(f"An unexpected error occurred while loading logs from {source_name}: {e}")
             raise
 
     def get_log_data(self) -> List[LogEntry]:
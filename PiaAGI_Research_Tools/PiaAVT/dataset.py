@@ -0,0 +1,219 @@
+# PiaAGI_Hub/PiaAVT/dataset.py
+"""
+Out-of-core analytics over many run logs at once.
+
+`PiaAVTAPI` analyses one log file held fully in memory. Parameter sweeps instead
+produce one `piase_internal_log.jsonl` per run directory, often thousands of them.
+`LogDataset` addresses such a collection through a glob pattern and computes
+aggregations without ever loading it as a whole:
+
+- Each file is streamed in chunks of at most `chunk_size` entries, so a worker's
+  memory is bounded by one chunk plus the (small) partial aggregates.
+- Files are processed in parallel worker processes; each returns its partial
+  aggregates grouped by e.g. (experiment_id, simulation_run_id).
+- The parent process merges the partial aggregates of every group as the files
+  complete.
+
+An aggregate is any picklable object exposing `update(entry)`, `merge(other)` and
+`get_stats()`, such as `RunningFieldStats` and `RunningEventCounts`. Aggregates are
+created by a picklable factory (a class or a `functools.partial` of one; lambdas
+cannot be sent to worker processes).
+"""
+
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable, Iterable, Iterator, Sequence
+
+try:
+    from .core.log_tailer import normalize_log_entry, LogEntry
+    from .analyzers.running_stats import RunningFieldStats, RunningEventCounts
+except ImportError:
+    from core.log_tailer import normalize_log_entry, LogEntry
+    from analyzers.running_stats import RunningFieldStats, RunningEventCounts
+
+DEFAULT_GROUP_BY = ("experiment_id", "simulation_run_id")
+RUN_ID_FIELDS = ("simulation_run_id", "run_id")
+
+GroupKey = Tuple[Any, ...]
+
+
+def iter_log_chunks(file_path: str, chunk_size: int = 10000) -> Iterator[List[LogEntry]]:
+    """
+    Streams a JSONL log file as lists of at most `chunk_size` normalized entries.
+
+    Empty lines are skipped; malformed lines are reported and skipped.
+
+    Raises:
+        FileNotFoundError: If `file_path` does not exist.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    chunk: List[LogEntry] = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Error decoding JSON from line {line_number} in {file_path}: {e}")
+                continue
+            if not isinstance(entry, dict):
+                continue
+            chunk.append(normalize_log_entry(entry))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _group_key(entry: LogEntry, group_by: Sequence[str], run_dir_name: str) -> GroupKey:
+    """Builds the group key of an entry; a missing run id falls back to the run directory name."""
+    key = []
+    for field in group_by:
+        value = entry.get(field)
+        if value is None and field in RUN_ID_FIELDS:
+            value = run_dir_name
+        key.append(value)
+    return tuple(key)
+
+
+def _aggregate_file(file_path: str,
+                    aggregate_factory: Callable[[], Any],
+                    group_by: Sequence[str],
+                    chunk_size: int) -> Tuple[str, Dict[GroupKey, Any], Optional[str]]:
+    """
+    Worker task: computes the partial aggregates of one file, grouped by `group_by`.
+
+    Returns:
+        Tuple[str, Dict[GroupKey, Any], Optional[str]]: (file path, aggregates by group,
+            error message or None).
+    """
+    run_dir_name = os.path.basename(os.path.dirname(os.path.abspath(file_path)))
+    partials: Dict[GroupKey, Any] = {}
+    try:
+        for chunk in iter_log_chunks(file_path, chunk_size):
+            for entry in chunk:
+                key = _group_key(entry, group_by, run_dir_name)
+                aggregate = partials.get(key)
+                if aggregate is None:
+                    aggregate = partials[key] = aggregate_factory()
+                aggregate.update(entry)
+    except (OSError, UnicodeDecodeError) as e:
+        return file_path, partials, str(e)
+    return file_path, partials, None
+
+
+class LogDataset:
+    """
+    A collection of JSONL log files addressed by glob pattern(s), analysed out of core.
+
+    Args:
+        patterns (Union[str, Iterable[str]]): Glob pattern(s), file paths, or directories.
+            Patterns support '**' for recursive matching; a directory stands for every
+            '*.jsonl' file below it.
+        max_workers (Optional[int]): Worker processes used by aggregations. None uses the
+            machine's CPU count; 1 processes files in the calling process.
+        chunk_size (int): Maximum number of entries held in memory per file at a time.
+
+    Attributes:
+        files (List[str]): The matched log files, sorted.
+        errors (Dict[str, str]): Files that could not be (fully) read by the last aggregation.
+    """
+
+    def __init__(self,
+                 patterns: Union[str, Iterable[str]],
+                 max_workers: Optional[int] = None,
+                 chunk_size: int = 10000):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.files: List[str] = self._resolve(patterns)
+        self.errors: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    @staticmethod
+    def _resolve(patterns: Union[str, Iterable[str]]) -> List[str]:
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        matched = set()
+        for pattern in patterns:
+            if os.path.isdir(pattern):
+                pattern = os.path.join(pattern, "**", "*.jsonl")
+            matched.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        return sorted(matched)
+
+    def iter_chunks(self) -> Iterator[Tuple[str, List[LogEntry]]]:
+        """Yields (file path, chunk of entries) for every file in turn, in the calling process."""
+        for file_path in self.files:
+            for chunk in iter_log_chunks(file_path, self.chunk_size):
+                yield file_path, chunk
+
+    def aggregate(self,
+                  aggregate_factory: Callable[[], Any],
+                  group_by: Sequence[str] = DEFAULT_GROUP_BY) -> Dict[GroupKey, Any]:
+        """
+        Computes one aggregate per group over all files, in parallel per file.
+
+        Args:
+            aggregate_factory (Callable[[], Any]): Picklable callable creating an empty aggregate
+                (an object with `update(entry)`, `merge(other)` and `get_stats()`).
+            group_by (Sequence[str]): Entry fields forming the group key. A missing
+                'simulation_run_id'/'run_id' falls back to the name of the file's directory
+                (the run directory); other missing fields group under None. Pass () for a
+                single overall group.
+
+        Returns:
+            Dict[GroupKey, Any]: The merged aggregate of every group, keyed by the tuple of
+                                 `group_by` values.
+        """
+        self.errors = {}
+        merged: Dict[GroupKey, Any] = {}
+        for file_path, partials, error in self._map_files(aggregate_factory, tuple(group_by)):
+            if error:
+                print(f"LogDataset Warning: Failed to read {file_path}: {error}")
+                self.errors[file_path] = error
+            for key, partial_aggregate in partials.items():
+                if key in merged:
+                    merged[key].merge(partial_aggregate)
+                else:
+                    merged[key] = partial_aggregate
+        return merged
+
+    def field_stats(self,
+                    data_field_path: Union[str, List[str]],
+                    source: Optional[str] = None,
+                    event_type: Optional[str] = None,
+                    group_by: Sequence[str] = DEFAULT_GROUP_BY) -> Dict[GroupKey, Optional[Dict[str, Any]]]:
+        """
+        Descriptive statistics of a numeric 'data' field per group (count, mean, min, max,
+        stdev, sum; see `RunningFieldStats.get_stats`).
+        """
+        factory = partial(RunningFieldStats, data_field_path, source, event_type)
+        return {key: aggregate.get_stats() for key, aggregate in self.aggregate(factory, group_by).items()}
+
+    def event_counts(self,
+                     source: Optional[str] = None,
+                     group_by: Sequence[str] = DEFAULT_GROUP_BY) -> Dict[GroupKey, Optional[Dict[str, Any]]]:
+        """Number of entries per event type, per group (see `RunningEventCounts.get_stats`)."""
+        factory = partial(RunningEventCounts, source)
+        return {key: aggregate.get_stats() for key, aggregate in self.aggregate(factory, group_by).items()}
+
+    def _map_files(self, aggregate_factory: Callable[[], Any], group_by: Tuple[str, ...]) -> Iterator[Tuple[str, Dict[GroupKey, Any], Optional[str]]]:
+        if self.max_workers == 1 or len(self.files) <= 1:
+            for file_path in self.files:
+                yield _aggregate_file(file_path, aggregate_factory, group_by, self.chunk_size)
+            return
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(_aggregate_file, file_path, aggregate_factory, group_by, self.chunk_size)
+                       for file_path in self.files]
+            for future in as_completed(futures):
+                yield future.result()
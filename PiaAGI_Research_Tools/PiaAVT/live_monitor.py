@@ -0,0 +1,205 @@
+# PiaAGI_Hub/PiaAVT/live_monitor.py
+"""
+Live analysis of a log file that is still being written by a running simulation.
+
+`LiveLogMonitor` combines a `JsonlLogTailer` with incremental analyses: each poll
+ingests only the newly appended entries and folds them into running field
+statistics, the single-pass `AnalysisPipeline` (goal lifecycles, emotion
+trajectories, ...) and a `CompiledSequenceMatcher`. Nothing is re-read or
+re-analysed, so refreshing the view of a multi-GB log costs only the new bytes.
+
+Entries are processed in file order, which for append-only loggers is also
+chronological order.
+"""
+
+import os
+from typing import List, Dict, Any, Optional, Union
+
+try:
+    from .core.log_tailer import JsonlLogTailer, LogEntry
+    from .analyzers.running_stats import RunningFieldStats
+    from .analyzers.sequence_matcher import CompiledSequenceMatcher, SequencePattern, SequenceMatch
+    from .Analysis_Implementations.analysis_pipeline import AnalysisPipeline
+except ImportError:
+    from core.log_tailer import JsonlLogTailer, LogEntry
+    from analyzers.running_stats import RunningFieldStats
+    from analyzers.sequence_matcher import CompiledSequenceMatcher, SequencePattern, SequenceMatch
+    from Analysis_Implementations.analysis_pipeline import AnalysisPipeline
+
+# Events kept indexed by event_id for tracing intrinsic goal triggers while following a log
+DEFAULT_MAX_INDEXED_EVENTS = 10000
+
+
+class LiveLogMonitor:
+    """
+    Incrementally analyses a growing JSONL log file.
+
+    Args:
+        file_path (str): The JSONL file to follow.
+        from_beginning (bool): If True (default), existing content is ingested on the first
+            poll. If False, only entries written after the monitor was created are analysed.
+        target_agent_id (Optional[str]): Filter for pipeline analyses that support agent filtering.
+        target_simulation_run_id (Optional[str]): Filter for pipeline analyses that support
+            simulation run filtering.
+        max_matches_kept (int): Number of most recent matches kept per sequence pattern;
+            older matches are only counted.
+        max_indexed_events (int): Number of most recent events the intrinsic motivation
+            analysis keeps indexed by event_id for tracing goal triggers. Events already
+            referenced as triggers are always kept.
+
+    Attributes:
+        tailer (JsonlLogTailer): The incremental file reader.
+        pipeline (AnalysisPipeline): The single-pass analyses fed with every new entry.
+        sequence_matcher (CompiledSequenceMatcher): Matcher for the registered sequence patterns.
+    """
+
+    def __init__(self,
+                 file_path: str,
+                 from_beginning: bool = True,
+                 target_agent_id: Optional[str] = None,
+                 target_simulation_run_id: Optional[str] = None,
+                 max_matches_kept: int = 100,
+                 max_indexed_events: int = DEFAULT_MAX_INDEXED_EVENTS):
+        start_offset = 0
+        if not from_beginning:
+            try:
+                start_offset = os.path.getsize(file_path)
+            except OSError:
+                start_offset = 0
+        self.tailer = JsonlLogTailer(file_path, start_offset=start_offset)
+        self.target_agent_id = target_agent_id
+        self.target_simulation_run_id = target_simulation_run_id
+        self.max_indexed_events = max_indexed_events
+        self.pipeline = AnalysisPipeline.with_default_analyses(target_agent_id, target_simulation_run_id,
+                                                               max_indexed_events)
+        self.sequence_matcher = CompiledSequenceMatcher()
+        self.max_matches_kept = max_matches_kept
+        self._field_stats: Dict[str, RunningFieldStats] = {}
+        self._match_counts: Dict[str, int] = {}
+        self._recent_matches: Dict[str, List[List[LogEntry]]] = {}
+
+    @property
+    def file_path(self) -> str:
+        """The followed log file."""
+        return self.tailer.file_path
+
+    @property
+    def entries_processed(self) -> int:
+        """Number of entries ingested so far."""
+        return self.pipeline.entries_processed
+
+    def add_field_stats(self,
+                        data_field_path: Union[str, List[str]],
+                        source: Optional[str] = None,
+                        event_type: Optional[str] = None,
+                        name: Optional[str] = None) -> str:
+        """
+        Starts tracking running statistics for a numeric 'data' field.
+        Only entries ingested after this call are counted.
+
+        Returns:
+            str: The name under which the statistics are reported (defaults to the dotted field path).
+
+        Raises:
+            ValueError: If statistics with the same name are already tracked.
+        """
+        if name is None:
+            name = data_field_path if isinstance(data_field_path, str) else ".".join(data_field_path)
+        if name in self._field_stats:
+            raise ValueError(f"Field statistics named '{name}' are already tracked.")
+        self._field_stats[name] = RunningFieldStats(data_field_path, source, event_type)
+        return name
+
+    def add_sequence(self,
+                     name: str,
+                     sequence_definition: List[Dict[str, Optional[str]]],
+                     max_time_between_steps_seconds: Optional[float] = None,
+                     max_intervening_logs: Optional[int] = None,
+                     allow_repeats_in_definition: bool = False) -> None:
+        """
+        Starts matching an event sequence (same definition format as `EventSequencer`).
+        Only entries ingested after this call are considered.
+
+        Raises:
+            ValueError: If the definition is invalid or the name is already registered.
+        """
+        self.sequence_matcher.add_pattern(SequencePattern(
+            name, sequence_definition,
+            max_time_between_steps_seconds=max_time_between_steps_seconds,
+            max_intervening_logs=max_intervening_logs,
+            allow_repeats_in_definition=allow_repeats_in_definition,
+        ))
+        self._match_counts[name] = 0
+        self._recent_matches[name] = []
+
+    def poll(self, max_bytes: Optional[int] = None) -> List[LogEntry]:
+        """
+        Ingests the entries appended to the file since the previous poll.
+
+        If the file was truncated or replaced since the previous poll, all aggregates
+        are reset before the new content is ingested.
+
+        Args:
+            max_bytes (Optional[int]): Upper bound on the bytes read by this poll.
+
+        Returns:
+            List[LogEntry]: The newly ingested entries.
+        """
+        resets_before = self.tailer.resets
+        new_entries = self.tailer.read_new_entries(max_bytes=max_bytes)
+        if self.tailer.resets != resets_before:
+            print(f"LiveLogMonitor: {self.file_path} was truncated or replaced; restarting analyses from its beginning.")
+            self._reset_aggregates()
+        for entry in new_entries:
+            self.pipeline.process_entry(entry)
+            for stats in self._field_stats.values():
+                stats.update(entry)
+            for match in self.sequence_matcher.feed(entry):
+                self._record_match(match)
+        return new_entries
+
+    def get_field_stats(self, name: str) -> Optional[Dict[str, Any]]:
+        """Returns the running statistics tracked under `name`, or None if none are available."""
+        stats = self._field_stats.get(name)
+        return stats.get_stats() if stats else None
+
+    def get_sequence_matches(self, name: str) -> List[List[LogEntry]]:
+        """Returns the most recent matches (up to `max_matches_kept`) of the named sequence."""
+        return list(self._recent_matches.get(name, []))
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of all running aggregates.
+
+        Returns:
+            Dict[str, Any]: {"file_path", "offset", "entries_processed", "malformed_lines",
+                             "field_stats": {name: stats}, "sequence_match_counts": {name: count},
+                             "analyses": combined AnalysisPipeline report}
+        """
+        return {
+            "file_path": self.file_path,
+            "offset": self.tailer.offset,
+            "entries_processed": self.entries_processed,
+            "malformed_lines": self.tailer.malformed_lines,
+            "field_stats": {name: stats.get_stats() for name, stats in self._field_stats.items()},
+            "sequence_match_counts": dict(self._match_counts),
+            "analyses": self.pipeline.report(),
+        }
+
+    def _reset_aggregates(self) -> None:
+        self.pipeline = AnalysisPipeline.with_default_analyses(self.target_agent_id, self.target_simulation_run_id,
+                                                               self.max_indexed_events)
+        self._field_stats = {
+            name: RunningFieldStats(stats.data_field_path, stats.source, stats.event_type)
+            for name, stats in self._field_stats.items()
+        }
+        self.sequence_matcher.reset()
+        self._match_counts = dict.fromkeys(self._match_counts, 0)
+        self._recent_matches = {name: [] for name in self._recent_matches}
+
+    def _record_match(self, match: SequenceMatch) -> None:
+        self._match_counts[match.pattern_name] += 1
+        recent = self._recent_matches[match.pattern_name]
+        recent.append(match.entries)
+        if len(recent) > self.max_matches_kept:
+            del recent[:len(recent) - self.max_matches_kept]
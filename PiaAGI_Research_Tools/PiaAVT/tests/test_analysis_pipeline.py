@@ -0,0 +1,108 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+# Adjust imports to reach PiaAVT components from the tests directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from PiaAVT.Analysis_Implementations.analysis_pipeline import AnalysisPipeline, run_full_analysis_jsonl
+from PiaAVT.Analysis_Implementations.Goal_Dynamics_Analysis import analyze_goal_lifecycles
+from PiaAVT.Analysis_Implementations.emotional_state_trajectory_analysis import analyze_emotional_trajectory as analyze_vad_trajectory
+from PiaAVT.Analysis_Implementations.emotional_trajectory_analysis import analyze_emotional_trajectory
+from PiaAVT.Analysis_Implementations.intrinsic_motivation_analysis import analyze_intrinsic_motivation
+from PiaAVT.Analysis_Implementations.task_performance_analysis import analyze_task_performance
+
+
+class _CountingAnalysis:
+    """Minimal analysis used to check event-type routing."""
+    def __init__(self, name, event_types):
+        self.name = name
+        self.event_types = event_types
+        self.seen = []
+
+    def process_entry(self, entry):
+        self.seen.append(entry["event_type"])
+
+    def finalize(self):
+        return list(self.seen)
+
+
+class TestAnalysisPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.logs = [
+            {"timestamp": 100.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_id": "evt_percept",
+             "event_type": "PERCEPTION_INPUT_PROCESSED", "event_data": {"novelty_score": 0.9}},
+            {"timestamp": 101.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "GOAL_CREATED",
+             "event_data": {"goal_id": "g1", "description": "Explore", "type": "INTRINSIC_CURIOSITY",
+                            "initial_priority": 0.6, "source_trigger_event_id": "evt_percept"}},
+            {"timestamp": 102.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "GOAL_CREATED",
+             "event_data": {"goal_id": "t1", "description": "Fetch", "type": "EXTRINSIC_TASK", "initial_priority": 5.0}},
+            {"timestamp": 103.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "EMOTION_STATE_UPDATED",
+             "event_data": {"current_vad": {"valence": 0.2, "arousal": 0.5, "dominance": 0.1}, "current_discrete_emotion": "interest"}},
+            {"timestamp": 104.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "GOAL_STATUS_CHANGED",
+             "event_data": {"goal_id": "t1", "new_state": "ACTIVE"}},
+            {"timestamp": 105.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "EMOTION_STATE_UPDATED",
+             "event_data": {"current_vad": {"valence": 0.6, "arousal": 0.3, "dominance": 0.4}, "current_discrete_emotion": "joy"}},
+            {"timestamp": 106.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "GOAL_STATUS_CHANGED",
+             "event_data": {"goal_id": "t1", "new_state": "ACHIEVED"}},
+            {"timestamp": 107.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "GOAL_STATE_CHANGED",
+             "event_data": {"goal_id": "g1", "new_state": "ACHIEVED"}},
+        ]
+
+    def test_routes_only_to_interested_analyses(self):
+        emotions = _CountingAnalysis("emotions", {"EMOTION_STATE_UPDATED"})
+        everything = _CountingAnalysis("everything", None)
+        pipeline = AnalysisPipeline([emotions, everything])
+        report = pipeline.run(self.logs)
+        self.assertEqual(report["emotions"], ["EMOTION_STATE_UPDATED", "EMOTION_STATE_UPDATED"])
+        self.assertEqual(len(report["everything"]), len(self.logs))
+        self.assertEqual(pipeline.entries_processed, len(self.logs))
+
+    def test_duplicate_analysis_name_rejected(self):
+        pipeline = AnalysisPipeline([_CountingAnalysis("a", None)])
+        with self.assertRaises(ValueError):
+            pipeline.register(_CountingAnalysis("a", {"X"}))
+
+    def test_default_report_matches_individual_analyses(self):
+        report = AnalysisPipeline.with_default_analyses().run(self.logs)
+        self.assertEqual(report["goal_dynamics"], analyze_goal_lifecycles(self.logs))
+        self.assertEqual(report["emotional_state_trajectory"], analyze_vad_trajectory(self.logs))
+        self.assertEqual(report["emotional_trajectory"], analyze_emotional_trajectory(self.logs))
+        self.assertEqual(report["intrinsic_motivation"], analyze_intrinsic_motivation(self.logs))
+        self.assertEqual(report["task_performance"], analyze_task_performance(self.logs))
+
+        self.assertEqual(report["intrinsic_motivation"]["simulation_run_id"], "sim1")
+        self.assertEqual(report["intrinsic_motivation"]["intrinsic_goals_analyzed"][0]["potential_triggers"][0]["event_type"],
+                         "PERCEPTION_INPUT_PROCESSED")
+        self.assertEqual(report["task_performance"]["t1"]["outcome"], "SUCCESS")
+        self.assertEqual(report["emotional_state_trajectory"]["summary_stats"]["count"], 2)
+
+    def test_report_can_be_refreshed_incrementally(self):
+        pipeline = AnalysisPipeline.with_default_analyses()
+        pipeline.process_entries(self.logs[:4])
+        partial = pipeline.report()
+        self.assertNotIn("outcome", partial["goal_dynamics"]["g1"])
+        pipeline.process_entries(self.logs[4:])
+        self.assertEqual(pipeline.report()["goal_dynamics"], analyze_goal_lifecycles(self.logs))
+
+    def test_run_full_analysis_jsonl_reads_file_once_sorted(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            for entry in reversed(self.logs): # Out of order on disk
+                f.write(json.dumps(entry) + "\n")
+            f.write("\n{not json}\n")
+            path = f.name
+        try:
+            report = run_full_analysis_jsonl(path, target_agent_id="agentA")
+        finally:
+            os.remove(path)
+        self.assertEqual(report["goal_dynamics"], analyze_goal_lifecycles(self.logs))
+        self.assertEqual(report["emotional_state_trajectory"]["agent_id"], "agentA")
+
+    def test_run_jsonl_missing_file(self):
+        self.assertEqual(AnalysisPipeline.with_default_analyses().run_jsonl("/nonexistent/log.jsonl"), {})
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
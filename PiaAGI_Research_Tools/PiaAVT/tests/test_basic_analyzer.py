@@ -204,5 +204,3 @@ class TestBasicAnalyzer(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
-
-```
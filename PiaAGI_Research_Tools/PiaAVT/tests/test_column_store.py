@@ -0,0 +1,80 @@
+# PiaAGI_Hub/PiaAVT/tests/test_column_store.py
+
+import unittest
+import os
+from datetime import datetime
+
+# Adjust import path
+try:
+    from core.column_store import LogColumnStore, parse_timestamps, seconds_to_datetime
+    from analyzers.basic_analyzer import BasicAnalyzer
+except ImportError:
+    import sys
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    pia_avt_dir = os.path.dirname(current_dir)
+    sys.path.insert(0, pia_avt_dir)
+    from core.column_store import LogColumnStore, parse_timestamps, seconds_to_datetime
+    from analyzers.basic_analyzer import BasicAnalyzer
+
+
+def _make_logs():
+    logs = []
+    for i in range(60):
+        logs.append({
+            "timestamp": f"2024-01-15T10:{i // 60:02}:{i % 60:02}.{i:03}Z",
+            "source": f"Agent{i % 3}",
+            "event_type": "reward" if i % 2 == 0 else "action",
+            "simulation_run_id": "sim_A" if i < 30 else "sim_B",
+            "data": {"reward": i * 0.5, "metrics": {"score": i}} if i % 2 == 0 else {"action": "move"},
+        })
+    logs.append({"timestamp": "not a timestamp", "source": "Agent0", "event_type": "reward", "data": {"reward": "n/a"}})
+    logs.append({"event_type": "reward", "data": {"reward": 100}}) # No timestamp, no source
+    return logs
+
+
+class TestLogColumnStore(unittest.TestCase):
+
+    def setUp(self):
+        self.logs = _make_logs()
+        self.store = LogColumnStore(self.logs)
+        self.analyzer = BasicAnalyzer(self.logs)
+
+    def test_timestamps_are_parsed_once(self):
+        self.assertEqual(len(self.store), 62)
+        self.assertEqual(seconds_to_datetime(self.store.timestamps[5]), datetime(2024, 1, 15, 10, 0, 5, 5000))
+        self.assertEqual(int(sum(ts != ts for ts in self.store.timestamps)), 2) # NaN for the two bad rows
+        # Other formats go through strptime
+        self.assertEqual(parse_timestamps(["15/01/2024"], "%d/%m/%Y")[0], parse_timestamps(["2024-01-15T00:00:00.0Z"])[0])
+
+    def test_counts_match_basic_analyzer(self):
+        self.assertEqual(self.store.count_unique_values("source"), dict(self.analyzer.count_unique_values("source")))
+        mask = self.store.mask(event_type="reward")
+        self.assertEqual(self.store.count_unique_values("source", mask),
+                         dict(self.analyzer.count_unique_values("source", event_type="reward")))
+        self.assertEqual(self.store.categories("simulation_run_id"), ["sim_A", "sim_B"])
+
+    def test_multi_value_and_time_filters(self):
+        mask = self.store.mask(source=["Agent0", "Agent1"], simulation_run_id="sim_B",
+                               start_time=datetime(2024, 1, 15, 10, 0, 40))
+        expected = [i for i, log in enumerate(self.logs[:60])
+                    if log["source"] in ("Agent0", "Agent1") and i >= 40]
+        self.assertEqual([self.logs.index(e) for e in self.store.select(mask)], expected)
+        self.assertFalse(self.store.mask(source="Unknown").any())
+        self.assertTrue(self.store.mask(source=[]).all())
+
+    def test_stats_and_series_match_basic_analyzer(self):
+        start, end = datetime(2024, 1, 15, 10, 0, 10), datetime(2024, 1, 15, 10, 0, 50)
+        expected = self.analyzer.get_descriptive_stats(["metrics", "score"], start_time=start, end_time=end)
+        stats = self.store.get_descriptive_stats(["metrics", "score"], self.store.mask(start_time=start, end_time=end))
+        for key, value in expected.items():
+            self.assertAlmostEqual(stats[key], value)
+        self.assertEqual(self.store.get_descriptive_stats("reward")["count"], 31) # Includes the row without timestamp
+        self.assertIsNone(self.store.get_descriptive_stats("missing"))
+
+        x, y = self.store.get_time_series_arrays("reward", self.store.mask(source="Agent0"))
+        expected_series = self.analyzer.get_time_series("reward", source="Agent0")
+        self.assertEqual([(seconds_to_datetime(s), v) for s, v in zip(x, y)], expected_series)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,125 @@
+import unittest
+import os
+import sys
+import json
+import random
+import statistics
+import tempfile
+
+# Adjust imports to reach PiaAVT components from the tests directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from PiaAVT.dataset import LogDataset, iter_log_chunks
+from PiaAVT.analyzers.running_stats import RunningFieldStats, RunningEventCounts
+from PiaAVT.api import PiaAVTAPI
+
+
+class TestLogDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.rewards = {}
+        rng = random.Random(7)
+        # Two experiments, three runs each; exp_b runs are split over two files.
+        for experiment in ("exp_a", "exp_b"):
+            for run in range(3):
+                run_id = f"{experiment}_run{run}"
+                values = [rng.uniform(-1, 1) for _ in range(rng.randint(5, 40))]
+                self.rewards[(experiment, run_id)] = values
+                halves = [values] if experiment == "exp_a" else [values[:len(values) // 2], values[len(values) // 2:]]
+                for part, part_values in enumerate(halves):
+                    run_dir = os.path.join(self.temp_dir.name, experiment, f"{run_id}_part{part}")
+                    os.makedirs(run_dir)
+                    with open(os.path.join(run_dir, "piase_internal_log.jsonl"), 'w') as f:
+                        for value in part_values:
+                            f.write(json.dumps({"experiment_id": experiment, "simulation_run_id": run_id,
+                                                "event_type": "ACTION", "data": {"reward": value}}) + "\n")
+                            f.write(json.dumps({"experiment_id": experiment, "simulation_run_id": run_id,
+                                                "event_type": "TICK", "data": {}}) + "\n")
+        self.pattern = os.path.join(self.temp_dir.name, "**", "piase_internal_log.jsonl")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _assert_stats_match(self, stats, values):
+        self.assertEqual(stats["count"], len(values))
+        self.assertAlmostEqual(stats["mean"], statistics.mean(values))
+        self.assertAlmostEqual(stats["stdev"], statistics.stdev(values))
+        self.assertAlmostEqual(stats["sum"], sum(values))
+        self.assertEqual(stats["min"], min(values))
+        self.assertEqual(stats["max"], max(values))
+
+    def test_resolves_glob_and_directory(self):
+        self.assertEqual(len(LogDataset(self.pattern)), 9)
+        self.assertEqual(len(LogDataset(os.path.join(self.temp_dir.name, "exp_a"))), 3)
+
+    def test_field_stats_grouped_by_run_in_process(self):
+        dataset = LogDataset(self.pattern, max_workers=1, chunk_size=4)
+        stats = dataset.field_stats("reward")
+        self.assertEqual(set(stats), set(self.rewards))
+        for key, values in self.rewards.items():
+            self._assert_stats_match(stats[key], values)
+
+    def test_parallel_workers_match_in_process(self):
+        parallel = LogDataset(self.pattern, max_workers=2, chunk_size=3).field_stats("reward", group_by=("experiment_id",))
+        for experiment in ("exp_a", "exp_b"):
+            values = [v for (exp, _), vals in self.rewards.items() if exp == experiment for v in vals]
+            self._assert_stats_match(parallel[(experiment,)], values)
+
+    def test_event_counts_overall(self):
+        counts = LogDataset(self.pattern, max_workers=1).event_counts(group_by=())
+        total_actions = sum(len(values) for values in self.rewards.values())
+        self.assertEqual(counts[()]["by_event_type"], {"ACTION": total_actions, "TICK": total_actions})
+
+    def test_missing_run_id_falls_back_to_run_directory(self):
+        run_dir = os.path.join(self.temp_dir.name, "piase_runs", "run_20240101-000000_abcd")
+        os.makedirs(run_dir)
+        with open(os.path.join(run_dir, "piase_internal_log.jsonl"), 'w') as f:
+            f.write(json.dumps({"wall_time": 1.0, "simulation_step": 0, "event_type": "STEP",
+                                "source_component": "Engine", "data": {"reward": 2}}))
+        stats = LogDataset(run_dir, max_workers=1).field_stats("reward")
+        self.assertEqual(list(stats), [(None, "run_20240101-000000_abcd")])
+        self.assertEqual(stats[(None, "run_20240101-000000_abcd")]["sum"], 2)
+
+    def test_iter_log_chunks_bounds_chunk_size(self):
+        file_path = LogDataset(self.pattern).files[0]
+        chunks = list(iter_log_chunks(file_path, chunk_size=5))
+        self.assertTrue(all(len(chunk) <= 5 for chunk in chunks))
+        with open(file_path) as f:
+            self.assertEqual(sum(len(chunk) for chunk in chunks), sum(1 for line in f if line.strip()))
+
+    def test_api_open_log_dataset(self):
+        api = PiaAVTAPI()
+        self.assertIsNone(api.open_log_dataset(os.path.join(self.temp_dir.name, "nothing_*.jsonl")))
+        dataset = api.open_log_dataset(self.pattern, max_workers=1)
+        self.assertEqual(len(dataset), 9)
+        self.assertEqual(api.get_log_count(), 0)
+
+
+class TestRunningStatsMerge(unittest.TestCase):
+
+    def test_merged_stats_equal_single_pass(self):
+        values = [random.Random(3).uniform(0, 10) for _ in range(50)]
+        entries = [{"data": {"v": value}} for value in values]
+        single = RunningFieldStats("v")
+        for entry in entries:
+            single.update(entry)
+        left, right, empty = RunningFieldStats("v"), RunningFieldStats("v"), RunningFieldStats("v")
+        for entry in entries[:17]:
+            left.update(entry)
+        for entry in entries[17:]:
+            right.update(entry)
+        merged = empty.merge(left).merge(right).get_stats()
+        for key, value in single.get_stats().items():
+            self.assertAlmostEqual(merged[key], value)
+
+    def test_event_counts_merge(self):
+        a, b = RunningEventCounts(), RunningEventCounts()
+        a.update({"event_type": "X"})
+        b.update({"event_type": "X"})
+        b.update({"event_type": "Y"})
+        self.assertEqual(a.merge(b).get_stats(), {"total": 3, "by_event_type": {"X": 2, "Y": 1}})
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,148 @@
+# PiaAGI_Hub/PiaAVT/tests/test_downsampling.py
+
+import unittest
+import os
+import math
+from datetime import datetime, timedelta
+import numpy as np
+import matplotlib # Important for backend configuration in non-GUI environments
+matplotlib.use('Agg') # Use a non-interactive backend for tests
+
+# Adjust import path
+try:
+    from visualizers.downsampling import TimeseriesPyramid, minmax_downsample, lttb_downsample
+    from visualizers.timeseries_plotter import TimeseriesPlotter
+except ImportError:
+    import sys
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    pia_avt_dir = os.path.dirname(current_dir)
+    sys.path.insert(0, pia_avt_dir)
+    from visualizers.downsampling import TimeseriesPyramid, minmax_downsample, lttb_downsample
+    from visualizers.timeseries_plotter import TimeseriesPlotter
+
+
+def _make_series(n, spike_at=None):
+    start = datetime(2024, 1, 15, 10, 0, 0)
+    series = [(start + timedelta(seconds=i), math.sin(i / 40.0)) for i in range(n)]
+    if spike_at is not None:
+        series[spike_at] = (series[spike_at][0], 25.0)
+    return series
+
+
+class TestDownsamplingFunctions(unittest.TestCase):
+
+    def test_minmax_keeps_extremes_of_each_bucket(self):
+        y = np.array([0.0, 5.0, 1.0, -3.0, 2.0, 2.0, 9.0, 0.5])
+        x = np.arange(len(y), dtype=float)
+        selected = minmax_downsample(x, y, 2)
+        self.assertEqual(selected.tolist(), [1, 3, 6, 7])
+
+    def test_minmax_returns_everything_for_short_series(self):
+        y = np.arange(5, dtype=float)
+        self.assertEqual(minmax_downsample(y, y, 10).tolist(), [0, 1, 2, 3, 4])
+
+    def test_lttb_keeps_endpoints_and_threshold(self):
+        x = np.arange(1000, dtype=float)
+        y = np.sin(x / 30.0)
+        y[500] = 10.0
+        selected = lttb_downsample(x, y, 50)
+        self.assertEqual(len(selected), 50)
+        self.assertEqual(selected[0], 0)
+        self.assertEqual(selected[-1], 999)
+        self.assertIn(500, selected.tolist())
+        self.assertTrue(np.all(np.diff(selected) > 0))
+
+    def test_invalid_parameters(self):
+        y = np.arange(10, dtype=float)
+        with self.assertRaises(ValueError):
+            minmax_downsample(y, y, 0)
+        with self.assertRaises(ValueError):
+            lttb_downsample(y, y, 2)
+
+
+class TestTimeseriesPyramid(unittest.TestCase):
+
+    def test_levels_shrink_and_points_are_bounded(self):
+        series = _make_series(20000, spike_at=12345)
+        pyramid = TimeseriesPyramid(series)
+        sizes = pyramid.level_sizes
+        self.assertEqual(sizes[0], 20000)
+        self.assertTrue(all(a > b for a, b in zip(sizes, sizes[1:])))
+        self.assertLessEqual(sizes[-1], 256)
+
+        points = pyramid.get_points(300)
+        self.assertLessEqual(len(points), 600)
+        self.assertEqual(points, sorted(points))
+        self.assertIn(series[12345], points) # The spike survives every level
+        self.assertEqual(max(v for _, v in points), 25.0)
+        self.assertEqual(min(v for _, v in points), min(v for _, v in series))
+
+        lttb_points = pyramid.get_points(300, method="lttb")
+        self.assertLessEqual(len(lttb_points), 300)
+
+    def test_zoom_window_returns_raw_points_when_they_fit(self):
+        series = _make_series(5000)
+        pyramid = TimeseriesPyramid(series)
+        window = pyramid.get_points(500, series[100][0], series[199][0])
+        self.assertEqual(window, series[100:200])
+
+    def test_zoom_window_is_downsampled_within_bounds(self):
+        series = _make_series(50000)
+        pyramid = TimeseriesPyramid(series)
+        start, end = series[10000][0], series[30000][0]
+        window = pyramid.get_points(200, start, end)
+        self.assertLessEqual(len(window), 400)
+        self.assertTrue(all(start <= ts <= end for ts, _ in window))
+
+    def test_non_numeric_values_are_skipped_and_input_is_sorted(self):
+        series = _make_series(10)
+        mixed = list(reversed(series)) + [(datetime(2024, 1, 15, 11), "n/a"), (datetime(2024, 1, 15, 11), None)]
+        pyramid = TimeseriesPyramid(mixed)
+        self.assertEqual(pyramid.skipped_points, 2)
+        self.assertEqual(pyramid.get_points(100), series)
+        self.assertEqual(pyramid.time_range, (series[0][0], series[-1][0]))
+
+    def test_unknown_method_raises(self):
+        with self.assertRaises(ValueError):
+            TimeseriesPyramid(_make_series(10)).get_points(10, method="average")
+
+    def test_from_arrays_matches_list_construction(self):
+        series = _make_series(5000, spike_at=1234)
+        epoch = datetime(1970, 1, 1)
+        seconds = np.array([(ts - epoch).total_seconds() for ts, _ in series])
+        values = np.array([v for _, v in series])
+        values_with_gap = np.append(values, np.nan)
+        from_arrays = TimeseriesPyramid.from_arrays(np.append(seconds, seconds[-1] + 1), values_with_gap)
+        from_list = TimeseriesPyramid(series)
+        self.assertEqual(from_arrays.skipped_points, 1)
+        self.assertEqual(len(from_arrays), len(from_list))
+        self.assertEqual(from_arrays.level_sizes, from_list.level_sizes)
+        self.assertEqual(from_arrays.get_points(200), from_list.get_points(200))
+        self.assertEqual(from_arrays.time_range, from_list.time_range)
+
+
+class TestPlotterDownsampling(unittest.TestCase):
+
+    def setUp(self):
+        self.plotter = TimeseriesPlotter()
+        self.test_output_file = "temp_test_downsampled_plot.png"
+
+    def tearDown(self):
+        if os.path.exists(self.test_output_file):
+            os.remove(self.test_output_file)
+
+    def test_prepare_plot_points_bounds_long_series(self):
+        series = _make_series(10000)
+        self.assertEqual(len(self.plotter.prepare_plot_points(series, 100, downsample_method=None)), 10000)
+        self.assertLessEqual(len(self.plotter.prepare_plot_points(series, 100)), 200)
+        short = series[:50]
+        self.assertEqual(self.plotter.prepare_plot_points(short, 100), short)
+
+    def test_plot_pyramid_creates_output_file(self):
+        pyramid = TimeseriesPyramid(_make_series(10000, spike_at=5000))
+        self.plotter.plot_time_series(pyramid, output_file=self.test_output_file, show_plot=False, pixel_width=400)
+        self.assertTrue(os.path.exists(self.test_output_file))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -134,6 +134,34 @@ class TestEventSequencer(unittest.TestCase):
         self.assertEqual(len(sequences), 1) # Still expects distinct logs for each step
         self.assertEqual([s["data"]["id"] for s in sequences[0]], [11, 12])
 
+    def test_extract_multiple_event_sequences(self):
+        definitions = {
+            "qtr": self.defined_sequence_QTR,
+            "double_thinking": [
+                {"event_type": "Thinking", "source": "Agent"},
+                {"event_type": "Thinking", "source": "Agent"},
+            ],
+            "empty": [],
+        }
+        results = self.sequencer.extract_multiple_event_sequences(definitions, max_time_between_steps_seconds=3.0)
+        self.assertEqual(set(results.keys()), {"qtr", "double_thinking", "empty"})
+        for name in ("qtr", "double_thinking"):
+            self.assertEqual(
+                results[name],
+                self.sequencer.extract_event_sequences(definitions[name], max_time_between_steps_seconds=3.0)
+            )
+        self.assertEqual(results["empty"], [])
+
+    def test_iter_sequence_matches_is_generator(self):
+        matches = self.sequencer.iter_sequence_matches({"qtr": self.defined_sequence_QTR}, max_intervening_logs=0)
+        first = next(matches)
+        self.assertEqual(first.pattern_name, "qtr")
+        self.assertEqual([s["data"]["id"] for s in first.entries], [1, 2, 3])
+        self.assertEqual(
+            [first.entries] + [match.entries for match in matches],
+            self.sequencer.extract_event_sequences(self.defined_sequence_QTR, max_intervening_logs=0)
+        )
+
     def test_format_sequences_for_display_no_sequences(self):
         formatted_str = self.sequencer.format_sequences_for_display([])
         self.assertEqual(formatted_str, "No event sequences found.")
@@ -150,4 +178,3 @@ class TestEventSequencer(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
-```
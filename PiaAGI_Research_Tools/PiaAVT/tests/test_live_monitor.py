@@ -0,0 +1,252 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+# Adjust imports to reach PiaAVT components from the tests directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from PiaAVT.core.log_tailer import JsonlLogTailer, normalize_log_entry
+from PiaAVT.analyzers.running_stats import RunningFieldStats
+from PiaAVT.analyzers.basic_analyzer import BasicAnalyzer
+from PiaAVT.analyzers.event_sequencer import EventSequencer
+from PiaAVT.Analysis_Implementations.analysis_pipeline import AnalysisPipeline
+from PiaAVT.live_monitor import LiveLogMonitor
+from PiaAVT.api import PiaAVTAPI
+
+
+def _line(entry):
+    return json.dumps(entry) + "\n"
+
+
+class _TempLogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, "live_log.jsonl")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def append(self, text):
+        with open(self.log_path, 'a') as f:
+            f.write(text)
+
+
+class TestJsonlLogTailer(_TempLogTestCase):
+
+    def test_missing_file_returns_nothing_until_created(self):
+        tailer = JsonlLogTailer(self.log_path)
+        self.assertEqual(tailer.read_new_entries(), [])
+        self.append(_line({"event_type": "A"}))
+        self.assertEqual([e["event_type"] for e in tailer.read_new_entries()], ["A"])
+
+    def test_reads_only_appended_entries(self):
+        self.append(_line({"event_type": "A"}) + _line({"event_type": "B"}))
+        tailer = JsonlLogTailer(self.log_path)
+        self.assertEqual(len(tailer.read_new_entries()), 2)
+        self.assertEqual(tailer.read_new_entries(), [])
+        self.append(_line({"event_type": "C"}))
+        self.assertEqual([e["event_type"] for e in tailer.read_new_entries()], ["C"])
+        self.assertEqual(tailer.offset, os.path.getsize(self.log_path))
+        self.assertEqual(tailer.entries_read, 3)
+
+    def test_partial_trailing_line_is_held_back(self):
+        full_line = _line({"event_type": "A", "data": {"value": 1}})
+        self.append(full_line[:10])
+        tailer = JsonlLogTailer(self.log_path)
+        self.assertEqual(tailer.read_new_entries(), [])
+        self.assertTrue(tailer.has_partial_line)
+        self.assertEqual(tailer.offset, 0)
+        self.append(full_line[10:])
+        entries = tailer.read_new_entries()
+        self.assertEqual(entries[0]["data"], {"value": 1})
+        self.assertFalse(tailer.has_partial_line)
+
+    def test_max_bytes_bounds_each_read(self):
+        lines = [_line({"event_type": f"E{i}"}) for i in range(5)]
+        self.append("".join(lines))
+        tailer = JsonlLogTailer(self.log_path)
+        seen = []
+        for _ in range(20):
+            seen.extend(e["event_type"] for e in tailer.read_new_entries(max_bytes=7))
+        self.assertEqual(seen, [f"E{i}" for i in range(5)])
+
+    def test_truncated_file_is_reread(self):
+        self.append(_line({"event_type": "A"}) + _line({"event_type": "B"}))
+        tailer = JsonlLogTailer(self.log_path)
+        tailer.read_new_entries()
+        with open(self.log_path, 'w') as f:
+            f.write(_line({"event_type": "C"}))
+        self.assertEqual([e["event_type"] for e in tailer.read_new_entries()], ["C"])
+        self.assertEqual(tailer.resets, 1)
+
+    def test_malformed_lines_are_skipped(self):
+        self.append('{"event_type": "A"}\nnot json\n[1, 2]\n{"event_type": "B"}\n')
+        tailer = JsonlLogTailer(self.log_path)
+        self.assertEqual([e["event_type"] for e in tailer.read_new_entries()], ["A", "B"])
+        self.assertEqual(tailer.malformed_lines, 2)
+
+    def test_normalize_log_entry_fills_aliases_without_overwriting(self):
+        piase_entry = normalize_log_entry({"wall_time": 5.0, "source_component": "Engine", "event_type": "X", "data": {"a": 1}})
+        self.assertEqual(piase_entry["timestamp"], 5.0)
+        self.assertEqual(piase_entry["source"], "Engine")
+        self.assertEqual(piase_entry["event_data"], {"a": 1})
+        prototype_entry = normalize_log_entry({"timestamp": 1.0, "source": "S", "source_component_id": "Other", "event_data": {"b": 2}})
+        self.assertEqual(prototype_entry["source"], "S")
+        self.assertEqual(prototype_entry["data"], {"b": 2})
+
+
+class TestRunningFieldStats(unittest.TestCase):
+
+    def test_matches_basic_analyzer(self):
+        logs = [
+            {"timestamp": "2024-01-15T10:00:0%d.000Z" % i, "source": "Agent" if i % 2 else "Env",
+             "event_type": "Action", "data": {"reward": value, "nested": {"score": i}}}
+            for i, value in enumerate([0.5, 1.0, -0.1, 3, 2.25, "n/a"])
+        ]
+        analyzer = BasicAnalyzer(logs)
+        for field_path, source in (("reward", None), (["nested", "score"], "Agent")):
+            running = RunningFieldStats(field_path, source=source)
+            for entry in logs:
+                running.update(entry)
+            expected = analyzer.get_descriptive_stats(field_path, source=source)
+            actual = running.get_stats()
+            for key in ("count", "min", "max", "sum"):
+                self.assertEqual(actual[key], expected[key])
+            self.assertAlmostEqual(actual["mean"], expected["mean"])
+            self.assertAlmostEqual(actual["stdev"], expected["stdev"])
+
+    def test_no_values(self):
+        running = RunningFieldStats("reward")
+        running.update({"data": {"other": 1}})
+        self.assertIsNone(running.get_stats())
+
+
+class TestLiveLogMonitor(_TempLogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.logs = [
+            {"timestamp": 100.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "GOAL_CREATED",
+             "source": "Motivation", "event_data": {"goal_id": "g1", "description": "Explore", "initial_priority": 0.6}},
+            {"timestamp": 101.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "EMOTION_STATE_UPDATED",
+             "source": "Emotion", "event_data": {"current_vad": {"valence": 0.4, "arousal": 0.5, "dominance": 0.1}}},
+            {"timestamp": 102.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "ACTION",
+             "source": "Agent", "event_data": {"reward": 1.5}},
+            {"timestamp": 103.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "GOAL_ACTIVATED",
+             "source": "Motivation", "event_data": {"goal_id": "g1"}},
+            {"timestamp": 104.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "ACTION",
+             "source": "Agent", "event_data": {"reward": -0.5}},
+            {"timestamp": 105.0, "agent_id": "agentA", "simulation_run_id": "sim1", "event_type": "GOAL_STATE_CHANGED",
+             "source": "Motivation", "event_data": {"goal_id": "g1", "new_state": "ACHIEVED", "reason": "done"}},
+        ]
+
+    def test_incremental_polls_match_single_pass(self):
+        monitor = LiveLogMonitor(self.log_path)
+        monitor.add_field_stats("reward")
+        monitor.add_sequence("act_then_goal", [{"event_type": "ACTION"}, {"event_type": "GOAL_ACTIVATED"}])
+
+        self.append("".join(_line(e) for e in self.logs[:3]))
+        self.assertEqual(len(monitor.poll()), 3)
+        self.assertEqual(monitor.get_field_stats("reward")["count"], 1)
+        self.append("".join(_line(e) for e in self.logs[3:]))
+        self.assertEqual(len(monitor.poll()), 3)
+
+        report = monitor.report()
+        expected = AnalysisPipeline.with_default_analyses().run(
+            [normalize_log_entry(json.loads(_line(e))) for e in self.logs])
+        self.assertEqual(report["analyses"], expected)
+        self.assertEqual(report["entries_processed"], 6)
+        self.assertEqual(report["field_stats"]["reward"]["sum"], 1.0)
+        self.assertEqual(report["sequence_match_counts"], {"act_then_goal": 1})
+        self.assertEqual([e["event_type"] for e in monitor.get_sequence_matches("act_then_goal")[0]],
+                         ["ACTION", "GOAL_ACTIVATED"])
+
+    def test_sequence_matches_equal_event_sequencer(self):
+        logs = [{"timestamp": "2024-01-15T10:00:%02d.000Z" % i, "source": "S", "event_type": et, "data": {"i": i}}
+                for i, et in enumerate("ABABBAABA")]
+        definition = [{"event_type": "A"}, {"event_type": "B"}]
+        monitor = LiveLogMonitor(self.log_path, max_matches_kept=2)
+        monitor.add_sequence("ab", definition, max_intervening_logs=1)
+        for entry in logs:
+            self.append(_line(entry))
+            monitor.poll()
+        normalized_logs = [normalize_log_entry(dict(entry)) for entry in logs]
+        expected = EventSequencer(normalized_logs).extract_event_sequences(definition, max_intervening_logs=1)
+        self.assertEqual(monitor.report()["sequence_match_counts"]["ab"], len(expected))
+        self.assertEqual(monitor.get_sequence_matches("ab"), expected[-2:])
+
+    def test_from_end_skips_existing_content(self):
+        self.append(_line(self.logs[0]))
+        monitor = LiveLogMonitor(self.log_path, from_beginning=False)
+        self.assertEqual(monitor.poll(), [])
+        self.append(_line(self.logs[1]))
+        self.assertEqual([e["event_type"] for e in monitor.poll()], ["EMOTION_STATE_UPDATED"])
+
+    def test_truncation_resets_aggregates(self):
+        monitor = LiveLogMonitor(self.log_path)
+        monitor.add_field_stats("reward")
+        self.append("".join(_line(e) for e in self.logs))
+        monitor.poll()
+        with open(self.log_path, 'w') as f:
+            f.write(_line(self.logs[2]))
+        monitor.poll()
+        self.assertEqual(monitor.entries_processed, 1)
+        self.assertEqual(monitor.get_field_stats("reward")["count"], 1)
+        self.assertEqual(monitor.report()["analyses"]["goal_dynamics"], {})
+
+    def test_epoch_timestamps_enforce_max_time_between_steps(self):
+        # PiaSELogger writes float epoch seconds as wall_time
+        monitor = LiveLogMonitor(self.log_path)
+        monitor.add_sequence("ab", [{"event_type": "A"}, {"event_type": "B"}], max_time_between_steps_seconds=1.0)
+        for wall_time, event_type in [(1000.0, "A"), (5000.0, "B"), (5000.5, "A"), (5001.0, "B")]:
+            self.append(_line({"wall_time": wall_time, "simulation_step": 0, "event_type": event_type,
+                               "source_component": "Engine", "data": {}}))
+        monitor.poll()
+        self.assertEqual(monitor.report()["sequence_match_counts"], {"ab": 1})
+        self.assertEqual([e["timestamp"] for e in monitor.get_sequence_matches("ab")[0]], [5000.5, 5001.0])
+
+    def test_trigger_index_is_bounded(self):
+        def goal(i, trigger_id):
+            return {"timestamp": 200.0 + i, "event_type": "GOAL_CREATED", "event_id": f"goal{i}",
+                    "event_data": {"goal_id": f"g{i}", "type": "INTRINSIC_CURIOSITY", "source_trigger_event_id": trigger_id}}
+        logs = [{"timestamp": float(i), "event_type": "PERCEPT", "event_id": f"e{i}"} for i in range(50)]
+        logs += [goal(0, "e48"), goal(1, "e2")] # e2 is out of a 5-event window by now
+        logs += [{"timestamp": 300.0 + i, "event_type": "PERCEPT", "event_id": f"late{i}"} for i in range(50)]
+        monitor = LiveLogMonitor(self.log_path, max_indexed_events=5)
+        self.append("".join(_line(e) for e in logs))
+        monitor.poll()
+        accumulator = monitor.pipeline.get_analysis("intrinsic_motivation")
+        self.assertLessEqual(len(accumulator._events_by_id), 5)
+        goals = monitor.report()["analyses"]["intrinsic_motivation"]["intrinsic_goals_analyzed"]
+        self.assertEqual([g["potential_triggers"][0]["event_type"] for g in goals], ["PERCEPT", "CONCEPTUAL_TRIGGER"])
+        # Unbounded (batch) indexing still finds every trigger
+        batch = AnalysisPipeline.with_default_analyses().run([normalize_log_entry(e) for e in logs])
+        triggers = [g["potential_triggers"][0]["event_type"] for g in batch["intrinsic_motivation"]["intrinsic_goals_analyzed"]]
+        self.assertEqual(triggers, ["PERCEPT", "PERCEPT"])
+
+
+class TestApiFollowMode(_TempLogTestCase):
+
+    def test_follow_poll_and_report(self):
+        api = PiaAVTAPI()
+        self.assertIsNone(api.get_live_report())
+        self.assertTrue(api.follow_log_jsonl(self.log_path))
+        self.assertEqual(api.follow_field_stats("reward"), "reward")
+        self.assertTrue(api.follow_event_sequence("ab", [{"event_type": "A"}, {"event_type": "B"}]))
+        self.assertFalse(api.follow_event_sequence("bad", []))
+        self.append(_line({"timestamp": "2024-01-15T10:00:00.000Z", "event_type": "A", "data": {"reward": 2}}))
+        self.append(_line({"timestamp": "2024-01-15T10:00:01.000Z", "event_type": "B", "data": {"reward": 4}}))
+        self.assertEqual(api.poll_followed_log(), 2)
+        report = api.get_live_report()
+        self.assertEqual(report["field_stats"]["reward"]["mean"], 3)
+        self.assertEqual(report["sequence_match_counts"], {"ab": 1})
+        self.assertEqual(api.get_log_count(), 0) # Followed entries are not stored
+        api.stop_following()
+        self.assertEqual(api.poll_followed_log(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -166,6 +166,25 @@ class TestLoggingSystem(unittest.TestCase):
         self.assertEqual(self.logging_system.get_log_count(), 2)
         self.assertEqual(self.logging_system.get_log_data(), entries)
 
+    def _schema_entry(self, event_type):
+        return {"timestamp": "2024-01-15T10:00:00.000Z", "simulation_run_id": "sim_run_001",
+                "experiment_id": "exp_A", "agent_id": "agent_alpha", "source_component_id": "PiaCML.Memory.LTM",
+                "log_level": "INFO", "event_type": event_type, "event_data": {"value": 1}}
+
+    def test_load_logs_from_jsonl_stream(self):
+        entry_1, entry_2 = self._schema_entry("Stored"), self._schema_entry("Retrieved")
+        # Mixed bytes/str lines as produced by an upload stream, with a blank and a broken line
+        lines = [json.dumps(entry_1).encode('utf-8') + b"\n", b"\n", b"{not json\n", json.dumps(entry_2) + "\n"]
+        added = self.logging_system.load_logs_from_jsonl_stream(iter(lines), source_name="upload")
+        self.assertEqual(added, 2)
+        self.assertEqual(self.logging_system.get_log_data(), [entry_1, entry_2])
+        self.assertEqual(self.logging_system.load_logs_from_jsonl_stream([]), 0)
+
+    def test_load_logs_from_jsonl_stream_invalid_entry(self):
+        lines = [json.dumps(self._schema_entry("Stored")), json.dumps({"event_type": "NoTimestamp"})]
+        with self.assertRaises(LogValidationError):
+            self.logging_system.load_logs_from_jsonl_stream(lines)
+        self.assertEqual(self.logging_system.get_log_count(), 0) # All-or-nothing, as for files
+
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
-```
@@ -0,0 +1,101 @@
+# PiaAGI_Hub/PiaAVT/tests/test_sequence_matcher.py
+
+import unittest
+
+# Adjust import path
+try:
+    from analyzers.sequence_matcher import CompiledSequenceMatcher, SequencePattern, SequenceMatch
+except ImportError:
+    import sys
+    import os
+    current_dir = os.path.dirname(os.path.abspath(__file__)) # .../PiaAVT/tests
+    pia_avt_dir = os.path.dirname(current_dir) # .../PiaAVT
+    sys.path.insert(0, pia_avt_dir)
+    from analyzers.sequence_matcher import CompiledSequenceMatcher, SequencePattern, SequenceMatch
+
+
+def _log(second: int, source: str, event_type: str, log_id: int):
+    return {"timestamp": f"2024-01-15T10:00:{second:02d}.000Z", "source": source, "event_type": event_type, "data": {"id": log_id}}
+
+
+class TestCompiledSequenceMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.logs = [
+            _log(0, "User", "Query", 1),
+            _log(1, "Agent", "Thinking", 2),
+            _log(2, "Agent", "Response", 3),
+            _log(3, "User", "Query", 4),
+            _log(4, "System", "Notification", 5),
+            _log(9, "Agent", "Response", 6),
+        ]
+
+    def test_pattern_validation(self):
+        with self.assertRaises(ValueError):
+            SequencePattern("empty", [])
+        with self.assertRaises(ValueError):
+            SequencePattern("bad", ["Query"]) # type: ignore
+
+    def test_duplicate_pattern_name_rejected(self):
+        matcher = CompiledSequenceMatcher([SequencePattern("p", [{"event_type": "Query"}])])
+        with self.assertRaises(ValueError):
+            matcher.add_pattern(SequencePattern("p", [{"event_type": "Response"}]))
+
+    def test_multiple_patterns_single_pass(self):
+        matcher = CompiledSequenceMatcher([
+            SequencePattern("query_response", [{"event_type": "Query"}, {"event_type": "Response"}]),
+            SequencePattern("any_agent", [{"source": "Agent"}]),
+        ])
+        matches = list(matcher.match_stream(self.logs))
+        by_pattern = {}
+        for match in matches:
+            self.assertIsInstance(match, SequenceMatch)
+            by_pattern.setdefault(match.pattern_name, []).append([e["data"]["id"] for e in match.entries])
+        self.assertEqual(by_pattern["query_response"], [[1, 3], [4, 6]])
+        self.assertEqual(by_pattern["any_agent"], [[2], [3], [6]])
+
+    def test_time_constraint_expires_partial_matches(self):
+        matcher = CompiledSequenceMatcher([
+            SequencePattern("qr", [{"event_type": "Query"}, {"event_type": "Response"}], max_time_between_steps_seconds=2.0),
+        ])
+        matches = list(matcher.match_stream(self.logs))
+        self.assertEqual([[e["data"]["id"] for e in m.entries] for m in matches], [[1, 3]])
+        self.assertEqual(matcher.pending_count(), 0) # Query 4 expired when Response 6 arrived
+
+    def test_intervening_constraint_and_pruning(self):
+        matcher = CompiledSequenceMatcher(
+            [SequencePattern("qr", [{"event_type": "Query"}, {"event_type": "Response"}], max_intervening_logs=0)],
+            prune_interval=1,
+        )
+        matcher.feed(self.logs[3]) # Query
+        self.assertEqual(matcher.pending_count(), 1)
+        matcher.feed(self.logs[4]) # Notification; the pending Query can no longer be extended
+        self.assertEqual(matcher.pending_count(), 0)
+        self.assertEqual(matcher.feed(self.logs[5]), [])
+
+    def test_incremental_feed_keeps_state(self):
+        matcher = CompiledSequenceMatcher([
+            SequencePattern("qtr", [{"event_type": "Query"}, {"event_type": "Thinking"}, {"event_type": "Response"}]),
+        ])
+        self.assertEqual(matcher.feed(self.logs[0]), [])
+        self.assertEqual(matcher.feed(self.logs[1]), [])
+        completed = matcher.feed(self.logs[2])
+        self.assertEqual(len(completed), 1)
+        self.assertEqual(completed[0].start_index, 0)
+        self.assertEqual(matcher.position, 3)
+        matcher.reset()
+        self.assertEqual(matcher.position, 0)
+        self.assertEqual(matcher.pending_count(), 0)
+
+    def test_max_partial_matches_per_step_bounds_state(self):
+        matcher = CompiledSequenceMatcher(
+            [SequencePattern("qr", [{"event_type": "Query"}, {"event_type": "Response"}])],
+            max_partial_matches_per_step=1,
+        )
+        list(matcher.match_stream([self.logs[0], self.logs[3]]))
+        self.assertEqual(matcher.pending_count(), 1)
+        completed = matcher.feed(self.logs[5])
+        self.assertEqual([e["data"]["id"] for e in completed[0].entries], [4, 6]) # Oldest attempt was dropped
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
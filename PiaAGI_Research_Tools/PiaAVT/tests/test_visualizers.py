@@ -164,4 +164,3 @@ class TestStateVisualizer(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
-```
@@ -0,0 +1,257 @@
+# PiaAGI_Hub/PiaAVT/visualizers/downsampling.py
+"""
+Downsampling and level-of-detail access to long time series for plotting.
+
+A plot cannot show more distinct points than it has horizontal pixels, yet the
+plotters used to hand every raw point of a run to Matplotlib. This module provides:
+
+- `minmax_downsample`: keeps the minimum and maximum of each bucket, which preserves
+  the visual envelope (spikes and dips) of the series exactly at pixel resolution.
+- `lttb_downsample`: Largest-Triangle-Three-Buckets, which keeps the points that
+  best preserve the perceived shape of the line.
+- `TimeseriesPyramid`: a multi-resolution pyramid built once per series. Each level
+  halves the previous one with min-max decimation, so a query for a pixel width and
+  zoom window reads a level holding only a small multiple of the requested points.
+  Query cost depends on the pixel width, not on the length of the log.
+"""
+from datetime import datetime, timedelta
+from typing import List, Tuple, Any, Optional
+
+import numpy as np
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+DOWNSAMPLE_METHODS = ("minmax", "lttb")
+
+
+def _to_seconds(timestamp: datetime) -> float:
+    """Converts a (naive or aware) datetime to seconds on a common axis."""
+    if timestamp.tzinfo is not None:
+        return timestamp.timestamp()
+    return (timestamp - _NAIVE_EPOCH).total_seconds()
+
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Selects the minimum and maximum point of each of `n_buckets` equal-count buckets.
+
+    Args:
+        x (np.ndarray): Sorted x coordinates (only the count is used; buckets are positional).
+        y (np.ndarray): Y values, same length as `x`.
+        n_buckets (int): Number of buckets (typically the pixel width of the plot).
+
+    Returns:
+        np.ndarray: Sorted indices of the selected points (at most 2 per bucket). All
+                    indices are returned if the series is not longer than 2 * n_buckets.
+    """
+    n = len(y)
+    if n_buckets <= 0:
+        raise ValueError("n_buckets must be a positive integer.")
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    bucket_ids = np.repeat(np.arange(n_buckets), np.diff(edges))
+    mins = np.minimum.reduceat(y, starts)
+    maxs = np.maximum.reduceat(y, starts)
+    # First position in each bucket that attains the bucket's min / max
+    min_positions = np.flatnonzero(y == mins[bucket_ids])
+    _, first_min = np.unique(bucket_ids[min_positions], return_index=True)
+    max_positions = np.flatnonzero(y == maxs[bucket_ids])
+    _, first_max = np.unique(bucket_ids[max_positions], return_index=True)
+    return np.unique(np.concatenate((min_positions[first_min], max_positions[first_max])))
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. The remaining points are split into
+    `threshold - 2` buckets and, from each bucket, the point forming the largest triangle
+    with the previously selected point and the average of the next bucket is kept.
+
+    Args:
+        x (np.ndarray): Sorted x coordinates.
+        y (np.ndarray): Y values, same length as `x`.
+        threshold (int): Number of points to keep (at least 3).
+
+    Returns:
+        np.ndarray: Sorted indices of the selected points.
+    """
+    n = len(y)
+    if threshold < 3:
+        raise ValueError("threshold must be at least 3 for LTTB downsampling.")
+    if n <= threshold:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start = end
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        areas = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+class TimeseriesPyramid:
+    """
+    Multi-resolution representation of one (datetime, value) series for fast plotting.
+
+    Level 0 holds every numeric point; each further level keeps the minimum and maximum
+    of every 4 consecutive points of the level below, halving its size, until a level
+    has at most `min_level_points` points. Non-numeric values are skipped.
+
+    Args:
+        time_series_data (List[Tuple[datetime, Any]]): (timestamp, value) pairs, as returned
+            by `BasicAnalyzer.get_time_series`. Sorted by timestamp if they are not already.
+        min_level_points (int): Size at which no coarser level is built.
+
+    Attributes:
+        skipped_points (int): Number of input points ignored because their value was not numeric.
+    """
+
+    def __init__(self, time_series_data: List[Tuple[datetime, Any]], min_level_points: int = 256):
+        if min_level_points < 4:
+            raise ValueError("min_level_points must be at least 4.")
+        numeric = [(ts, value) for ts, value in time_series_data
+                   if isinstance(value, (int, float)) and value == value] # value == value drops NaN
+        self.skipped_points = len(time_series_data) - len(numeric)
+
+        x = np.fromiter((_to_seconds(ts) for ts, _ in numeric), dtype=float, count=len(numeric))
+        if len(x) > 1 and np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind="stable")
+            numeric = [numeric[i] for i in order]
+            x = x[order]
+        self._points: Optional[List[Tuple[datetime, Any]]] = numeric
+        self._x_levels: List[np.ndarray] = [x]
+        self._y_levels: List[np.ndarray] = [np.fromiter((v for _, v in numeric), dtype=float, count=len(numeric))]
+        self._index_levels: List[np.ndarray] = [np.arange(len(numeric))]
+        self._build_levels(min_level_points)
+
+    @classmethod
+    def from_arrays(cls, seconds: np.ndarray, values: np.ndarray, min_level_points: int = 256) -> "TimeseriesPyramid":
+        """
+        Builds a pyramid directly from float arrays, e.g. the columns of a `LogColumnStore`,
+        without materializing a (datetime, value) pair per point.
+
+        Args:
+            seconds (np.ndarray): Timestamps as seconds since the naive epoch, sorted ascending.
+            values (np.ndarray): Numeric values, same length; NaN values are skipped.
+            min_level_points (int): Size at which no coarser level is built.
+        """
+        if min_level_points < 4:
+            raise ValueError("min_level_points must be at least 4.")
+        pyramid = cls.__new__(cls)
+        x = np.asarray(seconds, dtype=float)
+        y = np.asarray(values, dtype=float)
+        keep = ~np.isnan(y)
+        pyramid.skipped_points = int(len(y) - keep.sum())
+        x, y = x[keep], y[keep]
+        if len(x) > 1 and np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind="stable")
+            x, y = x[order], y[order]
+        pyramid._points = None # Points are created on demand from level 0
+        pyramid._x_levels = [x]
+        pyramid._y_levels = [y]
+        pyramid._index_levels = [np.arange(len(x))]
+        pyramid._build_levels(min_level_points)
+        return pyramid
+
+    def _point(self, index: int) -> Tuple[datetime, Any]:
+        if self._points is not None:
+            return self._points[index]
+        return _NAIVE_EPOCH + timedelta(seconds=float(self._x_levels[0][index])), float(self._y_levels[0][index])
+
+    def __len__(self) -> int:
+        return len(self._x_levels[0])
+
+    @property
+    def level_sizes(self) -> List[int]:
+        """Number of points held by each level, finest first."""
+        return [len(level) for level in self._x_levels]
+
+    @property
+    def time_range(self) -> Optional[Tuple[datetime, datetime]]:
+        """(first, last) timestamp of the series, or None if it is empty."""
+        if not len(self):
+            return None
+        return self._point(0)[0], self._point(len(self) - 1)[0]
+
+    def get_points(self,
+                   pixel_width: int,
+                   start: Optional[datetime] = None,
+                   end: Optional[datetime] = None,
+                   method: str = "minmax") -> List[Tuple[datetime, Any]]:
+        """
+        Returns the points needed to draw the series at `pixel_width` pixels wide.
+
+        Args:
+            pixel_width (int): Horizontal resolution of the plot area.
+            start (Optional[datetime]): Start of the zoom window (inclusive). None for the series start.
+            end (Optional[datetime]): End of the zoom window (inclusive). None for the series end.
+            method (str): "minmax" (up to 2 points per pixel, preserves extremes) or
+                          "lttb" (up to 1 point per pixel, preserves shape).
+
+        Returns:
+            List[Tuple[datetime, Any]]: Original (timestamp, value) pairs, in time order. If the
+                                        window holds few enough points, all of them are returned.
+
+        Raises:
+            ValueError: If `method` is unknown or `pixel_width` is not positive.
+        """
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"Unknown downsampling method '{method}'. Use one of {DOWNSAMPLE_METHODS}.")
+        if pixel_width <= 0:
+            raise ValueError("pixel_width must be a positive integer.")
+        target = 2 * pixel_width if method == "minmax" else max(pixel_width, 3)
+        start_s = _to_seconds(start) if start is not None else None
+        end_s = _to_seconds(end) if end is not None else None
+
+        # Coarsest level that still resolves the window at the requested density
+        chosen = None
+        for level in range(len(self._x_levels) - 1, -1, -1):
+            lo, hi = self._window(level, start_s, end_s)
+            if hi - lo >= target or level == 0:
+                chosen = (level, lo, hi)
+                break
+        level, lo, hi = chosen
+        x = self._x_levels[level][lo:hi]
+        y = self._y_levels[level][lo:hi]
+        if level == 0 and hi - lo <= target:
+            selected = np.arange(hi - lo)
+        elif method == "minmax":
+            selected = minmax_downsample(x, y, pixel_width)
+        else:
+            selected = lttb_downsample(x, y, target)
+        raw_indices = self._index_levels[level][lo:hi][selected]
+        return [self._point(i) for i in raw_indices]
+
+    def _window(self, level: int, start_s: Optional[float], end_s: Optional[float]) -> Tuple[int, int]:
+        x = self._x_levels[level]
+        lo = int(np.searchsorted(x, start_s, side="left")) if start_s is not None else 0
+        hi = int(np.searchsorted(x, end_s, side="right")) if end_s is not None else len(x)
+        return lo, max(lo, hi)
+
+    def _build_levels(self, min_level_points: int) -> None:
+        while len(self._x_levels[-1]) > min_level_points:
+            x, y, idx = self._x_levels[-1], self._y_levels[-1], self._index_levels[-1]
+            full = (len(y) // 4) * 4
+            blocks = y[:full].reshape(-1, 4)
+            offsets = np.arange(0, full, 4)
+            arg_min = offsets + np.argmin(blocks, axis=1)
+            arg_max = offsets + np.argmax(blocks, axis=1)
+            keep = np.unique(np.concatenate((arg_min, arg_max)))
+            keep = np.concatenate((keep, np.arange(full, len(y)))) # Remainder (< 4 points) is kept as-is
+            self._x_levels.append(x[keep])
+            self._y_levels.append(y[keep])
+            self._index_levels.append(idx[keep])
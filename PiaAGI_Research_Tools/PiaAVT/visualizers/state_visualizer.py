@@ -219,5 +219,3 @@ if __name__ == "__main__":
 
     empty_wm_data = {"active_elements": [], "capacity_used_percent": 0}
     print(visualizer.visualize_working_memory(empty_wm_data, title="Working Memory (Empty)"))
-
-```
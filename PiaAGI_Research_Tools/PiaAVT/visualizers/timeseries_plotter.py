@@ -13,12 +13,24 @@ that extracts the time-series data from logs, but it can also plot any
 appropriately formatted time-series data.
 It optionally integrates with 'mplcursors' for interactive data point tooltips
 if the library is installed.
+
+Long series are downsampled to the plot's pixel width before they reach Matplotlib
+(see `visualizers/downsampling.py`), so plotting cost does not grow with log length.
+When a plot is shown interactively, zooming re-queries the series' resolution
+pyramid for the visible window.
 """
-from typing import List, Tuple, Any, Optional
+from typing import List, Tuple, Any, Optional, Union
 from datetime import datetime
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
+try:
+    from .downsampling import TimeseriesPyramid
+except ImportError:
+    from downsampling import TimeseriesPyramid
+
+TimeSeriesInput = Union[List[Tuple[datetime, Any]], TimeseriesPyramid]
+
 # Note: The comment below was in the original file.
 # Assuming LogEntry and BasicAnalyzer might be used for data preparation,
 # but this module focuses on plotting given time-series data.
@@ -51,15 +63,56 @@ class TimeseriesPlotter:
             # mplcursors is optional, so we pass if not found.
             pass
 
+    def prepare_plot_points(self,
+                            time_series_data: TimeSeriesInput,
+                            pixel_width: int,
+                            x_range: Optional[Tuple[Optional[datetime], Optional[datetime]]] = None,
+                            downsample_method: Optional[str] = "minmax") -> List[Tuple[datetime, Any]]:
+        """
+        Returns the points to hand to Matplotlib for a plot `pixel_width` pixels wide.
+
+        Numeric series with more points than the plot can resolve are reduced through a
+        `TimeseriesPyramid` (built on the fly for plain lists; pass a prebuilt pyramid to
+        reuse it across plots). Short or non-numeric series are returned unchanged apart
+        from the `x_range` window.
+
+        Args:
+            time_series_data (TimeSeriesInput): (timestamp, value) pairs or a TimeseriesPyramid.
+            pixel_width (int): Horizontal resolution of the plot area in pixels.
+            x_range (Optional[Tuple[Optional[datetime], Optional[datetime]]]): Zoom window (start, end);
+                either bound may be None.
+            downsample_method (Optional[str]): "minmax", "lttb", or None to disable downsampling
+                of plain lists.
+
+        Returns:
+            List[Tuple[datetime, Any]]: The points to plot, in time order.
+        """
+        start, end = x_range if x_range else (None, None)
+        if isinstance(time_series_data, TimeseriesPyramid):
+            return time_series_data.get_points(pixel_width, start, end, method=downsample_method or "minmax")
+
+        points = time_series_data
+        if start is not None or end is not None:
+            points = [item for item in points
+                      if (start is None or item[0] >= start) and (end is None or item[0] <= end)]
+        if not downsample_method or len(points) <= 2 * pixel_width:
+            return points
+        if not all(isinstance(item[1], (int, float)) for item in points):
+            return points # Downsampling needs numeric values; leave mixed data to Matplotlib
+        return TimeseriesPyramid(points).get_points(pixel_width, method=downsample_method)
+
     def plot_time_series(self,
-                         time_series_data: List[Tuple[datetime, Any]],
+                         time_series_data: TimeSeriesInput,
                          title: str = "Time Series Plot",
                          x_label: str = "Time",
                          y_label: str = "Value",
                          output_file: Optional[str] = None,
                          show_plot: bool = True,
                          line_style: str = '-',
-                         marker: str = 'o') -> None:
+                         marker: str = 'o',
+                         pixel_width: Optional[int] = None,
+                         x_range: Optional[Tuple[Optional[datetime], Optional[datetime]]] = None,
+                         downsample_method: Optional[str] = "minmax") -> None:
         """
         Plots time-series data as a line graph.
 
@@ -84,24 +137,49 @@ class TimeseriesPlotter:
                               or when only saving the file.
             line_style (str): The style of the plot line (e.g., '-', '--', ':').
             marker (str): The marker style for data points (e.g., 'o', '.', ',').
+            pixel_width (Optional[int]): Horizontal resolution used for downsampling. Defaults to
+                                         the figure width in pixels.
+            x_range (Optional[Tuple[Optional[datetime], Optional[datetime]]]): Initial zoom window.
+            downsample_method (Optional[str]): "minmax" (default, keeps spikes), "lttb" (keeps shape),
+                                               or None to plot every raw point. A TimeseriesPyramid
+                                               input is always queried at `pixel_width`.
         """
-        if not time_series_data:
+        if not time_series_data: # Also covers an empty TimeseriesPyramid
             print("TimeseriesPlotter: No data provided to plot.")
             return
 
-        timestamps = [item[0] for item in time_series_data]
-        values = [item[1] for item in time_series_data]
+        figsize = (12, 6)
+        plot_width_px = pixel_width or int(figsize[0] * plt.rcParams['figure.dpi'])
+        if (downsample_method and not isinstance(time_series_data, TimeseriesPyramid)
+                and len(time_series_data) > 2 * plot_width_px
+                and all(isinstance(item[1], (int, float)) for item in time_series_data)):
+            time_series_data = TimeseriesPyramid(time_series_data) # Enables level-of-detail zooming below
+        plot_points = self.prepare_plot_points(time_series_data, plot_width_px, x_range, downsample_method)
+
+        timestamps = [item[0] for item in plot_points]
+        values = [item[1] for item in plot_points]
 
         # Basic check for numeric Y-values; essential for meaningful line plots.
         if not all(isinstance(v, (int, float)) for v in values if v is not None):
             print("TimeseriesPlotter Warning: Not all Y-axis values are numeric. Plot might be non-sensical or raise errors.")
 
         # Create figure and axes objects
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = plt.subplots(figsize=figsize)
 
         # Plot the data, get the line object for potential use with mplcursors
         line, = ax.plot(timestamps, values, linestyle=line_style, marker=marker)
 
+        # Level of detail: when the user zooms or pans, fetch only the points of the visible window
+        if show_plot and isinstance(time_series_data, TimeseriesPyramid):
+            def on_xlim_changed(axes):
+                x_min, x_max = axes.get_xlim()
+                window_points = time_series_data.get_points(plot_width_px,
+                                                            mdates.num2date(x_min), mdates.num2date(x_max),
+                                                            method=downsample_method or "minmax")
+                if window_points:
+                    line.set_data([item[0] for item in window_points], [item[1] for item in window_points])
+            ax.callbacks.connect('xlim_changed', on_xlim_changed)
+
         ax.set_title(title)
         ax.set_xlabel(x_label)
         ax.set_ylabel(y_label)
@@ -219,4 +297,3 @@ if __name__ == "__main__":
     # if os.path.exists("sample_mixed_timeseries.png"):
         # os.remove("sample_mixed_timeseries.png")
         # pass
-```
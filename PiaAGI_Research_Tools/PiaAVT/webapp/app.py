@@ -4,6 +4,10 @@ import sys
 import os
 import pandas as pd # For st.dataframe if used for stats
 import json # For parsing sequence definition if added later
+import io
+import hashlib
+import threading
+from datetime import datetime # For parsing the plot zoom window
 
 # Adjust Python path to import PiaAVTAPI
 # This assumes the webapp/app.py is run from the PiaAGI_Hub/PiaAVT/ directory
@@ -11,6 +15,7 @@ import json # For parsing sequence definition if added later
 try:
     from PiaAVT.api import PiaAVTAPI
     from PiaAVT.core.logging_system import DEFAULT_TIMESTAMP_FORMAT # For parsing help
+    from PiaAVT.visualizers.downsampling import TimeseriesPyramid
 except ImportError:
     # Fallback for development: if webapp/ is current directory
     # or if PiaAVT/ is current directory
@@ -23,11 +28,13 @@ except ImportError:
         sys.path.insert(0, pia_agi_hub_dir)
         from PiaAVT.api import PiaAVTAPI
         from PiaAVT.core.logging_system import DEFAULT_TIMESTAMP_FORMAT
+        from PiaAVT.visualizers.downsampling import TimeseriesPyramid
     elif os.path.basename(current_dir) == "PiaAVT":
         # If running from PiaAGI_Hub/PiaAVT/ (e.g. streamlit run webapp/app.py)
         sys.path.insert(0, pia_agi_hub_dir)
         from PiaAVT.api import PiaAVTAPI
         from PiaAVT.core.logging_system import DEFAULT_TIMESTAMP_FORMAT
+        from PiaAVT.visualizers.downsampling import TimeseriesPyramid
     else:
         # If imports still fail, user needs to ensure PYTHONPATH is set,
         # or run streamlit from PiaAGI_Hub/PiaAVT directory.
@@ -36,12 +43,104 @@ except ImportError:
         try:
             from api import PiaAVTAPI # For running from PiaAVT as CWD or PiaAVT in PYTHONPATH
             from core.logging_system import DEFAULT_TIMESTAMP_FORMAT
+            from visualizers.downsampling import TimeseriesPyramid
             # If this works, it implies PiaAVT directory itself is in PYTHONPATH or is CWD.
         except ImportError as e_final:
             st.error(f"PiaAVTAPI Import Error: Could not resolve imports. CWD: {os.getcwd()}, Script Dir: {current_dir}. Final error: {e_final}. Ensure PiaAGI_Hub is in PYTHONPATH or run from PiaAVT parent directory.")
             st.stop() # Stop execution if API cannot be loaded
 
 
+# --- Cached computations shared across reruns and sessions ---
+# Streamlit re-executes this script on every widget interaction. Parsed logs are kept by
+# st.cache_resource (one PiaAVTAPI with its columnar store per log content hash, shared
+# by all sessions), and derived results by st.cache_data keyed by (log hash, query
+# parameters), so a rerun only recomputes what the changed widget affects.
+# Arguments with a leading underscore are not part of Streamlit's cache key.
+
+@st.cache_resource(max_entries=4, show_spinner="Parsing log file...")
+def load_log(log_hash: str, _raw_bytes: bytes, _file_name: str) -> PiaAVTAPI:
+    """Parses an uploaded JSONL log (streamed from memory, no temporary file) and builds its column store."""
+    api = PiaAVTAPI()
+    if api.load_logs_from_jsonl_stream(io.BytesIO(_raw_bytes), source_name=f"uploaded file '{_file_name}'"):
+        api.get_column_store()
+    return api
+
+@st.cache_resource(max_entries=4)
+def log_lock(log_hash: str) -> threading.Lock:
+    """Serializes computations on one shared PiaAVTAPI; its analyzers are not thread-safe."""
+    return threading.Lock()
+
+def parse_field_path(field_path_text: str) -> tuple:
+    """'data.metrics.score' (or 'metrics.score') -> ('metrics', 'score'), a path into each entry's 'data'."""
+    parts = [part for part in field_path_text.strip().split('.') if part]
+    return tuple(parts[1:] if len(parts) > 1 and parts[0] == "data" else parts)
+
+def _filter_mask(store, sources: tuple, event_types: tuple, simulation_id, start_time=None, end_time=None):
+    return store.mask(source=sources, event_type=event_types, start_time=start_time, end_time=end_time,
+                      simulation_run_id=simulation_id or None)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def cached_filter_options(log_hash: str, _api: PiaAVTAPI) -> tuple:
+    store = _api.get_column_store()
+    return (sorted(str(v) for v in store.categories("source")),
+            sorted(str(v) for v in store.categories("event_type")))
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_value_counts(log_hash: str, _api: PiaAVTAPI, field: str, sources: tuple = (), event_types: tuple = (),
+                        simulation_id=None) -> dict:
+    store = _api.get_column_store()
+    with log_lock(log_hash):
+        return store.count_unique_values(field, _filter_mask(store, sources, event_types, simulation_id))
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_field_stats(log_hash: str, _api: PiaAVTAPI, field_path: tuple, sources: tuple, event_types: tuple,
+                       simulation_id, start_time_str: str, end_time_str: str):
+    """Descriptive statistics over the column store; raises ValueError for malformed time filters."""
+    start_time = datetime.strptime(start_time_str, DEFAULT_TIMESTAMP_FORMAT) if start_time_str else None
+    end_time = datetime.strptime(end_time_str, DEFAULT_TIMESTAMP_FORMAT) if end_time_str else None
+    store = _api.get_column_store()
+    with log_lock(log_hash):
+        return store.get_descriptive_stats(field_path, _filter_mask(store, sources, event_types, simulation_id, start_time, end_time))
+
+@st.cache_resource(max_entries=32, show_spinner="Building plot levels...")
+def cached_timeseries_pyramid(log_hash: str, _api: PiaAVTAPI, field_path: tuple, sources: tuple,
+                              event_types: tuple, simulation_id):
+    """Resolution pyramid of a filtered series; the time filters act as a zoom window on it."""
+    store = _api.get_column_store()
+    with log_lock(log_hash):
+        seconds, values = store.get_time_series_arrays(field_path, _filter_mask(store, sources, event_types, simulation_id))
+    return TimeseriesPyramid.from_arrays(seconds, values) if len(seconds) else None
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_plot_points(log_hash: str, _api: PiaAVTAPI, field_path: tuple, sources: tuple, event_types: tuple,
+                       simulation_id, pixel_width: int, zoom_start, zoom_end, method: str) -> tuple:
+    """Returns (downsampled points, total points in the series) for one plot."""
+    pyramid = cached_timeseries_pyramid(log_hash, _api, field_path, sources, event_types, simulation_id)
+    if pyramid is None:
+        return [], 0
+    return pyramid.get_points(pixel_width, zoom_start, zoom_end, method=method), len(pyramid)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_event_sequences(log_hash: str, _api: PiaAVTAPI, sequence_definition_json: str,
+                           max_time, max_logs, allow_repeats: bool) -> str:
+    with log_lock(log_hash):
+        return _api.get_formatted_event_sequences(
+            sequence_definition=json.loads(sequence_definition_json),
+            max_time_between_steps_seconds=max_time,
+            max_intervening_logs=max_logs,
+            allow_repeats_in_definition=allow_repeats
+        )
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_analysis(log_hash: str, _api: PiaAVTAPI, analysis_name: str, agent_id=None, simulation_id=None):
+    """Runs one of the Analysis_Implementations through the API ("goal_dynamics", "emotional_trajectory", ...)."""
+    with log_lock(log_hash):
+        if analysis_name == "goal_dynamics":
+            return _api.analyze_goal_dynamics()
+        analyze = getattr(_api, f"analyze_{analysis_name}")
+        return analyze(target_agent_id=agent_id, target_simulation_run_id=simulation_id)
+
+
 # Initialize PiaAVTAPI in Streamlit's session state to persist across interactions
 if 'pia_api' not in st.session_state:
     st.session_state.pia_api = PiaAVTAPI()
@@ -49,8 +148,10 @@ if 'log_file_name' not in st.session_state:
     st.session_state.log_file_name = None
 if 'error_message' not in st.session_state:
     st.session_state.error_message = None
-if 'uploaded_file_name_cache' not in st.session_state: # Cache for uploaded file name
+if 'uploaded_file_name_cache' not in st.session_state: # Identifies the upload already processed
     st.session_state.uploaded_file_name_cache = None
+if 'log_hash' not in st.session_state: # Content hash of the loaded log; key of all cached results
+    st.session_state.log_hash = None
 
 
 st.set_page_config(page_title="PiaAVT Dashboard", layout="wide")
@@ -63,22 +164,20 @@ with st.sidebar:
     uploaded_file = st.file_uploader("Upload Agent Log File (JSONL - one JSON object per line)", type=["jsonl", "json"])
 
     if uploaded_file is not None:
-        if uploaded_file.name != st.session_state.uploaded_file_name_cache:
+        upload_key = getattr(uploaded_file, "file_id", None) or f"{uploaded_file.name}:{uploaded_file.size}"
+        if upload_key != st.session_state.uploaded_file_name_cache:
             st.session_state.error_message = None
-            st.session_state.pia_api = PiaAVTAPI()
-
-            temp_log_path = os.path.join(".", uploaded_file.name) # Consider a more robust temp file handling
+            st.session_state.uploaded_file_name_cache = upload_key
             try:
-                with open(temp_log_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-
-                if st.session_state.pia_api.load_logs_from_jsonl(temp_log_path): # MODIFIED
+                raw_bytes = uploaded_file.getvalue()
+                log_hash = hashlib.sha256(raw_bytes).hexdigest()
+                # Parsed once per distinct content, then shared by every session and rerun
+                loaded_api = load_log(log_hash, raw_bytes, uploaded_file.name)
+                if loaded_api.get_log_count() > 0:
+                    st.session_state.pia_api = loaded_api
+                    st.session_state.log_hash = log_hash
                     st.session_state.log_file_name = uploaded_file.name
-                    st.session_state.uploaded_file_name_cache = uploaded_file.name
-                    if st.session_state.pia_api.get_log_count() > 0:
-                        st.success(f"Loaded {st.session_state.pia_api.get_log_count()} logs from JSONL file '{uploaded_file.name}'.")
-                    else:
-                        st.warning(f"JSONL file '{uploaded_file.name}' processed, but no valid log entries were loaded. File might be empty or all lines had errors.")
+                    st.success(f"Loaded {loaded_api.get_log_count()} logs from JSONL file '{uploaded_file.name}'.")
                     # Reset filters on new file upload
                     st.session_state.filter_source = []
                     st.session_state.filter_event_type = []
@@ -87,16 +186,13 @@ with st.sidebar:
                     st.session_state.filter_simulation_id = "" # Initialize new filter
                 else:
                     st.session_state.log_file_name = None
-                    st.session_state.uploaded_file_name_cache = None
-                    st.error(f"Failed to load JSONL logs from '{uploaded_file.name}'. Ensure it's valid JSONL. Check console for API errors.") # MODIFIED
+                    st.session_state.log_hash = None
+                    st.error(f"Failed to load JSONL logs from '{uploaded_file.name}'. Ensure it's valid JSONL with at least one valid entry. Check console for API errors.")
             except Exception as e:
                 st.session_state.log_file_name = None
-                st.session_state.uploaded_file_name_cache = None
-                st.error(f"Error saving or loading uploaded JSONL file: {e}") # MODIFIED
-            finally:
-                if os.path.exists(temp_log_path):
-                    os.remove(temp_log_path)
-        elif not st.session_state.log_file_name and uploaded_file.name == st.session_state.uploaded_file_name_cache :
+                st.session_state.log_hash = None
+                st.error(f"Error loading uploaded JSONL file: {e}")
+        elif not st.session_state.log_file_name:
              st.warning(f"Previously failed to load {uploaded_file.name}. Try a different file or check logs.")
 
 
@@ -112,9 +208,7 @@ with st.sidebar:
         analyzer = st.session_state.pia_api.get_analyzer()
         if analyzer:
             try:
-                all_logs_for_filters = st.session_state.pia_api.get_all_logs()
-                unique_sources = sorted(list(set(log.get('source', 'N/A') for log in all_logs_for_filters)))
-                unique_event_types = sorted(list(set(log.get('event_type', 'N/A') for log in all_logs_for_filters)))
+                unique_sources, unique_event_types = cached_filter_options(st.session_state.log_hash, st.session_state.pia_api)
 
                 st.session_state.filter_source = st.multiselect("Filter by Source(s)", options=unique_sources, default=st.session_state.filter_source)
                 st.session_state.filter_event_type = st.multiselect("Filter by Event Type(s)", options=unique_event_types, default=st.session_state.filter_event_type)
@@ -143,12 +237,14 @@ if st.session_state.log_file_name:
     # For agent_id, we'll use the 'source' filter, assuming agent IDs might appear there.
     # This might need refinement based on actual log structure.
     g_agent_id_single_filter = g_source_filter_list[0] if len(g_source_filter_list) == 1 else None
-    g_event_type_single_filter = g_event_type_filter_list[0] if len(g_event_type_filter_list) == 1 else None
     
+    # Statistics and plots filter the column store by all selected values.
+    g_log_hash = st.session_state.log_hash
+    g_sources = tuple(g_source_filter_list)
+    g_event_types = tuple(g_event_type_filter_list)
+
     if len(g_source_filter_list) > 1:
-        st.sidebar.warning("Multiple sources selected. For analyses requiring a single agent ID, the first selected source will be used if applicable. Other features might use all selected sources.")
-    if len(g_event_type_filter_list) > 1:
-        st.sidebar.warning("Multiple event types selected. Specific stats/plots might use the first selected type or all, depending on the feature.")
+        st.sidebar.warning("Multiple sources selected. Statistics and plots use all selected sources; analyses requiring a single agent ID ignore the source filter.")
 
 
     tab_titles = [
@@ -172,16 +268,15 @@ if st.session_state.log_file_name:
                 # However, the multiselect needs careful handling.
                 # Let's show unfiltered counts first, then filtered example for specific stats.
 
-                all_logs_unfiltered = st.session_state.pia_api.get_all_logs()
-                st.write(f"**Total Unfiltered Entries:** {len(all_logs_unfiltered)}")
+                st.write(f"**Total Unfiltered Entries:** {st.session_state.pia_api.get_log_count()}")
 
-                sources_count_unfiltered = analyzer.count_unique_values("source")
+                sources_count_unfiltered = cached_value_counts(g_log_hash, st.session_state.pia_api, "source")
                 st.write("**Unique Sources (unfiltered):**")
-                st.json(dict(sources_count_unfiltered))
+                st.json({str(k): v for k, v in sources_count_unfiltered.items()})
 
-                events_count_unfiltered = analyzer.count_unique_values("event_type")
+                events_count_unfiltered = cached_value_counts(g_log_hash, st.session_state.pia_api, "event_type")
                 st.write("**Unique Event Types (unfiltered):**")
-                st.json(dict(events_count_unfiltered))
+                st.json({str(k): v for k, v in events_count_unfiltered.items()})
                 st.caption("Note: Counts above are for the entire dataset. Filters apply to specific stats/plots below.")
 
             except Exception as e:
@@ -191,14 +286,15 @@ if st.session_state.log_file_name:
         stats_field_path = st.text_input("Field Path for Stats (e.g., data.reward or data.metrics.score)", key="stats_field")
         if st.button("Calculate Statistics", key="calc_stats_btn"):
             if stats_field_path:
-                # The API's get_stats_for_field expects single source/event_type if provided
-                stats = st.session_state.pia_api.get_stats_for_field(
-                    data_field_path=stats_field_path,
-                    source=g_agent_id_single_filter, # Using source filter as potential agent_id filter
-                    event_type=g_event_type_single_filter,
-                    start_time_str=st.session_state.filter_start_time or None,
-                    end_time_str=st.session_state.filter_end_time or None
-                )
+                try:
+                    stats = cached_field_stats(
+                        g_log_hash, st.session_state.pia_api, parse_field_path(stats_field_path),
+                        g_sources, g_event_types, g_simulation_id_filter,
+                        st.session_state.filter_start_time or "", st.session_state.filter_end_time or ""
+                    )
+                except ValueError:
+                    st.error(f"Invalid time filter. Use format {DEFAULT_TIMESTAMP_FORMAT}.")
+                    stats = None
                 if stats:
                     st.write(f"**Statistics for '{stats_field_path}' (with global filters applied where applicable):**")
                     st.json(stats)
@@ -213,18 +309,33 @@ if st.session_state.log_file_name:
         plot_title = st.text_input("Plot Title (Optional)", key="plot_title_input", placeholder="Defaults to field path")
         plot_ylabel = st.text_input("Y-Axis Label (Optional)", key="plot_ylabel_input", placeholder="Defaults to field path")
 
+        plot_col1, plot_col2 = st.columns(2)
+        with plot_col1:
+            plot_pixel_width = st.number_input("Plot Resolution (points across)", min_value=100, max_value=5000, value=1000, step=100, key="plot_pixel_width",
+                                               help="Long series are downsampled to this many buckets, so plot time does not depend on log length.")
+        with plot_col2:
+            plot_downsample_method = st.selectbox("Downsampling", ["minmax", "lttb"], key="plot_downsample_method",
+                                                  help="minmax keeps spikes and dips; lttb keeps the overall shape with fewer points.")
+
         if st.button("Generate Plot", key="gen_plot_btn"):
             if plot_field_path:
                 import matplotlib.pyplot as plt
 
-                ts_data = st.session_state.pia_api.get_timeseries_for_field(
-                    plot_field_path,
-                    source=g_agent_id_single_filter, # Using source filter as potential agent_id filter
-                    event_type=g_event_type_single_filter,
-                    start_time_str=st.session_state.filter_start_time or None,
-                    end_time_str=st.session_state.filter_end_time or None
+                # The pyramid is built once per field/filter; the time filters act as a zoom window on it.
+                try:
+                    zoom_start = datetime.strptime(st.session_state.filter_start_time, DEFAULT_TIMESTAMP_FORMAT) if st.session_state.filter_start_time else None
+                    zoom_end = datetime.strptime(st.session_state.filter_end_time, DEFAULT_TIMESTAMP_FORMAT) if st.session_state.filter_end_time else None
+                except ValueError:
+                    st.error(f"Invalid time filter. Use format {DEFAULT_TIMESTAMP_FORMAT}.")
+                    zoom_start = zoom_end = None
+                ts_data, total_points = cached_plot_points(
+                    g_log_hash, st.session_state.pia_api, parse_field_path(plot_field_path),
+                    g_sources, g_event_types, g_simulation_id_filter,
+                    int(plot_pixel_width), zoom_start, zoom_end, plot_downsample_method
                 )
                 if ts_data:
+                    if len(ts_data) < total_points:
+                        st.caption(f"Showing {len(ts_data)} of {total_points} points (downsampled with {plot_downsample_method}).")
                     fig, ax = plt.subplots(figsize=(10, 5))
                     timestamps = [item[0] for item in ts_data]
                     values = [item[1] for item in ts_data]
@@ -355,11 +466,10 @@ if st.session_state.log_file_name:
                         with st.spinner("Analyzing sequences..."):
                             st.caption("Note: Event sequence analysis currently runs on all loaded logs, global filters are not applied to this feature yet.")
 
-                            formatted_sequences = st.session_state.pia_api.get_formatted_event_sequences(
-                                sequence_definition=parsed_sequence_definition,
-                                max_time_between_steps_seconds=max_time_val,
-                                max_intervening_logs=max_logs_val,
-                                allow_repeats_in_definition=st.session_state.seq_allow_repeats
+                            formatted_sequences = cached_event_sequences(
+                                g_log_hash, st.session_state.pia_api,
+                                json.dumps(parsed_sequence_definition, sort_keys=True),
+                                max_time_val, max_logs_val, st.session_state.seq_allow_repeats
                             )
                         st.text_area("Found Sequences:", value=formatted_sequences, height=300, key="seq_results_text_area")
                 else:
@@ -370,7 +480,7 @@ if st.session_state.log_file_name:
         st.header("Goal Dynamics Analysis")
         if st.button("Run Goal Dynamics Analysis", key="run_goal_dynamics"):
             with st.spinner("Analyzing goal dynamics..."):
-                results = st.session_state.pia_api.analyze_goal_dynamics()
+                results = cached_analysis(g_log_hash, st.session_state.pia_api, "goal_dynamics")
                 if results:
                     st.success("Goal dynamics analysis complete.")
                     st.subheader("Analysis Results")
@@ -423,10 +533,8 @@ if st.session_state.log_file_name:
         st.caption(f"Using global Simulation ID filter: '{g_simulation_id_filter if g_simulation_id_filter else 'None'}' and Agent ID (first selected Source): '{g_agent_id_single_filter if g_agent_id_single_filter else 'None'}'.")
         if st.button("Run Emotional Trajectory Analysis", key="run_emotion_traj"):
             with st.spinner("Analyzing emotional trajectory..."):
-                results = st.session_state.pia_api.analyze_emotional_trajectory(
-                    target_agent_id=g_agent_id_single_filter,
-                    target_simulation_run_id=g_simulation_id_filter
-                )
+                results = cached_analysis(g_log_hash, st.session_state.pia_api, "emotional_trajectory",
+                                          g_agent_id_single_filter, g_simulation_id_filter)
                 if results:
                     st.success("Emotional trajectory analysis complete.")
                     st.subheader("Summary Statistics")
@@ -461,10 +569,8 @@ if st.session_state.log_file_name:
         st.caption(f"Using global Simulation ID filter: '{g_simulation_id_filter if g_simulation_id_filter else 'None'}' and Agent ID (first selected Source): '{g_agent_id_single_filter if g_agent_id_single_filter else 'None'}'.")
         if st.button("Run Intrinsic Motivation Analysis", key="run_intrinsic_motiv"):
             with st.spinner("Analyzing intrinsic motivation..."):
-                results = st.session_state.pia_api.analyze_intrinsic_motivation(
-                    target_agent_id=g_agent_id_single_filter,
-                    target_simulation_run_id=g_simulation_id_filter
-                )
+                results = cached_analysis(g_log_hash, st.session_state.pia_api, "intrinsic_motivation",
+                                          g_agent_id_single_filter, g_simulation_id_filter)
                 if results:
                     st.success("Intrinsic motivation analysis complete.")
                     st.subheader("Summary Statistics")
@@ -509,10 +615,8 @@ if st.session_state.log_file_name:
         st.caption(f"Using global Simulation ID filter: '{g_simulation_id_filter if g_simulation_id_filter else 'None'}' and Agent ID (first selected Source): '{g_agent_id_single_filter if g_agent_id_single_filter else 'None'}'.")
         if st.button("Run Task Performance Analysis", key="run_task_perf"):
             with st.spinner("Analyzing task performance..."):
-                results = st.session_state.pia_api.analyze_task_performance(
-                    target_agent_id=g_agent_id_single_filter,
-                    target_simulation_run_id=g_simulation_id_filter
-                )
+                results = cached_analysis(g_log_hash, st.session_state.pia_api, "task_performance",
+                                          g_agent_id_single_filter, g_simulation_id_filter)
                 if results:
                     st.success("Task performance analysis complete.")
                     st.subheader("Summary Statistics")
@@ -569,4 +673,3 @@ else:
 
 # For running: streamlit run PiaAGI_Hub/PiaAVT/webapp/app.py
 # (Ensure you are in the PiaAGI_Hub/PiaAVT directory or adjust paths if running from PiaAGI_Hub/)
-```
@@ -0,0 +1,421 @@
+"""
+Struct-of-arrays populations of lightweight agents, for social-dynamics experiments.
+
+Simulating a crowd by instantiating thousands of `ConcreteEmotionModule` and
+`ConcreteMotivationalSystemModule` objects, each with its own bus subscriptions, log
+and per-event Python arithmetic, is prohibitively slow. Here the state of every agent
+lives in NumPy arrays and a tick is one vectorized step:
+
+- `EmotionPopulation`: VAD states `vad` (N, 3) and arousal reactivity `arousal_reactivity`
+  (N,). Appraisals queued for the tick (`queue_appraisals`, rows of
+  `appraisal_batch.APPRAISAL_FEATURES`) are applied by `step()` to all agents at once,
+  clamping and decaying after each event as `ConcreteEmotionModule.appraise_event` does.
+- `MotivationPopulation`: goals in (N, G) arrays (priority, calculated intensity, type and
+  status codes), with G grown as needed. `step()` computes every goal's dynamic priority
+  as `ConcreteMotivationalSystemModule._calculate_dynamic_priority` does, using an
+  `EmotionPopulation`'s VAD for the emotional modifier, and returns each agent's top goal.
+
+`EmotionPopulation.view(i)` and `MotivationPopulation.view(i)` are adapters exposing one
+agent through the methods of the corresponding concrete module (`get_emotional_state`,
+`appraise_event`, `add_goal`, `get_active_goals`, `suggest_highest_priority_goal`, ...).
+Views read and write the arrays directly; they have no bus and no log.
+
+NumPy is required for populations; the rest of PiaCML does not depend on it.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError: # Only the populations need NumPy
+    np = None # type: ignore
+
+try:
+    from . import appraisal_batch
+    from .concrete_motivational_system_module import (
+        ConcreteMotivationalSystemModule, DYNAMIC_PRIORITY_WEIGHTS, INTRINSIC_GOAL_TYPES, Goal
+    )
+except ImportError:
+    import appraisal_batch # type: ignore
+    from concrete_motivational_system_module import ( # type: ignore
+        ConcreteMotivationalSystemModule, DYNAMIC_PRIORITY_WEIGHTS, INTRINSIC_GOAL_TYPES, Goal
+    )
+
+DEFAULT_DECAY_FACTOR = 0.95 # As ConcreteEmotionModule._decay_emotions
+DEFAULT_GOAL_CAPACITY = 4 # Goal slots per agent before the goal arrays grow
+
+ACTIVE_GOAL_STATUSES = ("PENDING", "ACTIVE") # Goals get_active_goals considers
+HIGH_PRIORITY_EXTRINSIC_THRESHOLD = 7.0 # Base priority of an ACTIVE extrinsic task that suppresses the intrinsic boost
+INTRINSIC_BOOST = 0.05
+DEFAULT_INTRINSIC_INTENSITY = 0.1 # For intrinsic goals without a calculated_intensity
+
+_EXTRINSIC_TYPE = "EXTRINSIC_TASK"
+_LOW_AROUSAL_LABELS = ("Content", "Sadness", "Calm")
+_HIGH_AROUSAL_LABELS = ("Joy_Excited", "Pleased_Alert", "Anger_Rage", "Distress_Fear", "High_Arousal_Neutral_Valence")
+_MID_AROUSAL_LABELS = ("Happy", "Pleased_Engaged", "Frustration_Annoyance", "Displeasure", "Neutral_Active")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Agent populations require NumPy.")
+
+
+def discrete_emotion_labels(vad: "np.ndarray") -> "np.ndarray":
+    """Labels of (N, 3) VAD states, as `ConcreteEmotionModule._map_vad_to_discrete_emotion` maps one state."""
+    _require_numpy()
+    vad = np.asarray(vad, dtype=float).reshape(-1, 3)
+    v, a = vad[:, 0], vad[:, 1]
+    low = np.select([v > 0.3, v < -0.3], _LOW_AROUSAL_LABELS[:2], _LOW_AROUSAL_LABELS[2])
+    high = np.select([v > 0.5, v > 0.2, v < -0.5, v < -0.2], _HIGH_AROUSAL_LABELS[:4], _HIGH_AROUSAL_LABELS[4])
+    mid = np.select([v > 0.5, v > 0.2, v < -0.5, v < -0.2], _MID_AROUSAL_LABELS[:4], _MID_AROUSAL_LABELS[4])
+    return np.where(a < 0.2, low, np.where(a > 0.7, high, mid))
+
+
+class EmotionPopulation:
+    """
+    VAD emotional states of `n_agents` agents.
+
+    Args:
+        n_agents (int): Population size.
+        initial_vad: Optional (N, 3) or (3,) initial states (clamped as ConcreteEmotionModule does).
+        arousal_reactivity: Optional (N,) or scalar personality reactivity modifiers.
+        decay_factor (float): Decay applied after each appraised event.
+    """
+
+    def __init__(self, n_agents: int, initial_vad: Any = None, arousal_reactivity: Any = 1.0,
+                 decay_factor: float = DEFAULT_DECAY_FACTOR):
+        _require_numpy()
+        self.n_agents = n_agents
+        self.decay_factor = decay_factor
+        vad = np.zeros((n_agents, 3)) if initial_vad is None else np.broadcast_to(np.asarray(initial_vad, dtype=float), (n_agents, 3))
+        self.vad = np.clip(vad, appraisal_batch.VAD_LOWER, appraisal_batch.VAD_UPPER)
+        self.arousal_reactivity = np.array(np.broadcast_to(np.asarray(arousal_reactivity, dtype=float), (n_agents,)))
+        self.personality_profiles: Dict[int, Dict[str, Any]] = {} # Profiles set through views (sparse, for reference)
+        self._queued_agents: List["np.ndarray"] = []
+        self._queued_features: List["np.ndarray"] = []
+
+    def queue_appraisals(self, agent_indices: Any, features: Any) -> None:
+        """Queues appraisals for the next `step()`: `features[k]` (an APPRAISAL_FEATURES row) for agent `agent_indices[k]`."""
+        agents = np.asarray(agent_indices, dtype=np.intp).reshape(-1)
+        rows = np.asarray(features, dtype=float).reshape(-1, len(appraisal_batch.APPRAISAL_FEATURES))
+        if len(agents) != len(rows):
+            raise ValueError(f"Got {len(agents)} agent indices for {len(rows)} appraisal rows.")
+        self._queued_agents.append(agents)
+        self._queued_features.append(rows)
+
+    def queue_event(self, agent_index: int, event_details: Dict[str, Any]) -> None:
+        """Queues one `appraise_event`-style event_details dict for an agent."""
+        self.queue_appraisals([agent_index], [appraisal_batch.appraisal_feature_row(event_details)])
+
+    @property
+    def queued_appraisals(self) -> int:
+        return sum(len(agents) for agents in self._queued_agents)
+
+    def step(self) -> "np.ndarray":
+        """
+        Applies the queued appraisals, in queue order per agent, and returns `vad`.
+        As in `ConcreteEmotionModule.appraise_event`, each event's change is clamped and then
+        decayed; this is vectorized over the agents, one pass per event an agent appraised.
+        Agents without events are unchanged.
+        """
+        if not self._queued_agents:
+            return self.vad
+        agents, features = np.concatenate(self._queued_agents), np.concatenate(self._queued_features)
+        self._queued_agents, self._queued_features = [], []
+        order = np.argsort(agents, kind="stable") # Group by agent, keeping queue order within agents
+        agents, features = agents[order], features[order]
+        deltas = appraisal_batch.vad_deltas(features, self.arousal_reactivity[agents])
+        counts = np.bincount(agents, minlength=self.n_agents)
+        first = np.cumsum(counts) - counts # Row of each agent's first event
+        for rank in range(int(counts.max())): # Every agent's rank-th event at once, clamped then decayed
+            active = np.flatnonzero(counts > rank)
+            reached = np.clip(self.vad[active] + deltas[first[active] + rank],
+                              appraisal_batch.VAD_LOWER, appraisal_batch.VAD_UPPER)
+            self.vad[active] = self.decay_factor * reached
+        return self.vad
+
+    def apply_appraisals(self, agent_index: int, features: Any) -> None:
+        """Appraises rows for one agent now (the path of its view's `appraise_event`)."""
+        deltas = appraisal_batch.vad_deltas(features, self.arousal_reactivity[agent_index])
+        if len(deltas):
+            self.vad[agent_index] = appraisal_batch.decayed_vad(self.vad[agent_index], deltas, self.decay_factor)
+
+    def discrete_emotions(self) -> "np.ndarray":
+        return discrete_emotion_labels(self.vad)
+
+    def view(self, agent_index: int) -> "EmotionAgentView":
+        if not 0 <= agent_index < self.n_agents:
+            raise IndexError(f"Agent index {agent_index} out of range for {self.n_agents} agents.")
+        return EmotionAgentView(self, agent_index)
+
+
+class EmotionAgentView:
+    """One agent of an `EmotionPopulation`, with the state-facing API of `ConcreteEmotionModule`."""
+
+    def __init__(self, population: EmotionPopulation, agent_index: int):
+        self._population = population
+        self._agent_index = agent_index
+        self._module_id = f"EmotionAgentView_{agent_index}"
+
+    @property
+    def current_emotion_state(self) -> Dict[str, float]:
+        """A snapshot; assigning to it does not change the population."""
+        valence, arousal, dominance = self._population.vad[self._agent_index].tolist()
+        return {"valence": valence, "arousal": arousal, "dominance": dominance}
+
+    @property
+    def current_discrete_emotion_label(self) -> str:
+        return str(discrete_emotion_labels(self._population.vad[self._agent_index])[0])
+
+    def get_emotional_state(self) -> Dict[str, float]:
+        return self.current_emotion_state
+
+    def get_current_emotional_state(self) -> Dict[str, Any]:
+        return {"vad_state": self.current_emotion_state, "categorical_emotion": self.current_discrete_emotion_label}
+
+    def appraise_event(self, event_details: Dict[str, Any]) -> None:
+        self._population.apply_appraisals(self._agent_index, [appraisal_batch.appraisal_feature_row(event_details)])
+
+    def appraise_events(self, events: Any, triggering_event_id: Optional[str] = None) -> Dict[str, float]:
+        if isinstance(events, (list, tuple)) and events and isinstance(events[0], dict):
+            events = [appraisal_batch.appraisal_feature_row(event) for event in events]
+        self._population.apply_appraisals(self._agent_index, events)
+        return self.current_emotion_state
+
+    def set_personality_profile(self, profile: Dict[str, Any]) -> None:
+        """Sets the agent's arousal reactivity and moves its state halfway to any `default_mood_*` values."""
+        population, i = self._population, self._agent_index
+        population.personality_profiles[i] = profile
+        for dimension, name in enumerate(("valence", "arousal", "dominance")):
+            mood = profile.get(f"default_mood_{name}")
+            if isinstance(mood, (int, float)):
+                population.vad[i, dimension] = np.clip((population.vad[i, dimension] + mood) / 2.0,
+                                                       appraisal_batch.VAD_LOWER[dimension], appraisal_batch.VAD_UPPER[dimension])
+        if isinstance(profile.get("reactivity_modifier_arousal"), (int, float)):
+            population.arousal_reactivity[i] = max(0.1, float(profile["reactivity_modifier_arousal"]))
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "module_id": self._module_id,
+            "module_type": "EmotionAgentView (EmotionPopulation)",
+            "current_vad_state": self.current_emotion_state,
+            "message_bus_connected": False,
+            "personality_profile_active": self._agent_index in self._population.personality_profiles,
+            "reactivity_modifier_arousal": float(self._population.arousal_reactivity[self._agent_index]),
+        }
+
+
+class MotivationPopulation:
+    """
+    Goals of `n_agents` agents. Goal `k` of an agent has id `goal_{k}`, as the k-th goal
+    added to a `ConcreteMotivationalSystemModule`.
+
+    Args:
+        n_agents (int): Population size.
+        emotions (Optional[EmotionPopulation]): Source of the VAD states used for the
+            emotional modifier of dynamic priorities; without it no modifier is applied.
+        goal_capacity (int): Initial goal slots per agent.
+    """
+
+    def __init__(self, n_agents: int, emotions: Optional[EmotionPopulation] = None,
+                 goal_capacity: int = DEFAULT_GOAL_CAPACITY):
+        _require_numpy()
+        self.n_agents = n_agents
+        self.emotions = emotions
+        capacity = max(1, goal_capacity)
+        self.goal_counts = np.zeros(n_agents, dtype=np.intp)
+        self.priority = np.zeros((n_agents, capacity)) # Goal.priority (base priority field)
+        self.intensity = np.full((n_agents, capacity), DEFAULT_INTRINSIC_INTENSITY) # calculated_intensity of intrinsic goals
+        self.type_code = np.zeros((n_agents, capacity), dtype=np.int16)
+        self.status_code = np.full((n_agents, capacity), -1, dtype=np.int16) # -1: unused slot
+        self.dynamic_priority = np.full((n_agents, capacity), np.nan) # From the last step(); NaN for inactive goals
+        self._goal_types: List[str] = [_EXTRINSIC_TYPE, *INTRINSIC_GOAL_TYPES]
+        self._statuses: List[str] = list(ACTIVE_GOAL_STATUSES)
+        self._base_priority = np.array([ConcreteMotivationalSystemModule._get_base_priority(t) for t in self._goal_types])
+        self._details: Dict[Tuple[int, int], Dict[str, Any]] = {} # (agent, slot) -> description, source_trigger, parent_id, ...
+
+    # --- Codes ---
+    def _code(self, names: List[str], name: str) -> int:
+        if name not in names:
+            names.append(name)
+            if names is self._goal_types:
+                self._base_priority = np.append(self._base_priority, ConcreteMotivationalSystemModule._get_base_priority(name))
+        return names.index(name)
+
+    def status_code_for(self, status: str) -> int:
+        return self._code(self._statuses, status)
+
+    def _ensure_capacity(self, needed: int) -> None:
+        capacity = self.priority.shape[1]
+        if needed <= capacity:
+            return
+        extra = max(needed, 2 * capacity) - capacity
+        pad = ((0, 0), (0, extra))
+        self.priority = np.pad(self.priority, pad)
+        self.intensity = np.pad(self.intensity, pad, constant_values=DEFAULT_INTRINSIC_INTENSITY)
+        self.type_code = np.pad(self.type_code, pad)
+        self.status_code = np.pad(self.status_code, pad, constant_values=-1)
+        self.dynamic_priority = np.pad(self.dynamic_priority, pad, constant_values=np.nan)
+
+    # --- Goals ---
+    def add_goals(self, agent_indices: Any, goal_type: str, priorities: Any, intensities: Any = None,
+                  status: str = "PENDING") -> "np.ndarray":
+        """
+        Adds one goal of `goal_type` per entry of `agent_indices` (an agent may appear
+        several times) and returns the new goals' slots.
+        """
+        agents = np.asarray(agent_indices, dtype=np.intp).reshape(-1)
+        order = np.argsort(agents, kind="stable")
+        sorted_agents = agents[order]
+        counts = np.bincount(sorted_agents, minlength=self.n_agents)
+        rank = np.empty(len(agents), dtype=np.intp)
+        rank[order] = np.arange(len(agents)) - (np.cumsum(counts) - counts)[sorted_agents]
+        slots = self.goal_counts[agents] + rank
+        self._ensure_capacity(int(slots.max()) + 1 if len(slots) else 0)
+        self.priority[agents, slots] = np.broadcast_to(np.asarray(priorities, dtype=float), agents.shape)
+        if intensities is not None:
+            self.intensity[agents, slots] = np.broadcast_to(np.asarray(intensities, dtype=float), agents.shape)
+        self.type_code[agents, slots] = self._code(self._goal_types, goal_type)
+        self.status_code[agents, slots] = self.status_code_for(status)
+        self.goal_counts += counts
+        return slots
+
+    def add_goal(self, agent_index: int, description: str, goal_type: str, initial_priority: float,
+                 source_trigger: Optional[Dict[str, Any]] = None, parent_id: Optional[str] = None,
+                 initial_status: str = "PENDING") -> int:
+        """Adds one goal with its details; returns its slot."""
+        intensity = None
+        if goal_type in INTRINSIC_GOAL_TYPES and source_trigger and "calculated_intensity" in source_trigger:
+            intensity = source_trigger["calculated_intensity"]
+        slot = int(self.add_goals([agent_index], goal_type, initial_priority, intensity, initial_status)[0])
+        self._details[(agent_index, slot)] = {"description": description, "source_trigger": source_trigger,
+                                              "parent_id": parent_id}
+        return slot
+
+    def set_status(self, agent_indices: Any, slots: Any, status: str) -> None:
+        self.status_code[np.asarray(agent_indices, dtype=np.intp), np.asarray(slots, dtype=np.intp)] = self.status_code_for(status)
+
+    def goal(self, agent_index: int, slot: int) -> Goal:
+        """A `Goal` snapshot of one goal; changing it does not change the population."""
+        details = self._details.get((agent_index, slot), {})
+        return Goal(id=f"goal_{slot}", description=details.get("description", ""),
+                    type=self._goal_types[self.type_code[agent_index, slot]],
+                    priority=float(self.priority[agent_index, slot]),
+                    status=self._statuses[self.status_code[agent_index, slot]],
+                    source_trigger=details.get("source_trigger"), parent_id=details.get("parent_id"))
+
+    # --- Dynamic priority ---
+    def _dynamic_priorities(self, rows: Union[slice, int, "np.ndarray"], vad: Optional["np.ndarray"]) -> "np.ndarray":
+        """Dynamic priorities of the goals of `rows` (NaN for inactive goals)."""
+        w = DYNAMIC_PRIORITY_WEIGHTS
+        priority, type_code, status = np.atleast_2d(self.priority[rows]), np.atleast_2d(self.type_code[rows]), np.atleast_2d(self.status_code[rows])
+        active = (status >= 0) & (status < len(ACTIVE_GOAL_STATUSES))
+        intrinsic = np.isin(type_code, [self._goal_types.index(t) for t in INTRINSIC_GOAL_TYPES])
+        intensity = np.where(intrinsic, np.atleast_2d(self.intensity[rows]), priority / 10.0)
+        # The placeholder factors of ConcreteMotivationalSystemModule are constant
+        constant = (w["urgency"] * ConcreteMotivationalSystemModule._get_urgency_factor(None)
+                    + w["value_alignment"] * ConcreteMotivationalSystemModule._get_value_alignment_score(None)
+                    + w["dependency"] * ConcreteMotivationalSystemModule._get_dependency_factor(None, [])
+                    - w["cost"] * ConcreteMotivationalSystemModule._get_estimated_cost(None))
+        raw = w["base"] * self._base_priority[type_code] + w["intensity"] * intensity + constant
+        if vad is not None:
+            vad = np.atleast_2d(vad)
+            v, a = vad[:, 0:1], vad[:, 1:2]
+            modifier = np.where(v > 0.5, v * 0.1, np.where(v < -0.5, -np.abs(v) * 0.1, 0.0))
+            modifier = modifier + np.where(a > 0.7, a * 0.05, np.where((a < 0.2) & intrinsic, 0.1, 0.0))
+            raw = raw + w["emotion"] * modifier
+        pressing = (type_code == self._goal_types.index(_EXTRINSIC_TYPE)) & (status == self._statuses.index("ACTIVE")) \
+            & (priority > HIGH_PRIORITY_EXTRINSIC_THRESHOLD)
+        raw = raw + np.where(intrinsic & ~pressing.any(axis=1, keepdims=True), INTRINSIC_BOOST, 0.0)
+        return np.where(active, np.clip(raw, 0.0, 1.0), np.nan)
+
+    def _vad(self, rows: Union[slice, int]) -> Optional["np.ndarray"]:
+        return self.emotions.vad[rows] if self.emotions is not None else None
+
+    def step(self) -> "np.ndarray":
+        """Recomputes `dynamic_priority` for all agents; returns each agent's top goal slot (-1 if it has none)."""
+        self.dynamic_priority = self._dynamic_priorities(slice(None), self._vad(slice(None)))
+        scores = np.where(np.isnan(self.dynamic_priority), -np.inf, self.dynamic_priority)
+        top = np.argmax(scores, axis=1) # The earliest goal among equals, as the stable sort in get_active_goals
+        return np.where(np.isfinite(scores[np.arange(self.n_agents), top]), top, -1)
+
+    def view(self, agent_index: int) -> "MotivationAgentView":
+        if not 0 <= agent_index < self.n_agents:
+            raise IndexError(f"Agent index {agent_index} out of range for {self.n_agents} agents.")
+        return MotivationAgentView(self, agent_index)
+
+
+class MotivationAgentView:
+    """One agent of a `MotivationPopulation`, with the goal API of `ConcreteMotivationalSystemModule`."""
+
+    def __init__(self, population: MotivationPopulation, agent_index: int):
+        self._population = population
+        self._agent_index = agent_index
+        self._module_id = f"MotivationAgentView_{agent_index}"
+
+    def _slot(self, goal_id: str) -> Optional[int]:
+        prefix, _, number = goal_id.partition("_")
+        if prefix != "goal" or not number.isdigit() or int(number) >= self._population.goal_counts[self._agent_index]:
+            return None
+        return int(number)
+
+    @property
+    def goals(self) -> List[Goal]:
+        return [self._population.goal(self._agent_index, slot) for slot in range(self._population.goal_counts[self._agent_index])]
+
+    def add_goal(self, description: str, goal_type: str, initial_priority: float,
+                 source_trigger: Optional[Dict[str, Any]] = None,
+                 parent_id: Optional[str] = None,
+                 initial_status: str = "PENDING") -> str:
+        slot = self._population.add_goal(self._agent_index, description, goal_type, initial_priority,
+                                         source_trigger, parent_id, initial_status)
+        return f"goal_{slot}"
+
+    def get_goal(self, goal_id: str) -> Optional[Goal]:
+        slot = self._slot(goal_id)
+        return self._population.goal(self._agent_index, slot) if slot is not None else None
+
+    def update_goal_status(self, goal_id: str, new_status: str) -> bool:
+        slot = self._slot(goal_id)
+        if slot is None:
+            return False
+        self._population.set_status([self._agent_index], [slot], new_status)
+        return True
+
+    def update_goal_priority(self, goal_id: str, new_priority: float) -> bool:
+        slot = self._slot(goal_id)
+        if slot is None:
+            return False
+        self._population.priority[self._agent_index, slot] = new_priority
+        return True
+
+    def get_active_goals(self, return_with_priority_scores: bool = False) -> Union[List[Goal], List[Tuple[float, Goal]]]:
+        population, i = self._population, self._agent_index
+        count = int(population.goal_counts[i])
+        scores = population._dynamic_priorities(i, population._vad(i))[0, :count]
+        slots = [slot for slot in np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind="stable") if not np.isnan(scores[slot])]
+        if return_with_priority_scores:
+            return [(float(scores[slot]), population.goal(i, int(slot))) for slot in slots]
+        return [population.goal(i, int(slot)) for slot in slots]
+
+    def suggest_highest_priority_goal(self) -> Optional[Goal]:
+        active = self.get_active_goals()
+        return active[0] if active else None
+
+    def get_module_status(self) -> Dict[str, Any]:
+        goals = self.goals
+        status_counts: Dict[str, int] = {}
+        for goal in goals:
+            status_counts[goal.status] = status_counts.get(goal.status, 0) + 1
+        return {
+            "module_id": self._module_id,
+            "module_type": "MotivationAgentView (MotivationPopulation)",
+            "total_goals": len(goals),
+            "goals_by_status": status_counts,
+            "top_active_goals_summary": [
+                {"id": g.id, "type": g.type, "dynamic_priority": round(dp, 3), "base_priority_field": g.priority, "status": g.status}
+                for dp, g in self.get_active_goals(return_with_priority_scores=True)[:3]
+            ],
+            "message_bus_configured": False,
+            "next_goal_id_counter": int(self._population.goal_counts[self._agent_index]),
+        }
@@ -0,0 +1,106 @@
+"""
+Batched VAD appraisal for `ConcreteEmotionModule`.
+
+`appraise_event` handles one event at a time. It reads the appraisal variables out
+of a dict, logs several lines, decays the state and publishes an
+`EmotionalStateChange`, so a social scenario with hundreds of percepts per tick
+published hundreds of state changes per tick. Here a tick's appraisals are instead
+a float array with one row per event and one column per `APPRAISAL_FEATURES` entry:
+
+- `appraisal_feature_row()` turns an `event_details` dict into a row, with the
+  defaults `appraise_event` uses for missing entries;
+- `vad_deltas()` computes every event's (valence, arousal, dominance) change in one
+  NumPy pass, with the coefficients below (which `appraise_event` also uses);
+- `decayed_vad()` folds the changes into the state. `appraise_event` clamps the state
+  after each change and then decays it, so event i takes the state `s` to
+  `d * clip(s + delta_i)`. While no `s + delta_i` leaves the valid range the clamp is a
+  no-op, and the state after events 1..N is, in closed form,
+  `d**N * s0 + sum_i d**(N - i + 1) * delta_i`. `decayed_vad()` evaluates this closed
+  form block by block, clamps at the first event that leaves the range and restarts
+  from there, so its result is the sequential one even for saturating batches.
+
+NumPy is only needed for the batched path; the rest of PiaCML does not depend on it.
+"""
+
+from typing import Any, Dict, List, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError: # Only vad_deltas and decayed_vad need NumPy
+    np = None # type: ignore
+
+APPRAISAL_FEATURES = ("intensity", "goal_congruence", "goal_importance", "expectedness",
+                      "novelty", "norm_alignment", "controllability", "self_agency")
+# Values of missing event_details entries, as in appraise_event
+FEATURE_DEFAULTS = {"intensity": 0.1, "goal_congruence": 0.0, "goal_importance": 0.5, "expectedness": 0.5,
+                    "novelty": 0.0, "norm_alignment": 0.0, "controllability": 0.5}
+
+# How much each appraisal variable moves V, A or D (per unit of event intensity)
+VALENCE_DESIRABILITY_WEIGHT = 1.0
+VALENCE_NORM_WEIGHT = 0.2
+AROUSAL_INTENSITY_WEIGHT = 0.4
+AROUSAL_UNEXPECTEDNESS_WEIGHT = 0.4
+AROUSAL_DESIRABILITY_WEIGHT = 0.2 # Applied to |desirability|
+AROUSAL_NOVELTY_WEIGHT = 0.1
+DOMINANCE_CONTROL_WEIGHT = 0.3 # Applied to (controllability - 0.5)
+DOMINANCE_AGENCY_WEIGHT = 0.1 # Self-caused outcomes, signed by desirability
+
+# Lower and upper bounds of (valence, arousal, dominance)
+VAD_LOWER = (-1.0, 0.0, -1.0)
+VAD_UPPER = (1.0, 1.0, 1.0)
+
+# Events per closed-form step of decayed_vad (its cost is quadratic in this)
+_CLOSED_FORM_BLOCK = 64
+
+FeatureArray = Union["np.ndarray", Sequence[Sequence[float]]]
+
+
+def appraisal_feature_row(event_details: Dict[str, Any]) -> List[float]:
+    """The `APPRAISAL_FEATURES` row of one `appraise_event` event_details dict."""
+    row = [float(event_details.get(name, FEATURE_DEFAULTS[name])) for name in APPRAISAL_FEATURES[:-1]]
+    row.append(1.0 if event_details.get("agency", "other") == "self" else 0.0)
+    return row
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Batched appraisal requires NumPy.")
+
+
+def vad_deltas(features: FeatureArray, arousal_reactivity: float = 1.0) -> "np.ndarray":
+    """(N, 3) valence, arousal and dominance changes of the N events in `features` (N, len(APPRAISAL_FEATURES))."""
+    _require_numpy()
+    f = np.asarray(features, dtype=float).reshape(-1, len(APPRAISAL_FEATURES))
+    intensity, congruence, importance, expectedness, novelty, norm, control, self_agency = f.T
+    desirability = congruence * importance
+    deltas = np.empty((f.shape[0], 3))
+    deltas[:, 0] = (desirability * VALENCE_DESIRABILITY_WEIGHT + norm * VALENCE_NORM_WEIGHT) * intensity
+    deltas[:, 1] = (AROUSAL_INTENSITY_WEIGHT
+                    + (1.0 - expectedness) * AROUSAL_UNEXPECTEDNESS_WEIGHT
+                    + np.abs(desirability) * AROUSAL_DESIRABILITY_WEIGHT
+                    + novelty * AROUSAL_NOVELTY_WEIGHT) * intensity * arousal_reactivity
+    deltas[:, 2] = ((control - 0.5) * DOMINANCE_CONTROL_WEIGHT
+                    + (self_agency > 0) * np.sign(desirability) * DOMINANCE_AGENCY_WEIGHT) * intensity
+    return deltas
+
+
+def decayed_vad(state: Sequence[float], deltas: "np.ndarray", decay_factor: float) -> "np.ndarray":
+    """(valence, arousal, dominance) after applying each row of `deltas` as `appraise_event` does: clamp, then decay."""
+    _require_numpy()
+    deltas = np.asarray(deltas, dtype=float).reshape(-1, 3)
+    lower, upper = np.asarray(VAD_LOWER), np.asarray(VAD_UPPER)
+    steps = np.arange(_CLOSED_FORM_BLOCK, dtype=float)
+    lags = steps[:, None] - steps[None, :]
+    weights = np.where(lags > 0, decay_factor ** np.maximum(lags, 0.0), 0.0) # d**(k - j) for event j before event k
+    powers = decay_factor ** steps[:, None]
+    s = np.asarray(state, dtype=float)
+    start, n = 0, deltas.shape[0]
+    while start < n:
+        block = deltas[start:start + _CLOSED_FORM_BLOCK]
+        m = block.shape[0]
+        reached = powers[:m] * s + weights[:m, :m] @ block + block # s + delta_k for each event k of the block, unclamped
+        outside = np.any((reached < lower) | (reached > upper), axis=1)
+        k = int(np.argmax(outside)) if outside.any() else m - 1 # The first event to clamp, or the last of the block
+        s = decay_factor * np.clip(reached[k], lower, upper)
+        start += k + 1
+    return s
@@ -0,0 +1,202 @@
+"""
+Compiled relevance filtering for `ConcreteAttentionModule.filter_information`.
+
+`filter_information` used to test every item of the stream against the focus
+target (tag list membership, a substring test on `content`, the id), then re-scan
+the surviving items once per active filter, building an intermediate list each
+time and printing a warning per item for unknown filter types. At perception rates
+the attention gate cost more than the percepts it let through.
+
+- `compile_filter_pipeline()` turns the focus target and the active filters into one
+  predicate, once, by chaining a closure per check. Required tags (`tag_present`
+  filters) are checked as one set, and an unknown filter type is reported once, at
+  compile time, to the caller (which logs it).
+- `InformationIndex` indexes a stream that is filtered repeatedly (a percept buffer)
+  by id, tag and content token, so the focus target's matches are looked up instead
+  of scanned for. Content still matches by substring: a target made of word
+  characters occurs in a content string exactly when it occurs in one of its
+  tokens, so only the index's vocabulary is searched.
+- `top_k_items()` selects the k most salient matching items with a heap, without
+  building the filtered list.
+"""
+
+import heapq
+import re
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Union
+
+Item = Dict[str, Any]
+Predicate = Callable[[Item], bool]
+
+TOKEN_PATTERN = re.compile(r"\w+")
+TAG_CONTAINERS = (list, tuple, set, frozenset, dict)
+
+
+def _accept(item: Item) -> bool:
+    return True
+
+
+def _reject(item: Item) -> bool:
+    return False
+
+
+def _has_tags(tags: Any, required: frozenset) -> bool:
+    if isinstance(tags, TAG_CONTAINERS):
+        return required.issubset(tags)
+    return all(tag in tags for tag in required)
+
+
+def _focus_check(target: str) -> Predicate:
+    def check(item: Item) -> bool:
+        tags = item.get('tags')
+        if isinstance(tags, list) and target in tags:
+            return True
+        content = item.get('content')
+        if isinstance(content, str) and target in content:
+            return True
+        return item.get('id') == target
+    return check
+
+
+def _required_tags_check(required: frozenset) -> Predicate:
+    return lambda item: _has_tags(item.get('tags', []), required)
+
+
+def _value_equals_check(key: Any, value: Any) -> Predicate:
+    return lambda item: item.get(key) == value
+
+
+def _value_gt_check(key: Any, threshold: Any) -> Predicate:
+    return lambda item: item.get(key, 0) > threshold
+
+
+def _all_of(checks: List[Predicate]) -> Predicate:
+    """One predicate for every check passing, short-circuiting in order."""
+    if not checks:
+        return _accept
+    if len(checks) == 1:
+        return checks[0]
+    first, rest = checks[0], _all_of(checks[1:])
+    return lambda item: first(item) and rest(item)
+
+
+def compile_filter_pipeline(focus_target: Any, active_filters: Sequence[Dict[str, Any]],
+                            include_focus: bool = True,
+                            on_unknown_filter: Optional[Callable[[Any], None]] = None) -> Predicate:
+    """
+    One predicate for "relevant to `focus_target` and passes every active filter",
+    built once from closures so each item costs a few calls. A falsy focus target
+    selects everything and a non-string one nothing; filters without a type pass every
+    item; an unknown filter type passes none (as before) and is passed to
+    `on_unknown_filter`. `include_focus=False` leaves the focus check out, for
+    candidates that an `InformationIndex` already matched.
+    """
+    checks: List[Predicate] = []
+    required_tags: Set[Any] = set()
+    check_focus = bool(include_focus and focus_target)
+    if check_focus:
+        if not isinstance(focus_target, str):
+            return _reject
+        checks.append(_focus_check(focus_target))
+    for active_filter in active_filters:
+        filter_type = active_filter.get('type')
+        if not filter_type:
+            continue
+        if filter_type == 'tag_present':
+            required_tags.add(active_filter.get('tag'))
+        elif filter_type == 'value_equals':
+            checks.append(_value_equals_check(active_filter.get('key'), active_filter.get('value')))
+        elif filter_type == 'value_gt':
+            checks.append(_value_gt_check(active_filter.get('key'), active_filter.get('threshold')))
+        else:
+            if on_unknown_filter is not None:
+                on_unknown_filter(filter_type)
+            return _reject
+    if required_tags:
+        checks.insert(1 if check_focus else 0, _required_tags_check(frozenset(required_tags)))
+    return _all_of(checks)
+
+
+class InformationIndex:
+    """
+    Append-only index over a stream of information items, by id, tag (items with a
+    list of tags) and content token (items with string content). Pass it to
+    `filter_information` in place of the list to look the focus target up.
+    """
+
+    def __init__(self, items: Iterable[Item] = ()):
+        self.items: List[Item] = []
+        self._by_id: Dict[Any, List[int]] = defaultdict(list)
+        self._by_tag: Dict[Any, List[int]] = defaultdict(list)
+        self._by_token: Dict[str, List[int]] = defaultdict(list)
+        self._content_matches: Dict[str, List[int]] = {} # Content positions per target, until the next add
+        self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item: Item) -> int:
+        """Indexes `item` and returns its position."""
+        position = len(self.items)
+        self.items.append(item)
+        if 'id' in item:
+            try:
+                self._by_id[item['id']].append(position)
+            except TypeError:
+                pass # Unhashable ids never equal a string target
+        tags = item.get('tags')
+        if isinstance(tags, list):
+            for tag in tags: # Repeated tags give repeated positions; lookups merge them
+                try:
+                    self._by_tag[tag].append(position)
+                except TypeError:
+                    pass # Only hashable tags can equal a string target
+        content = item.get('content')
+        if isinstance(content, str):
+            for token in set(TOKEN_PATTERN.findall(content)):
+                self._by_token[token].append(position)
+        self._content_matches.clear()
+        return position
+
+    def extend(self, items: Iterable[Item]) -> None:
+        for item in items:
+            self.add(item)
+
+    def _content_positions(self, target: str) -> List[int]:
+        positions = self._content_matches.get(target)
+        if positions is None:
+            if TOKEN_PATTERN.fullmatch(target):
+                positions = [p for token, postings in self._by_token.items() if target in token for p in postings]
+            else: # Targets spanning several tokens are matched against the content itself
+                positions = [p for p, item in enumerate(self.items)
+                             if isinstance(item.get('content'), str) and target in item['content']]
+            self._content_matches[target] = positions
+        return positions
+
+    def matching_positions(self, target: Any) -> List[int]:
+        """Positions, in stream order, of the items relevant to the focus target (see `compile_filter_pipeline`)."""
+        if not isinstance(target, str):
+            return []
+        positions = set(self._by_tag.get(target, ()))
+        positions.update(self._by_id.get(target, ()))
+        positions.update(self._content_positions(target))
+        return sorted(positions)
+
+    def candidates(self, focus_target: Any) -> List[Item]:
+        """The items the focus target selects; every item for a falsy target."""
+        if not focus_target:
+            return self.items
+        return [self.items[p] for p in self.matching_positions(focus_target)]
+
+
+def top_k_items(items: Iterable[Item], k: int, predicate: Predicate = _accept,
+                salience: Union[str, Callable[[Item], float]] = 'salience') -> List[Item]:
+    """
+    The `k` items passing `predicate` with the highest salience, highest first (stream
+    order among ties). `salience` is an item key (missing counts as 0.0) or a function.
+    """
+    if k <= 0:
+        return []
+    key = salience if callable(salience) else (lambda item: item.get(salience, 0.0))
+    matching = items if predicate is _accept else filter(predicate, items)
+    return heapq.nlargest(k, matching, key=key)
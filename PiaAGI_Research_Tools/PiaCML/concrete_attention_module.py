@@ -1,8 +1,11 @@
-from typing import Any, List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional, Union
 import datetime # Added for AttentionFocusUpdatePayload timestamp
+import logging
 
 try:
     from .base_attention_module import BaseAttentionModule
+    from .attention_filters import InformationIndex, compile_filter_pipeline, top_k_items
+    from .module_logger import ModuleLoggingMixin
     from .message_bus import MessageBus
     from .core_messages import (
         GenericMessage, GoalUpdatePayload, AttentionFocusUpdatePayload,
@@ -10,6 +13,8 @@ try:
     )
 except ImportError:
     from base_attention_module import BaseAttentionModule # type: ignore
+    from attention_filters import InformationIndex, compile_filter_pipeline, top_k_items # type: ignore
+    from module_logger import ModuleLoggingMixin # type: ignore
     try:
         from message_bus import MessageBus # type: ignore
         from core_messages import ( # type: ignore
@@ -23,7 +28,7 @@ except ImportError:
         AttentionFocusUpdatePayload = None # type: ignore
         EmotionalStateChangePayload = None # type: ignore
 
-class ConcreteAttentionModule(BaseAttentionModule):
+class ConcreteAttentionModule(BaseAttentionModule, ModuleLoggingMixin):
     """
     A concrete implementation of the BaseAttentionModule.
     Manages current attentional focus, can publish focus updates,
@@ -38,6 +43,9 @@ class ConcreteAttentionModule(BaseAttentionModule):
         """
         self.current_focus: Optional[AttentionFocusUpdatePayload] = None
         self._active_filters: List[Dict[str, Any]] = [] # Kept from original for filter_information method
+        self._filters_version: int = 0 # Bumped by set_active_filters; compiled pipelines are keyed on it
+        self._compiled_filter_key: Optional[tuple] = None
+        self._compiled_filter: Optional[Callable[[Dict[str, Any]], bool]] = None
         self._cognitive_load_level: float = 0.0 # Kept from original
 
         self.message_bus = message_bus
@@ -160,57 +168,63 @@ class ConcreteAttentionModule(BaseAttentionModule):
             # print(f"  AttentionModule: Arousal level {arousal:.2f} did not trigger major focus intensity shift.")
 
 
-    def filter_information(self, information_stream: List[Dict[str, Any]], current_focus_override: Optional[Any] = None) -> List[Dict[str, Any]]:
-        """Filters information based on current focus (or override) and active filters."""
-        # Use focused_item_id from self.current_focus if it's set
-        effective_focus_target = None
+    def set_active_filters(self, filters: List[Dict[str, Any]]) -> None:
+        """
+        Replaces the active filters applied by filter_information. Each filter is a dict with a
+        'type' of 'value_equals' ('key', 'value'), 'value_gt' ('key', 'threshold') or 'tag_present' ('tag').
+        """
+        self._active_filters = list(filters)
+        self._filters_version += 1
+
+    def _effective_focus_target(self, current_focus_override: Optional[Any]) -> Any:
         if current_focus_override is not None:
-            effective_focus_target = current_focus_override
-        elif self.current_focus and self.current_focus.focused_item_id is not None:
-            effective_focus_target = self.current_focus.focused_item_id
-
-        # print(f"ConcreteAttentionModule: Filtering {len(information_stream)} items. Effective focus target: '{effective_focus_target}'. Active filters: {self._active_filters}")
-
-        if effective_focus_target:
-            focused_stream = []
-            for item in information_stream:
-                is_relevant = False
-                # Assuming effective_focus_target is a string ID
-                if isinstance(effective_focus_target, str):
-                    if 'tags' in item and isinstance(item['tags'], list) and effective_focus_target in item['tags']:
-                        is_relevant = True
-                    elif 'content' in item and isinstance(item['content'], str) and effective_focus_target in item['content']: # Simple string match
-                        is_relevant = True
-                    elif item.get('id') == effective_focus_target:
-                        is_relevant = True
-                if is_relevant:
-                    focused_stream.append(item)
-        else:
-            focused_stream = list(information_stream)
-
-        # Apply active filters if any (original logic largely kept)
-        if not self._active_filters:
-            # print(f"ConcreteAttentionModule: No active filters. Filtered stream (by focus only) contains {len(focused_stream)} items.")
-            return focused_stream
-
-        stream_after_active_filters = list(focused_stream)
-        for active_filter in self._active_filters: # Removed f_idx for simplicity
-            # print(f"ConcreteAttentionModule: Applying filter: {active_filter}")
-            next_filtered_stream = []
-            filter_type = active_filter.get('type')
-            filter_key = active_filter.get('key')
-            for item in stream_after_active_filters:
-                passes_filter = False
-                if filter_type == 'value_equals' and item.get(filter_key) == active_filter.get('value'): passes_filter = True
-                elif filter_type == 'value_gt' and item.get(filter_key, 0) > active_filter.get('threshold'): passes_filter = True
-                elif filter_type == 'tag_present' and active_filter.get('tag') in item.get('tags', []): passes_filter = True
-                elif not filter_type : passes_filter = True # No specific type, pass all? Or make it strict? For PoC, pass.
-                else: print(f"ConcreteAttentionModule: Unknown or unhandled filter type '{filter_type}'.") # Passes by default
-
-                if passes_filter: next_filtered_stream.append(item)
-            stream_after_active_filters = next_filtered_stream
-        # print(f"ConcreteAttentionModule: Filtered stream (focus + active filters) contains {len(stream_after_active_filters)} items.")
-        return stream_after_active_filters
+            return current_focus_override
+        if self.current_focus and self.current_focus.focused_item_id is not None:
+            return self.current_focus.focused_item_id
+        return None
+
+    def _filter_pipeline(self, focus_target: Any, include_focus: bool = True) -> Callable[[Dict[str, Any]], bool]:
+        """The compiled focus and active-filter predicate, reused while the focus target and filters stay the same."""
+        key = (focus_target, include_focus, self._filters_version)
+        if key == self._compiled_filter_key:
+            return self._compiled_filter
+        pipeline = compile_filter_pipeline(focus_target, self._active_filters, include_focus=include_focus,
+                                           on_unknown_filter=self._log_unknown_filter)
+        self._compiled_filter_key, self._compiled_filter = key, pipeline
+        return pipeline
+
+    def _log_unknown_filter(self, filter_type: Any) -> None:
+        self._log_message("Unknown or unhandled filter type '%s'. No item passes it.", filter_type, level=logging.WARNING)
+
+    def _candidates_and_predicate(self, information_stream: Union[List[Dict[str, Any]], InformationIndex],
+                                  current_focus_override: Optional[Any]):
+        """Items to test and the predicate to test them with; an index already applied the focus target."""
+        effective_focus_target = self._effective_focus_target(current_focus_override)
+        if isinstance(information_stream, InformationIndex):
+            return (information_stream.candidates(effective_focus_target),
+                    self._filter_pipeline(effective_focus_target, include_focus=False))
+        return information_stream, self._filter_pipeline(effective_focus_target)
+
+    def filter_information(self, information_stream: Union[List[Dict[str, Any]], InformationIndex],
+                           current_focus_override: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """
+        Filters information based on current focus (or override) and active filters.
+        An item is relevant to a string focus target if it has it as a tag, contains it in its
+        'content' or has it as its 'id'. The stream may be an InformationIndex, in which case the
+        focus target's items are looked up rather than scanned for.
+        """
+        candidates, predicate = self._candidates_and_predicate(information_stream, current_focus_override)
+        return [item for item in candidates if predicate(item)]
+
+    def select_salient_information(self, information_stream: Union[List[Dict[str, Any]], InformationIndex], k: int,
+                                   salience: Union[str, Callable[[Dict[str, Any]], float]] = 'salience',
+                                   current_focus_override: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """
+        The k most salient items that filter_information would return, most salient first.
+        `salience` is an item key (missing counts as 0.0) or a function of the item.
+        """
+        candidates, predicate = self._candidates_and_predicate(information_stream, current_focus_override)
+        return top_k_items(candidates, k, predicate, salience)
 
     def manage_cognitive_load(self, current_load: float, capacity_thresholds: Dict[str, float]) -> Dict[str, Any]:
         """Manages cognitive load by adjusting internal state or suggesting actions."""
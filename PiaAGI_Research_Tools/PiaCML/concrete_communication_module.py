@@ -10,11 +10,16 @@ except ImportError:
     MessageBus = None # type: ignore
     GenericMessage = None # type: ignore
 
+try:
+    from .module_logger import ModuleLoggingMixin
+except ImportError:
+    from module_logger import ModuleLoggingMixin # type: ignore
+
 import uuid # Added
 import time # Added for logging timestamp
 import datetime # Added for logging timestamp
 
-class ConcreteCommunicationModule(BaseCommunicationModule):
+class ConcreteCommunicationModule(BaseCommunicationModule, ModuleLoggingMixin):
     """
     A basic, concrete implementation of the BaseCommunicationModule.
     This version uses simple keyword matching for NLU, template-based NLG,
@@ -25,7 +30,6 @@ class ConcreteCommunicationModule(BaseCommunicationModule):
     def __init__(self, message_bus: Optional[MessageBus] = None, module_id: Optional[str] = None):
         self._message_bus = message_bus
         self._module_id = module_id or f"CommModule_{str(uuid.uuid4())[:8]}"
-        self._log: List[str] = []
 
         self._dialogue_states: Dict[str, Dict[str, Any]] = {}
         self._default_strategies = ['direct_inform', 'simple_request']
@@ -56,13 +60,6 @@ class ConcreteCommunicationModule(BaseCommunicationModule):
 
         self._log_message(f"ConcreteCommunicationModule '{self._module_id}' initialized {bus_status_msg}.")
 
-    def _log_message(self, message: str):
-        """Helper method for internal logging."""
-        # Using time.time() for simplicity, can be switched to datetime if preferred
-        log_entry = f"{datetime.datetime.now(datetime.timezone.utc).isoformat()} [{self._module_id}]: {message}"
-        self._log.append(log_entry)
-        # print(log_entry) # Optional for real-time console monitoring
-
     def process_incoming_communication(self, raw_input: Any, source_modality: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Rudimentary NLU: keyword-based intent and entity extraction for text."""
         self._log_message(f"Processing incoming '{str(raw_input)[:100]}' from modality '{source_modality}'. Context: {context}")
@@ -1,4 +1,5 @@
 from typing import Any, Dict, List, Optional
+import logging
 import uuid # For module ID generation if needed, and triggering_event_id
 import datetime # For payloads if not already imported by core_messages
 
@@ -26,8 +27,15 @@ except ImportError:
     class GoalUpdatePayload: pass
     class EmotionalStateChangePayload: pass
 
+try:
+    from .module_logger import ModuleLoggingMixin
+    from . import appraisal_batch
+except ImportError:
+    from module_logger import ModuleLoggingMixin # type: ignore
+    import appraisal_batch # type: ignore
+
 
-class ConcreteEmotionModule(BaseEmotionModule):
+class ConcreteEmotionModule(BaseEmotionModule, ModuleLoggingMixin):
     """
     A concrete implementation of the BaseEmotionModule focusing on a dimensional
     emotional state (Valence, Arousal, Dominance - VAD).
@@ -66,12 +74,19 @@ class ConcreteEmotionModule(BaseEmotionModule):
 
     This module provides a foundational layer for emotional appraisal, with clear logging
     for its conceptual steps and hooks for future, more empirically-grounded refinements.
+
+    For many events per tick, `appraise_events` appraises a whole batch (an array of
+    `appraisal_batch.APPRAISAL_FEATURES` rows, or event_details dicts) with NumPy, applies
+    the per-event clamping and decay in closed form and publishes one state change. With
+    `batch_appraisals=True`, the message handlers queue their events instead of
+    appraising each one, and `flush_appraisals()` appraises the queue once per tick.
     """
 
     def __init__(self,
                  initial_vad_state: Optional[Dict[str, float]] = None,
                  message_bus: Optional[MessageBus] = None,
-                 module_id: str = f"ConcreteEmotionModule_{str(uuid.uuid4())[:8]}"):
+                 module_id: str = f"ConcreteEmotionModule_{str(uuid.uuid4())[:8]}",
+                 batch_appraisals: bool = False):
         """
         Initializes the emotion module.
 
@@ -80,9 +95,14 @@ class ConcreteEmotionModule(BaseEmotionModule):
                                Defaults to {"valence": 0.0, "arousal": 0.0, "dominance": 0.0}.
             message_bus: Optional instance of the MessageBus for communication.
             module_id: A unique identifier for this module instance.
+            batch_appraisals: If True, events received over the bus are queued until
+                               `flush_appraisals()` rather than appraised one by one.
         """
         self._message_bus = message_bus
         self._module_id = module_id
+        self._batch_appraisals = batch_appraisals
+        self._pending_appraisals: List[List[float]] = [] # appraisal_batch.APPRAISAL_FEATURES rows
+        self._pending_triggering_event_id: Optional[str] = None
 
         if initial_vad_state is None:
             self.current_emotion_state: Dict[str, float] = {"valence": 0.0, "arousal": 0.0, "dominance": 0.0}
@@ -95,7 +115,6 @@ class ConcreteEmotionModule(BaseEmotionModule):
 
         self._reactivity_modifier_arousal: float = 1.0
         self._personality_profile: Optional[Dict[str, Any]] = None
-        self._log: List[str] = [] # Initialize log
 
         bus_status_msg = "initialized without a message bus"
         if self._message_bus:
@@ -125,11 +144,6 @@ class ConcreteEmotionModule(BaseEmotionModule):
         self._log_message(f"ConcreteEmotionModule '{self._module_id}' {bus_status_msg}.")
 
 
-    def _log_message(self, message: str):
-        """Helper method for internal logging."""
-        log_entry = f"{datetime.datetime.now(datetime.timezone.utc).isoformat()} [{self._module_id}]: {message}"
-        self._log.append(log_entry)
-        # print(log_entry) # Optional for real-time debugging
 
     def _clamp_value(self, value: float, min_val: float = -1.0, max_val: float = 1.0) -> float:
         """Clamps a value between a minimum and maximum."""
@@ -139,15 +153,17 @@ class ConcreteEmotionModule(BaseEmotionModule):
         """Returns a copy of the current VAD emotional state."""
         return self.current_emotion_state.copy()
 
-    def _decay_emotions(self, decay_factor: float = 0.95) -> None:
+    def _decay_emotions(self, decay_factor: float = 0.95, steps: int = 1) -> None:
         """
         Applies decay to the current emotional state, moving values towards neutral (0.0).
         Arousal might decay towards a baseline slightly above 0 if preferred.
+        `steps` decays are applied at once (`decay_factor ** steps`).
         """
-        self.current_emotion_state["valence"] = self._clamp_value(self.current_emotion_state["valence"] * decay_factor)
+        factor = decay_factor ** steps
+        self.current_emotion_state["valence"] = self._clamp_value(self.current_emotion_state["valence"] * factor)
         # Arousal decays towards 0, but remains non-negative
-        self.current_emotion_state["arousal"] = self._clamp_value(self.current_emotion_state["arousal"] * decay_factor, 0.0, 1.0)
-        self.current_emotion_state["dominance"] = self._clamp_value(self.current_emotion_state["dominance"] * decay_factor)
+        self.current_emotion_state["arousal"] = self._clamp_value(self.current_emotion_state["arousal"] * factor, 0.0, 1.0)
+        self.current_emotion_state["dominance"] = self._clamp_value(self.current_emotion_state["dominance"] * factor)
         # print(f"Debug: Emotions decayed to V:{self.current_emotion_state['valence']:.2f} A:{self.current_emotion_state['arousal']:.2f} D:{self.current_emotion_state['dominance']:.2f}")
 
     def _handle_goal_update_for_appraisal(self, message: GenericMessage) -> None:
@@ -191,7 +207,7 @@ class ConcreteEmotionModule(BaseEmotionModule):
             event_details["novelty"] = 0.6 # New goals are somewhat novel
             event_details["expectedness"] = 0.4 # And perhaps not fully expected
 
-        self.appraise_event(event_details)
+        self._submit_appraisal(event_details)
 
     def _handle_percept_data_for_appraisal(self, message: GenericMessage) -> None:
         """Handles PerceptData messages for emotional appraisal."""
@@ -201,7 +217,7 @@ class ConcreteEmotionModule(BaseEmotionModule):
             return
 
         payload = message.payload # Assuming it's PerceptDataPayload
-        self._log_message(f"Handling PerceptData for appraisal: Modality='{payload.modality}', Content='{str(payload.content)[:100]}...'")
+        self._log_message("Handling PerceptData for appraisal: Modality='%s', Content='%s...'", payload.modality, str(payload.content)[:100])
 
         event_details: Dict[str, Any] = {
             "type": f"PERCEPTION_{payload.modality.upper()}",
@@ -220,27 +236,27 @@ class ConcreteEmotionModule(BaseEmotionModule):
                 event_details["goal_congruence"] = -0.8 # Strong negative congruence for threats
                 event_details["expectedness"] = 0.2 # Threats might be less expected
                 event_details["novelty"] = 0.7 # A high threat might also be novel
-                self._log_message(f"  Percept (dict): High threat detected. Intensity: {event_details['intensity']:.2f}, Congruence: {event_details['goal_congruence']:.2f}")
+                self._log_message("  Percept (dict): High threat detected. Intensity: %.2f, Congruence: %.2f", event_details['intensity'], event_details['goal_congruence'])
             # Example: social percept indicating positive feedback
             elif payload.content.get("social_feedback_valence", 0.0) > 0.5:
                 event_details["intensity"] = max(event_details["intensity"], payload.content.get("social_feedback_valence", 0.5))
                 event_details["goal_congruence"] = 0.7 # Positive social feedback is goal congruent
                 event_details["norm_alignment"] = 0.6 # Aligns with social norm of positive interaction
-                self._log_message(f"  Percept (dict): Positive social feedback. Intensity: {event_details['intensity']:.2f}, Congruence: {event_details['goal_congruence']:.2f}")
+                self._log_message("  Percept (dict): Positive social feedback. Intensity: %.2f, Congruence: %.2f", event_details['intensity'], event_details['goal_congruence'])
         elif isinstance(payload.content, str): # Basic text processing
             text_lower = payload.content.lower()
             if "surprise!" in text_lower or "unexpected" in text_lower:
                 event_details["novelty"] = 0.8
                 event_details["expectedness"] = 0.1
                 event_details["intensity"] = max(event_details["intensity"], 0.6)
-                self._log_message(f"  Percept (text): Surprise indicated. Novelty: {event_details['novelty']:.2f}, Expectedness: {event_details['expectedness']:.2f}")
+                self._log_message("  Percept (text): Surprise indicated. Novelty: %.2f, Expectedness: %.2f", event_details['novelty'], event_details['expectedness'])
 
 
         if payload.modality == "sound" and isinstance(payload.content, dict) and payload.content.get("type") == "sudden_loud_noise":
             event_details["intensity"] = max(event_details["intensity"], 0.9) # Use max to ensure it's at least this high
             event_details["novelty"] = max(event_details["novelty"], 0.8)
             event_details["expectedness"] = min(event_details["expectedness"], 0.1) # Use min if we want lower value
-            self._log_message(f"  Appraisal refined by 'sudden_loud_noise': Intensity: {event_details['intensity']:.2f}, Novelty: {event_details['novelty']:.2f}, Expectedness: {event_details['expectedness']:.2f}.")
+            self._log_message("  Appraisal refined by 'sudden_loud_noise': Intensity: %.2f, Novelty: %.2f, Expectedness: %.2f.", event_details['intensity'], event_details['novelty'], event_details['expectedness'])
         elif payload.modality == "text" and isinstance(payload.content, dict): # This was from original, might be redundant if content is str
             sentiment = payload.content.get("sentiment", "neutral") # Assuming content dict has sentiment
             keywords = payload.content.get("keywords", [])
@@ -248,22 +264,22 @@ class ConcreteEmotionModule(BaseEmotionModule):
                 event_details["intensity"] = max(event_details["intensity"], 0.8)
                 event_details["goal_congruence"] = min(event_details.get("goal_congruence", 0.0), -0.7)
                 event_details["expectedness"] = min(event_details.get("expectedness", 0.5), 0.3)
-                self._log_message(f"  Appraisal refined by negative text/keywords: Intensity: {event_details['intensity']:.2f}, Congruence: {event_details['goal_congruence']:.2f}.")
+                self._log_message("  Appraisal refined by negative text/keywords: Intensity: %.2f, Congruence: %.2f.", event_details['intensity'], event_details['goal_congruence'])
             elif sentiment == "very_positive" or "congratulations" in keywords:
                 event_details["intensity"] = max(event_details["intensity"], 0.7)
                 event_details["goal_congruence"] = max(event_details.get("goal_congruence", 0.0), 0.6)
-                self._log_message(f"  Appraisal refined by positive text/keywords: Intensity: {event_details['intensity']:.2f}, Congruence: {event_details['goal_congruence']:.2f}.")
+                self._log_message("  Appraisal refined by positive text/keywords: Intensity: %.2f, Congruence: %.2f.", event_details['intensity'], event_details['goal_congruence'])
 
-        self.appraise_event(event_details)
+        self._submit_appraisal(event_details)
 
     def _handle_action_event_for_appraisal(self, message: GenericMessage) -> None:
         """Handles ActionEvent messages for emotional appraisal."""
         if not hasattr(message.payload, 'action_type') or not hasattr(message.payload, 'status'):
-            self._log_message(f"ERROR: Received non-ActionEventPayload for _handle_action_event_for_appraisal: {type(message.payload)}")
+            self._log_message("ERROR: Received non-ActionEventPayload for _handle_action_event_for_appraisal: %s", type(message.payload))
             return
 
         payload: ActionEventPayload = message.payload # type: ignore
-        self._log_message(f"Handling ActionEvent for appraisal: Type='{payload.action_type}', Status='{payload.status}'")
+        self._log_message("Handling ActionEvent for appraisal: Type='%s', Status='%s'", payload.action_type, payload.status)
 
         # Determine agency
         agency = "other" # Default if not specified or not self
@@ -304,8 +320,8 @@ class ConcreteEmotionModule(BaseEmotionModule):
             "controllability": 0.8 if agency == "self" else 0.3, # Higher perceived control for own actions
             "triggering_message_id": message.message_id
         }
-        self._log_message(f"Appraisal derived from ActionEvent: Agency='{agency}', Congruence={goal_congruence:.2f}, Expectedness={expectedness:.2f}, Intensity={intensity:.2f}, NormAlign={norm_alignment:.2f}.")
-        self.appraise_event(event_details)
+        self._log_message("Appraisal derived from ActionEvent: Agency='%s', Congruence=%.2f, Expectedness=%.2f, Intensity=%.2f, NormAlign=%.2f.", agency, goal_congruence, expectedness, intensity, norm_alignment)
+        self._submit_appraisal(event_details)
 
     def appraise_event(self, event_details: Dict[str, Any]) -> None:
         """
@@ -325,7 +341,7 @@ class ConcreteEmotionModule(BaseEmotionModule):
                     "norm_alignment": Optional[float] // -1 (violates norms) to 1 (aligns) - Optional
                 }
         """
-        self._log_message(f"Appraising event: {event_details}")
+        self._log_message("Appraising event: %s", dict(event_details), level=logging.DEBUG)
 
         # --- 1. Derive Conceptual Appraisal Variables ---
         # These variables interpret the raw event_details in terms of core appraisal dimensions.
@@ -351,17 +367,18 @@ class ConcreteEmotionModule(BaseEmotionModule):
 
         novelty = event_details.get("novelty", 0.0) # Novelty of the event/stimulus itself
 
-        self._log_message(f"  Derived Appraisal Variables: Desirability={desirability:.2f}, Unexpectedness={unexpectedness:.2f}, Agency='{agency}', NormMatch={norm_match:.2f}, Controllability={controllability:.2f}, Novelty={novelty:.2f}, EventIntensity={intensity:.2f}")
+        self._log_message("  Derived Appraisal Variables: Desirability=%.2f, Unexpectedness=%.2f, Agency='%s', NormMatch=%.2f, Controllability=%.2f, Novelty=%.2f, EventIntensity=%.2f", desirability, unexpectedness, agency, norm_match, controllability, novelty, intensity, level=logging.DEBUG)
 
         # --- 2. Refined VAD Mapping ---
         # These factors determine the *direction and magnitude* of change for V, A, D.
         # Conceptual intensity factors for VAD dimensions (how much each appraisal variable influences V, A, or D)
-        intensity_factor_for_valence = 1.0 # How much desirability impacts valence
-        intensity_factor_for_arousal_base = 0.4 # Base impact of event intensity on arousal
-        intensity_factor_for_arousal_surprise = 0.4 # Impact of unexpectedness on arousal
-        intensity_factor_for_arousal_desirability = 0.2 # Impact of desirability magnitude on arousal
-        intensity_factor_for_dominance_control = 0.3 # Impact of controllability on dominance
-        intensity_factor_for_dominance_agency = 0.1 # Small boost/reduction based on agency for desirable/undesirable outcomes
+        # (Shared with the batched path in appraisal_batch)
+        intensity_factor_for_valence = appraisal_batch.VALENCE_DESIRABILITY_WEIGHT # How much desirability impacts valence
+        intensity_factor_for_arousal_base = appraisal_batch.AROUSAL_INTENSITY_WEIGHT # Base impact of event intensity on arousal
+        intensity_factor_for_arousal_surprise = appraisal_batch.AROUSAL_UNEXPECTEDNESS_WEIGHT # Impact of unexpectedness on arousal
+        intensity_factor_for_arousal_desirability = appraisal_batch.AROUSAL_DESIRABILITY_WEIGHT # Impact of desirability magnitude on arousal
+        intensity_factor_for_dominance_control = appraisal_batch.DOMINANCE_CONTROL_WEIGHT # Impact of controllability on dominance
+        intensity_factor_for_dominance_agency = appraisal_batch.DOMINANCE_AGENCY_WEIGHT # Small boost/reduction based on agency for desirable/undesirable outcomes
 
         valence_change = 0.0
         arousal_change = 0.0
@@ -370,8 +387,8 @@ class ConcreteEmotionModule(BaseEmotionModule):
         # Valence updates
         # Primarily driven by desirability and normative significance.
         valence_change += desirability * intensity_factor_for_valence * intensity
-        valence_change += norm_match * 0.2 * intensity # Norms have a moderate impact on valence
-        self._log_message(f"  Valence Change Components: DesirabilityEffect={(desirability * intensity_factor_for_valence * intensity):.2f}, NormMatchEffect={(norm_match * 0.2 * intensity):.2f}")
+        valence_change += norm_match * appraisal_batch.VALENCE_NORM_WEIGHT * intensity # Norms have a moderate impact on valence
+        self._log_message("  Valence Change Components: DesirabilityEffect=%.2f, NormMatchEffect=%.2f", desirability * intensity_factor_for_valence * intensity, norm_match * appraisal_batch.VALENCE_NORM_WEIGHT * intensity, level=logging.DEBUG)
 
         # Arousal updates
         # Influenced by event intensity, unexpectedness, novelty, and magnitude of desirability.
@@ -379,8 +396,8 @@ class ConcreteEmotionModule(BaseEmotionModule):
         arousal_change += intensity * intensity_factor_for_arousal_base
         arousal_change += unexpectedness * intensity_factor_for_arousal_surprise * intensity
         arousal_change += abs(desirability) * intensity_factor_for_arousal_desirability * intensity
-        arousal_change += novelty * 0.1 * intensity # Small direct effect of novelty on arousal
-        self._log_message(f"  Arousal Change Components: BaseIntensityEffect={(intensity * intensity_factor_for_arousal_base):.2f}, UnexpectednessEffect={(unexpectedness * intensity_factor_for_arousal_surprise * intensity):.2f}, AbsDesirabilityEffect={(abs(desirability) * intensity_factor_for_arousal_desirability * intensity):.2f}, NoveltyEffect={(novelty * 0.1 * intensity):.2f}")
+        arousal_change += novelty * appraisal_batch.AROUSAL_NOVELTY_WEIGHT * intensity # Small direct effect of novelty on arousal
+        self._log_message("  Arousal Change Components: BaseIntensityEffect=%.2f, UnexpectednessEffect=%.2f, AbsDesirabilityEffect=%.2f, NoveltyEffect=%.2f", intensity * intensity_factor_for_arousal_base, unexpectedness * intensity_factor_for_arousal_surprise * intensity, abs(desirability) * intensity_factor_for_arousal_desirability * intensity, novelty * appraisal_batch.AROUSAL_NOVELTY_WEIGHT * intensity, level=logging.DEBUG)
 
         # Apply overall arousal reactivity (can be personality-based)
         arousal_change *= current_arousal_reactivity
@@ -394,7 +411,7 @@ class ConcreteEmotionModule(BaseEmotionModule):
                 dominance_change += intensity_factor_for_dominance_agency * intensity
             elif desirability < 0: # Self caused bad outcome
                 dominance_change -= intensity_factor_for_dominance_agency * intensity
-        self._log_message(f"  Dominance Change Components: ControllabilityEffect={((controllability - 0.5) * intensity_factor_for_dominance_control * intensity):.2f}, AgencyEffectRelevant={agency=='self'}")
+        self._log_message("  Dominance Change Components: ControllabilityEffect=%.2f, AgencyEffectRelevant=%s", (controllability - 0.5) * intensity_factor_for_dominance_control * intensity, agency=='self', level=logging.DEBUG)
 
 
         # Apply calculated changes to the current VAD state
@@ -440,87 +457,88 @@ class ConcreteEmotionModule(BaseEmotionModule):
                 self._log_message(f"  Personality (Extraversion > 0.7 & pos desirability): Amplifying positive valence impact by {extraversion_factor}.")
                 # Similar to neuroticism, this would ideally modify the valence_change calculation.
 
-            self._log_message(f"  Personality: Arousal reactivity modifier {self._reactivity_modifier_arousal} was applied during arousal calculation.")
+            self._log_message("  Personality: Arousal reactivity modifier %s was applied during arousal calculation.", self._reactivity_modifier_arousal)
 
 
         # print(f"Debug: VAD before decay: V:{self.current_emotion_state['valence']:.2f} A:{self.current_emotion_state['arousal']:.2f} D:{self.current_emotion_state['dominance']:.2f}")
         self._decay_emotions() # Apply decay after each appraisal update
-        self._log_message(f"VAD after decay: V:{self.current_emotion_state['valence']:.2f} A:{self.current_emotion_state['arousal']:.2f} D:{self.current_emotion_state['dominance']:.2f}")
+        self._log_message("VAD after decay: V:%.2f A:%.2f D:%.2f", self.current_emotion_state['valence'], self.current_emotion_state['arousal'], self.current_emotion_state['dominance'])
 
         # Map VAD to discrete emotion label
         self.current_discrete_emotion_label = self._map_vad_to_discrete_emotion(self.current_emotion_state) # Added instance variable
-        self._log_message(f"Derived discrete emotion: {self.current_discrete_emotion_label}")
+        self._log_message("Derived discrete emotion: %s", self.current_discrete_emotion_label)
+
+        self._publish_emotional_state(event_details.get("triggering_message_id")) # Use the one from event_details
 
+    def _publish_emotional_state(self, triggering_event_id: Optional[str]) -> None:
+        """Publishes the current VAD state and discrete label as an EmotionalStateChange, if a bus is configured."""
         if self._message_bus and EmotionalStateChangePayload and GenericMessage: # Check core types too
             esc_payload = EmotionalStateChangePayload(
                 current_emotion_profile=self.current_emotion_state.copy(),
                 primary_emotion=self.current_discrete_emotion_label,
                 intensity=self.current_emotion_state['arousal'], # Using arousal as overall intensity proxy for the discrete emotion
-                triggering_event_id=event_details.get("triggering_message_id"), # Use the one from event_details
+                triggering_event_id=triggering_event_id,
                 behavioral_impact_suggestions=[] # Optional for now, could be derived too
             )
-            emotional_change_message = GenericMessage(
-        if "goal_congruence" in event_details:
-            goal_congruence = event_details.get("goal_congruence", 0.0)
-            goal_importance = event_details.get("goal_importance", 0.5)
-            valence_change += goal_congruence * goal_importance * intensity
-
-        if "norm_alignment" in event_details:
-            norm_alignment = event_details.get("norm_alignment", 0.0)
-            valence_change += norm_alignment * 0.3 * intensity # Norm alignment has some impact
-
-        # Arousal updates
-        current_arousal_reactivity = self._reactivity_modifier_arousal # Could be influenced by personality
-        base_arousal_from_intensity = intensity * 0.5
-        arousal_change += base_arousal_from_intensity
-
-        # More unexpected -> more arousal
-        arousal_change += (1.0 - event_details.get("expectedness", 0.5)) * 0.5 * intensity
-        # Novelty adds to arousal
-        arousal_change += event_details.get("novelty", 0.0) * 0.3 * intensity
-
-        if "goal_congruence" in event_details: # Significant goal events are arousing
-            arousal_change += abs(event_details.get("goal_congruence", 0.0)) * \
-                              event_details.get("goal_importance", 0.1) * \
-                              intensity * 0.5 # Scaled by importance and intensity
-
-        arousal_change *= current_arousal_reactivity # Apply overall reactivity
-
-        # Dominance updates
-        if "controllability" in event_details:
-            controllability = event_details.get("controllability", 0.5)
-            dominance_change += (controllability - 0.5) * 0.5 * intensity # More control -> more dominance
-
-        # Apply changes to current_emotion_state
-        self.current_emotion_state["valence"] += valence_change
-        self.current_emotion_state["arousal"] += arousal_change
-        self.current_emotion_state["dominance"] += dominance_change
-
-        # Clamp values
-        self.current_emotion_state["valence"] = self._clamp_value(self.current_emotion_state["valence"])
-        self.current_emotion_state["arousal"] = self._clamp_value(self.current_emotion_state["arousal"], 0.0, 1.0) # Arousal 0-1
-        self.current_emotion_state["dominance"] = self._clamp_value(self.current_emotion_state["dominance"])
-
-        # print(f"Debug: VAD before decay: V:{self.current_emotion_state['valence']:.2f} A:{self.current_emotion_state['arousal']:.2f} D:{self.current_emotion_state['dominance']:.2f}")
-        self._decay_emotions() # Apply decay after each appraisal update
-
-        self._log_message(f"VAD updated to V:{self.current_emotion_state['valence']:.2f} A:{self.current_emotion_state['arousal']:.2f} D:{self.current_emotion_state['dominance']:.2f}")
-
-        if self._message_bus and EmotionalStateChangePayload and GenericMessage: # Check core types too
-            esc_payload = EmotionalStateChangePayload(
-                current_emotion_profile=self.current_emotion_state.copy(),
-                primary_emotion=None, # Optional for now
-                intensity=self.current_emotion_state['arousal'], # Using arousal as overall intensity proxy
-                triggering_event_id=event_details.get("triggering_message_id"),
-                behavioral_impact_suggestions=[] # Optional for now
-            )
             emotional_change_message = GenericMessage(
                 source_module_id=self._module_id,
                 message_type="EmotionalStateChange",
                 payload=esc_payload
             )
             self._message_bus.publish(emotional_change_message)
-            self._log_message(f"Published EmotionalStateChange message (triggered by: {esc_payload.triggering_event_id}).")
+            self._log_message("Published EmotionalStateChange message (triggered by: %s).", esc_payload.triggering_event_id)
+
+    def _submit_appraisal(self, event_details: Dict[str, Any]) -> None:
+        """Appraises an event from a message handler now, or queues it for `flush_appraisals()` when batching."""
+        if not self._batch_appraisals:
+            self.appraise_event(event_details)
+            return
+        self._pending_appraisals.append(appraisal_batch.appraisal_feature_row(event_details))
+        if event_details.get("triggering_message_id") is not None:
+            self._pending_triggering_event_id = event_details["triggering_message_id"]
+
+    def appraise_events(self, events: Any, triggering_event_id: Optional[str] = None,
+                        decay_factor: float = 0.95) -> Dict[str, float]:
+        """
+        Appraises a batch of events and publishes at most one EmotionalStateChange.
+
+        The VAD state ends where appraising the events one by one with `appraise_event`
+        would leave it, including its clamping after each event (see `appraisal_batch`).
+        Requires NumPy.
+
+        Args:
+            events: An (N, len(appraisal_batch.APPRAISAL_FEATURES)) array of appraisal
+                    features, or a sequence of `appraise_event` event_details dicts.
+            triggering_event_id: Reported in the published state change.
+            decay_factor: Decay applied after each event, as in `_decay_emotions`.
+
+        Returns:
+            The new VAD state.
+        """
+        if isinstance(events, (list, tuple)) and events and isinstance(events[0], dict):
+            if triggering_event_id is None:
+                triggering_event_id = next((event["triggering_message_id"] for event in reversed(events)
+                                            if event.get("triggering_message_id") is not None), None)
+            events = [appraisal_batch.appraisal_feature_row(event) for event in events]
+        deltas = appraisal_batch.vad_deltas(events, self._reactivity_modifier_arousal)
+        if not len(deltas):
+            return self.get_emotional_state()
+        state = (self.current_emotion_state["valence"], self.current_emotion_state["arousal"], self.current_emotion_state["dominance"])
+        valence, arousal, dominance = appraisal_batch.decayed_vad(state, deltas, decay_factor).tolist()
+        self.current_emotion_state.update(valence=valence, arousal=arousal, dominance=dominance)
+        self.current_discrete_emotion_label = self._map_vad_to_discrete_emotion(self.current_emotion_state)
+        self._log_message("Appraised %d events: VAD V:%.2f A:%.2f D:%.2f (%s)", len(deltas), valence, arousal, dominance,
+                          self.current_discrete_emotion_label)
+        self._publish_emotional_state(triggering_event_id)
+        return self.get_emotional_state()
+
+    def flush_appraisals(self) -> Dict[str, float]:
+        """Appraises the events queued by the message handlers since the last flush (call once per tick)."""
+        if not self._pending_appraisals:
+            return self.get_emotional_state()
+        events, triggering_event_id = self._pending_appraisals, self._pending_triggering_event_id
+        self._pending_appraisals, self._pending_triggering_event_id = [], None
+        return self.appraise_events(events, triggering_event_id)
 
 
     def get_simulated_physiological_effects(self) -> Dict[str, Any]:
@@ -621,6 +639,8 @@ class ConcreteEmotionModule(BaseEmotionModule):
             "message_bus_connected": self._message_bus is not None,
             "personality_profile_active": self._personality_profile is not None,
             "reactivity_modifier_arousal": self._reactivity_modifier_arousal,
+            "batch_appraisals": self._batch_appraisals,
+            "pending_appraisals": len(self._pending_appraisals),
             "log_entries": len(self._log) # Added log entry count
         }
 
@@ -21,8 +21,13 @@ except ImportError:
     EmotionalStateChangePayload = object # type: ignore
     LearningOutcomePayload = object # type: ignore
 
+try:
+    from .module_logger import ModuleLoggingMixin
+except ImportError:
+    from module_logger import ModuleLoggingMixin # type: ignore
+
 
-class ConcreteLearningModule(BaseLearningModule):
+class ConcreteLearningModule(BaseLearningModule, ModuleLoggingMixin):
     """
     A concrete implementation of the BaseLearningModule, integrated with a message bus
     to learn from various system events and publish learning outcomes.
@@ -43,6 +48,8 @@ class ConcreteLearningModule(BaseLearningModule):
     Knowledge consolidation is supported conceptually to summarize and integrate learned items.
     """
 
+    _log_timestamp_format = "epoch"
+
     def __init__(self,
                  message_bus: Optional[MessageBus] = None,
                  module_id: str = f"LearningModule_{str(uuid.uuid4())[:8]}"):
@@ -79,15 +86,8 @@ class ConcreteLearningModule(BaseLearningModule):
             else:
                 bus_status_msg = "core message types missing for subscription"
 
-        self._log: List[str] = []
         self._log_message(f"ConcreteLearningModule '{self._module_id}' initialized. Message bus {bus_status_msg}.")
 
-    def _log_message(self, message: str):
-        """Helper method for internal logging."""
-        log_entry = f"{time.time():.2f} [{self._module_id}]: {message}"
-        self._log.append(log_entry)
-        # print(log_entry) # Optional: for real-time console monitoring
-
     # --- Message Handler Methods ---
     def _handle_goal_update_for_learning(self, message: GenericMessage): # Renamed
         if not isinstance(message.payload, GoalUpdatePayload): return
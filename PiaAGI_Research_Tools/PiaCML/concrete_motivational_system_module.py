@@ -1,5 +1,6 @@
 from typing import Any, Dict, List, Optional, Union
 from dataclasses import dataclass, field
+import logging
 import time
 import uuid # For module_id generation
 
@@ -24,6 +25,17 @@ except ImportError:
         ActionEventPayload = object # type: ignore
         EmotionalStateChangePayload = object # type: ignore
 
+try:
+    from .module_logger import ModuleLoggingMixin
+except ImportError:
+    from module_logger import ModuleLoggingMixin # type: ignore
+
+# Weights of the factors combined by ConcreteMotivationalSystemModule._calculate_dynamic_priority
+# (shared with agent_population); "cost" is subtracted
+DYNAMIC_PRIORITY_WEIGHTS = {"base": 0.20, "intensity": 0.30, "urgency": 0.15, "value_alignment": 0.15,
+                            "dependency": 0.10, "cost": 0.10, "emotion": 0.10}
+INTRINSIC_GOAL_TYPES = ("INTRINSIC_CURIOSITY", "INTRINSIC_COMPETENCE")
+
 
 @dataclass
 class Goal:
@@ -42,13 +54,15 @@ class Goal:
     target_task_domain: Optional[str] = None
     competence_details: Optional[Dict[str, Any]] = None # e.g., {"current_proficiency": 0.3, "target_proficiency": 0.8}
 
-class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected base class
+class ConcreteMotivationalSystemModule(MotivationalSystemModule, ModuleLoggingMixin): # Corrected base class
     """
     A concrete implementation of the BaseMotivationalSystemModule using a structured Goal dataclass.
     Manages a list of goals and includes basic mechanisms for intrinsic motivation (curiosity).
     Can publish GoalUpdate messages to a MessageBus and react to ActionEvents.
     """
 
+    _log_timestamp_format = "utc"
+
     def __init__(self,
                  message_bus: Optional[MessageBus] = None,
                  module_id: str = f"ConcreteMotivationalSystemModule_{str(uuid.uuid4())[:8]}"):
@@ -64,7 +78,6 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
         self.next_goal_id: int = 0
         self._message_bus = message_bus
         self._module_id = module_id
-        self._log: List[str] = [] # New log list
         self._last_emotional_state: Optional[EmotionalStateChangePayload] = None
         bus_status = "configured" if self._message_bus else "not configured"
 
@@ -91,11 +104,6 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
 
         self._log_message(f"ConcreteMotivationalSystemModule '{self._module_id}' initialized. Message bus {bus_status}. Subscribed to: {', '.join(subscriptions_log) if subscriptions_log else 'None'}.")
 
-    def _log_message(self, message: str):
-        """Helper method for internal logging."""
-        log_entry = f"{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())} [{self._module_id}]: {message}"
-        self._log.append(log_entry)
-        # print(log_entry) # Optional: for real-time console monitoring
 
 
     def _generate_goal_id(self) -> str:
@@ -261,9 +269,9 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
 
         # Log top few for debugging priority calculation
         if goals_with_dynamic_priority:
-            self._log_message(f"Dynamically prioritized goals (Top 3 - NormDynP, ID, Type, BasePrioField):")
+            self._log_message("Dynamically prioritized goals (Top 3 - NormDynP, ID, Type, BasePrioField):", level=logging.DEBUG)
             for dyn_prio, goal_obj in goals_with_dynamic_priority[:3]:
-                 self._log_message(f"  - {dyn_prio:.3f}: {goal_obj.id} ({goal_obj.type}, BasePrioField: {goal_obj.priority:.2f})")
+                 self._log_message("  - %.3f: %s (%s, BasePrioField: %.2f)", dyn_prio, goal_obj.id, goal_obj.type, goal_obj.priority, level=logging.DEBUG)
 
         if return_with_priority_scores:
             return goals_with_dynamic_priority
@@ -364,20 +372,20 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
                 intensity = self._calculate_curiosity_intensity("KNOWLEDGE_GAP", trigger_data, active_goals)
                 self._log_message(f"Knowledge gap for concept '{concept_id}' assessed for curiosity. Confidence: {data.get('confidence', 1.0):.2f}. Calculated intensity: {intensity:.2f}")
                 if intensity > curiosity_threshold:
-                desc = f"Explore knowledge gap for concept: {concept_id} (Current Confidence: {data.get('confidence',0):.2f}, Calculated Intensity: {intensity:.2f})"
+                    desc = f"Explore knowledge gap for concept: {concept_id} (Current Confidence: {data.get('confidence',0):.2f}, Calculated Intensity: {intensity:.2f})"
                     source_trigger_details = {
                         "trigger_type": "KNOWLEDGE_GAP",
                         "concept_id": concept_id,
-                    "current_confidence": data.get('confidence', 1.0), # Store actual confidence value used
-                    "current_understanding": data.get('understanding_level', 0.0), # Store actual understanding if available
-                    "calculated_intensity": intensity # Store the final calculated intensity
+                        "current_confidence": data.get('confidence', 1.0), # Store actual confidence value used
+                        "current_understanding": data.get('understanding_level', 0.0), # Store actual understanding if available
+                        "calculated_intensity": intensity # Store the final calculated intensity
                     }
-                goal_id = self.add_goal(
-                    description=desc,
-                    goal_type="INTRINSIC_CURIOSITY",
-                    initial_priority=intensity * 10.0, # Scale intensity
-                    source_trigger=source_trigger_details
-                )
+                    goal_id = self.add_goal(
+                        description=desc,
+                        goal_type="INTRINSIC_CURIOSITY",
+                        initial_priority=intensity * 10.0, # Scale intensity
+                        source_trigger=source_trigger_details
+                    )
                     new_curiosity_goal_ids.append(goal_id)
 
         return new_curiosity_goal_ids
@@ -413,18 +421,18 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
             complexity = trigger_data.get("complexity_score", 0.0)
             # Formula: Weighted sum of novelty and complexity.
             base_intensity = (w_novelty * novelty) + (w_complexity * complexity)
-            self._log_message(f"Curiosity (NovelStimulus): novelty={novelty:.2f}, complexity={complexity:.2f} -> base_intensity={base_intensity:.2f}")
+            self._log_message("Curiosity (NovelStimulus): novelty=%.2f, complexity=%.2f -> base_intensity=%.2f", novelty, complexity, base_intensity, level=logging.DEBUG)
         elif trigger_type == "PREDICTION_ERROR":
             error_mag = trigger_data.get("error_magnitude", 0.0)
             # Formula: Intensity is proportional to the error magnitude.
             base_intensity = w_error_magnitude * error_mag
-            self._log_message(f"Curiosity (PredictionError): error_mag={error_mag:.2f} -> base_intensity={base_intensity:.2f}")
+            self._log_message("Curiosity (PredictionError): error_mag=%.2f -> base_intensity=%.2f", error_mag, base_intensity, level=logging.DEBUG)
         elif trigger_type == "KNOWLEDGE_GAP":
             confidence = trigger_data.get("confidence", 1.0)  # Default to high confidence (low uncertainty) if not specified.
             uncertainty = 1.0 - confidence
             # Formula: Intensity is proportional to the uncertainty.
             base_intensity = w_uncertainty * uncertainty
-            self._log_message(f"Curiosity (KnowledgeGap): confidence={confidence:.2f}, uncertainty={uncertainty:.2f} -> base_intensity={base_intensity:.2f}")
+            self._log_message("Curiosity (KnowledgeGap): confidence=%.2f, uncertainty=%.2f -> base_intensity=%.2f", confidence, uncertainty, base_intensity, level=logging.DEBUG)
         else:
             self._log_message(f"Warning: Unknown curiosity trigger_type: {trigger_type}. Base intensity remains 0.")
 
@@ -451,12 +459,13 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
         # The original code had: intensity *= (1 + w_relevance_to_goals * relevance_score)
         # Let's keep that specific line for consistency with the previous version's direct effect.
         final_intensity = base_intensity * (1 + w_relevance_to_goals * relevance_score)
-        self._log_message(f"Curiosity: base_intensity={base_intensity:.2f}, relevance_factor={(1 + w_relevance_to_goals * relevance_score):.2f} -> final_intensity_before_clamp={final_intensity:.2f}")
+        self._log_message("Curiosity: base_intensity=%.2f, relevance_factor=%.2f -> final_intensity_before_clamp=%.2f",
+                          base_intensity, 1 + w_relevance_to_goals * relevance_score, final_intensity, level=logging.DEBUG)
 
         # Ensure final intensity is clamped between 0.0 and 1.0.
         clamped_intensity = max(0.0, min(1.0, final_intensity))
         if final_intensity != clamped_intensity:
-            self._log_message(f"Curiosity: Intensity clamped from {final_intensity:.2f} to {clamped_intensity:.2f}.")
+            self._log_message("Curiosity: Intensity clamped from %.2f to %.2f.", final_intensity, clamped_intensity, level=logging.DEBUG)
 
         return clamped_intensity
 
@@ -496,7 +505,8 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
 
         # Base formula: Weighted sum of proficiency gap and importance.
         base_intensity = (w_gap * proficiency_gap) + (w_importance * importance)
-        self._log_message(f"Competence (Skill: {skill_id}): proficiency={current_proficiency:.2f}, target={target_proficiency:.2f}, importance={importance:.2f} -> proficiency_gap={proficiency_gap:.2f}, base_intensity={base_intensity:.2f}")
+        self._log_message("Competence (Skill: %s): proficiency=%.2f, target=%.2f, importance=%.2f -> proficiency_gap=%.2f, base_intensity=%.2f",
+                          skill_id, current_proficiency, target_proficiency, importance, proficiency_gap, base_intensity, level=logging.DEBUG)
 
         # Conceptual Modulators (currently placeholders, not directly altering `base_intensity`):
         # 1. Success Rate Trend:
@@ -519,12 +529,12 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
         # For now, the final intensity is the base_intensity.
         # In a more complex model, these conceptual modulators would be integrated.
         final_intensity = base_intensity
-        self._log_message(f"Competence (Skill: {skill_id}): final_intensity_before_clamp={final_intensity:.2f} (modulators are conceptual).")
+        self._log_message("Competence (Skill: %s): final_intensity_before_clamp=%.2f (modulators are conceptual).", skill_id, final_intensity, level=logging.DEBUG)
 
         # Ensure final intensity is clamped between 0.0 and 1.0.
         clamped_intensity = max(0.0, min(1.0, final_intensity))
         if final_intensity != clamped_intensity:
-            self._log_message(f"Competence: Intensity clamped from {final_intensity:.2f} to {clamped_intensity:.2f}.")
+            self._log_message("Competence: Intensity clamped from %.2f to %.2f.", final_intensity, clamped_intensity, level=logging.DEBUG)
 
         return clamped_intensity
 
@@ -694,7 +704,7 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
         if goal.type in ["INTRINSIC_CURIOSITY", "INTRINSIC_COMPETENCE"]:
             if goal.source_trigger and "calculated_intensity" in goal.source_trigger:
                 intensity = goal.source_trigger["calculated_intensity"]
-                self._log_message(f"DynamicPrio for Intrinsic Goal '{goal.id}': Using calculated_intensity {intensity:.2f} from source_trigger.")
+                self._log_message("DynamicPrio for Intrinsic Goal '%s': Using calculated_intensity %.2f from source_trigger.", goal.id, intensity, level=logging.DEBUG)
             else:
                 intensity = 0.1 # Default low intensity if not found, though it should be there.
                 self._log_message(f"Warning: Intrinsic Goal '{goal.id}' missing 'calculated_intensity' in source_trigger. Defaulting intensity to {intensity:.2f}.")
@@ -703,12 +713,12 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
             # We normalize this to a 0-1 scale to serve as the 'intensity' component in the dynamic priority formula.
             # A higher `goal.priority` value for an extrinsic task means it contributes more to its dynamic priority.
             intensity = goal.priority / 10.0 # Assuming goal.priority is on a 0-10 scale. Adjust if scale is different.
-            self._log_message(f"DynamicPrio for Extrinsic Goal '{goal.id}': Using normalized goal.priority {intensity:.2f} (original: {goal.priority}).")
+            self._log_message("DynamicPrio for Extrinsic Goal '%s': Using normalized goal.priority %.2f (original: %s).", goal.id, intensity, goal.priority, level=logging.DEBUG)
         else:
             # For other goal types, or if a more nuanced intensity calculation is needed.
             # Fallback to using the goal's `priority` field, normalized, if it makes sense for that type.
             intensity = goal.priority / 10.0 # Default assumption for unhandled types
-            self._log_message(f"DynamicPrio for Goal '{goal.id}' (Type: {goal.type}): Defaulting intensity to normalized goal.priority {intensity:.2f}.")
+            self._log_message("DynamicPrio for Goal '%s' (Type: %s): Defaulting intensity to normalized goal.priority %.2f.", goal.id, goal.type, intensity, level=logging.DEBUG)
 
 
         # These would ideally take more specific context snapshots (e.g., from WM, SM, Planner)
@@ -718,13 +728,13 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
         estimated_cost = ConcreteMotivationalSystemModule._get_estimated_cost(goal, None)
 
         # Weights for combining factors
-        w_base = 0.20
-        w_int = 0.30
-        w_urg = 0.15
-        w_val = 0.15
-        w_dep = 0.10
-        w_cost = 0.10 # Cost is subtracted
-        w_emo = 0.10  # Weight for emotional modifier
+        w_base = DYNAMIC_PRIORITY_WEIGHTS["base"]
+        w_int = DYNAMIC_PRIORITY_WEIGHTS["intensity"]
+        w_urg = DYNAMIC_PRIORITY_WEIGHTS["urgency"]
+        w_val = DYNAMIC_PRIORITY_WEIGHTS["value_alignment"]
+        w_dep = DYNAMIC_PRIORITY_WEIGHTS["dependency"]
+        w_cost = DYNAMIC_PRIORITY_WEIGHTS["cost"] # Cost is subtracted
+        w_emo = DYNAMIC_PRIORITY_WEIGHTS["emotion"]  # Weight for emotional modifier
 
         dynamic_p_raw = (
             w_base * base_priority_for_type +
@@ -736,11 +746,10 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
         )
 
         emotional_modifier = 0.0
-        log_emo_details = "None"
+        emotion_log_format, emotion_log_args = "None", () # Formatted only if the log is read
         if current_emotional_state and current_emotional_state.current_emotion_profile:
             V = current_emotional_state.current_emotion_profile.get('valence', 0.0)
             A = current_emotional_state.current_emotion_profile.get('arousal', 0.0)
-            log_emo_details = f"V={V:.2f}, A={A:.2f}"
 
             if V > 0.5: # Positive affect
                 emotional_modifier += V * 0.1
@@ -753,7 +762,8 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
                 emotional_modifier += 0.1 # Specific boost for intrinsic goals
 
             dynamic_p_raw += w_emo * emotional_modifier
-            log_emo_details += f", EmoModRaw={emotional_modifier:.3f}, WeightedEmoMod={(w_emo * emotional_modifier):.3f}"
+            emotion_log_format = "V=%.2f, A=%.2f, EmoModRaw=%.3f, WeightedEmoMod=%.3f"
+            emotion_log_args = (V, A, emotional_modifier, w_emo * emotional_modifier)
 
 
         # Conceptual heuristic: If no high-priority extrinsic tasks are pressing, slightly boost intrinsic goals.
@@ -768,21 +778,27 @@ class ConcreteMotivationalSystemModule(MotivationalSystemModule): # Corrected ba
                     break
             if not has_high_priority_extrinsic:
                 boost_amount = 0.05
-                self._log_message(f"Goal '{goal.id}' ({goal.type}): Applying +{boost_amount:.2f} intrinsic boost (RawP before boost: {dynamic_p_raw:.3f}). No high-prio extrinsic tasks.")
+                self._log_message("Goal '%s' (%s): Applying +%.2f intrinsic boost (RawP before boost: %.3f). No high-prio extrinsic tasks.",
+                                  goal.id, goal.type, boost_amount, dynamic_p_raw, level=logging.DEBUG)
                 dynamic_p_raw += boost_amount
 
         normalized_priority = max(0.0, min(1.0, dynamic_p_raw))
 
         self._log_message(
-            f"Goal '{goal.id}' ({goal.type}, InitialPrioField:{goal.priority:.2f}): "
-            f"TypeBase={base_priority_for_type:.2f}(w:{w_base:.2f}), "
-            f"Intensity={intensity:.2f}(w:{w_int:.2f}), "
-            f"Urg={urgency_factor:.2f}(w:{w_urg:.2f}), "
-            f"ValAlign={value_alignment_score:.2f}(w:{w_val:.2f}), "
-            f"Dep={dependency_factor:.2f}(w:{w_dep:.2f}), "
-            f"Cost={estimated_cost:.2f}(w:{w_cost:.2f}) " # Removed comma
-            f"EmoState=({log_emo_details}) "
-            f"-> RawDynP(post-boost if any)={dynamic_p_raw:.3f} -> NormDynP={normalized_priority:.3f}"
+            "Goal '%s' (%s, InitialPrioField:%.2f): "
+            "TypeBase=%.2f(w:%.2f), "
+            "Intensity=%.2f(w:%.2f), "
+            "Urg=%.2f(w:%.2f), "
+            "ValAlign=%.2f(w:%.2f), "
+            "Dep=%.2f(w:%.2f), "
+            "Cost=%.2f(w:%.2f) " # Removed comma
+            "EmoState=(" + emotion_log_format + ") "
+            "-> RawDynP(post-boost if any)=%.3f -> NormDynP=%.3f",
+            goal.id, goal.type, goal.priority,
+            base_priority_for_type, w_base, intensity, w_int, urgency_factor, w_urg,
+            value_alignment_score, w_val, dependency_factor, w_dep, estimated_cost, w_cost,
+            *emotion_log_args, dynamic_p_raw, normalized_priority,
+            level=logging.DEBUG
         )
         return normalized_priority
 
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Deque
+from typing import Any, Dict, List, Optional, Deque, Tuple
 import uuid
 from collections import deque
 import asyncio
@@ -27,8 +27,25 @@ except ImportError:
     LTMQueryPayload = object # type: ignore
     MemoryItem = object # type: ignore
 
+try:
+    from .module_logger import ModuleLoggingMixin
+except ImportError:
+    from module_logger import ModuleLoggingMixin # type: ignore
+
+try:
+    from .plan_cache import CachedPlan, LTMResultStore, PendingPlanQueries, PlanCache, PlanCacheKey, normalize_goal
+except ImportError:
+    from plan_cache import CachedPlan, LTMResultStore, PendingPlanQueries, PlanCache, PlanCacheKey, normalize_goal # type: ignore
+
+try:
+    from .search_planner import PlanningDomain, SearchPlanner, SearchResult
+    from .symbolic_state import SymbolicStateBuilder
+except ImportError:
+    from search_planner import PlanningDomain, SearchPlanner, SearchResult # type: ignore
+    from symbolic_state import SymbolicStateBuilder # type: ignore
 
-class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModule):
+
+class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModule, ModuleLoggingMixin):
     """
     A concrete implementation of the Planning and Decision-Making (PDM) module,
     integrated with a message bus to receive various types of information (goals,
@@ -45,6 +62,9 @@ class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModul
         *   A direct, default sequence of actions.
         *   A "cautious" plan involving preliminary observation.
         *   An "exploratory" plan that might first query LTM for more context.
+        *   If a `search_planner` and `planning_domain` are configured and the domain
+            covers the goal, the best plan a search over the World Model's symbolic
+            state finds within `search_time_budget` seconds (see `search_planner`).
     3.  **Conceptual Plan Evaluation:** Each candidate plan (whether from LTM or internally
         generated) is subjected to a conceptual evaluation. This involves logging:
         *   Simulated World Model checks (e.g., predicted success, estimated resources).
@@ -61,26 +81,49 @@ class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModul
         ethical check during evaluation indicates a need for more thorough review.
     6.  **Dispatch:** ActionCommandPayloads for the selected plan are published to the message bus.
 
+    Steps 2-4 are skipped when the same goal (by normalized description) was planned
+    before in the same context (LTM plan available, emotional state thresholds, past
+    outcomes, pending LTM query): the selection is taken from a `PlanCache` and only
+    the selected plan's actions are rebuilt. `record_plan_outcome` feeds success
+    rates back into the cache. LTM plan results are indexed by their query content.
+
     Note: Many aspects of plan generation and evaluation are currently conceptual and
     primarily manifest as detailed logging statements. This structure is intended to
     outline how a more advanced planner would integrate diverse cognitive inputs.
     """
     MAX_PERCEPTS_HISTORY = 10 # Max number of recent percepts to store
     MAX_LTM_RESULTS_TO_STORE = 20 # Max number of LTM query results to store
+    PLAN_CACHE_CAPACITY = 256 # Max number of (goal, context) plan selections to remember
+    SEARCH_TIME_BUDGET_SECONDS = 0.05 # Per-call budget of the search planner
+    _log_timestamp_format = "epoch" # Timestamp style of the module's log lines
 
     def __init__(self,
                  message_bus: Optional[MessageBus] = None,
-                 module_id: str = f"PlanningDecisionMakingModule_{str(uuid.uuid4())[:8]}"):
+                 module_id: str = f"PlanningDecisionMakingModule_{str(uuid.uuid4())[:8]}",
+                 world_model: Optional[Any] = None,
+                 search_planner: Optional[SearchPlanner] = None,
+                 planning_domain: Optional[PlanningDomain] = None,
+                 search_time_budget: float = SEARCH_TIME_BUDGET_SECONDS):
         """
         Initializes the ConcretePlanningAndDecisionMakingModule.
+
+        Args:
+            world_model: Optional `ConcreteWorldModel` whose symbolic state search plans start from.
+            search_planner (Optional[SearchPlanner]): e.g. `AStarPlanner()` or `HTNPlanner(methods)`.
+            planning_domain (Optional[PlanningDomain]): Maps goals to planning problems for the search planner.
+            search_time_budget (float): Seconds the search planner may spend per planning call.
         """
         self._module_id = module_id
         self._message_bus = message_bus
+        self._search_planner = search_planner
+        self._planning_domain = planning_domain
+        self._search_time_budget = search_time_budget
+        self._symbolic_state_builder = SymbolicStateBuilder(world_model) if world_model is not None else None
 
         # Internal state
         self._active_goals: List[GoalUpdatePayload] = []
         self._current_percepts: Deque[PerceptDataPayload] = deque(maxlen=self.MAX_PERCEPTS_HISTORY)
-        self._ltm_query_results: Dict[str, LTMQueryResultPayload] = {} # query_id -> payload
+        self._ltm_query_results: Dict[str, LTMQueryResultPayload] = LTMResultStore() # query_id -> payload
         self._current_emotional_state: Optional[EmotionalStateChangePayload] = None
         self._current_attention_focus: Optional[AttentionFocusUpdatePayload] = None
 
@@ -116,8 +159,9 @@ class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModul
             except Exception as e:
                 bus_status_msg = f"configured but FAILED to subscribe: {e}"
 
-        self._log: List[str] = []
-        self._awaiting_plan_for_goal: Dict[str, str] = {} # goal_id -> ltm_query_id
+        self._awaiting_plan_for_goal: Dict[str, str] = PendingPlanQueries() # goal_id -> ltm_query_id
+        self._plan_cache = PlanCache(capacity=self.PLAN_CACHE_CAPACITY)
+        self._plan_cache_keys_by_goal: Dict[str, PlanCacheKey] = {} # goal_id -> key of the plan last dispatched for it
         self._past_plan_outcomes: Dict[str, str] = { # goal_id or keyword -> "success" | "failure"
             "achieve_world_peace": "failure", # Example based on test case
             "solve_universal_equation": "pending", # Might not resolve to success/failure
@@ -127,11 +171,19 @@ class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModul
         }
         self._log_message(f"ConcretePlanningAndDecisionMakingModule '{self._module_id}' initialized. Message bus {bus_status_msg}.")
 
-    def _log_message(self, message: str):
-        """Helper method for internal logging."""
-        log_entry = f"{time.time():.2f} [{self._module_id}]: {message}"
-        self._log.append(log_entry)
-        # print(log_entry) # Optional: print to console for real-time monitoring during tests
+    @property
+    def _ltm_query_results(self) -> LTMResultStore: return self._ltm_results
+
+    @_ltm_query_results.setter
+    def _ltm_query_results(self, results: Dict[str, LTMQueryResultPayload]):
+        self._ltm_results = results if isinstance(results, LTMResultStore) else LTMResultStore(results)
+
+    @property
+    def _awaiting_plan_for_goal(self) -> PendingPlanQueries: return self._pending_plan_queries
+
+    @_awaiting_plan_for_goal.setter
+    def _awaiting_plan_for_goal(self, pending: Dict[str, str]):
+        self._pending_plan_queries = pending if isinstance(pending, PendingPlanQueries) else PendingPlanQueries(pending)
 
     # --- Message Handler Methods ---
     def _handle_goal_update_message(self, message: GenericMessage):
@@ -168,16 +220,15 @@ class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModul
         self._ltm_query_results[payload.query_id] = payload
 
         # Check if this result was for a plan we were awaiting
-        for goal_id, query_id in list(self._awaiting_plan_for_goal.items()): # Iterate over a copy for safe removal
-            if query_id == payload.query_id:
-                self._log_message(f"LTM Plan result received for QueryID '{payload.query_id}', which was awaited for GoalID '{goal_id}'.")
-                # Conceptual: If goal is still active, could trigger re-planning.
-                # For now, just log and remove from awaiting list.
-                active_goal = next((g for g in self._active_goals if g.goal_id == goal_id), None)
-                if active_goal:
-                    self._log_message(f"Goal '{goal_id}' is still active. A re-plan could be triggered now that plan details are available.")
-                del self._awaiting_plan_for_goal[goal_id]
-                break
+        goal_id = self._awaiting_plan_for_goal.goal_for_query(payload.query_id)
+        if goal_id is not None:
+            self._log_message(f"LTM Plan result received for QueryID '{payload.query_id}', which was awaited for GoalID '{goal_id}'.")
+            # Conceptual: If goal is still active, could trigger re-planning.
+            # For now, just log and remove from awaiting list.
+            active_goal = next((g for g in self._active_goals if g.goal_id == goal_id), None)
+            if active_goal:
+                self._log_message(f"Goal '{goal_id}' is still active. A re-plan could be triggered now that plan details are available.")
+            del self._awaiting_plan_for_goal[goal_id]
 
 
     def _handle_emotional_state_change_message(self, message: GenericMessage):
@@ -217,244 +268,341 @@ class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModul
         return ltm_query_payload.query_id
 
     # --- Planning and Dispatch ---
-    def develop_and_dispatch_plan(self, goal_payload: GoalUpdatePayload) -> bool:
-        if not self._message_bus or not ActionCommandPayload or not GenericMessage:
-            self._log_message("Message bus or ActionCommandPayload not available. Cannot dispatch plan.")
-            return False
-
-        self._log_message(f"Developing plan for goal '{goal_payload.goal_id}': {goal_payload.goal_description}")
-
+    def _find_ltm_plan_query(self, goal_payload: GoalUpdatePayload) -> Optional[str]:
+        """Id of a stored LTM result for a "get_action_plan_for_goal" query matching the goal, via the plan index."""
+        q_id = self._ltm_query_results.find_plan_query(goal_payload.goal_description)
+        if q_id is not None:
+            self._log_message(f"Found potentially relevant LTM query result '{q_id}' for plan for goal '{goal_payload.goal_id}'.")
+        return q_id
+
+    def _ltm_plan_steps(self, ltm_query_id: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        ltm_result = self._ltm_query_results.get(ltm_query_id) if ltm_query_id else None
+        if not ltm_result or not ltm_result.success_status:
+            return None
+        if ltm_result.results and isinstance(ltm_result.results[0].content, list):
+            potential_plan_steps = ltm_result.results[0].content
+            if all(isinstance(step, dict) for step in potential_plan_steps):
+                return potential_plan_steps
+        return None
+
+    def _search_for_goal(self, goal_payload: GoalUpdatePayload) -> Optional[SearchResult]:
+        """Runs the search planner on the goal for up to the time budget; None if not configured or the domain doesn't cover it."""
+        if self._search_planner is None or self._planning_domain is None:
+            return None
+        state = self._symbolic_state_builder.build() if self._symbolic_state_builder is not None else frozenset()
+        problem = self._planning_domain.problem_for_goal(goal_payload, state)
+        if problem is None:
+            return None
+        result = self._search_planner.plan(problem, time_budget=self._search_time_budget)
+        self._log_message(f"Search planner '{result.planner}' for goal '{goal_payload.goal_id}': {len(result.plan)} steps, cost {result.cost:.2f}, complete: {result.complete}, optimal: {result.optimal}, {result.expansions} expansions in {result.elapsed * 1000:.1f} ms{' (reused search)' if result.reused else ''}.")
+        return result
+
+    def _current_valence(self) -> float:
+        if self._current_emotional_state and self._current_emotional_state.current_emotion_profile:
+            return self._current_emotional_state.current_emotion_profile.get("valence", 0.0)
+        return 0.0
+
+    def _past_plan_experience(self, goal_payload: GoalUpdatePayload) -> str:
+        """Conceptual LTM past experience for the goal, from `_past_plan_outcomes` by goal id, else by first keyword."""
+        goal_id_key = goal_payload.goal_id
+        # Try a keyword from description as a fallback simple concept
+        goal_desc_keywords = goal_payload.goal_description.lower().split()
+        goal_keyword_key = goal_desc_keywords[0] if goal_desc_keywords else ""
+
+        if goal_id_key in self._past_plan_outcomes:
+            if self._past_plan_outcomes[goal_id_key] == "success":
+                return "similar plans often succeed"
+            elif self._past_plan_outcomes[goal_id_key] == "failure":
+                return "similar plans often failed"
+        elif goal_keyword_key and goal_keyword_key in self._past_plan_outcomes: # Check first keyword
+            if self._past_plan_outcomes[goal_keyword_key] == "success":
+                return "similar plans (by keyword) often succeed"
+            elif self._past_plan_outcomes[goal_keyword_key] == "failure":
+                return "similar plans (by keyword) often failed"
+        return "no relevant past experience"
+
+    def _plan_cache_key(self, goal_payload: GoalUpdatePayload, ltm_query_id: Optional[str],
+                        search_result: Optional[SearchResult] = None) -> PlanCacheKey:
+        """
+        (normalized goal descriptor, context) for the plan cache. The context holds every input
+        candidate generation, evaluation and selection read besides the goal description, so
+        equal keys select the same plan. Goal ids and priorities only shape the rebuilt actions.
+        """
+        valence = self._current_valence()
+        context = (
+            ltm_query_id,
+            self._ltm_query_results.version(ltm_query_id) if ltm_query_id else None, # Changes when the result is replaced
+            goal_payload.goal_id in self._awaiting_plan_for_goal,
+            self._past_plan_experience(goal_payload),
+            valence < -0.2, valence > 0.2, # Emotion thresholds used by the World Model evaluation
+            "complex_skill_action" in goal_payload.goal_description, # Capability check is case-sensitive
+            (search_result.signature, search_result.complete) if search_result is not None else None,
+        )
+        return normalize_goal(goal_payload.goal_description), context
+
+    def _build_plan_actions(self, plan_id: str, goal_payload: GoalUpdatePayload,
+                            ltm_query_id: Optional[str] = None,
+                            search_result: Optional[SearchResult] = None) -> Optional[List[ActionCommandPayload]]:
+        """Builds fresh ActionCommandPayloads for a candidate or fallback plan; None if it cannot be built."""
+        goal_id, description, priority = goal_payload.goal_id, goal_payload.goal_description, goal_payload.priority
+        if plan_id.startswith("ltm_plan_"):
+            potential_plan_steps = self._ltm_plan_steps(ltm_query_id)
+            if potential_plan_steps is None:
+                return None
+            return [ActionCommandPayload(
+                        action_type=step_dict.get("action_type", f"ltm_plan_step_{i+1}"),
+                        parameters=dict(step_dict.get("parameters", {"goal_id": goal_id})), # Copied, so dispatch doesn't edit the LTM plan
+                        priority=priority - (i * 0.01),
+                        expected_outcome_summary=step_dict.get("expected_outcome_summary", f"Complete LTM plan step {i+1} for {description}")
+                    ) for i, step_dict in enumerate(potential_plan_steps)]
+        if plan_id == "internal_search_plan":
+            if search_result is None or not search_result.plan:
+                return None
+            return [ActionCommandPayload(
+                        action_type=operator.name,
+                        parameters={**(operator.parameters or {}), "goal_id": goal_id, "strategy": "search"},
+                        priority=priority - (i * 0.01),
+                        expected_outcome_summary=f"Complete search plan step {i+1} for {description}"
+                    ) for i, operator in enumerate(search_result.plan)]
+        if plan_id == "internal_direct_plan":
+            action_params_direct = {"goal_id": goal_id, "description": description, "strategy": "direct"}
+            actions = [ActionCommandPayload(action_type="direct_action_step1", parameters=action_params_direct.copy(), priority=priority)]
+            if priority > 0.6: # Add a second step for higher priority goals
+                actions.append(ActionCommandPayload(action_type="direct_action_step2", parameters=action_params_direct.copy(), priority=priority - 0.1))
+            return actions
+        if plan_id == "internal_cautious_plan":
+            action_params_cautious = {"goal_id": goal_id, "description": description, "strategy": "cautious"}
+            return [ActionCommandPayload(action_type="observe_surroundings", parameters=action_params_cautious.copy(), priority=priority),
+                    ActionCommandPayload(action_type="cautious_action_step1", parameters=action_params_cautious.copy(), priority=priority - 0.05)]
+        if plan_id == "internal_exploratory_plan":
+            action_params_exploratory = {"goal_id": goal_id, "description": description, "strategy": "exploratory_ltm_query"}
+            # This action would ideally trigger an LTMQuery via BGM or directly if PDM can do that
+            return [ActionCommandPayload(action_type="query_ltm_for_context", parameters={"query_topic": description, "goal_id": goal_id}, priority=priority),
+                    ActionCommandPayload(action_type="exploratory_action_step1", parameters=action_params_exploratory.copy(), priority=priority - 0.05)]
+        if plan_id == "internal_wait_plan":
+            return [ActionCommandPayload(action_type="wait_for_ltm_plan", parameters={"goal_id": goal_id}, priority=priority)]
+        if plan_id == "fallback_evaluation_reject":
+            return [ActionCommandPayload(action_type="request_assistance_no_valid_plan", parameters={"goal_id": goal_id, "reason": "All plans failed conceptual evaluation"}, priority=priority)]
+        if plan_id == "fallback_no_plan":
+            return [ActionCommandPayload(action_type="wait_error_no_plan", parameters={"goal_id": goal_id}, priority=0.1)]
+        return None
+
+    def _generate_candidate_plans(self, goal_payload: GoalUpdatePayload,
+                                  relevant_ltm_query_id_for_plan: Optional[str],
+                                  search_result: Optional[SearchResult] = None) -> List[Dict[str, Any]]:
+        """Steps 1 and 2: the LTM plan, if one was retrieved, else conceptual internal candidates."""
         candidate_plans: List[Dict[str, Any]] = [] # Stores dicts like {"id": str, "source": str, "actions": List[ActionCommandPayload], "eval_score": float}
-
-        # --- Step 1: Attempt to Retrieve Plan from LTM ---
-        self._log_message("Attempting to retrieve plan from LTM...")
-        ltm_action_payloads: List[ActionCommandPayload] = []
-        ltm_plan_source = None
-        relevant_ltm_query_id_for_plan = None
-
-        for q_id, result_payload in self._ltm_query_results.items():
-            if result_payload.query_metadata and result_payload.query_metadata.get("query_type") == "get_action_plan_for_goal":
-                if goal_payload.goal_description in result_payload.query_metadata.get("original_query_content", ""): # Conceptual match
-                    relevant_ltm_query_id_for_plan = q_id
-                    self._log_message(f"Found potentially relevant LTM query result '{q_id}' for plan for goal '{goal_payload.goal_id}'.")
-                    break
+        ltm_action_payloads: Optional[List[ActionCommandPayload]] = None
 
         if relevant_ltm_query_id_for_plan and self._ltm_query_results[relevant_ltm_query_id_for_plan].success_status:
             ltm_result = self._ltm_query_results[relevant_ltm_query_id_for_plan]
-            if ltm_result.results and isinstance(ltm_result.results[0].content, list):
-                potential_plan_steps = ltm_result.results[0].content
-                if all(isinstance(step, dict) for step in potential_plan_steps):
-                    self._log_message(f"Retrieved plan from LTM (QueryID: {relevant_ltm_query_id_for_plan}) with {len(potential_plan_steps)} steps.")
-                    ltm_plan_source = f"ltm_retrieved (QueryID: {relevant_ltm_query_id_for_plan})"
-                    for i, step_dict in enumerate(potential_plan_steps):
-                        ltm_action_payloads.append(ActionCommandPayload(
-                            action_type=step_dict.get("action_type", f"ltm_plan_step_{i+1}"),
-                            parameters=step_dict.get("parameters", {"goal_id": goal_payload.goal_id}),
-                            priority=goal_payload.priority - (i * 0.01),
-                            expected_outcome_summary=step_dict.get("expected_outcome_summary", f"Complete LTM plan step {i+1} for {goal_payload.goal_description}")
-                        ))
-                    candidate_plans.append({
-                        "id": f"ltm_plan_{relevant_ltm_query_id_for_plan}",
-                        "source": ltm_plan_source,
-                        "actions": ltm_action_payloads,
-                        "eval_score": 0.0 # To be filled by evaluation
-                    })
-                else:
-                    self._log_message(f"LTM result for plan (QueryID: {relevant_ltm_query_id_for_plan}) content is not a list of action dicts. Content: {str(potential_plan_steps)[:100]}")
+            ltm_action_payloads = self._build_plan_actions(f"ltm_plan_{relevant_ltm_query_id_for_plan}", goal_payload, relevant_ltm_query_id_for_plan)
+            if ltm_action_payloads is not None:
+                self._log_message(f"Retrieved plan from LTM (QueryID: {relevant_ltm_query_id_for_plan}) with {len(ltm_action_payloads)} steps.")
+                candidate_plans.append({
+                    "id": f"ltm_plan_{relevant_ltm_query_id_for_plan}",
+                    "source": f"ltm_retrieved (QueryID: {relevant_ltm_query_id_for_plan})",
+                    "actions": ltm_action_payloads,
+                    "eval_score": 0.0 # To be filled by evaluation
+                })
+            elif ltm_result.results and isinstance(ltm_result.results[0].content, list):
+                self._log_message(f"LTM result for plan (QueryID: {relevant_ltm_query_id_for_plan}) content is not a list of action dicts. Content: {str(ltm_result.results[0].content)[:100]}")
             else:
                 self._log_message(f"LTM query result for plan (QueryID: {relevant_ltm_query_id_for_plan}) had no results or results content was not a list.")
         else:
             self._log_message(f"No successful LTM plan found for goal '{goal_payload.goal_id}'.")
 
-
-        # --- Step 2: Conceptual Internal Plan Generation (if no LTM plan or LTM plan is poor) ---
         # This phase is triggered if candidate_plans is empty (no LTM plan) or if LTM plan is later evaluated poorly.
         # For now, we'll generate internal candidates if no LTM plan was found.
         if not candidate_plans:
             self._log_message("No LTM plan retrieved. Starting conceptual internal plan generation.")
-            plan_source = "internal_generation"
-
-            # Candidate Plan 1: Direct (similar to original default)
-            candidate_1_actions = []
-            action_params_direct = {"goal_id": goal_payload.goal_id, "description": goal_payload.goal_description, "strategy": "direct"}
-            candidate_1_actions.append(ActionCommandPayload(action_type=f"direct_action_step1", parameters=action_params_direct.copy(), priority=goal_payload.priority))
-            if goal_payload.priority > 0.6: # Add a second step for higher priority goals
-                 candidate_1_actions.append(ActionCommandPayload(action_type=f"direct_action_step2", parameters=action_params_direct.copy(), priority=goal_payload.priority - 0.1))
-            candidate_plans.append({"id": "internal_direct_plan", "source": plan_source, "actions": candidate_1_actions, "eval_score": 0.0})
-            self._log_message(f"Generated internal candidate 'direct_plan' with {len(candidate_1_actions)} steps.")
-
-            # Candidate Plan 2: Cautious
-            candidate_2_actions = []
-            action_params_cautious = {"goal_id": goal_payload.goal_id, "description": goal_payload.goal_description, "strategy": "cautious"}
-            candidate_2_actions.append(ActionCommandPayload(action_type="observe_surroundings", parameters=action_params_cautious.copy(), priority=goal_payload.priority))
-            candidate_2_actions.append(ActionCommandPayload(action_type="cautious_action_step1", parameters=action_params_cautious.copy(), priority=goal_payload.priority - 0.05))
-            candidate_plans.append({"id": "internal_cautious_plan", "source": plan_source, "actions": candidate_2_actions, "eval_score": 0.0})
-            self._log_message(f"Generated internal candidate 'cautious_plan' with {len(candidate_2_actions)} steps.")
-
-            # Candidate Plan 3: Exploratory (Query LTM for more context - if not already done for plan retrieval)
+            search_actions = self._build_plan_actions("internal_search_plan", goal_payload, search_result=search_result)
+            if search_actions is not None:
+                candidate_plans.append({"id": "internal_search_plan", "source": f"search_planner ({search_result.planner})",
+                                        "actions": search_actions, "eval_score": 0.0, "complete": search_result.complete})
+                self._log_message(f"Generated search candidate 'internal_search_plan' with {len(search_actions)} steps (complete: {search_result.complete}).")
+            plan_ids = ["internal_direct_plan", "internal_cautious_plan"]
+            # Exploratory (Query LTM for more context - if not already done for plan retrieval)
             if not relevant_ltm_query_id_for_plan and goal_payload.goal_id not in self._awaiting_plan_for_goal:
-                candidate_3_actions = []
-                action_params_exploratory = {"goal_id": goal_payload.goal_id, "description": goal_payload.goal_description, "strategy": "exploratory_ltm_query"}
-                # This action would ideally trigger an LTMQuery via BGM or directly if PDM can do that
-                candidate_3_actions.append(ActionCommandPayload(action_type="query_ltm_for_context", parameters={"query_topic": goal_payload.goal_description, "goal_id": goal_payload.goal_id}, priority=goal_payload.priority))
-                candidate_3_actions.append(ActionCommandPayload(action_type="exploratory_action_step1", parameters=action_params_exploratory.copy(), priority=goal_payload.priority - 0.05))
-                candidate_plans.append({"id": "internal_exploratory_plan", "source": plan_source, "actions": candidate_3_actions, "eval_score": 0.0})
-                self._log_message(f"Generated internal candidate 'exploratory_plan' with {len(candidate_3_actions)} steps.")
+                plan_ids.append("internal_exploratory_plan")
+            for plan_id in plan_ids:
+                actions = self._build_plan_actions(plan_id, goal_payload)
+                candidate_plans.append({"id": plan_id, "source": "internal_generation", "actions": actions, "eval_score": 0.0})
+                self._log_message(f"Generated internal candidate '{plan_id}' with {len(actions)} steps.")
 
         # Fallback: If LTM was queried for a plan and we are awaiting results, generate minimal default actions
         if goal_payload.goal_id in self._awaiting_plan_for_goal and not ltm_action_payloads:
             self._log_message(f"Awaiting LTM plan for goal '{goal_payload.goal_id}'. Generating minimal default actions for now.")
-            plan_source = "default_pending_ltm"
-            default_actions = [ActionCommandPayload(action_type="wait_for_ltm_plan", parameters={"goal_id": goal_payload.goal_id}, priority=goal_payload.priority)]
-            # Add to candidate_plans or handle separately if this is the only option
-            candidate_plans.append({"id": "internal_wait_plan", "source": plan_source, "actions": default_actions, "eval_score": 0.0})
-
+            candidate_plans.append({"id": "internal_wait_plan", "source": "default_pending_ltm",
+                                    "actions": self._build_plan_actions("internal_wait_plan", goal_payload), "eval_score": 0.0})
+        return candidate_plans
+
+    def _evaluate_candidate_plan(self, index: int, plan_candidate: Dict[str, Any], goal_payload: GoalUpdatePayload,
+                                 ltm_past_experience_str: str) -> None:
+        """Step 3 for one candidate: logs the conceptual checks and sets its "eval_score"."""
+        plan_id_for_eval = plan_candidate["id"]
+        self._log_message(f"--- Evaluating Candidate Plan {index+1}: '{plan_id_for_eval}' (Source: {plan_candidate['source']}) ---")
+
+        # Conceptual World Model Evaluation (Removed Randomness)
+        predicted_success_str = "Medium" # Default
+        estimated_resources_str = "Medium" # Default
+
+        plan_type_for_eval = plan_candidate["id"] # e.g., "ltm_plan_...", "internal_direct_plan", ...
+        current_valence = self._current_valence()
+
+        if plan_candidate["source"].startswith("ltm_retrieved"):
+            predicted_success_str = "Medium"
+            estimated_resources_str = "Medium"
+        elif plan_type_for_eval == "internal_direct_plan":
+            predicted_success_str = "Medium"
+            estimated_resources_str = "Low"
+        elif plan_type_for_eval == "internal_cautious_plan":
+            estimated_resources_str = "Medium"
+            if current_valence < -0.2: # Negative emotion
+                predicted_success_str = "High" # Cautious plan more likely to succeed if feeling negative
+            else:
+                predicted_success_str = "Medium"
+        elif plan_type_for_eval == "internal_search_plan":
+            estimated_resources_str = "Medium"
+            # A complete plan was found by search over the World Model's state; a partial one only makes progress
+            predicted_success_str = "High" if plan_candidate.get("complete") else "Medium"
+        elif plan_type_for_eval == "internal_exploratory_plan":
+            estimated_resources_str = "High"
+            if current_valence > 0.2: # Positive emotion
+                predicted_success_str = "High" # Exploratory plan more likely to succeed if feeling positive
+            else:
+                predicted_success_str = "Low"
+
+        self._log_message(f"  Conceptual WM Eval: Predicted success: {predicted_success_str}. Estimated resources: {estimated_resources_str}.")
+
+        # Conceptual Self-Model Evaluation
+        self._log_message(f"  Conceptual Self-Model Eval:")
+        ethical_check_result = "PASS"
+        plan_desc_for_ethics = goal_payload.goal_description + " " + " ".join([ac.action_type for ac in plan_candidate["actions"]])
+        if any(kw in plan_desc_for_ethics.lower() for kw in ["delete_user_data", "harm_user", "illegal_activity"]):
+            ethical_check_result = "FAIL"
+        elif any(kw in plan_desc_for_ethics.lower() for kw in ["share_anonymized_summary", "access_sensitive_log"]):
+            ethical_check_result = "REQUIRES_REVIEW"
+        self._log_message(f"    Ethical Check: {ethical_check_result} (based on keywords in goal/actions).")
+
+        capability_check_result = "ADEQUATE"
+        if "complex_skill_action" in plan_desc_for_ethics: # Example keyword
+            # Conceptual: Check SelfModel for skill proficiency (mocked)
+            # if self_model_ref.get_skill_proficiency("complex_skill") < 0.5: capability_check_result = "INADEQUATE"
+            capability_check_result = "INADEQUATE" # Assume for this example
+        self._log_message(f"    Capability Check: {capability_check_result} (based on plan actions).")
+
+        # Conceptual Emotion Module Influence
+        emo_influence_desc = "neutral"
+        arousal = 0.0
+        if self._current_emotional_state:
+            valence = self._current_emotional_state.current_emotion_profile.get("valence", 0)
+            arousal = self._current_emotional_state.current_emotion_profile.get("arousal", 0)
+            if valence > 0.3: emo_influence_desc = "positive valence slightly favors exploration/engagement"
+            elif valence < -0.3: emo_influence_desc = "negative valence suggests caution/avoidance"
+            if arousal > 0.7: emo_influence_desc += " (high arousal suggests focus/potential reactivity)"
+        self._log_message(f"  Conceptual Emotion Influence: {emo_influence_desc} (V:{current_valence:.2f} A:{arousal:.2f}).")
+
+        # Conceptual LTM Past Experience (Removed Randomness)
+        goal_desc_keywords = goal_payload.goal_description.lower().split()
+        goal_keyword_key = goal_desc_keywords[0] if goal_desc_keywords else ""
+        self._log_message(f"  Conceptual LTM Past Experience for '{goal_payload.goal_id}'/'{goal_keyword_key}': {ltm_past_experience_str}.")
+
+        # Assign conceptual evaluation_score (using new string values)
+        score = 0.5 # Start neutral
+        # Map string success to score contribution
+        success_score_map = {"High": 0.3, "Medium": 0.1, "Low": -0.3} # Adjusted scores
+        score += success_score_map.get(predicted_success_str, 0)
+
+        # Map resource estimation to score contribution (less is better)
+        resource_score_map = {"Low": 0.1, "Medium": 0.0, "High": -0.2}
+        score += resource_score_map.get(estimated_resources_str, 0)
+
+        if ethical_check_result == "FAIL": score = -1.0 # Hard fail
+        elif ethical_check_result == "REQUIRES_REVIEW": score -= 0.2 # Slightly higher penalty
+        if capability_check_result == "INADEQUATE": score -= 0.4 # Slightly higher penalty
+
+        if "often succeed" in ltm_past_experience_str: score += 0.2
+        elif "often failed" in ltm_past_experience_str: score -= 0.25 # Higher penalty for past failures
+
+        plan_candidate["eval_score"] = round(score, 3)
+        self._log_message(f"  Conceptual Evaluation Score for '{plan_id_for_eval}': {plan_candidate['eval_score']:.3f}")
+        self._log_message(f"--- End Evaluation for Candidate Plan '{plan_id_for_eval}' ---")
+
+    def _select_plan(self, goal_payload: GoalUpdatePayload,
+                     relevant_ltm_query_id_for_plan: Optional[str],
+                     search_result: Optional[SearchResult] = None) -> Tuple[CachedPlan, Optional[List[ActionCommandPayload]]]:
+        """Steps 1-4 in full: generates, evaluates and selects a plan for the goal. Returns it with its actions."""
+        candidate_plans = self._generate_candidate_plans(goal_payload, relevant_ltm_query_id_for_plan, search_result)
 
-        # --- Step 3: Conceptual Plan Evaluation ---
         self._log_message(f"Starting conceptual evaluation for {len(candidate_plans)} candidate plans.")
         if not candidate_plans: # Should not happen if default generation is a fallback
             self._log_message("No candidate plans (not even default) generated. This is unexpected.")
             # Fallback to a single "wait" action if truly no candidates
-            action_payloads = [ActionCommandPayload(action_type="wait_error_no_plan", parameters={"goal_id": goal_payload.goal_id}, priority=0.1)]
-            plan_source = "critical_fallback_no_plan"
-        else:
-            for i, plan_candidate in enumerate(candidate_plans):
-                plan_id_for_eval = plan_candidate["id"]
-                self._log_message(f"--- Evaluating Candidate Plan {i+1}: '{plan_id_for_eval}' (Source: {plan_candidate['source']}) ---")
-
-                # Conceptual World Model Evaluation (Removed Randomness)
-                predicted_success_str = "Medium" # Default
-                estimated_resources_str = "Medium" # Default
-
-                plan_type_for_eval = plan_candidate["id"] # e.g., "ltm_plan_...", "internal_direct_plan", ...
-                current_valence = self._current_emotional_state.current_emotion_profile.get("valence", 0.0) if self._current_emotional_state and self._current_emotional_state.current_emotion_profile else 0.0
-
-                if plan_candidate["source"].startswith("ltm_retrieved"):
-                    predicted_success_str = "Medium"
-                    estimated_resources_str = "Medium"
-                elif plan_type_for_eval == "internal_direct_plan":
-                    predicted_success_str = "Medium"
-                    estimated_resources_str = "Low"
-                elif plan_type_for_eval == "internal_cautious_plan":
-                    estimated_resources_str = "Medium"
-                    if current_valence < -0.2: # Negative emotion
-                        predicted_success_str = "High" # Cautious plan more likely to succeed if feeling negative
-                    else:
-                        predicted_success_str = "Medium"
-                elif plan_type_for_eval == "internal_exploratory_plan":
-                    estimated_resources_str = "High"
-                    if current_valence > 0.2: # Positive emotion
-                        predicted_success_str = "High" # Exploratory plan more likely to succeed if feeling positive
-                    else:
-                        predicted_success_str = "Low"
-
-                self._log_message(f"  Conceptual WM Eval: Predicted success: {predicted_success_str}. Estimated resources: {estimated_resources_str}.")
-
-                # Conceptual Self-Model Evaluation
-                self._log_message(f"  Conceptual Self-Model Eval:")
-                ethical_check_result = "PASS"
-                plan_desc_for_ethics = goal_payload.goal_description + " " + " ".join([ac.action_type for ac in plan_candidate["actions"]])
-                if any(kw in plan_desc_for_ethics.lower() for kw in ["delete_user_data", "harm_user", "illegal_activity"]):
-                    ethical_check_result = "FAIL"
-                elif any(kw in plan_desc_for_ethics.lower() for kw in ["share_anonymized_summary", "access_sensitive_log"]):
-                    ethical_check_result = "REQUIRES_REVIEW"
-                self._log_message(f"    Ethical Check: {ethical_check_result} (based on keywords in goal/actions).")
-
-                capability_check_result = "ADEQUATE"
-                if "complex_skill_action" in plan_desc_for_ethics: # Example keyword
-                    # Conceptual: Check SelfModel for skill proficiency (mocked)
-                    # if self_model_ref.get_skill_proficiency("complex_skill") < 0.5: capability_check_result = "INADEQUATE"
-                    capability_check_result = "INADEQUATE" # Assume for this example
-                self._log_message(f"    Capability Check: {capability_check_result} (based on plan actions).")
-
-                # Conceptual Emotion Module Influence
-                emo_influence_desc = "neutral"
-                if self._current_emotional_state:
-                    valence = self._current_emotional_state.current_emotion_profile.get("valence", 0)
-                    arousal = self._current_emotional_state.current_emotion_profile.get("arousal", 0)
-                    if valence > 0.3: emo_influence_desc = "positive valence slightly favors exploration/engagement"
-                    elif valence < -0.3: emo_influence_desc = "negative valence suggests caution/avoidance"
-                    if arousal > 0.7: emo_influence_desc += " (high arousal suggests focus/potential reactivity)"
-                self._log_message(f"  Conceptual Emotion Influence: {emo_influence_desc} (V:{current_valence:.2f} A:{arousal:.2f}).")
-
-                # Conceptual LTM Past Experience (Removed Randomness)
-                ltm_past_experience_str = "no relevant past experience"
-                goal_id_key = goal_payload.goal_id
-                # Try a keyword from description as a fallback simple concept
-                goal_desc_keywords = goal_payload.goal_description.lower().split()
-                goal_keyword_key = goal_desc_keywords[0] if goal_desc_keywords else ""
-
-                if goal_id_key in self._past_plan_outcomes:
-                    if self._past_plan_outcomes[goal_id_key] == "success":
-                        ltm_past_experience_str = "similar plans often succeed"
-                    elif self._past_plan_outcomes[goal_id_key] == "failure":
-                        ltm_past_experience_str = "similar plans often failed"
-                elif goal_keyword_key and goal_keyword_key in self._past_plan_outcomes: # Check first keyword
-                    if self._past_plan_outcomes[goal_keyword_key] == "success":
-                        ltm_past_experience_str = "similar plans (by keyword) often succeed"
-                    elif self._past_plan_outcomes[goal_keyword_key] == "failure":
-                        ltm_past_experience_str = "similar plans (by keyword) often failed"
-                self._log_message(f"  Conceptual LTM Past Experience for '{goal_id_key}'/'{goal_keyword_key}': {ltm_past_experience_str}.")
-
-                # Assign conceptual evaluation_score (using new string values)
-                score = 0.5 # Start neutral
-                # Map string success to score contribution
-                success_score_map = {"High": 0.3, "Medium": 0.1, "Low": -0.3} # Adjusted scores
-                score += success_score_map.get(predicted_success_str, 0)
-
-                # Map resource estimation to score contribution (less is better)
-                resource_score_map = {"Low": 0.1, "Medium": 0.0, "High": -0.2}
-                score += resource_score_map.get(estimated_resources_str, 0)
-
-                if ethical_check_result == "FAIL": score = -1.0 # Hard fail
-                elif ethical_check_result == "REQUIRES_REVIEW": score -= 0.2 # Slightly higher penalty
-                if capability_check_result == "INADEQUATE": score -= 0.4 # Slightly higher penalty
-
-                if "often succeed" in ltm_past_experience_str: score += 0.2
-                elif "often failed" in ltm_past_experience_str: score -= 0.25 # Higher penalty for past failures
-
-                plan_candidate["eval_score"] = round(score, 3)
-                self._log_message(f"  Conceptual Evaluation Score for '{plan_id_for_eval}': {plan_candidate['eval_score']:.3f}")
-                self._log_message(f"--- End Evaluation for Candidate Plan '{plan_id_for_eval}' ---")
-
-
-            # --- Step 4: Conceptual Plan Selection ---
-            self._log_message("Selecting plan based on conceptual evaluations...")
-            # Filter out hard failures (e.g., ethical FAIL)
-            valid_candidate_plans = [p for p in candidate_plans if p["eval_score"] > -0.5] # -1.0 was hard fail
-
-            if not valid_candidate_plans:
-                self._log_message("All candidate plans were conceptually rejected or scored too low. Generating critical fallback action.")
-                action_payloads = [ActionCommandPayload(action_type="request_assistance_no_valid_plan", parameters={"goal_id": goal_payload.goal_id, "reason": "All plans failed conceptual evaluation"}, priority=goal_payload.priority)]
-                plan_source = "critical_fallback_evaluation_reject"
-            else:
-                # Sort by evaluation score, highest first
-                valid_candidate_plans.sort(key=lambda p: p["eval_score"], reverse=True)
-                selected_plan_candidate = valid_candidate_plans[0]
-                action_payloads = selected_plan_candidate["actions"]
-                plan_source = selected_plan_candidate["source"]
-                self._log_message(f"Selected plan '{selected_plan_candidate['id']}' with score {selected_plan_candidate['eval_score']:.3f}. Source: {plan_source}.")
+            return CachedPlan("fallback_no_plan", "critical_fallback_no_plan", "N/A"), None
+
+        ltm_past_experience_str = self._past_plan_experience(goal_payload) # Same for every candidate of the goal
+        for i, plan_candidate in enumerate(candidate_plans):
+            self._evaluate_candidate_plan(i, plan_candidate, goal_payload, ltm_past_experience_str)
+
+        # --- Step 4: Conceptual Plan Selection ---
+        self._log_message("Selecting plan based on conceptual evaluations...")
+        # Filter out hard failures (e.g., ethical FAIL)
+        valid_candidate_plans = [p for p in candidate_plans if p["eval_score"] > -0.5] # -1.0 was hard fail
+
+        if not valid_candidate_plans:
+            self._log_message("All candidate plans were conceptually rejected or scored too low. Generating critical fallback action.")
+            return CachedPlan("fallback_evaluation_reject", "critical_fallback_evaluation_reject", "N/A"), None
 
-                # If an LTM plan was evaluated but not selected
-                if ltm_action_payloads and selected_plan_candidate["actions"] != ltm_action_payloads:
-                    ltm_plan_eval = next((p for p in candidate_plans if p["actions"] == ltm_action_payloads), None)
-                    if ltm_plan_eval: # Should exist if ltm_action_payloads is not empty
-                         self._log_message(f"LTM plan '{ltm_plan_eval['id']}' was not selected (score: {ltm_plan_eval['eval_score']:.3f}).")
+        # Sort by evaluation score, highest first
+        valid_candidate_plans.sort(key=lambda p: p["eval_score"], reverse=True)
+        selected_plan_candidate = valid_candidate_plans[0]
+        self._log_message(f"Selected plan '{selected_plan_candidate['id']}' with score {selected_plan_candidate['eval_score']:.3f}. Source: {selected_plan_candidate['source']}.")
 
+        # If an LTM plan was evaluated but not selected
+        ltm_plan_eval = next((p for p in candidate_plans if p["id"].startswith("ltm_plan_")), None)
+        if ltm_plan_eval and ltm_plan_eval is not selected_plan_candidate:
+            self._log_message(f"LTM plan '{ltm_plan_eval['id']}' was not selected (score: {ltm_plan_eval['eval_score']:.3f}).")
+        selected_plan = CachedPlan(selected_plan_candidate["id"], selected_plan_candidate["source"], selected_plan_candidate["eval_score"])
+        return selected_plan, selected_plan_candidate["actions"]
+
+    def develop_and_dispatch_plan(self, goal_payload: GoalUpdatePayload) -> bool:
+        if not self._message_bus or not ActionCommandPayload or not GenericMessage:
+            self._log_message("Message bus or ActionCommandPayload not available. Cannot dispatch plan.")
+            return False
+
+        self._log_message(f"Developing plan for goal '{goal_payload.goal_id}': {goal_payload.goal_description}")
+
+        # --- Step 1: Attempt to Retrieve Plan from LTM ---
+        self._log_message("Attempting to retrieve plan from LTM...")
+        relevant_ltm_query_id_for_plan = self._find_ltm_plan_query(goal_payload)
+        search_result = None
+        if self._ltm_plan_steps(relevant_ltm_query_id_for_plan) is None: # Internal candidates are only generated without an LTM plan
+            search_result = self._search_for_goal(goal_payload)
+
+        # --- Steps 2-4: Generate, evaluate and select, unless this goal was planned in the same context before ---
+        cache_key = self._plan_cache_key(goal_payload, relevant_ltm_query_id_for_plan, search_result)
+        selected_plan = self._plan_cache.get(cache_key)
+        action_payloads = None
+        if selected_plan is not None:
+            action_payloads = self._build_plan_actions(selected_plan.plan_id, goal_payload, relevant_ltm_query_id_for_plan, search_result)
+            if action_payloads is not None:
+                self._log_message(f"Reusing cached plan '{selected_plan.plan_id}' (score: {selected_plan.eval_score}) for goal '{goal_payload.goal_id}'. Source: {selected_plan.plan_source}.")
+        if action_payloads is None:
+            selected_plan, action_payloads = self._select_plan(goal_payload, relevant_ltm_query_id_for_plan, search_result)
+            if action_payloads is None:
+                action_payloads = self._build_plan_actions(selected_plan.plan_id, goal_payload)
+            self._plan_cache.put(cache_key, selected_plan) # Only the choice is cached; actions are rebuilt per goal instance
+        self._plan_cache_keys_by_goal[goal_payload.goal_id] = cache_key
+        plan_source = selected_plan.plan_source
 
         # --- Step 5: Ethical Review Trigger Integration (Post-selection) ---
         # The initial, more basic ethical check was done during evaluation.
         # This is for the formal EthicalReviewRequest if the selected plan still warrants it.
-        # For this refactor, we use the conceptual ethical_check_result from the selected plan if available,
-        # or re-evaluate based on keywords for the selected plan.
-
+        # Re-evaluated based on keywords for the selected plan; fallback plans were not evaluated and keep PASS.
         final_selected_plan_desc_for_ethics = goal_payload.goal_description + " " + " ".join([ac.action_type for ac in action_payloads])
         final_ethical_check_result_conceptual = "PASS" # Default
-        # Re-check selected plan or use stored eval
-        selected_plan_candidate_for_final_review = next((p for p in candidate_plans if p["actions"] == action_payloads), None)
-        if selected_plan_candidate_for_final_review and "eval_score" in selected_plan_candidate_for_final_review: # Check if it went through new eval
-            # A bit convoluted, ideally the ethical_check_result string is stored on the candidate plan object
-            # For now, re-derive based on keywords for simplicity if not directly stored.
+        if not selected_plan.plan_id.startswith("fallback_"):
             if any(kw in final_selected_plan_desc_for_ethics.lower() for kw in ["delete_user_data", "harm_user", "illegal_activity"]):
                  final_ethical_check_result_conceptual = "FAIL" # Should have been filtered, but as safety
             elif any(kw in final_selected_plan_desc_for_ethics.lower() for kw in ["share_anonymized_summary", "access_sensitive_log", "privacy"]): # Added privacy
@@ -480,7 +628,7 @@ class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModul
                 "goal_id": goal_payload.goal_id, "goal_priority": goal_payload.priority,
                 "emotional_state_summary": self._current_emotional_state.current_emotion_profile if self._current_emotional_state else None,
                 "plan_source": plan_source,
-                "conceptual_evaluation_score": selected_plan_candidate_for_final_review["eval_score"] if selected_plan_candidate_for_final_review else "N/A"
+                "conceptual_evaluation_score": selected_plan.eval_score
             }
             request_id = str(uuid.uuid4())
             ethical_review_payload_dict = {"request_id": request_id, "action_proposal": proposal, "context": context_for_review}
@@ -503,6 +651,18 @@ class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModul
             self._log_message(f"Published ActionCommand '{ac_payload.action_type}' (ID: {ac_payload.command_id}, PlanSource: {plan_source}) for goal '{goal_payload.goal_id}'.")
         return True
 
+    def record_plan_outcome(self, goal_id: str, succeeded: bool) -> None:
+        """
+        Reports how the plan last dispatched for `goal_id` went. Counts towards the cached
+        plan's success rate (plans that keep failing are dropped from the cache) and is
+        remembered in `_past_plan_outcomes`, which the evaluation of later plans reads.
+        """
+        cache_key = self._plan_cache_keys_by_goal.pop(goal_id, None)
+        if cache_key is not None:
+            self._plan_cache.record_outcome(cache_key, succeeded)
+        self._past_plan_outcomes[goal_id] = "success" if succeeded else "failure"
+        self._log_message(f"Recorded plan outcome for goal '{goal_id}': {'success' if succeeded else 'failure'}.")
+
     def process_highest_priority_goal(self) -> bool:
         if not self._active_goals:
             self._log_message("No active goals to process.")
@@ -521,6 +681,8 @@ class ConcretePlanningAndDecisionMakingModule(BasePlanningAndDecisionMakingModul
             "recent_percepts_count": len(self._current_percepts),
             "ltm_results_count": len(self._ltm_query_results),
             "awaiting_plan_for_goal_count": len(self._awaiting_plan_for_goal),
+            "plan_cache": self._plan_cache.stats(),
+            "search_planner": self._search_planner.name if self._search_planner is not None else None,
             "current_emotion_intensity": self._current_emotional_state.intensity if self._current_emotional_state else None,
             "current_attention_focus_item": self._current_attention_focus.focused_item_id if self._current_attention_focus else None,
             "log_entries": len(self._log)
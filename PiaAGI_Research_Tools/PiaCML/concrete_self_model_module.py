@@ -1,4 +1,6 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+import logging
 import time
 import uuid # For module_id generation
 import asyncio # For __main__
@@ -25,6 +27,13 @@ except ImportError:
     AttentionFocusUpdatePayload = object # type: ignore
 
 
+try:
+    from .module_logger import ModuleLoggingMixin
+    from .ethical_rule_matcher import CompiledEthicalRules
+except ImportError:
+    from module_logger import ModuleLoggingMixin # type: ignore
+    from ethical_rule_matcher import CompiledEthicalRules # type: ignore
+
 # --- Data Classes Definition (Copied from original, ensure they are up-to-date if changed elsewhere) ---
 class SelfAttributes:
     def __init__(self, agent_id: str = "PiaAGI_Self_v1.0",
@@ -103,8 +112,25 @@ class EthicalRule:
 
 class EthicalFramework:
     def __init__(self, rules: Optional[List[EthicalRule]] = None):
+        self.version: int = 0 # Bumped whenever the rules change; the compiled matcher is rebuilt on a new version
         self.rules = rules or []
 
+    @property
+    def rules(self) -> List[EthicalRule]: return self._rules
+
+    @rules.setter
+    def rules(self, rules: Optional[List[EthicalRule]]):
+        self._rules = rules
+        self.invalidate()
+
+    def add_rule(self, rule: EthicalRule):
+        self._rules.append(rule)
+        self.invalidate()
+
+    def invalidate(self):
+        """Call after changing the rule list or a rule's principle, contexts, priority or implication in place."""
+        self.version += 1
+
 class AutobiographicalLogSummaryEntry:
     def __init__(self, entry_id: str, ltm_ref: str, timestamp: float, description: str, type: str, impact_on_self_model_summary: str = ""):
         self.entry_id, self.ltm_ref, self.timestamp, self.description, self.type, self.impact_on_self_model_summary = entry_id, ltm_ref, timestamp, description, type, impact_on_self_model_summary
@@ -121,8 +147,18 @@ class DevelopmentalState: # Simplified
     def __init__(self, active_developmental_goals: Optional[List[DevelopmentalGoal]] = None):
         self.active_developmental_goals = active_developmental_goals or []
 
+ETHICAL_EVALUATION_CACHE_SIZE = 256 # Memoized evaluations of recent proposals, per module
+
+
+def _copy_ethical_evaluation(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {"outcome": result["outcome"], "relevant_rules": list(result["relevant_rules"]),
+            "detailed_relevant_rules": [dict(details) for details in result["detailed_relevant_rules"]],
+            "reasoning": list(result["reasoning"])}
+
 # --- ConcreteSelfModelModule Class ---
-class ConcreteSelfModelModule(BaseSelfModelModule):
+class ConcreteSelfModelModule(BaseSelfModelModule, ModuleLoggingMixin):
+    _log_timestamp_format = "epoch"
+
     def __init__(self,
                  message_bus: Optional[MessageBus] = None,
                  module_id: str = f"SelfModelModule_{str(uuid.uuid4())[:8]}"):
@@ -140,6 +176,9 @@ class ConcreteSelfModelModule(BaseSelfModelModule):
         self._capability_confidence: Dict[str, float] = {} # Renamed from self.capability_confidence
         self._performance_log: List[Dict[str, Any]] = []
         self._self_related_percepts: List[PerceptDataPayload] = []
+        self._ethical_matcher: Optional[CompiledEthicalRules] = None # Built from ethical_framework on first evaluation
+        self._ethical_matcher_framework: Optional[EthicalFramework] = None
+        self._ethical_evaluation_cache: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
 
         bus_status_msg = "not configured"
         if self._message_bus:
@@ -163,12 +202,8 @@ class ConcreteSelfModelModule(BaseSelfModelModule):
             except Exception as e:
                 bus_status_msg = f"FAILED to subscribe: {e}"
 
-        self._log: List[str] = [] # Initialize log
         self._log_message(f"ConcreteSelfModelModule '{self._module_id}' initialized. Message bus {bus_status_msg}.")
 
-    def _log_message(self, message: str):
-        self._log.append(f"{time.time():.2f} [{self._module_id}]: {message}")
-
     # --- Message Handler Methods ---
     def _handle_goal_update_message(self, message: GenericMessage):
         if not isinstance(message.payload, GoalUpdatePayload): return
@@ -250,7 +285,7 @@ class ConcreteSelfModelModule(BaseSelfModelModule):
         if aspect is None:
             return {
                 "attributes": self.attributes.__dict__, "knowledge_map": self.knowledge_map.__dict__,
-                "capabilities": self.capabilities.__dict__, "ethical_framework": self.ethical_framework.__dict__,
+                "capabilities": self.capabilities.__dict__, "ethical_framework": {"rules": self.ethical_framework.rules},
                 "autobiography": self.autobiography.__dict__, "development": self.development.__dict__
             }
         main_components = {"attributes": self.attributes, "knowledge_map": self.knowledge_map, "capabilities": self.capabilities,
@@ -315,12 +350,63 @@ class ConcreteSelfModelModule(BaseSelfModelModule):
     # For brevity, I'll assume they are structurally similar to the original unless specified.
     # Ensure to keep or adapt update_self_representation if needed.
 
+    def _compiled_ethical_rules(self) -> CompiledEthicalRules:
+        """The matcher for the current rulebase, rebuilt (and the evaluation cache cleared) when the rules change."""
+        framework = self.ethical_framework
+        rules, version = framework.rules, getattr(framework, "version", 0)
+        matcher = self._ethical_matcher
+        # In-place appends without invalidate() are still noticed through the length
+        if (matcher is None or self._ethical_matcher_framework is not framework or matcher.version != version
+                or matcher.source_rules is not rules or len(matcher.rules) != len(rules)):
+            matcher = self._ethical_matcher = CompiledEthicalRules(rules, version=version)
+            self._ethical_matcher_framework = framework
+            self._ethical_evaluation_cache = OrderedDict()
+            self._log_message("Compiled %d ethical rules (%d keywords).", len(rules), len(matcher.automaton.keywords), level=logging.DEBUG)
+        return matcher
+
     def perform_ethical_evaluation(self, action_proposal: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         action_type_log = action_proposal.get('action_type', 'N/A')
-        self._log_message(f"Performing ethical evaluation for action: {action_type_log}, Context: {str(context)[:100]}")
+        self._log_message("Performing ethical evaluation for action: %s, Context: %.100s", action_type_log, context)
+
+        action_description = action_proposal.get("description", "").lower()
+        action_intent = action_proposal.get("intent", action_proposal.get("reason", "")).lower() # Use 'intent' or fallback to 'reason'
+        context_keywords = context.get("keywords", []) if context else [] # Expecting context keywords as a list
+        context_string_full = str(context).lower() if context else "" # For broader context matching
 
+        # Ensure ethical_framework and rules are not None
+        rules_missing = not hasattr(self.ethical_framework, 'rules') or self.ethical_framework.rules is None
+        if rules_missing:
+            self.ethical_framework.rules = []
+            self._log_message("Warning: Ethical framework rules not initialized. Proceeding with no rules.", level=logging.WARNING)
+
+        # Rules are matched by one scan of each text; identical proposals under the same rules reuse the evaluation
+        matcher = self._compiled_ethical_rules()
+        cache_key: Optional[Tuple[Any, ...]] = None
+        if not rules_missing:
+            try:
+                keywords_key = context_keywords if isinstance(context_keywords, str) else tuple(context_keywords)
+                cache_key = (action_description, action_intent, keywords_key, context_string_full)
+                cached = self._ethical_evaluation_cache.get(cache_key)
+            except TypeError: # Unhashable keywords: evaluate without caching
+                cache_key, cached = None, None
+            if cached is not None:
+                self._ethical_evaluation_cache.move_to_end(cache_key)
+                self._log_message("Ethical evaluation for action %s served from cache. Outcome: %s.", action_type_log, cached["outcome"], level=logging.DEBUG)
+                return _copy_ethical_evaluation(cached)
+
+        matches = matcher.match(action_description, action_intent, context_keywords, context_string_full)
+        result = self._evaluate_matched_ethical_rules(matches, rules_missing)
+        if cache_key is not None:
+            self._ethical_evaluation_cache[cache_key] = _copy_ethical_evaluation(result)
+            if len(self._ethical_evaluation_cache) > ETHICAL_EVALUATION_CACHE_SIZE:
+                self._ethical_evaluation_cache.popitem(last=False)
+        return result
+
+    def _evaluate_matched_ethical_rules(self, matches: List[Tuple[EthicalRule, List[str]]], rules_missing: bool) -> Dict[str, Any]:
         # Initialize with structured reasoning
         reasoning_steps: List[str] = ["Initial assessment: Action is considered PERMISSIBLE by default."]
+        if rules_missing:
+            reasoning_steps.append("Warning: No ethical rules loaded. Evaluation based on default permissibility.")
 
         current_outcome: str = "PERMISSIBLE"
         # Track the rule that decisively set the outcome, and its priority
@@ -329,111 +415,55 @@ class ConcreteSelfModelModule(BaseSelfModelModule):
         # Store all rules that were matched, regardless of whether they changed the outcome
         matched_rules_details: List[Dict[str, Any]] = []
 
-        action_description = action_proposal.get("description", "").lower()
-        action_intent = action_proposal.get("intent", action_proposal.get("reason", "")).lower() # Use 'intent' or fallback to 'reason'
-        context_keywords = context.get("keywords", []) if context else [] # Expecting context keywords as a list
-        context_string_full = str(context).lower() if context else "" # For broader context matching
-
-        # Ensure ethical_framework and rules are not None
-        if not hasattr(self.ethical_framework, 'rules') or self.ethical_framework.rules is None:
-            self.ethical_framework.rules = []
-            self._log_message("Warning: Ethical framework rules not initialized. Proceeding with no rules.")
-            reasoning_steps.append("Warning: No ethical rules loaded. Evaluation based on default permissibility.")
-
         # Define priority order for easier comparison (higher number = higher priority)
         PRIORITY_ORDER = {"low": 1, "medium": 2, "moderate": 2, "high": 3, "critical": 4, "1":3, "2":2, "3":1} # Map string/int to comparable value
 
-        for rule in self.ethical_framework.rules:
-            rule_matched_by_principle = False
-            rule_matched_by_context = False
-            match_log_details = []
-
-            # Check principle in action description or intent
-            if rule.principle.lower() in action_description:
-                rule_matched_by_principle = True
-                match_log_details.append(f"Principle '{rule.principle}' in action description.")
-            if rule.principle.lower() in action_intent:
-                rule_matched_by_principle = True
-                match_log_details.append(f"Principle '{rule.principle}' in action intent/reason.")
-
-            # Check applicability contexts (keywords or full string match)
-            if rule.applicability_contexts:
-                for app_context_keyword in rule.applicability_contexts:
-                    ac_lower = app_context_keyword.lower()
-                    if ac_lower in context_keywords or ac_lower in context_string_full:
-                        rule_matched_by_context = True
-                        match_log_details.append(f"Applicability context '{app_context_keyword}' matched active context.")
-                        break
-
-            is_globally_applicable = not rule.applicability_contexts # Rule applies if no specific contexts are listed for it
-
-            if rule_matched_by_principle or (is_globally_applicable and rule_matched_by_principle) or (rule_matched_by_context and rule_matched_by_principle):
-                 # This logic means a principle keyword must be present for a rule to be considered,
-                 # and if contexts are specified, one of them must also match.
-                 # If no contexts are specified for the rule, matching principle keyword is enough.
-                 # Let's refine: if context matches, AND principle keywords match = strongest match.
-                 # If global (no app_context) AND principle keywords match = match.
-                 # If app_context matches BUT NO principle keyword = no match (unless rule is defined to match on context alone) - current assumption: principle keyword is key.
-                 # For this refactor, we'll assume:
-                 #   A) If rule.applicability_contexts is NOT empty, AT LEAST ONE must match AND a principle keyword must match.
-                 #   B) If rule.applicability_contexts IS empty (global), a principle keyword match is sufficient.
-
-                actual_match = False
-                if not rule.applicability_contexts and rule_matched_by_principle:
-                    actual_match = True
-                elif rule.applicability_contexts and rule_matched_by_context and rule_matched_by_principle:
-                    actual_match = True
-
-                if not actual_match and rule_matched_by_principle and rule_matched_by_context: # If both matched, it's an actual match.
-                     actual_match = True
-
-
-            if rule_matched_by_principle and (is_globally_applicable or rule_matched_by_context):
-                self._log_message(f"Rule '{rule.rule_id}' (Prio: {rule.priority_level}, Impl: {rule.implication}) considered. Matched by: {', '.join(match_log_details)}.")
-
-                current_rule_details = {
-                    "rule_id": rule.rule_id, "principle": rule.principle,
-                    "priority_str": str(rule.priority_level).lower(),
-                    "priority_val": PRIORITY_ORDER.get(str(rule.priority_level).lower(), 0),
-                    "description": rule.description, "implication": rule.implication,
-                    "match_source": ", ".join(match_log_details)
-                }
-                matched_rules_details.append(current_rule_details)
-                reasoning_steps.append(f"Rule '{rule.rule_id}' ({rule.principle}) considered due to: {current_rule_details['match_source']}. Implication: {rule.implication}, Priority: {rule.priority_level}.")
-
-                # Determine if this rule changes the outcome
-                new_outcome_candidate = current_outcome
-                changed_by_current_rule = False
-
-                if rule.implication == "impermissible":
-                    new_outcome_candidate = "IMPERMISSIBLE"
-                    changed_by_current_rule = True
-                elif rule.implication == "requires_caution" and current_outcome != "IMPERMISSIBLE":
-                    new_outcome_candidate = "REQUIRES_REVIEW"
-                    changed_by_current_rule = True
-                # "encouraged" or "neutral" don't change outcome hierarchy but add to reasoning
-
-                if changed_by_current_rule:
-                    # Compare with existing decisive rule if any
-                    if decisive_rule_info is None or \
-                       PRIORITY_ORDER.get(new_outcome_candidate, 0) > PRIORITY_ORDER.get(current_outcome, 0) or \
-                       (PRIORITY_ORDER.get(new_outcome_candidate, 0) == PRIORITY_ORDER.get(current_outcome, 0) and \
-                        current_rule_details["priority_val"] > decisive_rule_info["priority_val"]):
-
-                        if decisive_rule_info:
-                            self._log_message(f"Rule '{current_rule_details['rule_id']}' (PrioVal: {current_rule_details['priority_val']}) overrides previous decisive rule '{decisive_rule_info['rule_id']}' (PrioVal: {decisive_rule_info['priority_val']}) for outcome '{new_outcome_candidate}'.")
-                            reasoning_steps.append(f"Outcome updated to '{new_outcome_candidate}' by rule '{rule.rule_id}', overriding prior considerations due to priority/severity.")
-                        else:
-                            reasoning_steps.append(f"Outcome set to '{new_outcome_candidate}' by rule '{rule.rule_id}'.")
-
-                        current_outcome = new_outcome_candidate
-                        decisive_rule_info = current_rule_details
+        # A rule applies when its principle is in the action description or intent and it is either
+        # global (no applicability contexts) or one of its contexts matches the active context
+        self._log_message("%d of %d ethical rules matched.", len(matches), len(self.ethical_framework.rules), level=logging.DEBUG)
+        for rule, match_log_details in matches:
+            self._log_message("Rule '%s' (Prio: %s, Impl: %s) considered. Matched by: %s.", rule.rule_id, rule.priority_level, rule.implication, ", ".join(match_log_details))
+
+            current_rule_details = {
+                "rule_id": rule.rule_id, "principle": rule.principle,
+                "priority_str": str(rule.priority_level).lower(),
+                "priority_val": PRIORITY_ORDER.get(str(rule.priority_level).lower(), 0),
+                "description": rule.description, "implication": rule.implication,
+                "match_source": ", ".join(match_log_details)
+            }
+            matched_rules_details.append(current_rule_details)
+            reasoning_steps.append(f"Rule '{rule.rule_id}' ({rule.principle}) considered due to: {current_rule_details['match_source']}. Implication: {rule.implication}, Priority: {rule.priority_level}.")
+
+            # Determine if this rule changes the outcome
+            new_outcome_candidate = current_outcome
+            changed_by_current_rule = False
+
+            if rule.implication == "impermissible":
+                new_outcome_candidate = "IMPERMISSIBLE"
+                changed_by_current_rule = True
+            elif rule.implication == "requires_caution" and current_outcome != "IMPERMISSIBLE":
+                new_outcome_candidate = "REQUIRES_REVIEW"
+                changed_by_current_rule = True
+            # "encouraged" or "neutral" don't change outcome hierarchy but add to reasoning
+
+            if changed_by_current_rule:
+                # Compare with existing decisive rule if any
+                if decisive_rule_info is None or \
+                   PRIORITY_ORDER.get(new_outcome_candidate, 0) > PRIORITY_ORDER.get(current_outcome, 0) or \
+                   (PRIORITY_ORDER.get(new_outcome_candidate, 0) == PRIORITY_ORDER.get(current_outcome, 0) and \
+                    current_rule_details["priority_val"] > decisive_rule_info["priority_val"]):
+
+                    if decisive_rule_info:
+                        self._log_message("Rule '%s' (PrioVal: %s) overrides previous decisive rule '%s' (PrioVal: %s) for outcome '%s'.", current_rule_details['rule_id'], current_rule_details['priority_val'], decisive_rule_info['rule_id'], decisive_rule_info['priority_val'], new_outcome_candidate)
+                        reasoning_steps.append(f"Outcome updated to '{new_outcome_candidate}' by rule '{rule.rule_id}', overriding prior considerations due to priority/severity.")
                     else:
-                        self._log_message(f"Rule '{current_rule_details['rule_id']}' considered, but current outcome '{current_outcome}' (by rule '{decisive_rule_info.get('rule_id', 'N/A')}') maintained due to priority/severity.")
-                        reasoning_steps.append(f"Rule '{rule.rule_id}' noted, but outcome '{current_outcome}' (from rule '{decisive_rule_info.get('rule_id', 'N/A')}') is maintained.")
-            else: # Rule not matched by current logic
-                 self._log_message(f"Rule '{rule.rule_id}' not matched (Principle matched: {rule_matched_by_principle}, Context applicable/matched: {is_globally_applicable or rule_matched_by_context}).")
+                        reasoning_steps.append(f"Outcome set to '{new_outcome_candidate}' by rule '{rule.rule_id}'.")
 
+                    current_outcome = new_outcome_candidate
+                    decisive_rule_info = current_rule_details
+                else:
+                    self._log_message("Rule '%s' considered, but current outcome '%s' (by rule '%s') maintained due to priority/severity.", current_rule_details['rule_id'], current_outcome, decisive_rule_info.get('rule_id', 'N/A'))
+                    reasoning_steps.append(f"Rule '{rule.rule_id}' noted, but outcome '{current_outcome}' (from rule '{decisive_rule_info.get('rule_id', 'N/A')}') is maintained.")
 
         # Final reasoning refinement based on outcome and matched rules
         if current_outcome == "PERMISSIBLE":
@@ -462,7 +492,7 @@ class ConcreteSelfModelModule(BaseSelfModelModule):
             "detailed_relevant_rules": matched_rules_details,
             "reasoning": final_reasoning_list # Structured reasoning
         }
-        self._log_message(f"Ethical evaluation completed. Outcome: {current_outcome}. Relevant rules IDs: {[r['rule_id'] for r in matched_rules_details]}. Final reasoning steps count: {len(final_reasoning_list)}.")
+        self._log_message("Ethical evaluation completed. Outcome: %s. Relevant rules IDs: %s. Final reasoning steps count: %d.", current_outcome, result["relevant_rules"], len(final_reasoning_list))
         return result
 
     def assess_confidence_in_knowledge(self, concept_id: str, query_context: Optional[Dict[str, Any]] = None) -> Optional[float]:
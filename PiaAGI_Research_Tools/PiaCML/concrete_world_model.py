@@ -1,4 +1,5 @@
 from typing import Any, Dict, List, Optional, Union, Tuple
+import logging
 import time
 import uuid
 import asyncio # For __main__
@@ -25,6 +26,17 @@ except ImportError:
     LTMQueryPayload = object # type: ignore
 
 
+try:
+    from .module_logger import ModuleLoggingMixin
+    from .world_model_index import EntityRepository, ResultView, DEFAULT_SPATIAL_CELL_SIZE
+    from .temporal_event_store import TemporalEventStore, EventRetentionPolicy
+    from .world_model_kinematics import KinematicsCache, predict_trajectories
+except ImportError:
+    from module_logger import ModuleLoggingMixin # type: ignore
+    from world_model_index import EntityRepository, ResultView, DEFAULT_SPATIAL_CELL_SIZE # type: ignore
+    from temporal_event_store import TemporalEventStore, EventRetentionPolicy # type: ignore
+    from world_model_kinematics import KinematicsCache, predict_trajectories # type: ignore
+
 # --- Data Classes Definition (Copied from original, ensure they are up-to-date) ---
 class WorldEntity:
     def __init__(self, id: str, type: str, state: Dict[str, Any],
@@ -63,22 +75,28 @@ class SelfStateSnapshot: pass # Unchanged, assume defined as before
 class UncertaintyInfo: pass # Unchanged, assume defined as before
 
 # --- ConcreteWorldModel Class ---
-class ConcreteWorldModel(BaseWorldModel):
+class ConcreteWorldModel(BaseWorldModel, ModuleLoggingMixin):
+    _log_timestamp_format = "epoch"
+
     def __init__(self,
                  message_bus: Optional[MessageBus] = None,
-                 module_id: str = f"WorldModel_{str(uuid.uuid4())[:8]}"):
+                 module_id: str = f"WorldModel_{str(uuid.uuid4())[:8]}",
+                 spatial_cell_size: float = DEFAULT_SPATIAL_CELL_SIZE,
+                 event_retention: Optional[EventRetentionPolicy] = None):
         self._module_id = module_id # Renamed from model_id for consistency
         self._message_bus = message_bus
         self.last_updated_timestamp: float = time.time()
+        self._spatial_cell_size = spatial_cell_size
+        self._event_retention = event_retention # None keeps every event, as before
 
-        self._entity_repository: Dict[str, WorldEntity] = {}
+        self._entity_repository: EntityRepository = EntityRepository(cell_size=spatial_cell_size) # Indexed by type, location and position
         self._spatial_model: Dict[str, SpatialData] = {}
-        self._temporal_model_events: List[TemporalEvent] = []
+        self._temporal_model_events: TemporalEventStore = TemporalEventStore(retention=event_retention) # Time-ordered, indexed by type and entity
         self._social_model: Dict[str, SocialAgentModel] = {} # Not directly used by new handlers
         self._physics_rules: List[PhysicsRule] = [] # Not directly used by new handlers
         self._self_state_snapshot: SelfStateSnapshot = SelfStateSnapshot() # Not directly used by new handlers
         self._uncertainty_map: Dict[str, UncertaintyInfo] = {} # Not directly used by new handlers
-        self._log: List[str] = []
+        self._kinematics_cache = KinematicsCache() # Per-entity inputs of predict_future_states
 
         self._handled_message_counts: Dict[str, int] = {
             "PerceptData": 0, "LTMQueryResult": 0, "ActionEvent": 0
@@ -97,15 +115,33 @@ class ConcreteWorldModel(BaseWorldModel):
             else: bus_status_msg = "core message types missing for subscription"
         self._log_message(f"ConcreteWorldModel '{self._module_id}' initialized. Message bus {bus_status_msg}.")
 
-    def _log_message(self, message: str): self._log.append(f"{time.time():.2f} [{self._module_id}]: {message}")
     def _update_timestamp(self): self.last_updated_timestamp = time.time()
 
+    # Plain dicts/lists assigned to these (e.g. when restoring or seeding a model) are wrapped so the indexes stay valid
+    @property
+    def _entity_repository(self) -> EntityRepository: return self._entities
+
+    @_entity_repository.setter
+    def _entity_repository(self, entities: Dict[str, WorldEntity]):
+        self._entities = entities if isinstance(entities, EntityRepository) else EntityRepository(entities, cell_size=self._spatial_cell_size)
+
+    @property
+    def _temporal_model_events(self) -> TemporalEventStore: return self._events
+
+    @_temporal_model_events.setter
+    def _temporal_model_events(self, events: List[TemporalEvent]):
+        self._events = events if isinstance(events, TemporalEventStore) else TemporalEventStore(events, retention=self._event_retention)
+
+    def reindex_entity(self, entity_id: str):
+        """Updates the query indexes, and invalidates cached kinematics, after an entity's type, location_id or state was changed in place."""
+        self._entity_repository.reindex(entity_id)
+
     # --- Message Handler Methods ---
     def _handle_percept_data_message(self, message: GenericMessage):
         if not isinstance(message.payload, PerceptDataPayload): return
         payload: PerceptDataPayload = message.payload
         self._handled_message_counts["PerceptData"] += 1
-        self._log_message(f"Handling PerceptData (MsgID: {message.message_id}, PerceptID: {payload.percept_id}, Modality: {payload.modality})")
+        self._log_message("Handling PerceptData (MsgID: %s, PerceptID: %s, Modality: %s)", message.message_id, payload.percept_id, payload.modality)
 
         if isinstance(payload.content, dict) and "entities" in payload.content:
             entities_data = payload.content["entities"]
@@ -123,7 +159,7 @@ class ConcreteWorldModel(BaseWorldModel):
                         entity.state.update(observed_state) # Merge new observations
                         entity.last_observed_ts = payload.source_timestamp.timestamp() if payload.source_timestamp else time.time()
                         if entity_dict.get("location_id"): entity.location_id = entity_dict.get("location_id")
-                        self._log_message(f"Updated entity '{entity_id}' from percept.")
+                        self._log_message("Updated entity '%s' from percept.", entity_id)
                     else:
                         self._entity_repository[entity_id] = WorldEntity(
                             id=entity_id, type=entity_type, state=observed_state,
@@ -132,14 +168,15 @@ class ConcreteWorldModel(BaseWorldModel):
                             last_observed_ts=payload.source_timestamp.timestamp() if payload.source_timestamp else time.time(),
                             location_id=entity_dict.get("location_id")
                         )
-                        self._log_message(f"Created new entity '{entity_id}' from percept.")
+                        self._log_message("Created new entity '%s' from percept.", entity_id)
+                    self.reindex_entity(entity_id)
                     self._update_timestamp()
 
     def _handle_ltm_query_result_message(self, message: GenericMessage):
         if not isinstance(message.payload, LTMQueryResultPayload): return
         payload: LTMQueryResultPayload = message.payload
         self._handled_message_counts["LTMQueryResult"] += 1
-        self._log_message(f"Handling LTMQueryResult (QueryID: {payload.query_id}, Success: {payload.success_status}, Results: {len(payload.results)})")
+        self._log_message("Handling LTMQueryResult (QueryID: %s, Success: %s, Results: %s)", payload.query_id, payload.success_status, len(payload.results))
 
         if payload.success_status:
             for item in payload.results:
@@ -160,7 +197,7 @@ class ConcreteWorldModel(BaseWorldModel):
                             entity.state.update(state)
                             entity.properties.update(properties) # Merge properties
                             entity.last_observed_ts = item.timestamp.timestamp() if item.timestamp else time.time()
-                            self._log_message(f"Updated entity '{entity_id}' from LTM result.")
+                            self._log_message("Updated entity '%s' from LTM result.", entity_id)
                         else:
                             self._entity_repository[entity_id] = WorldEntity(
                                 id=entity_id, type=entity_type, state=state, properties=properties,
@@ -168,7 +205,8 @@ class ConcreteWorldModel(BaseWorldModel):
                                 last_observed_ts=item.timestamp.timestamp() if item.timestamp else time.time(),
                                 location_id=content_dict.get("location_id")
                             )
-                            self._log_message(f"Created new entity '{entity_id}' from LTM result.")
+                            self._log_message("Created new entity '%s' from LTM result.", entity_id)
+                        self.reindex_entity(entity_id)
                         self._update_timestamp()
 
     def _handle_action_event_message(self, message: GenericMessage):
@@ -176,7 +214,7 @@ class ConcreteWorldModel(BaseWorldModel):
         payload: ActionEventPayload = message.payload
         self._handled_message_counts["ActionEvent"] += 1
         ts = payload.timestamp.timestamp() if payload.timestamp else time.time()
-        self._log_message(f"Handling ActionEvent (CmdID: {payload.action_command_id}, Type: {payload.action_type}, Status: {payload.status})")
+        self._log_message("Handling ActionEvent (CmdID: %s, Type: %s, Status: %s)", payload.action_command_id, payload.action_type, payload.status)
 
         # Add to temporal model
         event_id = f"evt_action_{payload.action_command_id}_{payload.status.lower()}"
@@ -201,16 +239,17 @@ class ConcreteWorldModel(BaseWorldModel):
                 if isinstance(outcome_data, EntityMovementOutcome):
                     agent_id = outcome_data.entity_id
                     new_loc_id = outcome_data.new_location_id
-                    self._log_message(f"Processing EntityMovementOutcome for '{agent_id}'.")
+                    self._log_message("Processing EntityMovementOutcome for '%s'.", agent_id)
                 elif isinstance(outcome_data, dict): # Fallback for backward compatibility
                     agent_id = outcome_data.get("agent_id", outcome_data.get("entity_id"))
                     new_loc_id = outcome_data.get("new_location_id", outcome_data.get("location_id"))
-                    self._log_message(f"Processing MOVE_AGENT with dict outcome for '{agent_id}'.")
+                    self._log_message("Processing MOVE_AGENT with dict outcome for '%s'.", agent_id)
 
                 if agent_id and new_loc_id and agent_id in self._entity_repository:
                     self._entity_repository[agent_id].location_id = new_loc_id
                     self._entity_repository[agent_id].last_observed_ts = ts
-                    self._log_message(f"Entity '{agent_id}' moved to '{new_loc_id}' due to ActionEvent.")
+                    self._log_message("Entity '%s' moved to '%s' due to ActionEvent.", agent_id, new_loc_id)
+                    self.reindex_entity(agent_id)
                     self._update_timestamp()
 
             elif action_type_upper == "CREATE_OBJECT":
@@ -221,14 +260,14 @@ class ConcreteWorldModel(BaseWorldModel):
                     obj_loc = outcome_data.location_id
                     obj_state = outcome_data.state
                     obj_props = outcome_data.properties
-                    self._log_message(f"Processing EntityCreationOutcome for '{obj_id}'.")
+                    self._log_message("Processing EntityCreationOutcome for '%s'.", obj_id)
                 elif isinstance(outcome_data, dict): # Fallback
                     obj_id = outcome_data.get("object_id")
                     obj_type = outcome_data.get("object_type", "unknown_created_object")
                     obj_loc = outcome_data.get("location_id")
                     obj_state = outcome_data.get("state", {})
                     obj_props = outcome_data.get("properties", {})
-                    self._log_message(f"Processing CREATE_OBJECT with dict outcome for '{obj_id}'.")
+                    self._log_message("Processing CREATE_OBJECT with dict outcome for '%s'.", obj_id)
 
                 if obj_id:
                     if obj_id not in self._entity_repository:
@@ -236,44 +275,47 @@ class ConcreteWorldModel(BaseWorldModel):
                             id=obj_id, type=obj_type, state=obj_state, properties=obj_props,
                             affordances=[], relationships={}, last_observed_ts=ts, location_id=obj_loc
                         )
-                        self._log_message(f"New entity '{obj_id}' created due to ActionEvent.")
+                        self._log_message("New entity '%s' created due to ActionEvent.", obj_id)
                     else: # Object already existed, update its state/props
                         self._entity_repository[obj_id].state.update(obj_state)
                         self._entity_repository[obj_id].properties.update(obj_props)
                         self._entity_repository[obj_id].last_observed_ts = ts
                         if obj_loc: self._entity_repository[obj_id].location_id = obj_loc
-                        self._log_message(f"Entity '{obj_id}' state/props updated due to CREATE_OBJECT ActionEvent.")
+                        self._log_message("Entity '%s' state/props updated due to CREATE_OBJECT ActionEvent.", obj_id)
+                    self.reindex_entity(obj_id)
                     self._update_timestamp()
 
             elif action_type_upper == "CHANGE_ENTITY_STATE":
                 if isinstance(outcome_data, EntityStateChangeOutcome):
                     entity_id_to_change = outcome_data.entity_id
-                    self._log_message(f"Processing EntityStateChangeOutcome for '{entity_id_to_change}'. Reason: {outcome_data.reason}")
+                    self._log_message("Processing EntityStateChangeOutcome for '%s'. Reason: %s", entity_id_to_change, outcome_data.reason)
                     if entity_id_to_change in self._entity_repository:
                         entity = self._entity_repository[entity_id_to_change]
                         entity.state.update(outcome_data.changed_state)
                         entity.last_observed_ts = ts
-                        self._log_message(f"Entity '{entity_id_to_change}' state updated: {outcome_data.changed_state}.")
+                        self._log_message("Entity '%s' state updated: %s.", entity_id_to_change, outcome_data.changed_state)
+                        self.reindex_entity(entity_id_to_change)
                         self._update_timestamp()
                     else:
-                        self._log_message(f"Entity '{entity_id_to_change}' for state change not found.")
+                        self._log_message("Entity '%s' for state change not found.", entity_id_to_change)
                 elif isinstance(outcome_data, dict) and "entity_id" in outcome_data and "changed_state" in outcome_data: # Fallback
                     entity_id_to_change = outcome_data["entity_id"]
                     changed_state_dict = outcome_data["changed_state"]
-                    self._log_message(f"Processing CHANGE_ENTITY_STATE with dict outcome for '{entity_id_to_change}'.")
+                    self._log_message("Processing CHANGE_ENTITY_STATE with dict outcome for '%s'.", entity_id_to_change)
                     if entity_id_to_change in self._entity_repository and isinstance(changed_state_dict, dict):
                         entity = self._entity_repository[entity_id_to_change]
                         entity.state.update(changed_state_dict)
                         entity.last_observed_ts = ts
-                        self._log_message(f"Entity '{entity_id_to_change}' state updated via dict: {changed_state_dict}.")
+                        self._log_message("Entity '%s' state updated via dict: %s.", entity_id_to_change, changed_state_dict)
+                        self.reindex_entity(entity_id_to_change)
                         self._update_timestamp()
                     else:
-                        self._log_message(f"Entity '{entity_id_to_change}' for state change not found or changed_state invalid.")
+                        self._log_message("Entity '%s' for state change not found or changed_state invalid.", entity_id_to_change)
             # Else, other action types or generic outcomes might be logged or handled by a default mechanism
             elif isinstance(outcome_data, GeneralActionOutcome):
-                 self._log_message(f"Received GeneralActionOutcome: {outcome_data.description}. Details: {outcome_data.details}")
+                 self._log_message("Received GeneralActionOutcome: %s. Details: %s", outcome_data.description, outcome_data.details)
             elif isinstance(outcome_data, dict): # Fallback for other dict-based outcomes
-                 self._log_message(f"Received generic dict outcome for action '{payload.action_type}': {str(outcome_data)[:100]}")
+                 self._log_message("Received generic dict outcome for action '%s': %s", payload.action_type, str(outcome_data)[:100])
 
 
     # --- Existing Methods (ensure they use self._module_id in logs if applicable) ---
@@ -283,7 +325,7 @@ class ConcreteWorldModel(BaseWorldModel):
     # update_entity_state and get_entity_representation are core and used.
 
     def get_entity_representation(self, entity_id: str) -> Optional[WorldEntity]:
-        self._log_message(f"Getting entity representation for {entity_id}")
+        self._log_message("Getting entity representation for %s", entity_id)
         return self._entity_repository.get(entity_id)
 
     def update_entity_state(self, entity_id: str, new_state_info: Dict[str, Any], timestamp: Optional[float] = None) -> bool:
@@ -291,70 +333,118 @@ class ConcreteWorldModel(BaseWorldModel):
         ts = timestamp if timestamp is not None else time.time()
         entity = self._entity_repository.get(entity_id)
         if entity:
-            self._log_message(f"Updating entity '{entity_id}' state with {new_state_info}")
+            self._log_message("Updating entity '%s' state with %s", entity_id, new_state_info)
             entity.state.update(new_state_info.get("state", {}))
             entity.properties.update(new_state_info.get("properties", {}))
             if "location_id" in new_state_info: entity.location_id = new_state_info["location_id"]
             entity.last_observed_ts = ts
+            self.reindex_entity(entity_id)
             self._update_timestamp()
             return True
-        self._log_message(f"Entity '{entity_id}' not found for state update.")
+        self._log_message("Entity '%s' not found for state update.", entity_id)
         return False
 
     # Placeholder for other methods from original like query_world_state, predict_future_state etc.
     # They would need to be reviewed to ensure they use the new _entity_repository etc. correctly.
     def query_world_state(self, query_params: Dict[str, Any]) -> Dict[str, Any]:
-        self._log_message(f"Querying world state with params: {query_params}")
+        """
+        Answers a query from the repository and event indexes.
+
+        Returns:
+            {"success": bool, "data" or "error": ...}. "entity_state" returns the entity's dict;
+            list queries return a read-only `ResultView` of dicts, built on access. Use
+            `data.to_dicts()` where a list is needed, e.g. for JSON serialization.
+        """
+        self._log_message("Querying world state with params: %s", query_params)
         query_type = query_params.get("query_type") # Changed "type" to "query_type" for clarity
 
         if query_type == "entity_state" and "entity_id" in query_params:
             entity_id = query_params["entity_id"]
-            self._log_message(f"Query: Get entity state for '{entity_id}'.")
+            self._log_message("Query: Get entity state for '%s'.", entity_id)
             entity = self.get_entity_representation(entity_id)
             return {"success": True, "data": entity.to_dict()} if entity else {"success": False, "error": f"Entity '{entity_id}' not found"}
 
+        # List results are read-only ResultViews over the matching objects, built from the indexes
         elif query_type == "all_entities":
             self._log_message("Query: Get all entities.")
-            return {"success": True, "data": [e.to_dict() for e in self._entity_repository.values()]}
+            return {"success": True, "data": ResultView(list(self._entity_repository.values()))}
 
         elif query_type == "entities_by_type" and "entity_type" in query_params:
             entity_type_query = query_params["entity_type"]
-            self._log_message(f"Query: Get entities by type '{entity_type_query}'.")
-            result = [e.to_dict() for e in self._entity_repository.values() if e.type == entity_type_query]
-            return {"success": True, "data": result}
+            self._log_message("Query: Get entities by type '%s'.", entity_type_query)
+            repository = self._entity_repository
+            return {"success": True, "data": ResultView(repository.entities(repository.ids_by_type(entity_type_query)))}
 
         elif query_type == "entities_by_location" and "location_id" in query_params:
             location_id_query = query_params["location_id"]
-            self._log_message(f"Query: Get entities by location_id '{location_id_query}'.")
-            result = [e.to_dict() for e in self._entity_repository.values() if e.location_id == location_id_query]
-            return {"success": True, "data": result}
+            self._log_message("Query: Get entities by location_id '%s'.", location_id_query)
+            repository = self._entity_repository
+            return {"success": True, "data": ResultView(repository.entities(repository.ids_by_location(location_id_query)))}
+
+        elif query_type in ("entities_within_radius", "nearest_entities") and "position" in query_params:
+            return self._query_entities_near(query_type, query_params)
 
         elif query_type == "recent_events":
             count = query_params.get("count", 5)
-            self._log_message(f"Query: Get {count} recent events.")
-            return {"success": True, "data": [e.to_dict() for e in self._temporal_model_events[-count:]]}
+            self._log_message("Query: Get %s recent events.", count)
+            return {"success": True, "data": ResultView(self._temporal_model_events.latest(count))}
 
         elif query_type == "events_by_type" and "event_type" in query_params:
             event_type_query = query_params["event_type"]
-            self._log_message(f"Query: Get events by type '{event_type_query}'.")
-            result = [e.to_dict() for e in self._temporal_model_events if e.type == event_type_query]
-            return {"success": True, "data": result}
+            self._log_message("Query: Get events by type '%s'.", event_type_query)
+            return {"success": True, "data": ResultView(self._temporal_model_events.events_by_type(event_type_query))}
 
         elif query_type == "events_by_involved_entities" and "entity_ids" in query_params:
             entity_ids_query = query_params["entity_ids"]
             if not isinstance(entity_ids_query, list):
                 self._log_message("Query: Get events by involved entities - FAILED (entity_ids not a list).")
                 return {"success": False, "error": "entity_ids must be a list"}
-            self._log_message(f"Query: Get events by involved entities (any of: {entity_ids_query}).")
-            result = [
-                e.to_dict() for e in self._temporal_model_events
-                if any(ent_id in e.involved_entities for ent_id in entity_ids_query)
-            ]
-            return {"success": True, "data": result}
+            self._log_message("Query: Get events by involved entities (any of: %s).", entity_ids_query)
+            return {"success": True, "data": ResultView(self._temporal_model_events.events_involving(entity_ids_query))}
+
+        elif query_type == "events_between":
+            # {"start_time"?: t0, "end_time"?: t1, "entity_ids"?: [...], "event_type"?: type}; bounds are inclusive
+            entity_ids_query = query_params.get("entity_ids")
+            if entity_ids_query is not None and not isinstance(entity_ids_query, list):
+                self._log_message("Query: Get events between - FAILED (entity_ids not a list).")
+                return {"success": False, "error": "entity_ids must be a list"}
+            start_time, end_time = query_params.get("start_time"), query_params.get("end_time")
+            self._log_message("Query: Get events between %s and %s (entities: %s, type: %s).",
+                              start_time, end_time, entity_ids_query, query_params.get("event_type"))
+            return {"success": True, "data": ResultView(self._temporal_model_events.events_between(
+                start_time, end_time, involving=entity_ids_query, event_type=query_params.get("event_type")))}
 
-        self._log_message(f"Query: Unsupported query type '{query_type}' or missing params.")
+        self._log_message("Query: Unsupported query type '%s' or missing params.", query_type)
         return {"success": False, "error": f"Unsupported query_type '{query_type}' or missing parameters"}
 
+    def _query_entities_near(self, query_type: str, query_params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Spatial queries on entity `state["position"]`, answered from the spatial grid:
+        - entities_within_radius: {"position": [x,y,z], "radius": r, "entity_type"?: t}
+        - nearest_entities: {"position": [x,y,z], "count"?: 1, "max_distance"?: d, "entity_type"?: t}
+        Results are ordered nearest first; "distances" holds the matching distances.
+        """
+        position = query_params["position"]
+        if not isinstance(position, (list, tuple)) or len(position) not in (2, 3):
+            self._log_message("Query: %s - FAILED (position must be [x, y] or [x, y, z]).", query_type)
+            return {"success": False, "error": "position must be a list of 2 or 3 coordinates"}
+        center = (float(position[0]), float(position[1]), float(position[2]) if len(position) == 3 else 0.0)
+        entity_type = query_params.get("entity_type")
+        repository = self._entity_repository
+        if query_type == "entities_within_radius":
+            if "radius" not in query_params:
+                self._log_message("Query: entities_within_radius - FAILED (radius missing).")
+                return {"success": False, "error": "radius is required"}
+            self._log_message("Query: Get entities within %s of %s.", query_params["radius"], position)
+            matches = repository.within_radius(center, float(query_params["radius"]), entity_type)
+        else:
+            count = query_params.get("count", 1)
+            self._log_message("Query: Get %s nearest entities to %s.", count, position)
+            matches = repository.nearest(center, count, query_params.get("max_distance"), entity_type)
+        return {"success": True,
+                "data": ResultView(repository.entities(entity_id for _, entity_id in matches)),
+                "distances": [distance for distance, _ in matches]}
+
     # --- Helper methods for prediction ---
     def _calculate_distance(self, pos1: List[float], pos2: List[float]) -> float:
         if len(pos1) != 3 or len(pos2) != 3:
@@ -403,14 +493,14 @@ class ConcreteWorldModel(BaseWorldModel):
         current_rule_applied: str = "no_specific_rule_applied_current_state_assumed"
 
         # Rule 3: Static Entities (checked first as it's often a quick exit)
-        self._log_message(f"[{entity_id}] Evaluating Rule 3 (Static Entities)...")
+        self._log_message("[%s] Evaluating Rule 3 (Static Entities)...", entity_id, level=logging.DEBUG)
         STATIC_ENTITY_TYPES = ["building", "terrain_feature", "fixed_equipment", "location_marker"]
         is_static_prop = predicted_entity_dict.get("properties", {}).get("is_static") is True
         is_static_type = predicted_entity_dict.get("type") in STATIC_ENTITY_TYPES
 
         if is_static_prop or is_static_type:
             rule_reason = "is_static_prop" if is_static_prop else "is_static_type"
-            self._log_message(f"[{entity_id}] Rule 3 applies ({rule_reason}). Entity type: {predicted_entity_dict.get('type')}.")
+            self._log_message("[%s] Rule 3 applies (%s). Entity type: %s.", entity_id, rule_reason, predicted_entity_dict.get('type'), level=logging.DEBUG)
             current_rule_applied = "static_entity_no_change"
             current_confidence = 0.9 # High confidence in no change
 
@@ -419,14 +509,14 @@ class ConcreteWorldModel(BaseWorldModel):
             if damage_level > 0.8:
                 current_confidence = 0.3 # Low confidence (unstable)
                 current_rule_applied = "static_entity_unstable"
-                self._log_message(f"[{entity_id}] Static entity has high damage ({damage_level}), reducing confidence.")
+                self._log_message("[%s] Static entity has high damage (%s), reducing confidence.", entity_id, damage_level, level=logging.DEBUG)
             # No changes to predicted_entity_dict['state'] needed for position/location_id
 
         else: # Not static, proceed to other rules
-            self._log_message(f"[{entity_id}] Rule 3 does not apply (Type: {predicted_entity_dict.get('type')}, is_static: {predicted_entity_dict.get('properties', {}).get('is_static')}).")
+            self._log_message("[%s] Rule 3 does not apply (Type: %s, is_static: %s).", entity_id, predicted_entity_dict.get('type'), predicted_entity_dict.get('properties', {}).get('is_static'), level=logging.DEBUG)
 
             # Rule 1: Mobile entity with a goal
-            self._log_message(f"[{entity_id}] Evaluating Rule 1 (Mobile Entity with Goal)...")
+            self._log_message("[%s] Evaluating Rule 1 (Mobile Entity with Goal)...", entity_id, level=logging.DEBUG)
             entity_state = predicted_entity_dict.get("state", {})
             current_action = entity_state.get("current_action")
             movement_speed = entity_state.get("movement_speed") # e.g., units per second
@@ -434,18 +524,18 @@ class ConcreteWorldModel(BaseWorldModel):
             current_position = entity_state.get("position") # Assume [x,y,z]
 
             if current_action == "moving_to_goal" and movement_speed is not None and goal_location_id and isinstance(current_position, list) and len(current_position) == 3:
-                self._log_message(f"[{entity_id}] Rule 1 conditions met: action='moving_to_goal', speed={movement_speed}, goal='{goal_location_id}', pos={current_position}.")
+                self._log_message("[%s] Rule 1 conditions met: action='moving_to_goal', speed=%s, goal='%s', pos=%s.", entity_id, movement_speed, goal_location_id, current_position, level=logging.DEBUG)
 
                 goal_pos: Optional[List[float]] = None
                 goal_entity = self._entity_repository.get(goal_location_id)
                 if goal_entity and isinstance(goal_entity.state.get("position"), list) and len(goal_entity.state.get("position")) == 3:
                     goal_pos = goal_entity.state.get("position")
-                    self._log_message(f"[{entity_id}] Goal '{goal_location_id}' is an entity, using its position: {goal_pos}.")
+                    self._log_message("[%s] Goal '%s' is an entity, using its position: %s.", entity_id, goal_location_id, goal_pos, level=logging.DEBUG)
                 elif goal_location_id in self._spatial_model and self._spatial_model[goal_location_id].coordinates:
                     goal_pos = list(self._spatial_model[goal_location_id].coordinates) # Ensure it's a list of floats
-                    self._log_message(f"[{entity_id}] Goal '{goal_location_id}' is a spatial location, using its coords: {goal_pos}.")
+                    self._log_message("[%s] Goal '%s' is a spatial location, using its coords: %s.", entity_id, goal_location_id, goal_pos, level=logging.DEBUG)
                 else:
-                    self._log_message(f"[{entity_id}] Goal position for '{goal_location_id}' not found or invalid.")
+                    self._log_message("[%s] Goal position for '%s' not found or invalid.", entity_id, goal_location_id, level=logging.DEBUG)
 
                 if goal_pos:
                     # Check for obstacles in relationships
@@ -456,7 +546,7 @@ class ConcreteWorldModel(BaseWorldModel):
                                 for target_info in targets:
                                     if isinstance(target_info, dict) and target_info.get("target_id") == goal_location_id:
                                         obstacle_id = target_info.get("obstacle_id", "unknown_obstacle")
-                                        self._log_message(f"[{entity_id}] Path to '{goal_location_id}' is blocked by '{obstacle_id}'.")
+                                        self._log_message("[%s] Path to '%s' is blocked by '%s'.", entity_id, goal_location_id, obstacle_id, level=logging.DEBUG)
                                         is_blocked = True
                                         break
                             if is_blocked: break
@@ -466,11 +556,11 @@ class ConcreteWorldModel(BaseWorldModel):
                         # Position might change slightly if already moving, but for simplicity, assume no significant change here.
                         current_confidence = 0.7 # Confident about blockage
                         current_rule_applied = "mobile_entity_goal_blocked"
-                        self._log_message(f"[{entity_id}] Prediction: Blocked. Action set to 'blocked'. Confidence: {current_confidence}.")
+                        self._log_message("[%s] Prediction: Blocked. Action set to 'blocked'. Confidence: %s.", entity_id, current_confidence, level=logging.DEBUG)
                     else:
                         distance_to_goal = self._calculate_distance(current_position, goal_pos)
                         travelable_distance = float(movement_speed) * time_horizon
-                        self._log_message(f"[{entity_id}] Dist to goal: {distance_to_goal:.2f}, Travelable: {travelable_distance:.2f}.")
+                        self._log_message("[%s] Dist to goal: %.2f, Travelable: %.2f.", entity_id, distance_to_goal, travelable_distance, level=logging.DEBUG)
 
                         if travelable_distance >= distance_to_goal:
                             predicted_entity_dict["state"]["position"] = goal_pos
@@ -478,7 +568,7 @@ class ConcreteWorldModel(BaseWorldModel):
                             predicted_entity_dict["state"]["current_action"] = "at_goal" # Or "idle"
                             current_confidence = 0.6 # Medium-high confidence
                             current_rule_applied = "mobile_entity_reaches_goal"
-                            self._log_message(f"[{entity_id}] Prediction: Reaches goal '{goal_location_id}'. Pos: {goal_pos}. Action: 'at_goal'. Confidence: {current_confidence}.")
+                            self._log_message("[%s] Prediction: Reaches goal '%s'. Pos: %s. Action: 'at_goal'. Confidence: %s.", entity_id, goal_location_id, goal_pos, current_confidence, level=logging.DEBUG)
                         else:
                             fraction_moved = travelable_distance / distance_to_goal if distance_to_goal > 0 else 0
                             new_pos = self._linear_interpolate(current_position, goal_pos, fraction_moved)
@@ -486,23 +576,23 @@ class ConcreteWorldModel(BaseWorldModel):
                             # current_action remains "moving_to_goal"
                             current_confidence = 0.4 # Low-medium confidence
                             current_rule_applied = "mobile_entity_moves_towards_goal"
-                            self._log_message(f"[{entity_id}] Prediction: Moves towards goal. New Pos: {new_pos}. Action remains 'moving_to_goal'. Confidence: {current_confidence}.")
+                            self._log_message("[%s] Prediction: Moves towards goal. New Pos: %s. Action remains 'moving_to_goal'. Confidence: %s.", entity_id, new_pos, current_confidence, level=logging.DEBUG)
                 else: # No valid goal_pos
-                    self._log_message(f"[{entity_id}] Rule 1 cannot apply: goal_pos for '{goal_location_id}' not determined.")
+                    self._log_message("[%s] Rule 1 cannot apply: goal_pos for '%s' not determined.", entity_id, goal_location_id, level=logging.DEBUG)
             else: # Rule 1 conditions not met
-                self._log_message(f"[{entity_id}] Rule 1 conditions not met (Action: {current_action}, Speed: {movement_speed}, GoalID: {goal_location_id}, Pos: {current_position}).")
+                self._log_message("[%s] Rule 1 conditions not met (Action: %s, Speed: %s, GoalID: %s, Pos: %s).", entity_id, current_action, movement_speed, goal_location_id, current_position, level=logging.DEBUG)
 
 
             # Rule 2: Basic physics (constant velocity) - apply if Rule 1 didn't apply or had low confidence
             rule1_low_confidence = current_rule_applied.startswith("mobile_entity_moves_towards_goal") # 0.4
             if current_rule_applied == "no_specific_rule_applied_current_state_assumed" or rule1_low_confidence:
-                self._log_message(f"[{entity_id}] Evaluating Rule 2 (Constant Velocity Physics)... Current rule: {current_rule_applied}, Current Conf: {current_confidence}")
+                self._log_message("[%s] Evaluating Rule 2 (Constant Velocity Physics)... Current rule: %s, Current Conf: %s", entity_id, current_rule_applied, current_confidence, level=logging.DEBUG)
                 velocity = entity_state.get("velocity") # [vx,vy,vz]
                 # current_position is already fetched
 
                 if isinstance(velocity, list) and len(velocity) == 3 and \
                    isinstance(current_position, list) and len(current_position) == 3:
-                    self._log_message(f"[{entity_id}] Rule 2 conditions met: velocity={velocity}, position={current_position}.")
+                    self._log_message("[%s] Rule 2 conditions met: velocity=%s, position=%s.", entity_id, velocity, current_position, level=logging.DEBUG)
 
                     new_px = current_position[0] + velocity[0] * time_horizon
                     new_py = current_position[1] + velocity[1] * time_horizon
@@ -516,13 +606,13 @@ class ConcreteWorldModel(BaseWorldModel):
                     if max_speed is not None:
                         speed_magnitude = self._vector_magnitude(velocity)
                         if speed_magnitude > float(max_speed):
-                            self._log_message(f"[{entity_id}] Warning: Entity velocity magnitude {speed_magnitude:.2f} exceeds max_speed {max_speed:.2f}.")
+                            self._log_message("[%s] Warning: Entity velocity magnitude %.2f exceeds max_speed %.2f.", entity_id, speed_magnitude, max_speed, level=logging.WARNING)
                             current_confidence = 0.3 # Lower confidence due to exceeding max_speed
                             current_rule_applied = "physics_exceeds_max_speed"
 
-                    self._log_message(f"[{entity_id}] Prediction: New position by velocity {predicted_entity_dict['state']['position']}. Confidence: {current_confidence}.")
+                    self._log_message("[%s] Prediction: New position by velocity %s. Confidence: %s.", entity_id, predicted_entity_dict['state']['position'], current_confidence, level=logging.DEBUG)
                 else: # Rule 2 conditions not met
-                    self._log_message(f"[{entity_id}] Rule 2 conditions not met (Velocity: {velocity}, Position: {current_position}).")
+                    self._log_message("[%s] Rule 2 conditions not met (Velocity: %s, Position: %s).", entity_id, velocity, current_position, level=logging.DEBUG)
 
         # Final packaging of the result
         return {
@@ -531,6 +621,25 @@ class ConcreteWorldModel(BaseWorldModel):
             "prediction_rule_applied": current_rule_applied
         }
 
+    def predict_future_states(self, entity_ids: List[str], horizons: Union[float, List[float]]) -> Dict[str, Any]:
+        """
+        Batched `predict_future_state`: predicts every entity in `entity_ids` at every
+        horizon in one vectorized (NumPy) pass. Each entity's kinematic state is cached
+        until the entity, or its goal, is updated through the model or `reindex_entity`.
+
+        Returns a dict with "entity_ids" and the arrays of
+        `world_model_kinematics.predict_trajectories` ("positions" (E, H, 3),
+        "prediction_confidence" (E, H), "prediction_rule_applied" (E, H), "at_goal" (E, H)).
+        Unlike `predict_future_state`, no predicted entity dicts are built.
+        """
+        entity_ids = list(entity_ids)
+        cache, repository, spatial_model = self._kinematics_cache, self._entity_repository, self._spatial_model
+        prediction = predict_trajectories([cache.get(entity_id, repository, spatial_model) for entity_id in entity_ids], horizons)
+        prediction["entity_ids"] = entity_ids
+        self._log_message("Predicted %d entities at %d horizons (kinematics cache: %d hits, %d misses).",
+                          len(entity_ids), prediction["horizons"].size, cache.hits, cache.misses, level=logging.DEBUG)
+        return prediction
+
     def get_world_model_status(self) -> Dict[str, Any]: # Renamed from get_status for clarity
         self._log_message("Getting world model status.")
         return {
@@ -540,6 +649,7 @@ class ConcreteWorldModel(BaseWorldModel):
             'entity_count': len(self._entity_repository),
             'spatial_data_count': len(self._spatial_model), # Not currently updated by handlers
             'event_count': len(self._temporal_model_events),
+            'evicted_event_count': self._temporal_model_events.evicted_count,
             'handled_message_counts': dict(self._handled_message_counts),
             'log_entry_count': len(self._log)
         }
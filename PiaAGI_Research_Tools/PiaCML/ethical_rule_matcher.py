@@ -0,0 +1,150 @@
+"""
+Compiled matching of `EthicalRule`s for `ConcreteSelfModelModule.perform_ethical_evaluation`.
+
+The evaluation used to lower-case every rule's principle and applicability contexts
+for every proposal, and substring-search the action description, intent and
+`str(context)` once per rule and context. With hundreds of rules that made ethical
+review one of the slowest steps between planning and acting.
+
+`CompiledEthicalRules` lower-cases the rulebase once and builds an Aho-Corasick
+automaton (`KeywordAutomaton`) over all principles and contexts. A proposal's texts
+are each scanned once, giving every keyword they contain, overlapping ones
+included. `EthicalFramework.version` tells when the rules were replaced, so the
+module rebuilds the matcher only then.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of keywords. `find(text)` returns the ids
+    of all keywords occurring in `text` in one pass over it. The empty keyword occurs
+    in every text, as with `"" in text`.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(keywords))
+        self.ids: Dict[str, int] = {keyword: i for i, keyword in enumerate(self.keywords)}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        self._always: Tuple[int, ...] = tuple(i for i, keyword in enumerate(self.keywords) if not keyword)
+        for i, keyword in enumerate(self.keywords):
+            if keyword:
+                self._add(keyword, i)
+        self._link()
+
+    def _add(self, keyword: str, keyword_id: int) -> None:
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            node = next_node
+        self._outputs[node] += (keyword_id,)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] += self._outputs[self._fail[child]]
+
+    def find(self, text: str) -> Set[int]:
+        found: Set[int] = set(self._always)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        return found
+
+
+class CompiledEthicalRules:
+    """
+    A rulebase prepared for matching. `match()` gives, in rulebase order, each rule
+    whose principle occurs in the action description or intent and which is either
+    global (no applicability contexts) or has a context that is one of the context
+    keywords or occurs in the context string; exactly the rules the original
+    per-rule loop considered.
+    """
+
+    def __init__(self, rules: List[Any], version: int = 0):
+        self.source_rules = rules # The list compiled, so callers can tell when it is replaced
+        self.rules = list(rules)
+        self.version = version
+        self._principles = [rule.principle.lower() for rule in self.rules]
+        self._contexts = [[(context, context.lower()) for context in rule.applicability_contexts] for rule in self.rules]
+        self.automaton = KeywordAutomaton(self._principles + [lowered for contexts in self._contexts for _, lowered in contexts])
+        ids = self.automaton.ids
+        self._rules_by_principle: Dict[int, List[int]] = {}
+        for index, principle in enumerate(self._principles):
+            self._rules_by_principle.setdefault(ids[principle], []).append(index)
+
+    def match(self,
+              action_description: str,
+              action_intent: str,
+              context_keywords: Iterable[Any],
+              context_string: str) -> List[Tuple[Any, List[str]]]:
+        """
+        Args are already lower-cased, as `perform_ethical_evaluation` prepares them.
+        Returns (rule, match_log_details) pairs, in rulebase order.
+        """
+        in_description = self.automaton.find(action_description)
+        in_intent = self.automaton.find(action_intent)
+        candidates = sorted({index for keyword_id in in_description | in_intent
+                             for index in self._rules_by_principle.get(keyword_id, ())})
+        if not candidates:
+            return []
+        in_context: Optional[Set[int]] = None # Context string is scanned only if a candidate needs it
+        keywords = context_keywords if isinstance(context_keywords, (set, frozenset)) else _as_set(context_keywords)
+        ids = self.automaton.ids
+        matches: List[Tuple[Any, List[str]]] = []
+        for index in candidates:
+            rule, principle_id = self.rules[index], ids[self._principles[index]]
+            details: List[str] = []
+            if principle_id in in_description:
+                details.append(f"Principle '{rule.principle}' in action description.")
+            if principle_id in in_intent:
+                details.append(f"Principle '{rule.principle}' in action intent/reason.")
+            contexts = self._contexts[index]
+            if contexts:
+                matched_context = None
+                for context, lowered in contexts:
+                    if lowered in keywords:
+                        matched_context = context
+                        break
+                    if in_context is None:
+                        in_context = self.automaton.find(context_string)
+                    if ids[lowered] in in_context:
+                        matched_context = context
+                        break
+                if matched_context is None:
+                    continue
+                details.append(f"Applicability context '{matched_context}' matched active context.")
+            matches.append((rule, details))
+        return matches
+
+
+def _as_set(items: Iterable[Any]) -> Any:
+    if isinstance(items, str): # `in` on a string is a substring test; keep it
+        return items
+    try:
+        return set(items)
+    except TypeError: # Unhashable entries: fall back to list membership, as the original check did
+        return list(items)
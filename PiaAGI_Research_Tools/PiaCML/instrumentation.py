@@ -0,0 +1,399 @@
+"""
+Latency and throughput instrumentation for PiaCML cognitive cycles.
+
+Modules keep their own ad-hoc counters (`_processed_message_counts`,
+`_handled_message_counts`, ...), none of which say where the time of a cognitive
+cycle goes. Since every module is driven through the `MessageBus`, the bus is the
+one place that can time them all uniformly. `BusInstrumentation`, once attached
+with `MessageBus.enable_instrumentation()`, records:
+
+- a latency histogram per (subscriber module, message type) of callback durations,
+  with error counts;
+- per message type: published, delivered, filtered and dropped counts (no
+  subscribers, suspended subscriber, no event loop for asynchronous dispatch);
+- queue depth: asynchronous deliveries dispatched but not yet finished, and the
+  nesting depth of publishes made from within callbacks;
+- tick durations, with an optional cProfile or sampling profiler, via
+  `profile_tick()` around one cognitive cycle.
+
+`snapshot()`/`to_json()` export everything as a dict/JSON, `to_prometheus()` in the
+Prometheus text exposition format, and `to_log_events()`/`write_log_events()` as
+PiaAVT log entries.
+"""
+
+import bisect
+import cProfile
+import json
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple, DefaultDict, Iterator, Sequence
+
+# Upper bounds (seconds) of the latency buckets, from 10 microseconds to 10 seconds
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+PROFILER_MODES = ("cprofile", "sampling")
+DROP_NO_SUBSCRIBERS = "no_subscribers"
+DROP_SUSPENDED = "suspended"
+DROP_NO_EVENT_LOOP = "no_event_loop"
+
+PIAAVT_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ" # PiaAVT's DEFAULT_TIMESTAMP_FORMAT
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram of durations in seconds (cumulative buckets as in Prometheus).
+
+    Args:
+        buckets (Sequence[float]): Increasing bucket upper bounds; an implicit +Inf bucket follows.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # Per bucket (not cumulative); last is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates the q-quantile (0 <= q <= 1) by linear interpolation within its bucket,
+        clamped to the observed min/max. Returns None if nothing was observed.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = min(lower + (upper - lower) * (rank - cumulative) / bucket_count, upper)
+                return min(max(estimate, self.min), self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        """(le label, cumulative count) pairs including "+Inf"."""
+        result, running = [], 0
+        for bound, bucket_count in zip(list(self.buckets) + [None], self.counts):
+            running += bucket_count
+            result.append(("+Inf" if bound is None else repr(bound), running))
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        def ms(value):
+            return round(value * 1000.0, 6) if value is not None else None
+        return {"count": self.count, "sum_ms": ms(self.sum), "mean_ms": ms(self.sum / self.count) if self.count else None,
+                "min_ms": ms(self.min), "p50_ms": ms(self.quantile(0.5)), "p95_ms": ms(self.quantile(0.95)),
+                "p99_ms": ms(self.quantile(0.99)), "max_ms": ms(self.max)}
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a background thread samples the stack of the profiled thread
+    every `interval` seconds and counts the functions found on it. Much cheaper than
+    cProfile for long ticks, at the price of resolution.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples = 0
+        self.self_counts: Counter = Counter() # Innermost frame of each sample
+        self.total_counts: Counter = Counter() # Every function on the sampled stack
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target_thread_id: Optional[int] = None
+
+    def start(self) -> None:
+        self._target_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="PiaCML-SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.self_counts[self._label(frame)] += 1
+            seen = set()
+            while frame is not None:
+                label = self._label(frame)
+                if label not in seen: # Count recursive functions once per sample
+                    seen.add(label)
+                    self.total_counts[label] += 1
+                frame = frame.f_back
+
+    @staticmethod
+    def _label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+
+    def report(self, top_n: int = 20) -> List[Dict[str, Any]]:
+        return [{"function": label, "self_samples": self.self_counts.get(label, 0), "total_samples": count,
+                 "total_fraction": round(count / self.samples, 4) if self.samples else 0.0}
+                for label, count in self.total_counts.most_common(top_n)]
+
+
+class BusInstrumentation:
+    """
+    Metrics recorded by a `MessageBus` (see the module docstring).
+
+    Args:
+        buckets (Sequence[float]): Latency histogram bucket bounds in seconds.
+        profiler (Optional[str]): "cprofile", "sampling" or None; the profiler run by
+            `profile_tick()`. Results accumulate across ticks until `reset()`.
+        sampling_interval (float): Sample period of the "sampling" profiler, in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+                 profiler: Optional[str] = None, sampling_interval: float = 0.001):
+        if profiler is not None and profiler not in PROFILER_MODES:
+            raise ValueError(f"Unknown profiler '{profiler}'. Use one of {PROFILER_MODES} or None.")
+        self.buckets = tuple(buckets)
+        self.profiler = profiler
+        self.sampling_interval = sampling_interval
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discards all recorded metrics and profiles."""
+        with self._lock:
+            self.started_at = time.time()
+            self.handler_latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+            self.handler_errors: DefaultDict[Tuple[str, str], int] = defaultdict(int)
+            self.published: DefaultDict[str, int] = defaultdict(int)
+            self.delivered: DefaultDict[str, int] = defaultdict(int)
+            self.filtered: DefaultDict[str, int] = defaultdict(int)
+            self.dropped: DefaultDict[Tuple[str, str], int] = defaultdict(int) # (message_type, reason)
+            self.async_in_flight = 0
+            self.max_async_in_flight = 0
+            self.publish_depth = 0
+            self.max_publish_depth = 0
+            self.tick_latency = LatencyHistogram(self.buckets)
+            self.tick_count_by_label: Counter = Counter()
+            self._cprofile_stats: Optional[pstats.Stats] = None
+            self._sampler: Optional[SamplingProfiler] = None
+
+    # --- Recording (called by MessageBus) ---
+
+    def publish_started(self, message_type: str) -> None:
+        with self._lock:
+            self.published[message_type] += 1
+            self.publish_depth += 1
+            self.max_publish_depth = max(self.max_publish_depth, self.publish_depth)
+
+    def publish_finished(self) -> None:
+        with self._lock:
+            self.publish_depth -= 1
+
+    def record_handler(self, module_id: str, message_type: str, seconds: float, error: bool = False) -> None:
+        key = (module_id, message_type)
+        with self._lock:
+            histogram = self.handler_latency.get(key)
+            if histogram is None:
+                histogram = self.handler_latency[key] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds)
+            self.delivered[message_type] += 1
+            if error:
+                self.handler_errors[key] += 1
+
+    def record_filtered(self, message_type: str) -> None:
+        with self._lock:
+            self.filtered[message_type] += 1
+
+    def record_drop(self, message_type: str, reason: str) -> None:
+        with self._lock:
+            self.dropped[(message_type, reason)] += 1
+
+    def async_dispatched(self) -> None:
+        with self._lock:
+            self.async_in_flight += 1
+            self.max_async_in_flight = max(self.max_async_in_flight, self.async_in_flight)
+
+    def async_finished(self) -> None:
+        with self._lock:
+            self.async_in_flight -= 1
+
+    @contextmanager
+    def profile_tick(self, label: str = "tick") -> Iterator[None]:
+        """
+        Times one cognitive cycle (and profiles it if a profiler is configured):
+
+            with bus.instrumentation.profile_tick():
+                run_cognitive_cycle()
+        """
+        profile = None
+        if self.profiler == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+        elif self.profiler == "sampling":
+            if self._sampler is None:
+                self._sampler = SamplingProfiler(self.sampling_interval)
+            self._sampler.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                with self._lock:
+                    if self._cprofile_stats is None:
+                        self._cprofile_stats = pstats.Stats(profile)
+                    else:
+                        self._cprofile_stats.add(profile)
+            elif self.profiler == "sampling":
+                self._sampler.stop()
+            with self._lock:
+                self.tick_latency.observe(elapsed)
+                self.tick_count_by_label[label] += 1
+
+    # --- Export ---
+
+    def profile_report(self, top_n: int = 20) -> List[Dict[str, Any]]:
+        """Top functions of the accumulated profile, by cumulative time (cprofile) or samples (sampling)."""
+        if self.profiler == "sampling":
+            return self._sampler.report(top_n) if self._sampler else []
+        if self._cprofile_stats is None:
+            return []
+        rows = []
+        for (filename, line, function), (_, calls, total, cumulative, _) in self._cprofile_stats.stats.items():
+            rows.append({"function": f"{filename}:{line}({function})", "calls": calls,
+                         "total_ms": round(total * 1000.0, 6), "cumulative_ms": round(cumulative * 1000.0, 6)})
+        rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+        return rows[:top_n]
+
+    def snapshot(self, profile_top_n: int = 20) -> Dict[str, Any]:
+        """Returns all metrics as a JSON-serializable dict."""
+        with self._lock:
+            handlers = [dict(module_id=module_id, message_type=message_type,
+                             errors=self.handler_errors.get((module_id, message_type), 0), **histogram.summary())
+                        for (module_id, message_type), histogram in sorted(self.handler_latency.items())]
+            message_types = sorted(set(self.published) | set(self.delivered) | {t for t, _ in self.dropped})
+            messages = {message_type: {"published": self.published.get(message_type, 0),
+                                       "delivered": self.delivered.get(message_type, 0),
+                                       "filtered": self.filtered.get(message_type, 0),
+                                       "dropped": {reason: count for (t, reason), count in sorted(self.dropped.items())
+                                                   if t == message_type}}
+                        for message_type in message_types}
+            snapshot = {
+                "started_at": self.started_at,
+                "uptime_seconds": round(time.time() - self.started_at, 6),
+                "handlers": handlers,
+                "messages": messages,
+                "queue": {"async_in_flight": self.async_in_flight, "max_async_in_flight": self.max_async_in_flight,
+                          "publish_depth": self.publish_depth, "max_publish_depth": self.max_publish_depth},
+                "ticks": dict(self.tick_latency.summary(), by_label=dict(self.tick_count_by_label)),
+            }
+        if self.profiler:
+            snapshot["profile"] = {"mode": self.profiler, "top_functions": self.profile_report(profile_top_n)}
+        return snapshot
+
+    def to_json(self, **kwargs) -> str:
+        """`snapshot()` as a JSON string; keyword arguments are passed to `json.dumps`."""
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "piacml") -> str:
+        """Renders the metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+
+        def header(name: str, metric_type: str, help_text: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+
+        def histogram_lines(name: str, labels: str, histogram: LatencyHistogram) -> None:
+            separator = "," if labels else ""
+            for le, cumulative in histogram.cumulative_counts():
+                lines.append(f'{prefix}_{name}_bucket{{{labels}{separator}le="{le}"}} {cumulative}')
+            lines.append(f"{prefix}_{name}_sum{{{labels}}} {histogram.sum!r}")
+            lines.append(f"{prefix}_{name}_count{{{labels}}} {histogram.count}")
+
+        with self._lock:
+            header("handler_duration_seconds", "histogram", "Duration of MessageBus subscriber callbacks.")
+            for (module_id, message_type), histogram in sorted(self.handler_latency.items()):
+                histogram_lines("handler_duration_seconds",
+                                f'module="{_escape_label(module_id)}",message_type="{_escape_label(message_type)}"', histogram)
+            header("handler_errors_total", "counter", "Subscriber callbacks that raised an exception.")
+            for (module_id, message_type), count in sorted(self.handler_errors.items()):
+                lines.append(f'{prefix}_handler_errors_total{{module="{_escape_label(module_id)}",'
+                             f'message_type="{_escape_label(message_type)}"}} {count}')
+            for name, values, help_text in (("messages_published_total", self.published, "Messages published."),
+                                            ("messages_delivered_total", self.delivered, "Deliveries to subscriber callbacks."),
+                                            ("messages_filtered_total", self.filtered, "Deliveries skipped by subscription filters.")):
+                header(name, "counter", help_text)
+                for message_type, count in sorted(values.items()):
+                    lines.append(f'{prefix}_{name}{{message_type="{_escape_label(message_type)}"}} {count}')
+            header("messages_dropped_total", "counter", "Messages or deliveries dropped, by reason.")
+            for (message_type, reason), count in sorted(self.dropped.items()):
+                lines.append(f'{prefix}_messages_dropped_total{{message_type="{_escape_label(message_type)}",'
+                             f'reason="{reason}"}} {count}')
+            for name, value, help_text in (("async_in_flight", self.async_in_flight, "Asynchronous deliveries not yet finished."),
+                                           ("async_in_flight_max", self.max_async_in_flight, "Maximum of async_in_flight."),
+                                           ("publish_depth_max", self.max_publish_depth, "Maximum nesting of publishes from callbacks.")):
+                header(name, "gauge", help_text)
+                lines.append(f"{prefix}_{name} {value}")
+            header("tick_duration_seconds", "histogram", "Duration of profiled cognitive cycles.")
+            histogram_lines("tick_duration_seconds", "", self.tick_latency)
+        return "\n".join(lines) + "\n"
+
+    def to_log_events(self,
+                      simulation_run_id: str = "unknown_run",
+                      experiment_id: str = "unknown_experiment",
+                      agent_id: str = "unknown_agent",
+                      timestamp: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Converts the current metrics into PiaAVT log entries (see PiaAVT's Logging_Specification):
+        one CML_HANDLER_LATENCY_SUMMARY per (module, message type), one CML_BUS_METRICS
+        summary and, if a profiler is configured, one CML_TICK_PROFILE.
+        """
+        timestamp_str = (timestamp or datetime.now(timezone.utc)).strftime(PIAAVT_TIMESTAMP_FORMAT)
+        snapshot = self.snapshot()
+
+        def entry(event_type: str, event_data: Dict[str, Any], log_level: str = "INFO") -> Dict[str, Any]:
+            return {"timestamp": timestamp_str, "simulation_run_id": simulation_run_id, "experiment_id": experiment_id,
+                    "agent_id": agent_id, "source_component_id": "PiaCML.MessageBus", "log_level": log_level,
+                    "event_type": event_type, "event_data": event_data}
+
+        events = [entry("CML_HANDLER_LATENCY_SUMMARY", handler) for handler in snapshot["handlers"]]
+        events.append(entry("CML_BUS_METRICS", {"messages": snapshot["messages"], "queue": snapshot["queue"],
+                                                "ticks": snapshot["ticks"], "uptime_seconds": snapshot["uptime_seconds"]}))
+        if "profile" in snapshot:
+            events.append(entry("CML_TICK_PROFILE", snapshot["profile"], log_level="DEBUG"))
+        return events
+
+    def write_log_events(self, file_path: str, **log_ids: Any) -> int:
+        """Appends `to_log_events(**log_ids)` to a JSONL file PiaAVT can load; returns the number written."""
+        events = self.to_log_events(**log_ids)
+        with open(file_path, 'a', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+        return len(events)
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
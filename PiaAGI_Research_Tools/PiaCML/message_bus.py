@@ -2,15 +2,18 @@ from typing import Dict, Callable, List, Any, DefaultDict, Optional
 from collections import defaultdict
 import traceback # Added
 import asyncio
+import time
 from datetime import datetime
 
 # Attempt relative import, common for package structures
 try:
     from .core_messages import GenericMessage
+    from .instrumentation import BusInstrumentation, DROP_NO_SUBSCRIBERS, DROP_SUSPENDED, DROP_NO_EVENT_LOOP
 except ImportError:
     # Fallback for scenarios where the script might be run directly
     # or the environment setup makes relative imports tricky without full package install
     from core_messages import GenericMessage
+    from instrumentation import BusInstrumentation, DROP_NO_SUBSCRIBERS, DROP_SUSPENDED, DROP_NO_EVENT_LOOP
 
 MAX_CALLBACK_ERRORS = 3
 
@@ -20,15 +23,20 @@ class MessageBus:
     Modules can subscribe to specific message types and publish messages to the bus.
     Enhanced with filtering, asynchronous dispatch, and improved error handling.
     """
-    def __init__(self):
+    def __init__(self, instrumentation: Optional[BusInstrumentation] = None):
         """
         Initializes the MessageBus.
         _subscribers stores: message_type -> list of (module_id, callback, filter_func, metadata_filter)
+
+        Args:
+            instrumentation: Optional metrics recorder (see `enable_instrumentation`). Without one,
+                publishing carries no measurement overhead.
         """
         # Stores subscribers: message_type -> list of (module_id, callback, filter_func, metadata_filter)
         self._subscribers: DefaultDict[str, List[tuple[str, Callable[[GenericMessage], Any], Optional[Callable[[GenericMessage], bool]], Optional[Dict[str, Any]]]]] = defaultdict(list)
         self._error_counts: DefaultDict[str, int] = defaultdict(int)
         self._suspended_subscribers: Dict[str, datetime] = {}
+        self._instrumentation: Optional[BusInstrumentation] = instrumentation
         # print("MessageBus (Enhanced) initialized.") # Optional
 
     def subscribe(self,
@@ -57,11 +65,43 @@ class MessageBus:
         self._subscribers[message_type].append((module_id, callback, filter_func, metadata_filter))
         # print(f"Module '{module_id}' successfully subscribed to '{message_type}'.") # Optional
 
-    async def _execute_callback(self, callback: Callable[[GenericMessage], Any], message: GenericMessage):
+    @property
+    def instrumentation(self) -> Optional[BusInstrumentation]:
+        """The attached metrics recorder, or None if instrumentation is disabled."""
+        return self._instrumentation
+
+    def enable_instrumentation(self, instrumentation: Optional[BusInstrumentation] = None, **kwargs) -> BusInstrumentation:
+        """
+        Starts recording handler latencies, message counters and queue depth.
+
+        Args:
+            instrumentation: Recorder to use; if None, the current one is kept or a new
+                `BusInstrumentation(**kwargs)` is created.
+
+        Returns:
+            The active BusInstrumentation (use it for snapshots, exports and `profile_tick`).
+        """
+        if instrumentation is not None:
+            self._instrumentation = instrumentation
+        elif self._instrumentation is None:
+            self._instrumentation = BusInstrumentation(**kwargs)
+        return self._instrumentation
+
+    def disable_instrumentation(self) -> Optional[BusInstrumentation]:
+        """Stops recording; returns the detached recorder (with its metrics) if there was one."""
+        instrumentation, self._instrumentation = self._instrumentation, None
+        return instrumentation
+
+    async def _execute_callback(self, callback: Callable[[GenericMessage], Any], message: GenericMessage,
+                                module_id: Optional[str] = None,
+                                instrumentation: Optional[BusInstrumentation] = None):
         """
         Executes a callback, awaiting it if it's an coroutine.
-        Handles errors during execution.
+        Handles errors during execution. With `instrumentation`, the delivery is timed and
+        leaves the asynchronous in-flight count when it finishes.
         """
+        start = time.perf_counter()
+        failed = False
         try:
             if asyncio.iscoroutinefunction(callback):
                 await callback(message)
@@ -70,7 +110,12 @@ class MessageBus:
         except Exception as e:
             # This error will be caught by the caller (publish method)
             # and handled there for suspension logic.
+            failed = True
             raise e
+        finally:
+            if instrumentation is not None:
+                instrumentation.record_handler(module_id, message.message_type, time.perf_counter() - start, error=failed)
+                instrumentation.async_finished()
 
     def publish(self, message: GenericMessage, dispatch_mode: str = "synchronous"):
         """Publishes a message to all relevant subscribed modules.
@@ -80,34 +125,70 @@ class MessageBus:
         # print(f"Publishing message type '{message_type}' from '{message.source_module_id}' (mode: {dispatch_mode})") # Optional
 
         subscribers_to_notify = list(self._subscribers.get(message_type, []))
+        instrumentation = self._instrumentation
 
         if not subscribers_to_notify:
             # print(f"No subscribers for message type '{message_type}'.") # Optional
+            if instrumentation is not None:
+                instrumentation.publish_started(message_type)
+                instrumentation.record_drop(message_type, DROP_NO_SUBSCRIBERS)
+                instrumentation.publish_finished()
             return
 
+        if instrumentation is not None:
+            instrumentation.publish_started(message_type)
+        try:
+            self._notify_subscribers(message, subscribers_to_notify, dispatch_mode, instrumentation)
+        finally:
+            if instrumentation is not None:
+                instrumentation.publish_finished()
+
+    def _notify_subscribers(self, message: GenericMessage, subscribers_to_notify: List[tuple],
+                            dispatch_mode: str, instrumentation: Optional[BusInstrumentation]):
+        """Delivers `message` to each subscriber whose filters match (the body of `publish`)."""
+        message_type = message.message_type
         for module_id, callback, filter_func, metadata_filter in subscribers_to_notify:
             if module_id in self._suspended_subscribers:
                 # print(f"Skipping suspended module '{module_id}' for message '{message.message_id}'.") # Optional
+                if instrumentation is not None:
+                    instrumentation.record_drop(message_type, DROP_SUSPENDED)
                 continue
 
             try:
                 if filter_func and not filter_func(message):
                     # print(f"  Filter skipped notification for module '{module_id}' on message '{message.message_id}'") # Optional
+                    if instrumentation is not None:
+                        instrumentation.record_filtered(message_type)
                     continue
 
                 if metadata_filter:
                     if not message.metadata: # If message has no metadata, it cannot satisfy the filter
                         # print(f"  Metadata filter skipped for '{module_id}' (no metadata in message) on message '{message.message_id}'") # Optional
+                        if instrumentation is not None:
+                            instrumentation.record_filtered(message_type)
                         continue
                     match = all(item in message.metadata.items() for item in metadata_filter.items())
                     if not match:
                         # print(f"  Metadata filter skipped for '{module_id}' (metadata mismatch) on message '{message.message_id}'") # Optional
+                        if instrumentation is not None:
+                            instrumentation.record_filtered(message_type)
                         continue
 
                 # print(f"  Notifying module '{module_id}' for message type '{message_type}'") # Optional
                 if dispatch_mode == "asynchronous":
                     # print(f"  Dispatching asynchronously to '{module_id}' for message '{message.message_id}'.") # Optional
-                    asyncio.create_task(self._execute_callback(callback, message))
+                    if instrumentation is None:
+                        asyncio.create_task(self._execute_callback(callback, message))
+                    else:
+                        instrumentation.async_dispatched()
+                        coroutine = self._execute_callback(callback, message, module_id, instrumentation)
+                        try:
+                            asyncio.create_task(coroutine)
+                        except RuntimeError: # No running event loop; the delivery never starts
+                            coroutine.close()
+                            instrumentation.async_finished()
+                            instrumentation.record_drop(message_type, DROP_NO_EVENT_LOOP)
+                            raise
                 else: # Synchronous dispatch
                     if asyncio.iscoroutinefunction(callback):
                         print(f"WARNING: Coroutine callback {callback.__name__} for module '{module_id}' called in synchronous mode. This will block or not execute as intended. Consider using dispatch_mode='asynchronous'.")
@@ -115,9 +196,16 @@ class MessageBus:
                         # not run it as awaited. This is a simplification to fix syntax errors.
                         # Proper handling of async callbacks in sync mode is complex and might require
                         # running an event loop or using threading if true synchronous execution is needed.
-                        callback(message)
-                    else: # This is for regular synchronous callbacks
+                    if instrumentation is None:
                         callback(message) # Regular synchronous call
+                    else:
+                        start = time.perf_counter()
+                        try:
+                            callback(message)
+                        except Exception:
+                            instrumentation.record_handler(module_id, message_type, time.perf_counter() - start, error=True)
+                            raise
+                        instrumentation.record_handler(module_id, message_type, time.perf_counter() - start)
             except Exception as e:
                 err_type = type(e).__name__
                 tb_str = traceback.format_exc()
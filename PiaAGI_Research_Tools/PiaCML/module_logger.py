@@ -0,0 +1,347 @@
+"""
+Bounded, leveled logs for PiaCML modules.
+
+Concrete modules used to keep their own `_log_message`, each building an f-string
+with a timestamp and appending it to an unbounded `self._log` list. Over a long run
+that list was the largest memory consumer of an agent, and formatting debug lines that
+nobody ever read was a significant share of CPU time.
+
+`ModuleLog` replaces that list:
+
+- a fixed-capacity ring buffer (`collections.deque`), so the oldest records are
+  dropped (or spilled to a sink) once `capacity` is reached;
+- per-module levels (standard `logging` levels), set by module class name or module id
+  with `set_module_log_level()`; records below the level are never formatted or stored,
+  so callers should pass `self._log_message("Goal '%s' -> %.3f", goal_id, priority)`
+  rather than f-strings on hot paths;
+- records that pass the level are `%`-formatted when they are logged, so mutable
+  arguments appear as they were at that point, and stored as `(created, level, message)`.
+  The timestamp and `[module_id]:` prefix are added when the log is read, in the
+  module's old style (`timestamp_format`: "iso", "epoch" or "utc");
+- an optional `JsonlLogSink` that writes spilled records as PiaAVT log entries
+  (`CML_MODULE_LOG`), so nothing is lost when the buffer wraps.
+
+Modules get `self._log` and `self._log_message(msg, *args, level=logging.INFO)` by
+inheriting from `ModuleLoggingMixin`. The log still reads like the old list of
+strings (`len`, indexing, slicing, iteration, `clear()`), and assigning a list to
+`self._log` resets the buffer to those entries.
+"""
+
+import json
+import logging
+import time
+import weakref
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    from .instrumentation import PIAAVT_TIMESTAMP_FORMAT
+except ImportError:
+    from instrumentation import PIAAVT_TIMESTAMP_FORMAT # type: ignore
+
+DEFAULT_LOG_CAPACITY = 2048
+MODULE_LOG_EVENT_TYPE = "CML_MODULE_LOG"
+
+LogRecord = Tuple[float, int, str] # (created, level, message)
+
+# Timestamp styles of the `_log_message` helpers the modules used to define
+TIMESTAMP_FORMATTERS: Dict[str, Callable[[float], str]] = {
+    "iso": lambda created: datetime.fromtimestamp(created, timezone.utc).isoformat(),
+    "epoch": lambda created: f"{created:.2f}",
+    "utc": lambda created: time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(created)),
+}
+
+# Defaults for logs created after configure_module_logging(); DEBUG keeps every record, as the old lists did
+_defaults: Dict[str, Any] = {"capacity": DEFAULT_LOG_CAPACITY, "level": logging.DEBUG, "sink": None}
+_module_levels: Dict[str, int] = {}
+_levels_version = 0 # Bumped on every level change so logs can cache their effective level
+_live_logs: "weakref.WeakSet[ModuleLog]" = weakref.WeakSet()
+
+
+def _to_level(level: Union[int, str]) -> int:
+    if isinstance(level, str):
+        value = logging.getLevelName(level.upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unknown log level '{level}'.")
+        return value
+    return int(level)
+
+
+def configure_module_logging(capacity: Optional[int] = None,
+                             level: Optional[Union[int, str]] = None,
+                             sink: Optional["JsonlLogSink"] = None) -> None:
+    """
+    Sets the defaults for module logs. `capacity` and `sink` apply to logs created
+    afterwards; `level` applies immediately to every module without its own level.
+    """
+    global _levels_version
+    if capacity is not None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        _defaults["capacity"] = capacity
+    if level is not None:
+        _defaults["level"] = _to_level(level)
+        _levels_version += 1
+    if sink is not None:
+        _defaults["sink"] = sink
+
+
+def set_module_log_level(module: str, level: Optional[Union[int, str]]) -> None:
+    """
+    Sets the level for a module class name (e.g. "ConcreteWorldModel") or a module id;
+    a module id takes precedence over its class name. `level=None` removes the setting.
+    """
+    global _levels_version
+    if level is None:
+        _module_levels.pop(module, None)
+    else:
+        _module_levels[module] = _to_level(level)
+    _levels_version += 1
+
+
+def get_module_log_level(module_id: str, name: Optional[str] = None) -> int:
+    """Effective level for a module id (and optionally its class name)."""
+    if module_id in _module_levels:
+        return _module_levels[module_id]
+    if name is not None and name in _module_levels:
+        return _module_levels[name]
+    return _defaults["level"]
+
+
+def flush_module_logs() -> int:
+    """Spills every live module log to its sink and flushes the sinks; returns the number of records written."""
+    written, sinks = 0, set()
+    for log in list(_live_logs):
+        if log.sink is not None:
+            written += log.flush()
+            sinks.add(log.sink)
+    for sink in sinks:
+        sink.flush()
+    return written
+
+
+class JsonlLogSink:
+    """
+    Appends module log records to a JSONL file as PiaAVT log entries
+    (event_type `CML_MODULE_LOG`, source_component_id = the module id). Lines are
+    buffered and written every `buffer_size` records, on `flush()` and on `close()`.
+    One sink can be shared by all modules of an agent.
+    """
+
+    def __init__(self,
+                 file_path: str,
+                 simulation_run_id: str = "unknown_run",
+                 experiment_id: str = "unknown_experiment",
+                 agent_id: str = "unknown_agent",
+                 buffer_size: int = 256):
+        self.file_path = file_path
+        self.simulation_run_id = simulation_run_id
+        self.experiment_id = experiment_id
+        self.agent_id = agent_id
+        self.buffer_size = max(1, buffer_size)
+        self.records_written = 0
+        self._pending: List[str] = []
+
+    def write(self, module_id: str, records: Iterable[LogRecord]) -> None:
+        for created, level, message in records:
+            self._pending.append(json.dumps({
+                "timestamp": datetime.fromtimestamp(created, timezone.utc).strftime(PIAAVT_TIMESTAMP_FORMAT),
+                "simulation_run_id": self.simulation_run_id,
+                "experiment_id": self.experiment_id,
+                "agent_id": self.agent_id,
+                "source_component_id": module_id,
+                "log_level": logging.getLevelName(level),
+                "event_type": MODULE_LOG_EVENT_TYPE,
+                "event_data": {"message": message},
+            }))
+        if len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        with open(self.file_path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(self._pending) + "\n")
+        self.records_written += len(self._pending)
+        self._pending = []
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "JsonlLogSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def format_message(msg: str, args: Tuple[Any, ...]) -> str:
+    if not args:
+        return str(msg)
+    try:
+        return str(msg) % args
+    except (TypeError, ValueError):
+        return f"{msg} {args!r}" # Mismatched format arguments must not break reading the log
+
+
+class ModuleLog:
+    """
+    Fixed-capacity ring buffer of a module's log records.
+
+    Args:
+        module_id (str): Id shown in formatted lines and used as source_component_id in the sink.
+        name (Optional[str]): Module class name, used for per-module levels.
+        capacity (Optional[int]): Maximum records kept in memory; defaults to `configure_module_logging()`'s.
+        level (Optional[Union[int, str]]): Fixed level for this log, overriding `set_module_log_level()`.
+        sink (Optional[JsonlLogSink]): Receives records as they are evicted and on `flush()`.
+        timestamp_format (str): Timestamp style of formatted lines, a key of `TIMESTAMP_FORMATTERS`.
+    """
+
+    def __init__(self,
+                 module_id: str,
+                 name: Optional[str] = None,
+                 capacity: Optional[int] = None,
+                 level: Optional[Union[int, str]] = None,
+                 sink: Optional[JsonlLogSink] = None,
+                 timestamp_format: str = "iso"):
+        if timestamp_format not in TIMESTAMP_FORMATTERS:
+            raise ValueError(f"Unknown timestamp format '{timestamp_format}'.")
+        self.module_id = module_id
+        self.name = name
+        self.capacity = capacity or _defaults["capacity"]
+        self.sink = sink if sink is not None else _defaults["sink"]
+        self._format_timestamp = TIMESTAMP_FORMATTERS[timestamp_format]
+        self._fixed_level = _to_level(level) if level is not None else None
+        self._records: Deque[LogRecord] = deque(maxlen=self.capacity)
+        self._appended = 0 # Total records ever stored; the buffer holds the last len(self._records)
+        self._spilled = 0 # Records before this index have been written to the sink
+        self._level = 0
+        self._levels_version = -1
+        self.dropped = 0 # Records evicted without a sink
+        _live_logs.add(self)
+
+    @property
+    def level(self) -> int:
+        if self._fixed_level is not None:
+            return self._fixed_level
+        if self._levels_version != _levels_version:
+            self._level = get_module_log_level(self.module_id, self.name)
+            self._levels_version = _levels_version
+        return self._level
+
+    @level.setter
+    def level(self, level: Optional[Union[int, str]]) -> None:
+        self._fixed_level = _to_level(level) if level is not None else None
+
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    def log(self, level: int, msg: str, *args: Any) -> None:
+        if level < self.level:
+            return
+        if len(self._records) == self.capacity:
+            self._evict_oldest()
+        self._records.append((time.time(), level, format_message(msg, args)))
+        self._appended += 1
+
+    def debug(self, msg: str, *args: Any) -> None:
+        self.log(logging.DEBUG, msg, *args)
+
+    def info(self, msg: str, *args: Any) -> None:
+        self.log(logging.INFO, msg, *args)
+
+    def warning(self, msg: str, *args: Any) -> None:
+        self.log(logging.WARNING, msg, *args)
+
+    def error(self, msg: str, *args: Any) -> None:
+        self.log(logging.ERROR, msg, *args)
+
+    def _evict_oldest(self) -> None:
+        oldest_index = self._appended - len(self._records)
+        if self.sink is None:
+            self.dropped += 1
+        elif oldest_index >= self._spilled:
+            self.sink.write(self.module_id, (self._records[0],))
+            self._spilled = oldest_index + 1
+
+    def flush(self) -> int:
+        """Writes buffered records not yet spilled to the sink (they stay in memory); returns how many."""
+        if self.sink is None:
+            return 0
+        first_index = self._appended - len(self._records)
+        unspilled = list(self._records)[max(0, self._spilled - first_index):]
+        if unspilled:
+            self.sink.write(self.module_id, unspilled)
+        self._spilled = self._appended
+        return len(unspilled)
+
+    def records(self) -> List[LogRecord]:
+        """Raw (created, level, message) records, oldest first."""
+        return list(self._records)
+
+    def format_record(self, record: LogRecord) -> str:
+        created, _, message = record
+        return f"{self._format_timestamp(created)} [{self.module_id}]: {message}"
+
+    # --- List-like read access, so `self._log` still reads as the old list of strings ---
+    def append(self, line: str) -> None:
+        self.log(logging.INFO, "%s", line)
+
+    def extend(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.append(line)
+
+    def clear(self) -> None:
+        """Empties the buffer; records not yet spilled go to the sink first."""
+        self.flush()
+        self._records.clear()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.format_record(record) for record in list(self._records))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self.format_record(record) for record in list(self._records)[index]]
+        return self.format_record(self._records[index])
+
+    def __bool__(self) -> bool:
+        return bool(self._records)
+
+    def __repr__(self) -> str:
+        return f"ModuleLog(module_id={self.module_id!r}, records={len(self._records)}/{self.capacity})"
+
+
+class ModuleLoggingMixin:
+    """
+    Gives a module `self._log` (a `ModuleLog`, created on first use from `self._module_id`)
+    and `self._log_message(msg, *args, level=logging.INFO)`. Subclasses set
+    `_log_timestamp_format` to keep the timestamp style of their old log lines.
+    """
+
+    _log_timestamp_format = "iso"
+
+    @property
+    def _log(self) -> ModuleLog:
+        log = self.__dict__.get("_module_log")
+        if log is None:
+            name = type(self).__name__
+            log = self.__dict__["_module_log"] = ModuleLog(getattr(self, "_module_id", None) or name, name=name,
+                                                                 timestamp_format=self._log_timestamp_format)
+        return log
+
+    @_log.setter
+    def _log(self, entries: Union[ModuleLog, Iterable[str]]) -> None:
+        if isinstance(entries, ModuleLog):
+            self.__dict__["_module_log"] = entries
+            return
+        log = self._log
+        log.clear()
+        log.extend(entries)
+
+    def _log_message(self, message: str, *args: Any, level: int = logging.INFO) -> None:
+        """Records a log message; `args` are `%`-formatted into `message` only if its level is enabled."""
+        self._log.log(level, message, *args)
@@ -0,0 +1,277 @@
+"""
+Plan library cache and LTM plan indexes for `ConcretePlanningAndDecisionMakingModule`.
+
+`develop_and_dispatch_plan` used to scan every stored LTM query result for a plan
+whose query content contained the goal description, then regenerate and re-evaluate
+all internal candidate plans for every goal, even for goals a curriculum repeats
+many times. The containers here let it skip both:
+
+- `PlanCache`: an LRU of selected plans keyed by (normalized goal descriptor,
+  planning context). The context holds everything candidate generation, evaluation
+  and selection read (the LTM plan available, a pending LTM plan query, past
+  outcomes, emotional state thresholds), so a hit selects the same plan a full
+  planning pass would, in O(1). Each entry keeps success/failure counts; entries whose success
+  rate falls below `min_success_rate` are dropped so the goal is planned afresh.
+- `LTMResultStore`: the `dict` of LTM query id -> result, indexing results of
+  "get_action_plan_for_goal" queries by their original query content.
+- `PendingPlanQueries`: the `dict` of goal id -> pending LTM plan query id, with the
+  reverse index used when a result arrives.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+DEFAULT_PLAN_CACHE_CAPACITY = 256
+LTM_PLAN_QUERY_TYPE = "get_action_plan_for_goal"
+
+PlanCacheKey = Tuple[str, Hashable]
+
+
+def normalize_goal(description: Any) -> str:
+    """Goal descriptor used as the cache key: lower-cased, with whitespace collapsed."""
+    return " ".join(str(description).lower().split())
+
+
+@dataclass
+class CachedPlan:
+    """A selected plan, recorded by which candidate it was; its actions are rebuilt for each goal instance."""
+    plan_id: str # e.g. "internal_direct_plan", "ltm_plan_<query_id>", "fallback_evaluation_reject"
+    plan_source: str
+    eval_score: Any # float, or "N/A" for fallbacks that were not evaluated
+    hits: int = 0
+    successes: int = 0
+    failures: int = 0
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        outcomes = self.successes + self.failures
+        return self.successes / outcomes if outcomes else None
+
+
+class PlanCache:
+    """
+    LRU cache of `CachedPlan`s.
+
+    Args:
+        capacity (int): Maximum entries; the least recently used entry is evicted beyond it.
+        min_success_rate (float): Entries below this success rate are dropped once they have
+            `min_outcomes` recorded outcomes.
+        min_outcomes (int): Outcomes needed before the success rate is acted on.
+    """
+
+    def __init__(self,
+                 capacity: int = DEFAULT_PLAN_CACHE_CAPACITY,
+                 min_success_rate: float = 0.3,
+                 min_outcomes: int = 3):
+        self.capacity = max(1, capacity)
+        self.min_success_rate = min_success_rate
+        self.min_outcomes = min_outcomes
+        self._entries: "OrderedDict[PlanCacheKey, CachedPlan]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.successes = 0 # Outcomes recorded for cached plans, including ones since evicted
+        self.failures = 0
+
+    def get(self, key: PlanCacheKey) -> Optional[CachedPlan]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        entry.hits += 1
+        self.hits += 1
+        return entry
+
+    def put(self, key: PlanCacheKey, plan: CachedPlan) -> None:
+        self._entries[key] = plan
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def record_outcome(self, key: PlanCacheKey, succeeded: bool) -> Optional[CachedPlan]:
+        """Counts an outcome for the plan cached under `key`; drops it if it keeps failing."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if succeeded:
+            entry.successes += 1
+            self.successes += 1
+        else:
+            entry.failures += 1
+            self.failures += 1
+        rate = entry.success_rate
+        if entry.successes + entry.failures >= self.min_outcomes and rate is not None and rate < self.min_success_rate:
+            del self._entries[key]
+        return entry
+
+    def invalidate(self, goal_descriptor: Optional[str] = None) -> int:
+        """Drops the entries for one normalized goal descriptor, or all; returns how many."""
+        if goal_descriptor is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+        keys = [key for key in self._entries if key[0] == goal_descriptor]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        successes, failures = self.successes, self.failures
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries), "capacity": self.capacity,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "plan_successes": successes, "plan_failures": failures,
+            "plan_success_rate": successes / (successes + failures) if successes + failures else None,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: PlanCacheKey) -> bool:
+        return key in self._entries
+
+
+def plan_query_metadata(result: Any) -> Dict[str, Any]:
+    """Metadata describing the query an LTM result answers (`query_metadata`, else `metadata`)."""
+    metadata = getattr(result, "query_metadata", None) or getattr(result, "metadata", None)
+    return metadata if isinstance(metadata, dict) else {}
+
+
+class LTMResultStore(dict):
+    """
+    `dict` of LTM query id -> `LTMQueryResultPayload` that indexes plan results
+    (query_type "get_action_plan_for_goal") by their original query content, in
+    the dict's own order. Each (re)assignment gives the entry a new `version()`.
+    """
+
+    def __init__(self, results: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        self._plan_content: Dict[str, str] = {} # query id -> indexed content, plan results only
+        self._positions: Dict[str, int] = {} # query id -> rank of its first insertion, i.e. its dict position
+        self._plan_order_stale = False # _plan_content is out of dict order
+        self._versions: Dict[str, int] = {}
+        self._revision = 0
+        if results:
+            self.update(results)
+
+    def _index(self, query_id: str, result: Any) -> None:
+        metadata = plan_query_metadata(result)
+        self._revision += 1
+        self._versions[query_id] = self._revision
+        if metadata.get("query_type") != LTM_PLAN_QUERY_TYPE:
+            self._plan_content.pop(query_id, None)
+            return
+        content = str(metadata.get("original_query_content", ""))
+        if query_id not in self._plan_content and self._plan_content:
+            # A replaced result keeps its dict position, which may precede indexed plans
+            last_id = next(reversed(self._plan_content))
+            self._plan_order_stale |= self._positions[query_id] < self._positions[last_id]
+        self._plan_content[query_id] = content
+
+    def _unindex(self, query_id: str) -> None:
+        self._versions.pop(query_id, None)
+        self._positions.pop(query_id, None)
+        self._plan_content.pop(query_id, None)
+
+    def __setitem__(self, query_id: str, result: Any) -> None:
+        if query_id not in self:
+            self._positions[query_id] = self._revision
+        super().__setitem__(query_id, result)
+        self._index(query_id, result)
+
+    def __delitem__(self, query_id: str) -> None:
+        super().__delitem__(query_id)
+        self._unindex(query_id)
+
+    def pop(self, query_id: str, *default: Any) -> Any:
+        if query_id in self:
+            self._unindex(query_id)
+        return super().pop(query_id, *default)
+
+    def popitem(self) -> Tuple[str, Any]:
+        query_id, result = super().popitem()
+        self._unindex(query_id)
+        return query_id, result
+
+    def setdefault(self, query_id: str, default: Any = None) -> Any:
+        if query_id not in self:
+            self[query_id] = default
+        return self[query_id]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for query_id, result in dict(*args, **kwargs).items():
+            self[query_id] = result
+
+    def clear(self) -> None:
+        super().clear()
+        self._plan_content.clear()
+        self._positions.clear()
+        self._plan_order_stale = False
+        self._versions.clear()
+
+    def version(self, query_id: str) -> Optional[int]:
+        return self._versions.get(query_id)
+
+    def find_plan_query(self, goal_description: str) -> Optional[str]:
+        """
+        Id of the first plan result, in dict order, whose original query content contains
+        `goal_description` (the result a scan of the whole dict finds); only plan results are scanned.
+        """
+        if self._plan_order_stale:
+            self._plan_content = dict(sorted(self._plan_content.items(), key=lambda item: self._positions[item[0]]))
+            self._plan_order_stale = False
+        for query_id, content in self._plan_content.items():
+            if goal_description in content:
+                return query_id
+        return None
+
+
+class PendingPlanQueries(dict):
+    """`dict` of goal id -> pending LTM plan query id, indexed the other way by `goal_for_query()`."""
+
+    def __init__(self, pending: Optional[Dict[str, str]] = None):
+        super().__init__()
+        self._goals_by_query: Dict[str, str] = {}
+        if pending:
+            self.update(pending)
+
+    def __setitem__(self, goal_id: str, query_id: str) -> None:
+        if goal_id in self:
+            self._goals_by_query.pop(dict.__getitem__(self, goal_id), None)
+        super().__setitem__(goal_id, query_id)
+        self._goals_by_query[query_id] = goal_id
+
+    def __delitem__(self, goal_id: str) -> None:
+        self._goals_by_query.pop(dict.__getitem__(self, goal_id), None)
+        super().__delitem__(goal_id)
+
+    def pop(self, goal_id: str, *default: Any) -> Any:
+        if goal_id in self:
+            self._goals_by_query.pop(dict.__getitem__(self, goal_id), None)
+        return super().pop(goal_id, *default)
+
+    def popitem(self) -> Tuple[str, str]:
+        goal_id, query_id = super().popitem()
+        self._goals_by_query.pop(query_id, None)
+        return goal_id, query_id
+
+    def setdefault(self, goal_id: str, query_id: Any = None) -> Any:
+        if goal_id not in self:
+            self[goal_id] = query_id
+        return self[goal_id]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for goal_id, query_id in dict(*args, **kwargs).items():
+            self[goal_id] = query_id
+
+    def clear(self) -> None:
+        super().clear()
+        self._goals_by_query.clear()
+
+    def goal_for_query(self, query_id: str) -> Optional[str]:
+        return self._goals_by_query.get(query_id)
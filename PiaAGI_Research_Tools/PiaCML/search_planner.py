@@ -0,0 +1,633 @@
+"""
+Search-based planning over symbolic states for `ConcretePlanningAndDecisionMakingModule`.
+
+The planning module only chose among fixed "direct", "cautious" and "exploratory"
+candidate plans. Here a `PlanningDomain` turns a goal into a `PlanningProblem`
+(ground `Operator`s plus goal facts or HTN tasks) over the `symbolic_state` of the
+world model, and a pluggable `SearchPlanner` solves it:
+
+- `AStarPlanner`: anytime weighted A* (AWA*). An inflated heuristic finds a first
+  plan quickly; the search then keeps going, pruning with the admissible heuristic,
+  until the plan is proven optimal. Each `plan()` call stops after its time budget
+  and returns the best plan so far, so planning latency per tick is bounded. The
+  search (open list, g-values, best plan) is kept per problem key and resumed by the
+  next call. When the start state has moved along the current plan, or the operators
+  changed but the rest of the plan is still valid, that rest seeds the new search as
+  its bound; heuristic values are reused while goal and operators are unchanged.
+- `HTNPlanner`: total-order HTN decomposition (SHOP-style) with methods as callables.
+  Decompositions that failed in a state are remembered across calls, so a search cut
+  short by the budget continues where it left off.
+
+Heuristics: `zero_heuristic`, `HMaxHeuristic` (admissible for any domain),
+`manhattan_heuristic` (unit-cost grid moves) and `max_heuristic` to combine them.
+`grid_move_operators`, `location_graph_operators` and `recipe_operators` build the
+operators of grid, room and crafting scenarios.
+"""
+
+import heapq
+import itertools
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+try:
+    from .symbolic_state import Fact, State
+except ImportError:
+    from symbolic_state import Fact, State # type: ignore
+
+Task = Tuple[Any, ...] # (task name, *args)
+Heuristic = Callable[[State, FrozenSet[Fact]], float]
+Method = Callable[..., Optional[Sequence[Task]]] # method(state, *task_args) -> subtasks, or None if not applicable
+
+DEFAULT_ANYTIME_WEIGHT = 2.0
+MAX_SEARCH_SESSIONS = 32 # Problems (by key) whose search is kept for the next call
+_CLOCK_CHECK_INTERVAL = 32 # Search iterations between checks of the time budget
+
+
+@dataclass(frozen=True)
+class Operator:
+    """
+    A ground STRIPS operator. `name` is the action type it is dispatched as, with
+    `parameters` as the action parameters; `args` identify it among operators of the
+    same name (HTN tasks refer to primitive operators by `(name, *args)`).
+    """
+    name: str
+    args: Tuple[Any, ...] = ()
+    preconditions: FrozenSet[Fact] = frozenset()
+    add_effects: FrozenSet[Fact] = frozenset()
+    del_effects: FrozenSet[Fact] = frozenset()
+    cost: float = 1.0
+    parameters: Optional[Dict[str, Any]] = field(default=None, compare=False, hash=False)
+
+    def __post_init__(self):
+        for name in ("args", "preconditions", "add_effects", "del_effects"):
+            value = getattr(self, name)
+            expected = tuple if name == "args" else frozenset
+            if not isinstance(value, expected):
+                object.__setattr__(self, name, expected(value))
+
+    def applicable(self, state: State) -> bool:
+        return self.preconditions <= state
+
+    def apply(self, state: State) -> State:
+        return (state - self.del_effects) | self.add_effects
+
+
+class OperatorIndex:
+    """
+    Finds the operators applicable in a state without testing all of them: each
+    operator is filed under its most selective precondition, and only operators filed
+    under a fact of the state are tested. Results keep the operators' original order.
+    """
+
+    def __init__(self, operators: Iterable[Operator]):
+        self.operators: Tuple[Operator, ...] = tuple(operators)
+        self.by_signature: Dict[Tuple[str, Tuple[Any, ...]], Operator] = {}
+        self._order: Dict[Operator, int] = {}
+        self._unconditional: List[Tuple[int, Operator]] = []
+        self._by_fact: Dict[Fact, List[Tuple[int, Operator]]] = {} # Operators filed with their position
+        uses: Dict[Fact, int] = {}
+        for operator in self.operators:
+            for fact in operator.preconditions:
+                uses[fact] = uses.get(fact, 0) + 1
+        for position, operator in enumerate(self.operators):
+            self._order.setdefault(operator, position)
+            self.by_signature.setdefault((operator.name, operator.args), operator)
+            if operator.preconditions:
+                trigger = min(operator.preconditions, key=lambda fact: (uses[fact], repr(fact)))
+                self._by_fact.setdefault(trigger, []).append((position, operator))
+            else:
+                self._unconditional.append((position, operator))
+
+    def applicable(self, state: State) -> List[Operator]:
+        found = list(self._unconditional)
+        by_fact = self._by_fact
+        for fact in state:
+            for entry in by_fact.get(fact, ()):
+                if entry[1].preconditions <= state:
+                    found.append(entry)
+        if len(found) > 1:
+            found.sort(key=lambda entry: entry[0])
+        return [operator for _, operator in found]
+
+    def __contains__(self, operator: Operator) -> bool:
+        return operator in self._order
+
+
+@dataclass
+class PlanningProblem:
+    """
+    Args:
+        initial_state (State): Facts true now (see `symbolic_state`).
+        operators (Sequence[Operator]): Ground operators available.
+        goal (FrozenSet[Fact]): Facts a plan must make true (A*).
+        tasks (Sequence[Task]): Tasks a plan must accomplish (HTN).
+        heuristic (Optional[Heuristic]): Admissible estimate of the remaining cost, as
+            `heuristic(state, goal)`; without one, A* is uniform-cost search.
+        key (Hashable): Identifies the problem across calls, so its search is resumed;
+            defaults to the goal facts and tasks.
+    """
+    initial_state: State
+    operators: Sequence[Operator]
+    goal: FrozenSet[Fact] = frozenset()
+    tasks: Sequence[Task] = ()
+    heuristic: Optional[Heuristic] = None
+    key: Hashable = None
+
+    def __post_init__(self):
+        self.initial_state = frozenset(self.initial_state)
+        self.goal = frozenset(self.goal)
+        self.tasks = tuple(tuple(task) for task in self.tasks)
+        if not isinstance(self.operators, tuple):
+            self.operators = tuple(self.operators)
+        if self.key is None:
+            self.key = (self.goal, self.tasks)
+
+    def is_goal(self, state: State) -> bool:
+        return self.goal <= state
+
+
+@dataclass
+class SearchResult:
+    plan: List[Operator]
+    cost: float
+    complete: bool # The plan reaches the goal / accomplishes the tasks; else the best partial plan
+    optimal: bool # No cheaper plan exists (A* only)
+    exhausted: bool # The search space was used up: the result will not improve with more time
+    expansions: int # Nodes expanded (A*) or methods tried (HTN) during this call
+    elapsed: float # Seconds spent in this call
+    reused: bool = False # Resumed or seeded from an earlier call's search
+    planner: str = ""
+
+    @property
+    def signature(self) -> Tuple[Tuple[str, Tuple[Any, ...]], ...]:
+        return tuple((operator.name, operator.args) for operator in self.plan)
+
+
+def plan_cost(plan: Iterable[Operator]) -> float:
+    return sum(operator.cost for operator in plan)
+
+
+def validate_plan(plan: Sequence[Operator], state: State, goal: Optional[FrozenSet[Fact]] = None,
+                  operators: Optional[OperatorIndex] = None) -> bool:
+    """Whether `plan` can be executed from `state` (using only `operators`, if given) and ends in `goal`."""
+    for operator in plan:
+        if (operators is not None and operator not in operators) or not operator.applicable(state):
+            return False
+        state = operator.apply(state)
+    return goal is None or goal <= state
+
+
+# --- Heuristics ---
+def zero_heuristic(state: State, goal: FrozenSet[Fact]) -> float:
+    return 0.0
+
+
+class HMaxHeuristic:
+    """
+    h_max: with delete effects ignored, the cost of reaching the most expensive goal
+    fact. Admissible for any domain; `math.inf` marks states from which the goal is
+    unreachable, which the planner prunes.
+    """
+
+    def __init__(self, operators: Iterable[Operator]):
+        self.operators = tuple(operators)
+        self._precondition_counts = [len(operator.preconditions) for operator in self.operators]
+        self._by_precondition: Dict[Fact, List[int]] = {}
+        for i, operator in enumerate(self.operators):
+            for fact in operator.preconditions:
+                self._by_precondition.setdefault(fact, []).append(i)
+        self._unconditional = [i for i, count in enumerate(self._precondition_counts) if count == 0]
+
+    def __call__(self, state: State, goal: FrozenSet[Fact]) -> float:
+        pending = set(goal - state)
+        if not pending:
+            return 0.0
+        unsatisfied = list(self._precondition_counts)
+        reached: Set[Fact] = set()
+        tie = itertools.count()
+        heap: List[Tuple[float, int, Fact]] = [(0.0, next(tie), fact) for fact in state]
+        for i in self._unconditional:
+            heap.extend((self.operators[i].cost, next(tie), fact) for fact in self.operators[i].add_effects)
+        heapq.heapify(heap)
+        while heap:
+            cost, _, fact = heapq.heappop(heap)
+            if fact in reached:
+                continue
+            reached.add(fact)
+            pending.discard(fact)
+            if not pending:
+                return cost # Facts are reached in cost order, so this goal fact is the costliest
+            for i in self._by_precondition.get(fact, ()):
+                unsatisfied[i] -= 1
+                if unsatisfied[i] == 0:
+                    operator = self.operators[i]
+                    for effect in operator.add_effects:
+                        if effect not in reached:
+                            heapq.heappush(heap, (cost + operator.cost, next(tie), effect))
+        return math.inf
+
+
+def manhattan_heuristic(entity_id: str, predicate: str = "cell", step_cost: float = 1.0) -> Heuristic:
+    """
+    Manhattan distance between the entity's `(predicate, entity_id, (x, y))` fact in the
+    state and in the goal, times `step_cost`. Admissible for grids of unit moves costing
+    at least `step_cost`; 0 if the goal does not place the entity.
+    """
+    def heuristic(state: State, goal: FrozenSet[Fact]) -> float:
+        target = next((fact[2] for fact in goal if len(fact) == 3 and fact[0] == predicate and fact[1] == entity_id), None)
+        if target is None:
+            return 0.0
+        current = next((fact[2] for fact in state if len(fact) == 3 and fact[0] == predicate and fact[1] == entity_id), None)
+        if current is None:
+            return 0.0
+        return step_cost * (abs(current[0] - target[0]) + abs(current[1] - target[1]))
+    return heuristic
+
+
+def max_heuristic(*heuristics: Heuristic) -> Heuristic:
+    """The largest of several admissible heuristics, itself admissible."""
+    return lambda state, goal: max(heuristic(state, goal) for heuristic in heuristics)
+
+
+# --- Operator builders for common scenarios ---
+GRID_MOVES = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)} # As PiaSE's GridWorld moves
+
+
+def grid_move_operators(entity_id: str, width: int, height: int, blocked: Iterable[Tuple[int, int]] = (),
+                        cost: float = 1.0, moves: Mapping[str, Tuple[int, int]] = GRID_MOVES) -> List[Operator]:
+    """Moves of `entity_id` between free cells of a width x height grid, over `("cell", entity_id, (x, y))` facts."""
+    blocked = set(map(tuple, blocked))
+    operators = []
+    for x in range(width):
+        for y in range(height):
+            if (x, y) in blocked:
+                continue
+            here = ("cell", entity_id, (x, y))
+            for action_type, (dx, dy) in moves.items():
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and (nx, ny) not in blocked:
+                    there = ("cell", entity_id, (nx, ny))
+                    operators.append(Operator(action_type, (entity_id, (x, y)), frozenset({here}), frozenset({there}),
+                                              frozenset({here}), cost, {}))
+    return operators
+
+
+def location_graph_operators(entity_id: str, exits: Mapping[Any, Any], action_type: str = "go",
+                             parameter: str = "direction", cost: float = 1.0) -> List[Operator]:
+    """
+    Moves of `entity_id` between locations, over `("at", entity_id, location)` facts.
+    `exits[location]` maps exit labels (e.g. directions) to locations, or lists the
+    locations reachable; the label, or else the target, is sent as `parameter`.
+    """
+    operators = []
+    for location, targets in exits.items():
+        pairs = targets.items() if isinstance(targets, Mapping) else ((target, target) for target in targets)
+        for label, target in pairs:
+            here, there = ("at", entity_id, location), ("at", entity_id, target)
+            operators.append(Operator(action_type, (entity_id, location, label), frozenset({here}), frozenset({there}),
+                                      frozenset({here}), cost, {parameter: label}))
+    return operators
+
+
+def recipe_operators(entity_id: str, recipes: Mapping[str, Mapping[str, Any]],
+                     station_locations: Optional[Mapping[str, Iterable[Any]]] = None,
+                     action_type: str = "craft_item", cost: float = 1.0) -> List[Operator]:
+    """
+    Crafting operators over `("has", entity_id, item)` facts, from recipes shaped like
+    PiaSE's CraftingWorld ones (`{"inputs": {item: n}, "station_required": ..., "tool_required": ...}`).
+    Quantities are abstracted away: crafting needs and consumes each input, keeps the
+    tool, and needs the entity `("at", ...)` a location of the station, if one is required.
+    """
+    operators = []
+    for item, recipe in recipes.items():
+        inputs = set(recipe.get("inputs", {}))
+        tool = recipe.get("tool_required")
+        needs = {("has", entity_id, needed) for needed in inputs | ({tool} if tool else set())}
+        consumed = {("has", entity_id, used) for used in inputs if used != item and used != tool}
+        station = recipe.get("station_required")
+        locations = list((station_locations or {}).get(station, ())) if station else [None]
+        for location in locations:
+            preconditions = needs | ({("at", entity_id, location)} if location is not None else set())
+            operators.append(Operator(action_type, (entity_id, item, location), frozenset(preconditions),
+                                      frozenset({("has", entity_id, item)}), frozenset(consumed), cost, {"item_name": item}))
+    return operators
+
+
+# --- Planners ---
+class SearchPlanner:
+    """Planners the planning module can use. `plan()` should return within about `time_budget` seconds."""
+    name = "search"
+
+    def plan(self, problem: PlanningProblem, time_budget: Optional[float] = None,
+             max_expansions: Optional[int] = None) -> SearchResult:
+        raise NotImplementedError
+
+    def reset(self, key: Hashable = None) -> None:
+        """Forgets the search kept for one problem key, or for all."""
+
+
+def _deadline(time_budget: Optional[float]) -> float:
+    return time.perf_counter() + time_budget if time_budget is not None else math.inf
+
+
+class _AStarSession:
+    """The resumable state of one anytime A* search."""
+
+    def __init__(self, problem: PlanningProblem, index: OperatorIndex, h_cache: Dict[State, float],
+                 weight: float, seed_plan: Optional[List[Operator]] = None):
+        self.goal, self.operators, self.index = problem.goal, problem.operators, index
+        self.heuristic = problem.heuristic or zero_heuristic
+        self.h_cache, self.weight = h_cache, weight
+        self.start = problem.initial_state
+        self.g: Dict[State, float] = {self.start: 0.0}
+        self.parents: Dict[State, Optional[Tuple[State, Operator]]] = {self.start: None}
+        self.open: List[Tuple[float, float, int, float, State]] = []
+        self._tie = itertools.count()
+        self.incumbent_state: Optional[State] = None
+        self.incumbent_cost = math.inf
+        self.seed_plan: Optional[List[Operator]] = None
+        if seed_plan is not None:
+            self.seed_plan, self.incumbent_cost = seed_plan, plan_cost(seed_plan)
+        self.best_partial: Tuple[float, float, State] = (self.h(self.start), 0.0, self.start)
+        if self.best_partial[0] < math.inf:
+            self._push(self.start, 0.0, self.best_partial[0])
+
+    def h(self, state: State) -> float:
+        value = self.h_cache.get(state)
+        if value is None:
+            value = self.h_cache[state] = self.heuristic(state, self.goal)
+        return value
+
+    def _push(self, state: State, g: float, h: float) -> None:
+        heapq.heappush(self.open, (g + self.weight * h, -g, next(self._tie), g, state))
+
+    def run(self, deadline: float, max_expansions: Optional[int]) -> int:
+        expansions = iterations = 0
+        goal, g_values, parents, index = self.goal, self.g, self.parents, self.index
+        while self.open:
+            if max_expansions is not None and expansions >= max_expansions:
+                break
+            iterations += 1
+            if iterations % _CLOCK_CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                break
+            _, _, _, g, state = heapq.heappop(self.open)
+            if g > g_values.get(state, math.inf):
+                continue # Superseded by a cheaper path
+            h = self.h(state)
+            if g + h >= self.incumbent_cost:
+                continue # Cannot lead to a cheaper plan
+            if goal <= state:
+                self.incumbent_state, self.incumbent_cost, self.seed_plan = state, g, None
+                continue
+            expansions += 1
+            if (h, g) < self.best_partial[:2]:
+                self.best_partial = (h, g, state)
+            for operator in index.applicable(state):
+                child = operator.apply(state)
+                child_g = g + operator.cost
+                if child_g >= g_values.get(child, math.inf):
+                    continue
+                child_h = self.h(child)
+                if child_g + child_h >= self.incumbent_cost:
+                    continue
+                g_values[child] = child_g
+                parents[child] = (state, operator)
+                self._push(child, child_g, child_h)
+        return expansions
+
+    def path_to(self, state: State) -> List[Operator]:
+        plan = []
+        link = self.parents.get(state)
+        while link is not None:
+            state, operator = link
+            plan.append(operator)
+            link = self.parents[state]
+        plan.reverse()
+        return plan
+
+    def best_plan(self) -> Tuple[List[Operator], bool]:
+        if self.incumbent_state is not None:
+            return self.path_to(self.incumbent_state), True
+        if self.seed_plan is not None:
+            return list(self.seed_plan), True
+        return self.path_to(self.best_partial[2]), False
+
+    def plan_suffix_from(self, state: State, index: OperatorIndex) -> Optional[List[Operator]]:
+        """The rest of the best complete plan, if `state` lies on it and the rest is still valid."""
+        plan, complete = self.best_plan()
+        if not complete:
+            return None
+        current = self.start
+        for i, operator in enumerate(plan):
+            if current == state:
+                break
+            current = operator.apply(current)
+        else:
+            if current != state:
+                return None
+            i = len(plan)
+        suffix = plan[i:]
+        return suffix if validate_plan(suffix, state, self.goal, index) else None
+
+
+class AStarPlanner(SearchPlanner):
+    """
+    Anytime weighted A* with a per-call time budget and searches resumed across calls.
+
+    Args:
+        weight (float): Heuristic inflation for the first plan (>= 1; 1 is plain A*).
+            Later plans are improved until optimal whatever the weight.
+        max_sessions (int): Problems whose search is kept between calls.
+    """
+    name = "astar"
+
+    def __init__(self, weight: float = DEFAULT_ANYTIME_WEIGHT, max_sessions: int = MAX_SEARCH_SESSIONS):
+        self.weight = max(1.0, weight)
+        self.max_sessions = max(1, max_sessions)
+        self._sessions: "OrderedDict[Hashable, _AStarSession]" = OrderedDict()
+
+    def _session_for(self, problem: PlanningProblem) -> Tuple[_AStarSession, bool]:
+        session = self._sessions.get(problem.key)
+        if session is None or session.goal != problem.goal:
+            return _AStarSession(problem, OperatorIndex(problem.operators), {}, self.weight), False
+        same_operators = session.operators is problem.operators or session.operators == problem.operators
+        index = session.index if same_operators else OperatorIndex(problem.operators)
+        same_heuristic = same_operators and session.heuristic is (problem.heuristic or zero_heuristic)
+        if same_heuristic and session.start == problem.initial_state:
+            return session, True # Resume
+        seed = session.plan_suffix_from(problem.initial_state, index)
+        h_cache = session.h_cache if same_heuristic else {}
+        return _AStarSession(problem, index, h_cache, self.weight, seed), seed is not None
+
+    def plan(self, problem: PlanningProblem, time_budget: Optional[float] = None,
+             max_expansions: Optional[int] = None) -> SearchResult:
+        started = time.perf_counter()
+        session, reused = self._session_for(problem)
+        self._sessions[problem.key] = session
+        self._sessions.move_to_end(problem.key)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+        expansions = session.run(_deadline(time_budget), max_expansions)
+        plan, complete = session.best_plan()
+        exhausted = not session.open
+        return SearchResult(plan=plan, cost=plan_cost(plan), complete=complete, optimal=complete and exhausted,
+                            exhausted=exhausted, expansions=expansions, elapsed=time.perf_counter() - started,
+                            reused=reused, planner=self.name)
+
+    def reset(self, key: Hashable = None) -> None:
+        if key is None:
+            self._sessions.clear()
+        else:
+            self._sessions.pop(key, None)
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class _HTNSession:
+    def __init__(self, problem: PlanningProblem):
+        self.tasks, self.operators = problem.tasks, problem.operators
+        self.index = OperatorIndex(problem.operators)
+        self.failed: Set[Tuple[State, Tuple[Task, ...]]] = set() # (state, remaining tasks) known not to decompose
+        self.trajectory: List[State] = [] # States along the last plan found, from its start
+        self.plan: Optional[List[Operator]] = None
+
+
+class HTNPlanner(SearchPlanner):
+    """
+    Total-order HTN planner. A task `(name, *args)` is primitive if the problem has an
+    operator with that name and args; otherwise the methods in `methods[name]` are
+    tried in order, each called as `method(state, *args)` and returning subtasks, or
+    None if it does not apply. The first full decomposition found is returned.
+
+    Args:
+        methods (Mapping[str, Sequence[Method]]): Methods by compound task name.
+        max_sessions (int): Problems whose failure memo and last plan are kept between calls.
+    """
+    name = "htn"
+
+    def __init__(self, methods: Mapping[str, Sequence[Method]], max_sessions: int = MAX_SEARCH_SESSIONS):
+        self.methods = {name: list(task_methods) for name, task_methods in methods.items()}
+        self.max_sessions = max(1, max_sessions)
+        self._sessions: "OrderedDict[Hashable, _HTNSession]" = OrderedDict()
+
+    def plan(self, problem: PlanningProblem, time_budget: Optional[float] = None,
+             max_expansions: Optional[int] = None) -> SearchResult:
+        started = time.perf_counter()
+        session = self._sessions.get(problem.key)
+        if session is None or session.tasks != problem.tasks or not (
+                session.operators is problem.operators or session.operators == problem.operators):
+            session = _HTNSession(problem)
+        self._sessions[problem.key] = session
+        self._sessions.move_to_end(problem.key)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+        def result(plan, complete, exhausted, expansions, reused):
+            return SearchResult(plan=plan, cost=plan_cost(plan), complete=complete, optimal=False, exhausted=exhausted,
+                                expansions=expansions, elapsed=time.perf_counter() - started, reused=reused, planner=self.name)
+
+        if session.plan is not None and problem.initial_state in session.trajectory: # Still on the last plan
+            return result(session.plan[session.trajectory.index(problem.initial_state):], True, True, 0, True)
+
+        counter = {"expansions": 0}
+        deadline = _deadline(time_budget)
+        reused = bool(session.failed)
+        try:
+            plan = self._decompose(session, problem.initial_state, problem.tasks, deadline, max_expansions, counter)
+        except _BudgetExceeded:
+            return result([], False, False, counter["expansions"], reused)
+        if plan is None:
+            session.plan = None
+            return result([], False, True, counter["expansions"], reused)
+        state, trajectory = problem.initial_state, [problem.initial_state]
+        for operator in plan[:-1]:
+            state = operator.apply(state)
+            trajectory.append(state)
+        session.plan, session.trajectory = plan, trajectory
+        return result(plan, True, True, counter["expansions"], reused)
+
+    def _decompose(self, session: _HTNSession, state: State, tasks: Tuple[Task, ...], deadline: float,
+                   max_expansions: Optional[int], counter: Dict[str, int]) -> Optional[List[Operator]]:
+        plan: List[Operator] = []
+        while tasks:
+            task = tasks[0]
+            operator = session.index.by_signature.get((task[0], tuple(task[1:])))
+            if operator is not None:
+                if not operator.applicable(state):
+                    return None
+                plan.append(operator)
+                state, tasks = operator.apply(state), tasks[1:]
+                continue
+            if (state, tasks) in session.failed:
+                return None
+            for method in self.methods.get(task[0], ()):
+                if max_expansions is not None and counter["expansions"] >= max_expansions:
+                    raise _BudgetExceeded()
+                if time.perf_counter() >= deadline:
+                    raise _BudgetExceeded()
+                counter["expansions"] += 1
+                subtasks = method(state, *task[1:])
+                if subtasks is None:
+                    continue
+                rest = self._decompose(session, state, tuple(tuple(subtask) for subtask in subtasks) + tasks[1:],
+                                       deadline, max_expansions, counter)
+                if rest is not None:
+                    return plan + rest
+            session.failed.add((state, tasks)) # Not recorded when the budget ran out part-way
+            return None
+        return plan
+
+    def reset(self, key: Hashable = None) -> None:
+        if key is None:
+            self._sessions.clear()
+        else:
+            self._sessions.pop(key, None)
+
+
+class PlanningDomain:
+    """
+    Turns goals into `PlanningProblem`s over the symbolic state.
+
+    Args:
+        operators: Ground operators, or a callable `operators(state)` returning them
+            (e.g. to reflect obstacles currently in the world model).
+        goals: Goal facts (A*) by normalized goal description, or a callable
+            `goals(goal_payload, state)` returning them or None.
+        tasks: HTN tasks, likewise.
+        heuristic (Optional[Heuristic]): Admissible heuristic for the problems.
+    """
+
+    def __init__(self,
+                 operators: Any,
+                 goals: Any = None,
+                 tasks: Any = None,
+                 heuristic: Optional[Heuristic] = None):
+        self.operators, self.goals, self.tasks, self.heuristic = operators, goals, tasks, heuristic
+        self._operators_for: Optional[Tuple[State, Tuple[Operator, ...]]] = None
+
+    @staticmethod
+    def _lookup(source: Any, goal_payload: Any, state: State) -> Any:
+        if source is None:
+            return None
+        if callable(source):
+            return source(goal_payload, state)
+        return source.get(" ".join(str(goal_payload.goal_description).lower().split()))
+
+    def problem_for_goal(self, goal_payload: Any, state: State) -> Optional[PlanningProblem]:
+        goal = self._lookup(self.goals, goal_payload, state)
+        tasks = self._lookup(self.tasks, goal_payload, state)
+        if goal is None and tasks is None:
+            return None
+        operators = self.operators
+        if callable(operators):
+            if self._operators_for is None or self._operators_for[0] != state:
+                self._operators_for = (state, tuple(operators(state)))
+            operators = self._operators_for[1]
+        return PlanningProblem(initial_state=state, operators=operators, goal=goal or frozenset(), tasks=tasks or (),
+                               heuristic=self.heuristic, key=getattr(goal_payload, "goal_id", None))
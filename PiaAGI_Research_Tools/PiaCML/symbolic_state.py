@@ -0,0 +1,122 @@
+"""
+Symbolic (STRIPS-style) state derived from `ConcreteWorldModel`, for `search_planner`.
+
+A state is a `frozenset` of facts, each a tuple `(predicate, subject, ...)`. An entity
+contributes:
+
+- `("type", id, type)` and `("affords", id, affordance)` for each affordance;
+- `("at", id, location_id)` when it has a location;
+- `("cell", id, (ix, iy))`: the grid cell of `state["position"]` (x and y, floored
+  after dividing by `cell_size`), so grid planners see integer positions;
+- `("has", id, item)` for each item in `state["inventory"]` (a list, or a dict of
+  item -> count where the count is positive);
+- `("state", id, key, value)` for other state entries with scalar values, and
+  `("state", id, key, subkey, value)` one level into dict entries;
+- `("rel", id, relation, target)` for string targets in `relationships`.
+
+Spatial areas with a parent contribute `("part_of", area_id, parent_area_id)`.
+
+`SymbolicStateBuilder` keeps each entity's facts keyed by `EntityRepository.version()`,
+so rebuilding the state after an incremental change re-derives only the entities
+that changed.
+"""
+
+import math
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+try:
+    from .world_model_index import entity_position
+except ImportError:
+    from world_model_index import entity_position # type: ignore
+
+Fact = Tuple[Hashable, ...]
+State = FrozenSet[Fact]
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+_STRUCTURED_STATE_KEYS = frozenset({"position", "inventory"}) # Read into "cell"/"has" facts instead
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, _SCALAR_TYPES) and not (isinstance(value, float) and math.isnan(value))
+
+
+def grid_cell(position: Iterable[float], cell_size: float = 1.0) -> Tuple[int, int]:
+    """The (ix, iy) grid cell holding an (x, y[, z]) position."""
+    x, y = list(position)[:2]
+    return (int(math.floor(x / cell_size)), int(math.floor(y / cell_size)))
+
+
+def entity_facts(entity_id: str, entity: Any, cell_size: float = 1.0) -> FrozenSet[Fact]:
+    """Facts describing one `WorldEntity`."""
+    facts: List[Fact] = [("type", entity_id, getattr(entity, "type", None))]
+    facts.extend(("affords", entity_id, affordance) for affordance in (getattr(entity, "affordances", None) or ()) if _is_scalar(affordance))
+    location_id = getattr(entity, "location_id", None)
+    if location_id is not None:
+        facts.append(("at", entity_id, location_id))
+    position = entity_position(entity)
+    if position is not None:
+        facts.append(("cell", entity_id, grid_cell(position, cell_size)))
+
+    state = getattr(entity, "state", None) or {}
+    inventory = state.get("inventory")
+    if isinstance(inventory, dict):
+        facts.extend(("has", entity_id, item) for item, count in inventory.items()
+                     if _is_scalar(item) and (not isinstance(count, (int, float)) or count > 0))
+    elif isinstance(inventory, (list, tuple, set, frozenset)):
+        facts.extend(("has", entity_id, item) for item in inventory if _is_scalar(item))
+    for key, value in state.items():
+        if key in _STRUCTURED_STATE_KEYS or not _is_scalar(key):
+            continue
+        if _is_scalar(value):
+            facts.append(("state", entity_id, key, value))
+        elif isinstance(value, dict):
+            facts.extend(("state", entity_id, key, subkey, subvalue) for subkey, subvalue in value.items()
+                         if _is_scalar(subkey) and _is_scalar(subvalue))
+
+    for relation, targets in (getattr(entity, "relationships", None) or {}).items():
+        if isinstance(targets, (list, tuple)):
+            facts.extend(("rel", entity_id, relation, target) for target in targets if isinstance(target, str))
+    return frozenset(facts)
+
+
+class SymbolicStateBuilder:
+    """
+    Builds the symbolic state of a `ConcreteWorldModel`, re-deriving only entities whose
+    repository version changed since the last build.
+
+    Args:
+        world_model: The `ConcreteWorldModel` to read.
+        cell_size (float): Size of the grid cells used for "cell" facts.
+    """
+
+    def __init__(self, world_model: Any, cell_size: float = 1.0):
+        self.world_model = world_model
+        self.cell_size = cell_size
+        self._entity_facts: Dict[str, Tuple[Optional[int], FrozenSet[Fact]]] = {} # id -> (version, facts)
+        self.rebuilt_entities = 0 # Entities re-derived over the builder's lifetime
+
+    def _facts_for(self, entity_id: str, entity: Any, version: Optional[int]) -> FrozenSet[Fact]:
+        cached = self._entity_facts.get(entity_id)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1]
+        facts = entity_facts(entity_id, entity, self.cell_size)
+        self._entity_facts[entity_id] = (version, facts)
+        self.rebuilt_entities += 1
+        return facts
+
+    def build(self, entity_ids: Optional[Iterable[str]] = None) -> State:
+        """The symbolic state of the given entities (default: all) and of the spatial model."""
+        repository = self.world_model._entity_repository
+        version = getattr(repository, "version", lambda _entity_id: None)
+        ids = list(repository) if entity_ids is None else [entity_id for entity_id in entity_ids if entity_id in repository]
+        facts = set()
+        for entity_id in ids:
+            facts |= self._facts_for(entity_id, repository[entity_id], version(entity_id))
+        if entity_ids is None and len(self._entity_facts) > len(repository): # Forget removed entities
+            for entity_id in [entity_id for entity_id in self._entity_facts if entity_id not in repository]:
+                del self._entity_facts[entity_id]
+        for area_id, area in getattr(self.world_model, "_spatial_model", {}).items():
+            parent_area_id = getattr(area, "parent_area_id", None)
+            if parent_area_id is not None:
+                facts.add(("part_of", area_id, parent_area_id))
+        return frozenset(facts)
@@ -0,0 +1,339 @@
+"""
+Time-indexed, bounded storage for `ConcreteWorldModel`'s temporal events.
+
+The world model's event log used to be a plain list that grew for the whole run,
+and "what happened between t0 and t1 involving X" meant scanning all of it.
+`TemporalEventStore` keeps events ordered by timestamp instead:
+
+- events live in time-ordered chunks of `chunk_size`; the chunk start times are
+  bisected to find a time range, then the timestamps inside each chunk;
+- per event type and per involved entity, a time-ordered series is kept, so
+  `events_between(t0, t1, involving=[...], event_type=...)` costs
+  O(log n + matches) rather than a full scan;
+- an optional `EventRetentionPolicy` bounds the store by event count and/or age.
+  Whole chunks are evicted, oldest first; evicted events can be appended to a JSONL
+  file and/or handed, as a compact summary (`summarize_events`), to a callback such
+  as `ConcreteLongTermMemoryModule.store_episodic_experience`.
+
+Events arriving out of order are inserted at their timestamp; events with equal
+timestamps keep their arrival order. The store still reads like the old list
+(`len`, indexing, slicing, iteration, `append`), in time order.
+"""
+
+import heapq
+import json
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+DEFAULT_CHUNK_SIZE = 512
+
+SeriesEntry = Tuple[float, int, Any] # (timestamp, arrival sequence, event)
+
+
+@dataclass
+class EventRetentionPolicy:
+    """
+    Bounds a `TemporalEventStore`. Eviction works on whole chunks, so the store keeps
+    between `max_events` and `max_events + chunk_size - 1` events.
+
+    Attributes:
+        max_events (Optional[int]): Oldest chunks are evicted while the rest still hold at least this many events.
+        max_age_seconds (Optional[float]): Chunks whose newest event is older than this, relative to the
+            newest event in the store (not the wall clock, so simulated time works), are evicted.
+        spill_path (Optional[str]): Evicted events are appended to this JSONL file, one `to_dict()` per line.
+        summarizer (Optional[Callable[[Dict[str, Any]], Any]]): Called with `summarize_events(chunk)` for each
+            evicted chunk, e.g. `ltm.store_episodic_experience`.
+    """
+    max_events: Optional[int] = None
+    max_age_seconds: Optional[float] = None
+    spill_path: Optional[str] = None
+    summarizer: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+
+def summarize_events(events: List[Any]) -> Dict[str, Any]:
+    """
+    Compact summary of a run of events, shaped for `store_episodic_experience`
+    (event_description, timestamp, associated_data).
+    """
+    if not events:
+        return {"event_description": "No world model events.", "timestamp": None, "associated_data": {"event_count": 0}}
+    start, end = events[0].timestamp, events[-1].timestamp
+    by_type = Counter(getattr(event, "type", None) for event in events)
+    by_entity = Counter(entity_id for event in events for entity_id in dict.fromkeys(getattr(event, "involved_entities", None) or ()))
+    return {
+        "event_description": f"Summary of {len(events)} world model events between {start} and {end}.",
+        "timestamp": start,
+        "associated_data": {
+            "start_time": start,
+            "end_time": end,
+            "event_count": len(events),
+            "events_by_type": dict(by_type),
+            "events_by_entity": dict(by_entity),
+        },
+    }
+
+
+class _Chunk:
+    __slots__ = ("times", "events")
+
+    def __init__(self) -> None:
+        self.times: List[float] = []
+        self.events: List[Any] = []
+
+
+class _Series:
+    """Events of one type or involving one entity, ordered by (timestamp, arrival)."""
+    __slots__ = ("times", "entries")
+
+    def __init__(self) -> None:
+        self.times: List[float] = []
+        self.entries: List[SeriesEntry] = []
+
+    def insert(self, entry: SeriesEntry) -> None:
+        if not self.times or entry[0] >= self.times[-1]:
+            self.times.append(entry[0])
+            self.entries.append(entry)
+        else:
+            position = bisect_right(self.times, entry[0])
+            self.times.insert(position, entry[0])
+            self.entries.insert(position, entry)
+
+    def between(self, start: Optional[float], end: Optional[float]) -> List[SeriesEntry]:
+        lo = 0 if start is None else bisect_left(self.times, start)
+        hi = len(self.times) if end is None else bisect_right(self.times, end)
+        return self.entries[lo:hi]
+
+    def drop_oldest(self, count: int) -> None:
+        del self.times[:count]
+        del self.entries[:count]
+
+
+class TemporalEventStore:
+    """
+    Time-ordered, chunked store of temporal events (objects with `timestamp`, `type`
+    and `involved_entities`), indexed by event type and involved entity.
+
+    Args:
+        events (Iterable[Any]): Initial events, in any order.
+        chunk_size (int): Events per chunk; also the eviction granularity.
+        retention (Optional[EventRetentionPolicy]): Bounds on the store; unbounded if None.
+    """
+
+    def __init__(self,
+                 events: Iterable[Any] = (),
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 retention: Optional[EventRetentionPolicy] = None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.chunk_size = chunk_size
+        self.retention = retention
+        self.evicted_count = 0
+        self._chunks: List[_Chunk] = []
+        self._chunk_starts: List[float] = [] # First timestamp of each chunk
+        self._by_type: Dict[Any, _Series] = {}
+        self._by_entity: Dict[Any, _Series] = {}
+        self._length = 0
+        self._sequence = 0
+        self.extend(events)
+
+    # --- Writes ---
+    def append(self, event: Any) -> None:
+        timestamp = float(event.timestamp)
+        chunks = self._chunks
+        if not chunks or timestamp >= chunks[-1].times[-1]:
+            if not chunks or len(chunks[-1].times) >= self.chunk_size:
+                chunks.append(_Chunk())
+                self._chunk_starts.append(timestamp)
+            chunks[-1].times.append(timestamp)
+            chunks[-1].events.append(event)
+        else:
+            self._insert_out_of_order(timestamp, event)
+
+        entry = (timestamp, self._sequence, event)
+        self._sequence += 1
+        self._length += 1
+        self._series(self._by_type, getattr(event, "type", None)).insert(entry)
+        for entity_id in dict.fromkeys(getattr(event, "involved_entities", None) or ()):
+            self._series(self._by_entity, entity_id).insert(entry)
+
+        if self.retention is not None:
+            self._apply_retention()
+
+    def extend(self, events: Iterable[Any]) -> None:
+        for event in events:
+            self.append(event)
+
+    def clear(self) -> None:
+        self._chunks.clear()
+        self._chunk_starts.clear()
+        self._by_type.clear()
+        self._by_entity.clear()
+        self._length = 0
+
+    def _insert_out_of_order(self, timestamp: float, event: Any) -> None:
+        index = max(bisect_right(self._chunk_starts, timestamp) - 1, 0)
+        chunk = self._chunks[index]
+        position = bisect_right(chunk.times, timestamp)
+        chunk.times.insert(position, timestamp)
+        chunk.events.insert(position, event)
+        self._chunk_starts[index] = chunk.times[0]
+        if len(chunk.times) > 2 * self.chunk_size: # Split so late arrivals cannot grow one chunk without bound
+            tail = _Chunk()
+            tail.times, chunk.times = chunk.times[self.chunk_size:], chunk.times[:self.chunk_size]
+            tail.events, chunk.events = chunk.events[self.chunk_size:], chunk.events[:self.chunk_size]
+            self._chunks.insert(index + 1, tail)
+            self._chunk_starts.insert(index + 1, tail.times[0])
+
+    @staticmethod
+    def _series(index: Dict[Any, _Series], key: Any) -> _Series:
+        series = index.get(key)
+        if series is None:
+            series = index[key] = _Series()
+        return series
+
+    # --- Retention ---
+    def _apply_retention(self) -> None:
+        policy = self.retention
+        while len(self._chunks) > 1:
+            oldest = self._chunks[0]
+            over_count = policy.max_events is not None and self._length - len(oldest.times) >= policy.max_events
+            too_old = (policy.max_age_seconds is not None
+                       and oldest.times[-1] < self._chunks[-1].times[-1] - policy.max_age_seconds)
+            if not (over_count or too_old):
+                break
+            self._evict_oldest_chunk()
+
+    def _evict_oldest_chunk(self) -> None:
+        chunk = self._chunks.pop(0)
+        self._chunk_starts.pop(0)
+        self._length -= len(chunk.events)
+        self.evicted_count += len(chunk.events)
+        # The evicted events are the oldest overall, hence the first entries of every series they are in
+        self._drop_from_index(self._by_type, Counter(getattr(event, "type", None) for event in chunk.events))
+        self._drop_from_index(self._by_entity, Counter(
+            entity_id for event in chunk.events for entity_id in dict.fromkeys(getattr(event, "involved_entities", None) or ())))
+
+        policy = self.retention
+        if policy.spill_path:
+            with open(policy.spill_path, 'a', encoding='utf-8') as f:
+                for event in chunk.events:
+                    f.write(json.dumps(event.to_dict() if hasattr(event, "to_dict") else vars(event), default=str) + "\n")
+        if policy.summarizer is not None:
+            policy.summarizer(summarize_events(chunk.events))
+
+    @staticmethod
+    def _drop_from_index(index: Dict[Any, _Series], counts: Counter) -> None:
+        for key, count in counts.items():
+            series = index[key]
+            series.drop_oldest(count)
+            if not series.times:
+                del index[key]
+
+    # --- Queries ---
+    def events_between(self,
+                       start_time: Optional[float] = None,
+                       end_time: Optional[float] = None,
+                       involving: Optional[Iterable[Any]] = None,
+                       event_type: Any = None) -> List[Any]:
+        """
+        Events with start_time <= timestamp <= end_time (either bound may be None),
+        optionally involving any of `involving` and/or of type `event_type`, in time order.
+        """
+        if involving is not None:
+            series = [self._by_entity[entity_id] for entity_id in dict.fromkeys(involving) if entity_id in self._by_entity]
+            entries = self._merge([s.between(start_time, end_time) for s in series])
+            if event_type is not None:
+                return [event for _, _, event in entries if getattr(event, "type", None) == event_type]
+            return [event for _, _, event in entries]
+        if event_type is not None:
+            series_for_type = self._by_type.get(event_type)
+            return [event for _, _, event in series_for_type.between(start_time, end_time)] if series_for_type else []
+        return self._chunk_range(start_time, end_time)
+
+    def events_by_type(self, event_type: Any) -> List[Any]:
+        return self.events_between(event_type=event_type)
+
+    def events_involving(self, entity_ids: Iterable[Any]) -> List[Any]:
+        return self.events_between(involving=entity_ids)
+
+    def latest(self, count: int) -> List[Any]:
+        """The `count` most recent events, oldest first."""
+        if count <= 0:
+            return []
+        collected: List[Any] = []
+        for chunk in reversed(self._chunks):
+            collected[:0] = chunk.events[-(count - len(collected)):]
+            if len(collected) >= count:
+                break
+        return collected
+
+    @property
+    def time_span(self) -> Optional[Tuple[float, float]]:
+        """(oldest, newest) timestamp held, or None when empty."""
+        if not self._chunks:
+            return None
+        return self._chunks[0].times[0], self._chunks[-1].times[-1]
+
+    @staticmethod
+    def _merge(runs: List[List[SeriesEntry]]) -> List[SeriesEntry]:
+        if len(runs) == 1:
+            return runs[0]
+        merged: List[SeriesEntry] = []
+        last_sequence = -1
+        for entry in heapq.merge(*runs, key=lambda e: (e[0], e[1])):
+            if entry[1] != last_sequence: # An event involving several of the entities appears in several runs
+                merged.append(entry)
+                last_sequence = entry[1]
+        return merged
+
+    def _chunk_range(self, start_time: Optional[float], end_time: Optional[float]) -> List[Any]:
+        if start_time is None and end_time is None:
+            return list(self)
+        # Chunks starting exactly at start_time may be preceded by one that ends with the same timestamp
+        first = 0 if start_time is None else max(bisect_left(self._chunk_starts, start_time) - 1, 0)
+        result: List[Any] = []
+        for chunk in self._chunks[first:]:
+            if end_time is not None and chunk.times[0] > end_time:
+                break
+            lo = 0 if start_time is None else bisect_left(chunk.times, start_time)
+            hi = len(chunk.times) if end_time is None else bisect_right(chunk.times, end_time)
+            result.extend(chunk.events[lo:hi])
+        return result
+
+    # --- List-like read access, in time order ---
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in list(self._chunks):
+            yield from chunk.events
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1 and stop == self._length:
+                return self.latest(stop - start)
+            return list(self)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("event index out of range")
+        if index >= self._length // 2: # Recent events are the common case; walk from the newest chunk
+            offset = self._length
+            for chunk in reversed(self._chunks):
+                offset -= len(chunk.events)
+                if index >= offset:
+                    return chunk.events[index - offset]
+        for chunk in self._chunks:
+            if index < len(chunk.events):
+                return chunk.events[index]
+            index -= len(chunk.events)
+        raise IndexError("event index out of range")
+
+    def __repr__(self) -> str:
+        return f"TemporalEventStore(events={self._length}, chunks={len(self._chunks)}, evicted={self.evicted_count})"
@@ -0,0 +1,151 @@
+import unittest
+import os
+import random
+import sys
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML.agent_population import EmotionPopulation, MotivationPopulation, discrete_emotion_labels
+    from PiaAGI_Research_Tools.PiaCML.concrete_emotion_module import ConcreteEmotionModule
+    from PiaAGI_Research_Tools.PiaCML.concrete_motivational_system_module import ConcreteMotivationalSystemModule
+    from PiaAGI_Research_Tools.PiaCML.core_messages import EmotionalStateChangePayload
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from agent_population import EmotionPopulation, MotivationPopulation, discrete_emotion_labels
+    from concrete_emotion_module import ConcreteEmotionModule
+    from concrete_motivational_system_module import ConcreteMotivationalSystemModule
+    from core_messages import EmotionalStateChangePayload
+
+
+# The concrete module leaves some abstract methods of its base unimplemented; they are not used here
+ReferenceMotivationModule = type("ReferenceMotivationModule", (ConcreteMotivationalSystemModule,), {
+    name: (lambda self, *args, **kwargs: None) for name in getattr(ConcreteMotivationalSystemModule, "__abstractmethods__", ())})
+
+
+def _random_event(rng):
+    return {"intensity": rng.uniform(0.0, 0.05), "goal_congruence": rng.uniform(-1, 1), "goal_importance": rng.uniform(0, 1),
+            "expectedness": rng.uniform(0, 1), "novelty": rng.uniform(0, 1), "norm_alignment": rng.uniform(-1, 1),
+            "controllability": rng.uniform(0, 1), "agency": rng.choice(["self", "other"])}
+
+
+class TestEmotionPopulation(unittest.TestCase):
+
+    def test_step_matches_one_module_per_agent(self):
+        rng = random.Random(11)
+        n_agents = 12
+        reactivity = [rng.uniform(0.5, 1.5) for _ in range(n_agents)]
+        population = EmotionPopulation(n_agents, arousal_reactivity=reactivity)
+        modules = [ConcreteEmotionModule(module_id=f"Agent{i}") for i in range(n_agents)]
+        for module, r in zip(modules, reactivity):
+            module._reactivity_modifier_arousal = r
+        for _ in range(3): # Ticks
+            for _ in range(40):
+                agent, event = rng.randrange(n_agents - 1), _random_event(rng) # The last agent stays idle
+                population.queue_event(agent, event)
+                modules[agent].appraise_event(event)
+            self.assertEqual(population.queued_appraisals, 40)
+            population.step()
+            for i, module in enumerate(modules):
+                for dimension, name in enumerate(("valence", "arousal", "dominance")):
+                    self.assertAlmostEqual(population.vad[i, dimension], module.current_emotion_state[name], places=9)
+        self.assertEqual(population.queued_appraisals, 0)
+
+    def test_saturating_events_are_clamped_after_each_event(self):
+        positive = {"intensity": 0.8, "goal_congruence": 1.0, "goal_importance": 1.0, "agency": "self"}
+        negative = dict(positive, goal_congruence=-1.0)
+        per_agent = [[positive] * 30 + [negative] * 3, [negative] * 4 + [positive] * 2, [positive], []]
+        population = EmotionPopulation(len(per_agent), initial_vad=(0.7, 0.5, 0.0))
+        modules = [ConcreteEmotionModule(initial_vad_state={"valence": 0.7, "arousal": 0.5}, module_id=f"Agent{i}")
+                   for i in range(len(per_agent))]
+        for rank in range(max(len(events) for events in per_agent)): # Interleave the agents' events in the queue
+            for agent, events in enumerate(per_agent):
+                if rank < len(events):
+                    population.queue_event(agent, events[rank])
+                    modules[agent].appraise_event(events[rank])
+        population.step()
+        for i, module in enumerate(modules):
+            for dimension, name in enumerate(("valence", "arousal", "dominance")):
+                self.assertAlmostEqual(population.vad[i, dimension], module.current_emotion_state[name], places=9)
+        self.assertAlmostEqual(population.vad[2, 0], 0.95) # 0.7 + 0.8 clamped to 1.0, then decayed
+
+        view = EmotionPopulation(1, initial_vad=(0.7, 0.5, 0.0)).view(0)
+        view.appraise_event(positive)
+        self.assertEqual(view.get_emotional_state(), modules[2].current_emotion_state)
+
+    def test_labels_and_views(self):
+        module = ConcreteEmotionModule(module_id="Labels")
+        states = [(v / 10, a / 10, 0.0) for v in range(-10, 11) for a in range(0, 11)]
+        labels = discrete_emotion_labels(states)
+        for state, label in zip(states, labels):
+            self.assertEqual(label, module._map_vad_to_discrete_emotion(dict(zip(("valence", "arousal", "dominance"), state))))
+
+        population = EmotionPopulation(3)
+        view = population.view(1)
+        view.set_personality_profile({"reactivity_modifier_arousal": 2.0, "default_mood_valence": 0.4})
+        self.assertEqual(view.get_emotional_state(), {"valence": 0.2, "arousal": 0.0, "dominance": 0.0})
+        view.appraise_event({"intensity": 0.2, "goal_congruence": 0.5})
+        expected_arousal = 0.2 * (0.4 + 0.5 * 0.4 + 0.25 * 0.2) * 2.0 * 0.95
+        self.assertAlmostEqual(population.vad[1, 1], expected_arousal)
+        self.assertEqual(population.vad[0].tolist(), [0.0, 0.0, 0.0])
+        self.assertEqual(view.get_status()["reactivity_modifier_arousal"], 2.0)
+
+
+class TestMotivationPopulation(unittest.TestCase):
+
+    def test_dynamic_priorities_match_module(self):
+        rng = random.Random(5)
+        n_agents = 10
+        emotions = EmotionPopulation(n_agents, initial_vad=[[rng.uniform(-1, 1), rng.uniform(0, 1), 0.0] for _ in range(n_agents)])
+        population = MotivationPopulation(n_agents, emotions=emotions, goal_capacity=2)
+        modules = []
+        for i in range(n_agents):
+            module = ReferenceMotivationModule(module_id=f"Agent{i}")
+            if i % 4: # Agents whose module has no emotional state yet get no modifier; use a neutral population row too
+                module._last_emotional_state = EmotionalStateChangePayload(
+                    current_emotion_profile=dict(zip(("valence", "arousal", "dominance"), emotions.vad[i].tolist())))
+            else:
+                emotions.vad[i] = 0.0
+                module._last_emotional_state = EmotionalStateChangePayload(current_emotion_profile={"valence": 0.0, "arousal": 0.0})
+            modules.append(module)
+            view = population.view(i)
+            for k in range(rng.randint(0, 6)):
+                goal_type = rng.choice(["EXTRINSIC_TASK", "INTRINSIC_CURIOSITY", "INTRINSIC_COMPETENCE", "SOCIAL"])
+                args = (f"goal {k}", goal_type, rng.choice([2.0, 5.0, 8.0, 9.5]))
+                trigger = {"calculated_intensity": rng.uniform(0, 1)} if rng.random() < 0.7 else None
+                status = rng.choice(["PENDING", "ACTIVE", "ACTIVE", "ACHIEVED"])
+                self.assertEqual(view.add_goal(*args, source_trigger=trigger, initial_status=status),
+                                 module.add_goal(*args, source_trigger=trigger, initial_status=status))
+
+        top = population.step()
+        for i, module in enumerate(modules):
+            expected = module.get_active_goals(return_with_priority_scores=True)
+            actual = population.view(i).get_active_goals(return_with_priority_scores=True)
+            self.assertEqual([goal.id for _, goal in actual], [goal.id for _, goal in expected])
+            for (score, goal), (expected_score, expected_goal) in zip(actual, expected):
+                self.assertAlmostEqual(score, expected_score, places=12)
+                self.assertEqual((goal.type, goal.priority, goal.status, goal.description),
+                                 (expected_goal.type, expected_goal.priority, expected_goal.status, expected_goal.description))
+            suggested = module.suggest_highest_priority_goal()
+            self.assertEqual(f"goal_{top[i]}" if top[i] >= 0 else None, suggested.id if suggested else None)
+
+    def test_bulk_goals_and_view_updates(self):
+        population = MotivationPopulation(4, goal_capacity=1)
+        slots = population.add_goals([2, 0, 2, 2], "EXTRINSIC_TASK", [1.0, 2.0, 3.0, 4.0], status="ACTIVE")
+        self.assertEqual(slots.tolist(), [0, 0, 1, 2])
+        self.assertEqual(population.goal_counts.tolist(), [1, 0, 3, 0])
+        self.assertEqual(population.step().tolist(), [0, -1, 2, -1])
+
+        view = population.view(2)
+        self.assertTrue(view.update_goal_priority("goal_0", 9.0))
+        self.assertTrue(view.update_goal_status("goal_2", "ACHIEVED"))
+        self.assertFalse(view.update_goal_status("goal_3", "ACHIEVED"))
+        self.assertIsNone(view.get_goal("goal_7"))
+        self.assertEqual(view.suggest_highest_priority_goal().id, "goal_0")
+        self.assertEqual(view.get_goal("goal_2").status, "ACHIEVED")
+        self.assertEqual(view.get_module_status()["goals_by_status"], {"ACTIVE": 2, "ACHIEVED": 1})
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,103 @@
+import unittest
+import os
+import random
+import sys
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML.appraisal_batch import APPRAISAL_FEATURES, appraisal_feature_row, vad_deltas
+    from PiaAGI_Research_Tools.PiaCML.concrete_emotion_module import ConcreteEmotionModule
+    from PiaAGI_Research_Tools.PiaCML.message_bus import MessageBus
+    from PiaAGI_Research_Tools.PiaCML.core_messages import GenericMessage, PerceptDataPayload
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from appraisal_batch import APPRAISAL_FEATURES, appraisal_feature_row, vad_deltas
+    from concrete_emotion_module import ConcreteEmotionModule
+    from message_bus import MessageBus
+    from core_messages import GenericMessage, PerceptDataPayload
+
+
+def _random_event(rng):
+    event = {"intensity": rng.uniform(0.0, 0.3), "goal_congruence": rng.uniform(-1, 1),
+             "goal_importance": rng.uniform(0, 1), "expectedness": rng.uniform(0, 1), "novelty": rng.uniform(0, 1),
+             "norm_alignment": rng.uniform(-1, 1), "controllability": rng.uniform(0, 1),
+             "agency": rng.choice(["self", "other", "environment"])}
+    for name in rng.sample(sorted(event), 3): # appraise_event's defaults apply to missing entries
+        del event[name]
+    return event
+
+
+class TestBatchedAppraisal(unittest.TestCase):
+
+    def test_batch_matches_sequential_appraisal(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            initial = {"valence": rng.uniform(-0.3, 0.3), "arousal": rng.uniform(0, 0.2), "dominance": rng.uniform(-0.3, 0.3)}
+            sequential = ConcreteEmotionModule(initial_vad_state=initial, module_id="Seq")
+            batched = ConcreteEmotionModule(initial_vad_state=initial, module_id="Batch")
+            for module in (sequential, batched):
+                module._reactivity_modifier_arousal = 0.8
+            events = [_random_event(rng) for _ in range(rng.randint(1, 12))]
+            for event in events:
+                sequential.appraise_event(event)
+            state = batched.appraise_events(events)
+            for dimension in ("valence", "arousal", "dominance"):
+                self.assertAlmostEqual(state[dimension], sequential.current_emotion_state[dimension], places=9)
+            self.assertEqual(batched.current_discrete_emotion_label, sequential.current_discrete_emotion_label)
+
+    def test_saturating_batch_clamps_after_each_event(self):
+        positive = {"intensity": 0.8, "goal_congruence": 1.0, "goal_importance": 1.0}
+        negative = dict(positive, goal_congruence=-1.0)
+        rng = random.Random(3)
+        batches = [[positive] * 100 + [negative] * 3, [negative] * 5 + [positive] * 70 + [negative] * 2]
+        batches += [[dict(_random_event(rng), intensity=rng.uniform(0.5, 1.0)) for _ in range(rng.randint(1, 150))]
+                    for _ in range(10)]
+        for events in batches:
+            sequential = ConcreteEmotionModule(module_id="Seq")
+            batched = ConcreteEmotionModule(module_id="Batch")
+            for event in events:
+                sequential.appraise_event(event)
+            state = batched.appraise_events(events)
+            for dimension in ("valence", "arousal", "dominance"):
+                self.assertAlmostEqual(state[dimension], sequential.current_emotion_state[dimension], places=9)
+            self.assertEqual(batched.current_discrete_emotion_label, sequential.current_discrete_emotion_label)
+        module = ConcreteEmotionModule(module_id="Saturated")
+        self.assertAlmostEqual(module.appraise_events(batches[0])["valence"], -0.95) # Not +1.0, as clamping once gave
+        self.assertEqual(module.current_discrete_emotion_label, "Anger_Rage")
+
+    def test_feature_rows_and_empty_batch(self):
+        row = appraisal_feature_row({"intensity": 0.4, "agency": "self"})
+        self.assertEqual(len(row), len(APPRAISAL_FEATURES))
+        self.assertEqual(row, [0.4, 0.0, 0.5, 0.5, 0.0, 0.0, 0.5, 1.0])
+        self.assertEqual(vad_deltas([]).shape, (0, 3))
+        module = ConcreteEmotionModule(module_id="Empty")
+        self.assertEqual(module.appraise_events([]), {"valence": 0.0, "arousal": 0.0, "dominance": 0.0})
+
+    def test_queued_percepts_publish_one_state_change_per_flush(self):
+        bus = MessageBus()
+        module = ConcreteEmotionModule(message_bus=bus, module_id="BatchedEmotion", batch_appraisals=True)
+        published = []
+        bus.subscribe("Listener", "EmotionalStateChange", published.append)
+        last_message = None
+        for i in range(300):
+            content = {"social_feedback_valence": 0.9} if i % 2 else {"threat_level": 0.8}
+            last_message = GenericMessage(source_module_id="Perception", message_type="PerceptData",
+                                          payload=PerceptDataPayload(percept_id=f"p{i}", modality="social", content=content,
+                                                                     source_timestamp=None))
+            bus.publish(last_message)
+        self.assertEqual(published, [])
+        self.assertEqual(module.get_status()["pending_appraisals"], 300)
+
+        state = module.flush_appraisals()
+        self.assertEqual(len(published), 1)
+        self.assertEqual(published[0].payload.triggering_event_id, last_message.message_id)
+        self.assertEqual(published[0].payload.current_emotion_profile, state)
+        self.assertEqual(module.get_status()["pending_appraisals"], 0)
+        module.flush_appraisals()
+        self.assertEqual(len(published), 1) # Nothing queued, nothing published
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,102 @@
+import unittest
+import os
+import random
+import sys
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML.attention_filters import InformationIndex, compile_filter_pipeline
+    from PiaAGI_Research_Tools.PiaCML.concrete_attention_module import ConcreteAttentionModule
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from attention_filters import InformationIndex, compile_filter_pipeline
+    from concrete_attention_module import ConcreteAttentionModule
+
+
+WORDS = ["apple", "pineapple", "banana", "kiwi", "red", "green"]
+
+
+def _scan(stream, target, filters):
+    """filter_information's rules, one item and one filter at a time."""
+    result = []
+    for item in stream:
+        if target:
+            tags, content = item.get('tags'), item.get('content')
+            if not ((isinstance(tags, list) and target in tags) or (isinstance(content, str) and target in content)
+                    or item.get('id') == target):
+                continue
+        passes = True
+        for f in filters:
+            if f['type'] == 'value_equals':
+                passes = passes and item.get(f['key']) == f['value']
+            elif f['type'] == 'value_gt':
+                passes = passes and item.get(f['key'], 0) > f['threshold']
+            elif f['type'] == 'tag_present':
+                passes = passes and f['tag'] in item.get('tags', [])
+        if passes:
+            result.append(item)
+    return result
+
+
+class TestAttentionFilterPipeline(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(3)
+        self.stream = []
+        for i in range(300):
+            item = {'id': rng.choice([f"p{i}", "apple"]), 'kind': rng.choice("ab"), 'score': rng.randint(0, 5),
+                    'salience': rng.random()}
+            if rng.random() < 0.8:
+                item['content'] = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 4))) + rng.choice(["", "."])
+            if rng.random() < 0.7:
+                item['tags'] = rng.sample(WORDS, rng.randint(0, 3))
+            self.stream.append(item)
+        self.filters = [{'type': 'value_gt', 'key': 'score', 'threshold': 1}, {'type': 'tag_present', 'tag': 'red'},
+                        {'type': 'value_equals', 'key': 'kind', 'value': 'a'}]
+        self.attention = ConcreteAttentionModule()
+
+    def test_compiled_and_indexed_filtering_match_scan(self):
+        index = InformationIndex(self.stream)
+        for target in [None, "apple", "app", "le.", "red", "p7", "zzz"]:
+            for n_filters in range(len(self.filters) + 1):
+                self.attention.set_active_filters(self.filters[:n_filters])
+                expected = _scan(self.stream, target, self.filters[:n_filters])
+                self.assertEqual(self.attention.filter_information(self.stream, target), expected)
+                self.assertEqual(self.attention.filter_information(index, target), expected)
+
+    def test_index_follows_appended_items(self):
+        index = InformationIndex(self.stream[:100])
+        self.assertEqual(self.attention.filter_information(index, "pineapple"), _scan(self.stream[:100], "pineapple", []))
+        index.extend(self.stream[100:])
+        self.assertEqual(len(index), len(self.stream))
+        self.assertEqual(self.attention.filter_information(index, "pineapple"), _scan(self.stream, "pineapple", []))
+
+    def test_top_k_salience(self):
+        self.attention.set_active_filters(self.filters[:1])
+        self.attention.set_attention_focus("kiwi", "concept", 0.6)
+        expected = sorted(_scan(self.stream, "kiwi", self.filters[:1]), key=lambda item: -item['salience'])
+        self.assertEqual(self.attention.select_salient_information(self.stream, 5), expected[:5])
+        self.assertEqual(self.attention.select_salient_information(InformationIndex(self.stream), 5), expected[:5])
+        by_score = self.attention.select_salient_information(self.stream, 3, salience=lambda item: item['score'])
+        self.assertEqual([item['score'] for item in by_score], [5, 5, 5])
+        self.assertEqual(self.attention.select_salient_information(self.stream, 0), [])
+
+    def test_unknown_filter_types_and_targets_select_nothing(self):
+        self.assertEqual(compile_filter_pipeline("apple", [{'type': 'sound_louder_than'}])({'id': 'apple'}), False)
+        self.assertEqual(compile_filter_pipeline(42, [])({'id': 42}), False)
+        self.assertEqual(compile_filter_pipeline(None, [{}])({}), True)
+        self.assertEqual(self.attention.filter_information(InformationIndex(self.stream), 42), [])
+        reported = []
+        compile_filter_pipeline(None, [{'type': 'sound_louder_than'}], on_unknown_filter=reported.append)
+        self.assertEqual(reported, ['sound_louder_than'])
+        self.attention.set_active_filters([{'type': 'sound_louder_than'}])
+        for _ in range(3):
+            self.assertEqual(self.attention.filter_information(self.stream, "apple"), [])
+        logged = [line for line in self.attention._log if "'sound_louder_than'" in line]
+        self.assertEqual(len(logged), 1) # Reported once, when the pipeline is compiled
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,71 @@
+import unittest
+import os
+import sys
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML.ethical_rule_matcher import KeywordAutomaton
+    from PiaAGI_Research_Tools.PiaCML.concrete_self_model_module import ConcreteSelfModelModule, EthicalRule
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from ethical_rule_matcher import KeywordAutomaton
+    from concrete_self_model_module import ConcreteSelfModelModule, EthicalRule
+
+
+class TestKeywordAutomaton(unittest.TestCase):
+
+    def test_finds_every_keyword_like_substring_search(self):
+        keywords = ["harm", "harmful", "arm", "rmfu", "user privacy", "privacy", "", "zzz", "a"]
+        automaton = KeywordAutomaton(keywords)
+        for text in ["this is harmful to user privacy", "charm", "", "zz", "aaa harm"]:
+            found = {automaton.keywords[i] for i in automaton.find(text)}
+            self.assertEqual(found, {keyword for keyword in keywords if keyword in text}, text)
+
+
+class TestCompiledEthicalEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.self_model = ConcreteSelfModelModule(message_bus=None, module_id="TestSMEthics")
+        self.self_model.ethical_framework.rules = [
+            EthicalRule(rule_id="R_privacy", principle="User Privacy", description="Do not share user data.",
+                        priority_level="critical", applicability_contexts=["user_data_sharing", "PII_access"],
+                        implication="impermissible"),
+            EthicalRule(rule_id="R_benefit", principle="Beneficence", description="Benefit users.",
+                        priority_level="low", implication="encouraged"),
+        ]
+        self.action = {"action_type": "share", "description": "Share User Privacy data for beneficence."}
+
+    def test_context_keywords_and_context_string_select_rules(self):
+        global_only = self.self_model.perform_ethical_evaluation(self.action)
+        self.assertEqual(global_only["outcome"], "PERMISSIBLE")
+        self.assertEqual(global_only["relevant_rules"], ["R_benefit"])
+
+        by_keyword = self.self_model.perform_ethical_evaluation(self.action, context={"keywords": ["user_data_sharing"]})
+        self.assertEqual(by_keyword["outcome"], "IMPERMISSIBLE")
+        self.assertEqual(by_keyword["relevant_rules"], ["R_privacy", "R_benefit"])
+
+        by_string = self.self_model.perform_ethical_evaluation(self.action, context={"note": "needs pii_access"})
+        self.assertIn("Applicability context 'PII_access' matched active context.",
+                      by_string["detailed_relevant_rules"][0]["match_source"])
+
+    def test_repeated_proposals_are_memoized_until_rules_change(self):
+        context = {"keywords": ["user_data_sharing"]}
+        first = self.self_model.perform_ethical_evaluation(self.action, context)
+        first["reasoning"].clear() # Callers get their own copy
+        second = self.self_model.perform_ethical_evaluation(self.action, context)
+        self.assertTrue(second["reasoning"])
+        self.assertEqual(len(self.self_model._ethical_evaluation_cache), 1)
+
+        self.self_model.ethical_framework.rules[0].implication = "requires_caution"
+        self.self_model.ethical_framework.invalidate() # In-place edits to a rule must be announced
+        self.assertEqual(self.self_model.perform_ethical_evaluation(self.action, context)["outcome"], "REQUIRES_REVIEW")
+
+        self.self_model.ethical_framework.rules.append(
+            EthicalRule(rule_id="R_data", principle="data", description="", implication="impermissible"))
+        self.assertEqual(self.self_model.perform_ethical_evaluation(self.action)["outcome"], "IMPERMISSIBLE")
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
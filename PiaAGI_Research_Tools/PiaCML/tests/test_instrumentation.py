@@ -0,0 +1,150 @@
+import unittest
+import asyncio
+import io
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML import MessageBus, GenericMessage
+    from PiaAGI_Research_Tools.PiaCML.instrumentation import (
+        BusInstrumentation, LatencyHistogram, DROP_NO_SUBSCRIBERS, DROP_SUSPENDED
+    )
+    from PiaAGI_Research_Tools.PiaCML.message_bus import MAX_CALLBACK_ERRORS
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from message_bus import MessageBus, MAX_CALLBACK_ERRORS
+    from core_messages import GenericMessage
+    from instrumentation import BusInstrumentation, LatencyHistogram, DROP_NO_SUBSCRIBERS, DROP_SUSPENDED
+
+
+def _message(message_type, metadata=None):
+    return GenericMessage(source_module_id="test_source", message_type=message_type, payload={"data": 1}, metadata=metadata or {})
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_buckets_and_quantiles(self):
+        histogram = LatencyHistogram(buckets=(0.001, 0.01, 0.1))
+        for seconds in [0.0005] * 50 + [0.005] * 45 + [0.05] * 4 + [2.0]:
+            histogram.observe(seconds)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.cumulative_counts(), [("0.001", 50), ("0.01", 95), ("0.1", 99), ("+Inf", 100)])
+        self.assertLessEqual(histogram.quantile(0.5), 0.001)
+        self.assertTrue(0.001 < histogram.quantile(0.95) <= 0.01)
+        self.assertEqual(histogram.quantile(1.0), 2.0) # Clamped to the observed maximum
+        self.assertIsNone(LatencyHistogram().quantile(0.5))
+
+
+class TestBusInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = MessageBus()
+        self.metrics = self.bus.enable_instrumentation()
+
+    def test_disabled_by_default(self):
+        bus = MessageBus()
+        self.assertIsNone(bus.instrumentation)
+        bus.subscribe("m", "TypeA", lambda message: None)
+        bus.publish(_message("TypeA")) # No recorder involved
+        self.assertIs(bus.enable_instrumentation(), bus.instrumentation)
+        self.assertIsNotNone(bus.disable_instrumentation())
+        self.assertIsNone(bus.instrumentation)
+
+    def test_handler_latency_per_module_and_type(self):
+        self.bus.subscribe("fast", "TypeA", lambda message: None)
+        self.bus.subscribe("slow", "TypeA", lambda message: time.sleep(0.002))
+        for _ in range(3):
+            self.bus.publish(_message("TypeA"))
+        handlers = {(h["module_id"], h["message_type"]): h for h in self.metrics.snapshot()["handlers"]}
+        self.assertEqual(handlers[("fast", "TypeA")]["count"], 3)
+        self.assertGreaterEqual(handlers[("slow", "TypeA")]["min_ms"], 2.0)
+        self.assertGreater(handlers[("slow", "TypeA")]["p50_ms"], handlers[("fast", "TypeA")]["p50_ms"])
+        self.assertEqual(self.metrics.snapshot()["messages"]["TypeA"]["delivered"], 6)
+
+    def test_drops_filters_errors_and_nesting(self):
+        def failing(message):
+            raise ValueError("boom")
+
+        def republish(message):
+            self.bus.publish(_message("Inner"))
+
+        self.bus.subscribe("failing", "TypeA", failing)
+        self.bus.subscribe("meta", "TypeA", lambda message: None, metadata_filter={"k": "v"})
+        self.bus.subscribe("outer", "Outer", republish)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(MAX_CALLBACK_ERRORS + 2):
+                self.bus.publish(_message("TypeA"))
+            self.bus.publish(_message("Unheard"))
+            self.bus.publish(_message("Outer"))
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["messages"]["TypeA"]["filtered"], MAX_CALLBACK_ERRORS + 2)
+        self.assertEqual(snapshot["messages"]["TypeA"]["dropped"], {DROP_SUSPENDED: 1})
+        self.assertEqual(snapshot["messages"]["Unheard"]["dropped"], {DROP_NO_SUBSCRIBERS: 1})
+        self.assertEqual(snapshot["messages"]["Inner"]["dropped"], {DROP_NO_SUBSCRIBERS: 1})
+        failing_stats = [h for h in snapshot["handlers"] if h["module_id"] == "failing"][0]
+        self.assertEqual(failing_stats["errors"], MAX_CALLBACK_ERRORS + 1)
+        self.assertEqual(snapshot["queue"]["max_publish_depth"], 2)
+        self.assertEqual(snapshot["queue"]["publish_depth"], 0)
+
+    def test_async_in_flight(self):
+        async def slow(message):
+            await asyncio.sleep(0.005)
+
+        async def run_test():
+            self.bus.subscribe("async_mod", "AsyncType", slow)
+            for _ in range(3):
+                self.bus.publish(_message("AsyncType"), dispatch_mode="asynchronous")
+            self.assertEqual(self.metrics.async_in_flight, 3)
+            await asyncio.sleep(0.05)
+        asyncio.run(run_test())
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["queue"], {"async_in_flight": 0, "max_async_in_flight": 3,
+                                             "publish_depth": 0, "max_publish_depth": 1})
+        self.assertEqual(snapshot["handlers"][0]["count"], 3)
+
+    def test_profile_tick(self):
+        for mode in ("cprofile", "sampling"):
+            metrics = BusInstrumentation(profiler=mode, sampling_interval=0.0005)
+            with metrics.profile_tick("cycle"):
+                deadline = time.perf_counter() + 0.02
+                while time.perf_counter() < deadline:
+                    sum(range(100))
+            snapshot = metrics.snapshot()
+            self.assertEqual(snapshot["ticks"]["count"], 1)
+            self.assertEqual(snapshot["ticks"]["by_label"], {"cycle": 1})
+            self.assertEqual(snapshot["profile"]["mode"], mode)
+            self.assertTrue(snapshot["profile"]["top_functions"])
+        with self.assertRaises(ValueError):
+            BusInstrumentation(profiler="perf")
+
+    def test_exports(self):
+        self.bus.subscribe("mod \"x\"", "TypeA", lambda message: None)
+        self.bus.publish(_message("TypeA"))
+        self.assertEqual(json.loads(self.metrics.to_json())["messages"]["TypeA"]["published"], 1)
+
+        text = self.metrics.to_prometheus()
+        self.assertIn('# TYPE piacml_handler_duration_seconds histogram', text)
+        self.assertIn('piacml_handler_duration_seconds_bucket{module="mod \\"x\\"",message_type="TypeA",le="+Inf"} 1', text)
+        self.assertIn('piacml_messages_published_total{message_type="TypeA"} 1', text)
+
+        events = self.metrics.to_log_events(simulation_run_id="run1", experiment_id="exp1", agent_id="agent1")
+        self.assertEqual([e["event_type"] for e in events], ["CML_HANDLER_LATENCY_SUMMARY", "CML_BUS_METRICS"])
+        required = {"timestamp", "simulation_run_id", "experiment_id", "agent_id",
+                    "source_component_id", "log_level", "event_type", "event_data"}
+        self.assertTrue(all(required <= set(e) for e in events))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "metrics.jsonl")
+            self.assertEqual(self.metrics.write_log_events(path, simulation_run_id="run1"), 2)
+            with open(path) as f:
+                self.assertEqual(len(f.readlines()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
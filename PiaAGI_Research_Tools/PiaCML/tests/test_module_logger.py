@@ -0,0 +1,132 @@
+import unittest
+import json
+import logging
+import os
+import sys
+import tempfile
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML import module_logger
+    from PiaAGI_Research_Tools.PiaCML.module_logger import (
+        ModuleLog, ModuleLoggingMixin, JsonlLogSink, set_module_log_level, flush_module_logs
+    )
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import module_logger
+    from module_logger import ModuleLog, ModuleLoggingMixin, JsonlLogSink, set_module_log_level, flush_module_logs
+
+
+class CountingArg:
+    """Counts how often it is rendered, to check that records below the level are not formatted."""
+
+    def __init__(self):
+        self.renders = 0
+
+    def __str__(self):
+        self.renders += 1
+        return "counted"
+
+
+class DummyModule(ModuleLoggingMixin):
+    def __init__(self, module_id):
+        self._module_id = module_id
+        self._log_message("DummyModule '%s' initialized.", module_id)
+
+
+class TestModuleLog(unittest.TestCase):
+
+    def tearDown(self):
+        set_module_log_level("DummyModule", None)
+        set_module_log_level("dummy_2", None)
+
+    def test_ring_buffer_keeps_latest_records(self):
+        log = ModuleLog("mod", capacity=3)
+        for i in range(5):
+            log.info("entry %d", i)
+        self.assertEqual(len(log), 3)
+        self.assertEqual(log.dropped, 2)
+        self.assertTrue(log[0].endswith("[mod]: entry 2"))
+        self.assertTrue(log[-1].endswith("[mod]: entry 4"))
+        self.assertEqual([line[-7:] for line in log[1:]], ["entry 3", "entry 4"])
+
+    def test_messages_are_formatted_when_logged(self):
+        log = ModuleLog("mod", level=logging.INFO)
+        arg = CountingArg()
+        log.debug("skipped %s", arg) # Below the level: never formatted
+        self.assertEqual(arg.renders, 0)
+        items = ["a"]
+        log.info("items %s", items)
+        items.append("b")
+        self.assertTrue(log[-1].endswith("[mod]: items ['a']"))
+        self.assertEqual(log.records()[-1][1:], (logging.INFO, "items ['a']"))
+        log.info("%d items", "not a number") # Bad arguments must not break logging
+        self.assertIn("%d items ('not a number',)", log[-1])
+
+    def test_timestamp_formats_match_the_old_lines(self):
+        patterns = {"iso": r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+\+00:00 \[mod\]: entry$",
+                    "epoch": r"\d+\.\d{2} \[mod\]: entry$",
+                    "utc": r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} \[mod\]: entry$"}
+        for timestamp_format, pattern in patterns.items():
+            log = ModuleLog("mod", timestamp_format=timestamp_format)
+            log.info("entry")
+            self.assertRegex(log[-1], pattern)
+        with self.assertRaises(ValueError):
+            ModuleLog("mod", timestamp_format="local")
+
+        class EpochModule(DummyModule):
+            _log_timestamp_format = "epoch"
+
+        self.assertRegex(EpochModule("dummy_1")._log[0], r"^\d+\.\d{2} \[dummy_1\]: ")
+
+    def test_per_module_levels(self):
+        first, second = DummyModule("dummy_1"), DummyModule("dummy_2")
+        set_module_log_level("DummyModule", "INFO")
+        set_module_log_level("dummy_2", logging.WARNING) # Module id wins over class name
+        for module in (first, second):
+            module._log_message("detail %s", 1, level=logging.DEBUG)
+            module._log_message("info")
+            module._log_message("warning", level=logging.WARNING)
+        self.assertEqual([line.split(": ", 1)[1] for line in first._log], ["DummyModule 'dummy_1' initialized.", "info", "warning"])
+        self.assertEqual([line.split(": ", 1)[1] for line in second._log], ["DummyModule 'dummy_2' initialized.", "warning"])
+        with self.assertRaises(ValueError):
+            set_module_log_level("DummyModule", "LOUD")
+
+    def test_mixin_reads_like_a_list(self):
+        module = DummyModule("dummy_1")
+        self.assertIsInstance(module._log, ModuleLog)
+        self.assertIn("initialized", module._log[-1])
+        module._log = [] # Tests and callers reset the log this way
+        self.assertIsInstance(module._log, ModuleLog)
+        self.assertEqual(len(module._log), 0)
+        module._log_message("after reset")
+        self.assertTrue(any("after reset" in line for line in module._log))
+        module._log.clear()
+        self.assertFalse(module._log)
+
+    def test_sink_receives_evicted_and_flushed_records(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "module_logs.jsonl")
+            with JsonlLogSink(path, simulation_run_id="run1", agent_id="agent1", buffer_size=2) as sink:
+                log = ModuleLog("mod", capacity=2, sink=sink)
+                for i in range(5):
+                    log.info("entry %d", i)
+                self.assertEqual(log.dropped, 0)
+                self.assertEqual(flush_module_logs(), 2) # The two records still buffered
+                self.assertEqual(log.flush(), 0) # Nothing is written twice
+                self.assertEqual(len(log), 2) # Flushing keeps records in memory
+            with open(path) as f:
+                entries = [json.loads(line) for line in f]
+        self.assertEqual([e["event_data"]["message"] for e in entries], [f"entry {i}" for i in range(5)])
+        required = {"timestamp", "simulation_run_id", "experiment_id", "agent_id",
+                    "source_component_id", "log_level", "event_type", "event_data"}
+        self.assertTrue(all(required <= set(e) for e in entries))
+        self.assertEqual(entries[0]["event_type"], module_logger.MODULE_LOG_EVENT_TYPE)
+        self.assertEqual(entries[0]["source_component_id"], "mod")
+        self.assertEqual(entries[0]["log_level"], "INFO")
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,106 @@
+import unittest
+import os
+import random
+import sys
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML.plan_cache import (CachedPlan, LTMResultStore, PendingPlanQueries, PlanCache, normalize_goal,
+                                                         LTM_PLAN_QUERY_TYPE)
+    from PiaAGI_Research_Tools.PiaCML.core_messages import LTMQueryResultPayload, MemoryItem
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from plan_cache import CachedPlan, LTMResultStore, PendingPlanQueries, PlanCache, normalize_goal, LTM_PLAN_QUERY_TYPE
+    from core_messages import LTMQueryResultPayload, MemoryItem
+
+
+def _plan_result(query_id, content, query_type="get_action_plan_for_goal"):
+    return LTMQueryResultPayload(query_id=query_id, results=[MemoryItem(item_id="plan", content=[])], success_status=True,
+                                 metadata={"query_type": query_type, "original_query_content": content})
+
+
+class TestPlanCache(unittest.TestCase):
+
+    def test_lru_eviction_and_stats(self):
+        cache = PlanCache(capacity=2)
+        keys = [(normalize_goal(f"  Goal {i} "), ("ctx",)) for i in range(3)]
+        self.assertEqual(keys[0][0], "goal 0")
+        cache.put(keys[0], CachedPlan("internal_direct_plan", "internal_generation", 0.7))
+        cache.put(keys[1], CachedPlan("internal_cautious_plan", "internal_generation", 0.6))
+        self.assertIsNotNone(cache.get(keys[0])) # keys[1] is now least recently used
+        cache.put(keys[2], CachedPlan("internal_direct_plan", "internal_generation", 0.7))
+        self.assertNotIn(keys[1], cache)
+        self.assertIsNone(cache.get(keys[1]))
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["hits"], stats["misses"], stats["evictions"]), (2, 1, 1, 1))
+
+    def test_plans_that_keep_failing_are_dropped(self):
+        cache = PlanCache(min_success_rate=0.5, min_outcomes=3)
+        key = ("explore cave", ("ctx",))
+        cache.put(key, CachedPlan("internal_exploratory_plan", "internal_generation", 0.3))
+        cache.record_outcome(key, succeeded=True)
+        cache.record_outcome(key, succeeded=False)
+        self.assertIn(key, cache)
+        cache.record_outcome(key, succeeded=False)
+        self.assertNotIn(key, cache)
+        self.assertAlmostEqual(cache.stats()["plan_success_rate"], 1 / 3)
+
+
+class TestLTMPlanIndexes(unittest.TestCase):
+
+    def test_plan_results_are_found_by_query_content(self):
+        store = LTMResultStore({"q_other": _plan_result("q_other", "explore cave", query_type="semantic")})
+        store["q1"] = _plan_result("q1", "explore cave and map it")
+        store["q2"] = _plan_result("q2", "explore cave")
+        self.assertEqual(store.find_plan_query("explore cave"), "q1") # First match in dict order, not the exact one
+        self.assertEqual(store.find_plan_query("explore cave and map it"), "q1")
+        self.assertEqual(store.find_plan_query("map it"), "q1") # Contained in the query content
+        self.assertIsNone(store.find_plan_query("climb"))
+
+        version = store.version("q2")
+        store["q2"] = _plan_result("q2", "explore cave")
+        self.assertGreater(store.version("q2"), version)
+        del store[next(iter(store))] # FIFO eviction, as the module's result handler does
+        store.pop("q2")
+        self.assertEqual(list(store), ["q1"])
+        self.assertEqual(store.find_plan_query("explore cave"), "q1")
+
+    def test_found_plan_follows_dict_order_like_a_scan(self):
+        store = LTMResultStore()
+        store["q0"] = _plan_result("q0", "explore cave A")
+        store["q1"] = _plan_result("q1", "explore cave B")
+        store["q0"] = _plan_result("q0", "explore cave C") # Replaced in place: still first
+        self.assertEqual(store.find_plan_query("explore cave"), "q0")
+        store["q0"] = _plan_result("q0", "explore cave A", query_type="semantic")
+        self.assertEqual(store.find_plan_query("explore cave"), "q1")
+        store["q0"] = _plan_result("q0", "explore cave A") # A plan again, at its old position
+        self.assertEqual(store.find_plan_query("explore cave"), "q0")
+
+        rng = random.Random(5)
+        contents = ["fix the door", "fix the door now", "fix", "open the door", "door"]
+        for _ in range(300):
+            query_id = f"q{rng.randrange(8)}"
+            if rng.random() < 0.2:
+                store.pop(query_id, None)
+            else:
+                store[query_id] = _plan_result(query_id, rng.choice(contents), rng.choice([LTM_PLAN_QUERY_TYPE, "semantic"]))
+            goal = rng.choice(contents)
+            scanned = next((q for q, r in store.items() if r.metadata.get("query_type") == LTM_PLAN_QUERY_TYPE
+                            and goal in r.metadata.get("original_query_content", "")), None)
+            self.assertEqual(store.find_plan_query(goal), scanned)
+
+    def test_pending_queries_map_back_to_goals(self):
+        pending = PendingPlanQueries({"g1": "q1"})
+        pending["g2"] = "q2"
+        pending["g1"] = "q3"
+        self.assertIsNone(pending.goal_for_query("q1"))
+        self.assertEqual(pending.goal_for_query("q3"), "g1")
+        del pending["g2"]
+        self.assertIsNone(pending.goal_for_query("q2"))
+        self.assertEqual(dict(pending), {"g1": "q3"})
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
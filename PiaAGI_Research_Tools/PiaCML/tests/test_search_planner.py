@@ -0,0 +1,213 @@
+import unittest
+import os
+import random
+import sys
+from collections import deque
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML.search_planner import (
+        AStarPlanner, GRID_MOVES, HMaxHeuristic, HTNPlanner, Operator, PlanningDomain, PlanningProblem,
+        grid_move_operators, location_graph_operators, manhattan_heuristic, recipe_operators, validate_plan
+    )
+    from PiaAGI_Research_Tools.PiaCML.symbolic_state import SymbolicStateBuilder
+    from PiaAGI_Research_Tools.PiaCML.concrete_world_model import ConcreteWorldModel, WorldEntity
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from search_planner import (
+        AStarPlanner, GRID_MOVES, HMaxHeuristic, HTNPlanner, Operator, PlanningDomain, PlanningProblem,
+        grid_move_operators, location_graph_operators, manhattan_heuristic, recipe_operators, validate_plan
+    )
+    from symbolic_state import SymbolicStateBuilder
+    from concrete_world_model import ConcreteWorldModel, WorldEntity
+
+
+# The concrete model leaves some abstract methods of its base unimplemented; they are not used here
+ReferenceWorldModel = type("ReferenceWorldModel", (ConcreteWorldModel,), {
+    name: (lambda self, *args, **kwargs: None) for name in getattr(ConcreteWorldModel, "__abstractmethods__", ())})
+
+
+def _bfs_distance(width, height, blocked, start, goal):
+    distances, queue = {start: 0}, deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell == goal:
+            return distances[cell]
+        for dx, dy in GRID_MOVES.values():
+            nxt = (cell[0] + dx, cell[1] + dy)
+            if 0 <= nxt[0] < width and 0 <= nxt[1] < height and nxt not in blocked and nxt not in distances:
+                distances[nxt] = distances[cell] + 1
+                queue.append(nxt)
+    return None
+
+
+RECIPES = {
+    "wooden_plank": {"inputs": {"wood": 1}},
+    "stick": {"inputs": {"wooden_plank": 1}, "station_required": "workbench"},
+    "refined_stone": {"inputs": {"stone": 2}, "station_required": "workbench"},
+    "basic_axe": {"inputs": {"stick": 2, "refined_stone": 1}, "station_required": "workbench", "tool_required": "hammer"},
+}
+SOURCES = {"wood": ("forest", "gather_resource", "resource_type"), "stone": ("mine", "gather_resource", "resource_type"),
+           "hammer": ("workshop", "pickup_tool", "tool_name")}
+
+
+def _crafting_operators():
+    operators = recipe_operators("agent", RECIPES, {"workbench": ["workshop"]})
+    operators += location_graph_operators("agent", {"forest": ["workshop", "mine"], "workshop": ["forest", "mine"],
+                                                    "mine": ["forest", "workshop"]},
+                                          action_type="navigate", parameter="target_location_id")
+    for item, (location, action_type, parameter) in SOURCES.items():
+        operators.append(Operator(action_type, ("agent", item), {("at", "agent", location)}, {("has", "agent", item)},
+                                  parameters={parameter: item}))
+    return operators
+
+
+class TestAStarPlanner(unittest.TestCase):
+
+    def test_grid_plans_are_optimal_and_valid(self):
+        rng = random.Random(0)
+        for trial in range(15):
+            blocked = {(rng.randrange(20), rng.randrange(20)) for _ in range(100)} - {(0, 0), (19, 19)}
+            operators = grid_move_operators("agent", 20, 20, blocked)
+            heuristic = [manhattan_heuristic("agent"), HMaxHeuristic(operators), None][trial % 3]
+            problem = PlanningProblem(frozenset({("cell", "agent", (0, 0))}), operators,
+                                      goal={("cell", "agent", (19, 19))}, heuristic=heuristic)
+            result = AStarPlanner().plan(problem)
+            expected = _bfs_distance(20, 20, blocked, (0, 0), (19, 19))
+            if expected is None:
+                self.assertFalse(result.complete)
+                continue
+            self.assertTrue(result.complete and result.optimal)
+            self.assertEqual(result.cost, expected)
+            self.assertTrue(validate_plan(result.plan, problem.initial_state, problem.goal))
+
+    def test_anytime_search_resumes_and_reuses_plan_after_moving(self):
+        blocked = {(x, y) for x in range(5, 35) for y in (10, 20, 30)}
+        operators = grid_move_operators("agent", 40, 40, blocked)
+        problem = PlanningProblem({("cell", "agent", (0, 0))}, operators, goal={("cell", "agent", (39, 39))},
+                                  heuristic=manhattan_heuristic("agent"), key="goal_1")
+        planner = AStarPlanner(weight=3.0)
+        partial = planner.plan(problem, max_expansions=10)
+        self.assertFalse(partial.complete)
+        self.assertTrue(partial.plan) # Heads toward the goal
+        result = partial
+        for _ in range(1000):
+            result = planner.plan(problem, max_expansions=200)
+            if result.exhausted:
+                break
+        self.assertTrue(result.reused and result.optimal)
+        self.assertEqual(result.cost, _bfs_distance(40, 40, blocked, (0, 0), (39, 39)))
+
+        state = problem.initial_state
+        for operator in result.plan[:5]:
+            state = operator.apply(state)
+        moved = planner.plan(PlanningProblem(state, operators, goal=problem.goal, heuristic=problem.heuristic,
+                                             key="goal_1"), max_expansions=0)
+        self.assertTrue(moved.complete and moved.reused)
+        self.assertEqual(moved.plan, result.plan[5:])
+
+        # A new wall on the remaining path invalidates it; one elsewhere doesn't
+        on_path = result.plan[10].args[1]
+        changed = planner.plan(PlanningProblem(state, grid_move_operators("agent", 40, 40, blocked | {on_path}),
+                                               goal=problem.goal, heuristic=problem.heuristic, key="goal_1"),
+                               max_expansions=0)
+        self.assertFalse(changed.complete)
+        replanned = planner.plan(PlanningProblem(state, grid_move_operators("agent", 40, 40, blocked | {on_path}),
+                                                 goal=problem.goal, heuristic=problem.heuristic, key="goal_1"))
+        self.assertTrue(replanned.complete and replanned.optimal)
+
+    def test_crafting_with_hmax(self):
+        operators = _crafting_operators()
+        problem = PlanningProblem({("at", "agent", "forest")}, operators, goal={("has", "agent", "basic_axe")},
+                                  heuristic=HMaxHeuristic(operators))
+        result = AStarPlanner().plan(problem)
+        self.assertTrue(result.complete and result.optimal)
+        self.assertTrue(validate_plan(result.plan, problem.initial_state, problem.goal))
+        self.assertEqual(result.plan[-1].name, "craft_item")
+        self.assertEqual(result.plan[-1].parameters, {"item_name": "basic_axe"})
+
+
+class TestHTNPlanner(unittest.TestCase):
+
+    def setUp(self):
+        def get_item(state, agent, item):
+            if ("has", agent, item) in state:
+                return []
+            recipe = RECIPES.get(item)
+            if recipe is None:
+                return None
+            subtasks = [("get_item", agent, needed) for needed in recipe["inputs"]]
+            if recipe.get("tool_required"):
+                subtasks.append(("get_item", agent, recipe["tool_required"]))
+            if recipe.get("station_required"):
+                subtasks.append(("go", agent, "workshop"))
+            return subtasks + [("craft_item", agent, item, "workshop" if recipe.get("station_required") else None)]
+
+        def gather(state, agent, item):
+            if item not in SOURCES:
+                return None
+            location, action_type, _ = SOURCES[item]
+            return [("go", agent, location), (action_type, agent, item)]
+
+        def go(state, agent, location):
+            here = next(fact[2] for fact in state if fact[0] == "at" and fact[1] == agent)
+            return [] if here == location else [("navigate", agent, here, location)]
+
+        self.planner = HTNPlanner({"get_item": [get_item, gather], "go": [go]})
+
+    def test_decomposes_crafting_task_into_valid_plan(self):
+        problem = PlanningProblem({("at", "agent", "forest")}, _crafting_operators(),
+                                  tasks=[("get_item", "agent", "basic_axe")], key="axe")
+        result = self.planner.plan(problem)
+        self.assertTrue(result.complete)
+        self.assertTrue(validate_plan(result.plan, problem.initial_state, frozenset({("has", "agent", "basic_axe")})))
+        self.assertTrue(self.planner.plan(problem).reused)
+
+        unreachable = PlanningProblem({("at", "agent", "forest")}, _crafting_operators(),
+                                      tasks=[("get_item", "agent", "diamond")])
+        self.assertFalse(self.planner.plan(unreachable).complete)
+
+
+class TestPlanningOverWorldModel(unittest.TestCase):
+
+    def setUp(self):
+        self.world_model = ReferenceWorldModel()
+        for entity in [
+            WorldEntity(id="agent", type="agent", state={"position": [0.4, 0.2, 0], "inventory": {"key": 1, "map": 0}},
+                        properties={}, affordances=[], relationships={}, location_id="hall"),
+            WorldEntity(id="door", type="door", state={"locked": True}, properties={}, affordances=["open"],
+                        relationships={}),
+        ]:
+            self.world_model._entity_repository[entity.id] = entity
+        self.builder = SymbolicStateBuilder(self.world_model)
+
+    def test_state_rebuilds_only_changed_entities(self):
+        state = self.builder.build()
+        self.assertTrue({("cell", "agent", (0, 0)), ("at", "agent", "hall"), ("has", "agent", "key"),
+                         ("state", "door", "locked", True), ("affords", "door", "open")} <= state)
+        self.assertNotIn(("has", "agent", "map"), state)
+        self.assertEqual(self.builder.rebuilt_entities, 2)
+
+        self.world_model.update_entity_state("agent", {"state": {"position": [2.5, 0.0, 0]}, "location_id": "kitchen"})
+        state = self.builder.build()
+        self.assertEqual(self.builder.rebuilt_entities, 3)
+        self.assertIn(("cell", "agent", (2, 0)), state)
+        self.assertIn(("at", "agent", "kitchen"), state)
+
+    def test_text_rooms_domain_plans_from_world_model(self):
+        exits = {"hall": {"north": "library", "east": "kitchen"}, "library": {"south": "hall"},
+                 "kitchen": {"west": "hall", "down": "cellar"}, "cellar": {"up": "kitchen"}}
+        domain = PlanningDomain(location_graph_operators("agent", exits),
+                                goals={"reach the cellar": {("at", "agent", "cellar")}})
+        goal = type("Goal", (), {"goal_id": "g1", "goal_description": "Reach  the Cellar"})()
+        problem = domain.problem_for_goal(goal, self.builder.build())
+        result = AStarPlanner().plan(problem)
+        self.assertEqual([operator.parameters for operator in result.plan], [{"direction": "east"}, {"direction": "down"}])
+        other = type("Goal", (), {"goal_id": "g2", "goal_description": "Bake bread"})()
+        self.assertIsNone(domain.problem_for_goal(other, self.builder.build()))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
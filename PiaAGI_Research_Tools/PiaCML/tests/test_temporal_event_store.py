@@ -0,0 +1,109 @@
+import unittest
+import json
+import os
+import random
+import sys
+import tempfile
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML.temporal_event_store import TemporalEventStore, EventRetentionPolicy, summarize_events
+    from PiaAGI_Research_Tools.PiaCML.concrete_world_model import ConcreteWorldModel, TemporalEvent
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from temporal_event_store import TemporalEventStore, EventRetentionPolicy, summarize_events
+    from concrete_world_model import ConcreteWorldModel, TemporalEvent
+
+
+# The concrete model leaves some abstract methods of its base unimplemented; they are not used here
+ReferenceWorldModel = type("ReferenceWorldModel", (ConcreteWorldModel,), {
+    name: (lambda self, *args, **kwargs: None) for name in getattr(ConcreteWorldModel, "__abstractmethods__", ())})
+
+
+def _event(index, timestamp, entities=(), event_type="seen"):
+    return TemporalEvent(f"e{index}", event_type, timestamp, "", list(entities))
+
+
+class TestTemporalEventStore(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(11)
+        self.events = [_event(i, float(rng.randint(0, 400)), rng.sample(["a", "b", "c", "d"], rng.randint(0, 2)),
+                              rng.choice(["seen", "moved"])) for i in range(1000)]
+        self.store = TemporalEventStore(self.events, chunk_size=16) # Out of order, with duplicate timestamps
+
+    def _expected(self, start, end, involving=None, event_type=None):
+        # Stable sort: equal timestamps keep arrival order
+        ordered = sorted(self.events, key=lambda e: e.timestamp)
+        return [e.id for e in ordered if start <= e.timestamp <= end
+                and (involving is None or set(involving) & set(e.involved_entities))
+                and (event_type is None or e.type == event_type)]
+
+    def test_range_queries_match_a_scan(self):
+        self.assertEqual(len(self.store), 1000)
+        self.assertEqual([e.id for e in self.store], self._expected(0, 400))
+        for start, end in [(0, 400), (100, 100), (57.5, 250), (390, 1000), (-5, -1)]:
+            self.assertEqual([e.id for e in self.store.events_between(start, end)], self._expected(start, end))
+            self.assertEqual([e.id for e in self.store.events_between(start, end, involving=["b", "d"])],
+                             self._expected(start, end, involving=["b", "d"]))
+            self.assertEqual([e.id for e in self.store.events_between(start, end, involving=["a"], event_type="moved")],
+                             self._expected(start, end, involving=["a"], event_type="moved"))
+            self.assertEqual([e.id for e in self.store.events_between(start, end, event_type="seen")],
+                             self._expected(start, end, event_type="seen"))
+
+    def test_list_like_access(self):
+        ordered = self._expected(0, 400)
+        self.assertEqual(self.store[0].id, ordered[0])
+        self.assertEqual(self.store[-1].id, ordered[-1])
+        self.assertEqual(self.store[700].id, ordered[700])
+        self.assertEqual([e.id for e in self.store[-5:]], ordered[-5:])
+        self.assertEqual([e.id for e in self.store[10:20]], ordered[10:20])
+        with self.assertRaises(IndexError):
+            self.store[1000]
+
+    def test_retention_evicts_chunks_to_summarizer_and_spill_file(self):
+        summaries = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            spill_path = os.path.join(tmp_dir, "events.jsonl")
+            store = TemporalEventStore(chunk_size=10, retention=EventRetentionPolicy(
+                max_events=25, spill_path=spill_path, summarizer=summaries.append))
+            for i in range(100):
+                store.append(_event(i, float(i), ["a"] if i % 2 else ["b"]))
+            self.assertTrue(25 <= len(store) < 35)
+            self.assertEqual(store.evicted_count + len(store), 100)
+            self.assertEqual(store[0].id, f"e{store.evicted_count}")
+            self.assertEqual(len(store.events_involving(["a"])) + len(store.events_involving(["b"])), len(store))
+            with open(spill_path, encoding='utf-8') as f:
+                spilled = [json.loads(line) for line in f]
+        self.assertEqual([e["id"] for e in spilled], [f"e{i}" for i in range(store.evicted_count)])
+        self.assertEqual(sum(s["associated_data"]["event_count"] for s in summaries), store.evicted_count)
+        self.assertEqual(summaries[0]["associated_data"]["events_by_entity"], {"b": 5, "a": 5})
+
+    def test_retention_by_age(self):
+        store = TemporalEventStore(chunk_size=5, retention=EventRetentionPolicy(max_age_seconds=20))
+        for i in range(60):
+            store.append(_event(i, float(i)))
+        oldest, newest = store.time_span
+        self.assertEqual(newest, 59.0)
+        self.assertGreaterEqual(oldest, 59.0 - 20 - 5)
+        self.assertEqual(summarize_events([])["associated_data"]["event_count"], 0)
+
+
+class TestWorldModelEventsBetween(unittest.TestCase):
+
+    def test_events_between_query(self):
+        world_model = ReferenceWorldModel()
+        world_model._temporal_model_events = [_event(i, 100.0 + i, ["agent", f"obj{i % 3}"]) for i in range(30)]
+        result = world_model.query_world_state(
+            {"query_type": "events_between", "start_time": 105, "end_time": 110, "entity_ids": ["obj0"]})
+        self.assertTrue(result["success"])
+        self.assertEqual([e["id"] for e in result["data"]], ["e6", "e9"])
+        self.assertEqual(len(world_model.query_world_state({"query_type": "events_between", "start_time": 125})["data"]), 5)
+        bad = world_model.query_world_state({"query_type": "events_between", "entity_ids": "obj0"})
+        self.assertFalse(bad["success"])
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
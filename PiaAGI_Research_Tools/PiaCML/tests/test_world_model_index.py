@@ -0,0 +1,132 @@
+import unittest
+import json
+import math
+import os
+import random
+import sys
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML.world_model_index import SpatialGrid, EntityRepository, ResultView
+    from PiaAGI_Research_Tools.PiaCML.concrete_world_model import ConcreteWorldModel, WorldEntity, TemporalEvent
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from world_model_index import SpatialGrid, EntityRepository, ResultView
+    from concrete_world_model import ConcreteWorldModel, WorldEntity, TemporalEvent
+
+
+# The concrete model leaves some abstract methods of its base unimplemented; they are not used here
+ReferenceWorldModel = type("ReferenceWorldModel", (ConcreteWorldModel,), {
+    name: (lambda self, *args, **kwargs: None) for name in getattr(ConcreteWorldModel, "__abstractmethods__", ())})
+
+
+def _entity(entity_id, entity_type="thing", location_id=None, position=None):
+    state = {"position": position} if position is not None else {}
+    return WorldEntity(id=entity_id, type=entity_type, state=state, properties={}, affordances=[],
+                       relationships={}, location_id=location_id)
+
+
+class TestSpatialGrid(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.points = {f"p{i}": (rng.uniform(-100, 100), rng.uniform(-100, 100), rng.uniform(-5, 5)) for i in range(500)}
+        self.grid = SpatialGrid(cell_size=7.5)
+        for key, position in self.points.items():
+            self.grid.update(key, position)
+
+    def _brute_force(self, center):
+        return sorted((math.dist(center, position), key) for key, position in self.points.items())
+
+    def test_radius_and_nearest_match_brute_force(self):
+        for center in [(0.0, 0.0, 0.0), (95.0, -95.0, 0.0), (300.0, 300.0, 0.0)]:
+            expected = self._brute_force(center)
+            within = self.grid.within_radius(center, 20.0)
+            self.assertEqual([key for _, key in within], [key for d, key in expected if d <= 20.0])
+            self.assertEqual([key for _, key in self.grid.nearest(center, 5)], [key for _, key in expected[:5]])
+        self.assertEqual(len(self.grid.nearest((0.0, 0.0, 0.0), 1000)), 500)
+
+    def test_moves_and_removals(self):
+        self.grid.update("p0", (1000.0, 1000.0, 0.0))
+        self.assertEqual(self.grid.nearest((999.0, 999.0, 0.0), 1)[0][1], "p0")
+        self.grid.update("p0", None)
+        self.assertNotIn("p0", self.grid)
+        self.assertNotEqual(self.grid.nearest((999.0, 999.0, 0.0), 1)[0][1], "p0")
+
+
+class TestEntityRepository(unittest.TestCase):
+
+    def test_indexes_follow_dict_mutations(self):
+        repository = EntityRepository({"a": _entity("a", "fruit", "loc1", [0, 0, 0])})
+        repository["b"] = _entity("b", "fruit", "loc2", [3, 4, 0])
+        repository["c"] = _entity("c", "tool", "loc1")
+        self.assertEqual(repository.ids_by_type("fruit"), ["a", "b"])
+        self.assertEqual(repository.ids_by_location("loc1"), ["a", "c"])
+
+        repository["a"].location_id = "loc2"
+        repository["a"].state["position"] = [50, 50, 0]
+        repository.reindex("a")
+        self.assertEqual(repository.ids_by_location("loc2"), ["a", "b"]) # Dict order, not the order of the moves
+        self.assertEqual([key for _, key in repository.nearest((0.0, 0.0, 0.0), 2)], ["b", "a"])
+        self.assertEqual(repository.within_radius((0.0, 0.0, 0.0), 100.0, entity_type="tool"), []) # "c" has no position
+
+        del repository["b"]
+        repository.pop("c")
+        self.assertEqual(repository.ids_by_type("fruit"), ["a"])
+        self.assertEqual(repository.ids_by_location("loc1"), [])
+        self.assertEqual(len(repository.grid), 1)
+
+
+class TestWorldModelIndexedQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.world_model = ReferenceWorldModel(spatial_cell_size=5.0)
+        self.world_model._entity_repository = { # Plain dicts are wrapped into an indexed repository
+            "apple": _entity("apple", "fruit", "table", [1, 1, 0]),
+            "pear": _entity("pear", "fruit", "shelf", [9, 0, 0]),
+            "hammer": _entity("hammer", "tool", "table", [2, 0, 0]),
+        }
+
+    def test_results_are_views(self):
+        result = self.world_model.query_world_state({"query_type": "entities_by_type", "entity_type": "fruit"})
+        self.assertIsInstance(result["data"], ResultView)
+        self.assertEqual(result["data"], [self.world_model._entity_repository["apple"].to_dict(),
+                                          self.world_model._entity_repository["pear"].to_dict()])
+        self.assertEqual([e["id"] for e in result["data"][1:]], ["pear"])
+        as_list = result["data"].to_dicts()
+        self.assertIsInstance(as_list, list)
+        self.assertEqual(json.loads(json.dumps(as_list))[0]["id"], "apple")
+
+    def test_spatial_queries(self):
+        within = self.world_model.query_world_state({"query_type": "entities_within_radius", "position": [0, 0, 0], "radius": 3})
+        self.assertEqual([e["id"] for e in within["data"]], ["apple", "hammer"])
+        self.assertAlmostEqual(within["distances"][0], math.sqrt(2))
+        nearest_fruit = self.world_model.query_world_state(
+            {"query_type": "nearest_entities", "position": [10, 0], "count": 1, "entity_type": "fruit"})
+        self.assertEqual([e["id"] for e in nearest_fruit["data"]], ["pear"])
+        bad = self.world_model.query_world_state({"query_type": "entities_within_radius", "position": [0, 0, 0]})
+        self.assertFalse(bad["success"])
+
+    def test_state_updates_keep_result_order(self):
+        model = ReferenceWorldModel()
+        model._entity_repository = {f"e{i}": _entity(f"e{i}", "thing", "room", [i, 0, 0]) for i in range(4)}
+        model.update_entity_state("e0", {"state": {"hp": 1}})
+        for query in ({"query_type": "entities_by_type", "entity_type": "thing"},
+                      {"query_type": "entities_by_location", "location_id": "room"}):
+            self.assertEqual([e["id"] for e in model.query_world_state(query)["data"]], ["e0", "e1", "e2", "e3"])
+        model.update_entity_state("e2", {"location_id": "hall"})
+        model.update_entity_state("e2", {"location_id": "room"})
+        self.assertEqual(model._entity_repository.ids_by_location("room"), ["e0", "e1", "e2", "e3"])
+
+    def test_updates_through_the_model_are_reindexed(self):
+        self.world_model.update_entity_state("pear", {"state": {"position": [0, 0.5, 0]}, "location_id": "table"})
+        by_location = self.world_model.query_world_state({"query_type": "entities_by_location", "location_id": "table"})
+        self.assertEqual({e["id"] for e in by_location["data"]}, {"apple", "hammer", "pear"})
+        nearest = self.world_model.query_world_state({"query_type": "nearest_entities", "position": [0, 0, 0]})
+        self.assertEqual(nearest["data"][0]["id"], "pear")
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
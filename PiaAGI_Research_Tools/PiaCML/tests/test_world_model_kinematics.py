@@ -0,0 +1,95 @@
+import unittest
+import math
+import os
+import random
+import sys
+
+# Adjust path for consistent imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    from PiaAGI_Research_Tools.PiaCML.concrete_world_model import ConcreteWorldModel, WorldEntity, SpatialData
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from concrete_world_model import ConcreteWorldModel, WorldEntity, SpatialData
+
+
+# The concrete model leaves some abstract methods of its base unimplemented; they are not used here
+ReferenceWorldModel = type("ReferenceWorldModel", (ConcreteWorldModel,), {
+    name: (lambda self, *args, **kwargs: None) for name in getattr(ConcreteWorldModel, "__abstractmethods__", ())})
+
+
+def _entity(entity_id, entity_type="agent", state=None, properties=None, relationships=None):
+    return WorldEntity(id=entity_id, type=entity_type, state=state or {}, properties=properties or {},
+                       affordances=[], relationships=relationships or {})
+
+
+class TestPredictFutureStates(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(3)
+        self.world_model = ReferenceWorldModel()
+        self.world_model._spatial_model["dock"] = SpatialData("dock", "area", coordinates=(40.0, 0.0, 0.0))
+        entities = [
+            _entity("tower", "building", {"position": [0, 0, 0]}),
+            _entity("ruin", "fixed_equipment", {"position": [1, 1, 0], "damage_level": 0.95}),
+            _entity("goal_rock", "rock", {"position": [10, 0, 0]}),
+            _entity("blocked", state={"position": [0, 0, 0], "current_action": "moving_to_goal", "movement_speed": 1,
+                                      "goal_location_id": "goal_rock"},
+                    relationships={"obstructs_path_to": [{"target_id": "goal_rock", "obstacle_id": "wall"}]}),
+            _entity("no_goal", state={"position": [0, 0, 0], "current_action": "moving_to_goal", "movement_speed": 1,
+                                      "goal_location_id": "nowhere", "velocity": [1, 0, 0]}),
+            _entity("idle", state={"position": [3, 3, 3]}),
+            _entity("speeder", state={"position": [0, 0, 0], "velocity": [30, 40, 0]}, properties={"max_speed": 10}),
+        ]
+        for i in range(40):
+            state = {"position": [rng.uniform(-20, 20), rng.uniform(-20, 20), 0.0], "current_action": "moving_to_goal",
+                     "movement_speed": rng.uniform(0.5, 5), "goal_location_id": rng.choice(["goal_rock", "dock"])}
+            if i % 3 == 0:
+                state["velocity"] = [rng.uniform(-2, 2), rng.uniform(-2, 2), 0.0]
+            entities.append(_entity(f"walker{i}", state=state))
+        for entity in entities:
+            self.world_model._entity_repository[entity.id] = entity
+        self.entity_ids = [entity.id for entity in entities] + ["missing"]
+        self.horizons = [0.0, 1.0, 4.5, 20.0]
+
+    def _assert_matches_single_predictions(self, batch):
+        for e, entity_id in enumerate(self.entity_ids):
+            for h, horizon in enumerate(self.horizons):
+                single = self.world_model.predict_future_state(entity_id, horizon)
+                self.assertEqual(batch["prediction_rule_applied"][e, h], single["prediction_rule_applied"], (entity_id, horizon))
+                self.assertEqual(batch["prediction_confidence"][e, h], single["prediction_confidence"])
+                position = single["predicted_entity_state_dict"].get("state", {}).get("position")
+                if position is None:
+                    self.assertTrue(all(math.isnan(v) for v in batch["positions"][e, h]))
+                else:
+                    for predicted, expected in zip(batch["positions"][e, h], position):
+                        self.assertAlmostEqual(predicted, expected)
+
+    def test_batch_matches_single_entity_predictions(self):
+        batch = self.world_model.predict_future_states(self.entity_ids, self.horizons)
+        self.assertEqual(batch["positions"].shape, (len(self.entity_ids), len(self.horizons), 3))
+        self.assertEqual(batch["entity_ids"], self.entity_ids)
+        self._assert_matches_single_predictions(batch)
+        self.assertTrue(set(batch["prediction_rule_applied"].ravel()) >= {
+            "static_entity_no_change", "static_entity_unstable", "mobile_entity_goal_blocked", "mobile_entity_reaches_goal",
+            "mobile_entity_moves_towards_goal", "physics_constant_velocity", "physics_exceeds_max_speed", "entity_not_found"})
+
+    def test_kinematics_are_cached_until_updates(self):
+        cache = self.world_model._kinematics_cache
+        self.world_model.predict_future_states(self.entity_ids, 1.0)
+        misses = cache.misses
+        self.world_model.predict_future_states(self.entity_ids, [2.0, 3.0])
+        self.assertEqual(cache.misses, misses)
+
+        # Moving a goal invalidates the entities heading for it; updates through the model are picked up
+        self.world_model.update_entity_state("goal_rock", {"state": {"position": [-10, 0, 0]}})
+        self.world_model.update_entity_state("idle", {"state": {"velocity": [0, 0, 1]}})
+        self.world_model._spatial_model["dock"].coordinates = (0.0, 40.0, 0.0)
+        batch = self.world_model.predict_future_states(self.entity_ids, self.horizons)
+        self.assertGreater(cache.misses, misses)
+        self._assert_matches_single_predictions(batch)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,395 @@
+"""
+Secondary indexes for `ConcreteWorldModel`.
+
+`query_world_state` used to answer every query with a full scan of the entity
+repository, building a new list of dicts each time. Planners query the world
+model many times per tick, so the containers here keep the answers ready
+(temporal events are indexed by `temporal_event_store.TemporalEventStore`):
+
+- `EntityRepository`: the `dict` of entity id -> `WorldEntity`, maintaining
+  type -> ids and location_id -> ids indexes and a `SpatialGrid` over entity
+  positions (`entity.state["position"]`) as entities are added or removed. Code
+  that changes an entity's type, location_id or position in place must call
+  `reindex(entity_id)` afterwards, as `ConcreteWorldModel`'s own update paths do.
+- `SpatialGrid`: a uniform grid hash for radius and nearest-neighbour queries.
+- `ResultView`: a read-only sequence over query results that calls `to_dict()` on
+  an item only when it is accessed. Unlike the list it replaces it is neither
+  JSON-serializable nor mutable; `to_dicts()` returns that list.
+"""
+
+import heapq
+import math
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_SPATIAL_CELL_SIZE = 10.0
+
+Cell = Tuple[int, int, int]
+Position = Tuple[float, float, float]
+
+
+def entity_position(entity: Any) -> Optional[Position]:
+    """An entity's `state["position"]` as an (x, y, z) tuple, or None if it has no valid position."""
+    state = getattr(entity, "state", None)
+    position = state.get("position") if isinstance(state, dict) else None
+    if not isinstance(position, (list, tuple)) or len(position) not in (2, 3):
+        return None
+    try:
+        x, y = float(position[0]), float(position[1])
+        z = float(position[2]) if len(position) == 3 else 0.0
+    except (TypeError, ValueError):
+        return None
+    return (x, y, z)
+
+
+class SpatialGrid:
+    """
+    Uniform grid hash of keyed 3D points. Radius queries visit only the cells
+    overlapping the query sphere; nearest-neighbour queries search outwards shell by
+    shell. Either falls back to visiting the occupied cells when that is cheaper.
+
+    Args:
+        cell_size (float): Edge length of a grid cell; about the typical query radius works well.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_SPATIAL_CELL_SIZE):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive.")
+        self.cell_size = float(cell_size)
+        self._cells: Dict[Cell, Set[str]] = {}
+        self._points: Dict[str, Tuple[Position, Cell]] = {}
+        self._bounds: Optional[List[int]] = None # [min_x, min_y, min_z, max_x, max_y, max_z] of cells ever occupied
+
+    def _cell(self, position: Position) -> Cell:
+        size = self.cell_size
+        return (math.floor(position[0] / size), math.floor(position[1] / size), math.floor(position[2] / size))
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._points
+
+    def position(self, key: str) -> Optional[Position]:
+        entry = self._points.get(key)
+        return entry[0] if entry else None
+
+    def update(self, key: str, position: Optional[Position]) -> None:
+        """Inserts or moves `key`; a position of None removes it."""
+        if position is None:
+            self.remove(key)
+            return
+        cell = self._cell(position)
+        old = self._points.get(key)
+        if old is not None and old[1] != cell:
+            self._discard_from_cell(key, old[1])
+        self._points[key] = (position, cell)
+        self._cells.setdefault(cell, set()).add(key)
+        if self._bounds is None:
+            self._bounds = [cell[0], cell[1], cell[2], cell[0], cell[1], cell[2]]
+        else:
+            bounds = self._bounds
+            for axis in range(3):
+                if cell[axis] < bounds[axis]:
+                    bounds[axis] = cell[axis]
+                elif cell[axis] > bounds[axis + 3]:
+                    bounds[axis + 3] = cell[axis]
+
+    def remove(self, key: str) -> None:
+        old = self._points.pop(key, None)
+        if old is not None:
+            self._discard_from_cell(key, old[1])
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._points.clear()
+        self._bounds = None
+
+    def _discard_from_cell(self, key: str, cell: Cell) -> None:
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(key)
+            if not members:
+                del self._cells[cell]
+
+    def within_radius(self,
+                      center: Position,
+                      radius: float,
+                      predicate: Optional[Callable[[str], bool]] = None) -> List[Tuple[float, str]]:
+        """(distance, key) pairs within `radius` of `center`, nearest first."""
+        if radius < 0:
+            return []
+        cx, cy, cz = self._cell(center)
+        reach = math.ceil(radius / self.cell_size)
+        span = 2 * reach + 1
+        if span ** 3 <= len(self._cells):
+            cells = (self._cells.get((x, y, z)) for x in range(cx - reach, cx + reach + 1)
+                     for y in range(cy - reach, cy + reach + 1) for z in range(cz - reach, cz + reach + 1))
+        else: # Fewer occupied cells than cells in the query cube
+            cells = (members for cell, members in self._cells.items()
+                     if max(abs(cell[0] - cx), abs(cell[1] - cy), abs(cell[2] - cz)) <= reach)
+        radius_sq = radius * radius
+        results = []
+        for members in cells:
+            if not members:
+                continue
+            for key in members:
+                distance_sq = self._distance_sq(center, self._points[key][0])
+                if distance_sq <= radius_sq and (predicate is None or predicate(key)):
+                    results.append((math.sqrt(distance_sq), key))
+        results.sort()
+        return results
+
+    def nearest(self,
+                center: Position,
+                count: int = 1,
+                max_distance: Optional[float] = None,
+                predicate: Optional[Callable[[str], bool]] = None) -> List[Tuple[float, str]]:
+        """Up to `count` (distance, key) pairs nearest to `center`, nearest first."""
+        if count <= 0 or not self._points:
+            return []
+        if max_distance is not None:
+            return self.within_radius(center, max_distance, predicate)[:count]
+        cx, cy, cz = self._cell(center)
+        bounds = self._bounds
+        max_reach = max(cx - bounds[0], cy - bounds[1], cz - bounds[2], bounds[3] - cx, bounds[4] - cy, bounds[5] - cz, 0)
+        best: List[Tuple[float, str]] = [] # Heap of the best `count` as (-distance_sq, key)
+        for reach in range(max_reach + 1):
+            # Points in shells >= reach are at least (reach - 1) cells away from center
+            if len(best) == count and reach > 0 and -best[0][0] <= ((reach - 1) * self.cell_size) ** 2:
+                break
+            shell_size = (2 * reach + 1) ** 3 - (2 * reach - 1) ** 3 if reach else 1
+            if shell_size > len(self._cells):
+                # Cheaper to finish by visiting every occupied cell not yet searched
+                remaining = (members for cell, members in self._cells.items()
+                             if max(abs(cell[0] - cx), abs(cell[1] - cy), abs(cell[2] - cz)) >= reach)
+                self._push_nearest(best, count, center, remaining, predicate)
+                break
+            self._push_nearest(best, count, center, (self._cells.get(cell) for cell in self._shell(cx, cy, cz, reach)), predicate)
+        return sorted((math.sqrt(-neg_distance_sq), key) for neg_distance_sq, key in best)
+
+    def _push_nearest(self, best: List[Tuple[float, str]], count: int, center: Position,
+                      cells: Iterable[Optional[Set[str]]], predicate: Optional[Callable[[str], bool]]) -> None:
+        for members in cells:
+            if not members:
+                continue
+            for key in members:
+                if predicate is not None and not predicate(key):
+                    continue
+                item = (-self._distance_sq(center, self._points[key][0]), key)
+                if len(best) < count:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+
+    @staticmethod
+    def _shell(cx: int, cy: int, cz: int, reach: int) -> Iterator[Cell]:
+        """Cells at Chebyshev distance exactly `reach` from (cx, cy, cz)."""
+        if reach == 0:
+            yield (cx, cy, cz)
+            return
+        for x in range(cx - reach, cx + reach + 1):
+            for y in range(cy - reach, cy + reach + 1):
+                if abs(x - cx) == reach or abs(y - cy) == reach:
+                    for z in range(cz - reach, cz + reach + 1):
+                        yield (x, y, z)
+                else:
+                    yield (x, y, cz - reach)
+                    yield (x, y, cz + reach)
+
+    @staticmethod
+    def _distance_sq(a: Position, b: Position) -> float:
+        return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+class EntityRepository(dict):
+    """
+    `dict` of entity id -> entity that keeps type, location and spatial indexes up to
+    date as entries are set or removed. Type and location lookups list ids in the
+    dict's order, as a scan of the entities would. Call `reindex(entity_id)` after changing an
+    entity's `type`, `location_id` or `state["position"]` in place. Every (re)index
+    gives the entity a new `version()`, which caches derived from an entity (such as
+    `world_model_kinematics.KinematicsCache`) use to detect changes.
+
+    Args:
+        entities (Optional[Dict[str, Any]]): Initial entries.
+        cell_size (float): Cell size of the spatial grid.
+    """
+
+    def __init__(self, entities: Optional[Dict[str, Any]] = None, cell_size: float = DEFAULT_SPATIAL_CELL_SIZE):
+        super().__init__()
+        self._by_type: Dict[Any, Dict[str, None]] = {} # Dicts as insertion-ordered sets
+        self._by_location: Dict[Any, Dict[str, None]] = {}
+        self._keys: Dict[str, Tuple[Any, Any]] = {} # entity id -> (type, location_id) as indexed
+        self._positions: Dict[str, int] = {} # entity id -> rank in the dict's (insertion) order
+        self._inserted = 0
+        self._unordered: set = set() # (index id, key) of index entries no longer in dict order
+        self._versions: Dict[str, int] = {}
+        self._revision = 0
+        self.grid = SpatialGrid(cell_size)
+        if entities:
+            self.update(entities)
+
+    # --- Index maintenance ---
+    def _index(self, entity_id: str, entity: Any) -> None:
+        keys = (getattr(entity, "type", None), getattr(entity, "location_id", None))
+        if self._keys.get(entity_id) != keys: # Entries of unchanged keys keep their place
+            self._unindex_keys(entity_id)
+            self._add(self._by_type, keys[0], entity_id)
+            if keys[1] is not None:
+                self._add(self._by_location, keys[1], entity_id)
+            self._keys[entity_id] = keys
+        self.grid.update(entity_id, entity_position(entity))
+        self._revision += 1
+        self._versions[entity_id] = self._revision
+
+    def _add(self, index: Dict[Any, Dict[str, None]], key: Any, entity_id: str) -> None:
+        members = index.setdefault(key, {})
+        if members and self._positions[next(reversed(members))] > self._positions[entity_id]:
+            self._unordered.add((id(index), key)) # Moved in ahead of later entities; re-sorted on lookup
+        members[entity_id] = None
+
+    def _ordered(self, index: Dict[Any, Dict[str, None]], key: Any) -> Dict[str, None]:
+        members = index.get(key, {})
+        if (id(index), key) in self._unordered:
+            self._unordered.discard((id(index), key))
+            members = index[key] = dict.fromkeys(sorted(members, key=self._positions.__getitem__))
+        return members
+
+    def _unindex_keys(self, entity_id: str) -> None:
+        keys = self._keys.pop(entity_id, None)
+        if keys is None:
+            return
+        for index, key in ((self._by_type, keys[0]), (self._by_location, keys[1])):
+            members = index.get(key)
+            if members is not None:
+                members.pop(entity_id, None)
+                if not members:
+                    del index[key]
+                    self._unordered.discard((id(index), key))
+
+    def _unindex(self, entity_id: str) -> None:
+        self._unindex_keys(entity_id)
+        self._positions.pop(entity_id, None)
+        self._versions.pop(entity_id, None)
+        self.grid.remove(entity_id)
+
+    def reindex(self, entity_id: str) -> None:
+        """Re-reads an entity's type, location and position after an in-place change."""
+        if entity_id in self:
+            self._index(entity_id, dict.__getitem__(self, entity_id))
+
+    # --- dict mutators ---
+    def __setitem__(self, entity_id: str, entity: Any) -> None:
+        if entity_id not in self._positions:
+            self._inserted += 1
+            self._positions[entity_id] = self._inserted
+        super().__setitem__(entity_id, entity)
+        self._index(entity_id, entity)
+
+    def __delitem__(self, entity_id: str) -> None:
+        super().__delitem__(entity_id)
+        self._unindex(entity_id)
+
+    def pop(self, entity_id: str, *default: Any) -> Any:
+        if entity_id in self:
+            self._unindex(entity_id)
+        return super().pop(entity_id, *default)
+
+    def popitem(self) -> Tuple[str, Any]:
+        entity_id, entity = super().popitem()
+        self._unindex(entity_id)
+        return entity_id, entity
+
+    def setdefault(self, entity_id: str, default: Any = None) -> Any:
+        if entity_id not in self:
+            self[entity_id] = default
+        return dict.__getitem__(self, entity_id)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for entity_id, entity in dict(*args, **kwargs).items():
+            self[entity_id] = entity
+
+    def clear(self) -> None:
+        super().clear()
+        self._by_type.clear()
+        self._by_location.clear()
+        self._keys.clear()
+        self._positions.clear()
+        self._unordered.clear()
+        self._versions.clear()
+        self.grid.clear()
+
+    # --- Lookups ---
+    def version(self, entity_id: str) -> Optional[int]:
+        """Changes whenever the entity is set or reindexed; None if it is not in the repository."""
+        return self._versions.get(entity_id)
+
+    def ids_by_type(self, entity_type: Any) -> List[str]:
+        """Ids of the entities of a type, in the dict's order (as a scan of the repository finds them)."""
+        return list(self._ordered(self._by_type, entity_type))
+
+    def ids_by_location(self, location_id: Any) -> List[str]:
+        """Ids of the entities at a location, in the dict's order."""
+        return list(self._ordered(self._by_location, location_id))
+
+    def entities(self, entity_ids: Iterable[str]) -> List[Any]:
+        get = dict.__getitem__
+        return [get(self, entity_id) for entity_id in entity_ids]
+
+    def within_radius(self, center: Position, radius: float, entity_type: Any = None) -> List[Tuple[float, str]]:
+        return self.grid.within_radius(center, radius, self._type_predicate(entity_type))
+
+    def nearest(self, center: Position, count: int = 1, max_distance: Optional[float] = None,
+                entity_type: Any = None) -> List[Tuple[float, str]]:
+        return self.grid.nearest(center, count, max_distance, self._type_predicate(entity_type))
+
+    def _type_predicate(self, entity_type: Any) -> Optional[Callable[[str], bool]]:
+        if entity_type is None:
+            return None
+        members = self._by_type.get(entity_type, {})
+        return members.__contains__
+
+
+class ResultView(Sequence):
+    """
+    Read-only sequence over query results (entities or events). Items are exposed
+    through their `to_dict()` only when accessed, so a query does not build a list
+    of dicts up front. Compares equal to a list with the same dicts.
+
+    `to_dicts()` gives the plain list of dicts (e.g. for `json.dumps` or to modify
+    the list). The dicts are the items' own attribute dicts, as before; an entity
+    whose type, location_id or position is changed through them must be reindexed.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Sequence):
+        self._items = items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return ResultView(self._items[index])
+        return self._items[index].to_dict()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (item.to_dict() for item in self._items)
+
+    def objects(self) -> List[Any]:
+        """The underlying entity/event objects."""
+        return list(self._items)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """The results as a new list of `to_dict()` dicts, the former return type of list queries."""
+        return [item.to_dict() for item in self._items]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (ResultView, list, tuple)):
+            return self.to_dicts() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ResultView({self.to_dicts()!r})"
@@ -0,0 +1,257 @@
+"""
+Batched trajectory prediction for `ConcreteWorldModel`.
+
+`predict_future_state` answers one entity and one horizon at a time: it deep-copies
+the entity, re-evaluates its prediction rules and does the vector maths in pure
+Python. Social and navigation scenarios ask for dozens of entities several horizons
+ahead every tick, so `ConcreteWorldModel.predict_future_states` uses this module
+instead:
+
+- `EntityKinematics`: what the prediction rules need from one entity (which rule
+  applies, position, velocity, goal position and distance, speed, confidence),
+  extracted once and kept in a `KinematicsCache`. An entry stays valid until the
+  entity, or the entity that is its goal, gets a new `EntityRepository.version()`
+  (i.e. is set or reindexed), or its goal location's coordinates change.
+- `predict_trajectories()`: evaluates every (entity, horizon) pair in one NumPy pass
+  and returns arrays. Positions, confidences and rule names are the same as
+  `predict_future_state` gives for each pair.
+
+NumPy is only needed for the batched path; the rest of PiaCML does not depend on it.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError: # Only predict_trajectories needs NumPy
+    np = None # type: ignore
+
+STATIC_ENTITY_TYPES = ("building", "terrain_feature", "fixed_equipment", "location_marker")
+
+# Rule names, as reported by ConcreteWorldModel.predict_future_state
+RULE_NAMES = (
+    "no_specific_rule_applied_current_state_assumed",
+    "entity_not_found",
+    "static_entity_no_change",
+    "static_entity_unstable",
+    "mobile_entity_goal_blocked",
+    "mobile_entity_reaches_goal",
+    "mobile_entity_moves_towards_goal",
+    "physics_constant_velocity",
+    "physics_exceeds_max_speed",
+)
+(RULE_NONE, RULE_NOT_FOUND, RULE_STATIC, RULE_STATIC_UNSTABLE, RULE_BLOCKED, RULE_REACHES_GOAL,
+ RULE_TOWARDS_GOAL, RULE_CONSTANT_VELOCITY, RULE_EXCEEDS_MAX_SPEED) = range(len(RULE_NAMES))
+
+# Entity modes, i.e. which of the rules can apply to an entity
+MODE_NONE, MODE_STATIC, MODE_BLOCKED, MODE_GOAL = range(4)
+
+Vector = Tuple[float, float, float]
+
+
+def _is_vector3(value: Any) -> bool:
+    return isinstance(value, list) and len(value) == 3
+
+
+class EntityKinematics:
+    """Prediction inputs for one entity; see `from_entity`."""
+    __slots__ = ("version", "goal_id", "goal_version", "goal_spatial", "goal_coordinates",
+                 "mode", "position", "velocity", "goal_position", "goal_distance", "speed",
+                 "static_rule", "exceeds_max_speed")
+
+    def __init__(self) -> None:
+        self.version: Optional[int] = None
+        self.goal_id: Optional[str] = None
+        self.goal_version: Optional[int] = None
+        self.goal_spatial: Any = None
+        self.goal_coordinates: Any = None
+        self.mode = MODE_NONE
+        self.position: Optional[Vector] = None
+        self.velocity: Optional[Vector] = None
+        self.goal_position: Optional[Vector] = None
+        self.goal_distance = math.inf
+        self.speed = 0.0
+        self.static_rule = RULE_STATIC
+        self.exceeds_max_speed = False
+
+    @classmethod
+    def from_entity(cls, entity_id: str, entity: Any, repository: Any, spatial_model: Dict[str, Any]) -> "EntityKinematics":
+        """Applies the conditions of `predict_future_state`'s rules 1-3 to `entity` (a `WorldEntity` in `repository`)."""
+        kinematics = cls()
+        kinematics.version = repository.version(entity_id)
+        state = entity.state if isinstance(entity.state, dict) else {}
+        properties = entity.properties if isinstance(entity.properties, dict) else {}
+        position = state.get("position")
+        if _is_vector3(position):
+            kinematics.position = (position[0], position[1], position[2])
+
+        # Rule 3: static entities
+        if properties.get("is_static") is True or entity.type in STATIC_ENTITY_TYPES:
+            kinematics.mode = MODE_STATIC
+            if state.get("damage_level", 0.0) > 0.8:
+                kinematics.static_rule = RULE_STATIC_UNSTABLE
+            return kinematics
+
+        # Rule 1: mobile entity moving to a goal
+        movement_speed, goal_id = state.get("movement_speed"), state.get("goal_location_id")
+        if state.get("current_action") == "moving_to_goal" and movement_speed is not None and goal_id and kinematics.position:
+            kinematics.goal_id = goal_id
+            goal_pos = kinematics._resolve_goal(goal_id, repository, spatial_model)
+            if goal_pos:
+                if kinematics._is_blocked(entity, goal_id):
+                    kinematics.mode = MODE_BLOCKED
+                else:
+                    kinematics.mode = MODE_GOAL
+                    kinematics.speed = float(movement_speed)
+                    if len(goal_pos) == 3:
+                        kinematics.goal_position = (goal_pos[0], goal_pos[1], goal_pos[2])
+                        kinematics.goal_distance = math.sqrt(sum((a - b) ** 2 for a, b in zip(kinematics.position, goal_pos)))
+                    else: # As _calculate_distance/_linear_interpolate do: infinitely far, position unchanged
+                        kinematics.goal_position = kinematics.position
+
+        # Rule 2: constant velocity
+        velocity = state.get("velocity")
+        if _is_vector3(velocity) and kinematics.position:
+            kinematics.velocity = (velocity[0], velocity[1], velocity[2])
+            max_speed = properties.get("max_speed")
+            if max_speed is not None:
+                kinematics.exceeds_max_speed = math.sqrt(sum(v ** 2 for v in velocity)) > float(max_speed)
+        return kinematics
+
+    def _resolve_goal(self, goal_id: str, repository: Any, spatial_model: Dict[str, Any]) -> Optional[Sequence[float]]:
+        self.goal_version = repository.version(goal_id)
+        self.goal_spatial = spatial_model.get(goal_id)
+        self.goal_coordinates = getattr(self.goal_spatial, "coordinates", None)
+        goal_entity = repository.get(goal_id)
+        if goal_entity is not None and _is_vector3(goal_entity.state.get("position")):
+            return goal_entity.state["position"]
+        if self.goal_spatial is not None and self.goal_coordinates:
+            return list(self.goal_coordinates)
+        return None
+
+    @staticmethod
+    def _is_blocked(entity: Any, goal_id: str) -> bool:
+        relationships = entity.relationships if isinstance(entity.relationships, dict) else {}
+        targets = relationships.get("obstructs_path_to")
+        return isinstance(targets, list) and any(isinstance(t, dict) and t.get("target_id") == goal_id for t in targets)
+
+    def is_current(self, repository: Any, spatial_model: Dict[str, Any], entity_id: str) -> bool:
+        if self.version is None or repository.version(entity_id) != self.version:
+            return False
+        if self.goal_id is None:
+            return True
+        spatial = spatial_model.get(self.goal_id)
+        return (repository.version(self.goal_id) == self.goal_version and spatial is self.goal_spatial
+                and getattr(spatial, "coordinates", None) == self.goal_coordinates)
+
+
+class KinematicsCache:
+    """Per-entity `EntityKinematics`, re-extracted only when an entity or its goal changes."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, EntityKinematics] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, entity_id: str, repository: Any, spatial_model: Dict[str, Any]) -> Optional[EntityKinematics]:
+        entry = self._entries.get(entity_id)
+        if entry is not None and entry.is_current(repository, spatial_model, entity_id):
+            self.hits += 1
+            return entry
+        entity = repository.get(entity_id)
+        if entity is None:
+            self._entries.pop(entity_id, None)
+            return None
+        self.misses += 1
+        entry = self._entries[entity_id] = EntityKinematics.from_entity(entity_id, entity, repository, spatial_model)
+        return entry
+
+    def invalidate(self, entity_id: Optional[str] = None) -> None:
+        """Drops one entity's entry, or all entries (e.g. after editing the spatial model in place)."""
+        if entity_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(entity_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def predict_trajectories(kinematics: List[Optional[EntityKinematics]],
+                         horizons: Union[float, Sequence[float]]) -> Dict[str, Any]:
+    """
+    Predicts every entity at every horizon in one vectorized pass.
+
+    Args:
+        kinematics (List[Optional[EntityKinematics]]): One entry per entity; None for unknown entities.
+        horizons (Union[float, Sequence[float]]): Time horizons in seconds.
+
+    Returns:
+        Dict[str, Any]: With E entities and H horizons:
+            "horizons": (H,) array;
+            "positions": (E, H, 3) array, NaN where an entity has no [x, y, z] position or is unknown;
+            "prediction_confidence": (E, H) array;
+            "prediction_rule_applied": (E, H) array of rule names;
+            "at_goal": (E, H) bool array, True where the entity is predicted to have reached its goal.
+    """
+    if np is None:
+        raise ImportError("predict_future_states requires NumPy.")
+    h = np.atleast_1d(np.asarray(horizons, dtype=float))
+    count = len(kinematics)
+    nan3 = (math.nan, math.nan, math.nan)
+    position = np.array([(k.position or nan3) if k is not None else nan3 for k in kinematics], dtype=float).reshape(count, 3)
+    velocity = np.array([(k.velocity or (0.0, 0.0, 0.0)) if k is not None else (0.0, 0.0, 0.0) for k in kinematics], dtype=float).reshape(count, 3)
+    goal = np.array([(k.goal_position or nan3) if k is not None else nan3 for k in kinematics], dtype=float).reshape(count, 3)
+    goal_distance = np.array([k.goal_distance if k is not None else math.inf for k in kinematics], dtype=float)
+    speed = np.array([k.speed if k is not None else 0.0 for k in kinematics], dtype=float)
+    mode = np.array([k.mode if k is not None else MODE_NONE for k in kinematics], dtype=np.int8)
+    found = np.array([k is not None for k in kinematics], dtype=bool)
+    has_velocity = np.array([k is not None and k.velocity is not None for k in kinematics], dtype=bool)
+    exceeds = np.array([k is not None and k.exceeds_max_speed for k in kinematics], dtype=bool)
+    static_rule = np.array([k.static_rule if k is not None else RULE_STATIC for k in kinematics], dtype=np.int8)
+
+    shape = (count, h.size)
+    positions = np.repeat(position[:, None, :], h.size, axis=1)
+    confidence = np.full(shape, 0.1)
+    rules = np.full(shape, RULE_NONE, dtype=np.int8)
+
+    rules[~found] = RULE_NOT_FOUND
+    confidence[~found] = 0.0
+
+    static = mode == MODE_STATIC
+    rules[static] = static_rule[static, None]
+    confidence[static] = np.where(static_rule[static] == RULE_STATIC_UNSTABLE, 0.3, 0.9)[:, None]
+
+    blocked = mode == MODE_BLOCKED
+    rules[blocked] = RULE_BLOCKED
+    confidence[blocked] = 0.7
+
+    # Rule 1: move towards the goal by speed * horizon, or arrive
+    travel = speed[:, None] * h[None, :]
+    seeking = (mode == MODE_GOAL)[:, None]
+    reached = seeking & (travel >= goal_distance[:, None])
+    towards = seeking & ~reached
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.where(goal_distance[:, None] > 0, travel / goal_distance[:, None], 0.0)
+    interpolated = position[:, None, :] + (goal - position)[:, None, :] * fraction[..., None]
+    positions[towards] = interpolated[towards]
+    positions[reached] = np.broadcast_to(goal[:, None, :], positions.shape)[reached]
+    rules[reached], confidence[reached] = RULE_REACHES_GOAL, 0.6
+    rules[towards], confidence[towards] = RULE_TOWARDS_GOAL, 0.4
+
+    # Rule 2: constant velocity, where no rule or only the low-confidence "moves towards goal" applied
+    physics = has_velocity[:, None] & ((rules == RULE_NONE) | towards)
+    extrapolated = position[:, None, :] + velocity[:, None, :] * h[None, :, None]
+    positions[physics] = extrapolated[physics]
+    exceeds_2d = np.broadcast_to(exceeds[:, None], shape)
+    rules[physics] = np.where(exceeds_2d[physics], RULE_EXCEEDS_MAX_SPEED, RULE_CONSTANT_VELOCITY)
+    confidence[physics] = np.where(exceeds_2d[physics], 0.3, 0.5)
+
+    return {
+        "horizons": h,
+        "positions": positions,
+        "prediction_confidence": confidence,
+        "prediction_rule_applied": np.asarray(RULE_NAMES, dtype=object)[rules],
+        "at_goal": reached,
+    }
@@ -0,0 +1,330 @@
+"""
+Batch generation of prompt variants over persona x scenario parameter matrices.
+
+Evaluation runs need every combination of e.g. OCEAN personality values, motivational
+biases, emotional profiles and curriculum steps rendered as a prompt. `BatchPromptGenerator`
+takes one or more base templates plus parameter axes and produces the rendered variant of
+every combination:
+
+- Placeholder axes fill `{placeholders}`; attribute axes replace attributes addressed by a
+  dotted path (e.g. "executors.role.cognitive_module_configuration.personality_config").
+- Templates are compiled once (see `CompiledTemplate`), so a variant costs one fill plus
+  one render, and the template itself is never modified.
+- Variants are numbered; a variant is rebuilt from its index alone, so worker processes
+  generate index ranges themselves and only rendered text crosses process boundaries.
+- Variants whose rendered Markdown is identical (same content hash) are emitted once.
+
+Results are streamed as dictionaries, or written to a JSONL file or a directory of
+JSONL shards.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Union, Iterator, Tuple, Sequence, Mapping
+
+try:
+    from .prompt_engine_mvp import (
+        BaseElement, DevelopmentalCurriculum, CompiledTemplate, compile_value, load_template, render_cache_disabled
+    )
+except ImportError:
+    from prompt_engine_mvp import (
+        BaseElement, DevelopmentalCurriculum, CompiledTemplate, compile_value, load_template, render_cache_disabled
+    )
+
+COGNITIVE_CONFIG_PATH = "executors.role.cognitive_module_configuration"
+PERSONALITY_CONFIG_PATH = COGNITIVE_CONFIG_PATH + ".personality_config"
+MOTIVATIONAL_BIAS_PATH = COGNITIVE_CONFIG_PATH + ".motivational_bias_config"
+EMOTIONAL_PROFILE_PATH = COGNITIVE_CONFIG_PATH + ".emotional_profile_config"
+
+TEMPLATE_AXIS = "template"
+
+AxisValues = Union[Sequence[Any], Mapping[str, Any]]
+
+
+def _axis_items(name: str, values: AxisValues) -> List[Tuple[Any, Any]]:
+    """Normalizes axis values to (label, value) pairs. Labels are JSON-friendly."""
+    if isinstance(values, Mapping):
+        items = list(values.items())
+    elif isinstance(values, (str, bytes)) or not isinstance(values, Sequence):
+        raise TypeError(f"Values of axis '{name}' must be a list or a dict of label -> value.")
+    else:
+        items = [(value if value is None or isinstance(value, (str, int, float, bool)) else i, value)
+                 for i, value in enumerate(values)]
+    if not items:
+        raise ValueError(f"Axis '{name}' has no values.")
+    return items
+
+
+def _resolve_parent(element: BaseElement, path: str) -> Tuple[Any, str]:
+    """Returns (container, last segment) for a dotted path; numeric segments index lists."""
+    segments = path.split(".")
+    target: Any = element
+    for segment in segments[:-1]:
+        target = target[int(segment)] if isinstance(target, list) else getattr(target, segment)
+    return target, segments[-1]
+
+
+def _set_path(element: BaseElement, path: str, value: Any):
+    parent, last = _resolve_parent(element, path)
+    if isinstance(parent, list):
+        parent[int(last)] = value
+    elif isinstance(parent, dict):
+        parent[last] = value
+    else:
+        setattr(parent, last, value)
+
+
+def content_hash(markdown: str) -> str:
+    """SHA-256 hex digest of a rendered prompt, used to detect duplicate variants."""
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+
+class BatchPromptGenerator:
+    """
+    Generates the rendered prompt of every combination of a set of parameter axes.
+
+    Args:
+        templates (Union[BaseElement, Mapping[str, BaseElement]]): The base template, or
+            label -> template for several (e.g. one per curriculum step). Several templates
+            form an extra axis named "template".
+        placeholder_axes (Optional[Mapping[str, AxisValues]]): Placeholder name -> values
+            to fill `{name}` with.
+        attribute_axes (Optional[Mapping[str, AxisValues]]): Dotted attribute path -> values
+            assigned at that path (e.g. `PERSONALITY_CONFIG_PATH` -> PersonalityConfig
+            instances, or `PERSONALITY_CONFIG_PATH + ".ocean_openness"` -> floats). Values
+            are copied per variant, and placeholders inside them are filled too.
+        base_data (Optional[Mapping[str, Any]]): Placeholder values shared by all variants.
+
+    Axis values are a list (labelled by the value itself if it is a JSON primitive, else by
+    its position) or a dict of label -> value. Each variant's "params" map every axis name
+    to the label used.
+
+    Raises:
+        TypeError: If a template is not a BaseElement or axis values are malformed.
+        ValueError: If an axis is empty, an axis name is used twice, or an attribute path
+            does not exist in a template.
+    """
+
+    def __init__(self,
+                 templates: Union[BaseElement, Mapping[str, BaseElement]],
+                 placeholder_axes: Optional[Mapping[str, AxisValues]] = None,
+                 attribute_axes: Optional[Mapping[str, AxisValues]] = None,
+                 base_data: Optional[Mapping[str, Any]] = None):
+        if isinstance(templates, BaseElement):
+            templates = {"base": templates}
+        if not templates:
+            raise ValueError("At least one template is required.")
+        self._templates: List[Tuple[Any, CompiledTemplate]] = [
+            (label, CompiledTemplate(template)) for label, template in templates.items()]
+        self.base_data: Dict[str, Any] = dict(base_data or {})
+        self.duplicates_skipped = 0
+
+        # Axes in iteration order: template (if several), placeholders, attributes.
+        self._axes: List[Tuple[str, str, List[Tuple[Any, Any]]]] = [] # (kind, name, [(label, value)])
+        if len(self._templates) > 1:
+            self._axes.append(("template", TEMPLATE_AXIS, [(label, i) for i, (label, _) in enumerate(self._templates)]))
+        for name, values in (placeholder_axes or {}).items():
+            self._axes.append(("placeholder", name, _axis_items(name, values)))
+        for path, values in (attribute_axes or {}).items():
+            items = _axis_items(path, values)
+            self._axes.append(("attribute", path, [(label, compile_value(value)) for label, value in items]))
+        names = [name for _, name, _ in self._axes]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Axis names must be unique. Got: {names}")
+        self._validate_paths(templates)
+
+    def _validate_paths(self, templates: Mapping[str, BaseElement]):
+        for kind, path, _ in self._axes:
+            if kind != "attribute":
+                continue
+            for label, template in templates.items():
+                try:
+                    _resolve_parent(template, path)
+                except (AttributeError, IndexError, ValueError, TypeError, KeyError) as e:
+                    raise ValueError(f"Attribute path '{path}' does not exist in template '{label}': {e}") from e
+
+    @classmethod
+    def from_curriculum(cls,
+                        curriculum: DevelopmentalCurriculum,
+                        prompt_dir: str,
+                        **kwargs) -> "BatchPromptGenerator":
+        """
+        Creates a generator whose template axis is the prompt of every curriculum step.
+
+        Args:
+            curriculum (DevelopmentalCurriculum): The curriculum; steps are labelled "<order>: <name>".
+            prompt_dir (str): Directory that the steps' `prompt_reference` paths are relative to.
+            **kwargs: Further `BatchPromptGenerator` arguments (axes, base_data).
+
+        Raises:
+            ValueError: If a step's prompt template cannot be loaded.
+        """
+        templates = {}
+        for step in curriculum.steps:
+            template = load_template(os.path.join(prompt_dir, step.prompt_reference))
+            if template is None:
+                raise ValueError(f"Could not load the prompt template of curriculum step '{step.name}': {step.prompt_reference}")
+            templates[f"{step.order}: {step.name}"] = template
+        return cls(templates, **kwargs)
+
+    @property
+    def axis_names(self) -> List[str]:
+        return [name for _, name, _ in self._axes]
+
+    def __len__(self) -> int:
+        """Number of combinations (before deduplication)."""
+        size = 1
+        for _, _, items in self._axes:
+            size *= len(items)
+        return size
+
+    def params(self, index: int) -> Dict[str, Any]:
+        """The axis labels of the variant with the given index."""
+        return {name: items[choice][0] for (_, name, items), choice in zip(self._axes, self._decode(index))}
+
+    def _decode(self, index: int) -> List[int]:
+        """Mixed-radix decoding of a variant index into one choice per axis (last axis fastest)."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Variant index {index} out of range (0..{len(self) - 1}).")
+        choices = []
+        for _, _, items in reversed(self._axes):
+            index, choice = divmod(index, len(items))
+            choices.append(choice)
+        return choices[::-1]
+
+    def build(self, index: int) -> BaseElement:
+        """Builds the filled element tree of one variant."""
+        choices = self._decode(index)
+        data = dict(self.base_data)
+        template = self._templates[0][1]
+        attributes = []
+        for (kind, name, items), choice in zip(self._axes, choices):
+            value = items[choice][1]
+            if kind == "template":
+                template = self._templates[value][1]
+            elif kind == "placeholder":
+                data[name] = value
+            else:
+                attributes.append((name, value))
+        element = template.fill(data)
+        for path, node in attributes:
+            _set_path(element, path, node.fill(data))
+        return element
+
+    def render(self, index: int) -> Dict[str, Any]:
+        """Builds and renders one variant: {"index", "params", "content_hash", "markdown"}."""
+        with render_cache_disabled(): # Each variant tree is rendered once and discarded
+            markdown = self.build(index).render()
+        return {"index": index, "params": self.params(index), "content_hash": content_hash(markdown), "markdown": markdown}
+
+    def _render_range(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        with render_cache_disabled():
+            return [self.render(index) for index in range(start, stop)]
+
+    def generate(self,
+                 dedupe: bool = True,
+                 max_workers: Optional[int] = 1,
+                 chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Streams every variant in index order.
+
+        Args:
+            dedupe (bool): Skip variants whose rendered Markdown was already emitted.
+            max_workers (Optional[int]): Worker processes; 1 renders in the calling process,
+                None uses the CPU count.
+            chunk_size (int): Variants rendered per worker task.
+
+        Yields:
+            Dict[str, Any]: {"index", "params", "content_hash", "markdown"} per variant.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        self.duplicates_skipped = 0
+        seen = set()
+        for variant in self._iter_rendered(max_workers, chunk_size):
+            if dedupe:
+                if variant["content_hash"] in seen:
+                    self.duplicates_skipped += 1
+                    continue
+                seen.add(variant["content_hash"])
+            yield variant
+
+    def _iter_rendered(self, max_workers: Optional[int], chunk_size: int) -> Iterator[Dict[str, Any]]:
+        total = len(self)
+        ranges = ((start, min(start + chunk_size, total)) for start in range(0, total, chunk_size))
+        if max_workers == 1 or total <= chunk_size:
+            for start, stop in ranges:
+                yield from self._render_range(start, stop)
+            return
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(self,)) as executor:
+            window = 2 * (max_workers or os.cpu_count() or 1)
+            pending = [executor.submit(_render_worker_range, start, stop) for start, stop in itertools.islice(ranges, window)]
+            while pending:
+                results = pending.pop(0).result() # In order, with at most `window` chunks in flight
+                next_range = next(ranges, None)
+                if next_range is not None:
+                    pending.append(executor.submit(_render_worker_range, *next_range))
+                yield from results
+
+    def write_jsonl(self, file_path: str, **generate_kwargs) -> Dict[str, Any]:
+        """
+        Writes every (deduplicated) variant as one JSON line to `file_path`.
+
+        Returns:
+            Dict[str, Any]: {"combinations", "written", "duplicates_skipped", "files"}.
+        """
+        written = 0
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for variant in self.generate(**generate_kwargs):
+                f.write(json.dumps(variant) + "\n")
+                written += 1
+        return {"combinations": len(self), "written": written,
+                "duplicates_skipped": self.duplicates_skipped, "files": [file_path]}
+
+    def write_sharded(self, directory: str, shard_size: int = 10000, **generate_kwargs) -> Dict[str, Any]:
+        """
+        Writes the variants to `directory` as JSONL shards of at most `shard_size` lines
+        (shard-00000.jsonl, ...) plus a manifest.json describing the axes and shards.
+
+        Returns:
+            Dict[str, Any]: The manifest contents.
+        """
+        if shard_size < 1:
+            raise ValueError("shard_size must be a positive integer.")
+        os.makedirs(directory, exist_ok=True)
+        shards: List[str] = []
+        written = 0
+        f = None
+        try:
+            for variant in self.generate(**generate_kwargs):
+                if written % shard_size == 0:
+                    if f:
+                        f.close()
+                    shards.append(f"shard-{len(shards):05d}.jsonl")
+                    f = open(os.path.join(directory, shards[-1]), 'w', encoding='utf-8')
+                f.write(json.dumps(variant) + "\n")
+                written += 1
+        finally:
+            if f:
+                f.close()
+        manifest = {"combinations": len(self), "written": written, "duplicates_skipped": self.duplicates_skipped,
+                    "axes": {name: [label for label, _ in items] for _, name, items in self._axes},
+                    "shard_size": shard_size, "files": shards}
+        with open(os.path.join(directory, "manifest.json"), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=4)
+        return manifest
+
+
+# --- Worker process state ---
+
+_worker_generator: Optional[BatchPromptGenerator] = None
+
+def _init_worker(generator: BatchPromptGenerator):
+    global _worker_generator
+    _worker_generator = generator
+
+def _render_worker_range(start: int, stop: int) -> List[Dict[str, Any]]:
+    return _worker_generator._render_range(start, stop)
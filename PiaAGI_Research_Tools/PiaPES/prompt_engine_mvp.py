@@ -1,15 +1,510 @@
 import textwrap
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Iterable, Iterator, Tuple, FrozenSet
 import json
+import os
+import re
+import zlib
+import copy
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+
+# --- Placeholder Template Compilation ---
+
+_PLACEHOLDER_PATTERN = re.compile(r"\{([^{}]*)\}")
+
+class TemplateString:
+    """
+    A string field tokenized once into literal chunks and placeholder slots.
+
+    `parts` alternates literal text and placeholder keys: even indices are literals,
+    odd indices are keys (the result of splitting on `{key}` with a capturing group).
+    Filling is a single join; placeholders without a value in `data` are kept verbatim.
+    """
+    __slots__ = ("text", "parts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts: Tuple[str, ...] = tuple(_PLACEHOLDER_PATTERN.split(text))
+
+    @property
+    def keys(self) -> FrozenSet[str]:
+        return frozenset(self.parts[1::2])
+
+    def fill(self, data: Dict[str, Any]) -> str:
+        parts = self.parts
+        if len(parts) == 1:
+            return self.text
+        pieces = list(parts)
+        for i in range(1, len(parts), 2):
+            key = parts[i]
+            pieces[i] = str(data[key]) if key in data else f"{{{key}}}"
+        return "".join(pieces)
+
+@lru_cache(maxsize=4096)
+def compile_template_string(text: str) -> TemplateString:
+    """Returns the (cached) tokenized form of `text`."""
+    return TemplateString(text)
+
+class _ConstantNode:
+    """Compiled value without placeholders; mutable values are copied on every fill."""
+    __slots__ = ("value", "immutable")
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.immutable = value is None or isinstance(value, (str, int, float, bool, tuple, frozenset))
+
+    def fill(self, data: Dict[str, Any]) -> Any:
+        return self.value if self.immutable else copy.deepcopy(self.value)
+
+class _ListNode:
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+
+    def fill(self, data: Dict[str, Any]) -> List[Any]:
+        return [item.fill(data) for item in self.items]
+
+class _DictNode:
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Tuple[Any, Any]]):
+        self.items = items
+
+    def fill(self, data: Dict[str, Any]) -> Dict[Any, Any]:
+        return {key: node.fill(data) for key, node in self.items}
+
+class _ElementNode:
+    """Compiled BaseElement: copies are created without calling __init__, like load_template does."""
+    __slots__ = ("cls", "attributes")
+
+    def __init__(self, cls: type, attributes: List[Tuple[str, Any]]):
+        self.cls = cls
+        self.attributes = attributes
+
+    def fill(self, data: Dict[str, Any]) -> "BaseElement":
+        instance = self.cls.__new__(self.cls)
+        instance.__dict__.update((name, node.fill(data)) for name, node in self.attributes)
+        return instance
+
+def _compile_value(value: Any, keys: set) -> Any:
+    """Compiles one attribute value into a fill node, collecting placeholder keys."""
+    if isinstance(value, str):
+        template = compile_template_string(value)
+        if len(template.parts) == 1:
+            return _ConstantNode(value)
+        keys.update(template.keys)
+        return template
+    if isinstance(value, BaseElement):
+        return _ElementNode(type(value), [(name, _compile_value(attr, keys)) for name, attr in value.__dict__.items()])
+    if isinstance(value, list):
+        return _ListNode([_compile_value(item, keys) for item in value])
+    if isinstance(value, dict):
+        return _DictNode([(k, _compile_value(v, keys)) for k, v in value.items()])
+    return _ConstantNode(value)
+
+def compile_value(value: Any) -> Any:
+    """
+    Compiles any attribute value (string, element, list, dict, ...) for repeated filling.
+    The result's `fill(data)` returns a new, filled copy of the value, as
+    `CompiledTemplate.fill` does for a whole element tree.
+    """
+    return _compile_value(value, set())
+
+class CompiledTemplate:
+    """
+    A prompt element tree compiled for repeated placeholder filling.
+
+    Compilation walks the element tree once and tokenizes every string field. Each
+    call to `fill` then builds a new, independent element tree with one join per
+    string field; the compiled template itself is never modified, so a single
+    instance can be shared by many threads.
+
+    Unlike `BaseElement.fill_placeholders`, values are substituted in one pass:
+    a substituted value containing `{other_key}` is not filled again.
+    """
+
+    def __init__(self, element: "BaseElement"):
+        if not isinstance(element, BaseElement):
+            raise TypeError(f"Only BaseElement derivatives can be compiled. Got: {type(element)}")
+        keys: set = set()
+        self._root = _compile_value(element, keys)
+        self.element_type = type(element)
+        self.placeholders: FrozenSet[str] = frozenset(keys)
+
+    def fill(self, data: Dict[str, Any]) -> "BaseElement":
+        """Returns a new element tree with the placeholders filled from `data`."""
+        return self._root.fill(data)
+
+    def render(self, data: Dict[str, Any], indent_level: int = 0) -> str:
+        """Fills the template with `data` and renders the resulting element."""
+        return self.fill(data).render(indent_level)
+
+    def fill_many(self, data_items: Iterable[Dict[str, Any]]) -> Iterator["BaseElement"]:
+        """Lazily fills the template once per item of `data_items`."""
+        for data in data_items:
+            yield self.fill(data)
+
+    def missing_placeholders(self, data: Dict[str, Any]) -> FrozenSet[str]:
+        """Returns the placeholders of the template that `data` does not provide."""
+        return frozenset(key for key in self.placeholders if key not in data)
+
+# --- End of Placeholder Template Compilation ---
+
+# --- Render Memoization ---
+#
+# Opt-in (`enable_render_cache()`): with the cache off, render() is a plain call. With it on,
+# each element keeps its rendered Markdown per (render function, indent level) and a list of
+# the elements it is an attribute of (directly or inside a list, dict or tuple). Changes
+# mark an element dirty by dropping its output and that of all its ancestors:
+# attribute assignment through `BaseElement.__setattr__` (installed only while the cache
+# is on) and in-place changes to list and dict attributes, which are replaced by the
+# tracking `_TrackedList` / `_TrackedDict` when the element is first cached. A clean
+# element returns its cached output without looking at its subtree.
+#
+# All cache state is stamped with a generation; `clear_render_cache()` and switching the
+# cache on or off start a new one, which makes every earlier state stale at once.
+
+_render_cache_enabled = False
+_render_generation = 0
+# Threads inside render_cache_disabled(); the thread-local flag is only read while the count is non-zero
+_render_pass = threading.local()
+_render_bypass_count = 0
+_render_bypass_lock = threading.Lock()
+
+class _RenderState:
+    """Cached outputs of one element and weak references to the elements containing it."""
+    __slots__ = ("generation", "outputs", "parents")
+
+    def __init__(self):
+        self.generation = _render_generation
+        self.outputs: Dict[Tuple[Any, int], str] = {}
+        self.parents: List["weakref.ref[BaseElement]"] = []
+
+def _current_state(element: "BaseElement") -> Optional[_RenderState]:
+    state = getattr(element, "_render_state", None)
+    return state if state is not None and state.generation == _render_generation else None
+
+def _invalidate(element: "BaseElement") -> None:
+    """Drops the cached output of `element` and of every element containing it."""
+    state = _current_state(element)
+    if state is None:
+        return
+    state.outputs.clear()
+    for ref in state.parents:
+        parent = ref()
+        if parent is not None:
+            _invalidate(parent)
+
+def _link(element: "BaseElement") -> _RenderState:
+    """Gives `element` a current state and tracks its attributes (recursively, for new children)."""
+    state = _RenderState()
+    object.__setattr__(element, "_render_state", state)
+    attributes = element.__dict__
+    for name, value in list(attributes.items()):
+        adopted = _adopt(element, value)
+        if adopted is not value:
+            attributes[name] = adopted
+    return state
+
+def _adopt(owner: "BaseElement", value: Any) -> Any:
+    """Links elements in `value` to `owner`; returns `value`, with lists and dicts replaced by tracking ones."""
+    if isinstance(value, BaseElement):
+        state = _current_state(value)
+        if state is None:
+            state = _link(value)
+        if not any(ref() is owner for ref in state.parents):
+            state.parents.append(weakref.ref(owner))
+        return value
+    if isinstance(value, (_TrackedList, _TrackedDict)):
+        value._track(owner)
+        return value
+    if type(value) is list:
+        tracked = _TrackedList(value)
+        tracked._track(owner)
+        return tracked
+    if type(value) is dict:
+        tracked = _TrackedDict(value)
+        tracked._track(owner)
+        return tracked
+    if type(value) is tuple:
+        for item in value:
+            _adopt(owner, item)
+    return value
+
+class _TrackingContainer:
+    """Mixin of the tracking containers: `_changed()` marks their owning elements dirty."""
+    __slots__ = ()
+
+    def _live_owners(self) -> List["BaseElement"]:
+        if self._generation != _render_generation:
+            return []
+        return [owner for owner in (ref() for ref in self._owners) if owner is not None]
+
+    def _track(self, owner: "BaseElement") -> None:
+        if self._generation != _render_generation:
+            self._generation, self._owners = _render_generation, []
+        elif any(ref() is owner for ref in self._owners):
+            return
+        self._owners.append(weakref.ref(owner))
+        self._adopt_items(owner)
+
+    def _adopted(self, value: Any) -> Any:
+        for owner in self._live_owners():
+            value = _adopt(owner, value)
+        return value
+
+    def _changed(self) -> None:
+        for owner in self._live_owners():
+            _invalidate(owner)
+
+class _TrackedList(_TrackingContainer, list):
+    """A list attribute of a cached element; in-place changes mark the element dirty."""
+    __slots__ = ("_owners", "_generation")
+
+    def __init__(self, items: Iterable[Any] = ()):
+        list.__init__(self, items)
+        self._owners: List["weakref.ref[BaseElement]"] = []
+        self._generation = -1
+
+    def __reduce_ex__(self, protocol):
+        return (type(self), (list(self),)) # Copies are detached from the owners
+
+    def _adopt_items(self, owner: "BaseElement") -> None:
+        for i, item in enumerate(self):
+            adopted = _adopt(owner, item)
+            if adopted is not item:
+                list.__setitem__(self, i, adopted)
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, [self._adopted(v) for v in value] if isinstance(index, slice) else self._adopted(value))
+        self._changed()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._changed()
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __imul__(self, count):
+        list.__imul__(self, count)
+        self._changed()
+        return self
+
+    def append(self, value):
+        list.append(self, self._adopted(value))
+        self._changed()
+
+    def extend(self, values):
+        list.extend(self, [self._adopted(v) for v in values])
+        self._changed()
+
+    def insert(self, index, value):
+        list.insert(self, index, self._adopted(value))
+        self._changed()
+
+    def pop(self, index=-1):
+        value = list.pop(self, index)
+        self._changed()
+        return value
+
+    def remove(self, value):
+        list.remove(self, value)
+        self._changed()
+
+    def clear(self):
+        list.clear(self)
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        list.reverse(self)
+        self._changed()
+
+class _TrackedDict(_TrackingContainer, dict):
+    """A dict attribute of a cached element; in-place changes mark the element dirty."""
+    __slots__ = ("_owners", "_generation")
+
+    def __init__(self, items: Any = ()):
+        dict.__init__(self, items)
+        self._owners: List["weakref.ref[BaseElement]"] = []
+        self._generation = -1
+
+    def __reduce_ex__(self, protocol):
+        return (type(self), (dict(self),))
+
+    def _adopt_items(self, owner: "BaseElement") -> None:
+        for key, item in self.items():
+            adopted = _adopt(owner, item)
+            if adopted is not item:
+                dict.__setitem__(self, key, adopted)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, self._adopted(value))
+        self._changed()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            dict.__setitem__(self, key, self._adopted(value))
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def pop(self, *args):
+        value = dict.pop(self, *args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self._changed()
+        return item
+
+    def clear(self):
+        dict.clear(self)
+        self._changed()
+
+def _tracking_setattr(self: "BaseElement", name: str, value: Any) -> None:
+    """`BaseElement.__setattr__` while the render cache is on."""
+    if _current_state(self) is None:
+        object.__setattr__(self, name, value)
+        return
+    object.__setattr__(self, name, _adopt(self, value))
+    _invalidate(self)
+
+def _memoized_render(render_func):
+    """
+    Wraps a `render(self, indent_level=0)` implementation with per-element memoization.
+    With the render cache on, a clean element returns its cached output; a dirty one
+    re-runs `render_func`, whose children are in turn served from their own caches.
+    """
+    @wraps(render_func)
+    def render(self, indent_level: int = 0) -> str:
+        if not _render_cache_enabled or (_render_bypass_count and getattr(_render_pass, "disabled", False)):
+            return render_func(self, indent_level)
+        key = (render_func, indent_level)
+        state = getattr(self, "_render_state", None)
+        if state is not None and state.generation == _render_generation:
+            output = state.outputs.get(key)
+            if output is not None:
+                return output
+        else:
+            state = None
+        output = render_func(self, indent_level)
+        if state is None:
+            state = _link(self)
+        state.outputs[key] = output
+        return output
+    render.__wrapped_render__ = render_func
+    return render
+
+def enable_render_cache(enabled: bool = True) -> bool:
+    """
+    Switches render memoization on or off for all elements and returns the previous setting.
+    The cache is off by default: it pays off for trees that are rendered repeatedly and
+    edited in between, not for trees rendered once (e.g. loaded per request).
+    """
+    global _render_cache_enabled, _render_generation
+    previous = _render_cache_enabled
+    _render_cache_enabled = bool(enabled)
+    _render_generation += 1
+    if _render_cache_enabled:
+        BaseElement.__setattr__ = _tracking_setattr
+    elif "__setattr__" in BaseElement.__dict__:
+        del BaseElement.__setattr__
+    return previous
+
+def clear_render_cache():
+    """Drops the cached render output of every element."""
+    global _render_generation
+    _render_generation += 1
+
+@contextmanager
+def render_cache_disabled():
+    """Renders in this thread bypass the cache, e.g. for one-off trees that are discarded after rendering."""
+    global _render_bypass_count
+    previous = getattr(_render_pass, "disabled", False)
+    _render_pass.disabled = True
+    with _render_bypass_lock:
+        _render_bypass_count += 1
+    try:
+        yield
+    finally:
+        _render_pass.disabled = previous
+        with _render_bypass_lock:
+            _render_bypass_count -= 1
+
+# --- End of Render Memoization ---
+
+# --- Element Type Registry ---
+
+# Serialized type name -> element class. Every BaseElement subclass registers itself under its
+# class name when it is defined; `register_element_type` adds further (e.g. legacy) names.
+ELEMENT_TYPES: Dict[str, type] = {}
+_ELEMENT_TYPE_NAMES: Dict[type, str] = {}
+
+def register_element_type(cls: type, name: Optional[str] = None) -> type:
+    """
+    Registers an element class for (de)serialization under `name` (default: the class name).
+    The first name registered for a class is the one written when saving.
+
+    Raises:
+        TypeError: If `cls` is not a BaseElement subclass.
+        ValueError: If `name` is already registered for a different class.
+    """
+    if not (isinstance(cls, type) and issubclass(cls, BaseElement)):
+        raise TypeError(f"Only BaseElement subclasses can be registered. Got: {cls}")
+    name = name or cls.__name__
+    registered = ELEMENT_TYPES.get(name)
+    if registered is not None and registered is not cls:
+        raise ValueError(f"Element type name '{name}' is already registered for {registered.__module__}.{registered.__qualname__}")
+    ELEMENT_TYPES[name] = cls
+    _ELEMENT_TYPE_NAMES.setdefault(cls, name)
+    return cls
+
+# --- End of Element Type Registry ---
 
 class BaseElement:
-    """Base class for all prompt elements to handle placeholder filling."""
+    """Base class for all prompt elements to handle placeholder filling and (memoized) rendering."""
+    __slots__ = ("__dict__", "__weakref__", "_render_state") # The render state stays out of __dict__
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.__name__ not in ELEMENT_TYPES:
+            register_element_type(cls)
+        # Every render override is memoized, so subclasses keep writing plain render methods.
+        if "render" in cls.__dict__ and not hasattr(cls.__dict__["render"], "__wrapped_render__"):
+            cls.render = _memoized_render(cls.__dict__["render"])
+
+    def __getstate__(self):
+        return self.__dict__ # Copies and pickles leave the render cache state behind
+
+    def mark_dirty(self):
+        """Drops the cached render output of this element and its ancestors (e.g. after editing `__dict__` directly)."""
+        _invalidate(self)
+
     def _fill_placeholders_str(self, text: Optional[str], data: Dict[str, str]) -> Optional[str]:
         if text is None:
             return None
-        for key, value in data.items():
-            text = text.replace(f"{{{key}}}", str(value))
-        return text
+        return compile_template_string(text).fill(data)
 
     def _fill_placeholders_list(self, items: Optional[List[str]], data: Dict[str, str]) -> Optional[List[str]]:
         if items is None:
@@ -31,8 +526,19 @@ class BaseElement:
                 new_dict[k] = v # For non-string/list/dict values, like numbers or booleans
         return new_dict
         
+    def compile(self) -> CompiledTemplate:
+        """Compiles this element tree for repeated, non-mutating placeholder filling."""
+        return CompiledTemplate(self)
+
+    def filled_copy(self, data: Dict[str, Any]) -> "BaseElement":
+        """Returns a filled copy of this element tree, leaving the element itself unchanged."""
+        return CompiledTemplate(self).fill(data)
+
     def fill_placeholders(self, data: Dict[str, str]):
-        """Recursively fills placeholders in the element and its children."""
+        """
+        Recursively fills placeholders in the element and its children, in place.
+        To fill the same template many times, use `compile()` and `CompiledTemplate.fill`.
+        """
         for attr_name, attr_value in self.__dict__.items():
             if isinstance(attr_value, str):
                 setattr(self, attr_name, self._fill_placeholders_str(attr_value, data))
@@ -82,61 +588,59 @@ class BaseElement:
             return f"{indent}{value}\n"
 
 
-    def render(self, indent_level: int = 0) -> str:
-        """Renders the element to Markdown, handling None values gracefully."""
-        output = ""
-        indent = "    " * indent_level
-        
-        # Special handling for class name as header if it's not a sub-element being rendered by a parent
-        class_name = self.__class__.__name__
-        # Avoid redundant headers if a parent is already rendering this element under its attribute name
-        if indent_level == 0 or not any(isinstance(getattr(self, attr, None), type(self)) for attr in self.__dict__):
-             if class_name not in ["PiaAGIPrompt", "SystemRules", "Requirements", "Users", "Executors", "Role", "Workflow", "RoleDevelopment", "CBTAutoTraining", "DevelopmentalScaffolding", "CognitiveModuleConfiguration", "PersonalityConfig", "MotivationalBias", "EmotionalProfile"]:
-                pass # Don't print generic BaseElement class name or other structural classes if they are top-level
-             elif class_name != "PiaAGIPrompt": # PiaAGIPrompt is the root, no header for it.
-                output += f"{indent}# {class_name.replace('_', ' ')}\n"
-
-
+    def _render_attributes(self, parts: List[str], indent: str, heading: str, child_indent_level: int, skip: Tuple[str, ...] = ()):
+        """Appends the Markdown of every non-empty attribute to `parts`, one `heading` section each."""
         for attr_name, attr_value in self.__dict__.items():
-            if attr_value is None or (isinstance(attr_value, (list, dict)) and not attr_value):
+            if attr_name in skip or attr_value is None or (isinstance(attr_value, (list, dict)) and not attr_value):
                 continue
 
             formatted_attr_name = attr_name.replace('_', ' ').title()
-            
+
             if isinstance(attr_value, BaseElement):
                 # Render child BaseElement, it will handle its own header if necessary
-                output += f"{indent}## {formatted_attr_name}\n"
-                rendered_child = attr_value.render(indent_level + 1)
+                parts.append(f"{indent}{heading} {formatted_attr_name}\n")
+                rendered_child = attr_value.render(child_indent_level)
                 if rendered_child.strip(): # Add only if child has content
-                     output += rendered_child
+                    parts.append(rendered_child)
             elif isinstance(attr_value, list) and all(isinstance(item, BaseElement) for item in attr_value):
-                output += f"{indent}## {formatted_attr_name}\n"
+                parts.append(f"{indent}{heading} {formatted_attr_name}\n")
                 for item in attr_value:
-                    rendered_item = item.render(indent_level + 1)
+                    rendered_item = item.render(child_indent_level)
                     if rendered_item.strip():
-                        output += rendered_item
+                        parts.append(rendered_item)
             elif isinstance(attr_value, dict):
-                output += f"{indent}## {formatted_attr_name}\n"
-                rendered_dict_items = ""
+                parts.append(f"{indent}{heading} {formatted_attr_name}\n")
                 for k, v in attr_value.items():
                     key_str = str(k).replace('_', ' ').title()
                     if isinstance(v, str) and v.strip():
-                         rendered_dict_items += f"{indent}    - **{key_str}:** {v}\n"
+                        parts.append(f"{indent}    - **{key_str}:** {v}\n")
                     elif isinstance(v, (int, float, bool)):
-                         rendered_dict_items += f"{indent}    - **{key_str}:** {str(v)}\n"
-                if rendered_dict_items.strip():
-                    output += rendered_dict_items
+                        parts.append(f"{indent}    - **{key_str}:** {str(v)}\n")
             elif isinstance(attr_value, list):
-                output += f"{indent}## {formatted_attr_name}\n"
-                rendered_list_items = ""
+                parts.append(f"{indent}{heading} {formatted_attr_name}\n")
                 for item_val in attr_value:
                     if isinstance(item_val, str) and item_val.strip():
-                        rendered_list_items += f"{indent}    - {item_val}\n"
-                if rendered_list_items.strip():
-                    output += rendered_list_items
+                        parts.append(f"{indent}    - {item_val}\n")
             elif isinstance(attr_value, (str, int, float, bool)) and str(attr_value).strip():
-                output += f"{indent}## {formatted_attr_name}\n{indent}    {attr_value}\n"
-        return output
+                parts.append(f"{indent}{heading} {formatted_attr_name}\n{indent}    {attr_value}\n")
+
+    @_memoized_render
+    def render(self, indent_level: int = 0) -> str:
+        """Renders the element to Markdown, handling None values gracefully. Memoized per element when the render cache is on."""
+        parts: List[str] = []
+        indent = "    " * indent_level
+
+        # Special handling for class name as header if it's not a sub-element being rendered by a parent
+        class_name = self.__class__.__name__
+        # Avoid redundant headers if a parent is already rendering this element under its attribute name
+        if indent_level == 0 or not any(isinstance(getattr(self, attr, None), type(self)) for attr in self.__dict__):
+             if class_name not in ["PiaAGIPrompt", "SystemRules", "Requirements", "Users", "Executors", "Role", "Workflow", "RoleDevelopment", "CBTAutoTraining", "DevelopmentalScaffolding", "CognitiveModuleConfiguration", "PersonalityConfig", "MotivationalBias", "EmotionalProfile"]:
+                pass # Don't print generic BaseElement class name or other structural classes if they are top-level
+             elif class_name != "PiaAGIPrompt": # PiaAGIPrompt is the root, no header for it.
+                parts.append(f"{indent}# {class_name.replace('_', ' ')}\n")
+
+        self._render_attributes(parts, indent, "##", indent_level + 1)
+        return "".join(parts)
 
 # --- Core PiaAGI Prompt Structure Elements ---
 
@@ -173,6 +677,8 @@ class UsersInteractors(BaseElement): # Renamed from Users to match Appendix
         self.profile = profile
         self.interaction_history_summary = interaction_history_summary
 
+register_element_type(UsersInteractors, "Users") # Name used before the rename
+
 # --- Cognitive Configuration Sub-Elements ---
 class PersonalityConfig(BaseElement):
     def __init__(self,
@@ -239,48 +745,10 @@ class Role(BaseElement):
     def render(self, indent_level: int = 0) -> str:
         # Custom render for Role to include its name prominently
         indent = "    " * indent_level
-        output = f"{indent}## Role: {self.name}\n"
-        
-        # Render other attributes, skipping 'name' as it's already rendered
-        for attr_name, attr_value in self.__dict__.items():
-            if attr_name == 'name' or attr_value is None or (isinstance(attr_value, (list, dict)) and not attr_value):
-                continue
-
-            formatted_attr_name = attr_name.replace('_', ' ').title()
-            if isinstance(attr_value, BaseElement):
-                output += f"{indent}### {formatted_attr_name}\n" # Use H3 for sub-sections of Role
-                rendered_child = attr_value.render(indent_level + 2) # Increase indent for children
-                if rendered_child.strip():
-                     output += rendered_child
-            elif isinstance(attr_value, list) and all(isinstance(item, BaseElement) for item in attr_value):
-                # This case might not be typical for Role if complex objects are directly attributes
-                output += f"{indent}### {formatted_attr_name}\n"
-                for item in attr_value:
-                    rendered_item = item.render(indent_level + 2)
-                    if rendered_item.strip():
-                        output += rendered_item
-            elif isinstance(attr_value, dict):
-                output += f"{indent}### {formatted_attr_name}\n"
-                rendered_dict_items = ""
-                for k, v in attr_value.items():
-                    key_str = str(k).replace('_', ' ').title()
-                    if isinstance(v, str) and v.strip():
-                         rendered_dict_items += f"{indent}    - **{key_str}:** {v}\n"
-                    elif isinstance(v, (int, float, bool)):
-                         rendered_dict_items += f"{indent}    - **{key_str}:** {str(v)}\n"
-                if rendered_dict_items.strip():
-                    output += rendered_dict_items
-            elif isinstance(attr_value, list):
-                output += f"{indent}### {formatted_attr_name}\n"
-                rendered_list_items = ""
-                for item_val in attr_value:
-                    if isinstance(item_val, str) and item_val.strip():
-                        rendered_list_items += f"{indent}    - {item_val}\n"
-                if rendered_list_items.strip():
-                    output += rendered_list_items
-            elif isinstance(attr_value, (str, int, float, bool)) and str(attr_value).strip():
-                 output += f"{indent}### {formatted_attr_name}\n{indent}    {attr_value}\n"
-        return output
+        parts = [f"{indent}## Role: {self.name}\n"]
+        # Render other attributes as H3 sub-sections of Role, skipping 'name' as it's already rendered
+        self._render_attributes(parts, indent, "###", indent_level + 2, skip=('name',))
+        return "".join(parts)
 
 class Executors(BaseElement):
     def __init__(self, role: Optional[Role] = None): # Simplified to one role for MVP
@@ -301,16 +769,16 @@ class WorkflowStep(BaseElement):
 
     def render(self, indent_level: int = 0) -> str:
         indent = "    " * indent_level
-        output = f"{indent}**{self.name}:**\n"
+        parts = [f"{indent}**{self.name}:**\n"]
         if self.action_directive:
-            output += f"{indent}    - Action Directive: {self.action_directive}\n"
+            parts.append(f"{indent}    - Action Directive: {self.action_directive}\n")
         if self.module_focus:
-            output += f"{indent}    - Module Focus: {', '.join(self.module_focus)}\n"
+            parts.append(f"{indent}    - Module Focus: {', '.join(self.module_focus)}\n")
         if self.expected_outcome_internal:
-            output += f"{indent}    - Expected Internal Outcome: {self.expected_outcome_internal}\n"
+            parts.append(f"{indent}    - Expected Internal Outcome: {self.expected_outcome_internal}\n")
         if self.expected_output_external:
-            output += f"{indent}    - Expected External Output: {self.expected_output_external}\n"
-        return output
+            parts.append(f"{indent}    - Expected External Output: {self.expected_output_external}\n")
+        return "".join(parts)
 
 class Workflow(BaseElement):
     def __init__(self, steps: Optional[List[WorkflowStep]] = None):
@@ -375,42 +843,42 @@ class PiaAGIPrompt(BaseElement):
 
     def render(self, indent_level: int = 0) -> str:
         """Renders the full prompt to Markdown."""
-        output = f"<!--\n"
-        if self.target_agi: output += f"  - Target AGI: {self.target_agi}\n"
-        if self.developmental_stage_target: output += f"  - Developmental Stage Target: {self.developmental_stage_target}\n"
-        if self.author: output += f"  - Author: {self.author}\n"
-        if self.version: output += f"  - Version: {self.version}\n"
-        if self.date: output += f"  - Date: {self.date}\n"
-        if self.objective: output += f"  - Objective: {self.objective}\n"
-        output += "-->\n\n"
+        parts = ["<!--\n"]
+        if self.target_agi: parts.append(f"  - Target AGI: {self.target_agi}\n")
+        if self.developmental_stage_target: parts.append(f"  - Developmental Stage Target: {self.developmental_stage_target}\n")
+        if self.author: parts.append(f"  - Author: {self.author}\n")
+        if self.version: parts.append(f"  - Version: {self.version}\n")
+        if self.date: parts.append(f"  - Date: {self.date}\n")
+        if self.objective: parts.append(f"  - Objective: {self.objective}\n")
+        parts.append("-->\n\n")
 
         # Render each main section
         if self.system_rules:
-            output += "# System_Rules\n"
-            output += self.system_rules.render(indent_level=1) + "\n" # Indent content under section
+            parts.append("# System_Rules\n")
+            parts.extend((self.system_rules.render(indent_level=1), "\n")) # Indent content under section
         if self.requirements and (self.requirements.goal or self.requirements.background_context or self.requirements.constraints_and_boundaries or self.requirements.success_metrics) :
-            output += "# Requirements\n"
-            output += self.requirements.render(indent_level=1) + "\n"
+            parts.append("# Requirements\n")
+            parts.extend((self.requirements.render(indent_level=1), "\n"))
         if self.users_interactors and (self.users_interactors.type or self.users_interactors.profile or self.users_interactors.interaction_history_summary):
-            output += "# Users_Interactors\n"
-            output += self.users_interactors.render(indent_level=1) + "\n"
+            parts.append("# Users_Interactors\n")
+            parts.extend((self.users_interactors.render(indent_level=1), "\n"))
         if self.executors and self.executors.role:
-            output += "# Executors\n"
-            output += self.executors.render(indent_level=1) + "\n" # Executor itself renders its Role
+            parts.append("# Executors\n")
+            parts.extend((self.executors.render(indent_level=1), "\n")) # Executor itself renders its Role
         if self.workflow_or_curriculum_phase and self.workflow_or_curriculum_phase.steps:
-            output += "# Workflow_Or_Curriculum_Phase\n"
-            output += self.workflow_or_curriculum_phase.render(indent_level=1) + "\n"
+            parts.append("# Workflow_Or_Curriculum_Phase\n")
+            parts.extend((self.workflow_or_curriculum_phase.render(indent_level=1), "\n"))
         if self.developmental_scaffolding_context and (self.developmental_scaffolding_context.current_developmental_goal or self.developmental_scaffolding_context.scaffolding_techniques_employed or self.developmental_scaffolding_context.feedback_level_from_overseer):
-            output += "# Developmental_Scaffolding_Context\n"
-            output += self.developmental_scaffolding_context.render(indent_level=1) + "\n"
+            parts.append("# Developmental_Scaffolding_Context\n")
+            parts.extend((self.developmental_scaffolding_context.render(indent_level=1), "\n"))
         if self.cbt_autotraining_protocol and (self.cbt_autotraining_protocol.training_scenario or self.cbt_autotraining_protocol.self_critique_focus): # Check if it has content
-            output += "# CBT_AutoTraining_Protocol\n"
-            output += self.cbt_autotraining_protocol.render(indent_level=1) + "\n"
+            parts.append("# CBT_AutoTraining_Protocol\n")
+            parts.extend((self.cbt_autotraining_protocol.render(indent_level=1), "\n"))
         if self.initiate_interaction:
-            output += "# Initiate_Interaction\n"
-            output += f"    {self.initiate_interaction}\n"
+            parts.append("# Initiate_Interaction\n")
+            parts.append(f"    {self.initiate_interaction}\n")
             
-        return output.strip()
+        return "".join(parts).strip()
 # --- Export to Markdown Function ---
 
 def export_to_markdown(element: BaseElement, filepath: str):
@@ -435,47 +903,77 @@ def export_to_markdown(element: BaseElement, filepath: str):
 
 # --- Template Saving and Loading Functions ---
 
+def _type_name(element: BaseElement) -> str:
+    # Unregistered classes (e.g. a second class reusing a registered name) are written under
+    # their class name, as before the registry existed.
+    cls = type(element)
+    return _ELEMENT_TYPE_NAMES.get(cls) or cls.__name__
+
+def element_to_data(value: Any) -> Any:
+    """
+    Converts an element tree to plain JSON-compatible data in one pass.
+    Elements become dicts with a '__type__' key followed by their attributes.
+    """
+    if isinstance(value, BaseElement):
+        data = {'__type__': _type_name(value)}
+        for key, attr in value.__dict__.items():
+            data[key] = element_to_data(attr)
+        return data
+    if isinstance(value, (list, tuple)):
+        return [element_to_data(item) for item in value]
+    if isinstance(value, dict):
+        return {key: element_to_data(item) for key, item in value.items()}
+    return value
+
+def _instantiate(cls: type, attributes: Dict[str, Any]) -> BaseElement:
+    # Create instance without calling __init__; the attribute dict is adopted as-is (no copy).
+    instance = cls.__new__(cls)
+    object.__setattr__(instance, '__dict__', attributes)
+    return instance
+
+def element_from_data(value: Any) -> Any:
+    """Single-pass inverse of `element_to_data` for already parsed data (e.g. from a request body)."""
+    if isinstance(value, dict):
+        converted = {key: element_from_data(item) for key, item in value.items()}
+        return pia_agi_object_hook(converted)
+    if isinstance(value, list):
+        return [element_from_data(item) for item in value]
+    return value
+
 class PiaAGIEncoder(json.JSONEncoder):
     """Custom JSON encoder for PiaAGI elements."""
     def default(self, obj):
         if isinstance(obj, BaseElement):
             # Create a dictionary that includes the type and all attributes
-            data = {'__type__': obj.__class__.__name__}
+            data = {'__type__': _type_name(obj)}
             data.update(obj.__dict__)
             return data
         return super().default(obj)
 
 def pia_agi_object_hook(dct: Dict[str, Any]) -> Any:
-    """Custom object hook for deserializing PiaAGI elements."""
-    if '__type__' in dct:
-        class_name = dct.pop('__type__')
-        cls = globals().get(class_name)
-        if cls and issubclass(cls, BaseElement):
-            # Create instance without calling __init__ initially
-            instance = cls.__new__(cls)
-
-            # For each item in dct, if it's a dictionary that represents a nested custom object,
-            # recursively call this hook (or allow json.loads to do it).
-            # If it's a list of such dictionaries, process each one.
-            processed_dct = {}
-            for key, value in dct.items():
-                if isinstance(value, dict): # Potentially a nested object
-                    processed_dct[key] = pia_agi_object_hook(value)
-                elif isinstance(value, list): # Potentially a list of nested objects
-                    processed_dct[key] = [pia_agi_object_hook(item) if isinstance(item, dict) else item for item in value]
-                else:
-                    processed_dct[key] = value
-
-            instance.__dict__.update(processed_dct) # Populate attributes
-            return instance
-    return dct
+    """
+    Custom object hook for deserializing PiaAGI elements.
+
+    `json.load` calls the hook bottom-up, so nested elements have already been converted
+    when their parent is hooked; the hook only resolves the type through the registry and
+    turns the dict itself into the instance's attribute dict. Dicts of unknown types are
+    returned unchanged.
+    """
+    type_name = dct.get('__type__')
+    if type_name is None:
+        return dct
+    cls = ELEMENT_TYPES.get(type_name)
+    if cls is None:
+        return dct
+    del dct['__type__']
+    return _instantiate(cls, dct)
 
 def save_template(element: BaseElement, filepath: str):
     """
     Saves a PiaAGI prompt element (or any BaseElement derivative) to a JSON file.
     """
     with open(filepath, 'w') as f:
-        json.dump(element, f, cls=PiaAGIEncoder, indent=4)
+        json.dump(element_to_data(element), f, indent=4)
 
 def load_template(filepath: str) -> Optional[BaseElement]:
     """
@@ -502,6 +1000,79 @@ def load_template(filepath: str) -> Optional[BaseElement]:
         print(f"An unexpected error occurred while loading template from {filepath}: {e}")
         return None
 
+def load_template_directory(directory: str, suffix: str = ".json") -> Dict[str, BaseElement]:
+    """
+    Loads every template file in `directory` whose name ends with `suffix`.
+    Files that cannot be loaded are reported (see `load_template`) and left out.
+
+    Returns:
+        Dict[str, BaseElement]: File name -> loaded element, sorted by file name.
+    """
+    templates = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(suffix):
+            element = load_template(os.path.join(directory, filename))
+            if element is not None:
+                templates[filename] = element
+    return templates
+
+# --- Binary Template Library Format ---
+# Bulk template libraries are stored as one file: a short header followed by the
+# zlib-compressed compact JSON of a name -> template mapping. Repeated structure (attribute
+# names, type tags, default values) compresses away, and decoding is one decompression plus
+# one C-level JSON parse that builds the elements bottom-up through the object hook.
+
+BINARY_MAGIC = b"PIAPES\x00\x01"
+
+def dumps_binary(value: Any, compression_level: int = 6) -> bytes:
+    """
+    Encodes an element tree (or plain data containing elements) in the binary library format.
+
+    Raises:
+        TypeError: If the data contains values that are not JSON-serializable.
+    """
+    payload = json.dumps(element_to_data(value), separators=(',', ':'), ensure_ascii=False)
+    return BINARY_MAGIC + zlib.compress(payload.encode('utf-8'), compression_level)
+
+def loads_binary(data: bytes) -> Any:
+    """
+    Decodes data written by `dumps_binary`.
+
+    Raises:
+        ValueError: If the data is not in the binary library format or is corrupt.
+    """
+    if not data.startswith(BINARY_MAGIC):
+        raise ValueError("Not a PiaPES binary template library (bad header).")
+    try:
+        payload = zlib.decompress(memoryview(data)[len(BINARY_MAGIC):])
+    except zlib.error as e:
+        raise ValueError(f"Corrupt binary template data: {e}") from e
+    return json.loads(payload, object_hook=pia_agi_object_hook) # JSONDecodeError is a ValueError
+
+def save_template_library(templates: Dict[str, BaseElement], filepath: str):
+    """Saves many templates (name -> element) to one binary library file."""
+    with open(filepath, 'wb') as f:
+        f.write(dumps_binary(dict(templates)))
+
+def load_template_library(filepath: str) -> Optional[Dict[str, BaseElement]]:
+    """
+    Loads a binary library file written by `save_template_library`.
+    Returns the name -> element mapping, or None if an error occurs.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            templates = loads_binary(f.read())
+    except FileNotFoundError:
+        print(f"Error: Template library not found at {filepath}")
+        return None
+    except ValueError as e:
+        print(f"Error: Could not decode template library {filepath}: {e}")
+        return None
+    if not isinstance(templates, dict):
+        print(f"Warning: Template library {filepath} does not contain a name -> template mapping. Type: {type(templates)}")
+        return None
+    return templates
+
 # --- End of Template Saving and Loading Functions ---
 
 
@@ -523,12 +1094,12 @@ class CurriculumStep(BaseElement):
 
     def render(self, indent_level: int = 0) -> str:
         indent = "    " * indent_level
-        output = f"{indent}### Step {self.order}: {self.name}\n"
-        output += f"{indent}- **Prompt Template:** {self.prompt_reference}\n"
+        parts = [f"{indent}### Step {self.order}: {self.name}\n",
+                 f"{indent}- **Prompt Template:** {self.prompt_reference}\n"]
         if self.conditions:
-            output += f"{indent}- **Conditions:** {self.conditions}\n"
+            parts.append(f"{indent}- **Conditions:** {self.conditions}\n")
         if self.notes:
-            output += f"{indent}- **Notes:** {self.notes}\n"
+            parts.append(f"{indent}- **Notes:** {self.notes}\n")
         # Potentially load and render the referenced prompt if needed,
         # but for now, keep it as a reference.
         # Example:
@@ -540,7 +1111,7 @@ class CurriculumStep(BaseElement):
         #         output += f"{indent}    </details>\n"
         # except Exception as e:
         #     output += f"{indent}    (Could not load/render prompt: {e})\n"
-        return output
+        return "".join(parts)
 
 class DevelopmentalCurriculum(BaseElement):
     """Represents a developmental curriculum composed of multiple steps."""
@@ -575,21 +1146,21 @@ class DevelopmentalCurriculum(BaseElement):
 
     def render(self, indent_level: int = 0) -> str:
         indent = "    " * indent_level
-        output = f"{indent}# Curriculum: {self.name}\n"
+        parts = [f"{indent}# Curriculum: {self.name}\n"]
         if self.author:
-            output += f"{indent}**Author:** {self.author}\n"
+            parts.append(f"{indent}**Author:** {self.author}\n")
         if self.version:
-            output += f"{indent}**Version:** {self.version}\n"
-        output += f"{indent}**Description:** {self.description}\n"
-        output += f"{indent}**Target Developmental Stage:** {self.target_developmental_stage}\n\n"
+            parts.append(f"{indent}**Version:** {self.version}\n")
+        parts.append(f"{indent}**Description:** {self.description}\n")
+        parts.append(f"{indent}**Target Developmental Stage:** {self.target_developmental_stage}\n\n")
 
-        output += f"{indent}## Curriculum Steps\n"
+        parts.append(f"{indent}## Curriculum Steps\n")
         if not self.steps:
-            output += f"{indent}No steps defined for this curriculum.\n"
+            parts.append(f"{indent}No steps defined for this curriculum.\n")
         else:
-            for step in self.steps:
-                output += step.render(indent_level + 1)
-        return output
+            for step in self.steps: # Unchanged steps are served from their render cache
+                parts.append(step.render(indent_level + 1))
+        return "".join(parts)
 
 # --- End of Developmental Curriculum Classes ---
 
@@ -0,0 +1,345 @@
+"""
+Catalog index for directories of PiaPES template files.
+
+The PiaPES web application and the unified WebApp backend list prompts and
+curricula by opening and parsing every JSON file in their template directory on
+each request, so listing latency grows linearly with the library. `TemplateCatalog`
+keeps the listing metadata (name, objective, author, developmental stage, version)
+of every file in an SQLite index instead:
+
+- Files are only parsed when they are new or their mtime/size changed; a refresh
+  otherwise costs a single `stat` of the directory (plus a full `scandir` at most
+  every `rescan_interval` seconds, which picks up files edited in place).
+- The web handlers report their own writes through `upsert` / `remove`, so a
+  listing right after a create, update or delete is always current.
+- Listings are paginated, searchable by name/objective/author/stage and carry an
+  ETag for conditional GETs.
+
+The index lives in a hidden SQLite file inside the template directory by default,
+so a restarted server only re-parses files that changed while it was down.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+CATALOG_FILENAME = ".piapes_catalog.sqlite3"
+CURRICULUM_SUFFIX = ".curriculum.json"
+TEMPLATE_SUFFIX = ".json"
+KIND_PROMPT = "prompt"
+KIND_CURRICULUM = "curriculum"
+
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS templates (
+    filename    TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    search_text TEXT NOT NULL,
+    author      TEXT NOT NULL,
+    stage       TEXT NOT NULL,
+    summary     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS templates_kind ON templates (kind, filename);
+"""
+
+
+def template_kind(filename: str) -> str:
+    """Returns KIND_CURRICULUM for '*.curriculum.json' files and KIND_PROMPT otherwise."""
+    return KIND_CURRICULUM if filename.endswith(CURRICULUM_SUFFIX) else KIND_PROMPT
+
+
+def extract_metadata(filename: str, data: Any) -> Dict[str, Any]:
+    """
+    Extracts the listing metadata of a parsed template file.
+
+    'name' follows the rule the listing endpoints always used: the prompt objective,
+    else the element name, else the filename.
+
+    Args:
+        filename (str): Name of the file within the template directory.
+        data (Any): The parsed JSON content of the file.
+
+    Returns:
+        Dict[str, Any]: filename, kind, name, version, objective, author and stage.
+    """
+    if not isinstance(data, dict):
+        data = {}
+    return {
+        "filename": filename,
+        "kind": template_kind(filename),
+        "name": data.get('objective', data.get('name', filename)),
+        "version": data.get('version', 'N/A'),
+        "objective": data.get('objective'),
+        "author": data.get('author'),
+        # Prompts and curricula name their stage field differently.
+        "stage": data.get('developmental_stage_target', data.get('target_developmental_stage')),
+    }
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).lower()
+
+
+def parse_listing_args(args: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Converts listing query parameters into `TemplateCatalog.query` keyword arguments.
+
+    Supported parameters are 'q' (free-text search over name, objective, author and
+    stage), 'author', 'stage', 'page' (1-based) and 'per_page'. Without 'per_page'
+    the whole (filtered) listing is returned, as the endpoints always did.
+
+    Args:
+        args (Mapping[str, Any]): The request's query parameters.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for `TemplateCatalog.query`.
+
+    Raises:
+        ValueError: If 'page' or 'per_page' is not a positive integer.
+    """
+    kwargs: Dict[str, Any] = {
+        "search": args.get('q') or None,
+        "author": args.get('author') or None,
+        "stage": args.get('stage') or None,
+        "offset": 0,
+        "limit": None,
+    }
+    per_page = args.get('per_page')
+    page = args.get('page')
+    try:
+        if per_page is not None:
+            kwargs["limit"] = int(per_page)
+        page_number = int(page) if page is not None else 1
+    except (TypeError, ValueError):
+        raise ValueError("'page' and 'per_page' must be integers.")
+    if (kwargs["limit"] is not None and kwargs["limit"] < 1) or page_number < 1:
+        raise ValueError("'page' and 'per_page' must be positive.")
+    if kwargs["limit"] is not None:
+        kwargs["offset"] = (page_number - 1) * kwargs["limit"]
+    return kwargs
+
+
+def listing_etag(items: List[Dict[str, Any]], total: int) -> str:
+    """Returns a strong ETag value for a listing page and its total count."""
+    digest = hashlib.sha1(json.dumps([total, items], sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class TemplateCatalog:
+    """
+    SQLite index of the template files in one directory.
+
+    Args:
+        directory (str): The template directory.
+        index_path (Optional[str]): SQLite database path. Defaults to CATALOG_FILENAME
+            inside `directory`; ":memory:" keeps the index in memory only.
+        rescan_interval (float): Seconds between full directory scans when the directory
+            itself did not change. Files edited in place by other tools appear in
+            listings after at most this delay.
+
+    The database is opened lazily on first use and all methods are thread-safe.
+    """
+
+    def __init__(self, directory: str, index_path: Optional[str] = None, rescan_interval: float = 2.0):
+        self.directory = os.path.abspath(directory)
+        self.index_path = index_path or os.path.join(self.directory, CATALOG_FILENAME)
+        self.rescan_interval = rescan_interval
+        self._lock = threading.RLock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._directory_mtime: Optional[int] = None
+        self._last_scan = float('-inf')
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            try:
+                connection = sqlite3.connect(self.index_path, check_same_thread=False)
+                self._prepare(connection)
+            except sqlite3.DatabaseError as e:
+                print(f"Warning: Catalog index '{self.index_path}' unusable ({e}); using an in-memory index.")
+                connection = sqlite3.connect(":memory:", check_same_thread=False)
+                self._prepare(connection)
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _prepare(connection: sqlite3.Connection) -> None:
+        if connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            connection.execute("DROP TABLE IF EXISTS templates")
+            connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        connection.executescript(_SCHEMA)
+        connection.commit()
+
+    def close(self) -> None:
+        """Closes the database connection; it is reopened on next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._directory_mtime = None
+            self._last_scan = float('-inf')
+
+    # --- Maintenance ---
+
+    def _index_file(self, connection: sqlite3.Connection, filename: str, stat: os.stat_result) -> None:
+        try:
+            with open(os.path.join(self.directory, filename), 'r') as f:
+                metadata = extract_metadata(filename, json.load(f))
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            print(f"Warning: Could not parse metadata from {filename}: {e}")
+            metadata = {"filename": filename, "kind": template_kind(filename), "name": filename,
+                        "version": "Error reading", "objective": None, "author": None, "stage": None}
+        search_text = "\n".join(_text(metadata[key]) for key in ("name", "objective", "author", "stage"))
+        connection.execute(
+            "INSERT OR REPLACE INTO templates VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (filename, metadata["kind"], stat.st_mtime_ns, stat.st_size, search_text,
+             _text(metadata["author"]), _text(metadata["stage"]), json.dumps(metadata, default=str)))
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Brings the index up to date with the directory.
+
+        A full scan only happens when `force` is set, the directory's mtime changed
+        (files were added, removed or renamed) or `rescan_interval` elapsed; it then
+        re-parses only the files whose mtime or size differ from the index.
+
+        Returns:
+            int: Number of files added, re-parsed or removed.
+        """
+        with self._lock:
+            connection = self._connect()
+            try:
+                directory_mtime = os.stat(self.directory).st_mtime_ns
+            except FileNotFoundError:
+                directory_mtime = None
+            now = time.monotonic()
+            if (not force and directory_mtime == self._directory_mtime
+                    and now - self._last_scan < self.rescan_interval):
+                return 0
+
+            on_disk: Dict[str, os.stat_result] = {}
+            if directory_mtime is not None:
+                with os.scandir(self.directory) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(TEMPLATE_SUFFIX) and entry.is_file():
+                            on_disk[entry.name] = entry.stat()
+            indexed = {row[0]: (row[1], row[2]) for row in
+                       connection.execute("SELECT filename, mtime_ns, size FROM templates")}
+
+            changes = 0
+            for filename, stat in on_disk.items():
+                if indexed.get(filename) != (stat.st_mtime_ns, stat.st_size):
+                    self._index_file(connection, filename, stat)
+                    changes += 1
+            removed = [(filename,) for filename in indexed if filename not in on_disk]
+            connection.executemany("DELETE FROM templates WHERE filename = ?", removed)
+            changes += len(removed)
+            if changes:
+                connection.commit()
+            if changes and directory_mtime is not None:
+                # The default index lives in the directory itself; its rollback journal
+                # touches the directory's mtime on every commit.
+                directory_mtime = os.stat(self.directory).st_mtime_ns
+            self._directory_mtime = directory_mtime
+            self._last_scan = now
+            return changes
+
+    def upsert(self, filename: str) -> None:
+        """Indexes (or re-indexes) one file after it was created or updated."""
+        with self._lock:
+            connection = self._connect()
+            try:
+                stat = os.stat(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                connection.execute("DELETE FROM templates WHERE filename = ?", (filename,))
+            else:
+                self._index_file(connection, filename, stat)
+            connection.commit()
+
+    def remove(self, filename: str) -> None:
+        """Drops one file from the index after it was deleted."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM templates WHERE filename = ?", (filename,))
+            connection.commit()
+
+    # --- Queries ---
+
+    def query(self,
+              kind: Optional[str] = None,
+              search: Optional[str] = None,
+              author: Optional[str] = None,
+              stage: Optional[str] = None,
+              offset: int = 0,
+              limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Lists indexed templates ordered by filename, refreshing the index first.
+
+        Args:
+            kind (Optional[str]): KIND_PROMPT or KIND_CURRICULUM; None lists every file.
+            search (Optional[str]): Case-insensitive terms that must all occur in the
+                name, objective, author or stage.
+            author (Optional[str]): Case-insensitive substring of the author.
+            stage (Optional[str]): Case-insensitive substring of the developmental stage.
+            offset (int): Number of matching entries to skip.
+            limit (Optional[int]): Maximum number of entries to return; None for all.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: The page of metadata dicts (see
+                `extract_metadata`) and the total number of matching entries.
+        """
+        clauses, params = [], []
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        for term in (search or "").lower().split():
+            clauses.append("instr(search_text, ?) > 0")
+            params.append(term)
+        if author:
+            clauses.append("instr(author, ?) > 0")
+            params.append(author.lower())
+        if stage:
+            clauses.append("instr(stage, ?) > 0")
+            params.append(stage.lower())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            self.refresh()
+            connection = self._connect()
+            total = connection.execute(f"SELECT COUNT(*) FROM templates{where}", params).fetchone()[0]
+            rows = connection.execute(f"SELECT summary FROM templates{where} ORDER BY filename LIMIT ? OFFSET ?",
+                                      params + [-1 if limit is None else limit, offset]).fetchall()
+        return [json.loads(row[0]) for row in rows], total
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.refresh()
+            return self._connect().execute("SELECT COUNT(*) FROM templates").fetchone()[0]
+
+
+_catalogs: Dict[str, TemplateCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(directory: str, **kwargs) -> TemplateCatalog:
+    """
+    Returns the shared catalog of `directory`, creating it on first use.
+
+    Args:
+        directory (str): The template directory.
+        **kwargs: Passed to `TemplateCatalog` when the catalog is created.
+
+    Returns:
+        TemplateCatalog: One instance per absolute directory path.
+    """
+    key = os.path.abspath(directory)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = _catalogs[key] = TemplateCatalog(key, **kwargs)
+        return catalog
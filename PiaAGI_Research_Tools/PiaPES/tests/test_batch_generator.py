@@ -0,0 +1,128 @@
+import unittest
+import copy
+import json
+import os
+import tempfile
+
+from PiaAGI_Research_Tools.PiaPES.prompt_engine_mvp import (
+    PiaAGIPrompt, Requirements, Executors, Role, CognitiveModuleConfiguration,
+    PersonalityConfig, MotivationalBias, EmotionalProfile,
+    DevelopmentalCurriculum, CurriculumStep, save_template
+)
+from PiaAGI_Research_Tools.PiaPES.batch_generator import (
+    BatchPromptGenerator, content_hash,
+    PERSONALITY_CONFIG_PATH, MOTIVATIONAL_BIAS_PATH, EMOTIONAL_PROFILE_PATH
+)
+
+
+def _create_template(objective: str = "Tutor {learner} in {topic}") -> PiaAGIPrompt:
+    return PiaAGIPrompt(
+        objective=objective,
+        requirements=Requirements(goal="Explain {topic}"),
+        executors=Executors(role=Role(name="Tutor", cognitive_module_configuration=CognitiveModuleConfiguration(
+            personality_config=PersonalityConfig(ocean_openness=0.5),
+            motivational_bias_config=MotivationalBias(biases={"Curiosity": "Medium"})
+        )))
+    )
+
+
+class TestBatchPromptGenerator(unittest.TestCase):
+    def setUp(self):
+        self.template = _create_template()
+        self.original_render = copy.deepcopy(self.template).render()
+        self.generator = BatchPromptGenerator(
+            self.template,
+            placeholder_axes={"topic": ["fractions", "algebra"]},
+            attribute_axes={
+                PERSONALITY_CONFIG_PATH + ".ocean_neuroticism": [0.2, 0.8],
+                EMOTIONAL_PROFILE_PATH: {"calm": EmotionalProfile(baseline_valence="Calm about {topic}"),
+                                         "anxious": EmotionalProfile(baseline_valence="Anxious")},
+                MOTIVATIONAL_BIAS_PATH + ".biases": [{"Curiosity": "High"}, {"Curiosity": "High"}],
+            },
+            base_data={"learner": "Sam"}
+        )
+
+    def _expected_markdown(self, topic, neuroticism, emotional_profile, biases):
+        prompt = _create_template()
+        config = prompt.executors.role.cognitive_module_configuration
+        config.personality_config.ocean_neuroticism = neuroticism
+        config.emotional_profile_config = copy.deepcopy(emotional_profile)
+        config.motivational_bias_config.biases = dict(biases)
+        return prompt.fill_placeholders({"learner": "Sam", "topic": topic}).render()
+
+    def test_every_combination_matches_manual_construction(self):
+        self.assertEqual(len(self.generator), 16)
+        self.assertEqual(self.generator.params(0), {
+            "topic": "fractions", PERSONALITY_CONFIG_PATH + ".ocean_neuroticism": 0.2,
+            EMOTIONAL_PROFILE_PATH: "calm", MOTIVATIONAL_BIAS_PATH + ".biases": 0})
+        profiles = {"calm": EmotionalProfile(baseline_valence="Calm about {topic}"), "anxious": EmotionalProfile(baseline_valence="Anxious")}
+        for index in (0, 5, 15):
+            variant = self.generator.render(index)
+            params = variant["params"]
+            expected = self._expected_markdown(params["topic"], params[PERSONALITY_CONFIG_PATH + ".ocean_neuroticism"],
+                                               profiles[params[EMOTIONAL_PROFILE_PATH]], {"Curiosity": "High"})
+            self.assertEqual(variant["markdown"], expected)
+            self.assertEqual(variant["content_hash"], content_hash(expected))
+        self.assertIn("Calm about fractions", self.generator.render(0)["markdown"])
+        self.assertEqual(self.template.render(), self.original_render) # Template untouched
+
+    def test_identical_outputs_are_deduplicated(self):
+        variants = list(self.generator.generate())
+        self.assertEqual(len(variants), 8) # The two bias values render identically
+        self.assertEqual(self.generator.duplicates_skipped, 8)
+        self.assertEqual(len({v["content_hash"] for v in variants}), 8)
+        self.assertEqual([v["index"] for v in variants], sorted(v["index"] for v in variants))
+        self.assertEqual(len(list(self.generator.generate(dedupe=False))), 16)
+
+    def test_worker_processes_match_in_process(self):
+        in_process = list(self.generator.generate(max_workers=1))
+        parallel = list(self.generator.generate(max_workers=2, chunk_size=3))
+        self.assertEqual(parallel, in_process)
+
+    def test_write_jsonl_and_shards(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonl_path = os.path.join(temp_dir, "variants.jsonl")
+            summary = self.generator.write_jsonl(jsonl_path)
+            self.assertEqual((summary["combinations"], summary["written"], summary["duplicates_skipped"]), (16, 8, 8))
+            with open(jsonl_path) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual(len(lines), 8)
+
+            shard_dir = os.path.join(temp_dir, "shards")
+            manifest = self.generator.write_sharded(shard_dir, shard_size=3)
+            self.assertEqual(manifest["files"], ["shard-00000.jsonl", "shard-00001.jsonl", "shard-00002.jsonl"])
+            self.assertEqual(manifest["axes"]["topic"], ["fractions", "algebra"])
+            with open(os.path.join(shard_dir, "manifest.json")) as f:
+                self.assertEqual(json.load(f), manifest)
+            with open(os.path.join(shard_dir, "shard-00002.jsonl")) as f:
+                self.assertEqual(len(f.readlines()), 2)
+
+    def test_curriculum_steps_form_template_axis(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_template(_create_template("Step one on {topic}"), os.path.join(temp_dir, "one.json"))
+            save_template(_create_template("Step two on {topic}"), os.path.join(temp_dir, "two.json"))
+            curriculum = DevelopmentalCurriculum(name="C", description="d", target_developmental_stage="S", steps=[
+                CurriculumStep(name="Second", order=2, prompt_reference="two.json"),
+                CurriculumStep(name="First", order=1, prompt_reference="one.json")])
+            generator = BatchPromptGenerator.from_curriculum(curriculum, temp_dir, placeholder_axes={"topic": ["x", "y"]})
+            self.assertEqual(generator.axis_names, ["template", "topic"])
+            self.assertEqual(generator.params(2), {"template": "2: Second", "topic": "x"})
+            self.assertIn("Step two on x", generator.render(2)["markdown"])
+
+            curriculum.add_step(CurriculumStep(name="Missing", order=3, prompt_reference="missing.json"))
+            with self.assertRaises(ValueError):
+                BatchPromptGenerator.from_curriculum(curriculum, temp_dir)
+
+    def test_invalid_axes(self):
+        with self.assertRaises(ValueError):
+            BatchPromptGenerator(self.template, attribute_axes={"executors.nonexistent.value": [1]})
+        with self.assertRaises(ValueError):
+            BatchPromptGenerator(self.template, placeholder_axes={"topic": []})
+        with self.assertRaises(TypeError):
+            BatchPromptGenerator(self.template, placeholder_axes={"topic": "fractions"})
+        with self.assertRaises(IndexError):
+            self.generator.render(16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import copy
 import os
 import tempfile
 import shutil
@@ -13,7 +14,10 @@ from PiaAGI_Research_Tools.PiaPES.prompt_engine_mvp import (
     CognitiveModuleConfiguration, PersonalityConfig, MotivationalBias, EmotionalProfile, LearningModuleConfig,
     Workflow, WorkflowStep, DevelopmentalScaffolding, CBTAutoTraining,
     CurriculumStep, DevelopmentalCurriculum,
-    save_template, load_template, export_to_markdown
+    save_template, load_template, export_to_markdown,
+    CompiledTemplate, compile_value, clear_render_cache, enable_render_cache,
+    ELEMENT_TYPES, register_element_type, pia_agi_object_hook, element_to_data, element_from_data,
+    dumps_binary, loads_binary, save_template_library, load_template_library, load_template_directory
 )
 
 # Helper function for deep dictionary comparison
@@ -523,5 +527,270 @@ class TestPromptEngineMVP(unittest.TestCase):
         expected_render = curriculum.render()
         self.assertEqual(content, expected_render)
 
+class TestCompiledTemplate(unittest.TestCase):
+    def _create_template(self) -> PiaAGIPrompt:
+        role = Role(
+            name="Tutor {persona_name}",
+            profile="A {persona_style} tutor",
+            cognitive_module_configuration=CognitiveModuleConfiguration(
+                personality_config=PersonalityConfig(ocean_openness=0.7, ocean_neuroticism="{neuroticism}"),
+                motivational_bias_config=MotivationalBias(biases={"curiosity": "{curiosity_level}", "task_focus": 0.8}),
+            )
+        )
+        return PiaAGIPrompt(
+            objective="Teach {topic} to {persona_name}. Keep {{literal}} braces and {unknown}.",
+            requirements=Requirements(goal="Explain {topic}", constraints_and_boundaries=["No {forbidden}", "Be kind"]),
+            executors=Executors(role=role),
+            workflow_or_curriculum_phase=Workflow(steps=[WorkflowStep(name="Intro", action_directive="Greet {persona_name}")]),
+            initiate_interaction="Hello {persona_name}."
+        )
+
+    def _data(self, i: int) -> dict:
+        return {"persona_name": f"P{i}", "persona_style": "patient", "neuroticism": 0.1 * i,
+                "curiosity_level": "High", "topic": "fractions", "forbidden": "jargon", "literal": "x"}
+
+    def test_fill_matches_in_place_fill_and_leaves_template_unchanged(self):
+        template = self._create_template()
+        original_render = template.render()
+        compiled = template.compile()
+        filled = compiled.fill(self._data(1))
+
+        expected = self._create_template().fill_placeholders(self._data(1))
+        self.assertTrue(compare_dicts(filled, expected))
+        self.assertEqual(filled.render(), expected.render())
+        self.assertEqual(template.render(), original_render) # Not mutated
+        self.assertEqual(filled.objective, "Teach fractions to P1. Keep {x} braces and {unknown}.")
+
+    def test_filled_copies_are_independent(self):
+        compiled = CompiledTemplate(self._create_template())
+        first, second = compiled.fill(self._data(1)), compiled.fill(self._data(2))
+        self.assertEqual(first.executors.role.name, "Tutor P1")
+        self.assertEqual(second.executors.role.name, "Tutor P2")
+        first.requirements.constraints_and_boundaries.append("Extra")
+        first.executors.role.cognitive_module_configuration.motivational_bias_config.biases["task_focus"] = 0.1
+        self.assertNotIn("Extra", second.requirements.constraints_and_boundaries)
+        self.assertEqual(compiled.fill(self._data(3)).executors.role.cognitive_module_configuration.motivational_bias_config.biases["task_focus"], 0.8)
+
+    def test_placeholders_and_missing(self):
+        compiled = self._create_template().compile()
+        self.assertIn("persona_name", compiled.placeholders)
+        self.assertIn("unknown", compiled.placeholders)
+        self.assertEqual(compiled.missing_placeholders(self._data(0)), frozenset({"unknown"}))
+
+    def test_single_pass_substitution(self):
+        element = SimpleElement(name="{a}", description="{b}")
+        filled = element.filled_copy({"a": "{b}", "b": "B"})
+        self.assertEqual(filled.name, "{b}") # Substituted values are not filled again
+        self.assertEqual(filled.description, "B")
+        self.assertEqual(element.name, "{a}")
+
+    def test_concurrent_fills(self):
+        from concurrent.futures import ThreadPoolExecutor
+        compiled = self._create_template().compile()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            renders = list(executor.map(lambda i: compiled.render(self._data(i)), range(200)))
+        for i in (0, 57, 199):
+            self.assertEqual(renders[i], self._create_template().fill_placeholders(self._data(i)).render())
+
+    def test_compile_curriculum_and_fill_many(self):
+        curriculum = DevelopmentalCurriculum(name="Curriculum for {learner}", description="d", target_developmental_stage="S1",
+                                             steps=[CurriculumStep(name="S {learner}", order=1, prompt_reference="p.json")])
+        filled = list(curriculum.compile().fill_many([{"learner": "A"}, {"learner": "B"}]))
+        self.assertEqual([c.name for c in filled], ["Curriculum for A", "Curriculum for B"])
+        self.assertEqual(filled[1].steps[0].name, "S B")
+        self.assertIsInstance(filled[0], DevelopmentalCurriculum)
+
+    def test_compile_value(self):
+        compiled = compile_value({"steps": [WorkflowStep(name="Greet {persona_name}")], "focus": "{topic}", "level": 0.5})
+        first, second = compiled.fill(self._data(1)), compiled.fill(self._data(2))
+        self.assertEqual((first["steps"][0].name, first["focus"], first["level"]), ("Greet P1", "fractions", 0.5))
+        self.assertEqual(second["steps"][0].name, "Greet P2")
+        self.assertIsNot(first["steps"], second["steps"])
+        self.assertEqual(compile_value("plain").fill({}), "plain")
+
+
+class CountingWorkflowStep(WorkflowStep):
+    render_calls = 0
+
+    def render(self, indent_level: int = 0) -> str:
+        CountingWorkflowStep.render_calls += 1
+        return super().render(indent_level)
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(enable_render_cache, enable_render_cache(True))
+        CountingWorkflowStep.render_calls = 0
+        self.steps = [CountingWorkflowStep(name=f"Step {i}", action_directive=f"Do {i}", module_focus=["Memory"]) for i in range(20)]
+        self.prompt = PiaAGIPrompt(
+            objective="Cache test",
+            requirements=Requirements(goal="Goal", constraints_and_boundaries=["A"]),
+            executors=Executors(role=Role(name="R", cognitive_module_configuration=CognitiveModuleConfiguration(
+                motivational_bias_config=MotivationalBias(biases={"curiosity": "High"})))),
+            workflow_or_curriculum_phase=Workflow(steps=self.steps)
+        )
+
+    def assertRendersFresh(self, element):
+        # A deep copy has no cache entries, so its render is computed from scratch
+        self.assertEqual(element.render(), copy.deepcopy(element).render())
+
+    def test_repeated_render_is_served_from_cache(self):
+        first = self.prompt.render()
+        calls_after_first = CountingWorkflowStep.render_calls
+        self.assertEqual(calls_after_first, 20)
+        self.assertEqual(self.prompt.render(), first)
+        self.assertEqual(CountingWorkflowStep.render_calls, calls_after_first)
+
+    def test_attribute_change_rerenders_only_that_subtree(self):
+        self.prompt.render()
+        CountingWorkflowStep.render_calls = 0
+        self.steps[7].action_directive = "Do something else"
+        rendered = self.prompt.render()
+        self.assertEqual(CountingWorkflowStep.render_calls, 1)
+        self.assertIn("Do something else", rendered)
+        self.assertRendersFresh(self.prompt)
+
+    def test_in_place_container_changes_are_detected(self):
+        self.prompt.render()
+        self.prompt.requirements.constraints_and_boundaries.append("B")
+        self.assertIn("    - B", self.prompt.render())
+        self.prompt.executors.role.cognitive_module_configuration.motivational_bias_config.biases["curiosity"] = "Low"
+        self.assertIn("**Curiosity:** Low", self.prompt.render())
+        self.steps[3].module_focus[0] = "Attention"
+        self.assertIn("Module Focus: Attention", self.prompt.render())
+        self.prompt.workflow_or_curriculum_phase.steps.append(WorkflowStep(name="Appended"))
+        self.assertIn("**Appended:**", self.prompt.render())
+        self.assertRendersFresh(self.prompt)
+
+    def test_previously_empty_section_becomes_visible(self):
+        self.prompt.render()
+        self.prompt.users_interactors.type = "Student"
+        self.assertIn("# Users_Interactors", self.prompt.render())
+        self.prompt.developmental_scaffolding_context.scaffolding_techniques_employed.append("Hinting")
+        self.assertIn("# Developmental_Scaffolding_Context", self.prompt.render())
+
+    def test_fill_placeholders_and_curriculum_edits_invalidate(self):
+        self.steps[0].name = "{step_name}"
+        self.prompt.render()
+        self.prompt.fill_placeholders({"step_name": "Filled"})
+        self.assertIn("**Filled:**", self.prompt.render())
+
+        curriculum = DevelopmentalCurriculum(name="C", description="d", target_developmental_stage="S",
+                                             steps=[CurriculumStep(name="Two", order=2, prompt_reference="b.json")])
+        curriculum.render()
+        curriculum.add_step(CurriculumStep(name="One", order=1, prompt_reference="a.json"))
+        rendered = curriculum.render()
+        self.assertLess(rendered.index("Step 1: One"), rendered.index("Step 2: Two"))
+        curriculum.steps[1].notes = "Note"
+        self.assertIn("**Notes:** Note", curriculum.render())
+
+    def test_cache_is_off_by_default_and_can_be_switched(self):
+        enable_render_cache(False)
+        first = self.prompt.render()
+        self.assertEqual(self.prompt.render(), first)
+        self.assertEqual(CountingWorkflowStep.render_calls, 40) # No caching
+        self.assertIs(type(self.prompt.workflow_or_curriculum_phase.steps), list)
+
+        enable_render_cache(True)
+        self.prompt.render()
+        self.prompt.workflow_or_curriculum_phase.steps.append(WorkflowStep(name="While cached"))
+        enable_render_cache(False)
+        self.prompt.workflow_or_curriculum_phase.steps.append(WorkflowStep(name="While off"))
+        self.steps[2].name = "Renamed while off"
+        enable_render_cache(True)
+        rendered = self.prompt.render()
+        for text in ("**While cached:**", "**While off:**", "**Renamed while off:**"):
+            self.assertIn(text, rendered)
+        self.steps[2].name = "Renamed again"
+        self.assertIn("**Renamed again:**", self.prompt.render())
+        self.assertRendersFresh(self.prompt)
+
+    def test_shared_and_copied_elements(self):
+        self.prompt.render()
+        shallow = copy.copy(self.prompt.workflow_or_curriculum_phase)
+        other = PiaAGIPrompt(objective="Other", workflow_or_curriculum_phase=shallow)
+        other.render()
+        shallow.steps.append(WorkflowStep(name="Shared list"))
+        self.assertIn("**Shared list:**", self.prompt.render())
+        self.assertIn("**Shared list:**", other.render())
+        self.steps[0].name = "Shared step"
+        self.assertIn("**Shared step:**", other.render())
+
+        clone = copy.deepcopy(self.prompt)
+        clone.workflow_or_curriculum_phase.steps[0].name = "Clone only"
+        self.assertIn("**Clone only:**", clone.render())
+        self.assertNotIn("**Clone only:**", self.prompt.render())
+        self.assertRendersFresh(clone)
+
+    def test_cache_does_not_leak_into_attributes(self):
+        self.prompt.render()
+        self.assertNotIn("_render_cache", vars(self.prompt))
+        self.assertTrue(compare_dicts(self.prompt, copy.deepcopy(self.prompt)))
+
+
+class TestSerializationRegistry(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.prompt = TestPromptEngineMVP()._create_sample_pia_agi_prompt()
+        self.curriculum = DevelopmentalCurriculum(name="C", description="d", target_developmental_stage="S",
+                                                  steps=[CurriculumStep(name="S1", order=1, prompt_reference="p.json")])
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_element_types_are_registered(self):
+        self.assertIs(ELEMENT_TYPES["PiaAGIPrompt"], PiaAGIPrompt)
+        self.assertIs(ELEMENT_TYPES["CurriculumStep"], CurriculumStep)
+        with self.assertRaises(TypeError):
+            register_element_type(dict)
+        with self.assertRaises(ValueError):
+            register_element_type(Role, "PiaAGIPrompt")
+
+    def test_alias_resolves_to_registered_class(self):
+        register_element_type(UsersInteractors, "Users") # Registered by default; re-registering is a no-op
+        loaded = json.loads('{"__type__": "Users", "type": "Student", "profile": null}', object_hook=pia_agi_object_hook)
+        self.assertIsInstance(loaded, UsersInteractors)
+        self.assertEqual(element_to_data(loaded)["__type__"], "UsersInteractors") # Written under the class name
+
+    def test_unknown_type_is_left_as_dict(self):
+        data = json.loads('{"__type__": "NotAnElement", "a": {"__type__": "SystemRules", "language": "en"}}',
+                          object_hook=pia_agi_object_hook)
+        self.assertEqual(data["__type__"], "NotAnElement")
+        self.assertIsInstance(data["a"], SystemRules)
+
+    def test_element_from_data_single_pass(self):
+        data = element_to_data(self.prompt)
+        self.assertIsInstance(data["executors"]["role"], dict)
+        rebuilt = element_from_data(json.loads(json.dumps(data)))
+        self.assertTrue(compare_dicts(rebuilt, self.prompt))
+        self.assertEqual(rebuilt.render(), self.prompt.render())
+
+    def test_binary_round_trip(self):
+        payload = dumps_binary({"prompt": self.prompt, "curriculum": self.curriculum})
+        self.assertLess(len(payload), len(json.dumps(element_to_data(self.prompt))))
+        loaded = loads_binary(payload)
+        self.assertTrue(compare_dicts(loaded["prompt"], self.prompt))
+        self.assertTrue(compare_dicts(loaded["curriculum"], self.curriculum))
+        with self.assertRaises(ValueError):
+            loads_binary(b"not a library")
+        with self.assertRaises(ValueError):
+            loads_binary(payload[:-5])
+
+    def test_library_and_directory_loading(self):
+        save_template(self.prompt, os.path.join(self.test_dir, "a.json"))
+        save_template(self.curriculum, os.path.join(self.test_dir, "b.curriculum.json"))
+        with open(os.path.join(self.test_dir, "broken.json"), 'w') as f:
+            f.write("{not json")
+        templates = load_template_directory(self.test_dir)
+        self.assertEqual(list(templates), ["a.json", "b.curriculum.json"])
+
+        library_path = os.path.join(self.test_dir, "library.bin")
+        save_template_library(templates, library_path)
+        library = load_template_library(library_path)
+        self.assertEqual(list(library), ["a.json", "b.curriculum.json"])
+        self.assertTrue(compare_dicts(library["a.json"], self.prompt))
+        self.assertIsNone(load_template_library(os.path.join(self.test_dir, "a.json")))
+        self.assertIsNone(load_template_library(os.path.join(self.test_dir, "missing.bin")))
+
+
 if __name__ == '__main__':
     unittest.main()
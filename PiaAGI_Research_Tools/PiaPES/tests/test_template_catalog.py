@@ -0,0 +1,99 @@
+import unittest
+import json
+import os
+import tempfile
+
+from PiaAGI_Research_Tools.PiaPES.template_catalog import (
+    TemplateCatalog, parse_listing_args, listing_etag, KIND_PROMPT, KIND_CURRICULUM
+)
+
+
+class TestTemplateCatalog(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+        for i in range(30):
+            self._write(f"prompt_{i:02}.json", {"__type__": "PiaAGIPrompt", "objective": f"Teach topic {i}",
+                                                "author": "Ada" if i % 3 == 0 else "Grace",
+                                                "developmental_stage_target": "PiaSeedling", "version": "1.0"})
+        self._write("intro.curriculum.json", {"__type__": "DevelopmentalCurriculum", "name": "Intro Curriculum",
+                                              "target_developmental_stage": "PiaSprout", "author": "Ada"})
+        self.catalog = TemplateCatalog(self.directory, rescan_interval=0)
+
+    def tearDown(self):
+        self.catalog.close()
+        self.temp_dir.cleanup()
+
+    def _write(self, filename, data):
+        with open(os.path.join(self.directory, filename), 'w') as f:
+            f.write(data if isinstance(data, str) else json.dumps(data))
+
+    def test_listing_metadata_and_kinds(self):
+        items, total = self.catalog.query()
+        self.assertEqual(total, 31)
+        self.assertEqual([item["filename"] for item in items], sorted(item["filename"] for item in items))
+        curricula, total = self.catalog.query(kind=KIND_CURRICULUM)
+        self.assertEqual(total, 1)
+        self.assertEqual(curricula[0]["name"], "Intro Curriculum")
+        self.assertEqual(curricula[0]["stage"], "PiaSprout")
+        self.assertEqual(curricula[0]["version"], "N/A")
+        prompts, total = self.catalog.query(kind=KIND_PROMPT, limit=1)
+        self.assertEqual(total, 30)
+        self.assertEqual(prompts[0]["name"], "Teach topic 0")
+
+    def test_pagination_and_search(self):
+        page, total = self.catalog.query(kind=KIND_PROMPT, offset=10, limit=10)
+        self.assertEqual(total, 30)
+        self.assertEqual([item["filename"] for item in page], [f"prompt_{i:02}.json" for i in range(10, 20)])
+        _, total = self.catalog.query(search="TOPIC 1")
+        self.assertEqual(total, 12) # 1, 10-19 and 21
+        _, total = self.catalog.query(author="ada")
+        self.assertEqual(total, 11) # 10 prompts plus the curriculum
+        items, total = self.catalog.query(search="sprout ada")
+        self.assertEqual([item["filename"] for item in items], ["intro.curriculum.json"])
+
+    def test_updates_on_disk_and_through_hooks(self):
+        self._write("prompt_00.json", {"objective": "Renamed objective with more text"})
+        os.remove(os.path.join(self.directory, "prompt_01.json"))
+        self._write("broken.json", "{")
+        items, total = self.catalog.query(kind=KIND_PROMPT)
+        self.assertEqual(total, 30)
+        by_name = {item["filename"]: item for item in items}
+        self.assertEqual(by_name["prompt_00.json"]["name"], "Renamed objective with more text")
+        self.assertNotIn("prompt_01.json", by_name)
+        self.assertEqual(by_name["broken.json"]["version"], "Error reading")
+
+        self.catalog.rescan_interval = 3600 # Only the explicit hooks can report in-place edits now
+        self._write("prompt_02.json", {"objective": "Edited in place, same directory listing"})
+        self.assertEqual(self.catalog.query(search="edited")[1], 0)
+        self.catalog.upsert("prompt_02.json")
+        self.assertEqual(self.catalog.query(search="edited")[1], 1)
+        os.remove(os.path.join(self.directory, "prompt_02.json"))
+        self.catalog.remove("prompt_02.json")
+        self.assertEqual(self.catalog.query(search="edited")[1], 0)
+
+    def test_index_persists_and_only_changed_files_are_reparsed(self):
+        self.assertEqual(self.catalog.refresh(force=True), 31)
+        self.catalog.close()
+        reopened = TemplateCatalog(self.directory)
+        self.assertEqual(reopened.refresh(), 0)
+        self._write("new.json", {"objective": "New"})
+        self.assertEqual(reopened.refresh(), 1)
+        self.assertEqual(len(reopened), 32)
+        reopened.close()
+
+    def test_listing_args_and_etag(self):
+        self.assertEqual(parse_listing_args({"q": "x", "page": "3", "per_page": "20"}),
+                         {"search": "x", "author": None, "stage": None, "offset": 40, "limit": 20})
+        self.assertEqual(parse_listing_args({})["limit"], None)
+        for bad in ({"per_page": "0"}, {"page": "-1"}, {"per_page": "ten"}):
+            with self.assertRaises(ValueError):
+                parse_listing_args(bad)
+        items, total = self.catalog.query(limit=5)
+        self.assertEqual(listing_etag(items, total), listing_etag(*self.catalog.query(limit=5)))
+        self._write("prompt_03.json", {"objective": "Changed"})
+        self.assertNotEqual(listing_etag(items, total), listing_etag(*self.catalog.query(limit=5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
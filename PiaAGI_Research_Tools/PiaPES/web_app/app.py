@@ -2,7 +2,7 @@ import os
 import sys
 import json
 import re
-from flask import Flask, request, jsonify, abort, render_template, flash, redirect, url_for
+from flask import Flask, request, jsonify, abort, render_template, flash, redirect, url_for, make_response
 
 # --- Add PiaPES directory to sys.path ---
 # This allows importing prompt_engine_mvp
@@ -41,6 +41,8 @@ except ImportError as e:
     except ImportError:
         raise e # Re-raise the original error if fallback also fails
 
+from template_catalog import get_catalog, parse_listing_args, listing_etag, KIND_CURRICULUM
+
 app = Flask(__name__)
 PROMPT_DIR = os.path.join(os.path.dirname(__file__), 'prompt_files')
 
@@ -60,6 +62,23 @@ def sanitize_filename(name):
         name = "unnamed_prompt"
     return name + ".json"
 
+def catalog_listing_response(kind=None):
+    """
+    Builds a (conditional) listing response from the catalog index of PROMPT_DIR.
+
+    The body stays a JSON list of template summaries; pagination metadata travels in
+    the X-Total-Count header. Query parameters: q, author, stage, page, per_page.
+    """
+    try:
+        query_args = parse_listing_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    items, total = get_catalog(PROMPT_DIR).query(kind=kind, **query_args)
+    response = make_response(jsonify(items))
+    response.headers['X-Total-Count'] = str(total)
+    response.set_etag(listing_etag(items, total))
+    return response.make_conditional(request)
+
 # --- HTML Serving Routes ---
 
 @app.route('/')
@@ -281,25 +300,7 @@ def route_view_curriculum(filename):
 @app.route('/api/prompts', methods=['GET'])
 def api_list_prompts():
     try:
-        prompt_infos = []
-        for filename in os.listdir(PROMPT_DIR):
-            if filename.endswith('.json'):
-                filepath = os.path.join(PROMPT_DIR, filename)
-                try:
-                    with open(filepath, 'r') as f:
-                        # Partially load JSON to get name/objective and version without full object reconstruction
-                        data = json.load(f)
-                        name = data.get('objective', data.get('name', filename)) # Use objective or name if available
-                        version = data.get('version', 'N/A')
-                        prompt_infos.append({
-                            "filename": filename,
-                            "name": name,
-                            "version": version
-                        })
-                except Exception as e:
-                    app.logger.warn(f"Could not parse metadata from {filename}: {e}")
-                    prompt_infos.append({"filename": filename, "name": filename, "version": "Error reading"})
-        return jsonify(prompt_infos)
+        return catalog_listing_response()
     except Exception as e:
         app.logger.error(f"Error listing prompts: {e}")
         return jsonify({"error": "Failed to list prompts"}), 500
@@ -373,6 +374,8 @@ def create_prompt():
              return jsonify({"error": "Invalid prompt data structure after reconstruction. Ensure correct __type__ hints and fields."}), 400
 
         save_template(prompt_object, filepath)
+
+        get_catalog(PROMPT_DIR).upsert(filename)
         return jsonify({"message": f"Prompt '{filename}' created successfully.", "filename": filename}), 201
     except json.JSONDecodeError as e:
         app.logger.error(f"JSONDecodeError creating prompt {filename}: {e}")
@@ -407,6 +410,8 @@ def api_update_prompt(filename):
              return jsonify({"error": "Invalid prompt data structure after reconstruction. Ensure correct __type__ hints and fields."}), 400
 
         save_template(prompt_object, filepath)
+
+        get_catalog(PROMPT_DIR).upsert(filename)
         return jsonify({"message": f"Prompt '{filename}' updated successfully."})
     except json.JSONDecodeError as e:
         app.logger.error(f"JSONDecodeError updating prompt {filename}: {e}")
@@ -426,6 +431,7 @@ def api_delete_prompt(filename):
 
     try:
         os.remove(filepath)
+        get_catalog(PROMPT_DIR).remove(filename)
         return jsonify({"message": f"Prompt '{filename}' deleted successfully."})
     except Exception as e:
         app.logger.error(f"Error deleting prompt {filename}: {e}")
@@ -452,24 +458,7 @@ def api_render_prompt_markdown(filename):
 @app.route('/api/curricula', methods=['GET'])
 def api_list_curricula():
     try:
-        curriculum_files = []
-        for filename in os.listdir(PROMPT_DIR):
-            if filename.endswith('.curriculum.json'): # Specific suffix for curricula
-                filepath = os.path.join(PROMPT_DIR, filename)
-                try:
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-                        name = data.get('name', filename) # Use curriculum name if available
-                        version = data.get('version', 'N/A')
-                        curriculum_files.append({
-                            "filename": filename,
-                            "name": name,
-                            "version": version
-                        })
-                except Exception as e:
-                    app.logger.warn(f"Could not parse metadata from curriculum {filename}: {e}")
-                    curriculum_files.append({"filename": filename, "name": filename, "version": "Error reading"})
-        return jsonify(curriculum_files)
+        return catalog_listing_response(KIND_CURRICULUM)
     except Exception as e:
         app.logger.error(f"Error listing curricula: {e}")
         return jsonify({"error": "Failed to list curricula"}), 500
@@ -586,6 +575,8 @@ def api_create_curriculum():
              return jsonify({"error": "Error reconstructing curriculum object. Ensure data structure and __type__ hints are correct."}), 400
 
         save_template(curriculum_object, filepath)
+
+        get_catalog(PROMPT_DIR).upsert(filename)
         return jsonify({"message": f"Curriculum '{filename}' created successfully.", "filename": filename}), 201
     except json.JSONDecodeError as e: # Should be caught by initial parsing if not JSON
         app.logger.error(f"JSONDecodeError creating curriculum {filename}: {e}")
@@ -630,6 +621,7 @@ def api_update_curriculum_metadata(filename):
 
         if updated_fields_count > 0:
             save_template(curriculum_obj, filepath)
+            get_catalog(PROMPT_DIR).upsert(filename)
             return jsonify({"message": f"Curriculum metadata for '{filename}' updated successfully.", "filename": filename}), 200
         else:
             return jsonify({"message": f"No recognized metadata fields provided for update in '{filename}'. No changes made."}), 200
@@ -174,5 +174,3 @@ class QLearningAgent(AgentInterface):
         if self.current_state is not None and self.current_state not in self.q_table and self.action_space:
             self.initialize_q_table(self.current_state, self.action_space)
         print(f"QLearningAgent {self.agent_id} configured with action space: {self.action_space}")
-
-```
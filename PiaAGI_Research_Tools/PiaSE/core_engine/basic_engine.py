@@ -9,6 +9,7 @@ from .interfaces import (
 )
 from typing import Dict, List, Optional, Any, Union # Added Union
 import time
+import json
 from pathlib import Path
 
 try:
@@ -47,9 +48,6 @@ class PiaSELogger: # Basic Logger provided in prompt
         if not self.log_file_path.exists():
             self.log_file_path.touch()
 
-
-import json # Added import for json
-
     def log(self, simulation_step: int, event_type: str, source_component: str, data: Dict, wall_time: Optional[float] = None):
         if wall_time is None:
             wall_time = time.time()
@@ -488,5 +488,3 @@ if __name__ == "__main__":
     import os
     if os.path.exists(dummy_filepath):
         os.remove(dummy_filepath)
-
-```
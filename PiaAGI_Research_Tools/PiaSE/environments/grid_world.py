@@ -393,4 +393,3 @@ class GridWorld(Environment):
 
 # Need to import copy for deepcopy
 import copy
-```
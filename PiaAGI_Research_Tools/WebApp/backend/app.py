@@ -1,5 +1,5 @@
 import os
-from flask import Flask, request, jsonify, abort
+from flask import Flask, request, jsonify, abort, make_response, Response
 from dotenv import load_dotenv
 from openai import OpenAI, APIError, AuthenticationError, RateLimitError, APIConnectionError
 from flask_cors import CORS
@@ -9,6 +9,10 @@ import logging # Added for logging
 import json # For PiaPES integration
 import re # For PiaPES sanitize_filename
 
+# --- Setup Logging ---
+logging.basicConfig(level=logging.INFO) # Ensure logging is configured early
+logger = logging.getLogger(__name__) # app.logger can be used too once app is created
+
 # --- Path Setup ---
 # Add PiaAGI_Research_Tools to sys.path to allow direct imports of its submodules (PiaCML, PiaPES, etc.)
 # This assumes app.py is in PiaAGI_Research_Tools/WebApp/backend/
@@ -18,6 +22,10 @@ try:
     path_to_research_tools_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
     if path_to_research_tools_root not in sys.path:
         sys.path.insert(0, path_to_research_tools_root) # Add PiaAGI_Research_Tools to path
+    # Its parent, for package imports such as `PiaAGI_Research_Tools.PiaSE.environments.grid_world`
+    path_to_repository_root = os.path.dirname(path_to_research_tools_root)
+    if path_to_repository_root not in sys.path:
+        sys.path.append(path_to_repository_root)
 
     # The following specific additions for PiaPES, PiaSE, PiaAVT might be redundant
     # if these are proper packages within PiaAGI_Research_Tools and PiaAGI_Research_Tools itself is in sys.path.
@@ -37,6 +45,8 @@ try:
 
     # Note: CML imports like `from PiaCML.concrete_perception_module import ...` will work
     # because `path_to_research_tools_root` (which contains PiaCML as a sub-directory/package) is in sys.path.
+except Exception as e:
+    print(f"Error setting up sys.path for PiaAGI_Research_Tools: {e}")
 
 
 # --- Matplotlib Configuration (early) ---
@@ -51,13 +61,18 @@ try:
     from PiaCML.concrete_emotion_module import ConcreteEmotionModule
     from PiaCML.concrete_motivational_system_module import ConcreteMotivationalSystemModule
     from PiaCML.concrete_working_memory_module import ConcreteWorkingMemoryModule
+    from PiaCML.message_bus import MessageBus
     logger.info("CML modules imported successfully.")
+    CML_AVAILABLE = True
 except ImportError as e:
     logger.error(f"Error importing CML modules: {e}. Using dummy classes. Ensure PiaAGI_Research_Tools is in PYTHONPATH or sys.path is correct, and PiaCML is a package.")
     class ConcretePerceptionModule: pass
     class ConcreteEmotionModule: pass
     class ConcreteMotivationalSystemModule: pass
     class ConcreteWorkingMemoryModule: pass
+    class MessageBus: pass
+    CML_AVAILABLE = False
+from cml_sessions import CMLSessionManager, DEFAULT_SESSION_ID, run_batch
 # --- End CML Imports ---
 
 # --- PiaPES Imports ---
@@ -67,6 +82,7 @@ try:
         save_template, load_template,
         pia_agi_object_hook, PiaAGIEncoder
     )
+    from template_catalog import get_catalog, parse_listing_args, listing_etag, KIND_PROMPT, KIND_CURRICULUM
     logger.info("PiaPES prompt_engine_mvp components imported successfully.")
 except ImportError as e:
     logger.error(f"Error importing from prompt_engine_mvp: {e}. PiaPES functionalities will be unavailable. Ensure PiaPES is in sys.path.")
@@ -83,10 +99,11 @@ except ImportError as e:
 # --- PiaSE Imports ---
 import time # For PiaSE run folder naming
 try:
-    from core_engine.basic_engine import BasicSimulationEngine # PiaSE/core_engine/basic_engine.py
-    from environments.grid_world import GridWorld # PiaSE/environments/grid_world.py
-    from agents.q_learning_agent import QLearningAgent # PiaSE/agents/q_learning_agent.py
-    from utils.visualizer import GridWorldVisualizer # PiaSE/utils/visualizer.py
+    # Imported as a package: grid_world and q_learning_agent import the PiaSE interfaces relative to it
+    from PiaAGI_Research_Tools.PiaSE.core_engine.basic_engine import BasicSimulationEngine
+    from PiaAGI_Research_Tools.PiaSE.environments.grid_world import GridWorld
+    from PiaAGI_Research_Tools.PiaSE.agents.q_learning_agent import QLearningAgent
+    from PiaAGI_Research_Tools.PiaSE.utils.visualizer import GridWorldVisualizer
     logger.info("PiaSE components imported successfully.")
 except ImportError as e:
     logger.error(f"Error importing PiaSE components: {e}. PiaSE functionalities will be unavailable. Ensure PiaSE is in sys.path and its internal structure is correct (e.g., __init__.py files).")
@@ -95,6 +112,7 @@ except ImportError as e:
     class GridWorld: pass
     class QLearningAgent: pass
     class GridWorldVisualizer: pass
+from piase_jobs import SimulationJobManager, JobQueueFullError, parse_scenario_params, FINISHED_STATES
 # --- End PiaSE Imports ---
 
 
@@ -108,11 +126,6 @@ if 'PiaAGIEncoder' in globals(): # Check if PiaAGIEncoder was successfully impor
 else:
     logger.warning("PiaAGIEncoder not available. Using default JSON encoder.")
 
-
-# --- Setup Logging ---
-logging.basicConfig(level=logging.INFO) # Ensure logging is configured early
-logger = logging.getLogger(__name__) # app.logger can be used too once app is created
-
 # --- LLM Configuration ---
 llm_config = configparser.ConfigParser()
 LLM_CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'llm_config.ini')
@@ -149,11 +162,28 @@ def get_default_llm_model(provider='OpenAI'):
         return 'gpt-3.5-turbo'
 
 # --- CML Module Instantiations ---
-# For V1 WebApp, using global instances. Consider session-based or request-based for more advanced use.
-perception_module_instance = ConcretePerceptionModule() if 'ConcretePerceptionModule' in globals() else None
-emotion_module_instance = ConcreteEmotionModule() if 'ConcreteEmotionModule' in globals() else None
-motivational_system_instance = ConcreteMotivationalSystemModule() if 'ConcreteMotivationalSystemModule' in globals() else None
-working_memory_instance = ConcreteWorkingMemoryModule(capacity=5) if 'ConcreteWorkingMemoryModule' in globals() else None
+# Every client session gets its own module graph (see cml_sessions.py). Requests without
+# a session id share the DEFAULT_SESSION_ID graph, which replaces the former global instances.
+CML_SESSION_HEADER = 'X-CML-Session'
+
+def build_cml_session_graph(session_id):
+    """Creates the MessageBus and the CML modules of one session, wired to that bus."""
+    if not CML_AVAILABLE:
+        return None, {}
+    bus = MessageBus()
+    modules = {
+        "perception": ConcretePerceptionModule(message_bus=bus, module_id=f"ConcretePerceptionModule_{session_id}"),
+        "emotion": ConcreteEmotionModule(message_bus=bus, module_id=f"ConcreteEmotionModule_{session_id}"),
+        "motivation": ConcreteMotivationalSystemModule(message_bus=bus, module_id=f"ConcreteMotivationalSystemModule_{session_id}"),
+        "wm": ConcreteWorkingMemoryModule(capacity=5, message_bus=bus, module_id=f"WorkingMemoryModule_{session_id}"),
+    }
+    return bus, modules
+
+cml_session_manager = CMLSessionManager(
+    build_cml_session_graph,
+    max_sessions=int(os.environ.get('CML_MAX_SESSIONS', 64)),
+    ttl_seconds=float(os.environ.get('CML_SESSION_TTL_SECONDS', 1800))
+)
 # --- End CML Module Instantiations ---
 
 # --- PiaPES Configuration ---
@@ -193,8 +223,8 @@ if PIAVT_DIR not in sys.path:
 # it should work if PiaAVT is treated as a package (i.e. has __init__.py and is discoverable).
 
 # For file uploads
-import tempfile
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 
 try:
     from api import PiaAVTAPI # Assuming api.py is in PiaAVT directory
@@ -209,6 +239,7 @@ except ImportError as e:
     logger.warning("Please ensure PiaAVT is structured as a package or all its necessary paths are in PYTHONPATH.")
     class PiaAVTAPI: pass # Dummy class
     PIAVT_AVAILABLE = False
+from avt_cache import AnalysisCache, HashingLineReader, MultipartUpload, UploadTooLargeError
 # --- End PiaAVT Imports & Configuration ---
 
 
@@ -288,243 +319,138 @@ def process_prompt():
         logger.error(f"An unexpected error occurred in /api/process_prompt: {e}", exc_info=True)
         return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
 
-# --- Routes for ConcretePerceptionModule ---
-@app.route('/cml/perception/process', methods=['POST'])
-def cml_perception_process():
-    if not perception_module_instance:
-        logger.error("PerceptionModule not initialized for /cml/perception/process")
-        return jsonify({"error": "PerceptionModule not initialized"}), 500
+# --- CML Session Helpers ---
+def current_cml_session_id():
+    """The session id of the request: the X-CML-Session header, else the 'session_id' query parameter."""
+    return request.headers.get(CML_SESSION_HEADER) or request.args.get('session_id') or DEFAULT_SESSION_ID
+
+def cml_operation_response(operation, args=None):
+    """Runs one CML operation in the request's session and returns it as a JSON response."""
+    route = f"/cml/{operation.replace('.', '/')}"
+    try:
+        session = cml_session_manager.get(current_cml_session_id())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     try:
-        data = request.json
-        raw_input = data.get('raw_input')
-        modality = data.get('modality')
-        context = data.get('context', {})
-        result = perception_module_instance.process_sensory_input(raw_input, modality, context)
-        return jsonify(result)
+        return jsonify(session.run(operation, args))
+    except LookupError as e:
+        logger.error(f"{e} ({route})")
+        return jsonify({"error": str(e)}), 500
     except Exception as e:
-        logger.error(f"Error in /cml/perception/process: {e}", exc_info=True)
+        logger.error(f"Error in {route}: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+@app.route('/cml/sessions', methods=['POST'])
+def cml_create_session():
+    data = request.get_json(silent=True) or {}
+    try:
+        session = cml_session_manager.get(data.get('session_id'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(session.status()), 201
+
+@app.route('/cml/sessions', methods=['GET'])
+def cml_list_sessions():
+    return jsonify(cml_session_manager.stats())
+
+@app.route('/cml/sessions/<session_id>', methods=['DELETE'])
+def cml_close_session(session_id):
+    if not cml_session_manager.close(session_id):
+        return jsonify({"error": f"CML session '{session_id}' not found."}), 404
+    return jsonify({"message": f"CML session '{session_id}' closed."})
+
+@app.route('/cml/batch', methods=['POST'])
+def cml_batch():
+    """Applies {"operations": [{"op": "wm.add_item", "args": {...}}, ...]} to one session in a single request."""
+    data = request.get_json(silent=True) or {}
+    operations = data.get('operations')
+    if not isinstance(operations, list):
+        return jsonify({"error": "'operations' must be a list of {\"op\": ..., \"args\": {...}} objects."}), 400
+    try:
+        session = cml_session_manager.get(data.get('session_id') or current_cml_session_id())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    results = run_batch(session, operations, stop_on_error=bool(data.get('stop_on_error', False)))
+    return jsonify({"session_id": session.session_id, "results": results})
+
+# --- Routes for ConcretePerceptionModule ---
+@app.route('/cml/perception/process', methods=['POST'])
+def cml_perception_process():
+    return cml_operation_response('perception.process', request.get_json(silent=True))
+
 @app.route('/cml/perception/status', methods=['GET'])
 def cml_perception_status():
-    if not perception_module_instance:
-        logger.error("PerceptionModule not initialized for /cml/perception/status")
-        return jsonify({"error": "PerceptionModule not initialized"}), 500
-    try:
-        return jsonify(perception_module_instance.get_module_status())
-    except Exception as e:
-        logger.error(f"Error in /cml/perception/status: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('perception.status')
 
 # --- Routes for ConcreteEmotionModule ---
 @app.route('/cml/emotion/appraise', methods=['POST'])
 def cml_emotion_appraise():
-    if not emotion_module_instance:
-        logger.error("EmotionModule not initialized for /cml/emotion/appraise")
-        return jsonify({"error": "EmotionModule not initialized"}), 500
-    try:
-        data = request.json
-        event_info = data.get('event_info')
-        context = data.get('context', {})
-        result = emotion_module_instance.appraise_situation(event_info, context)
-        return jsonify(result)
-    except Exception as e:
-        logger.error(f"Error in /cml/emotion/appraise: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('emotion.appraise', request.get_json(silent=True))
 
 @app.route('/cml/emotion/current', methods=['GET'])
 def cml_emotion_current():
-    if not emotion_module_instance:
-        logger.error("EmotionModule not initialized for /cml/emotion/current")
-        return jsonify({"error": "EmotionModule not initialized"}), 500
-    try:
-        return jsonify(emotion_module_instance.get_current_emotion())
-    except Exception as e:
-        logger.error(f"Error in /cml/emotion/current: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('emotion.current')
 
 @app.route('/cml/emotion/express', methods=['GET']) # Or POST if context is sent
 def cml_emotion_express():
-    if not emotion_module_instance:
-        logger.error("EmotionModule not initialized for /cml/emotion/express")
-        return jsonify({"error": "EmotionModule not initialized"}), 500
-    try:
-        # context = request.json.get('context', {}) if request.is_json else {} # if context can be sent
-        return jsonify(emotion_module_instance.express_emotion(context=None))
-    except Exception as e:
-        logger.error(f"Error in /cml/emotion/express: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('emotion.express')
 
 @app.route('/cml/emotion/status', methods=['GET'])
 def cml_emotion_status():
-    if not emotion_module_instance:
-        logger.error("EmotionModule not initialized for /cml/emotion/status")
-        return jsonify({"error": "EmotionModule not initialized"}), 500
-    try:
-        return jsonify(emotion_module_instance.get_module_status())
-    except Exception as e:
-        logger.error(f"Error in /cml/emotion/status: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('emotion.status')
 
 # --- Routes for ConcreteMotivationalSystemModule ---
 @app.route('/cml/motivation/manage', methods=['POST'])
 def cml_motivation_manage():
-    if not motivational_system_instance:
-        logger.error("MotivationalSystemModule not initialized for /cml/motivation/manage")
-        return jsonify({"error": "MotivationalSystemModule not initialized"}), 500
-    try:
-        data = request.json
-        action = data.get('action')
-        goal_data = data.get('goal_data', {})
-        result = motivational_system_instance.manage_goals(action, goal_data)
-        return jsonify(result) if isinstance(result, (bool, str, list, dict)) else (jsonify(result) if result is not None else jsonify({"status": "ok_no_return"}) )
-    except Exception as e:
-        logger.error(f"Error in /cml/motivation/manage: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('motivation.manage', request.get_json(silent=True))
 
 @app.route('/cml/motivation/active_goals', methods=['GET'])
 def cml_motivation_active_goals():
-    if not motivational_system_instance:
-        logger.error("MotivationalSystemModule not initialized for /cml/motivation/active_goals")
-        return jsonify({"error": "MotivationalSystemModule not initialized"}), 500
-    try:
-        N = request.args.get('N', default=0, type=int)
-        min_priority = request.args.get('min_priority', default=0.0, type=float)
-        result = motivational_system_instance.get_active_goals(N, min_priority)
-        return jsonify(result)
-    except Exception as e:
-        logger.error(f"Error in /cml/motivation/active_goals: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('motivation.active_goals', {
+        "N": request.args.get('N', default=0, type=int),
+        "min_priority": request.args.get('min_priority', default=0.0, type=float)
+    })
 
 @app.route('/cml/motivation/update_state', methods=['POST'])
 def cml_motivation_update_state():
-    if not motivational_system_instance:
-        logger.error("MotivationalSystemModule not initialized for /cml/motivation/update_state")
-        return jsonify({"error": "MotivationalSystemModule not initialized"}), 500
-    try:
-        data = request.json
-        result = motivational_system_instance.update_motivation_state(data)
-        return jsonify({"success": result})
-    except Exception as e:
-        logger.error(f"Error in /cml/motivation/update_state: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('motivation.update_state', request.get_json(silent=True))
 
 @app.route('/cml/motivation/status', methods=['GET'])
 def cml_motivation_status():
-    if not motivational_system_instance:
-        logger.error("MotivationalSystemModule not initialized for /cml/motivation/status")
-        return jsonify({"error": "MotivationalSystemModule not initialized"}), 500
-    try:
-        return jsonify(motivational_system_instance.get_module_status())
-    except Exception as e:
-        logger.error(f"Error in /cml/motivation/status: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('motivation.status')
 
 # --- Routes for ConcreteWorkingMemoryModule ---
 @app.route('/cml/wm/add_item', methods=['POST'])
 def cml_wm_add_item():
-    if not working_memory_instance:
-        logger.error("WorkingMemoryModule not initialized for /cml/wm/add_item")
-        return jsonify({"error": "WorkingMemoryModule not initialized"}), 500
-    try:
-        data = request.json
-        item_content = data.get('item_content')
-        salience = data.get('salience', 0.5)
-        context = data.get('context', {})
-        item_id = working_memory_instance.add_item_to_workspace(item_content, salience, context)
-        return jsonify({"item_id": item_id, "current_size": len(working_memory_instance.get_workspace_contents())})
-    except Exception as e:
-        logger.error(f"Error in /cml/wm/add_item: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('wm.add_item', request.get_json(silent=True))
 
 @app.route('/cml/wm/remove_item', methods=['POST'])
 def cml_wm_remove_item():
-    if not working_memory_instance:
-        logger.error("WorkingMemoryModule not initialized for /cml/wm/remove_item")
-        return jsonify({"error": "WorkingMemoryModule not initialized"}), 500
-    try:
-        data = request.json
-        item_id = data.get('item_id')
-        success = working_memory_instance.remove_item_from_workspace(item_id)
-        return jsonify({"success": success, "current_size": len(working_memory_instance.get_workspace_contents())})
-    except Exception as e:
-        logger.error(f"Error in /cml/wm/remove_item: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('wm.remove_item', request.get_json(silent=True))
 
 @app.route('/cml/wm/contents', methods=['GET'])
 def cml_wm_contents():
-    if not working_memory_instance:
-        logger.error("WorkingMemoryModule not initialized for /cml/wm/contents")
-        return jsonify({"error": "WorkingMemoryModule not initialized"}), 500
-    try:
-        return jsonify(working_memory_instance.get_workspace_contents())
-    except Exception as e:
-        logger.error(f"Error in /cml/wm/contents: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('wm.contents')
 
 @app.route('/cml/wm/set_focus', methods=['POST'])
 def cml_wm_set_focus():
-    if not working_memory_instance:
-        logger.error("WorkingMemoryModule not initialized for /cml/wm/set_focus")
-        return jsonify({"error": "WorkingMemoryModule not initialized"}), 500
-    try:
-        data = request.json
-        item_id = data.get('item_id')
-        success = working_memory_instance.set_active_focus(item_id)
-        return jsonify({"success": success, "current_focus": working_memory_instance.get_active_focus()})
-    except Exception as e:
-        logger.error(f"Error in /cml/wm/set_focus: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('wm.set_focus', request.get_json(silent=True))
 
 @app.route('/cml/wm/get_focus', methods=['GET'])
 def cml_wm_get_focus():
-    if not working_memory_instance:
-        logger.error("WorkingMemoryModule not initialized for /cml/wm/get_focus")
-        return jsonify({"error": "WorkingMemoryModule not initialized"}), 500
-    try:
-        return jsonify(working_memory_instance.get_active_focus())
-    except Exception as e:
-        logger.error(f"Error in /cml/wm/get_focus: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('wm.get_focus')
 
 @app.route('/cml/wm/manage_capacity', methods=['POST']) # Explicit call if needed
 def cml_wm_manage_capacity():
-    if not working_memory_instance:
-        logger.error("WorkingMemoryModule not initialized for /cml/wm/manage_capacity")
-        return jsonify({"error": "WorkingMemoryModule not initialized"}), 500
-    try:
-        data = request.json
-        new_item_salience = data.get('new_item_salience') # Optional
-        working_memory_instance.manage_workspace_capacity_and_coherence(new_item_salience)
-        return jsonify({"status": "capacity_managed", "current_size": len(working_memory_instance.get_workspace_contents())})
-    except Exception as e:
-        logger.error(f"Error in /cml/wm/manage_capacity: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('wm.manage_capacity', request.get_json(silent=True))
 
 @app.route('/cml/wm/handle_forgetting', methods=['POST']) # Explicit call if needed
 def cml_wm_handle_forgetting():
-    if not working_memory_instance:
-        logger.error("WorkingMemoryModule not initialized for /cml/wm/handle_forgetting")
-        return jsonify({"error": "WorkingMemoryModule not initialized"}), 500
-    try:
-        data = request.json
-        strategy = data.get('strategy', 'default')
-        working_memory_instance.handle_forgetting(strategy)
-        return jsonify({"status": "forgetting_handled", "strategy": strategy, "contents": working_memory_instance.get_workspace_contents()})
-    except Exception as e:
-        logger.error(f"Error in /cml/wm/handle_forgetting: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('wm.handle_forgetting', request.get_json(silent=True))
 
 @app.route('/cml/wm/status', methods=['GET'])
 def cml_wm_status():
-    if not working_memory_instance:
-        logger.error("WorkingMemoryModule not initialized for /cml/wm/status")
-        return jsonify({"error": "WorkingMemoryModule not initialized"}), 500
-    try:
-        return jsonify(working_memory_instance.get_module_status())
-    except Exception as e:
-        logger.error(f"Error in /cml/wm/status: {e}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return cml_operation_response('wm.status')
 
 # --- PiaPES API Endpoints ---
 
@@ -532,31 +458,30 @@ def cml_wm_status():
 if 'PiaAGIPrompt' not in globals() or 'load_template' not in globals() or 'save_template' not in globals() or 'DevelopmentalCurriculum' not in globals():
     logger.error("Core PiaPES classes not imported. PiaPES API endpoints will not be available.")
 else:
+    def pes_catalog_listing_response(kind):
+        """
+        Builds a (conditional) listing response from the catalog index of PES_FILES_DIR.
+
+        The body stays a JSON list of template summaries; pagination metadata travels in
+        the X-Total-Count header. Query parameters: q, author, stage, page, per_page.
+        """
+        try:
+            query_args = parse_listing_args(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        items, total = get_catalog(PES_FILES_DIR).query(kind=kind, **query_args)
+        response = make_response(jsonify(items))
+        response.headers['X-Total-Count'] = str(total)
+        response.set_etag(listing_etag(items, total))
+        return response.make_conditional(request)
+
     @app.route('/api/pes/prompts', methods=['GET'])
     def api_list_pes_prompts():
         try:
-            prompt_infos = []
             if not os.path.exists(PES_FILES_DIR):
                 logger.warning(f"PiaPES files directory {PES_FILES_DIR} not found.")
                 return jsonify([]) # Return empty list if dir doesn't exist
-
-            for filename in os.listdir(PES_FILES_DIR):
-                if filename.endswith('.json') and not filename.endswith('.curriculum.json'):
-                    filepath = os.path.join(PES_FILES_DIR, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            name = data.get('objective', data.get('name', filename))
-                            version = data.get('version', 'N/A')
-                            prompt_infos.append({
-                                "filename": filename,
-                                "name": name,
-                                "version": version
-                            })
-                    except Exception as e:
-                        logger.warning(f"Could not parse metadata from PiaPES prompt {filename}: {e}")
-                        prompt_infos.append({"filename": filename, "name": filename, "version": "Error reading"})
-            return jsonify(prompt_infos)
+            return pes_catalog_listing_response(KIND_PROMPT)
         except Exception as e:
             logger.error(f"Error listing PiaPES prompts: {e}", exc_info=True)
             return jsonify({"error": "Failed to list PiaPES prompts"}), 500
@@ -617,6 +542,8 @@ else:
                  return jsonify({"error": "Invalid PiaPES prompt data structure after reconstruction. Ensure correct __type__ hints and fields."}), 400
             
             save_template(prompt_object, filepath) # Uses prompt_engine_mvp.save_template
+            
+            get_catalog(PES_FILES_DIR).upsert(filename)
             return jsonify({"message": f"PiaPES Prompt '{filename}' created successfully.", "filename": filename}), 201
         except (json.JSONDecodeError, TypeError, KeyError, AttributeError) as e:
             logger.error(f"Error processing/reconstructing data for PiaPES prompt {filename}: {e}", exc_info=True)
@@ -651,6 +578,8 @@ else:
                  return jsonify({"error": "Invalid PiaPES prompt data structure for update. Ensure correct __type__ hints and fields."}), 400
 
             save_template(prompt_object, filepath)
+
+            get_catalog(PES_FILES_DIR).upsert(filename)
             return jsonify({"message": f"PiaPES Prompt '{filename}' updated successfully."})
         except (json.JSONDecodeError, TypeError, KeyError, AttributeError) as e:
             logger.error(f"Error processing/reconstructing data for updating PiaPES prompt {filename}: {e}", exc_info=True)
@@ -670,6 +599,7 @@ else:
             abort(404, description="PiaPES Prompt file not found or invalid type for delete.")
         try:
             os.remove(filepath)
+            get_catalog(PES_FILES_DIR).remove(filename)
             return jsonify({"message": f"PiaPES Prompt '{filename}' deleted successfully."})
         except Exception as e:
             logger.error(f"Error deleting PiaPES prompt {filename}: {e}", exc_info=True)
@@ -700,28 +630,10 @@ else:
     @app.route('/api/pes/curricula', methods=['GET'])
     def api_list_pes_curricula():
         try:
-            curriculum_files = []
             if not os.path.exists(PES_FILES_DIR):
                 logger.warning(f"PiaPES files directory {PES_FILES_DIR} not found.")
                 return jsonify([])
-
-            for filename in os.listdir(PES_FILES_DIR):
-                if filename.endswith('.curriculum.json'):
-                    filepath = os.path.join(PES_FILES_DIR, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            name = data.get('name', filename)
-                            version = data.get('version', 'N/A')
-                            curriculum_files.append({
-                                "filename": filename,
-                                "name": name,
-                                "version": version
-                            })
-                    except Exception as e:
-                        logger.warning(f"Could not parse metadata from PiaPES curriculum {filename}: {e}")
-                        curriculum_files.append({"filename": filename, "name": filename, "version": "Error reading"})
-            return jsonify(curriculum_files)
+            return pes_catalog_listing_response(KIND_CURRICULUM)
         except Exception as e:
             logger.error(f"Error listing PiaPES curricula: {e}", exc_info=True)
             return jsonify({"error": "Failed to list PiaPES curricula"}), 500
@@ -807,6 +719,8 @@ else:
                 return jsonify({"error": "Error reconstructing PiaPES curriculum object."}), 400
             
             save_template(curriculum_object, filepath)
+            
+            get_catalog(PES_FILES_DIR).upsert(filename)
             return jsonify({"message": f"PiaPES Curriculum '{filename}' created successfully.", "filename": filename}), 201
         except (json.JSONDecodeError, TypeError, KeyError, AttributeError, ValueError) as e:
             logger.error(f"Error processing/reconstructing data for PiaPES curriculum {filename}: {e}", exc_info=True)
@@ -849,6 +763,7 @@ else:
 
             if updated_fields_count > 0:
                 save_template(curriculum_obj, filepath)
+                get_catalog(PES_FILES_DIR).upsert(filename)
                 return jsonify({"message": f"PiaPES Curriculum metadata for '{filename}' updated successfully.", "filename": filename}), 200
             else:
                 return jsonify({"message": f"No recognized metadata fields provided for PiaPES curriculum update in '{filename}'. No changes made."}), 200
@@ -865,212 +780,228 @@ else:
 if not all(name in globals() for name in ['BasicSimulationEngine', 'GridWorld', 'QLearningAgent', 'GridWorldVisualizer']):
     logger.error("Core PiaSE classes not imported. PiaSE API endpoint '/api/piase/run_simulation' will not be available.")
 else:
+    simulation_jobs = SimulationJobManager(
+        PIASE_RUNS_OUTPUT_DIR_ABSOLUTE,
+        f"/static/{PIASE_RUNS_STATIC_DIR}",
+        max_workers=int(os.environ.get('PIASE_MAX_CONCURRENT_JOBS', 2)),
+        max_pending_jobs=int(os.environ.get('PIASE_MAX_PENDING_JOBS', 16))
+    )
+
     @app.route('/api/piase/run_simulation', methods=['POST'])
     def piase_run_simulation():
+        """Queues a GridWorld simulation; the body holds scenario parameters (see piase_jobs.DEFAULT_SCENARIO)."""
         try:
-            # For now, using a hardcoded scenario similar to PiaSE/WebApp/app.py
-            # TODO: Accept scenario configuration from request JSON payload in a future iteration.
-            # data = request.get_json()
-            # grid_width = data.get('grid_width', 5)
-            # ... other params ...
-
-            grid_width = 5
-            grid_height = 5
-            goal_pos = (grid_width - 1, grid_height - 1)
-            walls = [(1, 1), (1, 2), (2, 1), (3, 3)]
-            start_pos_q_agent = (0, 0)
-            agent_id = "q_agent_1" # Hardcoded agent ID
-
-            # 1. Setup Environment
-            # The GridWorld in PiaSE/environments/grid_world.py has changed its __init__ signature.
-            # It now takes default_agent_id and uses that for agent_start_pos if not multi-agent.
-            # Let's adapt to use the `add_agent` method for clarity or pass `agent_start_positions`
-            environment = GridWorld(
-                width=grid_width,
-                height=grid_height,
-                walls=walls,
-                goal_position=goal_pos,
-                # The GridWorld in the provided code uses `agent_start_pos` for a single default agent,
-                # or expects agents to be added via `add_agent` or `agent_start_positions` for multi-agent.
-                # Let's assume we are setting up for a specific agent.
-                # We can use default_agent_id and initial_agent_start_pos, or add_agent.
-                default_agent_id=agent_id, # Set default agent ID
-                agent_start_pos=start_pos_q_agent # And its start position
-            )
-            # If GridWorld's __init__ expects `agent_start_positions` dict:
-            # environment = GridWorld(width=grid_width, height=grid_height, walls=walls, goal_position=goal_pos,
-            #                         agent_start_positions={agent_id: start_pos_q_agent})
-
-
-            # 2. Setup Engine and Agent
-            engine = BasicSimulationEngine() # Logger path will be default or set in initialize
-            q_agent = QLearningAgent(exploration_rate=0.2, learning_rate=0.1, discount_factor=0.9)
-            
-            # Engine initialization now takes environment, agents dict, scenario_config, and log_path
-            # We'll use a default log path within the run's unique directory.
-            
-            run_timestamp = time.strftime("%Y%m%d-%H%M%S")
-            random_id = os.urandom(4).hex() # Short random ID to avoid collisions
-            run_dir_name = f"run_{run_timestamp}_{random_id}"
-            
-            current_run_output_dir_absolute = os.path.join(PIASE_RUNS_OUTPUT_DIR_ABSOLUTE, run_dir_name)
-            if not os.path.exists(current_run_output_dir_absolute):
-                os.makedirs(current_run_output_dir_absolute)
-
-            # Log path for PiaSE's internal logger (if used by BasicSimulationEngine)
-            piase_log_file = os.path.join(current_run_output_dir_absolute, "piase_internal_log.jsonl")
-
-            # Initialize engine
-            # The BasicSimulationEngine's initialize method expects an agents dict.
-            engine.initialize(
-                environment=environment,
-                agents={agent_id: q_agent},
-                scenario_config={"name": "WebApp_DefaultGridScenario"},
-                log_path=piase_log_file
-            )
-            
-            # 3. Setup Visualizer for our API needs
-            visualizer = GridWorldVisualizer(environment)
-            image_urls = []
-            text_log_api = ["PiaSE Simulation Log (WebApp API):"] # This is the log we build for the API response
-
-            # Initial render
-            img_filename_initial = "step_000.png"
-            img_path_initial_absolute = os.path.join(current_run_output_dir_absolute, img_filename_initial)
-            visualizer.render(title="Initial State", output_path=img_path_initial_absolute, step_delay=None)
-            image_urls.append(f"/static/{PIASE_RUNS_STATIC_DIR}/{run_dir_name}/{img_filename_initial}")
-            text_log_api.append("Initial state rendered.")
-
-            # 4. Run Simulation Loop
-            num_steps = 50 # TODO: Make configurable from request
-            text_log_api.append(f"Starting simulation for up to {num_steps} steps...")
-            agent_reached_goal = False
-
-            for i in range(num_steps):
-                step_log_entry = f"--- Step {i+1}/{num_steps} ---"
-                text_log_api.append(step_log_entry)
-                logger.info(f"[PiaSE Run {run_dir_name}] {step_log_entry}")
-
-                engine.run_step()
-
-                agent_current_pos = environment.agent_positions.get(agent_id)
-                text_log_api.append(f"Agent {agent_id} action: {q_agent.last_action}, New position: {agent_current_pos}")
-
-                img_filename = f"step_{i+1:03d}.png"
-                img_path_absolute = os.path.join(current_run_output_dir_absolute, img_filename)
-                visualizer.render(title=f"After Step {i+1}", output_path=img_path_absolute, step_delay=None)
-                image_urls.append(f"/static/{PIASE_RUNS_STATIC_DIR}/{run_dir_name}/{img_filename}")
-
-                if environment.is_done(agent_id):
-                    text_log_api.append(f"Agent {agent_id} reached the goal at step {i+1}!")
-                    logger.info(f"[PiaSE Run {run_dir_name}] Agent {agent_id} reached goal at step {i+1}.")
-                    agent_reached_goal = True
-                    break
-            
-            if not agent_reached_goal:
-                 text_log_api.append(f"Simulation finished after {num_steps} steps. Goal not reached.")
-                 logger.info(f"[PiaSE Run {run_dir_name}] Simulation finished, goal not reached.")
-            else:
-                 text_log_api.append("Simulation finished.")
-                 logger.info(f"[PiaSE Run {run_dir_name}] Simulation finished, goal reached.")
-
-
-            # Add Q-table sample to log (optional, can be large)
-            text_log_api.append("\n--- Q-Learning Agent's Q-Table (sample) ---")
-            q_table_sample_count = 0
-            for state_key, actions_map in list(q_agent.q_table.items())[:10]: # Sample first 10 states
-                if q_table_sample_count >= 5 : break # Limit log size further
-                text_log_api.append(f"State {state_key}: {actions_map}")
-                q_table_sample_count +=1
-            
-            plt.close(visualizer.fig) # Close the figure to free memory
-
-            return jsonify({
-                "message": "PiaSE simulation run completed.",
-                "run_id": run_dir_name,
-                "image_urls": image_urls,
-                "text_log": "\n".join(text_log_api), # Join log list into a single string
-                "summary": {
-                    "agent_reached_goal": agent_reached_goal,
-                    "total_steps_taken": i + 1 if agent_reached_goal else num_steps,
-                    "final_agent_position": agent_current_pos
-                }
-            }), 200
-
-        except ImportError: # Catch if dummy classes are in use due to failed PiaSE import
-            logger.error("PiaSE components not available. Cannot run simulation.", exc_info=True)
-            return jsonify({"error": "PiaSE components are not available. Simulation cannot be run."}), 501 # Not Implemented
+            scenario = parse_scenario_params(request.get_json(silent=True))
+        except ValueError as e:
+            return jsonify({"error": f"Invalid scenario: {e}"}), 400
+        try:
+            job = simulation_jobs.submit(scenario)
+        except JobQueueFullError as e:
+            return jsonify({"error": str(e)}), 429
         except Exception as e:
-            logger.error(f"Error during PiaSE simulation: {e}", exc_info=True)
-            return jsonify({"error": f"An unexpected error occurred during PiaSE simulation: {str(e)}"}), 500
+            logger.error(f"Error queuing PiaSE simulation: {e}", exc_info=True)
+            return jsonify({"error": f"An unexpected error occurred while queuing the PiaSE simulation: {str(e)}"}), 500
+        return jsonify({
+            "message": "PiaSE simulation queued.",
+            "job_id": job.job_id,
+            "run_id": job.job_id,
+            "status": job.status,
+            "status_url": f"/api/piase/jobs/{job.job_id}",
+            "events_url": f"/api/piase/jobs/{job.job_id}/events"
+        }), 202
+
+    @app.route('/api/piase/jobs', methods=['GET'])
+    def piase_list_jobs():
+        return jsonify(simulation_jobs.list_jobs())
+
+    @app.route('/api/piase/jobs/<job_id>', methods=['GET'])
+    def piase_job_status(job_id):
+        """Polling endpoint: job state, latest progress, events after ?since=<seq> and, once done, the result."""
+        job = simulation_jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": f"PiaSE job '{job_id}' not found."}), 404
+        info = job.to_dict()
+        info["events"] = job.read_events(request.args.get('since', default=0, type=int))
+        return jsonify(info)
+
+    @app.route('/api/piase/jobs/<job_id>/events', methods=['GET'])
+    def piase_job_events(job_id):
+        """Server-Sent Events stream of a job's status, log, frame and progress events."""
+        job = simulation_jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": f"PiaSE job '{job_id}' not found."}), 404
+        last_seq = request.headers.get('Last-Event-ID', default=0, type=int) or request.args.get('since', default=0, type=int)
+
+        def stream(last_seq):
+            last_sent = time.monotonic()
+            while True:
+                finished = job.status in FINISHED_STATES # Checked before reading, so no event is missed
+                for event in job.read_events(last_seq):
+                    last_seq = event["seq"]
+                    yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+                    last_sent = time.monotonic()
+                if finished:
+                    yield f"event: end\ndata: {json.dumps(job.to_dict(), default=str)}\n\n"
+                    return
+                if time.monotonic() - last_sent > 15:
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                time.sleep(0.25)
+                simulation_jobs.get(job_id) # Advances queued -> running
+
+        return Response(stream(last_seq), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    @app.route('/api/piase/jobs/<job_id>/cancel', methods=['POST'])
+    def piase_cancel_job(job_id):
+        job = simulation_jobs.cancel(job_id)
+        if job is None:
+            return jsonify({"error": f"PiaSE job '{job_id}' not found."}), 404
+        return jsonify({"job_id": job_id, "status": job.status,
+                        "message": "Cancellation requested." if job.status not in FINISHED_STATES else f"Job already {job.status}."})
 # --- End PiaSE API Endpoints ---
 
 # --- PiaAVT API Endpoints ---
 if not PIAVT_AVAILABLE:
     logger.error("PiaAVT components not available. PiaAVT API endpoint '/api/avt/analyze_log_basic' will not be available.")
 else:
+    avt_analysis_cache = AnalysisCache(
+        max_bytes=int(os.environ.get('AVT_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+        max_results_per_log=int(os.environ.get('AVT_CACHE_MAX_RESULTS_PER_LOG', 128))
+    )
+    AVT_MAX_UPLOAD_BYTES = int(os.environ.get('AVT_MAX_UPLOAD_BYTES', 512 * 1024 * 1024))
+    AVT_MAX_FORM_BYTES = 1024 * 1024 # Multipart framing and form fields around an uploaded log
+    # Bodies declaring a larger Content-Length are refused with 413 before any of them is read.
+    app.config['MAX_CONTENT_LENGTH'] = AVT_MAX_UPLOAD_BYTES + AVT_MAX_FORM_BYTES
+    # Request bodies of these types are the JSONL log itself and are parsed while they arrive.
+    AVT_RAW_LOG_MIMETYPES = {'application/x-ndjson', 'application/jsonl', 'application/json-lines',
+                             'application/octet-stream', 'text/plain'}
+
+    def avt_ingest_stream(stream, original_filename):
+        """
+        Parses a JSONL stream chunk by chunk into a new PiaAVTAPI and caches it by content hash.
+        Returns (cached_log, error_response); exactly one of them is None.
+        """
+        reader = HashingLineReader(stream, max_bytes=AVT_MAX_UPLOAD_BYTES)
+        avt_api = PiaAVTAPI()
+        try:
+            loaded = avt_api.load_logs_from_jsonl_stream(reader, source_name=f"upload '{original_filename}'")
+        except (UploadTooLargeError, RequestEntityTooLarge) as e:
+            return None, (jsonify({"error": str(e)}), 413)
+        if reader.bytes_read > AVT_MAX_UPLOAD_BYTES: # PiaAVTAPI reports the reader's error as a failed load
+            return None, (jsonify({"error": f"Upload exceeds the limit of {AVT_MAX_UPLOAD_BYTES} bytes."}), 413)
+        if not loaded or avt_api.get_log_count() == 0:
+            logger.warning(f"JSONL upload {original_filename} contained no valid log entries or failed validation.")
+            return None, (jsonify({"error": f"PiaAVT could not load any valid log entries from '{original_filename}'. It might be empty or contain errors."}), 400)
+        log_id = reader.hexdigest()
+        logger.info(f"Streamed {reader.bytes_read} bytes ({avt_api.get_log_count()} entries) from {original_filename} into PiaAVT; log_id={log_id}")
+        return avt_analysis_cache.put(log_id, avt_api, avt_api.get_log_count(), reader.bytes_read, original_filename), None
+
     @app.route('/api/avt/analyze_log_basic', methods=['POST'])
     def avt_analyze_log_basic():
-        if 'logFile' not in request.files:
-            logger.warning("No log file part in request for /api/avt/analyze_log_basic")
-            return jsonify({"error": "No log file part in the request"}), 400
-        
-        file = request.files['logFile']
-        if file.filename == '':
-            logger.warning("No selected file for /api/avt/analyze_log_basic")
-            return jsonify({"error": "No selected file"}), 400
-
-        if file and (file.filename.endswith('.json') or file.filename.endswith('.jsonl')):
-            original_filename = secure_filename(file.filename)
-            temp_file = None
+        """
+        Counts unique values of a log field. The log is either uploaded (multipart 'logFile', or the
+        raw JSONL request body with a JSONL content type) or referenced by the 'log_id' returned
+        for an earlier upload. Optional parameters (query string or form): field (default
+        'event_type'), data_field (dot-separated path into event data), source, event_type.
+
+        Multipart bodies are parsed by `MultipartUpload` rather than `request.files`, so the
+        log is hashed and parsed while it arrives instead of being spooled to a temp file.
+        """
+        params = request.args.to_dict() # Not request.values: that would parse the whole multipart body
+        upload = None
+        if request.mimetype == 'multipart/form-data':
+            boundary = request.mimetype_params.get('boundary')
+            if not boundary:
+                return jsonify({"error": "Multipart request without a boundary."}), 400
+            upload = MultipartUpload(request.stream, boundary.encode('latin-1'), 'logFile')
             try:
-                # Save to a temporary file
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f"_{original_filename}")
-                file.save(temp_file.name)
-                temp_file.close() # Close it so PiaAVTAPI can open it
-                logger.info(f"Uploaded log file saved temporarily to {temp_file.name}")
-
-                avt_api = PiaAVTAPI()
-                # MODIFIED: Call load_logs_from_jsonl and update messages
-                if not avt_api.load_logs_from_jsonl(temp_file.name):
-                    logger.error(f"PiaAVT failed to load logs from JSONL file: {temp_file.name}")
-                    return jsonify({"error": "PiaAVT failed to load the JSONL log file. It might be empty or contain errors."}), 500
-
-                if avt_api.get_log_count() == 0:
-                    logger.warning(f"JSONL file {original_filename} loaded, but no valid log entries found by PiaAVT.")
-                    return jsonify({"error": f"Successfully processed JSONL file '{original_filename}', but it contained no valid log entries."}), 400
-
-
-                analyzer = avt_api.get_analyzer()
-                if not analyzer: # Should not happen if get_log_count > 0 and load was successful
-                    logger.error("PiaAVT analyzer could not be initialized after loading JSONL logs.")
-                    return jsonify({"error": "PiaAVT analyzer initialization failed after JSONL load."}), 500
-                
-                # Perform basic analysis: count event types
-                event_counts = analyzer.count_unique_values('event_type') # is_data_field=False is default
-                logger.info(f"JSONL Log analysis successful for {original_filename}. Event counts: {event_counts}")
-
-                return jsonify({
-                    "message": "JSONL Log analyzed successfully.", # MODIFIED
-                    "original_filename": original_filename,
-                    "analysis_results": { # Nest results for consistency with frontend expectation
-                        "event_counts": dict(event_counts) # Convert Counter to dict for JSON
-                    }
-                }), 200
-
+                upload.next_file() # Reads the form fields preceding the log
+            except (UploadTooLargeError, RequestEntityTooLarge) as e:
+                return jsonify({"error": str(e)}), 413
+            except ValueError as e:
+                return jsonify({"error": f"Malformed multipart request: {e}"}), 400
+            params = {**upload.fields, **params} # The query string takes precedence, as with request.values
+        log_id = params.get('log_id') or request.headers.get('X-AVT-Log-Id')
+        cached_log = avt_analysis_cache.get(log_id) if log_id else None
+        log_reused = cached_log is not None
+
+        if cached_log is None:
+            if upload is not None and upload.filename is not None:
+                if upload.filename == '':
+                    logger.warning("No selected file for /api/avt/analyze_log_basic")
+                    return jsonify({"error": "No selected file"}), 400
+                if not (upload.filename.endswith('.json') or upload.filename.endswith('.jsonl')):
+                    logger.warning(f"Invalid file type uploaded: {upload.filename}")
+                    return jsonify({"error": "Invalid file type. Please upload .jsonl (JSON Lines) files."}), 400
+                original_filename = secure_filename(upload.filename)
+                stream = upload
+            elif request.mimetype in AVT_RAW_LOG_MIMETYPES:
+                original_filename = secure_filename(params.get('filename', '')) or 'upload.jsonl'
+                stream = request.stream
+            elif log_id:
+                return jsonify({"error": f"Log '{log_id}' is not (or no longer) cached. Please upload it again."}), 404
+            else:
+                logger.warning("No log file part in request for /api/avt/analyze_log_basic")
+                return jsonify({"error": "No log file part in the request"}), 400
+            try:
+                cached_log, error_response = avt_ingest_stream(stream, original_filename)
             except Exception as e:
-                logger.error(f"Error during JSONL log analysis for {original_filename}: {e}", exc_info=True) # MODIFIED
+                logger.error(f"Error during JSONL log ingest for {original_filename}: {e}", exc_info=True)
                 return jsonify({"error": f"An unexpected error occurred during JSONL analysis: {str(e)}"}), 500
-            finally:
-                if temp_file and temp_file.name and os.path.exists(temp_file.name):
-                    try:
-                        os.remove(temp_file.name)
-                        logger.info(f"Temporary log file {temp_file.name} deleted.")
-                    except Exception as e_del:
-                        logger.error(f"Error deleting temporary file {temp_file.name}: {e_del}")
-        else:
-            logger.warning(f"Invalid file type uploaded: {file.filename}")
-            return jsonify({"error": "Invalid file type. Please upload .jsonl (JSON Lines) files."}), 400 # MODIFIED
+            if error_response:
+                return error_response
+        if upload is not None:
+            try:
+                params = {**upload.finish(), **request.args.to_dict()} # Fields sent after the log
+            except (UploadTooLargeError, RequestEntityTooLarge) as e:
+                return jsonify({"error": str(e)}), 413
+            except ValueError as e:
+                return jsonify({"error": f"Malformed multipart request: {e}"}), 400
+
+        field = params.get('field', 'event_type')
+        data_field = params.get('data_field')
+        source = params.get('source') or None
+        event_type = params.get('event_type') or None
+        result_key = ('count_unique_values', field, data_field, source, event_type)
+
+        def count_values(avt_api):
+            analyzer = avt_api.get_analyzer()
+            if data_field:
+                counts = analyzer.count_unique_values(field, source=source, event_type=event_type,
+                                                      is_data_field=True, data_field_path=data_field.split('.'))
+            else:
+                counts = analyzer.count_unique_values(field, source=source, event_type=event_type)
+            return {str(value): count for value, count in counts.items()} # JSON object keys must be strings
+
+        try:
+            value_counts, result_cached = avt_analysis_cache.result(cached_log, result_key, count_values)
+        except Exception as e:
+            logger.error(f"Error during JSONL log analysis for {cached_log.original_filename}: {e}", exc_info=True)
+            return jsonify({"error": f"An unexpected error occurred during JSONL analysis: {str(e)}"}), 500
+
+        analysis_results = {"field": f"data.{data_field}" if data_field else field, "value_counts": value_counts}
+        if field == 'event_type' and not data_field:
+            analysis_results["event_counts"] = value_counts # Key expected by the frontend
+        return jsonify({
+            "message": "JSONL Log analyzed successfully.",
+            "original_filename": cached_log.original_filename,
+            "log_id": cached_log.log_id,
+            "entry_count": cached_log.entry_count,
+            "log_cached": log_reused,
+            "result_cached": result_cached,
+            "analysis_results": analysis_results
+        }), 200
+
+    @app.route('/api/avt/cache', methods=['GET'])
+    def avt_cache_stats():
+        """Lists the cached logs and the hit/miss/eviction counters of the analysis cache."""
+        return jsonify(avt_analysis_cache.stats()), 200
+
+    @app.route('/api/avt/cache/<log_id>', methods=['DELETE'])
+    def avt_cache_discard(log_id):
+        if not avt_analysis_cache.discard(log_id):
+            return jsonify({"error": f"Log '{log_id}' is not cached."}), 404
+        return jsonify({"message": f"Log '{log_id}' removed from the analysis cache."}), 200
 # --- End PiaAVT API Endpoints ---
 
 
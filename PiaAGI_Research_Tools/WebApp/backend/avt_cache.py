@@ -0,0 +1,314 @@
+"""
+Streaming ingest and content-addressed caching for the PiaAVT endpoints of the WebApp backend.
+
+`/api/avt/analyze_log_basic` used to save every upload to a temporary file, re-parse
+it from scratch and recompute the analysis, even when the same log was analyzed a
+moment earlier with a slightly different filter. This module provides:
+
+- `HashingLineReader`: iterates the JSONL lines of an upload stream chunk by chunk,
+  hashing the raw bytes as they pass, so logs are parsed straight into a
+  `PiaAVTAPI` without the whole file being written (or held as one string) first.
+- `MultipartUpload`: reads the file part of a multipart/form-data request body as
+  such a stream. Flask's `request.files` would parse the whole body first and spool
+  large parts to temporary files.
+- `AnalysisCache`: a thread-safe LRU of parsed logs keyed by the SHA-256 of their
+  content, bounded by an estimate of their memory footprint. Each cached log also
+  memoizes the analysis results computed on it, keyed by the analysis parameters,
+  so re-analyzing a log or returning to a previous filter is a dictionary lookup.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+from werkzeug.sansio.multipart import MultipartDecoder, NeedData, Field, File, Data, Epilogue
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Parsed log entries (dicts of str) take several times the size of their JSON text.
+DEFAULT_PARSED_SIZE_FACTOR = 6
+DEFAULT_MAX_FIELD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised by `HashingLineReader` when a stream exceeds its `max_bytes`."""
+
+
+class HashingLineReader:
+    """
+    Iterates the lines of a binary stream, read in fixed-size chunks, while computing
+    the SHA-256 digest and byte count of everything read.
+
+    Args:
+        stream (Any): A binary file-like object with a `read(size)` method (e.g. a
+            werkzeug `FileStorage.stream` or `request.stream`).
+        chunk_size (int): Number of bytes requested per read.
+        max_bytes (Optional[int]): If given, reading more than this many bytes raises
+            `UploadTooLargeError`.
+    """
+
+    def __init__(self, stream: Any, chunk_size: int = DEFAULT_CHUNK_SIZE, max_bytes: Optional[int] = None):
+        self._stream = stream
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self._hash = hashlib.sha256()
+        self.bytes_read = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        pending = b""
+        while True:
+            chunk = self._stream.read(self.chunk_size)
+            if not chunk:
+                break
+            self.bytes_read += len(chunk)
+            if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+                raise UploadTooLargeError(f"Upload exceeds the limit of {self.max_bytes} bytes.")
+            self._hash.update(chunk)
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop() # Incomplete last line, continued by the next chunk
+            yield from lines
+        if pending:
+            yield pending
+
+    def hexdigest(self) -> str:
+        """Returns the SHA-256 of the bytes read so far (the content hash once exhausted)."""
+        return self._hash.hexdigest()
+
+
+class MultipartUpload:
+    """
+    Streams one file part out of a multipart/form-data body as it arrives.
+
+    Form fields are collected into `fields` as the body is read. `read()` returns the
+    bytes of the file part named `file_field` and b"" once that part has ended, so the
+    object can be handed to `HashingLineReader` like any other binary stream.
+
+    Args:
+        stream (Any): The raw request body (e.g. `request.stream`).
+        boundary (bytes): The multipart boundary from the Content-Type header.
+        file_field (str): Name of the file part to stream.
+        chunk_size (int): Number of bytes requested per read of `stream`.
+        max_field_bytes (int): Size limit of a form field; larger fields raise
+            `UploadTooLargeError`.
+
+    Raises:
+        ValueError: From the reading methods, if the body is not valid multipart data.
+    """
+
+    def __init__(self, stream: Any, boundary: bytes, file_field: str,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, max_field_bytes: int = DEFAULT_MAX_FIELD_BYTES):
+        self._stream = stream
+        self._decoder = MultipartDecoder(boundary)
+        self._closing_boundary = b"--" + boundary + b"--\r\n"
+        self.file_field = file_field
+        self.chunk_size = chunk_size
+        self.max_field_bytes = max_field_bytes
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self._field_name: Optional[str] = None # Part being read: a form field (name) ...
+        self._field_data = bytearray()
+        self._in_file = False # ... or the streamed file part (other file parts are discarded)
+        self._complete = False
+
+    def _read_chunk(self) -> bytes:
+        # The decoder may pass the CR preceding a boundary on as part data when a chunk ends
+        # between that CR and the end of the boundary line, so such chunks are extended.
+        chunk = self._stream.read(self.chunk_size)
+        while chunk:
+            fragment = chunk[chunk.rfind(b"\n") + 1:]
+            if not (chunk.endswith(b"\r") or (fragment and self._closing_boundary.startswith(fragment))):
+                break
+            more = self._stream.read(len(self._closing_boundary))
+            if not more:
+                break
+            chunk += more
+        return chunk
+
+    def _next_event(self) -> Any:
+        event = self._decoder.next_event()
+        while isinstance(event, NeedData):
+            chunk = self._read_chunk()
+            self._decoder.receive_data(chunk or None) # None marks the end of the body
+            event = self._decoder.next_event()
+        return event
+
+    def _advance(self) -> Optional[bytes]:
+        """Handles the next event; returns file data when the streamed part yields some."""
+        event = self._next_event()
+        if isinstance(event, Field):
+            self._field_name = event.name
+            self._field_data.clear()
+        elif isinstance(event, File):
+            if event.name == self.file_field and self.filename is None:
+                self.filename = event.filename
+                self._in_file = True
+        elif isinstance(event, Data):
+            if self._in_file:
+                self._in_file = event.more_data
+                return event.data
+            if self._field_name is not None:
+                self._field_data.extend(event.data)
+                if len(self._field_data) > self.max_field_bytes:
+                    raise UploadTooLargeError(f"Form field '{self._field_name}' exceeds {self.max_field_bytes} bytes.")
+                if not event.more_data:
+                    self.fields[self._field_name] = self._field_data.decode('utf-8', 'replace')
+                    self._field_name = None
+        elif isinstance(event, Epilogue):
+            self._complete = True
+        return None
+
+    def next_file(self) -> Optional[str]:
+        """Reads up to the start of the file part; returns its filename, or None if the body has none."""
+        while self.filename is None and not self._complete:
+            self._advance()
+        return self.filename
+
+    def read(self, size: int = -1) -> bytes:
+        """Returns the next bytes of the file part (at most one decoder event's worth); b"" at its end."""
+        while self._in_file:
+            data = self._advance()
+            if data:
+                return data
+        return b""
+
+    def finish(self) -> Dict[str, str]:
+        """Reads the rest of the body (collecting fields after the file part) and returns `fields`."""
+        while not self._complete:
+            self._advance()
+        return self.fields
+
+
+class CachedLog:
+    """
+    A parsed log held by `AnalysisCache`.
+
+    Attributes:
+        log_id (str): The content hash of the log.
+        api (Any): The `PiaAVTAPI` instance the log is loaded into.
+        entry_count (int): Number of loaded log entries.
+        size_bytes (int): Size of the raw log content.
+        estimated_bytes (int): Estimated memory footprint used for eviction.
+        original_filename (Optional[str]): The filename the log was first uploaded as.
+        results (Dict[Hashable, Any]): Memoized analysis results by parameter key.
+        lock (threading.Lock): Serializes analyses on `api`, which is not thread-safe.
+    """
+
+    def __init__(self, log_id: str, api: Any, entry_count: int, size_bytes: int,
+                 estimated_bytes: int, original_filename: Optional[str] = None):
+        self.log_id = log_id
+        self.api = api
+        self.entry_count = entry_count
+        self.size_bytes = size_bytes
+        self.estimated_bytes = estimated_bytes
+        self.original_filename = original_filename
+        self.results: Dict[Hashable, Any] = {}
+        self.lock = threading.Lock()
+
+    def result(self, key: Hashable, compute: Callable[[Any], Any]) -> "tuple[Any, bool]":
+        """
+        Returns (result, cached): the memoized result for `key`, or `compute(api)`
+        stored under `key` if it was not computed before.
+        """
+        with self.lock:
+            if key in self.results:
+                return self.results[key], True
+            value = self.results[key] = compute(self.api)
+            return value, False
+
+
+class AnalysisCache:
+    """
+    Thread-safe, memory-bounded LRU cache of `CachedLog` objects keyed by content hash.
+
+    Args:
+        max_bytes (int): Upper bound for the summed `estimated_bytes` of cached logs.
+            The least recently used logs are evicted to stay below it; a single log
+            larger than the bound is not cached at all.
+        max_results_per_log (int): Maximum memoized results per log; the oldest result
+            is dropped beyond that.
+        parsed_size_factor (int): Multiplier from raw size to estimated parsed size.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, max_results_per_log: int = 128,
+                 parsed_size_factor: int = DEFAULT_PARSED_SIZE_FACTOR):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be a positive integer.")
+        self.max_bytes = max_bytes
+        self.max_results_per_log = max_results_per_log
+        self.parsed_size_factor = parsed_size_factor
+        self._logs: "OrderedDict[str, CachedLog]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted_count = 0
+
+    def get(self, log_id: str) -> Optional[CachedLog]:
+        """Returns the cached log `log_id` (marking it as recently used), or None."""
+        with self._lock:
+            cached = self._logs.get(log_id)
+            if cached is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._logs.move_to_end(log_id)
+            return cached
+
+    def put(self, log_id: str, api: Any, entry_count: int, size_bytes: int,
+            original_filename: Optional[str] = None) -> CachedLog:
+        """
+        Caches a parsed log and evicts least recently used logs as needed.
+
+        Returns:
+            CachedLog: The cached entry (or an uncached one if the log alone exceeds
+                `max_bytes`). If `log_id` is already cached, the existing entry is
+                returned so that its memoized results are kept.
+        """
+        cached = CachedLog(log_id, api, entry_count, size_bytes,
+                           size_bytes * self.parsed_size_factor, original_filename)
+        with self._lock:
+            existing = self._logs.get(log_id)
+            if existing is not None:
+                self._logs.move_to_end(log_id)
+                return existing
+            if cached.estimated_bytes > self.max_bytes:
+                return cached
+            self._logs[log_id] = cached
+            self.current_bytes += cached.estimated_bytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._logs.popitem(last=False)
+                self.current_bytes -= evicted.estimated_bytes
+                self.evicted_count += 1
+            return cached
+
+    def result(self, cached: CachedLog, key: Hashable, compute: Callable[[Any], Any]) -> "tuple[Any, bool]":
+        """Like `CachedLog.result`, additionally bounding the number of memoized results."""
+        value, hit = cached.result(key, compute)
+        if not hit:
+            with cached.lock:
+                while len(cached.results) > self.max_results_per_log:
+                    cached.results.pop(next(iter(cached.results)))
+        return value, hit
+
+    def discard(self, log_id: str) -> bool:
+        """Removes a log from the cache; returns False if it was not cached."""
+        with self._lock:
+            cached = self._logs.pop(log_id, None)
+            if cached is None:
+                return False
+            self.current_bytes -= cached.estimated_bytes
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._logs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns usage counters and the cached logs (most recently used last)."""
+        with self._lock:
+            return {"cached_logs": len(self._logs), "current_bytes": self.current_bytes,
+                    "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses,
+                    "evicted_count": self.evicted_count,
+                    "logs": [{"log_id": c.log_id, "original_filename": c.original_filename,
+                              "entry_count": c.entry_count, "size_bytes": c.size_bytes,
+                              "cached_results": len(c.results)} for c in self._logs.values()]}
@@ -0,0 +1,272 @@
+"""
+Per-session PiaCML module graphs for the WebApp backend.
+
+The `/cml/...` endpoints used to operate on module-level singletons shared by
+every client, so concurrent researchers saw each other's working memory, goals and
+emotional state, and simultaneous requests mutated the same objects unguarded.
+`CMLSessionManager` instead keeps one module graph (a MessageBus plus the
+perception, emotion, motivation and working-memory modules wired to it) per
+session:
+
+- Graphs are built once per session and reused by every request of that session.
+- Each session has its own lock; requests of one session are serialized, while
+  different sessions proceed in parallel.
+- Sessions idle for longer than `ttl_seconds` expire, and the least recently used
+  session is evicted once `max_sessions` are open.
+
+`CML_OPERATIONS` maps operation names such as "wm.add_item" to functions of
+(modules, args); both the individual routes and the batch endpoint run through it.
+"""
+
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_SESSION_ID = "default"
+_SESSION_ID_PATTERN = re.compile(r'^[\w-]{1,64}$')
+
+GraphFactory = Callable[[str], Tuple[Any, Dict[str, Any]]]
+
+
+class CMLSession:
+    """
+    One client's PiaCML module graph.
+
+    Attributes:
+        session_id (str): The session identifier.
+        bus (Any): The session's MessageBus (None if PiaCML is unavailable).
+        modules (Dict[str, Any]): Modules by key ("perception", "emotion", "motivation", "wm").
+        lock (threading.RLock): Held while an operation (or a whole batch) runs.
+        created_at (float): Wall-clock creation time.
+        last_access (float): Manager clock value of the last access.
+        operation_count (int): Number of operations run in this session.
+    """
+
+    def __init__(self, session_id: str, bus: Any, modules: Dict[str, Any], now: float):
+        self.session_id = session_id
+        self.bus = bus
+        self.modules = modules
+        self.lock = threading.RLock()
+        self.created_at = time.time()
+        self.last_access = now
+        self.operation_count = 0
+
+    def run(self, operation: str, args: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Runs one operation of `CML_OPERATIONS` under the session lock.
+
+        Raises:
+            ValueError: If the operation is unknown.
+            LookupError: If the module the operation needs is not part of the graph.
+        """
+        handler = CML_OPERATIONS.get(operation)
+        if handler is None:
+            raise ValueError(f"Unknown CML operation '{operation}'.")
+        module_key = operation.split('.', 1)[0]
+        if not self.modules.get(module_key):
+            raise LookupError(f"Module '{module_key}' is not available in this session.")
+        with self.lock:
+            self.operation_count += 1
+            return handler(self.modules, args or {})
+
+    def status(self) -> Dict[str, Any]:
+        return {"session_id": self.session_id, "created_at": self.created_at,
+                "operation_count": self.operation_count, "modules": sorted(self.modules)}
+
+
+class CMLSessionManager:
+    """
+    Thread-safe LRU/TTL cache of `CMLSession` objects.
+
+    Args:
+        graph_factory (GraphFactory): Called with a new session id; returns (bus, modules).
+        max_sessions (int): Maximum number of open sessions; the least recently used
+            session is evicted when a new one would exceed it.
+        ttl_seconds (Optional[float]): Idle time after which a session expires; None
+            disables expiry.
+        clock (Callable[[], float]): Monotonic time source (replaceable in tests).
+    """
+
+    def __init__(self,
+                 graph_factory: GraphFactory,
+                 max_sessions: int = 64,
+                 ttl_seconds: Optional[float] = 1800.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be a positive integer.")
+        self._graph_factory = graph_factory
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._sessions: "OrderedDict[str, CMLSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted_count = 0
+        self.expired_count = 0
+
+    @staticmethod
+    def validate_session_id(session_id: str) -> str:
+        """Returns `session_id` if it is 1-64 word characters or hyphens, else raises ValueError."""
+        if not isinstance(session_id, str) or not _SESSION_ID_PATTERN.match(session_id):
+            raise ValueError("Session ids must be 1-64 characters of letters, digits, '_' or '-'.")
+        return session_id
+
+    def _expired(self, session: CMLSession, now: float) -> bool:
+        return self.ttl_seconds is not None and now - session.last_access > self.ttl_seconds
+
+    def _evict_expired_locked(self, now: float) -> None:
+        # The OrderedDict is in access order, so expired sessions sit at the front.
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if not self._expired(session, now):
+                break
+            self._sessions.popitem(last=False)
+            self.expired_count += 1
+
+    def get(self, session_id: Optional[str] = None, create: bool = True) -> Optional[CMLSession]:
+        """
+        Returns the session `session_id`, creating it (with a fresh graph) if needed.
+
+        Args:
+            session_id (Optional[str]): The session id; None creates a session with a new id.
+            create (bool): Whether a missing or expired session is created.
+
+        Returns:
+            Optional[CMLSession]: The session, or None if it does not exist and `create` is False.
+
+        Raises:
+            ValueError: If `session_id` is malformed.
+        """
+        if session_id is None:
+            session_id = uuid.uuid4().hex
+        self.validate_session_id(session_id)
+        with self._lock:
+            now = self._clock()
+            self._evict_expired_locked(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_access = now
+                self._sessions.move_to_end(session_id)
+                return session
+        if not create:
+            return None
+
+        # Build the graph outside the manager lock; module construction may be slow.
+        bus, modules = self._graph_factory(session_id)
+        with self._lock:
+            now = self._clock()
+            session = self._sessions.get(session_id)
+            if session is None: # Another request may have created it meanwhile
+                session = self._sessions[session_id] = CMLSession(session_id, bus, modules, now)
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evicted_count += 1
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def close(self, session_id: str) -> bool:
+        """Discards a session; returns False if it did not exist."""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict_expired_locked(self._clock())
+            return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the open sessions (most recently used last) and eviction counters."""
+        with self._lock:
+            self._evict_expired_locked(self._clock())
+            return {"open_sessions": len(self._sessions), "max_sessions": self.max_sessions,
+                    "ttl_seconds": self.ttl_seconds, "evicted_count": self.evicted_count,
+                    "expired_count": self.expired_count,
+                    "sessions": [session.status() for session in self._sessions.values()]}
+
+
+def _motivation_manage(modules: Dict[str, Any], args: Dict[str, Any]) -> Any:
+    result = modules["motivation"].manage_goals(args.get('action'), args.get('goal_data', {}))
+    return result if result is not None else {"status": "ok_no_return"}
+
+
+def _wm_add_item(modules: Dict[str, Any], args: Dict[str, Any]) -> Dict[str, Any]:
+    wm = modules["wm"]
+    item_id = wm.add_item_to_workspace(args.get('item_content'), args.get('salience', 0.5), args.get('context', {}))
+    return {"item_id": item_id, "current_size": len(wm.get_workspace_contents())}
+
+
+def _wm_remove_item(modules: Dict[str, Any], args: Dict[str, Any]) -> Dict[str, Any]:
+    wm = modules["wm"]
+    success = wm.remove_item_from_workspace(args.get('item_id'))
+    return {"success": success, "current_size": len(wm.get_workspace_contents())}
+
+
+def _wm_set_focus(modules: Dict[str, Any], args: Dict[str, Any]) -> Dict[str, Any]:
+    wm = modules["wm"]
+    success = wm.set_active_focus(args.get('item_id'))
+    return {"success": success, "current_focus": wm.get_active_focus()}
+
+
+def _wm_manage_capacity(modules: Dict[str, Any], args: Dict[str, Any]) -> Dict[str, Any]:
+    wm = modules["wm"]
+    wm.manage_workspace_capacity_and_coherence(args.get('new_item_salience'))
+    return {"status": "capacity_managed", "current_size": len(wm.get_workspace_contents())}
+
+
+def _wm_handle_forgetting(modules: Dict[str, Any], args: Dict[str, Any]) -> Dict[str, Any]:
+    wm = modules["wm"]
+    strategy = args.get('strategy', 'default')
+    wm.handle_forgetting(strategy)
+    return {"status": "forgetting_handled", "strategy": strategy, "contents": wm.get_workspace_contents()}
+
+
+CML_OPERATIONS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], Any]] = {
+    "perception.process": lambda m, a: m["perception"].process_sensory_input(a.get('raw_input'), a.get('modality'), a.get('context', {})),
+    "perception.status": lambda m, a: m["perception"].get_module_status(),
+    "emotion.appraise": lambda m, a: m["emotion"].appraise_situation(a.get('event_info'), a.get('context', {})),
+    "emotion.current": lambda m, a: m["emotion"].get_current_emotion(),
+    "emotion.express": lambda m, a: m["emotion"].express_emotion(context=a.get('context')),
+    "emotion.status": lambda m, a: m["emotion"].get_module_status(),
+    "motivation.manage": _motivation_manage,
+    "motivation.active_goals": lambda m, a: m["motivation"].get_active_goals(int(a.get('N', 0)), float(a.get('min_priority', 0.0))),
+    "motivation.update_state": lambda m, a: {"success": m["motivation"].update_motivation_state(a)},
+    "motivation.status": lambda m, a: m["motivation"].get_module_status(),
+    "wm.add_item": _wm_add_item,
+    "wm.remove_item": _wm_remove_item,
+    "wm.contents": lambda m, a: m["wm"].get_workspace_contents(),
+    "wm.set_focus": _wm_set_focus,
+    "wm.get_focus": lambda m, a: m["wm"].get_active_focus(),
+    "wm.manage_capacity": _wm_manage_capacity,
+    "wm.handle_forgetting": _wm_handle_forgetting,
+    "wm.status": lambda m, a: m["wm"].get_module_status(),
+}
+
+
+def run_batch(session: CMLSession, operations: List[Dict[str, Any]], stop_on_error: bool = False) -> List[Dict[str, Any]]:
+    """
+    Applies a list of {"op": name, "args": {...}} operations to one session, in order,
+    holding the session lock for the whole batch.
+
+    Returns:
+        List[Dict[str, Any]]: One {"op", "result"} or {"op", "error"} dict per operation
+            that was run; with `stop_on_error` the list ends at the first error.
+    """
+    results = []
+    with session.lock:
+        for operation in operations:
+            if not isinstance(operation, dict):
+                operation = {}
+            name = operation.get('op')
+            try:
+                args = operation.get('args') or {}
+                if not isinstance(args, dict):
+                    raise TypeError("Operation 'args' must be an object.")
+                results.append({"op": name, "result": session.run(name, args)})
+            except Exception as e:
+                results.append({"op": name, "error": str(e)})
+                if stop_on_error:
+                    break
+    return results
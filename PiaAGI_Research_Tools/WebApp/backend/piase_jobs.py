@@ -0,0 +1,434 @@
+"""
+Background job subsystem for PiaSE simulation runs started from the WebApp.
+
+`/api/piase/run_simulation` used to run the whole simulation, rendering one PNG per
+step, inside the HTTP request. `SimulationJobManager` instead queues the run and
+returns a job id at once:
+
+- Runs execute in a process pool whose size is the concurrency limit; at most
+  `max_pending_jobs` queued or running jobs are accepted.
+- A worker appends progress, log and frame events to `job_events.jsonl` in the run
+  directory. The web process tails that file incrementally to serve polling
+  requests and Server-Sent Events.
+- Queued jobs are cancelled directly. Running jobs are cancelled through a flag file
+  that the worker checks between steps.
+
+`parse_scenario_params` validates the scenario (grid size, walls, start/goal, step
+count, learning parameters, frame interval) that replaces the former hardcoded 5x5
+grid. Its defaults reproduce that grid.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVENTS_FILENAME = "job_events.jsonl"
+CANCEL_FILENAME = "cancel.flag"
+MAX_GRID_SIZE = 50
+MAX_STEPS = 1000
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+DEFAULT_SCENARIO: Dict[str, Any] = {
+    "name": "WebApp_DefaultGridScenario",
+    "grid_width": 5,
+    "grid_height": 5,
+    "walls": [(1, 1), (1, 2), (2, 1), (3, 3)],
+    "start_position": (0, 0),
+    "goal_position": None, # Bottom-right corner
+    "agent_id": "q_agent_1",
+    "num_steps": 50,
+    "exploration_rate": 0.2,
+    "learning_rate": 0.1,
+    "discount_factor": 0.9,
+    "frame_every": 1, # Render a frame every N steps (the final step is always rendered); 0 = initial frame only
+}
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when `max_pending_jobs` jobs are already queued or running."""
+
+
+def _position(value: Any, name: str, width: int, height: int) -> Tuple[int, int]:
+    if not isinstance(value, (list, tuple)) or len(value) != 2 or not all(isinstance(v, int) for v in value):
+        raise ValueError(f"'{name}' must be a pair of integers.")
+    x, y = value
+    if not (0 <= x < width and 0 <= y < height):
+        raise ValueError(f"'{name}' {tuple(value)} lies outside the {width}x{height} grid.")
+    return (x, y)
+
+
+def _number(value: Any, name: str, low: float, high: float, integer: bool = False) -> Any:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or (integer and not isinstance(value, int)):
+        raise ValueError(f"'{name}' must be {'an integer' if integer else 'a number'}.")
+    if not low <= value <= high:
+        raise ValueError(f"'{name}' must be between {low} and {high}.")
+    return value
+
+
+def parse_scenario_params(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Validates a scenario request body against `DEFAULT_SCENARIO`.
+
+    Args:
+        data (Optional[Dict[str, Any]]): Scenario overrides; missing keys use the defaults.
+
+    Returns:
+        Dict[str, Any]: The complete scenario, with positions as tuples.
+
+    Raises:
+        ValueError: If a parameter is unknown, of the wrong type or out of range.
+    """
+    data = data or {}
+    if not isinstance(data, dict):
+        raise ValueError("The scenario must be a JSON object.")
+    unknown = set(data) - set(DEFAULT_SCENARIO)
+    if unknown:
+        raise ValueError(f"Unknown scenario parameter(s): {', '.join(sorted(unknown))}.")
+    scenario = dict(DEFAULT_SCENARIO, **data)
+
+    width = _number(scenario["grid_width"], "grid_width", 2, MAX_GRID_SIZE, integer=True)
+    height = _number(scenario["grid_height"], "grid_height", 2, MAX_GRID_SIZE, integer=True)
+    if not isinstance(scenario["walls"], (list, tuple)):
+        raise ValueError("'walls' must be a list of [x, y] pairs.")
+    walls = [_position(wall, "walls", width, height) for wall in scenario["walls"]]
+    start = _position(scenario["start_position"], "start_position", width, height)
+    goal = (_position(scenario["goal_position"], "goal_position", width, height)
+            if scenario["goal_position"] is not None else (width - 1, height - 1))
+    if start in walls or goal in walls:
+        raise ValueError("'start_position' and 'goal_position' must not be walls.")
+    if not isinstance(scenario["agent_id"], str) or not scenario["agent_id"]:
+        raise ValueError("'agent_id' must be a non-empty string.")
+    if not isinstance(scenario["name"], str):
+        raise ValueError("'name' must be a string.")
+
+    scenario.update(
+        walls=walls, start_position=start, goal_position=goal,
+        num_steps=_number(scenario["num_steps"], "num_steps", 1, MAX_STEPS, integer=True),
+        exploration_rate=_number(scenario["exploration_rate"], "exploration_rate", 0.0, 1.0),
+        learning_rate=_number(scenario["learning_rate"], "learning_rate", 0.0, 1.0),
+        discount_factor=_number(scenario["discount_factor"], "discount_factor", 0.0, 1.0),
+        frame_every=_number(scenario["frame_every"], "frame_every", 0, MAX_STEPS, integer=True),
+    )
+    return scenario
+
+
+class _EventWriter:
+    """Appends numbered events to a run's events file, flushing each one for readers."""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'a', encoding='utf-8')
+        self._seq = 0
+
+    def emit(self, event_type: str, **data: Any) -> None:
+        self._seq += 1
+        self._file.write(json.dumps({"seq": self._seq, "type": event_type, "time": time.time(), "data": data}, default=str) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def run_simulation_job(scenario: Dict[str, Any], run_dir: str, run_url_prefix: str) -> Dict[str, Any]:
+    """
+    Worker entry point: runs one GridWorld Q-learning simulation.
+
+    PiaSE and matplotlib are imported here so that only worker processes pay for them.
+
+    Args:
+        scenario (Dict[str, Any]): Output of `parse_scenario_params`.
+        run_dir (str): Existing directory receiving frames, the PiaSE log and the events file.
+        run_url_prefix (str): URL under which `run_dir` is served, e.g. '/static/piase_runs/<run_id>'.
+
+    Returns:
+        Dict[str, Any]: The run result (run_id, image_urls, text_log, summary, cancelled).
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from PiaAGI_Research_Tools.PiaSE.core_engine.basic_engine import BasicSimulationEngine
+    from PiaAGI_Research_Tools.PiaSE.environments.grid_world import GridWorld
+    from PiaAGI_Research_Tools.PiaSE.agents.q_learning_agent import QLearningAgent
+    from PiaAGI_Research_Tools.PiaSE.utils.visualizer import GridWorldVisualizer
+
+    run_id = os.path.basename(run_dir)
+    cancel_path = os.path.join(run_dir, CANCEL_FILENAME)
+    events = _EventWriter(os.path.join(run_dir, EVENTS_FILENAME))
+    text_log: List[str] = ["PiaSE Simulation Log (WebApp API):"]
+    image_urls: List[str] = []
+
+    def log(line: str) -> None:
+        text_log.append(line)
+        events.emit("log", line=line)
+
+    def render(step: int, title: str) -> None:
+        filename = f"step_{step:03d}.png"
+        visualizer.render(title=title, output_path=os.path.join(run_dir, filename), step_delay=None)
+        url = f"{run_url_prefix}/{filename}"
+        image_urls.append(url)
+        events.emit("frame", step=step, url=url)
+
+    try:
+        events.emit("status", status=JOB_RUNNING)
+        agent_id = scenario["agent_id"]
+        num_steps = scenario["num_steps"]
+        frame_every = scenario["frame_every"]
+        environment = GridWorld(
+            width=scenario["grid_width"],
+            height=scenario["grid_height"],
+            walls=list(scenario["walls"]),
+            goal_position=tuple(scenario["goal_position"]),
+            default_agent_id=agent_id,
+            agent_start_pos=tuple(scenario["start_position"])
+        )
+        engine = BasicSimulationEngine()
+        q_agent = QLearningAgent(exploration_rate=scenario["exploration_rate"],
+                                 learning_rate=scenario["learning_rate"],
+                                 discount_factor=scenario["discount_factor"])
+        engine.initialize(
+            environment=environment,
+            agents={agent_id: q_agent},
+            scenario_config={"name": scenario["name"]},
+            log_path=os.path.join(run_dir, "piase_internal_log.jsonl")
+        )
+        visualizer = GridWorldVisualizer(environment)
+        render(0, "Initial State")
+        log("Initial state rendered.")
+        log(f"Starting simulation for up to {num_steps} steps...")
+
+        agent_reached_goal = False
+        cancelled = False
+        steps_taken = 0
+        agent_current_pos = environment.agent_positions.get(agent_id)
+        for i in range(num_steps):
+            if os.path.exists(cancel_path):
+                cancelled = True
+                log(f"Simulation cancelled before step {i + 1}.")
+                break
+            log(f"--- Step {i + 1}/{num_steps} ---")
+            engine.run_step()
+            steps_taken = i + 1
+            agent_current_pos = environment.agent_positions.get(agent_id)
+            log(f"Agent {agent_id} action: {q_agent.last_action}, New position: {agent_current_pos}")
+            agent_reached_goal = environment.is_done(agent_id)
+            last_step = agent_reached_goal or steps_taken == num_steps
+            if frame_every and (steps_taken % frame_every == 0 or last_step):
+                render(steps_taken, f"After Step {steps_taken}")
+            events.emit("progress", step=steps_taken, total_steps=num_steps)
+            if agent_reached_goal:
+                log(f"Agent {agent_id} reached the goal at step {steps_taken}!")
+                break
+
+        if not cancelled:
+            log("Simulation finished." if agent_reached_goal else f"Simulation finished after {num_steps} steps. Goal not reached.")
+
+        text_log.append("\n--- Q-Learning Agent's Q-Table (sample) ---")
+        for state_key, actions_map in list(q_agent.q_table.items())[:5]:
+            text_log.append(f"State {state_key}: {actions_map}")
+        plt.close(visualizer.fig) # Close the figure to free memory
+
+        return {
+            "message": "PiaSE simulation run cancelled." if cancelled else "PiaSE simulation run completed.",
+            "run_id": run_id,
+            "image_urls": image_urls,
+            "text_log": "\n".join(text_log),
+            "cancelled": cancelled,
+            "summary": {
+                "agent_reached_goal": agent_reached_goal,
+                "total_steps_taken": steps_taken,
+                "final_agent_position": agent_current_pos
+            }
+        }
+    finally:
+        events.close()
+
+
+class SimulationJob:
+    """
+    Bookkeeping of one submitted simulation, held by the web process.
+
+    Attributes:
+        job_id (str): Identifier; also the name of the run directory.
+        status (str): One of queued, running, completed, failed, cancelled.
+        scenario (Dict[str, Any]): The validated scenario.
+        run_dir (str): Directory receiving the run's files.
+        result (Optional[Dict[str, Any]]): The worker's result once completed/cancelled.
+        error (Optional[str]): The failure message once failed.
+    """
+
+    def __init__(self, job_id: str, scenario: Dict[str, Any], run_dir: str):
+        self.job_id = job_id
+        self.scenario = scenario
+        self.run_dir = run_dir
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.future: Optional[Future] = None
+        self.events: List[Dict[str, Any]] = []
+        self._events_offset = 0
+        self._events_lock = threading.Lock()
+
+    def read_events(self, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """Returns the events with a sequence number above `after_seq`, reading only new file content."""
+        with self._events_lock:
+            path = os.path.join(self.run_dir, EVENTS_FILENAME)
+            try:
+                with open(path, 'rb') as f:
+                    f.seek(self._events_offset)
+                    chunk = f.read()
+            except FileNotFoundError:
+                chunk = b""
+            complete = chunk[:chunk.rfind(b"\n") + 1] # Leave a partially written line for the next read
+            self._events_offset += len(complete)
+            for line in complete.splitlines():
+                if line.strip():
+                    self.events.append(json.loads(line))
+            if after_seq <= 0:
+                return list(self.events)
+            # Sequence numbers are 1-based and contiguous.
+            return self.events[after_seq:]
+
+    def progress(self) -> Optional[Dict[str, Any]]:
+        for event in reversed(self.read_events()):
+            if event["type"] == "progress":
+                return event["data"]
+        return None
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        info = {"job_id": self.job_id, "status": self.status, "scenario": self.scenario,
+                "created_at": self.created_at, "finished_at": self.finished_at,
+                "progress": self.progress(), "error": self.error}
+        if include_result:
+            info["result"] = self.result
+        return info
+
+
+class SimulationJobManager:
+    """
+    Queues simulation jobs on a process pool and tracks their state.
+
+    Args:
+        runs_dir (str): Directory in which each job gets its run directory.
+        runs_url_prefix (str): URL under which `runs_dir` is served.
+        max_workers (int): Worker processes, i.e. the number of simulations running at once.
+        max_pending_jobs (int): Maximum number of queued plus running jobs.
+        max_finished_jobs (int): Finished jobs kept for status queries (oldest dropped first).
+        worker (Callable): Picklable worker function with the signature of `run_simulation_job`.
+    """
+
+    def __init__(self,
+                 runs_dir: str,
+                 runs_url_prefix: str,
+                 max_workers: int = 2,
+                 max_pending_jobs: int = 16,
+                 max_finished_jobs: int = 100,
+                 worker: Callable[[Dict[str, Any], str, str], Dict[str, Any]] = run_simulation_job):
+        self.runs_dir = runs_dir
+        self.runs_url_prefix = runs_url_prefix.rstrip('/')
+        self.max_workers = max_workers
+        self.max_pending_jobs = max_pending_jobs
+        self.max_finished_jobs = max_finished_jobs
+        self._worker = worker
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: "OrderedDict[str, SimulationJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _active_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status not in FINISHED_STATES)
+
+    def _prune_locked(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def submit(self, scenario: Dict[str, Any]) -> SimulationJob:
+        """
+        Queues a simulation of a validated scenario.
+
+        Raises:
+            JobQueueFullError: If `max_pending_jobs` jobs are already queued or running.
+        """
+        with self._lock:
+            if self._active_count() >= self.max_pending_jobs:
+                raise JobQueueFullError(f"Too many simulation jobs in progress (limit {self.max_pending_jobs}).")
+            job_id = f"run_{time.strftime('%Y%m%d-%H%M%S')}_{uuid.uuid4().hex[:8]}"
+            run_dir = os.path.join(self.runs_dir, job_id)
+            os.makedirs(run_dir)
+            job = SimulationJob(job_id, scenario, run_dir)
+            self._jobs[job_id] = job
+            self._prune_locked()
+            job.future = self._get_executor().submit(self._worker, scenario, run_dir, f"{self.runs_url_prefix}/{job_id}")
+        job.future.add_done_callback(lambda future, job=job: self._on_done(job, future))
+        logger.info(f"[PiaSE Job {job_id}] Queued.")
+        return job
+
+    def _on_done(self, job: SimulationJob, future: Future) -> None:
+        with self._lock:
+            job.finished_at = time.time()
+            if future.cancelled():
+                job.status = JOB_CANCELLED
+            elif future.exception() is not None:
+                job.status = JOB_FAILED
+                job.error = str(future.exception())
+                logger.error(f"[PiaSE Job {job.job_id}] Failed: {job.error}")
+            else:
+                job.result = future.result()
+                job.status = JOB_CANCELLED if job.result.get("cancelled") else JOB_COMPLETED
+        logger.info(f"[PiaSE Job {job.job_id}] {job.status}.")
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        """Returns the job, with its status advanced to 'running' once its worker reported in."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None and job.status == JOB_QUEUED and job.read_events():
+            with self._lock:
+                if job.status == JOB_QUEUED:
+                    job.status = JOB_RUNNING
+        return job
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            job_ids = list(self._jobs)
+        jobs = [self.get(job_id) for job_id in job_ids]
+        return [job.to_dict(include_result=False) for job in jobs if job is not None]
+
+    def cancel(self, job_id: str) -> Optional[SimulationJob]:
+        """
+        Cancels a queued job, or asks a running one to stop after its current step.
+
+        Returns:
+            Optional[SimulationJob]: The job, or None if it is unknown.
+        """
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return job
+        if job.future is not None and job.future.cancel():
+            return job # _on_done marks it cancelled
+        with open(os.path.join(job.run_dir, CANCEL_FILENAME), 'w') as f:
+            f.write(str(time.time()))
+        return job
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
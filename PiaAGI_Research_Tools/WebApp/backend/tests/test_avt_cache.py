@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+import io
+import hashlib
+
+# The backend modules are imported flat, as app.py imports them
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from avt_cache import AnalysisCache, HashingLineReader, MultipartUpload, UploadTooLargeError
+
+
+LOG = b'{"event_type": "A"}\n{"event_type": "B"}\n\n{"event_type": "C"}'
+BOUNDARY = "testboundary"
+
+
+def _multipart(*parts):
+    """Encodes (name, value) fields and (name, filename, content) files as a multipart body."""
+    body = b""
+    for part in parts:
+        if len(part) == 2:
+            body += f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{part[0]}"\r\n\r\n{part[1]}\r\n'.encode()
+        else:
+            body += (f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{part[0]}"; filename="{part[1]}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n').encode() + part[2] + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+class TestHashingLineReader(unittest.TestCase):
+
+    def test_lines_and_digest_do_not_depend_on_chunking(self):
+        for chunk_size in (1, 3, 16, 1024):
+            reader = HashingLineReader(io.BytesIO(LOG), chunk_size=chunk_size)
+            self.assertEqual(list(reader), LOG.split(b"\n"))
+            self.assertEqual(reader.hexdigest(), hashlib.sha256(LOG).hexdigest())
+            self.assertEqual(reader.bytes_read, len(LOG))
+
+    def test_max_bytes(self):
+        self.assertEqual(len(list(HashingLineReader(io.BytesIO(LOG), max_bytes=len(LOG)))), 4)
+        with self.assertRaises(UploadTooLargeError):
+            list(HashingLineReader(io.BytesIO(LOG), chunk_size=8, max_bytes=len(LOG) - 1))
+
+
+class TestMultipartUpload(unittest.TestCase):
+
+    def _upload(self, body, chunk_size=7, **kwargs):
+        return MultipartUpload(io.BytesIO(body), BOUNDARY.encode(), "logFile", chunk_size=chunk_size, **kwargs)
+
+    def test_streams_the_file_part_and_collects_fields_around_it(self):
+        body = _multipart(("field", "source"), ("other", "x.txt", b"ignored\n" * 5),
+                          ("logFile", "run.jsonl", LOG), ("data_field", "k.v"))
+        for chunk_size in range(1, len(body) + 1): # Chunks splitting CRLFs and boundaries anywhere
+            upload = self._upload(body, chunk_size)
+            self.assertEqual(upload.next_file(), "run.jsonl")
+            self.assertEqual(upload.fields, {"field": "source"})
+            reader = HashingLineReader(upload, chunk_size=5)
+            self.assertEqual(list(reader), LOG.split(b"\n"))
+            self.assertEqual(reader.hexdigest(), hashlib.sha256(LOG).hexdigest())
+            self.assertEqual(upload.finish(), {"field": "source", "data_field": "k.v"})
+
+    def test_body_without_the_file_part(self):
+        upload = self._upload(_multipart(("log_id", "abc")))
+        self.assertIsNone(upload.next_file())
+        self.assertEqual(upload.read(), b"")
+        self.assertEqual(upload.finish(), {"log_id": "abc"})
+
+    def test_oversized_fields_and_truncated_bodies_are_rejected(self):
+        with self.assertRaises(UploadTooLargeError):
+            self._upload(_multipart(("field", "x" * 100)), max_field_bytes=50).next_file()
+        body = _multipart(("logFile", "run.jsonl", LOG))
+        upload = self._upload(body[:-len(LOG) // 2])
+        self.assertEqual(upload.next_file(), "run.jsonl")
+        with self.assertRaises(ValueError):
+            list(HashingLineReader(upload))
+
+
+class TestAnalysisCache(unittest.TestCase):
+
+    def test_logs_are_keyed_by_content_hash(self):
+        cache = AnalysisCache(max_bytes=10 ** 6)
+        log_id = hashlib.sha256(LOG).hexdigest()
+        first = cache.put(log_id, "api-1", 3, len(LOG), "a.jsonl")
+        self.assertIs(cache.put(log_id, "api-2", 3, len(LOG), "renamed.jsonl"), first) # Same content, same entry
+        self.assertIs(cache.get(log_id), first)
+        self.assertIsNone(cache.get(hashlib.sha256(LOG + b"\n").hexdigest()))
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 1))
+
+    def test_results_are_memoized_per_parameter_key(self):
+        cache = AnalysisCache(max_bytes=10 ** 6, max_results_per_log=2)
+        cached = cache.put("log", "api", 3, 10)
+        calls = []
+
+        def compute(field):
+            return lambda api: calls.append(field) or f"{api}:{field}"
+
+        self.assertEqual(cache.result(cached, ("count", "a"), compute("a")), ("api:a", False))
+        self.assertEqual(cache.result(cached, ("count", "a"), compute("a")), ("api:a", True))
+        cache.result(cached, ("count", "b"), compute("b"))
+        cache.result(cached, ("count", "c"), compute("c")) # Drops the oldest result, for "a"
+        self.assertEqual(cache.result(cached, ("count", "a"), compute("a")), ("api:a", False))
+        self.assertEqual(calls, ["a", "b", "c", "a"])
+
+    def test_least_recently_used_logs_are_evicted_by_estimated_size(self):
+        cache = AnalysisCache(max_bytes=300, parsed_size_factor=10)
+        cache.put("a", "api", 1, 10)
+        cache.put("b", "api", 1, 10)
+        cache.get("a") # "b" is now the least recently used
+        cache.put("c", "api", 1, 15)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual((cache.current_bytes, cache.evicted_count), (250, 1))
+        oversized = cache.put("d", "api", 1, 31) # Larger than the whole cache: returned, not cached
+        self.assertEqual(oversized.log_id, "d")
+        self.assertIsNone(cache.get("d"))
+        self.assertTrue(cache.discard("a"))
+        self.assertFalse(cache.discard("a"))
+        self.assertEqual([log["log_id"] for log in cache.stats()["logs"]], ["c"])
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,135 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+# The backend modules are imported flat, as app.py imports them
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cml_sessions import CMLSessionManager, run_batch
+
+
+class _FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeWorkingMemory:
+    """Records how many calls overlap; `barrier` (if set) must be passed by every caller."""
+
+    def __init__(self):
+        self.items = []
+        self.active = 0
+        self.max_active = 0
+        self.barrier = None
+        self._lock = threading.Lock()
+
+    def add_item_to_workspace(self, content, salience, context):
+        self.items.append(content)
+        return f"item_{len(self.items)}"
+
+    def get_workspace_contents(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if self.barrier is not None:
+                self.barrier.wait(timeout=5)
+            else:
+                time.sleep(0.01)
+            return list(self.items)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _graph_factory(session_id):
+    return None, {"wm": _FakeWorkingMemory()}
+
+
+class TestCMLSessionManager(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = _FakeClock()
+
+    def _manager(self, **kwargs):
+        return CMLSessionManager(_graph_factory, clock=self.clock, **kwargs)
+
+    def test_sessions_are_isolated_and_reused(self):
+        manager = self._manager()
+        a, b = manager.get("a"), manager.get("b")
+        self.assertIs(manager.get("a"), a)
+        a.run("wm.add_item", {"item_content": "apple"})
+        self.assertEqual(a.run("wm.contents"), ["apple"])
+        self.assertEqual(b.run("wm.contents"), [])
+        self.assertIsNone(manager.get("c", create=False))
+        self.assertEqual(len(manager.get().session_id), 32)
+        for bad in ["", "x" * 65, "a/b", 7]:
+            with self.assertRaises(ValueError):
+                manager.get(bad)
+
+    def test_least_recently_used_session_is_evicted(self):
+        manager = self._manager(max_sessions=2)
+        manager.get("a")
+        manager.get("b")
+        manager.get("a") # "b" is now the least recently used
+        manager.get("c")
+        self.assertIsNone(manager.get("b", create=False))
+        self.assertIsNotNone(manager.get("a", create=False))
+        self.assertEqual((len(manager), manager.evicted_count), (2, 1))
+        self.assertEqual([s["session_id"] for s in manager.stats()["sessions"]], ["c", "a"])
+
+    def test_idle_sessions_expire(self):
+        manager = self._manager(ttl_seconds=10)
+        first = manager.get("a")
+        manager.get("b")
+        self.clock.now = 8
+        manager.get("a")
+        self.clock.now = 15 # "b" idle for 15s, "a" for 7s
+        self.assertEqual(len(manager), 1)
+        self.assertIs(manager.get("a", create=False), first)
+        self.clock.now = 30
+        self.assertIsNot(manager.get("a"), first) # Expired; recreated with a fresh graph
+        self.assertEqual(manager.expired_count, 2)
+        self.assertTrue(manager.close("a"))
+        self.assertFalse(manager.close("a"))
+
+    def test_requests_of_one_session_are_serialized(self):
+        session = self._manager().get("a")
+        threads = [threading.Thread(target=session.run, args=("wm.contents",)) for _ in range(4)]
+        threads.append(threading.Thread(target=run_batch, args=(session, [{"op": "wm.contents"}] * 2)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(session.modules["wm"].max_active, 1)
+        self.assertEqual(session.operation_count, 6)
+
+    def test_different_sessions_run_in_parallel(self):
+        manager = self._manager()
+        a, b = manager.get("a"), manager.get("b")
+        barrier = threading.Barrier(2)
+        a.modules["wm"].barrier = b.modules["wm"].barrier = barrier
+        thread = threading.Thread(target=a.run, args=("wm.contents",))
+        thread.start()
+        b.run("wm.contents") # Would break the barrier (timeout) if sessions shared a lock
+        thread.join()
+        self.assertFalse(barrier.broken)
+
+    def test_batch_reports_errors_per_operation(self):
+        session = self._manager().get("a")
+        operations = [{"op": "wm.add_item", "args": {"item_content": "x"}}, {"op": "nope"},
+                      {"op": "emotion.current"}, {"op": "wm.contents", "args": "x"}, {"op": "wm.contents"}]
+        results = run_batch(session, operations)
+        self.assertEqual(results[0], {"op": "wm.add_item", "result": {"item_id": "item_1", "current_size": 1}})
+        self.assertEqual([("error" in result) for result in results], [False, True, True, True, False])
+        self.assertEqual(len(run_batch(session, operations, stop_on_error=True)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,147 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import time
+
+# The backend modules are imported flat, as app.py imports them
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from piase_jobs import (SimulationJob, SimulationJobManager, JobQueueFullError, parse_scenario_params,
+                        _EventWriter, DEFAULT_SCENARIO, EVENTS_FILENAME, CANCEL_FILENAME, FINISHED_STATES,
+                        JOB_COMPLETED, JOB_CANCELLED, JOB_FAILED, JOB_QUEUED)
+
+
+def _fake_worker(scenario, run_dir, run_url_prefix):
+    """Stands in for run_simulation_job: one progress event per step, honouring the cancel flag."""
+    events = _EventWriter(os.path.join(run_dir, EVENTS_FILENAME))
+    try:
+        events.emit("status", status="running")
+        if scenario["name"] == "fail":
+            raise RuntimeError("simulated failure")
+        for step in range(1, scenario["num_steps"] + 1):
+            if os.path.exists(os.path.join(run_dir, CANCEL_FILENAME)):
+                return {"run_id": os.path.basename(run_dir), "cancelled": True}
+            time.sleep(0.02)
+            events.emit("progress", step=step, total_steps=scenario["num_steps"])
+        return {"run_id": os.path.basename(run_dir), "cancelled": False, "url": run_url_prefix}
+    finally:
+        events.close()
+
+
+def _wait(job, condition, timeout=20.0):
+    deadline = time.time() + timeout
+    while not condition(job):
+        if time.time() > deadline:
+            raise AssertionError(f"Timed out waiting for job {job.job_id} (status {job.status}).")
+        time.sleep(0.02)
+
+
+class TestParseScenarioParams(unittest.TestCase):
+
+    def test_defaults_reproduce_the_former_grid(self):
+        scenario = parse_scenario_params(None)
+        self.assertEqual(scenario["grid_width"], 5)
+        self.assertEqual(scenario["goal_position"], (4, 4))
+        self.assertEqual(scenario["walls"], [tuple(wall) for wall in DEFAULT_SCENARIO["walls"]])
+
+    def test_overrides_are_validated(self):
+        scenario = parse_scenario_params({"grid_width": 8, "walls": [[2, 2]], "start_position": [1, 0], "num_steps": 3})
+        self.assertEqual((scenario["walls"], scenario["start_position"], scenario["goal_position"]), ([(2, 2)], (1, 0), (7, 4)))
+        for bad in [{"colour": "red"}, {"grid_width": 1}, {"num_steps": True}, {"num_steps": 2.5},
+                    {"exploration_rate": 1.5}, {"walls": [[9, 9]]}, {"walls": [[0, 0]]}, {"agent_id": ""},
+                    {"start_position": [0]}]:
+            with self.assertRaises(ValueError, msg=bad):
+                parse_scenario_params(bad)
+
+
+class TestSimulationJobEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.job = SimulationJob("run_test", parse_scenario_params({}), self.temp_dir.name)
+        self.path = os.path.join(self.temp_dir.name, EVENTS_FILENAME)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_events_is_incremental_and_waits_for_complete_lines(self):
+        self.assertEqual(self.job.read_events(), [])
+        self.assertIsNone(self.job.progress())
+        writer = _EventWriter(self.path)
+        writer.emit("progress", step=1, total_steps=3)
+        writer.emit("log", line="hello")
+        writer.close()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"seq": 3, "type": "progress", "time": 0, "data": {"step": 2}})[:20])
+        self.assertEqual([event["seq"] for event in self.job.read_events()], [1, 2])
+        self.assertEqual(self.job.progress(), {"step": 1, "total_steps": 3})
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"seq": 3, "type": "progress", "time": 0, "data": {"step": 2}})[20:] + "\n")
+        self.assertEqual([event["seq"] for event in self.job.read_events(after_seq=1)], [2, 3])
+        self.assertEqual(self.job.progress(), {"step": 2})
+
+
+class TestSimulationJobManager(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.managers = []
+
+    def tearDown(self):
+        for manager in self.managers:
+            manager.shutdown(wait=True)
+        self.temp_dir.cleanup()
+
+    def _manager(self, **kwargs):
+        manager = SimulationJobManager(self.temp_dir.name, "/static/piase_runs/", worker=_fake_worker, **kwargs)
+        self.managers.append(manager)
+        return manager
+
+    def test_job_completes_with_progress(self):
+        manager = self._manager(max_workers=1)
+        job = manager.submit(parse_scenario_params({"num_steps": 3}))
+        self.assertIn(job.status, (JOB_QUEUED, "running"))
+        _wait(job, lambda job: job.status in FINISHED_STATES)
+        self.assertEqual(job.status, JOB_COMPLETED)
+        self.assertEqual(job.result["url"], f"/static/piase_runs/{job.job_id}")
+        self.assertEqual(job.progress(), {"step": 3, "total_steps": 3})
+        info = manager.list_jobs()[0]
+        self.assertEqual((info["job_id"], info["status"]), (job.job_id, JOB_COMPLETED))
+        self.assertNotIn("result", info)
+
+    def test_worker_failure_is_reported(self):
+        manager = self._manager(max_workers=1)
+        job = manager.submit(parse_scenario_params({"name": "fail"}))
+        _wait(job, lambda job: job.status in FINISHED_STATES)
+        self.assertEqual((job.status, job.error), (JOB_FAILED, "simulated failure"))
+
+    def test_cancel_running_and_queued_jobs(self):
+        manager = self._manager(max_workers=1)
+        running = manager.submit(parse_scenario_params({"num_steps": 500}))
+        queued = [manager.submit(parse_scenario_params({"num_steps": 500})) for _ in range(3)]
+        _wait(running, lambda job: job.progress() is not None)
+        for job in [running] + queued:
+            self.assertIs(manager.cancel(job.job_id), job)
+        for job in [running] + queued:
+            _wait(job, lambda job: job.status in FINISHED_STATES)
+            self.assertEqual(job.status, JOB_CANCELLED)
+        self.assertLess(running.progress()["step"], 500)
+        self.assertIsNone(manager.cancel("run_unknown"))
+
+    def test_queue_limit_and_finished_job_pruning(self):
+        manager = self._manager(max_workers=1, max_pending_jobs=2, max_finished_jobs=1)
+        jobs = [manager.submit(parse_scenario_params({"num_steps": 2})) for _ in range(2)]
+        with self.assertRaises(JobQueueFullError):
+            manager.submit(parse_scenario_params({"num_steps": 2}))
+        for job in jobs:
+            _wait(job, lambda job: job.status in FINISHED_STATES)
+        last = manager.submit(parse_scenario_params({"num_steps": 1}))
+        self.assertIsNone(manager.get(jobs[0].job_id))
+        self.assertIs(manager.get(jobs[1].job_id), jobs[1])
+        _wait(last, lambda job: job.status in FINISHED_STATES)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -5,22 +5,24 @@ const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001
 function SEInterface() {
   const [isLoading, setIsLoading] = useState(false);
   const [simulationResults, setSimulationResults] = useState(null);
+  const [progress, setProgress] = useState(null);
   const [error, setError] = useState('');
 
   const handleRunSimulation = async () => {
     setIsLoading(true);
     setError('');
     setSimulationResults(null);
+    setProgress(null);
 
     try {
-      // The backend /api/piase/run_simulation is a POST request
-      // and currently runs a hardcoded scenario, so no body is strictly needed for this version.
+      // POST queues the run (default 5x5 GridWorld scenario) and returns a job id right away;
+      // the job is then polled until it finishes.
       const response = await fetch(`${API_BASE_URL}/api/piase/run_simulation`, {
         method: 'POST',
         headers: {
-          'Content-Type': 'application/json', // Still good practice to send
+          'Content-Type': 'application/json',
         },
-        // body: JSON.stringify({}), // Send empty JSON object if backend expects it
+        body: JSON.stringify({}), // Scenario parameters, e.g. { grid_width: 8, num_steps: 100 }
       });
 
       const data = await response.json();
@@ -28,8 +30,22 @@ function SEInterface() {
       if (!response.ok) {
         throw new Error(data.error || `HTTP error! status: ${response.status}`);
       }
-      
-      setSimulationResults(data);
+
+      let job = null;
+      do {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        const statusResponse = await fetch(`${API_BASE_URL}${data.status_url}`);
+        job = await statusResponse.json();
+        if (!statusResponse.ok) {
+          throw new Error(job.error || `HTTP error! status: ${statusResponse.status}`);
+        }
+        setProgress(job.progress);
+      } while (job.status === 'queued' || job.status === 'running');
+
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Simulation failed.');
+      }
+      setSimulationResults(job.result);
 
     } catch (err) {
       console.error("Simulation run error:", err);
@@ -68,7 +84,10 @@ function SEInterface() {
 
       {isLoading && (
         <div className="mt-6 text-center">
-          <p className="text-lg text-gray-300">Simulation in progress, please wait...</p>
+          <p className="text-lg text-gray-300">
+            Simulation in progress, please wait...
+            {progress && ` (step ${progress.step} of ${progress.total_steps})`}
+          </p>
           {/* You could add a spinner here */}
         </div>
       )}